@@ -36,7 +36,7 @@ from numpy import (
 from landlab import ACTIVE_LINK, CORE_NODE, HexModelGrid
 from landlab.core.utils import as_id_array
 
-from ..cfuncs import get_next_event_new  # , update_link_state_new
+from ..cfuncs import reschedule_transitions
 
 _DEFAULT_NUM_ROWS = 5
 _DEFAULT_NUM_COLS = 5
@@ -330,6 +330,8 @@ class LatticeNormalFault(HexLatticeTectonicizer):
                 self.num_fw_rows[c] += 1
                 current_row += 1
 
+        self._setup_node_offsets()
+
         # If we're handling properties and property IDs, we need to do some
         # setup
         if self.propid is not None:
@@ -507,6 +509,72 @@ class LatticeNormalFault(HexLatticeTectonicizer):
                         self.first_link_shifted_from = ln
                         self.first_link_shifted_to = ln + offset
 
+        # Links whose data move, ordered from the top of the grid down so
+        # that, where two links shift to the same place, the lower one wins
+        shifted = where(self.link_offset_id != arange(self.grid.number_of_links))[0]
+        self._links_shifted_from = shifted[::-1]
+        self._links_shifted_to = self.link_offset_id[self._links_shifted_from]
+
+    def _setup_node_offsets(self):
+        """Set up arrays of node IDs for shifting node data up and right.
+
+        Examples
+        --------
+        >>> from landlab import HexModelGrid
+        >>> grid = HexModelGrid(5, 5, 1.0, orientation='vertical',
+        ...                     shape='rect', reorient_links=True)
+        >>> lnf = LatticeNormalFault(-0.01, grid)
+        >>> lnf._fault_base_nodes
+        array([2, 7, 4, 1, 6, 3, 0])
+        >>> lnf._nodes_shifted_to
+        array([12, 17, 22,  9, 14, 19, 24, 11, 16,  8])
+        >>> lnf._nodes_shifted_from
+        array([ 4,  9, 14,  1,  6, 11, 16,  3,  8,  0])
+        """
+        base_nodes = []
+        shifted_to = []
+        shifted_from = []
+
+        # We go column-by-column, starting from the right side
+        for c in range(self.grid.number_of_node_columns - 1, self.first_fw_col - 1, -1):
+
+            # Odd-numbered rows are shifted up in the hexagonal, vertically
+            # oriented lattice
+            row_offset = 2 - (c % 2)
+
+            # Number of base nodes in the footwall in this column (1 or 2).
+            n_base_nodes = min(self.num_fw_rows[c], row_offset)
+
+            # ID of the bottom footwall node in this column
+            bottom_node = (c // 2) + ((c % 2) * self.n_even_cols)
+
+            # The bottom 1 or 2 nodes in this column are set to rock
+            base_nodes.append(bottom_node)
+            if n_base_nodes == 2:
+                base_nodes.append(bottom_node + self.nc)
+
+            # "indices" here contains the array indices of those nodes in this
+            # column that are to be replaced by the ones in the column to the
+            # left and down one or two nodes.
+            first_repl = bottom_node + n_base_nodes * self.nc
+            last_repl = (
+                first_repl + (self.num_fw_rows[c] - (n_base_nodes + 1)) * self.nc
+            )
+            indices = arange(first_repl, last_repl + 1, self.nc)
+            offset = (
+                self.nc + ((self.nc + 1) // 2) + ((c + 1) % 2) * ((self.nc + 1) % 2)
+            )
+            shifted_to.append(indices)
+            shifted_from.append(indices - offset)
+
+        # Each node takes the contents that its source node had before the
+        # offset, so the shift can be done as a single array assignment.
+        self._fault_base_nodes = array(base_nodes, dtype=int)
+        self._nodes_shifted_to = np.concatenate(shifted_to + [zeros(0, dtype=int)])
+        self._nodes_shifted_from = np.concatenate(
+            shifted_from + [zeros(0, dtype=int)]
+        )
+
     def _setup_links_to_update_after_offset(self, in_footwall):
         """Create and store array with IDs of links for which to update
         transitions after fault offset.
@@ -594,21 +662,16 @@ class LatticeNormalFault(HexLatticeTectonicizer):
         >>> (int(1000 * pq[30][0]), pq[30][1:])
         (575, (6, 16))
         >>> lnf.do_offset(ca=ohcts)
-        >>> (int(1000 * pq[48][0]), pq[48][1:])
-        (752, (11, 43))
-        >>> (int(1000 * pq[54][0]), pq[54][1:])
-        (483, (9, 40))
-        >>> (int(1000 * pq[61][0]), pq[61][1:])
-        (575, (6, 37))
+        >>> len(ohcts.priority_queue)
+        38
+        >>> events = {
+        ...     link: (int(1000 * time), idx)
+        ...     for (time, idx, link) in ohcts.priority_queue._queue
+        ... }
+        >>> events[43], events[40], events[37]
+        ((752, 11), (483, 9), (575, 6))
         """
-        for i in range(len(ca.priority_queue._queue)):
-            link = ca.priority_queue._queue[i][2]
-            if self.link_offset_id[link] != link:
-                ca.priority_queue._queue[i] = (
-                    ca.priority_queue._queue[i][0],
-                    ca.priority_queue._queue[i][1],
-                    self.link_offset_id[link],
-                )
+        ca.priority_queue.remap(self.link_offset_id, ca.next_update)
 
     def shift_link_states(self, ca, current_time):
         """Shift link data up and right.
@@ -651,18 +714,31 @@ class LatticeNormalFault(HexLatticeTectonicizer):
                 0,  8,  4, 11,  4,  0,  2,  4,  8,  6,  8,  0,  0,  0,  8,  4,  8,
                 4,  0,  0,  0,  0,  0,  0,  0])
         """
-        num_links = self.grid.number_of_links
-        for lnk in range(num_links - 1, self.first_link_shifted_from - 1, -1):
-            link_offset = self.link_offset_id[lnk]
-            if link_offset != lnk:
-                ca.link_state[link_offset] = ca.link_state[lnk]
-                ca.next_trn_id[link_offset] = ca.next_trn_id[lnk]
-                ca.next_update[link_offset] = ca.next_update[lnk]
+        to_link = self._links_shifted_to
+        from_link = self._links_shifted_from
+        ca.link_state[to_link] = ca.link_state[from_link]
+        ca.next_trn_id[to_link] = ca.next_trn_id[from_link]
+        ca.next_update[to_link] = ca.next_update[from_link]
 
         self.shift_scheduled_transitions(ca, current_time)
 
-        for lnk in self.links_to_update:
-            self.assign_new_link_state_and_transition(lnk, ca, current_time)
+        reschedule_transitions(
+            self.links_to_update,
+            np.asarray(ca.node_state, dtype=int),
+            self.grid.node_at_link_tail,
+            self.grid.node_at_link_head,
+            ca.link_orientation,
+            ca.num_node_states,
+            ca.num_node_states_sq,
+            ca.link_state,
+            ca.n_trn,
+            ca.trn_id,
+            ca.trn_rate,
+            ca.next_update,
+            ca.next_trn_id,
+            ca.priority_queue,
+            current_time,
+        )
 
     def do_offset(self, ca=None, current_time=0.0, rock_state=1):
         """Apply 60-degree normal-fault offset.
@@ -723,41 +799,14 @@ class LatticeNormalFault(HexLatticeTectonicizer):
             # and possibly top that are about to shift off the grid
             propids_for_incoming_nodes = self.propid[self.outgoing_node]
 
-        # We go column-by-column, starting from the right side
-        for c in range(self.grid.number_of_node_columns - 1, self.first_fw_col - 1, -1):
-
-            # Odd-numbered rows are shifted up in the hexagonal, vertically
-            # oriented lattice
-            row_offset = 2 - (c % 2)
-
-            # Number of base nodes in the footwall in this column (1 or 2).
-            n_base_nodes = min(self.num_fw_rows[c], row_offset)
-
-            # ID of the bottom footwall node in this column
-            bottom_node = (c // 2) + ((c % 2) * self.n_even_cols)
-
-            # The bottom 1 or 2 nodes in this column are set to rock
-            self.node_state[bottom_node] = rock_state
-            if n_base_nodes == 2:
-                self.node_state[bottom_node + self.nc] = rock_state
-
-            # "indices" here contains the array indices of those nodes in this
-            # column that are to be replaced by the ones in the column to the
-            # left and down one or two nodes. We do this replacement if indices
-            # contains any data.
-            first_repl = bottom_node + n_base_nodes * self.nc
-            last_repl = (
-                first_repl + (self.num_fw_rows[c] - (n_base_nodes + 1)) * self.nc
-            )
-            indices = arange(first_repl, last_repl + 1, self.nc)
-
-            if len(indices) > 0:
-                offset = (
-                    self.nc + ((self.nc + 1) // 2) + ((c + 1) % 2) * ((self.nc + 1) % 2)
-                )
-                self.node_state[indices] = self.node_state[indices - offset]
-                if self.propid is not None:
-                    self.propid[indices] = self.propid[indices - offset]
+        # Shift node contents up and right across the fault, and fill the
+        # base of each footwall column with rock.
+        self.node_state[self._nodes_shifted_to] = self.node_state[
+            self._nodes_shifted_from
+        ]
+        self.node_state[self._fault_base_nodes] = rock_state
+        if self.propid is not None:
+            self.propid[self._nodes_shifted_to] = self.propid[self._nodes_shifted_from]
 
         if self.propid is not None:
             self.propid[self.incoming_node] = propids_for_incoming_nodes
@@ -821,6 +870,13 @@ class LatticeUplifter(HexLatticeTectonicizer):
                 (self.nr - 1) * self.nc
             )
 
+        # Interior nodes above the bottom row, and the nodes one full row
+        # below them from which they take their contents on uplift
+        self._nodes_uplifted_to = (
+            self.inner_base_row_nodes + self.nc * arange(1, self.nr).reshape((-1, 1))
+        ).flatten()
+        self._nodes_uplifted_from = self._nodes_uplifted_to - self.nc
+
         self._setup_links_to_update_after_uplift()
 
         # Handle option for a layer of "blocks"
@@ -972,63 +1028,54 @@ class LatticeUplifter(HexLatticeTectonicizer):
         # (or down)
         shift = nc + 2 * (nc - 1)
 
-        # Loop from top to bottom of grid, shifting the following link data
-        # upward: state of link, ID of its next transition, and time of its
-        # next transition.
-        for lnk in range(self.grid.number_of_links - 1, first_link - 1, -1):
-            ca.link_state[lnk] = ca.link_state[lnk - shift]
-            ca.next_trn_id[lnk] = ca.next_trn_id[lnk - shift]
-            ca.next_update[lnk] = ca.next_update[lnk - shift]
+        # Shift the following link data upward: state of link, ID of its next
+        # transition, and time of its next transition.
+        n_links = self.grid.number_of_links
+        ca.link_state[first_link:] = ca.link_state[first_link - shift : n_links - shift]
+        ca.next_trn_id[first_link:] = ca.next_trn_id[
+            first_link - shift : n_links - shift
+        ]
+        ca.next_update[first_link:] = ca.next_update[
+            first_link - shift : n_links - shift
+        ]
 
         # Sweep through event queue, shifting links upward. Do NOT shift links
         # with IDs greater than NL - [SHIFT + (NC - 1)], because these are so
         # close to the top of the grid that either the events would refer to
         # non-existent links (>= NL) or would involve shifting an event onto
-        # an upper-boundary link. Note that because the event data are stored
-        # in a tuple, we have to replace the entire tuple (can't simply change
-        # the one item, because tuples are immutable)
+        # an upper-boundary link. Events that no longer match the scheduled
+        # time of their link are dropped from the queue.
         first_no_shift_id = self.grid.number_of_links - (shift + (nc - 1))
-        for i in range(len(ca.priority_queue._queue)):
-            if ca.priority_queue._queue[i][2] < first_no_shift_id:
-                ca.priority_queue._queue[i] = (
-                    ca.priority_queue._queue[i][0],
-                    ca.priority_queue._queue[i][1],
-                    (ca.priority_queue._queue[i][2] + shift),
-                )
-
-        # Update state of links along the boundaries.
-        for lk in self.links_to_update:
-
-            # Update link state
-            fns = self.node_state[self.grid.node_at_link_tail[lk]]
-            tns = self.node_state[self.grid.node_at_link_head[lk]]
-            orientation = ca.link_orientation[lk]
-            new_link_state = (
-                orientation * ca.num_node_states_sq + fns * ca.num_node_states + tns
-            )
-
-            # Schedule a new transition, if applicable
-            ca.link_state[lk] = new_link_state
-            if ca.n_trn[new_link_state] > 0:
-                (event_time, this_trn_id) = get_next_event_new(
-                    lk, new_link_state, current_time, ca.n_trn, ca.trn_id, ca.trn_rate
-                )
-                ca.priority_queue.push(lk, event_time)
-                ca.next_update[lk] = event_time
-                ca.next_trn_id[lk] = this_trn_id
-            else:
-                ca.next_update[lk] = _NEVER
-                ca.next_trn_id[lk] = -1
+        new_link_id = arange(self.grid.number_of_links)
+        new_link_id[:first_no_shift_id] += shift
+        ca.priority_queue.remap(new_link_id, ca.next_update)
+
+        # Update state of links along the boundaries, and schedule new
+        # transitions for them.
+        reschedule_transitions(
+            self.links_to_update,
+            np.asarray(self.node_state, dtype=int),
+            self.grid.node_at_link_tail,
+            self.grid.node_at_link_head,
+            ca.link_orientation,
+            ca.num_node_states,
+            ca.num_node_states_sq,
+            ca.link_state,
+            ca.n_trn,
+            ca.trn_id,
+            ca.trn_rate,
+            ca.next_update,
+            ca.next_trn_id,
+            ca.priority_queue,
+            current_time,
+        )
 
     def uplift_property_ids(self):
         """
         Shift property IDs upward by one row
         """
         top_row_propid = self.propid[self.inner_top_row_nodes]
-        for r in range(self.nr - 1, 0, -1):
-            self.propid[self.inner_base_row_nodes + self.nc * r] = self.propid[
-                self.inner_base_row_nodes + self.nc * (r - 1)
-            ]
+        self.propid[self._nodes_uplifted_to] = self.propid[self._nodes_uplifted_from]
         self.propid[self.inner_base_row_nodes] = top_row_propid
         self.prop_data[self.propid[self.inner_base_row_nodes]] = self.prop_reset_value
 
@@ -1069,11 +1116,9 @@ class LatticeUplifter(HexLatticeTectonicizer):
 
         # Shift the node states up by a full row. A "full row" includes two
         # staggered rows.
-        for r in range(self.nr - 1, 0, -1):
-            # This row gets the contents of the nodes 1 row down
-            self.node_state[self.inner_base_row_nodes + self.nc * r] = self.node_state[
-                self.inner_base_row_nodes + self.nc * (r - 1)
-            ]
+        self.node_state[self._nodes_uplifted_to] = self.node_state[
+            self._nodes_uplifted_from
+        ]
 
         # Fill the bottom rows with "fresh material" (code = rock_state), or
         # if using a block layer, with the right pattern of states.
@@ -115,5 +115,10 @@ def test_shift_link_and_transition_data_upward():
         [0.75, 0.84, 2.6, 0.07, 0.09, 0.8, 0.02, 1.79, 1.51, 2.04, 3.85],
     )
     assert_equal(pq._queue[0][2], 15)  # new soonest event
-    assert_equal(pq._queue[9][2], 14)  # was previously 7, now shifted up...
-    assert_equal(round(pq._queue[9][0], 2), 0.8)  # ...still sched for t = 0.80
+    events = {link: time for (time, _, link) in pq._queue}
+    assert_equal(round(events[14], 2), 0.8)  # was previously 7, now shifted up
+
+    # queue holds one event per link, each at the link's scheduled time
+    assert_equal(len(events), len(pq))
+    for link, time in events.items():
+        assert_equal(time, ohcts.next_update[link])
@@ -83,9 +83,9 @@ node_pair : list (x number of possible link states)
     you to look up the node states and orientation corresponding to a
     particular link-state ID.
 
-priority_queue : heap containing event records
+priority_queue : PriorityQueue
     Queue containing all future transition events, sorted by time of occurrence
-    (from soonest to latest).
+    (from soonest to latest). Holds at most one event per link.
 
 next_update : 1d array (x number of active links)
     Time (in the future) at which the link will undergo its next transition.
@@ -158,7 +158,9 @@ if _CYTEST:
         do_transition_new,
         update_link_states_and_transitions_new,
         run_cts_new,
+        run_cts_nogil,
         get_next_event_new,
+        seed_generator,
     )
 
 _NEVER = 1e50
@@ -403,6 +405,8 @@ class CellLabCTSModel(object):
     prop_reset_value : number or object, optional
         Default or initial value for a node/cell property (e.g., 0.0).
         Must be same type as *prop_data*.
+    seed : int, optional
+        Seed for random number generation.
     """
 
     def __init__(
@@ -449,6 +453,7 @@ class CellLabCTSModel(object):
 
         # Initialize random number generation
         np.random.seed(seed)
+        self._rng_state = seed_generator(seed)
 
         # Create an array that knows which links are connected to a boundary
         # node
@@ -522,7 +527,7 @@ class CellLabCTSModel(object):
         # X self.event_queue = []
         # X heapify(self.event_queue)
         self.next_update = self.grid.add_zeros("link", "next_update_time")
-        self.priority_queue = PriorityQueue()
+        self.priority_queue = PriorityQueue(self.grid.number_of_links)
         self.next_trn_id = -np.ones(self.grid.number_of_links, dtype=np.int)
 
         # Assign link types from node types
@@ -1147,6 +1152,7 @@ class CellLabCTSModel(object):
                 self.next_trn_id[i] = trn_id
 
             else:
+                self.priority_queue.remove(i)
                 self.next_update[i] = _NEVER
 
     # @profile
@@ -1282,6 +1288,7 @@ class CellLabCTSModel(object):
             self.next_update[link] = event_time
             self.next_trn_id[link] = trn_id
         else:
+            self.priority_queue.remove(link)
             self.next_update[link] = _NEVER
             self.next_trn_id[link] = -1
 
@@ -1708,7 +1715,12 @@ class CellLabCTSModel(object):
 
     # @profile
     def run(
-        self, run_to, node_state_grid=None, plot_each_transition=False, plotter=None
+        self,
+        run_to,
+        node_state_grid=None,
+        plot_each_transition=False,
+        plotter=None,
+        nogil=False,
     ):
         """Run the model forward for a specified period of time.
 
@@ -1722,6 +1734,13 @@ class CellLabCTSModel(object):
             Option to display the grid after each transition
         plotter : CAPlotter object (optional)
             Needed if caller wants to plot after every transition
+        nogil : bool (optional)
+            Run the transitions without holding the GIL, so that separate
+            models can run on separate threads. This mode can't plot or
+            call a transition's *prop_update_fn*, needs a float *prop_data*
+            if properties are swapped, and draws transition times from the
+            model's own random number generator (seeded with *seed*) rather
+            than numpy's global one.
 
         Examples
         --------
@@ -1738,10 +1757,17 @@ class CellLabCTSModel(object):
         >>> trn_list.append(Transition((0, 1, 1), (1, 1, 1), 4.0))
         >>> ins = np.arange(15) % 2
         >>> cts = OrientedRasterCTS(grid, nsd, trn_list, ins)
+        >>> cts.run(1.0, nogil=True)
+        >>> cts.current_time
+        1.0
         """
         if node_state_grid is not None:
             self.set_node_state_grid(node_state_grid)
 
+        if nogil:
+            self._run_nogil(run_to, plot_each_transition=plot_each_transition)
+            return
+
         # X        if plot_each_transition or self._use_propswap_or_callback:
         #            lean_run = False
         #        else:
@@ -1856,17 +1882,60 @@ class CellLabCTSModel(object):
     #                if _DEBUG:
     #                    print(self.node_state)
 
+    def _run_nogil(self, run_to, plot_each_transition=False):
+        """Run the model forward with the nogil engine."""
+        if plot_each_transition:
+            raise ValueError("plot_each_transition is not available with nogil")
+        if any(fn is not None and fn != 0 for fn in self.trn_prop_update_fn):
+            raise ValueError("nogil can't call a transition's prop_update_fn")
+
+        if np.any(self.trn_propswap):
+            prop_data = self.prop_data
+            if not (isinstance(prop_data, np.ndarray) and prop_data.dtype == float):
+                raise ValueError("nogil needs prop_data to be an array of float")
+            prop_reset_value = float(self.prop_reset_value)
+        else:
+            prop_data, prop_reset_value = np.empty(0), 0.0
+
+        self.current_time = run_cts_nogil(
+            run_to,
+            self.current_time,
+            self.priority_queue,
+            self.next_update,
+            self.grid.node_at_link_tail,
+            self.grid.node_at_link_head,
+            self.node_state,
+            self.next_trn_id,
+            self.trn_to,
+            self.grid.status_at_node,
+            self.num_node_states,
+            self.num_node_states_sq,
+            self.bnd_lnk,
+            self.link_orientation,
+            self.link_state,
+            self.n_trn,
+            self.trn_id,
+            self.trn_rate,
+            self.grid.links_at_node,
+            self.grid.active_link_dirs_at_node,
+            self.trn_propswap,
+            self.propid,
+            prop_data,
+            prop_reset_value,
+            self._rng_state,
+        )
+
     def run_new(self, run_to, plot_each_transition=False, plotter=None):
         """Test of new approach using priority queue."""
 
         # Continue until we've run out of either time or events
-        while self.current_time < run_to and self.priority_queue._queue:
+        while self.current_time < run_to and len(self.priority_queue) > 0:
 
             if _DEBUG:
                 print("Current Time = ", self.current_time)
 
             # Is there an event scheduled to occur within this run?
-            if self.priority_queue._queue[0][0] <= run_to:
+            if self.priority_queue.peek()[0] <= run_to:
 
                 # If so, pick the next transition event from the event queue
                 (ev_time, ev_idx, ev_link) = self.priority_queue.pop()
@@ -35,22 +35,280 @@ cdef char _DEBUG = 0
 
 cdef class PriorityQueue:
     """
-    Implements a priority queue.
+    Implements a priority queue of integer items, keyed by item.
+
+    The queue is an array-backed binary heap together with an index that
+    records the position of each item in the heap. An item appears at most
+    once: pushing an item that is already queued reschedules it, and an item
+    can be removed without waiting for it to reach the top of the heap.
+
+    Entries are ordered by priority and then by the order in which they were
+    pushed, which is the same ordering as a heapq of
+    (priority, index, item) tuples.
+
+    Parameters
+    ----------
+    capacity : int, optional
+        Expected number of items. The queue grows as needed.
+
+    Examples
+    --------
+    >>> from landlab.ca.cfuncs import PriorityQueue
+    >>> pq = PriorityQueue()
+    >>> pq.push(2, 2.2)
+    >>> pq.push(5, 5.5)
+    >>> pq.push(0, 0.11)
+    >>> len(pq)
+    3
+
+    Pushing an item that is already in the queue reschedules it.
+
+    >>> pq.push(5, 0.5)
+    >>> len(pq)
+    3
+    >>> pq.pop()
+    (0.11, 2, 0)
+    >>> pq.remove(5)
+    >>> 5 in pq
+    False
+    >>> pq._queue
+    [(2.2, 0, 2)]
     """
-    cdef public object _queue
+    cdef DTYPE_t [:] _priority
+    cdef DTYPE_INT_t [:] _order
+    cdef DTYPE_INT_t [:] _item
+    cdef DTYPE_INT_t [:] _position
+    cdef Py_ssize_t _size
     cdef public int _index
 
-    def __init__(self):
-        self._queue = []
+    def __init__(self, Py_ssize_t capacity=16):
+        capacity = max(capacity, 1)
+        self._priority = np.empty(capacity, dtype=DTYPE)
+        self._order = np.empty(capacity, dtype=DTYPE_INT)
+        self._item = np.empty(capacity, dtype=DTYPE_INT)
+        self._position = np.full(capacity, -1, dtype=DTYPE_INT)
+        self._size = 0
         self._index = 0
 
-    def push(self, int item, double priority):
-        heappush(self._queue, (priority, self._index, item))
+    def __len__(self):
+        return self._size
+
+    def __contains__(self, DTYPE_INT_t item):
+        return 0 <= item < self._position.shape[0] and self._position[item] >= 0
+
+    @property
+    def _queue(self):
+        """List of (priority, index, item) entries in heap order."""
+        return [
+            (self._priority[slot], self._order[slot], self._item[slot])
+            for slot in range(self._size)
+        ]
+
+    @property
+    def _capacity(self):
+        """Number of entries, and of items, the queue has room for."""
+        return (self._priority.shape[0], self._position.shape[0])
+
+    cdef void _grow_heap(self) except *:
+        cdef Py_ssize_t n = 2 * self._priority.shape[0]
+
+        self._priority = np.resize(np.asarray(self._priority), n)
+        self._order = np.resize(np.asarray(self._order), n)
+        self._item = np.resize(np.asarray(self._item), n)
+
+    cdef void _grow_index(self, Py_ssize_t n_items) except *:
+        cdef Py_ssize_t n = max(n_items, 2 * self._position.shape[0])
+        position = np.full(n, -1, dtype=DTYPE_INT)
+
+        position[:self._position.shape[0]] = self._position
+        self._position = position
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cdef inline bint _less(self, Py_ssize_t a, Py_ssize_t b) nogil:
+        return (
+            self._priority[a] < self._priority[b]
+            or (self._priority[a] == self._priority[b]
+                and self._order[a] < self._order[b])
+        )
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cdef inline void _move(self, Py_ssize_t src, Py_ssize_t dst) nogil:
+        self._priority[dst] = self._priority[src]
+        self._order[dst] = self._order[src]
+        self._item[dst] = self._item[src]
+        self._position[self._item[dst]] = dst
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cdef void _sift_toward_root(self, Py_ssize_t start, Py_ssize_t pos) nogil:
+        """Move the entry at *pos* up toward *start* (heapq._siftdown)."""
+        cdef DTYPE_t priority = self._priority[pos]
+        cdef DTYPE_INT_t order = self._order[pos]
+        cdef DTYPE_INT_t item = self._item[pos]
+        cdef Py_ssize_t parent
+
+        while pos > start:
+            parent = (pos - 1) >> 1
+            if (priority < self._priority[parent]
+                    or (priority == self._priority[parent]
+                        and order < self._order[parent])):
+                self._move(parent, pos)
+                pos = parent
+            else:
+                break
+        self._priority[pos] = priority
+        self._order[pos] = order
+        self._item[pos] = item
+        self._position[item] = pos
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cdef void _sift_toward_leaves(self, Py_ssize_t pos) nogil:
+        """Move the entry at *pos* down to its place (heapq._siftup)."""
+        cdef Py_ssize_t start = pos
+        cdef Py_ssize_t child = 2 * pos + 1
+        cdef DTYPE_t priority = self._priority[pos]
+        cdef DTYPE_INT_t order = self._order[pos]
+        cdef DTYPE_INT_t item = self._item[pos]
+
+        while child < self._size:
+            if child + 1 < self._size and not self._less(child, child + 1):
+                child += 1
+            self._move(child, pos)
+            pos = child
+            child = 2 * pos + 1
+        self._priority[pos] = priority
+        self._order[pos] = order
+        self._item[pos] = item
+        self._position[item] = pos
+        self._sift_toward_root(start, pos)
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cdef void _restore(self, Py_ssize_t pos) nogil:
+        """Restore the heap after the key at *pos* has changed."""
+        if pos > 0 and self._less(pos, (pos - 1) >> 1):
+            self._sift_toward_root(0, pos)
+        else:
+            self._sift_toward_leaves(pos)
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cdef void _remove_at(self, Py_ssize_t pos) nogil:
+        self._position[self._item[pos]] = -1
+        self._size -= 1
+        if pos < self._size:
+            self._move(self._size, pos)
+            self._restore(pos)
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cdef inline DTYPE_t _top_priority(self) nogil:
+        return self._priority[0]
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cdef DTYPE_INT_t _pop_item(self, DTYPE_t * priority) nogil:
+        """Remove the top entry, returning its item and priority."""
+        cdef DTYPE_INT_t item = self._item[0]
+
+        priority[0] = self._priority[0]
+        self._remove_at(0)
+        return item
+
+    cdef void _reserve(self, Py_ssize_t n_items) except *:
+        """Make room for items up to *n_items* without further growth."""
+        if n_items > self._position.shape[0]:
+            self._grow_index(n_items)
+        while self._priority.shape[0] < n_items:
+            self._grow_heap()
+
+    cpdef void push(self, DTYPE_INT_t item, double priority) except *:
+        """Schedule *item*, replacing any entry it already has."""
+        if item >= self._position.shape[0]:
+            self._grow_index(item + 1)
+        if self._position[item] < 0 and self._size == self._priority.shape[0]:
+            self._grow_heap()
+        self._push(item, priority)
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cdef void _push(self, DTYPE_INT_t item, DTYPE_t priority) nogil:
+        """Schedule *item*, assuming the queue has room for it."""
+        cdef Py_ssize_t pos = self._position[item]
+
+        if pos < 0:
+            pos = self._size
+            self._size += 1
+            self._item[pos] = item
+            self._position[item] = pos
+        self._priority[pos] = priority
+        self._order[pos] = self._index
         self._index += 1
 
+        self._restore(pos)
+
+    def peek(self):
+        """Return the earliest entry as (priority, index, item)."""
+        assert self._size > 0, 'Q is empty'
+        return (self._priority[0], self._order[0], self._item[0])
+
     def pop(self):
-        assert len(self._queue) > 0, 'Q is empty'
-        return heappop(self._queue)
+        """Remove and return the earliest entry as (priority, index, item)."""
+        assert self._size > 0, 'Q is empty'
+        entry = (self._priority[0], self._order[0], self._item[0])
+        self._remove_at(0)
+        return entry
+
+    cpdef void remove(self, DTYPE_INT_t item):
+        """Remove *item* from the queue, if it is there."""
+        self._remove(item)
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cdef void _remove(self, DTYPE_INT_t item) nogil:
+        if 0 <= item < self._position.shape[0] and self._position[item] >= 0:
+            self._remove_at(self._position[item])
+
+    def remap(self, DTYPE_INT_t [:] new_item, DTYPE_t [:] priority):
+        """Relabel queued items and drop entries that are out of date.
+
+        Each queued item, *i*, becomes *new_item[i]*. Entries whose priority
+        then differs from *priority[new_item[i]]*, or that duplicate an
+        item already seen, are removed. The heap is then rebuilt in place,
+        so the work done is proportional to the length of the queue.
+
+        Parameters
+        ----------
+        new_item : ndarray of int
+            New label for each item.
+        priority : ndarray of float
+            Current priority of each relabeled item.
+        """
+        cdef Py_ssize_t slot
+        cdef Py_ssize_t n_kept = 0
+        cdef DTYPE_INT_t item
+        cdef Py_ssize_t n_items = max(new_item.shape[0], priority.shape[0])
+
+        for slot in range(self._size):
+            self._position[self._item[slot]] = -1
+        if n_items > self._position.shape[0]:
+            self._grow_index(n_items)
+
+        for slot in range(self._size):
+            item = new_item[self._item[slot]]
+            if self._priority[slot] == priority[item] and self._position[item] < 0:
+                self._priority[n_kept] = self._priority[slot]
+                self._order[n_kept] = self._order[slot]
+                self._item[n_kept] = item
+                self._position[item] = n_kept
+                n_kept += 1
+        self._size = n_kept
+
+        for slot in range(self._size // 2 - 1, -1, -1):
+            self._sift_toward_leaves(slot)
 
 
 cdef class Event:
@@ -470,8 +728,97 @@ cpdef push_transitions_to_event_queue_new(int number_of_active_links,
             next_trn_id[i] = this_trn_id
 
         else:
+            priority_queue.remove(i)
             next_update[i] = _NEVER
 
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+cpdef reschedule_transitions(const DTYPE_INT_t [:] links,
+                             const DTYPE_INT_t [:] node_state,
+                             const DTYPE_INT_t [:] node_at_link_tail,
+                             const DTYPE_INT_t [:] node_at_link_head,
+                             const DTYPE_INT8_t [:] link_orientation,
+                             DTYPE_INT_t num_node_states,
+                             DTYPE_INT_t num_node_states_sq,
+                             DTYPE_INT_t [:] link_state,
+                             const DTYPE_INT_t [:] n_trn,
+                             const DTYPE_INT_t [:, :] trn_id,
+                             const DTYPE_t [:] trn_rate,
+                             DTYPE_t [:] next_update,
+                             DTYPE_INT_t [:] next_trn_id,
+                             PriorityQueue priority_queue,
+                             DTYPE_t current_time):
+    """Reset the state of a set of links and schedule their next transitions.
+
+    Each link gets the state given by its orientation and the states of its
+    two nodes. This gives the same result as calling update_link_state_new
+    for each link in turn, but the waiting times of all of the links are
+    drawn from numpy's global generator in a single call (in the same order
+    as the link-by-link calls would draw them), and the new events are
+    pushed onto the queue in one batch.
+
+    Parameters
+    ----------
+    links : ndarray of int
+        IDs of the links to update.
+    current_time : float
+        Current time in simulation.
+    (see celllab_cts.py for other parameters)
+    """
+    cdef Py_ssize_t n_links = links.shape[0]
+    cdef Py_ssize_t n_draws = 0
+    cdef Py_ssize_t i, j, k
+    cdef DTYPE_INT_t link, state, this_trn_id
+    cdef DTYPE_t next_time
+    cdef DTYPE_INT_t [:] new_state = np.empty(n_links, dtype=DTYPE_INT)
+    cdef DTYPE_t [:] scale
+    cdef DTYPE_t [:] wait
+
+    for i in range(n_links):
+        link = links[i]
+        new_state[i] = (
+            link_orientation[link] * num_node_states_sq
+            + node_state[node_at_link_tail[link]] * num_node_states
+            + node_state[node_at_link_head[link]]
+        )
+        n_draws += n_trn[new_state[i]]
+
+    scale = np.empty(n_draws, dtype=DTYPE)
+    k = 0
+    for i in range(n_links):
+        state = new_state[i]
+        for j in range(n_trn[state]):
+            scale[k] = 1.0 / trn_rate[trn_id[state, j]]
+            k += 1
+    wait = np.random.exponential(np.asarray(scale))
+
+    priority_queue._reserve(next_update.shape[0])
+
+    with nogil:
+        k = 0
+        for i in range(n_links):
+            link = links[i]
+            state = new_state[i]
+            link_state[link] = state
+            if n_trn[state] > 0:
+                next_time = _NEVER
+                this_trn_id = -1
+                for j in range(n_trn[state]):
+                    if wait[k] < next_time:
+                        next_time = wait[k]
+                        this_trn_id = trn_id[state, j]
+                    k += 1
+                next_update[link] = next_time + current_time
+                next_trn_id[link] = this_trn_id
+                priority_queue._push(link, next_update[link])
+            else:
+                priority_queue._remove(link)
+                next_update[link] = _NEVER
+                next_trn_id[link] = -1
+
+
 @cython.boundscheck(True)
 @cython.wraparound(False)
 cdef void update_link_state(DTYPE_INT_t link, DTYPE_INT_t new_link_state, 
@@ -588,6 +935,7 @@ cdef void update_link_state_new(DTYPE_INT_t link, DTYPE_INT_t new_link_state,
         next_update[link] = event_time
         next_trn_id[link] = this_trn_id
     else:
+        priority_queue.remove(link)
         next_update[link] = _NEVER
         next_trn_id[link] = -1
 
@@ -992,25 +1340,24 @@ cpdef double run_cts_new(double run_to, double current_time,
     (see celllab_cts.py for other parameters)
     """
     import sys
-    cdef double ev_time
-    cdef int ev_idx
-    cdef int ev_link
+    cdef DTYPE_t ev_time
+    cdef DTYPE_INT_t ev_link
 
     # Continue until we've run out of either time or events
-    while current_time < run_to and priority_queue._queue:
+    while current_time < run_to and priority_queue._size > 0:
 
         if _DEBUG:
             print('current time = ', current_time)
 
         # Is there an event scheduled to occur within this run?
-        if priority_queue._queue[0][0] <= run_to:
+        if priority_queue._top_priority() <= run_to:
 
             # If so, pick the next transition event from the event queue
-            (ev_time, ev_idx, ev_link) = priority_queue.pop()
+            ev_link = priority_queue._pop_item(&ev_time)
 
             if _DEBUG:
                 print('event:', ev_time, ev_link, trn_to[next_trn_id[ev_link]])
-                print('pq top is now:', priority_queue._queue[0])
+                print('pq top is now:', priority_queue._queue[:1])
 
             # ... and execute the transition
             do_transition_new(ev_link, ev_time, priority_queue, next_update,
@@ -1052,6 +1399,365 @@ cpdef double run_cts_new(double run_to, double current_time,
     return current_time
 
 
+cdef np.uint64_t _GOLDEN_GAMMA = 0x9E3779B97F4A7C15
+
+
+cdef inline np.uint64_t _splitmix64(np.uint64_t * x) nogil:
+    """Advance the splitmix64 generator at *x* and return its next value."""
+    cdef np.uint64_t z
+
+    x[0] += _GOLDEN_GAMMA
+    z = x[0]
+    z = (z ^ (z >> 30)) * <np.uint64_t>0xBF58476D1CE4E5B9
+    z = (z ^ (z >> 27)) * <np.uint64_t>0x94D049BB133111EB
+    return z ^ (z >> 31)
+
+
+def seed_generator(seed, spawn_key=()):
+    """Create the state of the random number generator of run_cts_nogil.
+
+    The state is filled from a splitmix64 generator seeded with *seed*,
+    as recommended for xoshiro256**. Each entry of *spawn_key* is mixed
+    into that generator to give an independent stream.
+
+    Parameters
+    ----------
+    seed : int or None
+        Seed for the generator. If None, draw a seed from numpy's global
+        random number generator.
+    spawn_key : tuple of int, optional
+        Key of an independent stream derived from *seed*.
+
+    Returns
+    -------
+    ndarray of uint64, shape (4, )
+        Generator state, which is advanced in place by run_cts_nogil.
+
+    Examples
+    --------
+    >>> from landlab.ca.cfuncs import seed_generator
+    >>> state = seed_generator(1945)
+    >>> state.shape, state.dtype
+    ((4,), dtype('uint64'))
+    >>> (seed_generator(1945) == state).all()
+    True
+    >>> (seed_generator(1945, spawn_key=(1, )) == state).all()
+    False
+    """
+    cdef np.uint64_t x
+    cdef int i
+
+    if seed is None:
+        seed = np.random.randint(2 ** 31)
+    x = seed & 0xFFFFFFFFFFFFFFFF
+    for key in spawn_key:
+        x = _splitmix64(&x) ^ <np.uint64_t>(key & 0xFFFFFFFFFFFFFFFF)
+
+    state = np.empty(4, dtype=np.uint64)
+    for i in range(4):
+        state[i] = _splitmix64(&x)
+    return state
+
+
+cdef inline np.uint64_t _rotl(np.uint64_t x, int k) nogil:
+    return (x << k) | (x >> (64 - k))
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef inline double _uniform(np.uint64_t [:] s) nogil:
+    """Draw from [0, 1) with the xoshiro256** generator."""
+    cdef np.uint64_t result = _rotl(s[1] * 5, 7) * 9
+    cdef np.uint64_t t = s[1] << 17
+
+    s[2] ^= s[0]
+    s[3] ^= s[1]
+    s[1] ^= s[2]
+    s[0] ^= s[3]
+    s[2] ^= t
+    s[3] = _rotl(s[3], 45)
+
+    return (result >> 11) * (1.0 / 9007199254740992.0)
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+cdef DTYPE_t _next_event_nogil(DTYPE_INT_t current_state,
+                               DTYPE_t current_time,
+                               const DTYPE_INT_t [:] n_trn,
+                               const DTYPE_INT_t [:, :] trn_id,
+                               const DTYPE_t [:] trn_rate,
+                               np.uint64_t [:] rng_state,
+                               DTYPE_INT_t * next_trn) nogil:
+    """Choose the time and ID of the next transition out of a link state.
+
+    Same as get_next_event_new, but draws its waiting times from
+    *rng_state* rather than from numpy's global generator.
+    """
+    cdef DTYPE_t next_time = _NEVER
+    cdef DTYPE_t this_next
+    cdef DTYPE_INT_t i
+
+    next_trn[0] = -1
+    for i in range(n_trn[current_state]):
+        this_next = -log(1.0 - _uniform(rng_state)) / trn_rate[trn_id[current_state, i]]
+        if this_next < next_time:
+            next_time = this_next
+            next_trn[0] = trn_id[current_state, i]
+
+    return next_time + current_time
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef void _update_link_state_nogil(DTYPE_INT_t link,
+                                   DTYPE_INT_t new_link_state,
+                                   DTYPE_t current_time,
+                                   const DTYPE_INT8_t [:] bnd_lnk,
+                                   const DTYPE_INT_t [:] node_state,
+                                   const DTYPE_INT_t [:] node_at_link_tail,
+                                   const DTYPE_INT_t [:] node_at_link_head,
+                                   const DTYPE_INT8_t [:] link_orientation,
+                                   DTYPE_INT_t num_node_states,
+                                   DTYPE_INT_t num_node_states_sq,
+                                   DTYPE_INT_t [:] link_state,
+                                   const DTYPE_INT_t [:] n_trn,
+                                   PriorityQueue priority_queue,
+                                   DTYPE_t [:] next_update,
+                                   DTYPE_INT_t [:] next_trn_id,
+                                   const DTYPE_INT_t [:, :] trn_id,
+                                   const DTYPE_t [:] trn_rate,
+                                   np.uint64_t [:] rng_state) nogil:
+    """Set the state of a link and schedule its next transition.
+
+    Same as update_link_state_new, without the GIL.
+    """
+    cdef DTYPE_INT_t this_trn_id
+    cdef DTYPE_t event_time
+
+    if bnd_lnk[link]:
+        new_link_state = (
+            link_orientation[link] * num_node_states_sq
+            + node_state[node_at_link_tail[link]] * num_node_states
+            + node_state[node_at_link_head[link]]
+        )
+
+    link_state[link] = new_link_state
+    if n_trn[new_link_state] > 0:
+        event_time = _next_event_nogil(new_link_state, current_time, n_trn,
+                                       trn_id, trn_rate, rng_state,
+                                       &this_trn_id)
+        priority_queue._push(link, event_time)
+        next_update[link] = event_time
+        next_trn_id[link] = this_trn_id
+    else:
+        priority_queue._remove(link)
+        next_update[link] = _NEVER
+        next_trn_id[link] = -1
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cpdef push_transitions_to_event_queue_nogil(const DTYPE_INT_t [:] active_links,
+                                            const DTYPE_INT_t [:] n_trn,
+                                            const DTYPE_INT_t [:] link_state,
+                                            const DTYPE_INT_t [:, :] trn_id,
+                                            const DTYPE_t [:] trn_rate,
+                                            DTYPE_t [:] next_update,
+                                            DTYPE_INT_t [:] next_trn_id,
+                                            PriorityQueue priority_queue,
+                                            np.uint64_t [:] rng_state,
+                                            DTYPE_t current_time=0.0):
+    """Schedule a transition at each active link, without the GIL.
+
+    Same as push_transitions_to_event_queue_new, but draws transition times
+    from *rng_state* (see seed_generator), starting from *current_time*.
+    """
+    cdef Py_ssize_t j
+    cdef DTYPE_INT_t link, this_trn_id
+
+    priority_queue._reserve(next_update.shape[0])
+
+    with nogil:
+        for j in range(active_links.shape[0]):
+            link = active_links[j]
+            if n_trn[link_state[link]] > 0:
+                next_update[link] = _next_event_nogil(
+                    link_state[link], current_time, n_trn, trn_id, trn_rate,
+                    rng_state,
+                    &this_trn_id)
+                next_trn_id[link] = this_trn_id
+                priority_queue._push(link, next_update[link])
+            else:
+                priority_queue._remove(link)
+                next_update[link] = _NEVER
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef void _update_links_at_node_nogil(DTYPE_INT_t node,
+                                      DTYPE_INT_t event_link,
+                                      DTYPE_t current_time,
+                                      const DTYPE_INT_t [:, :] links_at_node,
+                                      const DTYPE_INT8_t [:, :] active_link_dirs_at_node,
+                                      const DTYPE_INT8_t [:] bnd_lnk,
+                                      const DTYPE_INT_t [:] node_state,
+                                      const DTYPE_INT_t [:] node_at_link_tail,
+                                      const DTYPE_INT_t [:] node_at_link_head,
+                                      const DTYPE_INT8_t [:] link_orientation,
+                                      DTYPE_INT_t num_node_states,
+                                      DTYPE_INT_t num_node_states_sq,
+                                      DTYPE_INT_t [:] link_state,
+                                      const DTYPE_INT_t [:] n_trn,
+                                      PriorityQueue priority_queue,
+                                      DTYPE_t [:] next_update,
+                                      DTYPE_INT_t [:] next_trn_id,
+                                      const DTYPE_INT_t [:, :] trn_id,
+                                      const DTYPE_t [:] trn_rate,
+                                      np.uint64_t [:] rng_state) nogil:
+    """Update the states of the active links at a node, except *event_link*."""
+    cdef DTYPE_INT_t i, link, new_link_state
+
+    for i in range(links_at_node.shape[1]):
+        link = links_at_node[node, i]
+        if active_link_dirs_at_node[node, i] != 0 and link != event_link:
+            new_link_state = (
+                link_orientation[link] * num_node_states_sq
+                + node_state[node_at_link_tail[link]] * num_node_states
+                + node_state[node_at_link_head[link]]
+            )
+            _update_link_state_nogil(
+                link, new_link_state, current_time, bnd_lnk, node_state,
+                node_at_link_tail, node_at_link_head, link_orientation,
+                num_node_states, num_node_states_sq, link_state, n_trn,
+                priority_queue, next_update, next_trn_id, trn_id, trn_rate,
+                rng_state)
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+cpdef double run_cts_nogil(double run_to, double current_time,
+                           PriorityQueue priority_queue,
+                           DTYPE_t [:] next_update,
+                           const DTYPE_INT_t [:] node_at_link_tail,
+                           const DTYPE_INT_t [:] node_at_link_head,
+                           DTYPE_INT_t [:] node_state,
+                           DTYPE_INT_t [:] next_trn_id,
+                           const DTYPE_INT_t [:] trn_to,
+                           const DTYPE_UINT8_t [:] status_at_node,
+                           DTYPE_INT_t num_node_states,
+                           DTYPE_INT_t num_node_states_sq,
+                           const DTYPE_INT8_t [:] bnd_lnk,
+                           const DTYPE_INT8_t [:] link_orientation,
+                           DTYPE_INT_t [:] link_state,
+                           const DTYPE_INT_t [:] n_trn,
+                           const DTYPE_INT_t [:, :] trn_id,
+                           const DTYPE_t [:] trn_rate,
+                           const DTYPE_INT_t [:, :] links_at_node,
+                           const DTYPE_INT8_t [:, :] active_link_dirs_at_node,
+                           const DTYPE_INT8_t [:] trn_propswap,
+                           DTYPE_INT_t [:] propid,
+                           DTYPE_t [:] prop_data,
+                           DTYPE_t prop_reset_value,
+                           np.uint64_t [:] rng_state):
+    """Run the model forward for a specified period of time, without the GIL.
+
+    Same as run_cts_new except that all model state is held in typed arrays,
+    property updates are limited to the swaps given by *trn_propswap*, and
+    waiting times are drawn from *rng_state* (see seed_generator) rather than
+    from numpy's global generator. Models that each have their own arrays and
+    generator state can be run on separate threads at the same time.
+
+    Parameters
+    ----------
+    run_to : float
+        Time to run to, starting from *current_time*
+    prop_data : ndarray of float
+        Property values, indexed by *propid*.
+    prop_reset_value : float
+        Property value given to cells that swap onto a boundary node.
+    rng_state : ndarray of uint64, shape (4, )
+        State of the random number generator. Updated in place.
+    (see celllab_cts.py for other parameters)
+
+    Returns
+    -------
+    float
+        Time reached by the run.
+    """
+    cdef DTYPE_t ev_time
+    cdef DTYPE_INT_t ev_link
+    cdef DTYPE_INT_t tail_node, head_node
+    cdef DTYPE_INT_t old_tail_node_state, old_head_node_state
+    cdef DTYPE_INT_t this_trn_id, this_trn_to
+    cdef DTYPE_INT_t tmp
+
+    priority_queue._reserve(next_update.shape[0])
+
+    with nogil:
+        while current_time < run_to and priority_queue._size > 0:
+
+            # If no event is scheduled within this run, we are done
+            if priority_queue._top_priority() > run_to:
+                current_time = run_to
+                break
+
+            ev_link = priority_queue._pop_item(&ev_time)
+            current_time = ev_time
+            if ev_time != next_update[ev_link]:
+                continue
+
+            tail_node = node_at_link_tail[ev_link]
+            head_node = node_at_link_head[ev_link]
+            old_tail_node_state = node_state[tail_node]
+            old_head_node_state = node_state[head_node]
+
+            this_trn_id = next_trn_id[ev_link]
+            this_trn_to = trn_to[this_trn_id]
+
+            if status_at_node[tail_node] == _CORE:
+                node_state[tail_node] = (this_trn_to / num_node_states) % num_node_states
+            if status_at_node[head_node] == _CORE:
+                node_state[head_node] = this_trn_to % num_node_states
+
+            _update_link_state_nogil(
+                ev_link, this_trn_to, ev_time, bnd_lnk, node_state,
+                node_at_link_tail, node_at_link_head, link_orientation,
+                num_node_states, num_node_states_sq, link_state, n_trn,
+                priority_queue, next_update, next_trn_id, trn_id, trn_rate,
+                rng_state)
+
+            if node_state[tail_node] != old_tail_node_state:
+                _update_links_at_node_nogil(
+                    tail_node, ev_link, ev_time, links_at_node,
+                    active_link_dirs_at_node, bnd_lnk, node_state,
+                    node_at_link_tail, node_at_link_head, link_orientation,
+                    num_node_states, num_node_states_sq, link_state, n_trn,
+                    priority_queue, next_update, next_trn_id, trn_id,
+                    trn_rate, rng_state)
+            if node_state[head_node] != old_head_node_state:
+                _update_links_at_node_nogil(
+                    head_node, ev_link, ev_time, links_at_node,
+                    active_link_dirs_at_node, bnd_lnk, node_state,
+                    node_at_link_tail, node_at_link_head, link_orientation,
+                    num_node_states, num_node_states_sq, link_state, n_trn,
+                    priority_queue, next_update, next_trn_id, trn_id,
+                    trn_rate, rng_state)
+
+            if trn_propswap[this_trn_id]:
+                tmp = propid[tail_node]
+                propid[tail_node] = propid[head_node]
+                propid[head_node] = tmp
+                if status_at_node[tail_node] != _CORE:
+                    prop_data[propid[tail_node]] = prop_reset_value
+                if status_at_node[head_node] != _CORE:
+                    prop_data[propid[head_node]] = prop_reset_value
+
+    return current_time
+
+
 cpdef double run_cts(double run_to, double current_time,
                      char plot_each_transition,
                      object plotter,
@@ -0,0 +1,167 @@
+"""Run an ensemble of stochastic realizations of a CellLab-CTS model.
+
+A CTSEnsemble is built from one CellLab-CTS model (a RasterCTS, HexCTS,
+OrientedRasterCTS or OrientedHexCTS). The grid and the transition tables of
+that model are set up once and shared by every realization; each
+realization gets its own copy of the node, link and property state, its own
+event queue, and its own random number stream. Realizations are run with
+the nogil engine of CellLabCTSModel.run, so they advance in parallel on a
+pool of threads.
+
+Examples
+--------
+>>> import numpy as np
+>>> from landlab import HexModelGrid
+>>> from landlab.ca.celllab_cts import Transition
+>>> from landlab.ca.oriented_hex_cts import OrientedHexCTS
+>>> from landlab.ca.ensemble import CTSEnsemble
+
+>>> grid = HexModelGrid(8, 6, 1.0, orientation="vertical", shape="rect")
+>>> nsd = {0: "fluid", 1: "grain"}
+>>> xnlist = [
+...     Transition((1, 0, 0), (0, 1, 0), 10.0, "falling"),
+...     Transition((1, 0, 1), (0, 1, 1), 1.0, "slide left"),
+...     Transition((1, 0, 2), (0, 1, 2), 1.0, "slide right"),
+... ]
+>>> nsg = (grid.node_y > 4.0).astype(int)
+>>> ca = OrientedHexCTS(grid, nsd, xnlist, nsg)
+
+>>> ensemble = CTSEnsemble(ca, 10, seed=1945)
+>>> len(ensemble)
+10
+>>> node_states = ensemble.run([0.5, 1.0, 2.0])
+>>> node_states.shape
+(10, 3, 48)
+
+Each realization follows its own path from the same starting state.
+
+>>> np.all(ensemble.realizations[0].node_state == nsg)
+False
+>>> len(np.unique(node_states[:, 0], axis=0)) > 1
+True
+"""
+import copy
+import multiprocessing
+from multiprocessing.pool import ThreadPool
+
+import numpy as np
+
+from .cfuncs import (
+    PriorityQueue,
+    push_transitions_to_event_queue_nogil,
+    seed_generator,
+)
+
+
+class CTSEnsemble(object):
+
+    """Ensemble of realizations of a CellLab-CTS model.
+
+    Parameters
+    ----------
+    model : CellLabCTSModel
+        Model from which the realizations start. Its grid and transition
+        data are shared, not copied.
+    n_realizations : int
+        Number of realizations.
+    seed : int, optional
+        Seed for random number generation. Realization *i* draws from the
+        independent stream *i* of this seed.
+    n_threads : int, optional
+        Number of realizations to run at once. The default is the number of
+        CPUs.
+    """
+
+    def __init__(self, model, n_realizations, seed=0, n_threads=None):
+        """Create the realizations and schedule their first transitions."""
+        self._model = model
+        self._n_threads = n_threads or multiprocessing.cpu_count()
+        self._realizations = [
+            self._new_realization(model, seed, index)
+            for index in range(n_realizations)
+        ]
+
+    def __len__(self):
+        return len(self._realizations)
+
+    @property
+    def realizations(self):
+        """List of the models of each realization."""
+        return self._realizations
+
+    @staticmethod
+    def _new_realization(model, seed, index):
+        """Copy the state of *model* into a new, independently seeded model."""
+        ca = copy.copy(model)
+
+        ca.node_state = model.node_state.copy()
+        ca.link_state = model.link_state.copy()
+        ca.next_update = model.next_update.copy()
+        ca.next_trn_id = model.next_trn_id.copy()
+        ca.propid = model.propid.copy()
+        ca.prop_data = copy.copy(model.prop_data)
+        ca.priority_queue = PriorityQueue(model.grid.number_of_links)
+        ca._rng_state = seed_generator(seed, spawn_key=(index,))
+
+        push_transitions_to_event_queue_nogil(
+            model.grid.active_links,
+            ca.n_trn,
+            ca.link_state,
+            ca.trn_id,
+            ca.trn_rate,
+            ca.next_update,
+            ca.next_trn_id,
+            ca.priority_queue,
+            ca._rng_state,
+            current_time=ca.current_time,
+        )
+
+        return ca
+
+    def run(self, output_times, path=None):
+        """Run every realization, recording node states at the output times.
+
+        Parameters
+        ----------
+        output_times : array_like of float
+            Increasing times at which to record node states. Realizations
+            run to the last of these.
+        path : str, optional
+            If given, write node states to this *.npy* file as each
+            realization reaches them, rather than holding them in memory.
+
+        Returns
+        -------
+        ndarray of int, shape (n_realizations, n_output_times, n_nodes)
+            Node states of each realization at each output time. This is a
+            memory map of *path*, if given.
+        """
+        output_times = np.asarray(output_times, dtype=float).reshape((-1,))
+        if np.any(np.diff(output_times) < 0.0):
+            raise ValueError("output_times must be increasing")
+
+        shape = (len(self), len(output_times), self._model.grid.number_of_nodes)
+        dtype = self._model.node_state.dtype
+        if path is None:
+            node_states = np.empty(shape, dtype=dtype)
+        else:
+            node_states = np.lib.format.open_memmap(
+                path, mode="w+", dtype=dtype, shape=shape
+            )
+
+        def run_realization(index):
+            ca = self._realizations[index]
+            for n, time in enumerate(output_times):
+                ca.run(time, nogil=True)
+                node_states[index, n] = ca.node_state
+            if path is not None:
+                node_states.flush()
+
+        pool = ThreadPool(self._n_threads)
+        try:
+            pool.map(run_realization, range(len(self)), chunksize=1)
+        finally:
+            pool.close()
+            pool.join()
+
+        return node_states
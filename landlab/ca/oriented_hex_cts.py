@@ -39,6 +39,8 @@ class OrientedHexCTS(CellLabCTSModel):
     prop_reset_value : number or object, optional
         Default or initial value for a node/cell property (e.g., 0.0).
         Must be same type as *prop_data*.
+    seed : int, optional
+        Seed for random number generation.
 
     Examples
     --------
@@ -62,6 +64,7 @@ class OrientedHexCTS(CellLabCTSModel):
         initial_node_states,
         prop_data=None,
         prop_reset_value=None,
+        seed=0,
     ):
         """Initialize a OrientedHexCTS.
 
@@ -84,6 +87,8 @@ class OrientedHexCTS(CellLabCTSModel):
         prop_reset_value : number or object, optional
             Default or initial value for a node/cell property (e.g., 0.0).
             Must be same type as *prop_data*.
+        seed : int, optional
+            Seed for random number generation.
         """
 
         # Make sure caller has sent the right grid type
@@ -108,6 +113,7 @@ class OrientedHexCTS(CellLabCTSModel):
             initial_node_states,
             prop_data,
             prop_reset_value,
+            seed=seed,
         )
 
     def setup_array_of_orientation_codes(self):
@@ -44,6 +44,8 @@ class OrientedRasterCTS(CellLabCTSModel):
     prop_reset_value : number or object, optional
         Default or initial value for a node/cell property (e.g., 0.0).
         Must be same type as *prop_data*.
+    seed : int, optional
+        Seed for random number generation.
 
     Examples
     --------
@@ -67,6 +69,7 @@ class OrientedRasterCTS(CellLabCTSModel):
         initial_node_states,
         prop_data=None,
         prop_reset_value=None,
+        seed=0,
     ):
         """
         RasterCTS constructor: sets number of orientations to 2 and calls
@@ -88,6 +91,8 @@ class OrientedRasterCTS(CellLabCTSModel):
         prop_reset_value : number or object, optional
             Default or initial value for a node/cell property (e.g., 0.0).
             Must be same type as *prop_data*.
+        seed : int, optional
+            Seed for random number generation.
         """
 
         if _DEBUG:
@@ -110,6 +115,7 @@ class OrientedRasterCTS(CellLabCTSModel):
             initial_node_states,
             prop_data,
             prop_reset_value,
+            seed=seed,
         )
 
         if _DEBUG:
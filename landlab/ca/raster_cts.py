@@ -37,6 +37,8 @@ class RasterCTS(CellLabCTSModel):
     prop_reset_value : number or object, optional
         Default or initial value for a node/cell property (e.g., 0.0).
         Must be same type as *prop_data*.
+    seed : int, optional
+        Seed for random number generation.
 
     Examples
     --------
@@ -60,6 +62,7 @@ class RasterCTS(CellLabCTSModel):
         initial_node_states,
         prop_data=None,
         prop_reset_value=None,
+        seed=0,
     ):
         """
         RasterLCA constructor: sets number of orientations to 1 and calls
@@ -81,6 +84,8 @@ class RasterCTS(CellLabCTSModel):
         prop_reset_value : number or object, optional
             Default or initial value for a node/cell property (e.g., 0.0).
             Must be same type as *prop_data*.
+        seed : int, optional
+            Seed for random number generation.
         """
         # Make sure caller has sent the right grid type
         if not isinstance(model_grid, RasterModelGrid):
@@ -99,6 +104,7 @@ class RasterCTS(CellLabCTSModel):
             initial_node_states,
             prop_data,
             prop_reset_value,
+            seed=seed,
         )
 
 
@@ -10,6 +10,7 @@ Created on Thu Jul  9 08:20:06 2015
 from heapq import heappop, heappush
 
 import numpy as np
+import pytest
 from numpy.testing import assert_array_equal
 
 from landlab import HexModelGrid, RasterModelGrid
@@ -17,6 +18,7 @@ from landlab import HexModelGrid, RasterModelGrid
 # For dev
 from landlab.ca.celllab_cts import Transition  # X, Event
 from landlab.ca.celllab_cts import _RUN_NEW
+from landlab.ca.cfuncs import reschedule_transitions
 from landlab.ca.hex_cts import HexCTS
 from landlab.ca.oriented_hex_cts import OrientedHexCTS
 from landlab.ca.oriented_raster_cts import OrientedRasterCTS
@@ -236,6 +238,73 @@ def test_priority_queue():
     assert item == 5, "incorrect item in PQ test"
 
 
+def test_priority_queue_reschedule_and_remove():
+    """Test that an item is held in the priority queue at most once."""
+    from ..cfuncs import PriorityQueue
+
+    pq = PriorityQueue(2)
+    for item, priority in enumerate([3.0, 1.0, 4.0, 1.0, 5.0, 9.0]):
+        pq.push(item, priority)
+    assert len(pq) == 6
+
+    pq.push(5, 0.5)
+    pq.push(1, 6.0)
+    pq.remove(2)
+    pq.remove(2)
+    assert len(pq) == 5
+    assert 2 not in pq
+
+    assert [pq.pop()[2] for _ in range(len(pq))] == [5, 3, 0, 4, 1]
+
+
+def test_priority_queue_matches_heapq():
+    """Test the priority queue pops events in the same order as a heapq."""
+    from ..cfuncs import PriorityQueue
+
+    rng = np.random.RandomState(1945)
+    heap, scheduled = [], {}
+    pq = PriorityQueue()
+    for index in range(2000):
+        item = rng.randint(50)
+        if rng.rand() < 0.2:
+            scheduled.pop(item, None)
+            pq.remove(item)
+        else:
+            priority = float(rng.randint(100))
+            heappush(heap, (priority, index, item))
+            scheduled[item] = index
+            pq.push(item, priority)
+
+    expected = []
+    while heap:
+        (priority, index, item) = heappop(heap)
+        if scheduled.get(item) == index:
+            expected.append(priority)
+
+    assert len(pq) == len(expected)
+    assert [pq.pop()[0] for _ in range(len(expected))] == expected
+
+
+def test_priority_queue_has_no_stale_events():
+    """Test the event queue holds only events that are still scheduled."""
+    grid = RasterModelGrid((6, 7))
+    nsd = {0: "zero", 1: "one"}
+    trn_list = []
+    trn_list.append(Transition((0, 1, 0), (1, 0, 0), 1.0))
+    trn_list.append(Transition((1, 0, 0), (0, 1, 0), 2.0))
+    trn_list.append(Transition((0, 1, 1), (1, 0, 1), 3.0))
+    trn_list.append(Transition((0, 1, 1), (1, 1, 1), 4.0))
+    ins = np.arange(42) % 2
+    cts = OrientedRasterCTS(grid, nsd, trn_list, ins)
+    cts.run(5.0)
+
+    events = cts.priority_queue._queue
+    assert len(events) <= grid.number_of_active_links
+    assert len({link for (_, _, link) in events}) == len(events)
+    for (time, _, link) in events:
+        assert time == cts.next_update[link]
+
+
 def test_run_oriented_raster():
     """Test running with a small grid, 2 states, 4 transition types."""
 
@@ -276,6 +345,148 @@ def test_run_oriented_raster():
     assert_array_equal(cts.node_state, [0, 1, 0, 1, 0, 1, 0, 0, 1, 1, 0, 1, 0, 1, 0])
 
 
+def test_reschedule_transitions_matches_link_by_link_updates():
+    """Test rescheduling in a batch is the same as one link at a time."""
+    nsd = {0: "zero", 1: "one"}
+    trn_list = []
+    trn_list.append(Transition((0, 1, 0), (1, 0, 0), 1.0))
+    trn_list.append(Transition((1, 0, 0), (0, 1, 0), 2.0))
+    trn_list.append(Transition((0, 1, 1), (1, 0, 1), 3.0))
+    trn_list.append(Transition((0, 1, 1), (1, 1, 1), 4.0))
+    ins = np.arange(42) % 2
+
+    np.random.seed(1)
+    by_link = OrientedRasterCTS(RasterModelGrid((6, 7)), nsd, trn_list, ins.copy())
+    np.random.seed(1)
+    batched = OrientedRasterCTS(RasterModelGrid((6, 7)), nsd, trn_list, ins.copy())
+    grid = batched.grid
+
+    links = grid.active_links[::2]
+    for cts in (by_link, batched):
+        cts.node_state[:] = np.arange(42) % 3 == 0
+
+    np.random.seed(2)
+    for link in links:
+        state = (
+            by_link.link_orientation[link] * by_link.num_node_states_sq
+            + by_link.node_state[grid.node_at_link_tail[link]]
+            * by_link.num_node_states
+            + by_link.node_state[grid.node_at_link_head[link]]
+        )
+        by_link.update_link_state_new(link, state, 1.0)
+
+    np.random.seed(2)
+    reschedule_transitions(
+        links,
+        np.asarray(batched.node_state, dtype=int),
+        grid.node_at_link_tail,
+        grid.node_at_link_head,
+        batched.link_orientation,
+        batched.num_node_states,
+        batched.num_node_states_sq,
+        batched.link_state,
+        batched.n_trn,
+        batched.trn_id,
+        batched.trn_rate,
+        batched.next_update,
+        batched.next_trn_id,
+        batched.priority_queue,
+        1.0,
+    )
+
+    assert_array_equal(batched.link_state, by_link.link_state)
+    assert_array_equal(batched.next_trn_id, by_link.next_trn_id)
+    assert_array_equal(batched.next_update, by_link.next_update)
+    assert sorted(batched.priority_queue._queue) == sorted(
+        by_link.priority_queue._queue
+    )
+
+
+def _make_nogil_model(seed=0, prop_update_fn=None):
+    grid = HexModelGrid(12, 10, 1.0, orientation="vertical", shape="rect")
+    nsd = {0: "fluid", 1: "grain"}
+    trn_list = []
+    trn_list.append(Transition((1, 0, 0), (0, 1, 0), 5.0, "fall", True))
+    trn_list.append(Transition((1, 0, 1), (0, 1, 1), 1.0, "left", True))
+    trn_list.append(Transition((1, 0, 2), (0, 1, 2), 1.0, "right", True))
+    trn_list.append(
+        Transition((0, 1, 1), (1, 0, 1), 0.5, "up-left", True, prop_update_fn)
+    )
+    ins = (np.arange(grid.number_of_nodes) % 3 == 0).astype(int)
+    return OrientedHexCTS(
+        grid, nsd, trn_list, ins, np.arange(grid.number_of_nodes) * 1.0, -1.0, seed
+    )
+
+
+def test_run_nogil_is_reproducible():
+    """Test the nogil engine gives the same run for the same seed."""
+    cts1, cts2, cts3 = _make_nogil_model(), _make_nogil_model(), _make_nogil_model(1)
+    for cts in (cts1, cts2, cts3):
+        cts.run(1.0, nogil=True)
+        cts.run(2.5, nogil=True)
+        assert cts.current_time == 2.5
+
+    assert_array_equal(cts1.node_state, cts2.node_state)
+    assert_array_equal(cts1.propid, cts2.propid)
+    assert not np.all(cts1.node_state == cts3.node_state)
+
+
+def test_run_nogil_keeps_model_consistent():
+    """Test link states, events and properties after a nogil run."""
+    cts = _make_nogil_model()
+    grid = cts.grid
+    boundary_state = cts.node_state[grid.boundary_nodes].copy()
+    cts.run(2.0, nogil=True)
+
+    assert_array_equal(cts.node_state[grid.boundary_nodes], boundary_state)
+    assert_array_equal(np.sort(cts.propid), np.arange(grid.number_of_nodes))
+
+    link_state = (
+        cts.link_orientation * cts.num_node_states_sq
+        + cts.node_state[grid.node_at_link_tail] * cts.num_node_states
+        + cts.node_state[grid.node_at_link_head]
+    )
+    assert_array_equal(
+        cts.link_state[grid.active_links], link_state[grid.active_links]
+    )
+    for (time, _, link) in cts.priority_queue._queue:
+        assert time == cts.next_update[link]
+        assert time > cts.current_time
+
+
+def test_run_nogil_on_threads():
+    """Test models run on threads at once give the same results as in turn."""
+    from multiprocessing.pool import ThreadPool
+
+    expected = []
+    for seed in range(4):
+        cts = _make_nogil_model(seed)
+        cts.run(3.0, nogil=True)
+        expected.append(cts.node_state.copy())
+
+    models = [_make_nogil_model(seed) for seed in range(4)]
+    pool = ThreadPool(4)
+    try:
+        pool.map(lambda cts: cts.run(3.0, nogil=True), models)
+    finally:
+        pool.close()
+        pool.join()
+
+    for cts, node_state in zip(models, expected):
+        assert_array_equal(cts.node_state, node_state)
+
+
+def test_run_nogil_with_callback():
+    """Test the nogil engine refuses transitions with a callback."""
+    cts = _make_nogil_model(prop_update_fn=callback_function)
+    with pytest.raises(ValueError):
+        cts.run(1.0, nogil=True)
+
+    cts = _make_nogil_model()
+    with pytest.raises(ValueError):
+        cts.run(1.0, plot_each_transition=True, nogil=True)
+
+
 def test_grain_hill_model():
     """Run a lattice-grain-based hillslope evolution model."""
     from .grain_hill import GrainHill
@@ -319,6 +530,27 @@ def test_grain_hill_model():
     )
 
 
+def test_event_queue_stays_bounded_with_uplift():
+    """Test the event queue doesn't grow with the number of uplift events."""
+    from .grain_hill import GrainHill
+
+    grain_hill_model = GrainHill(
+        (10, 10),
+        report_interval=1.0e5,
+        run_duration=40.0,
+        output_interval=1.0e5,
+        uplift_interval=1.0,
+        show_plots=False,
+    )
+    grain_hill_model.run()
+
+    n_links = grain_hill_model.grid.number_of_links
+    priority_queue = grain_hill_model.ca.priority_queue
+    assert max(priority_queue._capacity) <= 2 * n_links
+    for (time, _, link) in priority_queue._queue:
+        assert time == grain_hill_model.ca.next_update[link]
+
+
 def test_setup_transition_data():
     """Test the CellLabCTSModel setup_transition_data method."""
     grid = RasterModelGrid((3, 4))
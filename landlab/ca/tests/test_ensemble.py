@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+from numpy.testing import assert_array_equal
+
+from landlab import HexModelGrid
+from landlab.ca.celllab_cts import Transition
+from landlab.ca.ensemble import CTSEnsemble
+from landlab.ca.oriented_hex_cts import OrientedHexCTS
+
+
+def _grain_model():
+    grid = HexModelGrid(10, 8, 1.0, orientation="vertical", shape="rect")
+    nsd = {0: "fluid", 1: "grain"}
+    xnlist = []
+    xnlist.append(Transition((1, 0, 0), (0, 1, 0), 10.0, "falling", True))
+    xnlist.append(Transition((1, 0, 1), (0, 1, 1), 1.0, "slide left", True))
+    xnlist.append(Transition((1, 0, 2), (0, 1, 2), 1.0, "slide right", True))
+    nsg = (grid.node_y > 4.0).astype(int)
+    return OrientedHexCTS(grid, nsd, xnlist, nsg)
+
+
+def test_realizations_share_grid_and_transitions():
+    ca = _grain_model()
+    ensemble = CTSEnsemble(ca, 3)
+
+    for realization in ensemble.realizations:
+        assert realization.grid is ca.grid
+        assert realization.trn_rate is ca.trn_rate
+        assert realization.trn_id is ca.trn_id
+        assert realization.node_state is not ca.node_state
+        assert realization.priority_queue is not ca.priority_queue
+        assert_array_equal(realization.node_state, ca.node_state)
+
+
+def test_realizations_are_independent():
+    ensemble = CTSEnsemble(_grain_model(), 4, seed=7)
+    node_states = ensemble.run([1.0])
+
+    assert node_states.shape == (4, 1, 80)
+    assert len({tuple(state) for state in node_states[:, 0]}) == 4
+
+
+def test_run_is_reproducible():
+    ca = _grain_model()
+    in_turn = CTSEnsemble(ca, 4, seed=7, n_threads=1).run([0.5, 1.0, 1.5])
+    at_once = CTSEnsemble(ca, 4, seed=7, n_threads=4).run([0.5, 1.0, 1.5])
+
+    assert_array_equal(in_turn, at_once)
+
+
+def test_run_in_steps():
+    ca = _grain_model()
+    in_one = CTSEnsemble(ca, 2).run([0.5, 1.5])
+
+    ensemble = CTSEnsemble(ca, 2)
+    first = ensemble.run([0.5])
+    second = ensemble.run([1.5])
+
+    assert_array_equal(in_one[:, :1], first)
+    assert_array_equal(in_one[:, 1:], second)
+
+
+def test_run_to_file(tmpdir):
+    ca = _grain_model()
+    expected = CTSEnsemble(ca, 3, seed=1).run([0.5, 1.0])
+
+    with tmpdir.as_cwd():
+        node_states = CTSEnsemble(ca, 3, seed=1).run([0.5, 1.0], path="states.npy")
+        assert_array_equal(node_states, expected)
+        del node_states
+        assert_array_equal(np.load("states.npy"), expected)
+
+
+def test_output_times_must_increase():
+    ensemble = CTSEnsemble(_grain_model(), 2)
+    with pytest.raises(ValueError):
+        ensemble.run([1.0, 0.5])
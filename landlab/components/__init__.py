@@ -3,7 +3,11 @@ from .diffusion import LinearDiffuser
 from .fire_generator import FireGenerator
 from .detachment_ltd_erosion import DetachmentLtdErosion, DepthSlopeProductErosion
 from .flexure import Flexure
-from .flow_routing import FlowRouter, DepressionFinderAndRouter
+from .flow_routing import (
+    FlowRouter,
+    DepressionFinderAndRouter,
+    PriorityFloodDepressionRouter,
+)
 from .nonlinear_diffusion import PerronNLDiffuse
 from .flow_director import FlowDirectorD8
 from .flow_director import FlowDirectorSteepest
@@ -49,6 +53,7 @@ COMPONENTS = [
     Flexure,
     FlowRouter,
     DepressionFinderAndRouter,
+    PriorityFloodDepressionRouter,
     PerronNLDiffuse,
     OverlandFlowBates,
     OverlandFlow,
@@ -1,4 +1,4 @@
-from multiprocessing import Pool
+from multiprocessing.pool import ThreadPool
 
 import numpy as np
 cimport numpy as np
@@ -31,6 +31,42 @@ def subside_parallel_row(np.ndarray[DTYPE_t, ndim=1] w,
         w[j] += - c * r[abs(j - i)]
 
 
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef void _subside_rows(DTYPE_t [:, :] w,
+                        const DTYPE_t [:, :] load,
+                        const DTYPE_t [:, :] r,
+                        DTYPE_t inv_c,
+                        int start, int stop) nogil:
+  """Add the deflections due to all of the loads to rows start:stop of w."""
+  cdef int nrows = load.shape[0]
+  cdef int ncols = load.shape[1]
+  cdef int i, j, ii, jj
+  cdef int di
+  cdef double c
+
+  for i in range(nrows):
+    for j in range(start, stop):
+      di = abs(j - i)
+      for ii in range(ncols):
+        if fabs(load[i, ii]) > 1e-6:
+          c = load[i, ii] * inv_c
+          for jj in range(ncols):
+            w[j, jj] -= c * r[di, abs(jj - ii)]
+
+
+def subside_grid_rows(DTYPE_t [:, :] w,
+                      const DTYPE_t [:, :] load,
+                      const DTYPE_t [:, :] r,
+                      DTYPE_t alpha, DTYPE_t gamma_mantle,
+                      int start, int stop):
+  """Subside rows start:stop of a grid in place, without holding the GIL."""
+  cdef double inv_c = 1. / (2. * np.pi * gamma_mantle * alpha ** 2.)
+
+  with nogil:
+    _subside_rows(w, load, r, inv_c, start, stop)
+
+
 def subside_grid(np.ndarray[DTYPE_t, ndim=2] w,
                  np.ndarray[DTYPE_t, ndim=2] load,
                  np.ndarray[DTYPE_t, ndim=2] r,
@@ -61,7 +97,7 @@ def subside_grid_strip(np.ndarray[DTYPE_t, ndim=2] load,
 
 
 def tile_grid_into_strips(grid, n_strips):
-    rows_per_strip = grid.shape[0] // n_strips
+    rows_per_strip = max(grid.shape[0] // n_strips, 1)
 
     starts = np.arange(0, grid.shape[0], rows_per_strip)
     stops = starts + rows_per_strip
@@ -74,6 +110,10 @@ def _subside_grid_strip_helper(args):
   return subside_grid_strip(*args)
 
 
+def _subside_grid_rows_helper(args):
+  return subside_grid_rows(*args)
+
+
 def subside_grid_in_parallel(np.ndarray[DTYPE_t, ndim=2] w,
                              np.ndarray[DTYPE_t, ndim=2] load,
                              np.ndarray[DTYPE_t, ndim=2] r,
@@ -81,13 +121,16 @@ def subside_grid_in_parallel(np.ndarray[DTYPE_t, ndim=2] w,
     if n_procs == 1:
         return subside_grid(w, load, r, alpha, gamma_mantle)
 
-    strips = tile_grid_into_strips(w, n_procs)
-
-    args = [(load, r, alpha, gamma_mantle, strip) for strip in strips]
-
-    pool = Pool(processes=n_procs)
-
-    results = pool.map(_subside_grid_strip_helper, args)
-    for dz, strip in results:
-        start, stop = strip
-        w[start:stop] += dz
+    # Each thread adds deflections to its own strip of rows of w, so all
+    # threads share w, load and r without copying them.
+    args = [
+        (w, load, r, alpha, gamma_mantle, start, stop)
+        for start, stop in tile_grid_into_strips(w, n_procs)
+    ]
+
+    pool = ThreadPool(n_procs)
+    try:
+        pool.map(_subside_grid_rows_helper, args, chunksize=1)
+    finally:
+        pool.close()
+        pool.join()
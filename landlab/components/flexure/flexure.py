@@ -169,14 +169,17 @@ class Flexure(Component):
             Effective elastic thickness (m).
         youngs : float, optional
             Young's modulus.
-        method : {'airy', 'flexure'}, optional
-            Method to use to calculate deflections.
+        method : {'airy', 'flexure', 'fft'}, optional
+            Method to use to calculate deflections. Both 'flexure' and 'fft'
+            calculate elastic deflections; 'fft' convolves the loads with the
+            flexure kernel using fast Fourier transforms, which is much
+            faster for large grids.
         rho_mantle : float, optional
             Density of the mantle (kg / m^3).
         gravity : float, optional
             Acceleration due to gravity (m / s^2).
         """
-        if method not in ("airy", "flexure"):
+        if method not in ("airy", "flexure", "fft"):
             raise ValueError("{method}: method not understood".format(method=method))
 
         self._grid = grid
@@ -214,6 +217,7 @@ class Flexure(Component):
         self._r = self._create_kei_func_grid(
             self._grid.shape, (self.grid.dy, self.grid.dx), self.alpha
         )
+        self._kei_fft = None
 
     @property
     def youngs(self):
@@ -257,13 +261,35 @@ class Flexure(Component):
 
         return kei(np.sqrt(dx ** 2 + dy ** 2) / alpha)
 
+    @staticmethod
+    def _create_kei_func_fft(r):
+        """Fourier transform of the kei function over all offsets.
+
+        The kernel *r*, which holds values for non-negative offsets only, is
+        mirrored into the negative offsets and wrapped so that the offset
+        of zero is at the origin. The padded size is at least
+        2 * shape - 1 along each axis, so that a circular convolution with
+        a load of the grid's shape is equal to the linear one.
+        """
+        from scipy.fftpack import next_fast_len
+
+        n_rows, n_cols = r.shape
+        fft_shape = (next_fast_len(2 * n_rows - 1), next_fast_len(2 * n_cols - 1))
+
+        kernel = np.zeros(fft_shape)
+        kernel[:n_rows, :n_cols] = r
+        kernel[fft_shape[0] - n_rows + 1 :, :n_cols] = r[:0:-1, :]
+        kernel[:, fft_shape[1] - n_cols + 1 :] = kernel[:, n_cols - 1 : 0 : -1]
+
+        return fft_shape, np.fft.rfft2(kernel)
+
     def update(self, n_procs=1):
         """Update fields with current loading conditions.
 
         Parameters
         ----------
         n_procs : int, optional
-            Number of processors to use for calculations.
+            Number of threads to use for calculations.
         """
         load = self.grid.at_node["lithosphere__overlying_pressure_increment"]
         deflection = self.grid.at_node["lithosphere_surface__elevation_increment"]
@@ -274,6 +300,8 @@ class Flexure(Component):
 
         if self.method == "airy":
             deflection[:] = new_load / self.gamma_mantle
+        elif self.method == "fft":
+            self.subside_loads_fft(new_load, out=deflection)
         else:
             self.subside_loads(new_load, out=deflection, n_procs=n_procs)
 
@@ -287,7 +315,7 @@ class Flexure(Component):
         out : ndarray of float, optional
             Buffer to place resulting deflection values.
         n_procs : int, optional
-            Number of processors to use for calculations.
+            Number of threads to use for calculations.
 
         Returns
         -------
@@ -311,3 +339,53 @@ class Flexure(Component):
         )
 
         return out
+
+    def subside_loads_fft(self, loads, out=None):
+        """Subside surface due to multiple loads, using FFTs.
+
+        Deflections are the same as those of :meth:`subside_loads` but are
+        calculated by convolving the loads with the flexure kernel in
+        Fourier space. The transformed kernel is kept between calls until
+        the effective elastic thickness changes.
+
+        Parameters
+        ----------
+        loads : ndarray of float
+            Loads applied to each grid node.
+        out : ndarray of float, optional
+            Buffer to place resulting deflection values.
+
+        Returns
+        -------
+        ndarray of float
+            Deflections caused by the loading.
+
+        Examples
+        --------
+        >>> from landlab import RasterModelGrid
+        >>> from landlab.components.flexure import Flexure
+        >>> grid = RasterModelGrid((5, 4), xy_spacing=(1.e4, 1.e4))
+        >>> flex = Flexure(grid, method="fft")
+        >>> loads = np.zeros(grid.shape)
+        >>> loads[2, 1] = 1e9
+        >>> dz_fft = flex.subside_loads_fft(loads)
+        >>> dz = flex.subside_loads(loads)
+        >>> np.allclose(dz_fft, dz, rtol=1e-9, atol=0.)
+        True
+        """
+        if out is None:
+            out = np.zeros(self.grid.shape, dtype=np.float)
+        dz = out.reshape(self.grid.shape)
+        load = loads.reshape(self.grid.shape)
+
+        if self._kei_fft is None:
+            self._kei_fft = self._create_kei_func_fft(self._r)
+        fft_shape, kei_fft = self._kei_fft
+
+        c = -self.grid.dx * self.grid.dy / (
+            2. * np.pi * self.gamma_mantle * self.alpha ** 2.
+        )
+        w = np.fft.irfft2(np.fft.rfft2(load, s=fft_shape) * kei_fft, s=fft_shape)
+        dz += c * w[: self.grid.shape[0], : self.grid.shape[1]]
+
+        return out
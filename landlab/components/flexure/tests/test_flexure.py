@@ -15,6 +15,7 @@ def test_method_names():
     grid = RasterModelGrid((20, 20), xy_spacing=10e3)
     assert Flexure(grid, method="airy").method == "airy"
     assert Flexure(grid, method="flexure").method == "flexure"
+    assert Flexure(grid, method="fft").method == "fft"
     with pytest.raises(ValueError):
         Flexure(grid, method="bad-name")
 
@@ -137,3 +138,47 @@ def test_subside_loads():
     out = np.zeros((n, n))
     dz = flex.subside_loads(load, out=out)
     assert dz is out
+
+
+def test_subside_loads_threaded():
+    n = 11
+    grid = RasterModelGrid((n, n), xy_spacing=1e3)
+    flex = Flexure(grid, method="flexure")
+
+    np.random.seed(0)
+    load = np.random.uniform(0., 1e9, (n, n))
+
+    dz_serial = flex.subside_loads(load, n_procs=1)
+    dz_threaded = flex.subside_loads(load, n_procs=4)
+    assert dz_threaded == pytest.approx(dz_serial, rel=1e-12)
+
+
+@pytest.mark.parametrize("shape", [(11, 11), (7, 13), (3, 9)])
+def test_subside_loads_fft(shape):
+    grid = RasterModelGrid(shape, xy_spacing=1e3)
+    flex = Flexure(grid, method="fft")
+
+    np.random.seed(0)
+    load = np.random.uniform(0., 1e9, shape)
+
+    dz_fft = flex.subside_loads_fft(load)
+    dz_direct = flex.subside_loads(load)
+    assert dz_fft == pytest.approx(dz_direct, rel=1e-9)
+
+    grid.at_node["lithosphere__overlying_pressure_increment"][:] = load.flat
+    flex.update()
+    dz = grid.at_node["lithosphere_surface__elevation_increment"]
+    assert dz == pytest.approx(dz_direct.flatten(), rel=1e-9)
+
+
+def test_fft_kernel_follows_eet():
+    grid = RasterModelGrid((11, 11), xy_spacing=1e3)
+    flex = Flexure(grid, method="fft")
+    load = np.zeros((11, 11))
+    load[5, 5] = 1e9
+
+    flex.subside_loads_fft(load)
+    flex.eet = 10e3
+    assert flex.subside_loads_fft(load) == pytest.approx(
+        flex.subside_loads(load), rel=1e-9
+    )
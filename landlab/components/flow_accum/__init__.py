@@ -2,6 +2,7 @@ from .flow_accum_bw import (
     make_ordered_node_array,
     find_drainage_area_and_discharge,
     flow_accumulation,
+    update_drainage_area_and_discharge,
 )
 
 from .flow_accumulator import FlowAccumulator
@@ -13,4 +14,5 @@ __all__ = [
     "make_ordered_node_array",
     "find_drainage_area_and_discharge",
     "flow_accumulation",
+    "update_drainage_area_and_discharge",
 ]
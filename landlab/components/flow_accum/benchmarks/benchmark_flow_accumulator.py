@@ -0,0 +1,78 @@
+"""Per-step timing of FlowAccumulator on large raster grids.
+
+Run as a script to print the time per call of ``run_one_step`` for grids
+with between 1e6 and 1.6e7 nodes, using one and then four threads::
+
+    $ python benchmark_flow_accumulator.py
+"""
+from __future__ import print_function
+
+import multiprocessing
+import timeit
+
+import numpy as np
+
+from landlab import RasterModelGrid
+from landlab.components import FlowAccumulator
+
+GRID_SHAPES = ((1000, 1000), (2000, 2000), (4000, 4000))
+
+
+def _setup_flow_accumulator(shape, flow_director="D8", n_threads=1):
+    grid = RasterModelGrid(shape)
+    np.random.seed(0)
+    grid.add_field(
+        "topographic__elevation",
+        grid.node_x + grid.node_y + np.random.rand(grid.number_of_nodes),
+        at="node",
+    )
+    return FlowAccumulator(grid, flow_director=flow_director, n_threads=n_threads)
+
+
+def bench_flow_accumulator_1e6():
+    fa = _setup_flow_accumulator(GRID_SHAPES[0])
+    fa.run_one_step()
+
+
+def bench_flow_accumulator_4e6():
+    fa = _setup_flow_accumulator(GRID_SHAPES[1])
+    fa.run_one_step()
+
+
+def bench_flow_accumulator_1p6e7():
+    fa = _setup_flow_accumulator(GRID_SHAPES[2])
+    fa.run_one_step()
+
+
+def bench_flow_accumulator_4e6_threaded():
+    fa = _setup_flow_accumulator(
+        GRID_SHAPES[1], n_threads=multiprocessing.cpu_count()
+    )
+    fa.run_one_step()
+
+
+def bench_flow_accumulator_mfd_1e6():
+    fa = _setup_flow_accumulator(GRID_SHAPES[0], flow_director="MFD")
+    fa.run_one_step()
+
+
+def time_per_step(shape, n_steps=5, flow_director="D8", n_threads=1):
+    """Return the mean time (s) of FlowAccumulator.run_one_step."""
+    fa = _setup_flow_accumulator(
+        shape, flow_director=flow_director, n_threads=n_threads
+    )
+    fa.run_one_step()
+    return timeit.timeit(fa.run_one_step, number=n_steps) / n_steps
+
+
+if __name__ == "__main__":  # pragma: no cover
+    for n_threads in (1, 4):
+        for shape in GRID_SHAPES:
+            print(
+                "{n_nodes:>10d} nodes, {n_threads} threads: "
+                "{time:.3f} s per step".format(
+                    n_nodes=shape[0] * shape[1],
+                    n_threads=n_threads,
+                    time=time_per_step(shape, n_threads=n_threads),
+                )
+            )
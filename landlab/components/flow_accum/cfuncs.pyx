@@ -18,22 +18,141 @@ cpdef _add_to_stack(DTYPE_INT_t l, DTYPE_INT_t j,
 
     """
     Adds node l to the stack and increments the current index (j).
+
+    The upstream walk uses an explicit stack rather than recursion so that
+    long flow paths cannot overflow the C stack.
     """
-    cdef int m, n, delta_l, delta_lplus1
+    cdef int m, n, top
+    cdef np.ndarray[DTYPE_INT_t, ndim=1] work = np.empty(
+        len(donors) + 1, dtype=DTYPE_INT)
 
-    s[j] = l
-    j += 1
-    delta_l = delta[l]
-    delta_lplus1 = delta[l+1]
+    work[0] = l
+    top = 1
+    while top > 0:
+        top -= 1
+        l = work[top]
+        s[j] = l
+        j += 1
 
-    for n in range(delta_l, delta_lplus1):
-        m = donors[n]
-        if m != l:
-            j = _add_to_stack(m, j, s, delta, donors)
+        # Push donors in reverse so they are popped in the same order the
+        # recursive algorithm would visit them.
+        for n in range(delta[l+1] - 1, delta[l] - 1, -1):
+            m = donors[n]
+            if m != l:
+                work[top] = m
+                top += 1
 
     return j
 
 
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cpdef DTYPE_INT_t _make_stack_bw(DTYPE_INT_t np,
+                                 np.ndarray[DTYPE_INT_t, ndim=1] r,
+                                 np.ndarray[DTYPE_INT_t, ndim=1] w,
+                                 np.ndarray[DTYPE_INT_t, ndim=1] delta,
+                                 np.ndarray[DTYPE_INT_t, ndim=1] D,
+                                 np.ndarray[DTYPE_INT_t, ndim=1] s,
+                                 np.ndarray[DTYPE_INT_t, ndim=1] work):
+    """
+    Builds the delta, donor and stack arrays for route-to-one receivers.
+
+    All arrays are supplied by the caller and overwritten in place, so that
+    repeated calls allocate nothing. *w* and *work* are scratch arrays of
+    length np, *delta* has length np + 1. Returns the number of nodes that
+    were added to the stack.
+    """
+    cdef int i, j, k, l, m, n, ri, top
+
+    # Number of donors of each node.
+    for i in range(np):
+        w[i] = 0
+    for i in range(np):
+        w[r[i]] += 1
+
+    # Index into D where the donor list of each node begins.
+    delta[np] = np
+    for i in range(np - 1, -1, -1):
+        delta[i] = delta[i + 1] - w[i]
+        w[i] = 0
+
+    # Donors of each node.
+    for i in range(np):
+        ri = r[i]
+        D[delta[ri] + w[ri]] = i
+        w[ri] += 1
+
+    # Depth-first walk upstream from each base-level node.
+    j = 0
+    for k in range(np):
+        if r[k] != k:
+            continue
+        work[0] = k
+        top = 1
+        while top > 0:
+            top -= 1
+            l = work[top]
+            s[j] = l
+            j += 1
+            for n in range(delta[l + 1] - 1, delta[l] - 1, -1):
+                m = D[n]
+                if m != l:
+                    work[top] = m
+                    top += 1
+
+    return j
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cpdef DTYPE_INT_t _make_stack_to_n(DTYPE_INT_t np, DTYPE_INT_t q,
+                                   np.ndarray[DTYPE_INT_t, ndim=2] r,
+                                   np.ndarray[DTYPE_FLOAT_t, ndim=2] p,
+                                   np.ndarray[DTYPE_INT_t, ndim=1] delta,
+                                   np.ndarray[DTYPE_INT_t, ndim=1] D,
+                                   np.ndarray[DTYPE_INT_t, ndim=1] w,
+                                   np.ndarray[DTYPE_INT_t, ndim=1] s):
+    """
+    Builds the stack for route-to-n receivers by topological sort.
+
+    Uses Kahn's algorithm: a node is added to the stack once every node it
+    sends flow to is already in it, starting from nodes that send flow
+    nowhere but to themselves. A first-in first-out queue is used, so the
+    stack is ordered by level: the nodes of each level come after those of
+    all levels downstream of it. *w* is a scratch array of length np.
+    Returns the number of nodes that were added to the stack, which is less
+    than np only if the receivers contain a cycle.
+    """
+    cdef int i, v, n, donor, recvr, node
+    cdef int first = 0
+    cdef int last = 0
+
+    # Number of other nodes each node sends flow to.
+    for i in range(np):
+        w[i] = 0
+        for v in range(q):
+            recvr = r[i, v]
+            if p[i, v] > 0. and recvr != -1 and recvr != i:
+                w[i] += 1
+        if w[i] == 0:
+            s[last] = i
+            last += 1
+
+    # The stack doubles as the queue of nodes waiting to be processed.
+    while first < last:
+        node = s[first]
+        first += 1
+        for n in range(delta[node], delta[node + 1]):
+            donor = D[n]
+            if donor != node:
+                w[donor] -= 1
+                if w[donor] == 0:
+                    s[last] = donor
+                    last += 1
+
+    return last
+
+
 @cython.boundscheck(False)
 cpdef _accumulate_to_n(DTYPE_INT_t np, DTYPE_INT_t q,
                        np.ndarray[DTYPE_INT_t, ndim=1] s,
@@ -64,20 +183,24 @@ cpdef _accumulate_to_n(DTYPE_INT_t np, DTYPE_INT_t q,
 
 
 @cython.boundscheck(False)
-cpdef _accumulate_bw(DTYPE_INT_t np,
-                     np.ndarray[DTYPE_INT_t, ndim=1] s,
-                     np.ndarray[DTYPE_INT_t, ndim=1] r,
-                     np.ndarray[DTYPE_FLOAT_t, ndim=1] drainage_area,
-                     np.ndarray[DTYPE_FLOAT_t, ndim=1] discharge):
+@cython.wraparound(False)
+cdef void _accumulate_bw_nogil(const DTYPE_INT_t [:] s,
+                               const DTYPE_INT_t [:] r,
+                               DTYPE_FLOAT_t [:] drainage_area,
+                               DTYPE_FLOAT_t [:] discharge,
+                               DTYPE_INT_t start,
+                               DTYPE_INT_t stop) nogil:
     """
-    Accumulates drainage area and discharge, permitting transmission losses.
+    Accumulates drainage area and discharge over part of the stack.
+
+    Nodes s[start:stop] are visited from upstream to downstream. The part
+    of the stack must hold whole basins, so that no other part of the stack
+    touches the same nodes.
     """
     cdef int donor, recvr, i
     cdef float accum
 
-    # Iterate backward through the list, which means we work from upstream to
-    # downstream.
-    for i in range(np-1, -1, -1):
+    for i in range(stop - 1, start - 1, -1):
         donor = s[i]
         recvr = r[donor]
         if donor != recvr:
@@ -88,6 +211,35 @@ cpdef _accumulate_bw(DTYPE_INT_t np,
             discharge[recvr] = accum
 
 
+cpdef _accumulate_bw(DTYPE_INT_t np,
+                     np.ndarray[DTYPE_INT_t, ndim=1] s,
+                     np.ndarray[DTYPE_INT_t, ndim=1] r,
+                     np.ndarray[DTYPE_FLOAT_t, ndim=1] drainage_area,
+                     np.ndarray[DTYPE_FLOAT_t, ndim=1] discharge):
+    """
+    Accumulates drainage area and discharge, permitting transmission losses.
+    """
+    # Iterate backward through the list, which means we work from upstream to
+    # downstream.
+    _accumulate_bw_nogil(s, r, drainage_area, discharge, 0, np)
+
+
+def _accumulate_bw_in_range(const DTYPE_INT_t [:] s,
+                            const DTYPE_INT_t [:] r,
+                            DTYPE_FLOAT_t [:] drainage_area,
+                            DTYPE_FLOAT_t [:] discharge,
+                            DTYPE_INT_t start,
+                            DTYPE_INT_t stop):
+    """
+    Accumulates drainage area and discharge over the basins in s[start:stop].
+
+    The GIL is released, so that basins can be accumulated by several
+    threads at once.
+    """
+    with nogil:
+        _accumulate_bw_nogil(s, r, drainage_area, discharge, start, stop)
+
+
 @cython.boundscheck(False)
 cpdef _make_donors(DTYPE_INT_t np,
                    np.ndarray[DTYPE_INT_t, ndim=1] w,
@@ -120,3 +272,59 @@ cpdef _make_donors_to_n(DTYPE_INT_t np,
                 ind = delta[ri] + w[ri]
                 D[ind] = i
                 w[ri] += 1
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cpdef DTYPE_INT_t _update_accumulation_bw(
+        DTYPE_INT_t np,
+        np.ndarray[DTYPE_INT_t, ndim=1] changed,
+        np.ndarray[DTYPE_INT_t, ndim=1] r_old,
+        np.ndarray[DTYPE_INT_t, ndim=1] r_new,
+        np.ndarray[DTYPE_FLOAT_t, ndim=1] drainage_area,
+        np.ndarray[DTYPE_FLOAT_t, ndim=1] discharge):
+    """
+    Updates drainage area and discharge for a set of changed receivers.
+
+    Every node in *changed* is first cut from its old receiver, subtracting
+    its accumulated values from all nodes downstream of it, and then joined
+    to its new receiver, adding them back along the new path. *r_old* is
+    modified in place and is equal to *r_new* on return. Returns 0 on
+    success, or 1 if a flow path does not end at a base-level node, in
+    which case the arrays are left in an undefined state.
+    """
+    cdef int i, k, j, n_steps
+    cdef int n_changed = len(changed)
+    cdef double area, flux
+
+    for k in range(n_changed):
+        i = changed[k]
+        area = drainage_area[i]
+        flux = discharge[i]
+        j = i
+        n_steps = 0
+        while r_old[j] != j:
+            j = r_old[j]
+            drainage_area[j] -= area
+            discharge[j] -= flux
+            n_steps += 1
+            if n_steps > np:
+                return 1
+        r_old[i] = i
+
+    for k in range(n_changed):
+        i = changed[k]
+        r_old[i] = r_new[i]
+        area = drainage_area[i]
+        flux = discharge[i]
+        j = i
+        n_steps = 0
+        while r_old[j] != j:
+            j = r_old[j]
+            drainage_area[j] += area
+            discharge[j] += flux
+            n_steps += 1
+            if n_steps > np:
+                return 1
+
+    return 0
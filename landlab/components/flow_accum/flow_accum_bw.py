@@ -24,12 +24,21 @@ If you simply want the ordered list by itself, use::
 
 Created: GT Nov 2013
 """
+from multiprocessing.pool import ThreadPool
+
 import numpy
 from six.moves import range
 
 from landlab.core.utils import as_id_array
 
-from .cfuncs import _accumulate_bw, _add_to_stack, _make_donors
+from .cfuncs import (
+    _accumulate_bw,
+    _accumulate_bw_in_range,
+    _add_to_stack,
+    _make_donors,
+    _make_stack_bw,
+    _update_accumulation_bw,
+)
 
 
 class _DrainageStack:
@@ -178,6 +187,61 @@ def _make_array_of_donors(r, delta):
     return D
 
 
+def _make_stack_and_data_structures(receiver_nodes, nd, delta, D, s, work):
+
+    """Build the delta, donor and stack arrays in a single pass.
+
+    This is a fused, non-recursive version of
+    :func:`_make_number_of_donors_array`, :func:`_make_delta_array`,
+    :func:`_make_array_of_donors` and :func:`make_ordered_node_array`. All of
+    the arrays are provided by the caller and are overwritten in place, which
+    allows them to be reused from one call to the next. Entries of the stack
+    beyond the last node that drains to a base-level node are set to zero.
+
+    Parameters
+    ----------
+    receiver_nodes : ndarray of int
+        ID of receiver for each node.
+    nd : ndarray of int
+        Scratch array of length number of nodes.
+    delta : ndarray of int
+        Delta array (length number of nodes + 1).
+    D : ndarray of int
+        Array of donors (length number of nodes).
+    s : ndarray of int
+        Ordered (downstream to upstream) array of node IDs.
+    work : ndarray of int
+        Scratch array of length number of nodes.
+
+    Returns
+    -------
+    int
+        Number of nodes added to the stack.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from landlab.components.flow_accum.flow_accum_bw import(
+    ... _make_stack_and_data_structures)
+    >>> r = np.array([2, 5, 2, 7, 5, 5, 6, 5, 7, 8]) - 1
+    >>> nd, D, s, work = (np.empty(10, dtype=int) for _ in range(4))
+    >>> delta = np.empty(11, dtype=int)
+    >>> _make_stack_and_data_structures(r, nd, delta, D, s, work)
+    10
+    >>> delta
+    array([ 0,  0,  2,  2,  2,  6,  7,  9, 10, 10, 10])
+    >>> D
+    array([0, 2, 1, 4, 5, 7, 6, 3, 8, 9])
+    >>> s
+    array([4, 1, 0, 2, 5, 6, 3, 8, 7, 9])
+    """
+    n_in_stack = _make_stack_bw(
+        len(receiver_nodes), receiver_nodes, nd, delta, D, s, work
+    )
+    s[n_in_stack:] = 0
+    return n_in_stack
+
+
 def make_ordered_node_array(receiver_nodes):
 
     """Create an array of node IDs that is arranged in order from.
@@ -197,21 +261,84 @@ def make_ordered_node_array(receiver_nodes):
     >>> s
     array([4, 1, 0, 2, 5, 6, 3, 8, 7, 9])
     """
-    node_id = numpy.arange(receiver_nodes.size)
-    baselevel_nodes = numpy.where(node_id == receiver_nodes)[0]
-    nd = _make_number_of_donors_array(receiver_nodes)
-    delta = _make_delta_array(nd)
-    D = _make_array_of_donors(receiver_nodes, delta)
-    dstack = _DrainageStack(delta, D)
-    add_it = dstack.add_to_stack
-    for k in baselevel_nodes:
-        add_it(k)  # don't think this is a bottleneck, so no C++
+    receiver_nodes = as_id_array(receiver_nodes)
+    np = len(receiver_nodes)
+    s = numpy.empty(np, dtype=int)
+    _make_stack_and_data_structures(
+        receiver_nodes,
+        numpy.empty(np, dtype=int),
+        numpy.empty(np + 1, dtype=int),
+        numpy.empty(np, dtype=int),
+        s,
+        numpy.empty(np, dtype=int),
+    )
+
+    return s
+
+
+def split_stack_by_basin(s, r, n_parts):
+    """Split a stack into parts that each hold whole basins.
+
+    The stack built by *make_ordered_node_array* lists the nodes of each
+    basin together, beginning with its base-level node. The stack is cut
+    into no more than *n_parts* parts at the first base-level node at or
+    after each multiple of ``len(s) / n_parts``.
+
+    Parameters
+    ----------
+    s : ndarray of int
+        Ordered (downstream to upstream) array of node IDs
+    r : ndarray of int
+        Receiver IDs for each node
+    n_parts : int
+        Number of parts to split the stack into.
+
+    Returns
+    -------
+    ndarray of int
+        Indices into the stack at which each part begins, followed by the
+        length of the stack.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from landlab.components.flow_accum.flow_accum_bw import (
+    ...     split_stack_by_basin)
+    >>> r = np.array([0, 0, 1, 3, 3, 5, 5, 5])
+    >>> s = np.array([0, 1, 2, 3, 4, 5, 6, 7])
+    >>> split_stack_by_basin(s, r, 1)
+    array([0, 8])
+    >>> split_stack_by_basin(s, r, 2)
+    array([0, 5, 8])
+    >>> split_stack_by_basin(s, r, 8)
+    array([0, 3, 5, 8])
+    """
+    n_nodes = len(s)
+    basin_starts = numpy.append(numpy.flatnonzero(r[s] == s), n_nodes)
+    cut_at = numpy.linspace(0, n_nodes, n_parts + 1)[1:-1]
+    cuts = basin_starts[numpy.searchsorted(basin_starts, cut_at)]
+    return numpy.unique(numpy.concatenate(([0], cuts, [n_nodes])))
+
+
+def _accumulate_bw_by_basin(s, r, drainage_area, discharge, n_threads):
+    """Accumulate drainage area and discharge over basins in parallel."""
+    bounds = split_stack_by_basin(s, r, 4 * n_threads)
 
-    return dstack.s
+    def accumulate_part(k):
+        _accumulate_bw_in_range(
+            s, r, drainage_area, discharge, bounds[k], bounds[k + 1]
+        )
+
+    pool = ThreadPool(n_threads)
+    try:
+        pool.map(accumulate_part, range(len(bounds) - 1), chunksize=1)
+    finally:
+        pool.close()
+        pool.join()
 
 
 def find_drainage_area_and_discharge(
-    s, r, node_cell_area=1.0, runoff=1.0, boundary_nodes=None
+    s, r, node_cell_area=1.0, runoff=1.0, boundary_nodes=None, n_threads=1
 ):
 
     """Calculate the drainage area and water discharge at each node.
@@ -231,6 +358,12 @@ def find_drainage_area_and_discharge(
     boundary_nodes: list, optional
         Array of boundary nodes to have discharge and drainage area set to zero.
         Default value is None.
+    n_threads : int, optional
+        Number of threads with which to accumulate. If more than one, the
+        stack is split into parts made of whole basins, and the parts are
+        accumulated at the same time. Results are the same as for one
+        thread.
+
     Returns
     -------
     tuple of ndarray
@@ -261,6 +394,12 @@ def find_drainage_area_and_discharge(
     array([  1.,   3.,   1.,   1.,  10.,   4.,   3.,   2.,   1.,   1.])
     >>> q
     array([  1.,   3.,   1.,   1.,  10.,   4.,   3.,   2.,   1.,   1.])
+
+    Basins can be accumulated by more than one thread.
+
+    >>> a, q = find_drainage_area_and_discharge(s, r, n_threads=2)
+    >>> a
+    array([  1.,   3.,   1.,   1.,  10.,   4.,   3.,   2.,   1.,   1.])
     """
     # Number of points
     np = len(s)
@@ -279,13 +418,86 @@ def find_drainage_area_and_discharge(
 
     # Call the cfunc to work accumulate from upstream to downstream, permitting
     # transmission losses
-    _accumulate_bw(np, s, r, drainage_area, discharge)
+    if n_threads > 1:
+        _accumulate_bw_by_basin(
+            as_id_array(s), as_id_array(r), drainage_area, discharge, n_threads
+        )
+    else:
+        _accumulate_bw(np, s, r, drainage_area, discharge)
     # nodes at channel heads can still be negative with this method, so...
     discharge = discharge.clip(0.)
 
     return drainage_area, discharge
 
 
+def update_drainage_area_and_discharge(
+    r_old, r_new, drainage_area, discharge, changed_nodes=None
+):
+
+    """Update drainage area and discharge after receivers have changed.
+
+    Rather than accumulating over the whole stack, the accumulated values of
+    each node whose receiver changed are removed along its old flow path and
+    added along its new one. The cost is proportional to the length of
+    those paths. Arrays are updated in place, and *r_old* is equal to
+    *r_new* on return.
+
+    Accumulated discharge is only updated correctly if it is never clipped
+    at zero, that is, if the local runoff is nowhere negative.
+
+    Parameters
+    ----------
+    r_old : ndarray of int
+        Receiver IDs for each node that were used to calculate the current
+        drainage area and discharge.
+    r_new : ndarray of int
+        New receiver IDs for each node.
+    drainage_area : ndarray of float
+        Drainage area for the old receivers.
+    discharge : ndarray of float
+        Discharge for the old receivers.
+    changed_nodes : ndarray of int, optional
+        Nodes whose receiver changed. If not given, calculate them.
+
+    Returns
+    -------
+    bool
+        *True* if the update succeeded, or *False* if some flow path did not
+        end at a base-level node. In that case the arrays must be
+        recalculated from scratch.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from landlab.components.flow_accum import (
+    ...     find_drainage_area_and_discharge,
+    ...     make_ordered_node_array,
+    ...     update_drainage_area_and_discharge,
+    ... )
+    >>> r = np.array([2, 5, 2, 7, 5, 5, 6, 5, 7, 8]) - 1
+    >>> a, q = find_drainage_area_and_discharge(make_ordered_node_array(r), r)
+    >>> a
+    array([  1.,   3.,   1.,   1.,  10.,   4.,   3.,   2.,   1.,   1.])
+
+    Now node 9 drains to node 3 rather than to node 7.
+
+    >>> r_new = r.copy()
+    >>> r_new[9] = 3
+    >>> update_drainage_area_and_discharge(r, r_new, a, q)
+    True
+    >>> a
+    array([  1.,   3.,   1.,   2.,  10.,   5.,   4.,   1.,   1.,   1.])
+    >>> np.all(r == r_new)
+    True
+    """
+    if changed_nodes is None:
+        changed_nodes = numpy.flatnonzero(r_old != r_new)
+    error = _update_accumulation_bw(
+        len(r_old), as_id_array(changed_nodes), r_old, r_new, drainage_area, discharge
+    )
+    return error == 0
+
+
 def find_drainage_area_and_discharge_lossy(
     s, r, l, loss_function, grid, node_cell_area=1.0, runoff=1.0, boundary_nodes=None
 ):
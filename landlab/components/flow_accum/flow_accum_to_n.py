@@ -50,7 +50,7 @@ from six.moves import range
 
 from landlab.core.utils import as_id_array
 
-from .cfuncs import _accumulate_to_n, _make_donors_to_n
+from .cfuncs import _accumulate_to_n, _make_donors_to_n, _make_stack_to_n
 
 
 class _DrainageStack_to_n:
@@ -410,19 +410,75 @@ def make_ordered_node_array_to_n(receiver_nodes, receiver_proportion):
     >>> len(set([0, 3, 8])-set(s[6:9]))
     0
     """
-    node_id = numpy.arange(receiver_nodes.shape[0])
-    baselevel_nodes = numpy.where(node_id == receiver_nodes[:, 0])[0]
     nd = _make_number_of_donors_array_to_n(receiver_nodes, receiver_proportion)
     delta = _make_delta_array_to_n(nd)
     D = _make_array_of_donors_to_n(receiver_nodes, receiver_proportion, delta)
 
-    num_receivers = numpy.sum(receiver_nodes >= 0, axis=1)
+    return _make_stack_from_donors_to_n(receiver_nodes, receiver_proportion, delta, D)
 
-    dstack = _DrainageStack_to_n(delta, D, num_receivers)
-    construct_it = dstack.construct__stack
 
-    construct_it(baselevel_nodes)  # don't think this is a bottleneck, so no C++
-    return dstack.s
+def _make_stack_from_donors_to_n(r, p, delta, D):
+    """Build the stack from the delta and donor arrays.
+
+    Nodes are sorted topologically with a compiled version of Kahn's
+    algorithm, so each node comes after all of the nodes that it sends flow
+    to. Nodes are added in order of their level (the length of the longest
+    flow path from them to a base-level node), so the stack is the same
+    every time it is built. Any nodes whose flow does not reach a
+    base-level node (which can only happen if the receivers form a cycle)
+    are put at the end of the stack.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from landlab.components.flow_accum.flow_accum_to_n import(
+    ... _make_stack_from_donors_to_n)
+    >>> r = np.array([[ 1,  2],
+    ...               [ 4,  5],
+    ...               [ 1,  5],
+    ...               [ 6,  2],
+    ...               [ 4, -1],
+    ...               [ 4, -1],
+    ...               [ 5,  7],
+    ...               [ 4,  5],
+    ...               [ 6,  7],
+    ...               [ 7,  8]])
+    >>> p = np.array([[ 0.6,   0.4 ],
+    ...               [ 0.85,  0.15],
+    ...               [ 0.65,  0.35],
+    ...               [ 0.9,   0.1 ],
+    ...               [ 1.,    0.  ],
+    ...               [ 1.,    0.  ],
+    ...               [ 0.75,  0.25],
+    ...               [ 0.55,  0.45],
+    ...               [ 0.8,   0.2 ],
+    ...               [ 0.95,  0.05]])
+    >>> delta = np.array([ 0,  0,  2,  4,  4,  8,  12,  14, 17, 18, 18])
+    >>> D = np.array([0, 2, 0, 3, 1, 4, 5, 7, 6, 1, 2, 7, 3, 8, 9, 6, 8, 9])
+    >>> _make_stack_from_donors_to_n(r, p, delta, D)
+    array([4, 5, 1, 7, 2, 6, 0, 3, 8, 9])
+    """
+    r = as_id_array(r)
+    p = numpy.asarray(p, dtype=float)
+    np = r.shape[0]
+
+    s = numpy.empty(np, dtype=int)
+    n_in_stack = _make_stack_to_n(
+        np,
+        r.shape[1],
+        r,
+        p,
+        as_id_array(delta),
+        as_id_array(D),
+        numpy.empty(np, dtype=int),
+        s,
+    )
+    if n_in_stack < np:
+        in_stack = numpy.zeros(np, dtype=bool)
+        in_stack[s[:n_in_stack]] = True
+        s[n_in_stack:] = numpy.flatnonzero(~in_stack)
+
+    return s
 
 
 def find_drainage_area_and_discharge_to_n(
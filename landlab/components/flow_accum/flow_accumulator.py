@@ -112,10 +112,25 @@ class FlowAccumulator(Component):
         permitted to contain negative values, in which case they mimic
         transmission losses rather than e.g. rain inputs.
     depression_finder : string, class, instance of class, optional
-         A string of class name (e.g., 'DepressionFinderAndRouter'), an
-         uninstantiated DepressionFinder class, or an instance of a
-         DepressionFinder class.
+         A string of class name (e.g., 'DepressionFinderAndRouter' or
+         'PriorityFloodDepressionRouter'), an uninstantiated DepressionFinder
+         class, or an instance of a DepressionFinder class.
          This sets the method for depression finding.
+    incremental : bool, optional
+         If True, and flow is routed to one receiver, compare receivers
+         with those of the previous call and, if only a few have changed,
+         update drainage area and discharge only along the old and new flow
+         paths of those nodes. The stack, delta and D data structures are
+         only rebuilt if a receiver changed. Incremental updates are used
+         only while the runoff rate is unchanged and nowhere negative;
+         otherwise flow is accumulated over the whole grid. Results are
+         the same as for a full accumulation up to round-off error.
+    n_threads : int, optional
+         Number of threads used to accumulate drainage area and discharge
+         if flow is routed to one receiver. Independent basins (sets of
+         nodes that drain to the same base-level node) are accumulated at
+         the same time, so a grid that drains to many outlets gains the
+         most. Results are the same as for the default of one thread.
     **kwargs : any additional parameters to pass to a FlowDirector or
          DepressionFinderAndRouter instance (e.g., partion_method for
          FlowDirectorMFD). This will have no effect if an instantiated component
@@ -688,6 +703,8 @@ class FlowAccumulator(Component):
         flow_director="FlowDirectorSteepest",
         runoff_rate=None,
         depression_finder=None,
+        incremental=False,
+        n_threads=1,
         **kwargs
     ):
         """Initialize the FlowAccumulator component.
@@ -792,6 +809,37 @@ class FlowAccumulator(Component):
 
         self.nodes_not_in_stack = True
 
+        # Work arrays for building the route-to-one stack. These are reused
+        # every time flow is accumulated.
+        if self.flow_director.to_n_receivers == "one":
+            n_nodes = grid.number_of_nodes
+            self._nd = np.empty(n_nodes, dtype=int)
+            self._delta = np.empty(n_nodes + 1, dtype=int)
+            self._D = np.empty(n_nodes, dtype=int)
+            self._stack = np.empty(n_nodes, dtype=int)
+            self._stack_work = np.empty(n_nodes, dtype=int)
+
+        # Receivers, runoff, drainage area and discharge of the previous
+        # call, for incremental updates.
+        if incremental:
+            if self.flow_director.to_n_receivers != "one":
+                raise NotImplementedError(
+                    "Incremental flow accumulation only works with route to "
+                    "one FlowDirectors such as FlowDirectorSteepest and "
+                    "FlowDirectorD8."
+                )
+            self._r_prev = np.empty(n_nodes, dtype=int)
+            self._runoff_prev = np.empty(n_nodes, dtype=float)
+            self._a_prev = np.empty(n_nodes, dtype=float)
+            self._q_prev = np.empty(n_nodes, dtype=float)
+            self._max_changed_receivers = max(1, n_nodes // 100)
+        self._incremental = incremental
+        self._has_previous = False
+
+        if n_threads < 1:
+            raise ValueError("n_threads must be at least 1")
+        self._n_threads = int(n_threads)
+
     @property
     def node_drainage_area(self):
         """Return the drainage area."""
@@ -840,7 +888,7 @@ class FlowAccumulator(Component):
         ...      flow_director='MFD')
         >>> fa.run_one_step()
         >>> fa.link_order_upstream()
-        array([ 5, 14, 10,  6, 11,  7, 23, 19, 15, 20, 16, 28, 24, 29, 25])
+        array([ 5, 10,  6, 14, 11,  7, 19, 15, 23, 20, 16, 28, 24, 29, 25])
         """
         downstream_links = self._grid["node"]["flow__link_to_receiver_node"][
             self.node_order_upstream
@@ -988,7 +1036,10 @@ class FlowAccumulator(Component):
 
     def _add_depression_finder(self, depression_finder):
         """Test and add the depression finder component."""
-        PERMITTED_DEPRESSION_FINDERS = ["DepressionFinderAndRouter"]
+        PERMITTED_DEPRESSION_FINDERS = [
+            "DepressionFinderAndRouter",
+            "PriorityFloodDepressionRouter",
+        ]
 
         # now do a similar thing for the depression finder.
         self.depression_finder_provided = depression_finder
@@ -1037,10 +1088,14 @@ class FlowAccumulator(Component):
             # depression finder is provided as a string.
             if isinstance(self.depression_finder_provided, six.string_types):
 
-                from landlab.components import DepressionFinderAndRouter
+                from landlab.components import (
+                    DepressionFinderAndRouter,
+                    PriorityFloodDepressionRouter,
+                )
 
                 DEPRESSION_METHODS = {
-                    "DepressionFinderAndRouter": DepressionFinderAndRouter
+                    "DepressionFinderAndRouter": DepressionFinderAndRouter,
+                    "PriorityFloodDepressionRouter": PriorityFloodDepressionRouter,
                 }
 
                 try:
@@ -1139,20 +1194,33 @@ class FlowAccumulator(Component):
                 if self.flow_director._name is "FlowDirectorSteepest":
                     self.flow_director._determine_link_directions()
 
+            if self._incremental:
+                changed = self._changed_receivers(r)
+            else:
+                changed = None
+
             # step 3. Stack, D, delta construction
-            nd = as_id_array(flow_accum_bw._make_number_of_donors_array(r))
-            delta = as_id_array(flow_accum_bw._make_delta_array(nd))
-            D = as_id_array(flow_accum_bw._make_array_of_donors(r, delta))
-            s = as_id_array(flow_accum_bw.make_ordered_node_array(r))
+            if changed is None or len(changed) > 0:
+                flow_accum_bw._make_stack_and_data_structures(
+                    r, self._nd, self._delta, self._D, self._stack, self._stack_work
+                )
+                s = self._stack
 
-            # put these in grid so that depression finder can use it.
-            # store the generated data in the grid
-            self._grid["node"]["flow__data_structure_delta"][:] = delta[1:]
-            self._grid["grid"]["flow__data_structure_D"] = np.array([D], dtype=object)
-            self._grid["node"]["flow__upstream_node_order"][:] = s
+                # put these in grid so that depression finder can use it.
+                # store the generated data in the grid
+                self._grid["node"]["flow__data_structure_delta"][:] = self._delta[1:]
+                self._grid["grid"]["flow__data_structure_D"] = np.array(
+                    [self._D], dtype=object
+                )
+                self._grid["node"]["flow__upstream_node_order"][:] = s
 
             # step 4. Accumulate (to one or to N depending on direction method)
-            a[:], q[:] = self._accumulate_A_Q_to_one(s, r)
+            if changed is None:
+                a[:], q[:] = self._accumulate_A_Q_to_one(s, r)
+                if self._incremental:
+                    self._save_previous_accumulation(r, a, q)
+            else:
+                a[:], q[:] = self._update_A_Q_to_one(changed, r)
 
         else:
             # Get p
@@ -1162,7 +1230,7 @@ class FlowAccumulator(Component):
             nd = as_id_array(flow_accum_to_n._make_number_of_donors_array_to_n(r, p))
             delta = as_id_array(flow_accum_to_n._make_delta_array_to_n(nd))
             D = as_id_array(flow_accum_to_n._make_array_of_donors_to_n(r, p, delta))
-            s = as_id_array(flow_accum_to_n.make_ordered_node_array_to_n(r, p))
+            s = flow_accum_to_n._make_stack_from_donors_to_n(r, p, delta, D)
 
             # put theese in grid so that depression finder can use it.
             # store the generated data in the grid
@@ -1171,7 +1239,6 @@ class FlowAccumulator(Component):
                 [D], dtype=object
             )
             self._grid["node"]["flow__upstream_node_order"][:] = s
-            self._grid["node"]["flow__upstream_node_order"][:] = s
 
             # step 4. Accumulate (to one or to N depending on direction method)
             a[:], q[:] = self._accumulate_A_Q_to_n(s, r, p)
@@ -1184,10 +1251,56 @@ class FlowAccumulator(Component):
         Note this can be overridden in inherited components.
         """
         a, q = flow_accum_bw.find_drainage_area_and_discharge(
-            s, r, self.node_cell_area, self._grid.at_node["water__unit_flux_in"]
+            s,
+            r,
+            self.node_cell_area,
+            self._grid.at_node["water__unit_flux_in"],
+            n_threads=self._n_threads,
         )
         return (a, q)
 
+    def _changed_receivers(self, r):
+        """Find the nodes whose receiver changed since the previous call.
+
+        Returns None if flow must be accumulated over the whole grid, either
+        because this is the first call, too many receivers changed, or the
+        runoff rate changed or is negative.
+        """
+        runoff = self._grid.at_node["water__unit_flux_in"]
+        if not self._has_previous or not np.array_equal(runoff, self._runoff_prev):
+            return None
+
+        changed = np.flatnonzero(r != self._r_prev)
+        if len(changed) > self._max_changed_receivers:
+            return None
+        else:
+            return changed
+
+    def _update_A_Q_to_one(self, changed, r):
+        """Update area and discharge of the previous call for new receivers.
+
+        Falls back to accumulating over the whole grid if the update fails.
+        """
+        if len(changed) > 0:
+            updated = flow_accum_bw.update_drainage_area_and_discharge(
+                self._r_prev, r, self._a_prev, self._q_prev, changed_nodes=changed
+            )
+            if not updated:
+                a, q = self._accumulate_A_Q_to_one(self._stack, r)
+                self._save_previous_accumulation(r, a, q)
+                return (a, q)
+        return (self._a_prev, self._q_prev)
+
+    def _save_previous_accumulation(self, r, a, q):
+        """Keep a copy of receivers and accumulated flow for the next call."""
+        runoff = self._grid.at_node["water__unit_flux_in"]
+        self._has_previous = not np.any(runoff < 0.)
+        if self._has_previous:
+            self._r_prev[:] = r
+            self._runoff_prev[:] = runoff
+            self._a_prev[:] = a
+            self._q_prev[:] = q
+
     def _accumulate_A_Q_to_n(self, s, r, p):
         """Accumulate area and discharge for a route-to-many scheme.
 
@@ -344,6 +344,17 @@ class LossyFlowAccumulator(FlowAccumulator):
         keyword arguments, tests the argument of runoff_rate, and
         initializes new fields.
         """
+        if kwargs.get("incremental", False):
+            raise ValueError(
+                "LossyFlowAccumulator does not support incremental flow "
+                "accumulation."
+            )
+        if kwargs.get("n_threads", 1) != 1:
+            raise ValueError(
+                "LossyFlowAccumulator does not support multithreaded flow "
+                "accumulation."
+            )
+
         super(LossyFlowAccumulator, self).__init__(
             grid,
             surface=surface,
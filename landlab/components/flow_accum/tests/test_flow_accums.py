@@ -2,9 +2,13 @@
 import numpy as np
 from numpy.testing import assert_array_equal
 
-from landlab.components.flow_accum import find_drainage_area_and_discharge
+from landlab.components.flow_accum import (
+    find_drainage_area_and_discharge,
+    make_ordered_node_array,
+)
 from landlab.components.flow_accum.flow_accum_to_n import (
-    find_drainage_area_and_discharge_to_n
+    find_drainage_area_and_discharge_to_n,
+    make_ordered_node_array_to_n,
 )
 
 
@@ -44,9 +48,67 @@ def test_boundary_to_n():
     assert np.allclose(a, true_a)
 
 
+def test_stack_to_n_is_topological():
+    r = np.array([[1, 2], [3, -1], [3, 1], [3, -1], [2, 5], [3, 1]])
+    p = np.array(
+        [[0.5, 0.5], [1., 0.], [0.2, 0.8], [1., 0.], [0.7, 0.3], [0.4, 0.6]]
+    )
+    s = make_ordered_node_array_to_n(r, p)
+
+    assert_array_equal(np.sort(s), np.arange(6))
+    position = np.argsort(s)
+    for node in range(6):
+        for receiver, proportion in zip(r[node], p[node]):
+            if proportion > 0. and receiver != node:
+                assert position[receiver] < position[node]
+
+
+def test_stack_to_n_with_cycle():
+    r = np.array([[0, -1], [2, 0], [1, -1], [1, -1]])
+    p = np.array([[1., 0.], [0.5, 0.5], [1., 0.], [1., 0.]])
+    s = make_ordered_node_array_to_n(r, p)
+
+    assert s[0] == 0
+    assert_array_equal(s[1:], [1, 2, 3])
+
+
 def test_boundary_bw():
     r = np.array([2, 5, 2, 7, 5, 5, 6, 5, 7, 8]) - 1
     s = np.array([4, 1, 0, 2, 5, 6, 3, 8, 7, 9])
     a, q = find_drainage_area_and_discharge(s, r, boundary_nodes=[0])
     true_a = np.array([0., 2., 1., 1., 9., 4., 3., 2., 1., 1.])
     assert_array_equal(a, true_a)
+
+
+def test_fused_stack_matches_separate_steps():
+    from landlab.components.flow_accum.flow_accum_bw import (
+        _make_array_of_donors,
+        _make_delta_array,
+        _make_number_of_donors_array,
+        _make_stack_and_data_structures,
+    )
+
+    np.random.seed(42)
+    n_nodes = 1000
+    r = np.arange(n_nodes)
+    r[10:] = np.random.randint(0, np.arange(10, n_nodes))
+
+    delta = np.empty(n_nodes + 1, dtype=int)
+    nd, D, s, work = (np.empty(n_nodes, dtype=int) for _ in range(4))
+
+    assert _make_stack_and_data_structures(r, nd, delta, D, s, work) == n_nodes
+
+    expected_delta = _make_delta_array(_make_number_of_donors_array(r))
+    assert_array_equal(delta, expected_delta)
+    assert_array_equal(D, _make_array_of_donors(r, expected_delta))
+    assert_array_equal(np.sort(s), np.arange(n_nodes))
+    assert np.all(np.argsort(s)[r] <= np.argsort(s))
+
+
+def test_stack_of_long_river():
+    n_nodes = 2000000
+    r = np.arange(n_nodes) - 1
+    r[0] = 0
+
+    s = make_ordered_node_array(r)
+    assert_array_equal(s, np.arange(n_nodes))
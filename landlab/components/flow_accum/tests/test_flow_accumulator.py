@@ -1076,3 +1076,93 @@ def test_nmg_no_cell_area():
     nmg.add_field("topographic__elevation", nmg.x_of_node + nmg.y_of_node, at="node")
     with pytest.raises(FieldError):
         FlowAccumulator(nmg)
+
+
+@pytest.mark.parametrize("flow_director", ["D4", "D8"])
+def test_incremental_matches_full_accumulation(flow_director):
+    np.random.seed(1945)
+    mg0 = RasterModelGrid((30, 30))
+    z0 = mg0.add_field(
+        "topographic__elevation",
+        mg0.node_x + mg0.node_y + np.random.rand(mg0.number_of_nodes),
+        at="node",
+    )
+    mg1 = RasterModelGrid((30, 30))
+    z1 = mg1.add_field("topographic__elevation", z0.copy(), at="node")
+
+    fa0 = FlowAccumulator(mg0, flow_director=flow_director)
+    fa1 = FlowAccumulator(mg1, flow_director=flow_director, incremental=True)
+
+    for _ in range(20):
+        nodes = np.random.choice(mg0.core_nodes, 5)
+        z0[nodes] += np.random.rand(5)
+        z1[:] = z0
+        fa0.run_one_step()
+        fa1.run_one_step()
+
+        np.testing.assert_allclose(mg1.at_node["drainage_area"], fa0.drainage_area)
+        np.testing.assert_allclose(
+            mg1.at_node["surface_water__discharge"],
+            mg0.at_node["surface_water__discharge"],
+        )
+        assert_array_equal(
+            mg1.at_node["flow__upstream_node_order"],
+            mg0.at_node["flow__upstream_node_order"],
+        )
+        assert_array_equal(
+            mg1.at_node["flow__data_structure_delta"],
+            mg0.at_node["flow__data_structure_delta"],
+        )
+
+
+def test_incremental_with_changed_runoff():
+    mg = RasterModelGrid((10, 10))
+    mg.add_field("topographic__elevation", mg.node_x + mg.node_y, at="node")
+    fa = FlowAccumulator(mg, incremental=True)
+    fa.run_one_step()
+
+    mg.at_node["water__unit_flux_in"][:] = 2.
+    fa.run_one_step()
+    assert_array_equal(
+        mg.at_node["surface_water__discharge"], 2. * mg.at_node["drainage_area"]
+    )
+
+
+def test_incremental_to_n_not_implemented():
+    mg = RasterModelGrid((10, 10))
+    mg.add_field("topographic__elevation", mg.node_x + mg.node_y, at="node")
+    with pytest.raises(NotImplementedError):
+        FlowAccumulator(mg, flow_director="MFD", incremental=True)
+
+
+@pytest.mark.parametrize("n_threads", [2, 3, 8])
+@pytest.mark.parametrize("flow_director", ["D4", "D8"])
+def test_threaded_matches_serial_accumulation(flow_director, n_threads):
+    np.random.seed(1066)
+    z = np.random.rand(40 * 50)
+    runoff = np.random.rand(40 * 50) - 0.2
+
+    grids = []
+    for threads in (1, n_threads):
+        mg = RasterModelGrid((40, 50))
+        mg.add_field("topographic__elevation", z.copy(), at="node")
+        mg.add_field("water__unit_flux_in", runoff.copy(), at="node")
+        FlowAccumulator(
+            mg, flow_director=flow_director, n_threads=threads
+        ).run_one_step()
+        grids.append(mg)
+
+    assert_array_equal(
+        grids[1].at_node["drainage_area"], grids[0].at_node["drainage_area"]
+    )
+    assert_array_equal(
+        grids[1].at_node["surface_water__discharge"],
+        grids[0].at_node["surface_water__discharge"],
+    )
+
+
+def test_bad_number_of_threads():
+    mg = RasterModelGrid((10, 10))
+    mg.add_field("topographic__elevation", mg.node_x + mg.node_y, at="node")
+    with pytest.raises(ValueError):
+        FlowAccumulator(mg, n_threads=0)
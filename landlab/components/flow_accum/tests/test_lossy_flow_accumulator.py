@@ -1137,3 +1137,17 @@ def test_hex_mfd():
     mg.add_field("topographic__elevation", mg.node_x + mg.node_y, at="node")
     fa = LossyFlowAccumulator(mg, flow_director="MFD")
     fa.run_one_step()
+
+
+def test_incremental_not_permitted():
+    mg = RasterModelGrid((10, 10))
+    mg.add_field("topographic__elevation", mg.node_x + mg.node_y, at="node")
+    with pytest.raises(ValueError):
+        LossyFlowAccumulator(mg, incremental=True)
+
+
+def test_threads_not_permitted():
+    mg = RasterModelGrid((10, 10))
+    mg.add_field("topographic__elevation", mg.node_x + mg.node_y, at="node")
+    with pytest.raises(ValueError):
+        LossyFlowAccumulator(mg, n_threads=2)
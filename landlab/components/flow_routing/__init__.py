@@ -1,5 +1,6 @@
 from .route_flow_dn import FlowRouter
 from .lake_mapper import DepressionFinderAndRouter
+from .priority_flood_router import PriorityFloodDepressionRouter
 from ..flow_director import flow_direction_DN
 from ..flow_director.flow_direction_DN import flow_directions
 
@@ -7,6 +8,7 @@ from ..flow_director.flow_direction_DN import flow_directions
 __all__ = [
     "FlowRouter",
     "DepressionFinderAndRouter",
+    "PriorityFloodDepressionRouter",
     "flow_directions",
     "flow_direction_DN",
 ]
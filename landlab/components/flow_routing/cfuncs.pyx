@@ -0,0 +1,211 @@
+import numpy as np
+cimport numpy as np
+cimport cython
+from libc.math cimport INFINITY, nextafter
+
+
+DTYPE_INT = np.int
+ctypedef np.int_t DTYPE_INT_t
+
+DTYPE_FLOAT = np.double
+ctypedef np.double_t DTYPE_FLOAT_t
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef inline bint _heap_less(DTYPE_FLOAT_t [:] key, DTYPE_INT_t [:] seq,
+                            DTYPE_INT_t a, DTYPE_INT_t b) nogil:
+    """Order heap entries by key and then by insertion order."""
+    if key[a] < key[b]:
+        return True
+    elif key[a] == key[b]:
+        return seq[a] < seq[b]
+    else:
+        return False
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef inline void _heap_push(DTYPE_INT_t [:] heap, DTYPE_INT_t size,
+                            DTYPE_FLOAT_t [:] key, DTYPE_INT_t [:] seq,
+                            DTYPE_INT_t node) nogil:
+    """Add a node to a binary min-heap that holds *size* nodes."""
+    cdef DTYPE_INT_t child = size
+    cdef DTYPE_INT_t parent
+
+    while child > 0:
+        parent = (child - 1) // 2
+        if _heap_less(key, seq, node, heap[parent]):
+            heap[child] = heap[parent]
+            child = parent
+        else:
+            break
+    heap[child] = node
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef inline DTYPE_INT_t _heap_pop(DTYPE_INT_t [:] heap, DTYPE_INT_t size,
+                                  DTYPE_FLOAT_t [:] key,
+                                  DTYPE_INT_t [:] seq) nogil:
+    """Remove and return the smallest node of a heap of *size* nodes."""
+    cdef DTYPE_INT_t top = heap[0]
+    cdef DTYPE_INT_t last = heap[size - 1]
+    cdef DTYPE_INT_t parent = 0
+    cdef DTYPE_INT_t child
+
+    size -= 1
+    while True:
+        child = 2 * parent + 1
+        if child >= size:
+            break
+        if child + 1 < size and _heap_less(key, seq, heap[child + 1],
+                                           heap[child]):
+            child += 1
+        if _heap_less(key, seq, heap[child], last):
+            heap[parent] = heap[child]
+            parent = child
+        else:
+            break
+    if size > 0:
+        heap[parent] = last
+
+    return top
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def _priority_flood(const DTYPE_FLOAT_t [:] elev,
+                    const DTYPE_INT_t [:, :] nbrs,
+                    const DTYPE_INT_t [:, :] links,
+                    const DTYPE_INT_t [:] outlets,
+                    const np.uint8_t [:] closed,
+                    DTYPE_FLOAT_t [:] filled,
+                    DTYPE_INT_t [:] parent,
+                    DTYPE_INT_t [:] parent_link,
+                    DTYPE_INT_t [:] visit_order,
+                    DTYPE_FLOAT_t epsilon=0.):
+    """Flood a surface inward from its outlets.
+
+    Implements the Priority-Flood algorithm of Barnes et al. (2014). Nodes
+    are visited in order of their filled elevation, starting from the
+    *outlets*. Nodes that lie at or below the water level of the node from
+    which they are reached are placed in a first-in first-out queue, so that
+    depressions and flats are crossed breadth first from their spill points.
+
+    Parameters
+    ----------
+    elev : ndarray of float
+        Elevation at each node.
+    nbrs : ndarray of int, shape (n_nodes, n_nbrs)
+        Neighbors of each node, -1 where there is none.
+    links : ndarray of int, shape (n_nodes, n_nbrs)
+        Links (or diagonals) that connect each node to its neighbors.
+    outlets : ndarray of int
+        Nodes from which flooding starts.
+    closed : ndarray of uint8
+        Nodes that are never flooded.
+    filled : ndarray of float
+        Output. Elevation of the filled surface. Nodes that are not reached
+        are left unchanged.
+    parent : ndarray of int
+        Output. Node from which each node was reached; an outlet is its own
+        parent. Nodes that are not reached are left unchanged.
+    parent_link : ndarray of int
+        Output. Link between each node and its parent.
+    visit_order : ndarray of int
+        Output. Node IDs in the order they were reached. Returns the number
+        of nodes in this array.
+    epsilon : float, optional
+        If greater than zero, nodes in depressions are filled to be at
+        least this much higher than the node from which they are reached,
+        so that the filled surface has a gradient across flats.
+    """
+    cdef DTYPE_INT_t n_nodes = elev.shape[0]
+    cdef DTYPE_INT_t n_nbrs = nbrs.shape[1]
+    cdef DTYPE_INT_t n_outlets = outlets.shape[0]
+    cdef DTYPE_INT_t [:] heap = np.empty(n_nodes, dtype=DTYPE_INT)
+    cdef DTYPE_INT_t [:] seq = np.empty(n_nodes, dtype=DTYPE_INT)
+    cdef DTYPE_INT_t [:] pit_queue = np.empty(n_nodes, dtype=DTYPE_INT)
+    cdef np.uint8_t [:] visited = np.array(closed, dtype=np.uint8)
+    cdef DTYPE_INT_t heap_size = 0
+    cdef DTYPE_INT_t pit_first = 0
+    cdef DTYPE_INT_t pit_last = 0
+    cdef DTYPE_INT_t n_visited = 0
+    cdef DTYPE_INT_t i, k, node, nbr
+    cdef DTYPE_FLOAT_t level
+
+    with nogil:
+        for i in range(n_outlets):
+            node = outlets[i]
+            if visited[node]:
+                continue
+            visited[node] = True
+            filled[node] = elev[node]
+            parent[node] = node
+            parent_link[node] = -1
+            seq[node] = n_visited
+            visit_order[n_visited] = node
+            n_visited += 1
+            _heap_push(heap, heap_size, filled, seq, node)
+            heap_size += 1
+
+        while pit_first < pit_last or heap_size > 0:
+            if pit_first < pit_last:
+                node = pit_queue[pit_first]
+                pit_first += 1
+            else:
+                node = _heap_pop(heap, heap_size, filled, seq)
+                heap_size -= 1
+
+            level = filled[node]
+            if epsilon > 0.:
+                level = max(level + epsilon, nextafter(level, INFINITY))
+
+            for k in range(n_nbrs):
+                nbr = nbrs[node, k]
+                if nbr == -1 or visited[nbr]:
+                    continue
+                visited[nbr] = True
+                parent[nbr] = node
+                parent_link[nbr] = links[node, k]
+                seq[nbr] = n_visited
+                visit_order[n_visited] = nbr
+                n_visited += 1
+
+                if elev[nbr] <= level:
+                    filled[nbr] = level
+                    pit_queue[pit_last] = nbr
+                    pit_last += 1
+                else:
+                    filled[nbr] = elev[nbr]
+                    _heap_push(heap, heap_size, filled, seq, nbr)
+                    heap_size += 1
+
+    return n_visited
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def _find_depression_outlets(const DTYPE_INT_t [:] visit_order,
+                             const DTYPE_INT_t [:] parent,
+                             const np.uint8_t [:] flooded,
+                             DTYPE_INT_t [:] outlet):
+    """Find the node through which each flooded node spills.
+
+    For every flooded node, follow the chain of parents set by
+    *_priority_flood* up to the first node that is not flooded. Nodes must
+    be given in the order they were visited, so that parents come first.
+    """
+    cdef DTYPE_INT_t n_visited = visit_order.shape[0]
+    cdef DTYPE_INT_t i, node, up
+
+    with nogil:
+        for i in range(n_visited):
+            node = visit_order[i]
+            if flooded[node]:
+                up = parent[node]
+                if flooded[up]:
+                    outlet[node] = outlet[up]
+                else:
+                    outlet[node] = up
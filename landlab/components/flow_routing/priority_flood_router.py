@@ -0,0 +1,456 @@
+# -*- coding: utf-8 -*-
+"""Find and route flow across depressions using the Priority-Flood algorithm.
+
+Barnes, R., Lehman, C., Mulla, D. (2014). Priority-flood: An optimal
+depression-filling and watershed-labeling algorithm for digital elevation
+models. Computers & Geosciences, 62, 117-127.
+"""
+import numpy as np
+
+from landlab import CLOSED_BOUNDARY, CORE_NODE, Component, RasterModelGrid
+from landlab.components.flow_accum import flow_accum_bw
+from landlab.grid.base import BAD_INDEX_VALUE as LOCAL_BAD_INDEX_VALUE
+
+from .cfuncs import _find_depression_outlets, _priority_flood
+
+# Codes for depression status, as used by DepressionFinderAndRouter
+_UNFLOODED = 0
+_FLOODED = 3
+
+
+def _get_flood_connectivity(grid, d8):
+    """Get the connectivity needed to flood a grid with *_priority_flood*.
+
+    Parameters
+    ----------
+    grid : ModelGrid
+        A landlab grid.
+    d8 : bool
+        If True, nodes of a raster are also connected along diagonals.
+
+    Returns
+    -------
+    tuple of ndarray
+        Neighbors of each node (with closed neighbors set to -1), the links
+        (or diagonals) to those neighbors, a flag for closed nodes, and the
+        open boundary nodes from which flooding starts.
+
+    Examples
+    --------
+    >>> from landlab import RasterModelGrid
+    >>> from landlab.components.flow_routing.priority_flood_router import (
+    ...     _get_flood_connectivity,
+    ... )
+    >>> grid = RasterModelGrid((3, 4))
+    >>> grid.status_at_node[4] = grid.BC_NODE_IS_CLOSED
+    >>> nbrs, links, closed, outlets = _get_flood_connectivity(grid, False)
+    >>> nbrs[5]
+    array([ 6,  9, -1,  1])
+    >>> links[5]
+    array([ 8, 11,  7,  4])
+    >>> outlets
+    array([ 0,  1,  2,  3,  7,  8,  9, 10, 11])
+    """
+    if d8:
+        nbrs = np.hstack(
+            (grid.adjacent_nodes_at_node, grid.diagonal_adjacent_nodes_at_node)
+        )
+        links = grid.d8s_at_node
+    else:
+        nbrs = grid.adjacent_nodes_at_node.copy()
+        links = grid.links_at_node
+
+    is_closed = grid.status_at_node == CLOSED_BOUNDARY
+    nbrs[(nbrs != -1) & is_closed[nbrs]] = -1
+    outlets = np.setdiff1d(grid.boundary_nodes, grid.closed_boundary_nodes)
+
+    return (
+        np.ascontiguousarray(nbrs, dtype=int),
+        np.ascontiguousarray(links, dtype=int),
+        is_closed.astype(np.uint8),
+        outlets.astype(int),
+    )
+
+
+class PriorityFloodDepressionRouter(Component):
+
+    """Find depressions on a topographic surface and route flow across them.
+
+    This component is a drop-in alternative to DepressionFinderAndRouter.
+    Rather than flooding each pit in turn, the whole surface is flooded
+    inward from its open boundaries in a single compiled pass of the
+    Priority-Flood algorithm (Barnes et al., 2014), which takes
+    O(N log N) time for a grid of N nodes.
+
+    A node is part of a depression (a "lake") if it lies below the level at
+    which water would spill from it toward an open boundary, or if it is a
+    local sink on a flat. The depth of each depression node is recorded in
+    the field *depression__depth*, and the node over which it spills in
+    *depression__outlet_node*. Lakes are identified by their outlet node.
+
+    If asked to reroute flow, flow across lakes is directed breadth first
+    from the outlet, lake outlets are directed away from their lake, and
+    drainage area and discharge are recalculated. Receivers of all other
+    nodes are left as they were set by the flow director.
+
+    The primary method of this class is *map_depressions(reroute_flow=True)*.
+
+    Examples
+    --------
+    Route flow across a depression in a sloped surface.
+
+    >>> import numpy as np
+    >>> from landlab import RasterModelGrid
+    >>> from landlab.components import (
+    ...     FlowAccumulator,
+    ...     PriorityFloodDepressionRouter,
+    ... )
+    >>> mg = RasterModelGrid((7, 7), xy_spacing=0.5)
+    >>> z = mg.add_field('node', 'topographic__elevation', mg.node_x.copy())
+    >>> z += 0.01 * mg.node_y
+    >>> mg.at_node['topographic__elevation'].reshape(mg.shape)[2:5, 2:5] *= 0.1
+    >>> fr = FlowAccumulator(mg, flow_director='D8')
+    >>> fr.run_one_step()  # the flow "gets stuck" in the hole
+    >>> df = PriorityFloodDepressionRouter(mg)
+    >>> df.map_depressions()
+    >>> mg.at_node['flow__receiver_node'].reshape(mg.shape)
+    array([[ 0,  1,  2,  3,  4,  5,  6],
+           [ 7,  7, 16, 17, 18, 18, 13],
+           [14, 14,  8, 16, 17, 18, 20],
+           [21, 21, 16, 16, 17, 25, 27],
+           [28, 28, 23, 23, 24, 32, 34],
+           [35, 35, 30, 31, 32, 32, 41],
+           [42, 43, 44, 45, 46, 47, 48]])
+    >>> mg.at_node['drainage_area'].reshape(mg.shape)
+    array([[ 0.  ,  0.  ,  0.  ,  0.  ,  0.  ,  0.  ,  0.  ],
+           [ 5.25,  5.25,  0.25,  0.25,  0.25,  0.25,  0.  ],
+           [ 0.25,  0.25,  5.  ,  2.  ,  1.  ,  0.25,  0.  ],
+           [ 0.25,  0.25,  1.25,  1.25,  0.5 ,  0.25,  0.  ],
+           [ 0.25,  0.25,  0.5 ,  0.5 ,  1.  ,  0.25,  0.  ],
+           [ 0.25,  0.25,  0.25,  0.25,  0.25,  0.25,  0.  ],
+           [ 0.  ,  0.  ,  0.  ,  0.  ,  0.  ,  0.  ,  0.  ]])
+    >>> df.lake_map.reshape(mg.shape)  # doctest: +NORMALIZE_WHITESPACE
+    array([[-1, -1, -1, -1, -1, -1, -1],
+           [-1, -1, -1, -1, -1, -1, -1],
+           [-1, -1,  8,  8,  8, -1, -1],
+           [-1, -1,  8,  8,  8, -1, -1],
+           [-1, -1,  8,  8,  8, -1, -1],
+           [-1, -1, -1, -1, -1, -1, -1],
+           [-1, -1, -1, -1, -1, -1, -1]])
+    >>> df.lake_outlets
+    array([8])
+    >>> df.lake_areas
+    array([ 2.25])
+
+    The depths of the depressions are the same as those found by
+    DepressionFinderAndRouter.
+
+    >>> from landlab.components import DepressionFinderAndRouter
+    >>> depth = mg.at_node['depression__depth'].copy()
+    >>> DepressionFinderAndRouter(mg).map_depressions(pits=None, reroute_flow=False)
+    >>> np.allclose(mg.at_node['depression__depth'], depth)
+    True
+
+    The component can also be given to the FlowAccumulator as its
+    depression finder.
+
+    >>> fr = FlowAccumulator(
+    ...     mg,
+    ...     flow_director='D8',
+    ...     depression_finder='PriorityFloodDepressionRouter',
+    ... )
+    >>> fr.run_one_step()
+    >>> mg.at_node['drainage_area'][7]
+    5.25
+    """
+
+    _name = "PriorityFloodDepressionRouter"
+
+    _input_var_names = ("topographic__elevation",)
+
+    _output_var_names = (
+        "depression__depth",
+        "depression__outlet_node",
+        "flood_status_code",
+    )
+
+    _var_units = {
+        "topographic__elevation": "m",
+        "depression__depth": "m",
+        "depression__outlet_node": "-",
+        "flood_status_code": "-",
+    }
+
+    _var_mapping = {
+        "topographic__elevation": "node",
+        "depression__depth": "node",
+        "depression__outlet_node": "node",
+        "flood_status_code": "node",
+    }
+
+    _var_doc = {
+        "topographic__elevation": "Surface topographic elevation",
+        "depression__depth": "Depth of depression below its spillway point",
+        "depression__outlet_node": "If a depression, the id of the outlet node for that depression, "
+        "otherwise BAD_INDEX_VALUE",
+        "flood_status_code": "Map of flood status (_UNFLOODED=0, _FLOODED=3)",
+    }
+
+    def __init__(self, grid, routing="D8"):
+        """Create a PriorityFloodDepressionRouter.
+
+        Parameters
+        ----------
+        grid : ModelGrid
+            A landlab grid.
+        routing : 'D8' or 'D4' (optional)
+            If grid is a raster type, controls whether lake connectivity can
+            occur on diagonals ('D8', default), or only orthogonally ('D4').
+            Has no effect if grid is not a raster.
+        """
+        super(PriorityFloodDepressionRouter, self).__init__(grid)
+
+        if routing not in ("D8", "D4"):
+            raise ValueError("routing must be either 'D8' or 'D4'")
+        self._routing = routing
+        self._D8 = isinstance(grid, RasterModelGrid) and routing == "D8"
+
+        if "flow__receiver_node" in grid.at_node:
+            if grid.at_node["flow__receiver_node"].size != grid.number_of_nodes:
+                raise NotImplementedError(
+                    "A route-to-multiple flow director has been run on this "
+                    "grid. The depression router only works with route-to-one "
+                    "methods."
+                )
+
+        self._elev = grid.at_node["topographic__elevation"]
+
+        self.depression_depth = grid.add_zeros(
+            "node", "depression__depth", noclobber=False
+        )
+        self.depression_outlet_map = grid.add_zeros(
+            "node", "depression__outlet_node", dtype=int, noclobber=False
+        )
+        self.depression_outlet_map.fill(LOCAL_BAD_INDEX_VALUE)
+        self.flood_status = grid.add_zeros(
+            "node", "flood_status_code", dtype=int, noclobber=False
+        )
+
+        n_nodes = grid.number_of_nodes
+        self._filled = np.empty(n_nodes, dtype=float)
+        self._parent = np.empty(n_nodes, dtype=int)
+        self._parent_link = np.empty(n_nodes, dtype=int)
+        self._visit_order = np.empty(n_nodes, dtype=int)
+        self._is_flooded = np.zeros(n_nodes, dtype=np.uint8)
+
+        self._bc_set_code = grid.bc_set_code
+        self.updated_boundary_conditions()
+
+    def updated_boundary_conditions(self):
+        """Call this if boundary conditions on the grid are updated after the
+        component is instantiated."""
+        grid = self._grid
+        if self._D8:
+            self._length_of_link = grid.length_of_d8
+        else:
+            self._length_of_link = grid.length_of_link
+        (
+            self._nbrs,
+            self._links,
+            self._is_closed,
+            self._outlets,
+        ) = _get_flood_connectivity(grid, self._D8)
+
+    def _flood(self):
+        """Flood the surface inward from the open boundary nodes.
+
+        Returns the IDs of the nodes that were reached, in order.
+        """
+        n_visited = _priority_flood(
+            np.asarray(self._elev, dtype=float),
+            self._nbrs,
+            self._links,
+            self._outlets,
+            self._is_closed,
+            self._filled,
+            self._parent,
+            self._parent_link,
+            self._visit_order,
+        )
+        self._n_visited = n_visited
+        return self._visit_order[:n_visited]
+
+    def map_depressions(self, reroute_flow=True):
+        """Map depressions/lakes in a topographic surface.
+
+        Parameters
+        ----------
+        reroute_flow : bool, optional
+            If True (default), and the grid has the fields created by a
+            route-to-one flow director, modify them to route flow across the
+            lake surface(s). Ensure you call this method *after* you have
+            already routed flow in each loop of your model.
+
+        Examples
+        --------
+        >>> import numpy as np
+        >>> from landlab import RasterModelGrid
+        >>> from landlab.components import PriorityFloodDepressionRouter
+        >>> rg = RasterModelGrid((5, 5))
+        >>> z = rg.add_zeros('node', 'topographic__elevation')
+        >>> z[:] = np.array([100., 100.,  95., 100., 100.,
+        ...                  100., 101.,  92.,   1., 100.,
+        ...                  100., 101.,   2., 101., 100.,
+        ...                  100.,   3., 101., 101., 100.,
+        ...                   90.,  95., 100., 100., 100.])
+        >>> df = PriorityFloodDepressionRouter(rg)
+        >>> df.map_depressions(reroute_flow=False)
+        >>> rg.at_node['depression__depth'].reshape(rg.shape)
+        array([[  0.,   0.,   0.,   0.,   0.],
+               [  0.,   0.,   0.,  89.,   0.],
+               [  0.,   0.,  88.,   0.,   0.],
+               [  0.,  87.,   0.,   0.,   0.],
+               [  0.,   0.,   0.,   0.,   0.]])
+        >>> rg.at_node['depression__outlet_node'][[8, 12, 16]]
+        array([20, 20, 20])
+        """
+        if self._bc_set_code != self.grid.bc_set_code:
+            self.updated_boundary_conditions()
+            self._bc_set_code = self.grid.bc_set_code
+
+        visit_order = self._flood()
+
+        reached = np.zeros(self._grid.number_of_nodes, dtype=bool)
+        reached[visit_order] = True
+
+        is_core = self._grid.status_at_node == CORE_NODE
+        flooded = reached & is_core & (self._filled > self._elev)
+
+        reroute_flow = reroute_flow and "flow__receiver_node" in self._grid.at_node
+        if reroute_flow:
+            receivers = self._grid.at_node["flow__receiver_node"]
+            flooded |= reached & is_core & (receivers == np.arange(len(receivers)))
+
+        self._is_flooded[:] = flooded
+        _find_depression_outlets(
+            visit_order, self._parent, self._is_flooded, self.depression_outlet_map
+        )
+
+        self.flood_status.fill(_UNFLOODED)
+        self.flood_status[flooded] = _FLOODED
+        self.depression_depth.fill(0.)
+        self.depression_depth[flooded] = (self._filled - self._elev)[flooded]
+        self.depression_outlet_map[~flooded] = LOCAL_BAD_INDEX_VALUE
+
+        if reroute_flow:
+            self._route_flow(reached & is_core, flooded)
+            if "drainage_area" in self._grid.at_node:
+                self._reaccumulate_flow()
+
+    def _route_flow(self, rerouteable, flooded):
+        """Route flow across lakes and away from lake outlets.
+
+        A node keeps its receiver unless it is in a lake, or its receiver
+        would not carry flow closer to an open boundary in the order in which
+        nodes were flooded. Such nodes instead drain to the node from which
+        they were flooded.
+        """
+        receivers = self._grid.at_node["flow__receiver_node"]
+
+        order = np.full_like(self._parent, len(self._parent))
+        order[self._visit_order[: self._n_visited]] = np.arange(self._n_visited)
+        filled_at_receiver = self._filled[receivers]
+        drains_away = (filled_at_receiver < self._filled) | (
+            (filled_at_receiver == self._filled) & (order[receivers] < order)
+        )
+        reroute = np.where(rerouteable & (flooded | ~drains_away))[0]
+
+        new_receivers = self._parent[reroute]
+        new_links = self._parent_link[reroute]
+        receivers[reroute] = new_receivers
+
+        if "flow__link_to_receiver_node" in self._grid.at_node:
+            self._grid.at_node["flow__link_to_receiver_node"][reroute] = new_links
+        if "topographic__steepest_slope" in self._grid.at_node:
+            slopes = (
+                self._elev[reroute] - self._elev[new_receivers]
+            ) / self._length_of_link[new_links]
+            self._grid.at_node["topographic__steepest_slope"][reroute] = np.maximum(
+                slopes, 0.
+            )
+        if "flow__sink_flag" in self._grid.at_node:
+            self._grid.at_node["flow__sink_flag"][reroute] = False
+
+    def _reaccumulate_flow(self):
+        """Update drainage area, discharge, and upstream order."""
+        Q_in = self._grid.at_node["water__unit_flux_in"]
+        areas = self._grid.cell_area_at_node.copy()
+        areas[self._grid.closed_boundary_nodes] = 0.
+
+        a, q, s = flow_accum_bw.flow_accumulation(
+            self._grid.at_node["flow__receiver_node"],
+            node_cell_area=areas,
+            runoff_rate=Q_in,
+        )
+
+        self._grid.at_node["drainage_area"][:] = a
+        self._grid.at_node["surface_water__discharge"][:] = q
+        self._grid.at_node["flow__upstream_node_order"][:] = s
+
+    @property
+    def lake_map(self):
+        """Return an array of ints, where each node within a lake is labelled
+        with the outlet node of that lake. Nodes not in a lake are labelled
+        with LOCAL_BAD_INDEX_VALUE."""
+        return self.depression_outlet_map
+
+    @property
+    def lake_at_node(self):
+        """Return a boolean array, True if the node is flooded, False
+        otherwise."""
+        return self.flood_status == _FLOODED
+
+    @property
+    def lake_outlets(self):
+        """Returns the outlet of each lake, in increasing order."""
+        return np.unique(self.depression_outlet_map[self.lake_at_node])
+
+    @property
+    def lake_codes(self):
+        """Returns the code of each lake used in *lake_map*. Lakes are
+        identified by their outlet node, so this is the same as
+        *lake_outlets*."""
+        return self.lake_outlets
+
+    @property
+    def number_of_lakes(self):
+        """Return the number of individual lakes."""
+        return len(self.lake_outlets)
+
+    @property
+    def lake_areas(self):
+        """A nlakes-long array of the area of each lake.
+
+        The order is the same as that returned by *lake_codes*.
+        """
+        return self._sum_over_lakes(self._grid.cell_area_at_node)
+
+    @property
+    def lake_volumes(self):
+        """A nlakes-long array of the volume of each lake.
+
+        The order is the same as that returned by *lake_codes*.
+        """
+        return self._sum_over_lakes(
+            self._grid.cell_area_at_node * self.depression_depth
+        )
+
+    def _sum_over_lakes(self, values):
+        """Sum node values over the nodes of each lake."""
+        in_lake = self.lake_at_node
+        codes, lake_of_node = np.unique(
+            self.depression_outlet_map[in_lake], return_inverse=True
+        )
+        return np.bincount(
+            lake_of_node, weights=values[in_lake], minlength=len(codes)
+        ).astype(float)
@@ -0,0 +1,129 @@
+import numpy as np
+import pytest
+from numpy.testing import assert_array_almost_equal, assert_array_equal
+
+from landlab import BAD_INDEX_VALUE as XX, HexModelGrid, RasterModelGrid
+from landlab.components import (
+    DepressionFinderAndRouter,
+    FlowAccumulator,
+    PriorityFloodDepressionRouter,
+)
+
+
+def _random_grid(grid, seed):
+    np.random.seed(seed)
+    grid.add_field(
+        "topographic__elevation",
+        np.round(20. * np.random.rand(grid.number_of_nodes)),
+        at="node",
+    )
+    return grid
+
+
+def test_route_to_multiple_error_raised():
+    mg = RasterModelGrid((10, 10))
+    z = mg.add_zeros("node", "topographic__elevation")
+    z += mg.x_of_node + mg.y_of_node
+    fa = FlowAccumulator(mg, flow_director="MFD")
+    fa.run_one_step()
+
+    with pytest.raises(NotImplementedError):
+        PriorityFloodDepressionRouter(mg)
+
+
+def test_bad_routing():
+    mg = RasterModelGrid((10, 10))
+    mg.add_zeros("node", "topographic__elevation")
+    with pytest.raises(ValueError):
+        PriorityFloodDepressionRouter(mg, routing="D6")
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("routing", ["D4", "D8"])
+def test_same_as_depression_finder_raster(seed, routing):
+    flow_director = "D8" if routing == "D8" else "D4"
+    grids = []
+    for depression_finder in (
+        "DepressionFinderAndRouter",
+        "PriorityFloodDepressionRouter",
+    ):
+        mg = _random_grid(RasterModelGrid((12, 15)), seed)
+        mg.set_closed_boundaries_at_grid_edges(True, False, True, False)
+        fa = FlowAccumulator(
+            mg,
+            flow_director=flow_director,
+            depression_finder=depression_finder,
+            routing=routing,
+        )
+        fa.run_one_step()
+        grids.append(mg)
+
+    assert_array_almost_equal(
+        grids[0].at_node["depression__depth"], grids[1].at_node["depression__depth"]
+    )
+    is_lake = grids[1].at_node["depression__depth"] > 0.
+    assert np.all(grids[0].at_node["flood_status_code"][is_lake] == 3)
+
+    mg = grids[1]
+    receivers = mg.at_node["flow__receiver_node"]
+    assert np.all(receivers[mg.core_nodes] != mg.core_nodes)
+    assert mg.at_node["drainage_area"][mg.boundary_nodes].sum() == pytest.approx(
+        mg.cell_area_at_node.sum()
+    )
+
+
+def test_same_as_depression_finder_hex():
+    hg0 = _random_grid(HexModelGrid(7, 7), 1)
+    DepressionFinderAndRouter(hg0).map_depressions(pits=None, reroute_flow=False)
+
+    hg1 = _random_grid(HexModelGrid(7, 7), 1)
+    fa = FlowAccumulator(hg1, depression_finder=PriorityFloodDepressionRouter)
+    fa.run_one_step()
+
+    assert_array_almost_equal(
+        hg0.at_node["depression__depth"], hg1.at_node["depression__depth"]
+    )
+    assert hg1.at_node["drainage_area"][hg1.boundary_nodes].sum() == pytest.approx(
+        hg1.cell_area_at_node.sum()
+    )
+
+
+def test_lake_outlet_drains_away_from_lake():
+    mg = RasterModelGrid((5, 6))
+    mg.set_closed_boundaries_at_grid_edges(True, True, True, False)
+    mg.add_field(
+        "topographic__elevation",
+        np.array(
+            [
+                [0., 0., 0., 0., 0., 0.],
+                [0., 1., 5., 5., 5., 0.],
+                [0., 3., 6., 6., 6., 0.],
+                [0., 1., 7., 7., 7., 0.],
+                [0., 0., 0., 0., 0., 0.],
+            ]
+        ).flatten(),
+        at="node",
+    )
+    fa = FlowAccumulator(
+        mg,
+        flow_director="D4",
+        depression_finder="PriorityFloodDepressionRouter",
+        routing="D4",
+    )
+    fa.run_one_step()
+    df = fa.depression_finder
+
+    assert_array_equal(df.lake_outlets, [13])
+    assert_array_equal(np.where(df.lake_at_node)[0], [19])
+    assert mg.at_node["depression__depth"][19] == pytest.approx(2.)
+    assert mg.at_node["depression__outlet_node"][19] == 13
+    assert mg.at_node["depression__outlet_node"][13] == XX
+
+    receivers = mg.at_node["flow__receiver_node"]
+    assert receivers[19] == 13
+    assert receivers[13] == 7
+    assert receivers[7] == 1
+    assert mg.at_node["drainage_area"][1] == pytest.approx(5.)
+    assert df.number_of_lakes == 1
+    assert_array_almost_equal(df.lake_areas, [1.])
+    assert_array_almost_equal(df.lake_volumes, [2.])
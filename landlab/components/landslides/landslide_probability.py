@@ -35,6 +35,14 @@ from statsmodels.distributions.empirical_distribution import ECDF
 from landlab import Component
 from landlab.utils.decorators import use_file_name_or_kwds
 
+# Approximate number of bytes of samples held in memory at once by
+# calculate_landslide_probability.
+_MEMORY_BUDGET = 2 ** 27
+
+# Number of (n_nodes, number_of_iterations) float arrays that are alive at
+# once when a chunk of nodes is sampled.
+_ARRAYS_PER_CHUNK = 12
+
 
 class LandslideProbability(Component):
     """Landslide probability component using the infinite slope stability
@@ -52,7 +60,15 @@ class LandslideProbability(Component):
     The main method of the LandslideProbability class is
     calculate_landslide_probability(), which calculates the mean soil relative
     wetness, probability of soil saturation, and probability of failure at
-    each node based on a Monte Carlo simulation.
+    each node based on a Monte Carlo simulation. Core nodes are simulated
+    in chunks, sized to fit in a fixed memory budget, and all iterations
+    for all of the nodes of a chunk are sampled and evaluated at once.
+
+    Random numbers are drawn from :class:`numpy.random.RandomState` streams
+    derived from *seed*. Each chunk has its own stream, so results are
+    reproducible for a given seed and chunk size, and chunks can be
+    calculated independently of one another (for instance, by separate
+    processes) with :meth:`calculate_landslide_probability_of_chunk`.
 
     **Usage:**
 
@@ -294,6 +310,7 @@ class LandslideProbability(Component):
         groundwater__recharge_standard_deviation=None,
         groundwater__recharge_HSD_inputs=[],
         seed=0,
+        chunk_size=None,
         **kwds
     ):
         """
@@ -331,7 +348,14 @@ class LandslideProbability(Component):
             seed for random number generation. if seed is assigned any value
             other than the default value of zero, it will create different
             sequence. To create a certain sequence repititively, use the same
-            value as input for seed.
+            value as input for seed. Each chunk of core nodes draws from its
+            own stream of this seed, so results for a given seed also depend
+            on *chunk_size*.
+        chunk_size: int, optional
+            number of core nodes simulated at once. The default is the
+            largest number whose samples fit in about 128 MB, which depends
+            on *number_of_iterations*. Results for a given seed depend on the
+            chunk size, so pass the same *chunk_size* to reproduce a run.
         """
         # Initialize seeded random number generation
         self._seed_generator(seed)
@@ -340,6 +364,9 @@ class LandslideProbability(Component):
 
         # Store grid and parameters and do unit conversions
         self.n = int(number_of_iterations)
+        if chunk_size is None:
+            chunk_size = _MEMORY_BUDGET // (_ARRAYS_PER_CHUNK * 8 * self.n)
+        self._chunk_size = max(int(chunk_size), 1)
         self._g = kwds.get("g", scipy.constants.g)
         self.groundwater__recharge_distribution = groundwater__recharge_distribution
         # Following code will deal with the input distribution and associated
@@ -348,7 +375,7 @@ class LandslideProbability(Component):
         if self.groundwater__recharge_distribution == "uniform":
             self._recharge_min = groundwater__recharge_min_value
             self._recharge_max = groundwater__recharge_max_value
-            self._Re = np.random.uniform(
+            self._Re = self._rng.uniform(
                 self._recharge_min, self._recharge_max, size=self.n
             )
             self._Re /= 1000.  # Convert mm to m
@@ -369,7 +396,7 @@ class LandslideProbability(Component):
             self._sigma_lognormal = np.sqrt(
                 np.log((self._recharge_stdev ** 2) / (self._recharge_mean ** 2) + 1)
             )
-            self._Re = np.random.lognormal(
+            self._Re = self._rng.lognormal(
                 self._mu_lognormal, self._sigma_lognormal, self.n
             )
             self._Re /= 1000.  # Convert mm to m
@@ -428,108 +455,157 @@ class LandslideProbability(Component):
         i: int
             index of core node ID.
         """
+        self._calculate_factor_of_safety_at_nodes(np.array([i]), self._rng)
+
+        self._C = self._C[0]
+        self._phi = self._phi[0]
+        self._hs = self._hs[0]
+        self._T = self._T[0]
+        self._C_dim = self._C_dim[0]
+        self._rel_wetness = self._rel_wetness[0]
+        self._FS = self._FS[0]
+        self._soil__probability_of_saturation = self._prob_sat_at_nodes[0]
+        self._soil__mean_relative_wetness = self._mean_rel_wetness_at_nodes[0]
+        self._landslide__probability_of_failure = self._prob_fail_at_nodes[0]
+
+    def _calculate_factor_of_safety_at_nodes(self, nodes, rng):
+        """Calculate factor of safety at a set of nodes.
+
+        Samples every parameter distribution *n* times for each of the
+        *nodes*, as arrays of shape (len(nodes), n), using the random-number
+        generator *rng*. Probabilities of saturation and failure and mean
+        relative wetness at each of the nodes are stored as arrays.
+        """
+        size = (len(nodes), self.n)
+
         # generate distributions to sample from to provide input parameters
         # currently triangle distribution using mode, min, & max
-        self._a = np.float32(
-            self.grid.at_node["topographic__specific_contributing_area"][i]
-        )
-        self._theta = np.float32(self.grid.at_node["topographic__slope"][i])
-        self._Tmode = np.float32(self.grid.at_node["soil__transmissivity"][i])
-        self._Ksatmode = np.float32(
-            self.grid.at_node["soil__saturated_hydraulic_conductivity"][i]
-        )
-        self._Cmode = np.float32(self.grid.at_node["soil__mode_total_cohesion"][i])
-        self._Cmin = np.float32(self.grid.at_node["soil__minimum_total_cohesion"][i])
-        self._Cmax = np.float32(self.grid.at_node["soil__maximum_total_cohesion"][i])
-        self._phi_mode = np.float32(
-            self.grid.at_node["soil__internal_friction_angle"][i]
-        )
-        self._rho = np.float32(self.grid.at_node["soil__density"][i])
-        self._hs_mode = np.float32(self.grid.at_node["soil__thickness"][i])
+        def at_nodes(name):
+            return np.float32(self.grid.at_node[name][nodes])[:, np.newaxis]
+
+        a = at_nodes("topographic__specific_contributing_area")
+        theta = at_nodes("topographic__slope")
+        Tmode = at_nodes("soil__transmissivity")
+        Ksatmode = at_nodes("soil__saturated_hydraulic_conductivity")
+        Cmode = at_nodes("soil__mode_total_cohesion")
+        Cmin = at_nodes("soil__minimum_total_cohesion")
+        Cmax = at_nodes("soil__maximum_total_cohesion")
+        phi_mode = at_nodes("soil__internal_friction_angle")
+        rho = at_nodes("soil__density")
+        hs_mode = at_nodes("soil__thickness")
 
         # recharge distribution based on distribution type
         if self.groundwater__recharge_distribution == "data_driven_spatial":
-            self._calculate_HSD_recharge(i)
-            self._Re /= 1000.  # mm->m
+            Re = np.empty(size)
+            for row, i in enumerate(nodes):
+                self._calculate_HSD_recharge(i)
+                Re[row] = self._Re
+            Re /= 1000.  # mm->m
         elif self.groundwater__recharge_distribution == "lognormal_spatial":
-            mu_lognormal = np.log(
-                (self._recharge_mean[i] ** 2)
-                / np.sqrt(self._recharge_stdev[i] ** 2 + self._recharge_mean[i] ** 2)
-            )
-            sigma_lognormal = np.sqrt(
-                np.log(
-                    (self._recharge_stdev[i] ** 2) / (self._recharge_mean[i] ** 2) + 1
-                )
-            )
-            self._Re = np.random.lognormal(mu_lognormal, sigma_lognormal, self.n)
-            self._Re /= 1000.  # Convert mm to m
+            mean = self._recharge_mean[nodes][:, np.newaxis]
+            stdev = self._recharge_stdev[nodes][:, np.newaxis]
+            mu_lognormal = np.log((mean ** 2) / np.sqrt(stdev ** 2 + mean ** 2))
+            sigma_lognormal = np.sqrt(np.log((stdev ** 2) / (mean ** 2) + 1))
+            Re = rng.lognormal(mu_lognormal, sigma_lognormal, size)
+            Re /= 1000.  # Convert mm to m
+        else:
+            Re = self._Re
 
         # Cohesion
         # if don't provide fields of min and max C, uncomment 2 lines below
-        #    Cmin = self._Cmode-0.3*self._Cmode
-        #    Cmax = self._Cmode+0.3*self._Cmode
-        self._C = np.random.triangular(self._Cmin, self._Cmode, self._Cmax, size=self.n)
+        #    Cmin = Cmode-0.3*Cmode
+        #    Cmax = Cmode+0.3*Cmode
+        self._C = rng.triangular(Cmin, Cmode, Cmax, size=size)
 
         # phi - internal angle of friction provided in degrees
-        phi_min = self._phi_mode - 0.18 * self._phi_mode
-        phi_max = self._phi_mode + 0.32 * self._phi_mode
-        self._phi = np.random.triangular(phi_min, self._phi_mode, phi_max, size=self.n)
+        phi_min = phi_mode - 0.18 * phi_mode
+        phi_max = phi_mode + 0.32 * phi_mode
+        self._phi = rng.triangular(phi_min, phi_mode, phi_max, size=size)
         # soil thickness
-        # hs_min = min(0.005, self._hs_mode-0.3*self._hs_mode) # Alternative
-        hs_min = self._hs_mode - 0.3 * self._hs_mode
-        hs_max = self._hs_mode + 0.1 * self._hs_mode
-        self._hs = np.random.triangular(hs_min, self._hs_mode, hs_max, size=self.n)
+        # hs_min = min(0.005, hs_mode-0.3*hs_mode) # Alternative
+        hs_min = hs_mode - 0.3 * hs_mode
+        hs_max = hs_mode + 0.1 * hs_mode
+        self._hs = rng.triangular(hs_min, hs_mode, hs_max, size=size)
         self._hs[self._hs <= 0.] = 0.005
         if self.Ksat_provided:
             # Hydraulic conductivity (Ksat)
-            Ksatmin = self._Ksatmode - (0.3 * self._Ksatmode)
-            Ksatmax = self._Ksatmode + (0.1 * self._Ksatmode)
-            self._Ksat = np.random.triangular(
-                Ksatmin, self._Ksatmode, Ksatmax, size=self.n
-            )
-            self._T = self._Ksat * self._hs
+            Ksatmin = Ksatmode - (0.3 * Ksatmode)
+            Ksatmax = Ksatmode + (0.1 * Ksatmode)
+            self._T = rng.triangular(Ksatmin, Ksatmode, Ksatmax, size=size)
+            self._T *= self._hs
         else:
             # Transmissivity (T)
-            Tmin = self._Tmode - (0.3 * self._Tmode)
-            Tmax = self._Tmode + (0.1 * self._Tmode)
-            self._T = np.random.triangular(Tmin, self._Tmode, Tmax, size=self.n)
+            Tmin = Tmode - (0.3 * Tmode)
+            Tmax = Tmode + (0.1 * Tmode)
+            self._T = rng.triangular(Tmin, Tmode, Tmax, size=size)
 
         # calculate Factor of Safety for n number of times
         # calculate components of FS equation
-        self._C_dim = self._C / (
-            self._hs * self._rho * self._g
-        )  # dimensionless cohesion
-        self._rel_wetness = ((self._Re) / self._T) * (
-            self._a / np.sin(np.arctan(self._theta))
-        )  # relative wetness
-        # calculate probability of saturation
-        countr = 0
-        for val in self._rel_wetness:  # find how many RW values >= 1
-            if val >= 1.0:
-                countr = countr + 1  # number with RW values (>=1)
-        # probability: No. high RW values/total No. of values (n)
-        self._soil__probability_of_saturation = np.float32(countr) / self.n
+        sin_theta = np.sin(np.arctan(theta))
+        cos_theta = np.cos(np.arctan(theta))
+        self._C_dim = self._C / (self._hs * rho * self._g)  # dimensionless cohesion
+        self._rel_wetness = (Re / self._T) * (a / sin_theta)  # relative wetness
+
+        # probability of saturation: No. high RW values (>=1)/total No. of
+        # values (n)
+        n_saturated = np.sum(self._rel_wetness >= 1.0, axis=1)
+        self._prob_sat_at_nodes = n_saturated / np.float32(self.n)
         # Maximum Rel_wetness = 1.0
-        np.place(self._rel_wetness, self._rel_wetness > 1, 1.0)
-        self._soil__mean_relative_wetness = np.mean(self._rel_wetness)
-        Y = np.tan(np.radians(self._phi)) * (1 - (self._rel_wetness * 0.5))
+        np.minimum(self._rel_wetness, 1.0, out=self._rel_wetness)
+        self._mean_rel_wetness_at_nodes = np.mean(self._rel_wetness, axis=1)
+
         # convert from degrees; 0.5 = water to soil density ratio
+        Y = np.tan(np.radians(self._phi))
+        Y *= 1 - (self._rel_wetness * 0.5)
         # calculate Factor-of-safety
-        self._FS = (self._C_dim / np.sin(np.arctan(self._theta))) + (
-            np.cos(np.arctan(self._theta)) * (Y / np.sin(np.arctan(self._theta)))
+        self._FS = self._C_dim / sin_theta
+        self._FS += cos_theta * (Y / sin_theta)
+
+        # probability: No. unstable values (<=1)/total No. of values (n)
+        n_failed = np.sum(self._FS <= 1.0, axis=1)
+        self._prob_fail_at_nodes = n_failed / np.float32(self.n)
+
+    @property
+    def number_of_chunks(self):
+        """Number of chunks of core nodes that are simulated separately."""
+        return -(-self.grid.number_of_core_nodes // self._chunk_size)
+
+    def calculate_landslide_probability_of_chunk(self, chunk):
+        """Run the Monte Carlo simulation for one chunk of core nodes.
+
+        Each chunk draws its random numbers from its own stream, so chunks
+        can be calculated in any order, or by different processes, and
+        give the same results.
+
+        Parameters
+        ----------
+        chunk: int
+            index of the chunk, between 0 and *number_of_chunks* - 1.
+
+        Returns
+        -------
+        tuple of ndarray
+            Core nodes of the chunk, and the mean relative wetness,
+            probability of failure and probability of saturation at them.
+        """
+        start = chunk * self._chunk_size
+        nodes = self.grid.core_nodes[start : start + self._chunk_size]
+        rng = np.random.RandomState([self._seed, chunk])
+
+        self._calculate_factor_of_safety_at_nodes(nodes, rng)
+
+        return (
+            nodes,
+            self._mean_rel_wetness_at_nodes,
+            self._prob_fail_at_nodes,
+            self._prob_sat_at_nodes,
         )
-        count = 0
-        for val in self._FS:  # find how many FS values <= 1
-            if val <= 1.0:
-                count = count + 1  # number with unstable FS values (<=1)
-        # probability: No. unstable values/total No. of values (n)
-        self._landslide__probability_of_failure = np.float32(count) / self.n
 
     def calculate_landslide_probability(self, **kwds):
         """Main method of Landslide Probability class.
 
-        Method creates arrays for output variables then loops through all
-        the core nodes to run the method 'calculate_factor_of_safety.'
+        Method creates arrays for output variables then runs the Monte Carlo
+        simulation over the core nodes, one chunk at a time.
         Output parameters probability of failure, mean relative wetness,
         and probability of saturation are assigned as fields to nodes.
         """
@@ -538,13 +614,14 @@ class LandslideProbability(Component):
         self.prob_fail = np.full(self.grid.number_of_nodes, -9999.)
         self.prob_sat = np.full(self.grid.number_of_nodes, -9999.)
         # Run factor of safety Monte Carlo for all core nodes in domain
-        # i refers to each core node id
-        for i in self.grid.core_nodes:
-            self.calculate_factor_of_safety(i)
+        for chunk in range(self.number_of_chunks):
+            nodes, rel_wetness, prob_fail, prob_sat = (
+                self.calculate_landslide_probability_of_chunk(chunk)
+            )
             # Populate storage arrays with calculated values
-            self.mean_Relative_Wetness[i] = self._soil__mean_relative_wetness
-            self.prob_fail[i] = self._landslide__probability_of_failure
-            self.prob_sat[i] = self._soil__probability_of_saturation
+            self.mean_Relative_Wetness[nodes] = rel_wetness
+            self.prob_fail[nodes] = prob_fail
+            self.prob_sat[nodes] = prob_sat
         # Values can't be negative
         self.mean_Relative_Wetness[self.mean_Relative_Wetness < 0.] = 0.
         self.prob_fail[self.prob_fail < 0.] = 0.
@@ -556,12 +633,15 @@ class LandslideProbability(Component):
     def _seed_generator(self, seed=0):
         """Method to initiate random seed.
 
-        Seed the random-number generator. This method will create the same
-        sequence again by re-seeding with the same value (default value is
-        zero). To create a sequence other than the default, assign non-zero
-        value for seed.
+        Create the random-number generator used for the recharge
+        distribution. This method will create the same sequence again by
+        re-seeding with the same value (default value is zero). To create a
+        sequence other than the default, assign non-zero value for seed.
+        Each chunk of nodes uses a generator of its own, seeded with both
+        *seed* and the index of the chunk.
         """
-        np.random.seed(seed)
+        self._seed = seed
+        self._rng = np.random.RandomState(seed)
 
     def _interpolate_HSD_dict(self):
         """Method to extrapolate input data.
@@ -572,7 +652,7 @@ class LandslideProbability(Component):
         """
         HSD_dict = copy.deepcopy(self._HSD_dict)
         # First generate interpolated Re for each HSD grid
-        Yrand = np.sort(np.random.rand(self.n))
+        Yrand = np.sort(self._rng.random_sample(self.n))
         # n random numbers (0 to 1) in a column
         for vkey in HSD_dict.keys():
             if isinstance(HSD_dict[vkey], int):
@@ -3,7 +3,7 @@ Unit tests for landlab.components.landslides.landslide_probability
 """
 import numpy as np
 import pytest
-from numpy.testing import assert_array_almost_equal
+from numpy.testing import assert_array_almost_equal, assert_array_equal
 
 from landlab import RasterModelGrid
 from landlab.components import LandslideProbability
@@ -195,10 +195,10 @@ def test_calculate_landslide_probability_lognormal_method():
     )
     ls_prob_lognormal.calculate_landslide_probability()
     np.testing.assert_almost_equal(
-        grid_2.at_node["landslide__probability_of_failure"][5], 0.8
+        grid_2.at_node["landslide__probability_of_failure"][5], 0.9
     )
     np.testing.assert_almost_equal(
-        grid_2.at_node["landslide__probability_of_failure"][9], 0.4
+        grid_2.at_node["landslide__probability_of_failure"][9], 0.5
     )
 
 
@@ -242,8 +242,89 @@ def test_calculate_landslide_probability_lognormal_spatial_method():
     )
     ls_prob_lognormal_spatial.calculate_landslide_probability()
     np.testing.assert_almost_equal(
-        grid_3.at_node["landslide__probability_of_failure"][5], 0.4
+        grid_3.at_node["landslide__probability_of_failure"][5], 0.6
     )
     np.testing.assert_almost_equal(
-        grid_3.at_node["landslide__probability_of_failure"][9], 0.29999999
+        grid_3.at_node["landslide__probability_of_failure"][9], 0.1
     )
+
+
+def _make_lognormal_spatial_grid():
+    grid = RasterModelGrid((6, 7), xy_spacing=(0.2, 0.2))
+    gridnum = grid.number_of_nodes
+    np.random.seed(seed=8)
+    grid.at_node["topographic__slope"] = np.random.rand(gridnum)
+    scatter_dat = np.random.randint(1, 10, gridnum)
+    grid.at_node["topographic__specific_contributing_area"] = np.sort(
+        np.random.randint(30, 900, gridnum)
+    )
+    grid.at_node["soil__transmissivity"] = np.sort(
+        np.random.randint(5, 20, gridnum), -1
+    )
+    grid.at_node["soil__mode_total_cohesion"] = np.sort(
+        np.random.randint(30, 900, gridnum)
+    )
+    grid.at_node["soil__minimum_total_cohesion"] = (
+        grid.at_node["soil__mode_total_cohesion"] - scatter_dat
+    )
+    grid.at_node["soil__maximum_total_cohesion"] = (
+        grid.at_node["soil__mode_total_cohesion"] + scatter_dat
+    )
+    grid.at_node["soil__internal_friction_angle"] = np.sort(
+        np.random.randint(26, 37, gridnum)
+    )
+    grid.at_node["soil__thickness"] = np.sort(np.random.randint(1, 10, gridnum))
+    grid.at_node["soil__density"] = 2000. * np.ones(gridnum)
+    recharge_mean = np.random.randint(2, 7, gridnum)
+    recharge_stdev = np.random.rand(gridnum)
+    return grid, recharge_mean, recharge_stdev
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, None])
+def test_calculate_landslide_probability_is_reproducible(chunk_size):
+    """Test that runs with the same seed give the same probabilities."""
+    probabilities = []
+    for _ in range(2):
+        grid, recharge_mean, recharge_stdev = _make_lognormal_spatial_grid()
+        ls_prob = LandslideProbability(
+            grid,
+            number_of_iterations=50,
+            groundwater__recharge_distribution="lognormal_spatial",
+            groundwater__recharge_mean=recharge_mean,
+            groundwater__recharge_standard_deviation=recharge_stdev,
+            seed=3,
+            chunk_size=chunk_size,
+        )
+        ls_prob.calculate_landslide_probability()
+        probabilities.append(
+            grid.at_node["landslide__probability_of_failure"].copy()
+        )
+    assert_array_equal(probabilities[0], probabilities[1])
+    assert np.all(probabilities[0][grid.core_nodes] >= 0.)
+    assert np.all(probabilities[0][grid.core_nodes] <= 1.)
+
+
+def test_calculate_landslide_probability_of_chunk():
+    """Test that chunks can be calculated independently, in any order."""
+    grid, recharge_mean, recharge_stdev = _make_lognormal_spatial_grid()
+    ls_prob = LandslideProbability(
+        grid,
+        number_of_iterations=50,
+        groundwater__recharge_distribution="lognormal_spatial",
+        groundwater__recharge_mean=recharge_mean,
+        groundwater__recharge_standard_deviation=recharge_stdev,
+        seed=3,
+        chunk_size=7,
+    )
+    assert ls_prob.number_of_chunks == 3
+    ls_prob.calculate_landslide_probability()
+    prob_fail = grid.at_node["landslide__probability_of_failure"].copy()
+    prob_sat = grid.at_node["soil__probability_of_saturation"].copy()
+
+    for chunk in reversed(range(ls_prob.number_of_chunks)):
+        nodes, _, chunk_prob_fail, chunk_prob_sat = (
+            ls_prob.calculate_landslide_probability_of_chunk(chunk)
+        )
+        assert_array_equal(nodes, grid.core_nodes[chunk * 7 : (chunk + 1) * 7])
+        assert_array_equal(chunk_prob_fail, prob_fail[nodes])
+        assert_array_equal(chunk_prob_sat, prob_sat[nodes])
@@ -63,6 +63,7 @@ class LithoLayers(Lithology):
         y0=0,
         function=lambda x, y: 0 * x + 0 * y,
         layer_type="EventLayers",
+        path=None,
     ):
         """Create a new instance of a LithoLayers.
 
@@ -91,6 +92,9 @@ class LithoLayers(Lithology):
             used, then erosion removes material and creates layers of thickness
             zero. Thus, EventLayers may be appropriate if the user is interested
             in chronostratigraphy.
+        path : str, optional
+            Folder in which to store the layers. If given, the layers are
+            kept in memory-mapped files in this folder rather than in memory.
 
         Examples
         --------
@@ -186,5 +190,10 @@ class LithoLayers(Lithology):
             layer_ids.append(ids[i] * np.ones(z_surf.size))
 
         super(LithoLayers, self).__init__(
-            grid, layer_thicknesses, layer_ids, attrs, layer_type=layer_type
+            grid,
+            layer_thicknesses,
+            layer_ids,
+            attrs,
+            layer_type=layer_type,
+            path=path,
         )
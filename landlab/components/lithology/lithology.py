@@ -4,7 +4,6 @@
 
 import numpy as np
 import xarray as xr
-from scipy.interpolate import interp1d
 
 from landlab import Component
 from landlab.layers import EventLayers, MaterialLayers
@@ -63,7 +62,9 @@ class Lithology(Component):
                     author = "Katherine R. Barnhart and Eric Hutton and Nicole M. Gasparini and Gregory E. Tucker",
                     }"""
 
-    def __init__(self, grid, thicknesses, ids, attrs, layer_type="MaterialLayers"):
+    def __init__(
+        self, grid, thicknesses, ids, attrs, layer_type="MaterialLayers", path=None
+    ):
         """Create a new instance of Lithology.
 
         Parameters
@@ -87,6 +88,10 @@ class Lithology(Component):
             used, then erosion removes material and creates layers of thickness
             zero. Thus, EventLayers may be appropriate if the user is interested
             in chronostratigraphy.
+        path : str, optional
+            Folder in which to store the layers. If given, the layers are
+            kept in memory-mapped files in this folder rather than in memory.
+            Use this when there are more layers than will fit in memory.
 
         Examples
         --------
@@ -244,11 +249,11 @@ class Lithology(Component):
         # create a EventLayers instance
         if layer_type == "EventLayers":
             self._layers = EventLayers(
-                grid.number_of_nodes, self._number_of_init_layers
+                grid.number_of_nodes, self._number_of_init_layers, path=path
             )
         elif layer_type == "MaterialLayers":
             self._layers = MaterialLayers(
-                grid.number_of_nodes, self._number_of_init_layers
+                grid.number_of_nodes, self._number_of_init_layers, path=path
             )
         else:
             raise ValueError(("Lithology passed an invalid option for " "layer type."))
@@ -709,7 +714,7 @@ class Lithology(Component):
         """Get surface values for attribute."""
         return np.array(list(map(self._attrs[at].get, self._surface_rock_type)))
 
-    def rock_cube_to_xarray(self, depths):
+    def rock_cube_to_xarray(self, depths, window=64):
         """Construct a 3D rock cube of rock type ID as an xarray dataset.
 
         Create an xarray dataset in (x, y, z) that shows the rock type with
@@ -721,29 +726,47 @@ class Lithology(Component):
         Note also that when this method is called, it will construct the current
         values of lithology with depth, NOT the initial values.
 
+        Layers are read from the surface downward, *window* layers at a time,
+        and only as deep as the deepest of *depths*, so the whole of a large
+        Lithology need not be read into memory.
+
         Paramters
         ---------
         depths : array
+        window : int, optional
+            Number of layers to read at a time.
 
         Returns
         -------
         ds : xarray dataset
         """
         depths = np.asarray(depths)
+        if np.any(depths < 0.0):
+            raise ValueError("Lithology: depths must not be negative.")
+
         rock_type = self._layers[self._rock_id_name]
-        rock_cube = np.empty((depths.size, self._grid.shape[0], self._grid.shape[1]))
-
-        # at each node point, interpolate between ztop/bottomo correct.y
-        for sid in range(self._layers.number_of_stacks):
-            coord = np.unravel_index(sid, (self._grid.shape[0], self._grid.shape[1]))
-            real_layers = self.dz[:, sid] > 0
-            f = interp1d(
-                np.flipud(self.z_top[real_layers, sid]),
-                np.flipud(rock_type[real_layers, sid]),
-                kind="previous",
-            )
-            vals = f(depths)
-            rock_cube[:, coord[0], coord[1]] = vals
+        dz = self._layers.dz
+        rock_cube = np.full((depths.size, self._layers.number_of_stacks), np.nan)
+
+        # walk down from the surface, assigning each depth the rock type of
+        # the deepest layer whose top is no deeper than it
+        depth_to_top = np.zeros(self._layers.number_of_stacks)
+        for stop in range(self._layers.number_of_layers, 0, -window):
+            start = max(stop - window, 0)
+            dz_window = np.array(dz[start:stop])
+            rock_type_window = np.array(rock_type[start:stop])
+            for layer in range(stop - start - 1, -1, -1):
+                is_below_top = (dz_window[layer] > 0.0) & (
+                    depths.reshape((-1, 1)) >= depth_to_top
+                )
+                rock_cube[is_below_top] = np.broadcast_to(
+                    rock_type_window[layer], rock_cube.shape
+                )[is_below_top]
+                depth_to_top += dz_window[layer]
+            if np.all(depth_to_top > depths.max()):
+                break
+
+        rock_cube = rock_cube.reshape((depths.size,) + tuple(self._grid.shape))
 
         ds = xr.Dataset(
             data_vars={
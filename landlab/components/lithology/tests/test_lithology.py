@@ -332,3 +332,36 @@ def test_rock_block_xarray():
     )
 
     assert_array_equal(ds.rock_type__id.values, expected_array)
+
+
+@pytest.mark.parametrize("window", [1, 3, 64])
+def test_rock_block_xarray_in_windows(tmpdir, window):
+    """Test the xarray method reads layers stored in files, a few at a time."""
+    sample_depths = np.arange(0, 10, 1)
+
+    mg = RasterModelGrid((3, 3))
+    mg.add_zeros("node", "topographic__elevation")
+    layer_ids = np.tile([0, 1, 2, 3], 5)
+    layer_elevations = 3.0 * np.arange(-10, 10)
+    layer_elevations[-1] = layer_elevations[-2] + 100
+    attrs = {"K_sp": {0: 0.0003, 1: 0.0001, 2: 0.0002, 3: 0.0004}}
+
+    lith = LithoLayers(
+        mg, layer_elevations, layer_ids, function=lambda x, y: x + y, attrs=attrs
+    )
+    mg = RasterModelGrid((3, 3))
+    mg.add_zeros("node", "topographic__elevation")
+    in_files = LithoLayers(
+        mg,
+        layer_elevations,
+        layer_ids,
+        function=lambda x, y: x + y,
+        attrs=attrs,
+        path=str(tmpdir),
+    )
+
+    assert_array_equal(in_files.dz, lith.dz)
+    assert_array_equal(
+        in_files.rock_cube_to_xarray(sample_depths, window=window).rock_type__id,
+        lith.rock_cube_to_xarray(sample_depths).rock_type__id,
+    )
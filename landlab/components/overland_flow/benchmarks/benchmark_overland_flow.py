@@ -0,0 +1,62 @@
+"""Sub-step throughput of OverlandFlow on large raster grids.
+
+Run as a script to print the number of de Almeida sub-steps per second for
+grids with between 1e5 and 4e6 nodes::
+
+    $ python benchmark_overland_flow.py
+"""
+from __future__ import print_function
+
+import timeit
+
+import numpy as np
+
+from landlab import RasterModelGrid
+from landlab.components import OverlandFlow
+
+GRID_SHAPES = ((316, 316), (1000, 1000), (2000, 2000))
+
+
+def _setup_overland_flow(shape, steep_slopes=False):
+    grid = RasterModelGrid(shape, xy_spacing=10.0)
+    np.random.seed(0)
+    grid.add_field(
+        "topographic__elevation",
+        0.01 * grid.node_y + 0.01 * np.random.rand(grid.number_of_nodes),
+        at="node",
+    )
+    grid.add_zeros("surface_water__depth", at="node")
+    of = OverlandFlow(
+        grid, mannings_n=0.03, rainfall_intensity=1.0e-5, steep_slopes=steep_slopes
+    )
+    of.overland_flow()
+    return of
+
+
+def bench_overland_flow_1e6():
+    of = _setup_overland_flow(GRID_SHAPES[1])
+    of.overland_flow()
+
+
+def bench_overland_flow_1e6_steep_slopes():
+    of = _setup_overland_flow(GRID_SHAPES[1], steep_slopes=True)
+    of.overland_flow()
+
+
+def substeps_per_second(shape, n_steps=20, steep_slopes=False):
+    """Return the number of sub-steps of OverlandFlow run per second."""
+    of = _setup_overland_flow(shape, steep_slopes=steep_slopes)
+    return n_steps / timeit.timeit(of.overland_flow, number=n_steps)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    for steep_slopes in (False, True):
+        for shape in GRID_SHAPES:
+            print(
+                "{n_nodes:>10d} nodes, steep_slopes={steep_slopes}: "
+                "{rate:.1f} sub-steps per second".format(
+                    n_nodes=shape[0] * shape[1],
+                    steep_slopes=steep_slopes,
+                    rate=substeps_per_second(shape, steep_slopes=steep_slopes),
+                )
+            )
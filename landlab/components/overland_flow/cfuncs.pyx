@@ -0,0 +1,145 @@
+import numpy as np
+cimport numpy as np
+cimport cython
+from libc.math cimport NAN, fabs, pow
+
+
+DTYPE_INT = np.int
+ctypedef np.int_t DTYPE_INT_t
+
+DTYPE_FLOAT = np.double
+ctypedef np.double_t DTYPE_FLOAT_t
+
+# Same tolerance and number of iterations as scipy.optimize.newton.
+cdef DTYPE_FLOAT_t NEWTON_TOL = 1.48e-8
+cdef int NEWTON_MAXITER = 50
+
+
+@cython.cdivision(True)
+cdef inline DTYPE_FLOAT_t _solve_for_depth(DTYPE_FLOAT_t a,
+                                           DTYPE_FLOAT_t b,
+                                           DTYPE_FLOAT_t c,
+                                           DTYPE_FLOAT_t d,
+                                           DTYPE_FLOAT_t e) nogil:
+    """Solve the implicit water-depth equation for a single node.
+
+    Finds the root, *x*, of::
+
+        x - c + a * (b * x + (b - 1) * c) ** d - e
+
+    by Newton's method, starting from the old depth, *c*. The term raised
+    to the power *d* is taken to be zero where it would be negative. Returns
+    NaN if the iteration does not converge.
+    """
+    cdef DTYPE_FLOAT_t x = c
+    cdef DTYPE_FLOAT_t x_prev
+    cdef DTYPE_FLOAT_t h
+    cdef DTYPE_FLOAT_t f
+    cdef DTYPE_FLOAT_t df
+    cdef int n
+
+    # Without any outflow the equation is linear.
+    if a == 0.:
+        return c + e
+
+    for n in range(NEWTON_MAXITER):
+        h = b * x + (b - 1.) * c
+        if h > 0.:
+            f = x - c + a * pow(h, d) - e
+            df = 1. + a * d * b * pow(h, d - 1.)
+        else:
+            f = x - c - e
+            df = 1.
+        x_prev = x
+        x = x - f / df
+        if fabs(x - x_prev) < NEWTON_TOL:
+            return x
+
+    return NAN
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+def _sweep_implicit_kinwave(const DTYPE_INT_t [:] nodes_ordered,
+                            const np.uint8_t [:] is_core,
+                            const DTYPE_INT_t [:, :] receivers,
+                            const DTYPE_FLOAT_t [:, :] proportions,
+                            const DTYPE_FLOAT_t [:] alpha,
+                            const DTYPE_FLOAT_t [:] grad_width_sum,
+                            const DTYPE_FLOAT_t [:] cell_area,
+                            DTYPE_FLOAT_t [:] depth,
+                            DTYPE_FLOAT_t [:] disch_in,
+                            DTYPE_FLOAT_t [:] eff_depth,
+                            DTYPE_FLOAT_t dt,
+                            DTYPE_FLOAT_t runoff_rate,
+                            DTYPE_FLOAT_t weight,
+                            DTYPE_FLOAT_t depth_exp,
+                            DTYPE_FLOAT_t vel_coef):
+    """Update water depth at core nodes, from upstream to downstream.
+
+    Parameters
+    ----------
+    nodes_ordered : ndarray of int
+        Node IDs ordered from downstream to upstream.
+    is_core : ndarray of uint8
+        Nodes at which water depth is calculated.
+    receivers : ndarray of int, shape (n_nodes, n_receivers)
+        Nodes that may receive flow from each node, -1 where there is none.
+    proportions : ndarray of float, shape (n_nodes, n_receivers)
+        Proportion of the outflow from each node that goes to each receiver.
+    alpha : ndarray of float
+        Prefactor of the water-depth equation at each node.
+    grad_width_sum : ndarray of float
+        Sum of square-root-of-gradient times face width over the outgoing
+        links of each node.
+    cell_area : ndarray of float
+        Area of the cell of each core node.
+    depth : ndarray of float
+        Water depth at each node. Updated in place.
+    disch_in : ndarray of float
+        Output. Water inflow discharge to each node. Must be zero on entry.
+    eff_depth : ndarray of float
+        Output. Depth, weighted between the old and new time steps, that
+        sets the outflow from each core node.
+    dt : float
+        Time-step duration.
+    runoff_rate : float
+        Local runoff rate.
+    weight : float
+        Weighting on depth at the new time step versus the old one.
+    depth_exp : float
+        Exponent on water depth in the discharge equation.
+    vel_coef : float
+        Inverse of the roughness coefficient.
+    """
+    cdef DTYPE_INT_t n_nodes = nodes_ordered.shape[0]
+    cdef DTYPE_INT_t n_receivers = receivers.shape[1]
+    cdef DTYPE_INT_t i, k, node, recvr
+    cdef DTYPE_FLOAT_t old_depth, heff, outflow
+
+    with nogil:
+        for i in range(n_nodes - 1, -1, -1):
+            node = nodes_ordered[i]
+            if not is_core[node]:
+                continue
+
+            old_depth = depth[node]
+            depth[node] = _solve_for_depth(
+                alpha[node],
+                weight,
+                old_depth,
+                depth_exp,
+                dt * runoff_rate + dt * disch_in[node] / cell_area[node],
+            )
+
+            heff = weight * depth[node] + (1. - weight) * old_depth
+            if heff < 0.:
+                heff = 0.
+            eff_depth[node] = heff
+
+            outflow = vel_coef * pow(heff, depth_exp) * grad_width_sum[node]
+            for k in range(n_receivers):
+                recvr = receivers[node, k]
+                if recvr != -1 and proportions[node, k] > 0.:
+                    disch_in[recvr] += outflow * proportions[node, k]
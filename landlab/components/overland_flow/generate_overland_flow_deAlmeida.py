@@ -411,6 +411,53 @@ class OverlandFlow(Component):
         # Once the neighbor arrays are set up, we change the flag to True!
         self.neighbor_flag = True
 
+        self._set_up_workspace()
+
+    def _set_up_workspace(self):
+        """Allocate the buffers used by every time step.
+
+        The neighbor arrays of horizontal and vertical links are merged into
+        arrays that are ordered by link ID, so that discharge can be updated
+        over all links at once. All of the temporary arrays that a time step
+        needs are allocated here and then filled in place. They depend on the
+        core nodes and active links of the grid, so they are set up again if
+        the status of any node changes.
+        """
+        n_links = self.grid.number_of_links
+
+        self._status_at_node = self.grid.status_at_node.copy()
+
+        self.core_nodes = self.grid.core_nodes
+        self.active_links = self.grid.active_links
+        self._tail_at_active_link = self.grid.node_at_link_tail[self.active_links]
+        self._head_at_active_link = self.grid.node_at_link_head[self.active_links]
+        self._length_of_active_link = self.grid.length_of_link[self.active_links]
+        if self.default_fixed_links is True:
+            self._fixed_links = self.grid.fixed_links
+
+        # Discharge neighbors of every link. Non-existent or inactive
+        # neighbors have an index of '-1', which points to an extra 0.0 at
+        # the end of self._q_with_zero.
+        self._first_neighbor = np.empty(n_links, dtype=int)
+        self._first_neighbor[self.horizontal_ids] = self.west_neighbors
+        self._first_neighbor[self.vertical_ids] = self.north_neighbors
+        self._second_neighbor = np.empty(n_links, dtype=int)
+        self._second_neighbor[self.horizontal_ids] = self.east_neighbors
+        self._second_neighbor[self.vertical_ids] = self.south_neighbors
+        self._q_with_zero = np.zeros(n_links + 1)
+
+        n_active = len(self.active_links)
+        self._w = self.grid.empty(at="node")
+        self._flux_div = self.grid.zeros(at="node")
+        self._is_too_shallow = np.empty(self.grid.number_of_nodes, dtype=bool)
+        self._h_core = np.empty(len(self.core_nodes))
+        self._dh_core = np.empty(len(self.core_nodes))
+        self._active_link_buffers = [np.empty(n_active) for _ in range(4)]
+        self._link_buffers = [np.empty(n_links) for _ in range(3)]
+        self._link_masks = [np.empty(n_links, dtype=bool) for _ in range(2)]
+
+        self.water_surface__gradient = self._active_link_buffers[3]
+
     def overland_flow(self, dt=None):
         """Generate overland flow across a grid.
 
@@ -423,6 +470,22 @@ class OverlandFlow(Component):
         Outputs water depth, discharge and shear stress values through time at
         every point in the input grid.
         """
+        # In case another component has added data to the fields, we just
+        # reset our water depths, topographic elevations and water
+        # discharge variables to the fields. Within the loop below they are
+        # only ever updated in place.
+        self.h = self.grid["node"]["surface_water__depth"]
+        self.z = self.grid["node"]["topographic__elevation"]
+        self.q = self.grid["link"]["surface_water__discharge"]
+        self.h_links = self.grid["link"]["surface_water__depth"]
+        self._mannings_n_squared = np.square(self.mannings_n)
+
+        # Boundary conditions may have changed since the last call.
+        if self.neighbor_flag is True and not np.array_equal(
+            self.grid.status_at_node, self._status_at_node
+        ):
+            self._set_up_workspace()
+
         # DH adds a loop to enable an imposed tstep while maintaining stability
         local_elapsed_time = 0.
         if dt is None:
@@ -441,260 +504,147 @@ class OverlandFlow(Component):
             if self.neighbor_flag is False:
                 self.set_up_neighbor_arrays()
 
-            # In case another component has added data to the fields, we just
-            # reset our water depths, topographic elevations and water
-            # discharge variables to the fields.
-            self.h = self.grid["node"]["surface_water__depth"]
-            self.z = self.grid["node"]["topographic__elevation"]
-            self.q = self.grid["link"]["surface_water__discharge"]
-            self.h_links = self.grid["link"]["surface_water__depth"]
-
-            # Here we identify the core nodes and active links for later use.
-            self.core_nodes = self.grid.core_nodes
-            self.active_links = self.grid.active_links
-
-            # Per Bates et al., 2010, this solution needs to find difference
-            # between the highest water surface in the two cells and the
-            # highest bed elevation
-            zmax = self._grid.map_max_of_link_nodes_to_link(self.z)
-            w = self.h + self.z
-            wmax = self._grid.map_max_of_link_nodes_to_link(w)
-            hflow = wmax[self._grid.active_links] - zmax[self._grid.active_links]
-
-            # Insert this water depth into an array of water depths at the
-            # links.
-            self.h_links[self.active_links] = hflow
-
-            # Now we calculate the slope of the water surface elevation at
-            # active links
-            self.water_surface__gradient = self.grid.calc_grad_at_link(w)[
-                self.grid.active_links
-            ]
-
-            # And insert these values into an array of all links
-            self.water_surface_slope[self.active_links] = self.water_surface__gradient
-            # If the user chooses to set boundary links to the neighbor value,
-            # we set the discharge array to have the boundary links set to
-            # their neighbor value
-            if self.default_fixed_links is True:
-                self.q[self.grid.fixed_links] = self.q[self.active_neighbors]
-
-            # Now we can calculate discharge. To handle links with neighbors
-            # that do not exist, we will do a fancy indexing trick. Non-
-            # existent links or inactive links have an index of '-1', which in
-            # Python, looks to the end of a list or array. To accommodate these
-            # '-1' indices, we will simply insert an value of 0.0 discharge (in
-            # units of L^2/T) to the end of the discharge array.
-            self.q = np.append(self.q, [0])
-
-            horiz = self.horizontal_ids
-            vert = self.vertical_ids
-            # Now we calculate discharge in the horizontal direction
-            try:
-                self.q[horiz] = (
-                    self.theta * self.q[horiz]
-                    + (1. - self.theta)
-                    / 2.
-                    * (self.q[self.west_neighbors] + self.q[self.east_neighbors])
-                    - self.g
-                    * self.h_links[horiz]
-                    * self.dt
-                    * self.water_surface_slope[horiz]
-                ) / (
-                    1
-                    + self.g
-                    * self.dt
-                    * self.mannings_n ** 2.
-                    * abs(self.q[horiz])
-                    / self.h_links[horiz] ** _SEVEN_OVER_THREE
-                )
-
-                # ... and in the vertical direction
-                self.q[vert] = (
-                    self.theta * self.q[vert]
-                    + (1 - self.theta)
-                    / 2.
-                    * (self.q[self.north_neighbors] + self.q[self.south_neighbors])
-                    - self.g
-                    * self.h_links[vert]
-                    * self.dt
-                    * self.water_surface_slope[vert]
-                ) / (
-                    1
-                    + self.g
-                    * self.dt
-                    * self.mannings_n ** 2.
-                    * abs(self.q[vert])
-                    / self.h_links[vert] ** _SEVEN_OVER_THREE
-                )
-
-            except ValueError:
-                self.mannings_n = self.grid["link"]["mannings_n"]
-                # if manning's n in a field
-                # calc discharge in horizontal
-                self.q[horiz] = (
-                    self.theta * self.q[horiz]
-                    + (1. - self.theta)
-                    / 2.
-                    * (self.q[self.west_neighbors] + self.q[self.east_neighbors])
-                    - self.g
-                    * self.h_links[horiz]
-                    * self.dt
-                    * self.water_surface_slope[horiz]
-                ) / (
-                    1
-                    + self.g
-                    * self.dt
-                    * self.mannings_n[horiz] ** 2.
-                    * abs(self.q[horiz])
-                    / self.h_links[horiz] ** _SEVEN_OVER_THREE
-                )
-
-                # ... and in the vertical direction
-                self.q[vert] = (
-                    self.theta * self.q[vert]
-                    + (1 - self.theta)
-                    / 2.
-                    * (self.q[self.north_neighbors] + self.q[self.south_neighbors])
-                    - self.g
-                    * self.h_links[vert]
-                    * self.dt
-                    * self.water_surface_slope[self.vertical_ids]
-                ) / (
-                    1
-                    + self.g
-                    * self.dt
-                    * self.mannings_n[vert] ** 2.
-                    * abs(self.q[vert])
-                    / self.h_links[vert] ** _SEVEN_OVER_THREE
-                )
-
-            # Now to return the array to its original length (length of number
-            # of all links), we delete the extra 0.0 value from the end of the
-            # array.
-            self.q = np.delete(self.q, len(self.q) - 1)
-
-            # Updating the discharge array to have the boundary links set to
-            # their neighbor
-            if self.default_fixed_links is True:
-                self.q[self.grid.fixed_links] = self.q[self.active_neighbors]
+            self._update_discharge()
 
             if self.steep_slopes is True:
-                # To prevent water from draining too fast for our time steps...
-                # Our Froude number.
-                Fr = 1.0
-                # Our two limiting factors, the froude number and courant
-                # number.
-                # Looking a calculated q to be compared to our Fr number.
-                calculated_q = (self.q / self.h_links) / np.sqrt(self.g * self.h_links)
-
-                # Looking at our calculated q and comparing it to Courant no.,
-                q_courant = self.q * self.dt / self.grid.dx
-
-                # Water depth split equally between four links..
-                water_div_4 = self.h_links / 4.
-
-                # IDs where water discharge is positive...
-                (positive_q,) = np.where(self.q > 0)
-
-                # ... and negative.
-                (negative_q,) = np.where(self.q < 0)
-
-                # Where does our calculated q exceed the Froude number? If q
-                # does exceed the Froude number, we are getting supercritical
-                # flow and discharge needs to be reduced to maintain stability.
-                (Froude_logical,) = np.where((calculated_q) > Fr)
-                (Froude_abs_logical,) = np.where(abs(calculated_q) > Fr)
-
-                # Where does our calculated q exceed the Courant number and
-                # water depth divided amongst 4 links? If the calculated q
-                # exceeds the Courant number and is greater than the water
-                # depth divided by 4 links, we reduce discharge to maintain
-                # stability.
-                (water_logical,) = np.where(q_courant > water_div_4)
-                (water_abs_logical,) = np.where(abs(q_courant) > water_div_4)
-
-                # Where are these conditions met? For positive and negative q,
-                # there are specific rules to reduce q. This step finds where
-                # the discharge values are positive or negative and where
-                # discharge exceeds the Froude or Courant number.
-                self.if_statement_1 = np.intersect1d(positive_q, Froude_logical)
-                self.if_statement_2 = np.intersect1d(negative_q, Froude_abs_logical)
-                self.if_statement_3 = np.intersect1d(positive_q, water_logical)
-                self.if_statement_4 = np.intersect1d(negative_q, water_abs_logical)
-
-                # Rules 1 and 2 reduce discharge by the Froude number.
-                self.q[self.if_statement_1] = self.h_links[self.if_statement_1] * (
-                    np.sqrt(self.g * self.h_links[self.if_statement_1]) * Fr
-                )
-
-                self.q[self.if_statement_2] = 0. - (
-                    self.h_links[self.if_statement_2]
-                    * np.sqrt(self.g * self.h_links[self.if_statement_2])
-                    * Fr
-                )
-
-                # Rules 3 and 4 reduce discharge by the Courant number.
-                self.q[self.if_statement_3] = (
-                    (self.h_links[self.if_statement_3] * self.grid.dx) / 5.
-                ) / self.dt
-
-                self.q[self.if_statement_4] = (
-                    0.
-                    - (self.h_links[self.if_statement_4] * self.grid.dx / 5.) / self.dt
-                )
-
-            # Once stability has been restored, we calculate the change in
-            # water depths on all core nodes by finding the difference between
-            # inputs (rainfall) and the inputs/outputs (flux divergence of
-            # discharge)
-            self.dhdt = self.rainfall_intensity - self.grid.calc_flux_div_at_node(
-                self.q
-            )
+                self._limit_discharge()
 
-            # Updating our water depths...
-            self.h[self.core_nodes] = (
-                self.h[self.core_nodes] + self.dhdt[self.core_nodes] * self.dt
-            )
-
-            # To prevent divide by zero errors, a minimum threshold water depth
-            # must be maintained. To reduce mass imbalances, this is set to
-            # find locations where water depth is smaller than h_init (default
-            # is 0.001) and the new value is self.h_init * 10^-3. This was set
-            # as it showed the smallest amount of mass creation in the grid
-            # during testing.
-            if self.steep_slopes is True:
-                self.h[self.h < self.h_init] = self.h_init * 10.0 ** -3
-
-            # And reset our field values with the newest water depth and
-            # discharge.
-            self.grid.at_node["surface_water__depth"] = self.h
-            self.grid.at_link["surface_water__discharge"] = self.q
-            #
-            #
-            #            self.helper_q = self.grid.map_upwind_node_link_max_to_node(self.q)
-            #            self.helper_s = self.grid.map_upwind_node_link_max_to_node(
-            #                                                    self.water_surface_slope)
-            #
-            #            self.helper_q = self.grid.map_max_of_link_nodes_to_link(self.helper_q)
-            #            self.helper_s = self.grid.map_max_of_link_nodes_to_link(self.helper_s)
-            #
-            #            self.grid['link']['surface_water__discharge'][
-            #                     self.active_links_at_open_bdy] = self.helper_q[
-            #                     self.active_links_at_open_bdy]
-            #
-            #            self.grid['link']['water_surface__gradient'][
-            #                self.active_links_at_open_bdy] = self.helper_s[
-            #                self.active_links_at_open_bdy]
-            # Update nodes near boundary locations - nodes adjacent to
-            # boundaries may have discharge and water surface slopes
-            # artifically reduced due to boundary effects. This step removes
-            # those errors.
+            self._update_depth()
 
             if dt is np.inf:
                 break
             local_elapsed_time += self.dt
 
+    def _update_discharge(self):
+        """Update water depth, water-surface slope and discharge at links."""
+        h_flow, w_tail, w_head, slope = self._active_link_buffers
+        tail, head = self._tail_at_active_link, self._head_at_active_link
+
+        # Per Bates et al., 2010, this solution needs to find difference
+        # between the highest water surface in the two cells and the
+        # highest bed elevation
+        w = np.add(self.h, self.z, out=self._w)
+        np.maximum(w.take(tail, out=w_tail), w.take(head, out=w_head), out=h_flow)
+        z_max = np.maximum(
+            self.z.take(tail, out=w_tail), self.z.take(head, out=w_head), out=w_tail
+        )
+        h_flow -= z_max
+
+        # Insert this water depth into an array of water depths at the
+        # links.
+        self.h_links[self.active_links] = h_flow
+
+        # Now we calculate the slope of the water surface elevation at
+        # active links and insert these values into an array of all links
+        w.take(tail, out=w_tail)
+        w.take(head, out=slope)
+        slope -= w_tail
+        slope /= self._length_of_active_link
+        self.water_surface_slope[self.active_links] = slope
+
+        # If the user chooses to set boundary links to the neighbor value,
+        # we set the discharge array to have the boundary links set to
+        # their neighbor value
+        if self.default_fixed_links is True:
+            self.q[self._fixed_links] = self.q[self.active_neighbors]
+
+        # Now we can calculate discharge, in the horizontal and vertical
+        # directions at once:
+        #
+        #   q = (theta q + (1 - theta) / 2 (q_1 + q_2) - g h dt S)
+        #       / (1 + g dt n^2 |q| / h^(7/3))
+        #
+        # where q_1 and q_2 are the discharges of the link's two neighbors.
+        q, h, dt, g = self.q, self.h_links, self.dt, self.g
+        numer, denom, tmp = self._link_buffers
+
+        self._q_with_zero[:-1] = q
+        self._q_with_zero.take(self._first_neighbor, out=numer)
+        numer += self._q_with_zero.take(self._second_neighbor, out=tmp)
+        numer *= (1. - self.theta) / 2.
+        numer += np.multiply(q, self.theta, out=tmp)
+        np.multiply(h, self.water_surface_slope, out=tmp)
+        tmp *= g * dt
+        numer -= tmp
+
+        np.absolute(q, out=denom)
+        denom *= g * dt
+        denom *= self._mannings_n_squared
+        denom /= np.power(h, _SEVEN_OVER_THREE, out=tmp)
+        denom += 1.
+
+        np.divide(numer, denom, out=q)
+
+        # Updating the discharge array to have the boundary links set to
+        # their neighbor
+        if self.default_fixed_links is True:
+            q[self._fixed_links] = q[self.active_neighbors]
+
+    def _limit_discharge(self):
+        """Limit discharge by the Froude and Courant numbers.
+
+        To prevent water from draining too fast for our time steps, the
+        magnitude of discharge is reduced where flow is supercritical
+        (Froude number greater than one) and, more strongly, where it would
+        move more than a quarter of the water on a link in one time step.
+        """
+        Fr = 1.0
+        q, h, dt, dx = self.q, self.h_links, self.dt, self.grid.dx
+        q_max, abs_q, tmp = self._link_buffers
+        is_limited, tmp_mask = self._link_masks
+
+        np.absolute(q, out=abs_q)
+
+        # Where does our calculated q exceed the Froude number? If q
+        # does exceed the Froude number, we are getting supercritical
+        # flow and discharge needs to be reduced to maintain stability.
+        np.multiply(h, self.g, out=q_max)
+        np.sqrt(q_max, out=q_max)
+        q_max *= h
+        q_max *= Fr
+        np.greater(abs_q, q_max, out=is_limited)
+
+        # Where does our calculated q exceed the Courant number and
+        # water depth divided amongst 4 links? If so, we reduce discharge
+        # to maintain stability; this takes precedence over the Froude
+        # limit.
+        np.multiply(abs_q, dt / dx, out=tmp)
+        water_div_4 = np.multiply(h, 0.25, out=abs_q)
+        np.greater(tmp, water_div_4, out=tmp_mask)
+        np.multiply(h, dx / 5. / dt, out=tmp)
+        np.copyto(q_max, tmp, where=tmp_mask)
+        is_limited |= tmp_mask
+
+        # Limits apply only to links with flow, and keep its direction.
+        is_limited &= np.not_equal(q, 0., out=tmp_mask)
+        np.copysign(q_max, q, out=q, where=is_limited)
+
+    def _update_depth(self):
+        """Update water depth at core nodes from the flux divergence."""
+        # Once stability has been restored, we calculate the change in
+        # water depths on all core nodes by finding the difference between
+        # inputs (rainfall) and the inputs/outputs (flux divergence of
+        # discharge)
+        self.grid.calc_flux_div_at_node(self.q, out=self._flux_div)
+        np.subtract(self.rainfall_intensity, self._flux_div, out=self.dhdt)
+
+        # Updating our water depths...
+        self.h.take(self.core_nodes, out=self._h_core)
+        self.dhdt.take(self.core_nodes, out=self._dh_core)
+        self._dh_core *= self.dt
+        self._h_core += self._dh_core
+        self.h[self.core_nodes] = self._h_core
+
+        # To prevent divide by zero errors, a minimum threshold water depth
+        # must be maintained. To reduce mass imbalances, this is set to
+        # find locations where water depth is smaller than h_init (default
+        # is 0.001) and the new value is self.h_init * 10^-3. This was set
+        # as it showed the smallest amount of mass creation in the grid
+        # during testing.
+        if self.steep_slopes is True:
+            np.less(self.h, self.h_init, out=self._is_too_shallow)
+            np.copyto(self.h, self.h_init * 10.0 ** -3, where=self._is_too_shallow)
+
     def run_one_step(self, dt=None):
         """Generate overland flow across a grid.
 
@@ -10,17 +10,20 @@ Created on Fri May 27 14:26:13 2016
 
 
 import numpy as np
-from scipy.optimize import newton
 
 from landlab import Component
 from landlab.components import FlowAccumulator
+from landlab.grid.base import CORE_NODE
+
+from .cfuncs import _sweep_implicit_kinwave
 
 
 def water_fn(x, a, b, c, d, e):
     r"""Evaluates the solution to the water-depth equation.
 
-    Called by scipy.newton() to find solution for :math:`x`
-    using Newton's method.
+    The compiled solver used by :class:`KinwaveImplicitOverlandFlow` finds
+    the root of this function with Newton's method; it is kept here as a
+    reference implementation.
 
     Parameters
     ----------
@@ -131,8 +134,12 @@ class KinwaveImplicitOverlandFlow(Component):
     When we combine these equations, we have an equation that includes the
     unknown :math:`H^{t+1}` and a bunch of terms that are known.
     If :math:`w\ne 0`, it is a nonlinear equation in :math:`H^{t+1}`,
-    and must be solved iteratively. We do this using a root-finding
-    method in the scipy.optimize library.
+    and must be solved iteratively. We do this with Newton's method, in a
+    single compiled upstream-to-downstream sweep over the grid.
+
+    The specific discharge and velocity along links are not needed for the
+    solution, so they are only calculated on request, by
+    :meth:`calc_discharge_and_velocity_at_link`.
 
     Examples
     --------
@@ -146,6 +153,18 @@ class KinwaveImplicitOverlandFlow(Component):
     100.0
     >>> rg.at_node['surface_water__depth'][6:9]
     array([ 0.,  0.,  0.])
+
+    On a uniform slope, water flows down the links that point downhill.
+
+    >>> z[:] = 0.1 * rg.node_y
+    >>> kw = KinwaveImplicitOverlandFlow(rg)
+    >>> kw.run_one_step(10.0, runoff_rate=10.0)
+    >>> kw.calc_discharge_and_velocity_at_link()
+    >>> q = rg.at_link['water__specific_discharge']
+    >>> bool(np.all(q[rg.vertical_links] <= 0.0))
+    True
+    >>> bool(np.all(q[rg.horizontal_links] == 0.0))
+    True
     """
 
     _name = "KinwaveImplicitOverlandFlow"
@@ -155,8 +174,8 @@ class KinwaveImplicitOverlandFlow(Component):
     _output_var_names = (
         "topographic__gradient",
         "surface_water__depth",
-        # 'water__velocity',
-        # 'water__specific_discharge',
+        "water__velocity",
+        "water__specific_discharge",
         "surface_water_inflow__discharge",
     )
 
@@ -166,14 +185,15 @@ class KinwaveImplicitOverlandFlow(Component):
         "surface_water__depth": "m",
         "water__velocity": "m/s",
         "water__specific_discharge": "m2/s",
+        "surface_water_inflow__discharge": "m3/s",
     }
 
     _var_mapping = {
         "topographic__elevation": "node",
         "topographic__gradient": "link",
         "surface_water__depth": "node",
-        # 'water__velocity': 'link',
-        # 'water__specific_discharge': 'link',
+        "water__velocity": "link",
+        "water__specific_discharge": "link",
         "surface_water_inflow__discharge": "node",
     }
 
@@ -181,10 +201,8 @@ class KinwaveImplicitOverlandFlow(Component):
         "topographic__elevation": "elevation of the ground surface relative to some datum",
         "topographic__gradient": "gradient of the ground surface",
         "surface_water__depth": "depth of water",
-        #        'water__velocity':
-        #            'flow velocity component in the direction of the link',
-        #        'water__specific_discharge':
-        #            'flow discharge component in the direction of the link',
+        "water__velocity": "flow velocity component in the direction of the link",
+        "water__specific_discharge": "flow discharge component in the direction of the link",
         "surface_water_inflow__discharge": "water volume inflow rate to the cell around each node",
     }
 
@@ -241,16 +259,15 @@ class KinwaveImplicitOverlandFlow(Component):
         else:
             self.slope = grid.add_zeros("link", "topographic__gradient")
         #  Velocity
-        #        if 'water__velocity' in grid.at_link:
-        #            self.vel = grid.at_link['water__velocity']
-        #        else:
-        #            self.vel = grid.add_zeros('link', 'water__velocity')
+        if "water__velocity" in grid.at_link:
+            self.vel = grid.at_link["water__velocity"]
+        else:
+            self.vel = grid.add_zeros("link", "water__velocity")
         #  Discharge
-        #        if 'surface_water__specific_discharge' in grid.at_link:
-        #            self.disch = grid.at_link['surface_water__specific_discharge']
-        #        else:
-        #            self.disch = grid.add_zeros('link',
-        #                                        'surface_water__specific_discharge')
+        if "water__specific_discharge" in grid.at_link:
+            self.disch = grid.at_link["water__specific_discharge"]
+        else:
+            self.disch = grid.add_zeros("link", "water__specific_discharge")
         #  Inflow discharge at nodes
         if "surface_water_inflow__discharge" in grid.at_node:
             self.disch_in = grid.at_node["surface_water_inflow__discharge"]
@@ -265,6 +282,12 @@ class KinwaveImplicitOverlandFlow(Component):
         # will find a solution for.
         self.alpha = grid.zeros("node")
 
+        # Area of the cell around each core node, and the depth, weighted
+        # between old and new time steps, that sets the outflow from each
+        # node during the last time step.
+        self._cell_area_at_node = grid.ones("node")
+        self._eff_depth = grid.zeros("node")
+
         # Instantiate flow router
         self.flow_accum = FlowAccumulator(
             grid,
@@ -315,58 +338,70 @@ class KinwaveImplicitOverlandFlow(Component):
             #
             #   $\alpha = \frac{\Sigma W S^{1/2} \Delta t}{A C_r}$
             cores = self.grid.core_nodes
+            self._cell_area_at_node[cores] = self.grid.area_of_cell[
+                self.grid.cell_at_node[cores]
+            ]
             self.alpha[cores] = (
                 self.vel_coef
                 * self.grad_width_sum[cores]
                 * dt
-                / (self.grid.area_of_cell[self.grid.cell_at_node[cores]])
+                / self._cell_area_at_node[cores]
             )
 
         # Zero out inflow discharge
         self.disch_in[:] = 0.0
+        self._eff_depth[:] = 0.0
+
+        # Upstream-to-downstream sweep that solves for the new water depth
+        # at each core node and sends its outflow on to its neighbors. For
+        # this we use the flow director's "proportions" array, which
+        # contains, for each node, the proportion of flow that heads out
+        # toward each of its N neighbors. The proportion is zero if the
+        # neighbor is uphill; otherwise, it is S^1/2 / sum(S^1/2).
+        _sweep_implicit_kinwave(
+            self.nodes_ordered,
+            (self.grid.status_at_node == CORE_NODE).view(np.uint8),
+            self.grid.adjacent_nodes_at_node,
+            self.flow_accum.flow_director.proportions,
+            self.alpha,
+            self.grad_width_sum,
+            self._cell_area_at_node,
+            self.depth,
+            self.disch_in,
+            self._eff_depth,
+            dt,
+            runoff_rate,
+            self.weight,
+            self.depth_exp,
+            self.vel_coef,
+        )
+        if np.any(np.isnan(self.depth)):
+            raise RuntimeError("Failed to converge on a new water depth")
 
-        # Upstream-to-downstream loop
-        for i in range(len(self.nodes_ordered) - 1, -1, -1):
-            n = self.nodes_ordered[i]
-            if self.grid.status_at_node[n] == 0:
-
-                # Solve for new water depth
-                aa = self.alpha[n]
-                cc = self.depth[n]
-                ee = (dt * runoff_rate) + (
-                    dt
-                    * self.disch_in[n]
-                    / self.grid.area_of_cell[self.grid.cell_at_node[n]]
-                )
-                self.depth[n] = newton(
-                    water_fn,
-                    self.depth[n],
-                    args=(aa, self.weight, cc, self.depth_exp, ee),
-                )
-
-                # Calc outflow
-                Heff = self.weight * self.depth[n] + (1.0 - self.weight) * cc
-                outflow = (
-                    self.vel_coef * (Heff ** self.depth_exp) * self.grad_width_sum[n]
-                )  # this is manning/chezy/darcy
-
-                # Send flow downstream. Here we take total inflow discharge
-                # and partition it among the node's neighbors. For this, we use
-                # the flow director's "proportions" array, which contains, for
-                # each node, the proportion of flow that heads out toward each
-                # of its N neighbors. The proportion is zero if the neighbor is
-                # uphill; otherwise, it is S^1/2 / sum(S^1/2). If for example
-                # we have a raster grid, there will be four neighbors and four
-                # proportions, some of which may be zero and some between 0 and
-                # 1.
-                self.disch_in[self.grid.adjacent_nodes_at_node[n]] += (
-                    outflow * self.flow_accum.flow_director.proportions[n]
-                )
+    def calc_discharge_and_velocity_at_link(self):
+        """Calculate specific discharge and velocity along links.
 
-                # TODO: the above is enough to implement the solution for flow
-                # depth, but it does not provide any information about flow
-                # velocity or discharge on links. This could be added as an
-                # optional method, perhaps done just before output.
+        Uses the water depths of the last time step to fill the
+        *water__specific_discharge* and *water__velocity* link fields. Both
+        are positive in the direction of the link and zero on links that
+        do not carry flow out of a core node.
+        """
+        self.disch[:] = 0.0
+        self.vel[:] = 0.0
+
+        proportions = self.flow_accum.flow_director.proportions
+        is_outflow = proportions > 0.0
+        is_outflow[self.grid.status_at_node != CORE_NODE] = False
+        nodes = np.nonzero(is_outflow)[0]
+        links = self.flow_lnks[is_outflow]
+
+        heff = self._eff_depth[nodes]
+        q = self.vel_coef * heff ** self.depth_exp * self.sqrt_slope[links]
+        q[self.grid.node_at_link_head[links] == nodes] *= -1.0
+
+        self.disch[links] = q
+        has_water = heff > 0.0
+        self.vel[links[has_water]] = q[has_water] / heff[has_water]
 
 
 if __name__ == "__main__":
@@ -5,6 +5,7 @@ Unit tests for landlab.components.overland_flow.OverlandFlow
 last updated: 3/14/16
 """
 import numpy as np
+import pytest
 
 from landlab import RasterModelGrid
 from landlab.components.overland_flow import OverlandFlow
@@ -143,3 +144,104 @@ def test_deAlm_analytical_imposed_dt_long():
     hdeAlm = hdeAlm[1][1:]
     hdeAlm = np.append(hdeAlm, [0])
     np.testing.assert_almost_equal(h_analytical, hdeAlm, decimal=1)
+
+
+def _overland_flow_by_direction(of, dt):
+    """Run OverlandFlow with the scheme it used before it had a workspace."""
+    grid = of.grid
+    h = grid.at_node["surface_water__depth"]
+    z = grid.at_node["topographic__elevation"]
+    q = grid.at_link["surface_water__discharge"]
+    h_links = grid.at_link["surface_water__depth"]
+    slope = of.water_surface_slope
+
+    elapsed_time = 0.
+    while elapsed_time < dt:
+        of.dt = min(of.calc_time_step(), dt - elapsed_time)
+        core_nodes = grid.core_nodes
+        active_links = grid.active_links
+
+        w = h + z
+        h_flow = grid.map_max_of_link_nodes_to_link(
+            w
+        ) - grid.map_max_of_link_nodes_to_link(z)
+        h_links[active_links] = h_flow[active_links]
+        slope[active_links] = grid.calc_grad_at_link(w)[active_links]
+
+        q_with_zero = np.append(q, [0.])
+        for links, first, second in (
+            (of.horizontal_ids, of.west_neighbors, of.east_neighbors),
+            (of.vertical_ids, of.north_neighbors, of.south_neighbors),
+        ):
+            q_with_zero[links] = (
+                of.theta * q_with_zero[links]
+                + (1. - of.theta) / 2. * (q_with_zero[first] + q_with_zero[second])
+                - of.g * h_links[links] * of.dt * slope[links]
+            ) / (
+                1.
+                + of.g
+                * of.dt
+                * of.mannings_n ** 2.
+                * abs(q_with_zero[links])
+                / h_links[links] ** (7. / 3.)
+            )
+        q[:] = q_with_zero[:-1]
+
+        if of.steep_slopes:
+            froude_q = h_links * np.sqrt(of.g * h_links)
+            courant_q = h_links * grid.dx / 5. / of.dt
+            is_courant_limited = abs(q) * of.dt / grid.dx > h_links / 4.
+            q_max = np.where(is_courant_limited, courant_q, froude_q)
+            is_limited = (abs(q) > froude_q) | is_courant_limited
+            is_limited &= q != 0.
+            q[is_limited] = np.copysign(q_max, q)[is_limited]
+
+        dhdt = of.rainfall_intensity - grid.calc_flux_div_at_node(q)
+        h[core_nodes] += dhdt[core_nodes] * of.dt
+        if of.steep_slopes:
+            h[h < of.h_init] = of.h_init * 10.0 ** -3
+
+        elapsed_time += of.dt
+
+
+def _setup_sloped_grid():
+    grid = RasterModelGrid((8, 10), xy_spacing=10.)
+    grid.add_zeros("node", "surface_water__depth")
+    grid.add_field(
+        "node", "topographic__elevation", 0.0002 * grid.node_x + 0.001 * grid.node_y
+    )
+    grid.set_closed_boundaries_at_grid_edges(True, True, True, False)
+    return grid
+
+
+@pytest.mark.parametrize("steep_slopes", [False, True])
+def test_deAlm_same_as_previous_scheme(steep_slopes):
+    grids = (_setup_sloped_grid(), _setup_sloped_grid())
+    (deAlm, expected) = [
+        OverlandFlow(
+            grid, mannings_n=0.03, rainfall_intensity=1e-5, steep_slopes=steep_slopes
+        )
+        for grid in grids
+    ]
+    expected.set_up_neighbor_arrays()
+
+    for step in range(20):
+        if step == 10:
+            for grid in grids:
+                grid.status_at_node[grid.nodes_at_bottom_edge[1:-1]] = (
+                    grid.BC_NODE_IS_CLOSED
+                )
+        deAlm.overland_flow(30.)
+        _overland_flow_by_direction(expected, 30.)
+
+    np.testing.assert_allclose(
+        grids[0].at_node["surface_water__depth"],
+        grids[1].at_node["surface_water__depth"],
+        rtol=1e-10,
+    )
+    np.testing.assert_allclose(
+        grids[0].at_link["surface_water__discharge"],
+        grids[1].at_link["surface_water__discharge"],
+        rtol=1e-10,
+        atol=1e-14,
+    )
@@ -9,6 +9,7 @@ Created on Sat Apr  1 10:49:33 2017
 """
 
 import numpy as np
+import pytest
 
 from landlab import RasterModelGrid
 from landlab.components import KinwaveImplicitOverlandFlow
@@ -135,8 +136,32 @@ def test_curved_surface():
         assert round(kw.disch_in[i], 6) == round(runoff_rate * (area[i] - unit_area), 6)
 
 
+def test_link_discharge_and_velocity():
+    """Test specific discharge and velocity on links of a basic ramp."""
+    rg = RasterModelGrid((10, 10), xy_spacing=(2, 2))
+    rg.add_field("topographic__elevation", 0.1 * rg.node_y, at="node")
+
+    kw = KinwaveImplicitOverlandFlow(rg)
+    for i in range(12):
+        kw.run_one_step(1.0, runoff_rate=0.001)
+    kw.calc_discharge_and_velocity_at_link()
+
+    # All of the outflow from node 15 goes down the link to node 5, against
+    # the direction of the link.
+    south_link = rg.links_at_node[15, 3]
+    q = rg.at_link["water__specific_discharge"]
+    assert q[south_link] * 2.0 == pytest.approx(-kw.disch_in[5])
+    assert round(q[south_link] * 2.0, 2) == -0.03
+    assert np.all(q[rg.horizontal_links] == 0.0)
+
+    vel = rg.at_link["water__velocity"]
+    assert vel[south_link] < 0.0
+    assert round(vel[south_link] * kw.depth[15], 3) == round(q[south_link], 3)
+
+
 if __name__ == "__main__":
     test_initialization()
     test_first_iteration()
     test_steady_basic_ramp()
     test_curved_surface()
+    test_link_discharge_and_velocity()
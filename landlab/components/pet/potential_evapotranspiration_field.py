@@ -223,10 +223,15 @@ class PotentialEvapotranspiration(Component):
             Observed radiation (W/m^2)
         """
 
-        if self._method == "Constant":
-            self._PET_value = const_potential_evapotranspiration
-        elif self._method == "PriestleyTaylor":
-            self._PET_value = self._PriestleyTaylor(current_time, Tmax, Tmin, Tavg)
+        self._calc_pet_value(
+            current_time=current_time,
+            const_potential_evapotranspiration=const_potential_evapotranspiration,
+            Tmin=Tmin,
+            Tmax=Tmax,
+            Tavg=Tavg,
+            obs_radiation=obs_radiation,
+        )
+        if self._method == "PriestleyTaylor":
             self._cell_values["radiation__incoming_shortwave_flux"] = (
                 self._Rs * self._cell_values["radiation__ratio_to_flat_surface"]
             )
@@ -239,6 +244,34 @@ class PotentialEvapotranspiration(Component):
             self._cell_values["radiation__net_flux"] = (
                 self._Rn * self._cell_values["radiation__ratio_to_flat_surface"]
             )
+
+        self._PET = (
+            self._PET_value * self._cell_values["radiation__ratio_to_flat_surface"]
+        )
+        self._cell_values["surface__potential_evapotranspiration_rate"][:] = self._PET
+
+    def _calc_pet_value(
+        self,
+        current_time=None,
+        const_potential_evapotranspiration=12.,
+        Tmin=0.,
+        Tmax=1.,
+        Tavg=0.5,
+        obs_radiation=350.,
+    ):
+        """Calculate potential evapotranspiration on a flat surface.
+
+        Takes the same parameters as *update*.
+
+        Returns
+        -------
+        float
+            Potential evapotranspiration rate (mm/d).
+        """
+        if self._method == "Constant":
+            self._PET_value = const_potential_evapotranspiration
+        elif self._method == "PriestleyTaylor":
+            self._PET_value = self._PriestleyTaylor(current_time, Tmax, Tmin, Tavg)
         elif self._method == "MeasuredRadiationPT":
             Robs = obs_radiation
             self._PET_value = self._MeasuredRadPT(Tavg, (1 - self._a) * Robs)
@@ -256,10 +289,7 @@ class PotentialEvapotranspiration(Component):
                 0.0,
             )
 
-        self._PET = (
-            self._PET_value * self._cell_values["radiation__ratio_to_flat_surface"]
-        )
-        self._cell_values["surface__potential_evapotranspiration_rate"][:] = self._PET
+        return self._PET_value
 
     def _PriestleyTaylor(self, current_time, Tmax, Tmin, Tavg):
 
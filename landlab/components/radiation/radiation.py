@@ -183,11 +183,42 @@ class Radiation(Component):
         hour: float, optional
               Hour of the day.
         """
-        self._t = hour
         self._radf = self._cell_values["radiation__ratio_to_flat_surface"]
         self._Rs = self._cell_values["radiation__incoming_shortwave_flux"]
         self._Rnet = self._cell_values["radiation__net_shortwave_flux"]
 
+        self._calc_sun_position(current_time, hour=hour)
+
+        self._sloped = np.cos(self._slope) * np.sin(self._alpha) + np.sin(
+            self._slope
+        ) * np.cos(self._alpha) * np.cos(self._phisun - self._aspect)
+        # Ratio of cosine of solar incidence angle of sloped surface to that
+        # of a flat surface
+        self._radf = self._sloped / self._flat
+
+        self._radf[self._radf <= 0.] = 0.
+        self._radf[self._radf > 6.] = 6.
+
+        # Sloped surface Toatl Incoming Shortwave Radn
+        self._Rs = self._Rsflat * self._radf
+        self._Rnet = self._Rnetflat * self._radf
+
+        self._cell_values["radiation__ratio_to_flat_surface"] = self._radf
+        self._cell_values["radiation__incoming_shortwave_flux"] = self._Rs
+        self._cell_values["radiation__net_shortwave_flux"] = self._Rnet
+
+    def _calc_sun_position(self, current_time, hour=12.):
+        """Calculate the position of the sun and radiation on a flat surface.
+
+        Parameters
+        ----------
+        current_time: float
+              Current time (years).
+        hour: float, optional
+              Hour of the day.
+        """
+        self._t = hour
+
         self._julian = np.floor(
             (current_time - np.floor(current_time)) * 365.25
         )  # Julian day
@@ -240,21 +271,3 @@ class Radiation(Component):
 
         # flat surface Net incoming shortwave radiation
         self._Rnetflat = (1 - self._A) * (1 - 0.65 * (self._N ** 2)) * self._Rsflat
-
-        self._sloped = np.cos(self._slope) * np.sin(self._alpha) + np.sin(
-            self._slope
-        ) * np.cos(self._alpha) * np.cos(self._phisun - self._aspect)
-        # Ratio of cosine of solar incidence angle of sloped surface to that
-        # of a flat surface
-        self._radf = self._sloped / self._flat
-
-        self._radf[self._radf <= 0.] = 0.
-        self._radf[self._radf > 6.] = 6.
-
-        # Sloped surface Toatl Incoming Shortwave Radn
-        self._Rs = self._Rsflat * self._radf
-        self._Rnet = self._Rnetflat * self._radf
-
-        self._cell_values["radiation__ratio_to_flat_surface"] = self._radf
-        self._cell_values["radiation__incoming_shortwave_flux"] = self._Rs
-        self._cell_values["radiation__net_shortwave_flux"] = self._Rnet
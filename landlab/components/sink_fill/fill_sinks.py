@@ -11,6 +11,10 @@ import numpy as np
 import landlab
 from landlab import Component, FieldError, ModelParameterDictionary
 from landlab.components import DepressionFinderAndRouter, FlowAccumulator
+from landlab.components.flow_routing.cfuncs import _priority_flood
+from landlab.components.flow_routing.priority_flood_router import (
+    _get_flood_connectivity,
+)
 from landlab.core.model_parameter_dictionary import MissingKeyError
 from landlab.grid.base import BAD_INDEX_VALUE
 from landlab.utils.decorators import deprecated, use_file_name_or_kwds
@@ -25,6 +29,12 @@ class SinkFiller(Component):
     spatially variable, and is chosen to not reverse any drainage directions
     at the perimeter of each lake.
 
+    If no slope is applied, depressions are filled in a single compiled pass
+    of the Priority-Flood algorithm (Barnes et al., 2014), without routing
+    flow or creating any fields other than *sediment_fill__depth*. An
+    optional *epsilon* then gives the filled surfaces (and any flats) a
+    small gradient toward their outlets.
+
     The primary method of this class is 'run_one_step'. 'fill_pits' is a
     synonym.
 
@@ -75,6 +85,19 @@ class SinkFiller(Component):
     >>> fr.run_one_step()
     >>> mg.at_node['flow__sink_flag'][mg.core_nodes].sum()
     0
+
+    Alternatively, fill the holes with a tiny gradient across their surfaces.
+
+    >>> field[:] = z
+    >>> hf = SinkFiller(mg, epsilon=1.e-6)
+    >>> hf.run_one_step()
+    >>> np.all(mg.at_node['topographic__elevation'][lake1] > 4.)
+    True
+    >>> np.all(mg.at_node['topographic__elevation'][lake1] < 4.001)
+    True
+    >>> fr.run_one_step()
+    >>> mg.at_node['flow__sink_flag'][mg.core_nodes].sum()
+    0
     """
 
     _name = "SinkFiller"
@@ -93,7 +116,15 @@ class SinkFiller(Component):
     }
 
     @use_file_name_or_kwds
-    def __init__(self, grid, routing="D8", apply_slope=False, fill_slope=1.e-5, **kwds):
+    def __init__(
+        self,
+        grid,
+        routing="D8",
+        apply_slope=False,
+        fill_slope=1.e-5,
+        epsilon=0.,
+        **kwds
+    ):
         """
         Parameters
         ----------
@@ -113,6 +144,11 @@ class SinkFiller(Component):
         fill_slope : float (m/m)
             The slope added to the top surface of filled pits to allow flow
             routing across them, if apply_slope.
+        epsilon : float (m)
+            If apply_slope is False, the smallest rise in elevation from one
+            filled node to the next, moving away from the outlet. Flats are
+            also given this gradient. The default (0.) leaves the filled
+            surfaces flat.
         """
         if "flow__receiver_node" in grid.at_node:
             if grid.at_node["flow__receiver_node"].size != grid.size("node"):
@@ -140,6 +176,9 @@ class SinkFiller(Component):
                 self.num_nbrs = 4
         self._fill_slope = fill_slope
         self._apply_slope = apply_slope
+        if epsilon < 0.:
+            raise ValueError("epsilon must not be negative")
+        self._epsilon = epsilon
         self.initialize()
 
     def initialize(self, input_stream=None):
@@ -195,8 +234,31 @@ class SinkFiller(Component):
             "node", "sediment_fill__depth", noclobber=False
         )
 
-        self._lf = DepressionFinderAndRouter(self._grid, routing=self._routing)
-        self._fr = FlowAccumulator(self._grid, flow_director=self._routing)
+        # the lake mapper and flow router are only needed to apply a slope,
+        # so are created when first used
+        self._lake_mapper = None
+        self._flow_router = None
+
+        self._bc_set_code = self._grid.bc_set_code
+        self._flood_connectivity = _get_flood_connectivity(self._grid, self._D8)
+
+    @property
+    def _lf(self):
+        """The DepressionFinderAndRouter used to map lakes."""
+        if self._lake_mapper is None:
+            self._lake_mapper = DepressionFinderAndRouter(
+                self._grid, routing=self._routing
+            )
+        return self._lake_mapper
+
+    @property
+    def _fr(self):
+        """The FlowAccumulator used to route flow before mapping lakes."""
+        if self._flow_router is None:
+            self._flow_router = FlowAccumulator(
+                self._grid, flow_director=self._routing
+            )
+        return self._flow_router
 
     def fill_pits(self, **kwds):
         """
@@ -214,6 +276,10 @@ class SinkFiller(Component):
             self._apply_slope = kwds["apply_slope"]
         except KeyError:
             pass
+        if not self._apply_slope:
+            self._fill_with_priority_flood()
+            return
+
         self.original_elev = self._elev.copy()
         # We need this, as we'll have to do ALL this again if we manage
         # to jack the elevs too high in one of the "subsidiary" lakes.
@@ -240,34 +306,8 @@ class SinkFiller(Component):
         )
         # add the depression depths to get up to flat:
         self._elev += self._grid.at_node["depression__depth"]
-        # if apply_slope is none, we're now done! But if not...
-        if self._apply_slope:
-            # new way of doing this - use the upstream structure! Should be
-            # both more general and more efficient
-            for (outlet_node, lake_code) in zip(
-                self._lf.lake_outlets, self._lf.lake_codes
-            ):
-                lake_nodes = np.where(self._lf.lake_map == lake_code)[0]
-                lake_perim = self._get_lake_ext_margin(lake_nodes)
-                perim_elevs = self._elev[lake_perim]
-                out_elev = self._elev[outlet_node]
-                lowest_elev_perim = perim_elevs[perim_elevs != out_elev].min()
-                # note we exclude the outlet node
-                elev_increment = (lowest_elev_perim - self._elev[outlet_node]) / (
-                    lake_nodes.size + 2.
-                )
-                assert elev_increment > 0.
-                all_ordering = self._grid.at_node["flow__upstream_node_order"]
-                upstream_order_bool = np.in1d(
-                    all_ordering, lake_nodes, assume_unique=True
-                )
-                lake_upstream_order = all_ordering[upstream_order_bool]
-                argsort_lake = np.argsort(lake_upstream_order)
-                elevs_to_add = (
-                    np.arange(lake_nodes.size, dtype=float) + 1.
-                ) * elev_increment
-                sorted_elevs_to_add = elevs_to_add[argsort_lake]
-                self._elev[lake_nodes] += sorted_elevs_to_add
+        # then incline the lake surfaces toward their outlets:
+        self._add_upstream_slopes()
         # now put back any fields that were present initially, and wipe the
         # rest:
         for delete_me in spurious_fields:
@@ -278,6 +318,74 @@ class SinkFiller(Component):
         # fill the output field
         self.sed_fill_depth[:] = self._elev - self.original_elev
 
+    def _fill_with_priority_flood(self):
+        """Fill depressions in one pass of the Priority-Flood algorithm.
+
+        Nothing but *sediment_fill__depth* and the elevations are written,
+        and no flow routing is done.
+        """
+        if self._bc_set_code != self._grid.bc_set_code:
+            self._flood_connectivity = _get_flood_connectivity(self._grid, self._D8)
+            self._bc_set_code = self._grid.bc_set_code
+        nbrs, links, is_closed, outlets = self._flood_connectivity
+
+        self.original_elev = np.array(self._elev, dtype=float)
+        filled = self.original_elev.copy()
+        n_nodes = self._grid.number_of_nodes
+        _priority_flood(
+            self.original_elev,
+            nbrs,
+            links,
+            outlets,
+            is_closed,
+            filled,
+            np.empty(n_nodes, dtype=int),
+            np.empty(n_nodes, dtype=int),
+            np.empty(n_nodes, dtype=int),
+            epsilon=self._epsilon,
+        )
+
+        self._elev[:] = filled
+        self.sed_fill_depth[:] = filled - self.original_elev
+
+    def _add_upstream_slopes(self):
+        """Incline the filled lakes toward their outlets.
+
+        Within each lake, elevations are raised in steps in the upstream
+        order set by the flow router, such that the highest lake node stays
+        below the lowest node on the lake perimeter (other than the outlet).
+        """
+        lake_map = self._lf.lake_map
+        lake_nodes = np.where(lake_map != BAD_INDEX_VALUE)[0]
+
+        upstream_order = self._grid.at_node["flow__upstream_node_order"]
+        rank_of_node = np.empty(upstream_order.size, dtype=int)
+        rank_of_node[upstream_order] = np.arange(upstream_order.size)
+
+        lake_nodes = lake_nodes[
+            np.lexsort((rank_of_node[lake_nodes], lake_map[lake_nodes]))
+        ]
+        codes, first_node, n_nodes = np.unique(
+            lake_map[lake_nodes], return_index=True, return_counts=True
+        )
+        nodes_in_lake = dict(
+            (code, lake_nodes[start : start + n])
+            for code, start, n in zip(codes, first_node, n_nodes)
+        )
+
+        for (outlet_node, lake_code) in zip(self._lf.lake_outlets, self._lf.lake_codes):
+            nodes = nodes_in_lake[lake_code]
+            lake_perim = self._get_lake_ext_margin(nodes)
+            perim_elevs = self._elev[lake_perim]
+            out_elev = self._elev[outlet_node]
+            lowest_elev_perim = perim_elevs[perim_elevs != out_elev].min()
+            # note we exclude the outlet node
+            elev_increment = (lowest_elev_perim - out_elev) / (nodes.size + 2.)
+            assert elev_increment > 0.
+            self._elev[nodes] += (np.arange(nodes.size, dtype=float) + 1.) * (
+                elev_increment
+            )
+
     @deprecated(use="fill_pits", version=1.0)
     def _fill_pits_old(self, apply_slope=None):
         """
@@ -11,7 +11,7 @@ import pytest
 from numpy.testing import assert_array_almost_equal, assert_array_equal
 
 from landlab import BAD_INDEX_VALUE as XX, FieldError, RasterModelGrid
-from landlab.components import FlowAccumulator, SinkFiller
+from landlab.components import DepressionFinderAndRouter, FlowAccumulator, SinkFiller
 
 
 def test_route_to_multiple_error_raised():
@@ -262,3 +262,73 @@ def test_D4_filling(sink_grid5):
     assert_array_almost_equal(
         sink_grid5.at_node["topographic__elevation"][sink_grid5.lake2], hole2
     )
+
+
+@pytest.mark.parametrize("routing", ["D4", "D8"])
+@pytest.mark.parametrize("seed", range(3))
+def test_fill_matches_depression_finder(routing, seed):
+    np.random.seed(seed)
+    z = np.round(20. * np.random.rand(150))
+
+    mg0 = RasterModelGrid((10, 15))
+    mg0.add_field("topographic__elevation", z.copy(), at="node")
+    FlowAccumulator(mg0, flow_director=routing).run_one_step()
+    DepressionFinderAndRouter(mg0, routing=routing).map_depressions(
+        reroute_flow=False
+    )
+
+    mg1 = RasterModelGrid((10, 15))
+    mg1.add_field("topographic__elevation", z.copy(), at="node")
+    hf = SinkFiller(mg1, routing=routing)
+    hf.run_one_step()
+
+    assert_array_almost_equal(
+        mg1.at_node["sediment_fill__depth"], mg0.at_node["depression__depth"]
+    )
+    assert_array_almost_equal(
+        mg1.at_node["topographic__elevation"], z + mg0.at_node["depression__depth"]
+    )
+
+
+def test_fill_does_not_route_flow(sink_grid2):
+    hf = SinkFiller(sink_grid2)
+    fields = set(sink_grid2.at_node.keys())
+    hf.run_one_step()
+    assert set(sink_grid2.at_node.keys()) == fields
+    assert_array_equal(
+        sink_grid2.at_node["sediment_fill__depth"][sink_grid2.lake], np.ones(9)
+    )
+
+
+@pytest.mark.parametrize("routing", ["D4", "D8"])
+def test_fill_with_epsilon(sink_grid4, routing):
+    z = sink_grid4.at_node["topographic__elevation"]
+    z_initial = z.copy()
+
+    hf = SinkFiller(sink_grid4, routing=routing, epsilon=1.e-6)
+    hf.run_one_step()
+
+    assert np.all(z >= z_initial)
+    assert np.all(z[sink_grid4.lake1] > 4.)
+    assert np.all(z[sink_grid4.lake1] < 4.001 + 1.e-4)
+    assert_array_almost_equal(sink_grid4.at_node["sediment_fill__depth"], z - z_initial)
+
+    fa = FlowAccumulator(sink_grid4, flow_director=routing)
+    fa.run_one_step()
+    assert sink_grid4.at_node["flow__sink_flag"][sink_grid4.core_nodes].sum() == 0
+
+
+def test_negative_epsilon(sink_grid2):
+    with pytest.raises(ValueError):
+        SinkFiller(sink_grid2, epsilon=-1.)
+
+
+def test_fill_after_boundary_change(sink_grid2):
+    hf = SinkFiller(sink_grid2)
+    sink_grid2.set_closed_boundaries_at_grid_edges(True, True, True, True)
+    sink_grid2.status_at_node[4] = sink_grid2.BC_NODE_IS_FIXED_VALUE
+    z = sink_grid2.at_node["topographic__elevation"]
+    z[14] = 0.5
+    hf.run_one_step()
+    assert z[14] == 1.
+    assert_array_equal(z[sink_grid2.lake], np.ones(9))
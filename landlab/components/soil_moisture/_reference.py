@@ -0,0 +1,176 @@
+"""Cell-by-cell soil moisture update.
+
+The tests and the benchmark of SoilMoisture use this as the reference for
+the whole-grid update.
+"""
+import numpy as np
+
+
+def _update_soil_moisture_by_cell(sm, P_, Tb):
+    """Update soil moisture one cell at a time.
+
+    This is the scalar scheme that SoilMoisture used before it updated
+    the whole grid at once.
+    """
+    sm._Sini = np.zeros(sm._SO.shape)
+    sm._ETmax = np.zeros(sm._SO.shape)
+
+    for cell in range(0, sm.grid.number_of_cells):
+        P = P_[cell]
+        # print cell
+        s = sm._SO[cell]
+        fbare = sm._fbare
+        ZR = sm._zr[cell]
+        pc = sm._soil_pc[cell]
+        fc = sm._soil_fc[cell]
+        scc = sm._soil_sc[cell]
+        wp = sm._soil_wp[cell]
+        hgw = sm._soil_hgw[cell]
+        beta = sm._soil_beta[cell]
+        if sm._vegtype[cell] == 0:  # 0 - GRASS
+            sc = scc * sm._fr[cell] + (1 - sm._fr[cell]) * fc
+        else:
+            sc = scc
+
+        Inf_cap = (
+            sm._soil_Ib[cell] * (1 - sm._vegcover[cell])
+            + sm._soil_Iv[cell] * sm._vegcover[cell]
+        )
+        # Infiltration capacity
+        Int_cap = min(sm._vegcover[cell] * sm._interception_cap[cell], P)
+        # Interception capacity
+        Peff = max(P - Int_cap, 0.)  # Effective precipitation depth
+        mu = (Inf_cap / 1000.0) / (pc * ZR * (np.exp(beta * (1. - fc)) - 1.))
+        Ep = max(
+            (
+                sm._PET[cell] * sm._fr[cell]
+                + fbare * sm._PET[cell] * (1. - sm._fr[cell])
+            )
+            - Int_cap,
+            0.0001,
+        )  # mm/d
+        sm._ETmax[cell] = Ep
+        nu = ((Ep / 24.) / 1000.) / (pc * ZR)  # Loss function parameter
+        nuw = ((sm._soil_Ew / 24.) / 1000.) / (pc * ZR)
+        # Loss function parameter
+        sini = sm._SO[cell] + ((Peff + sm._runon) / (pc * ZR * 1000.))
+
+        if sini > 1.:
+            sm._runoff[cell] = (sini - 1.) * pc * ZR * 1000.
+            # print 'Runoff =', sm._runoff
+            sini = 1.
+        else:
+            sm._runoff[cell] = 0.
+
+        if sini >= fc:
+            tfc = (1. / (beta * (mu - nu))) * (
+                beta * (fc - sini)
+                + np.log((nu - mu + mu * np.exp(beta * (sini - fc))) / nu)
+            )
+            tsc = ((fc - sc) / nu) + tfc
+            twp = ((sc - wp) / (nu - nuw)) * np.log(nu / nuw) + tsc
+
+            if Tb < tfc:
+                s = abs(
+                    sini
+                    - (1. / beta)
+                    * np.log(
+                        (
+                            (nu - mu + mu * np.exp(beta * (sini - fc)))
+                            * np.exp(beta * (nu - mu) * Tb)
+                            - mu * np.exp(beta * (sini - fc))
+                        )
+                        / (nu - mu)
+                    )
+                )
+
+                sm._D[cell] = ((pc * ZR * 1000.) * (sini - s)) - (Tb * (Ep / 24.))
+                sm._ETA[cell] = Tb * (Ep / 24.)
+
+            elif Tb >= tfc and Tb < tsc:
+                s = fc - (nu * (Tb - tfc))
+                sm._D[cell] = ((pc * ZR * 1000.) * (sini - fc)) - (
+                    (tfc) * (Ep / 24.)
+                )
+                sm._ETA[cell] = Tb * (Ep / 24.)
+
+            elif Tb >= tsc and Tb < twp:
+                s = wp + (sc - wp) * (
+                    (nu / (nu - nuw))
+                    * np.exp((-1) * ((nu - nuw) / (sc - wp)) * (Tb - tsc))
+                    - (nuw / (nu - nuw))
+                )
+                sm._D[cell] = ((pc * ZR * 1000.) * (sini - fc)) - (tfc * Ep / 24.)
+                sm._ETA[cell] = (1000. * ZR * pc * (sini - s)) - sm._D[cell]
+
+            else:
+                s = hgw + (wp - hgw) * np.exp(
+                    (-1) * (nuw / (wp - hgw)) * max(Tb - twp, 0.)
+                )
+                sm._D[cell] = ((pc * ZR * 1000.) * (sini - fc)) - (tfc * Ep / 24.)
+                sm._ETA[cell] = (1000. * ZR * pc * (sini - s)) - sm._D[cell]
+
+        elif sini < fc and sini >= sc:
+            tfc = 0.
+            tsc = (sini - sc) / nu
+            twp = ((sc - wp) / (nu - nuw)) * np.log(nu / nuw) + tsc
+
+            if Tb < tsc:
+                s = sini - nu * Tb
+                sm._D[cell] = 0.
+                sm._ETA[cell] = 1000. * ZR * pc * (sini - s)
+
+            elif Tb >= tsc and Tb < twp:
+                s = wp + (sc - wp) * (
+                    (nu / (nu - nuw))
+                    * np.exp((-1) * ((nu - nuw) / (sc - wp)) * (Tb - tsc))
+                    - (nuw / (nu - nuw))
+                )
+                sm._D[cell] = 0
+                sm._ETA[cell] = 1000. * ZR * pc * (sini - s)
+
+            else:
+                s = hgw + (wp - hgw) * np.exp(
+                    (-1) * (nuw / (wp - hgw)) * (Tb - twp)
+                )
+                sm._D[cell] = 0.
+                sm._ETA[cell] = 1000. * ZR * pc * (sini - s)
+
+        elif sini < sc and sini >= wp:
+            tfc = 0
+            tsc = 0
+            twp = ((sc - wp) / (nu - nuw)) * np.log(
+                1 + (nu - nuw) * (sini - wp) / (nuw * (sc - wp))
+            )
+
+            if Tb < twp:
+                s = wp + ((sc - wp) / (nu - nuw)) * (
+                    (np.exp((-1) * ((nu - nuw) / (sc - wp)) * Tb))
+                    * (nuw + ((nu - nuw) / (sc - wp)) * (sini - wp))
+                    - nuw
+                )
+                sm._D[cell] = 0.
+                sm._ETA[cell] = 1000. * ZR * pc * (sini - s)
+
+            else:
+                s = hgw + (wp - hgw) * np.exp(
+                    (-1) * (nuw / (wp - hgw)) * (Tb - twp)
+                )
+                sm._D[cell] = 0.
+                sm._ETA[cell] = 1000. * ZR * pc * (sini - s)
+
+        else:
+            tfc = 0.
+            tsc = 0.
+            twp = 0.
+
+            s = hgw + (sini - hgw) * np.exp((-1) * (nuw / (wp - hgw)) * Tb)
+            sm._D[cell] = 0.
+            sm._ETA[cell] = 1000. * ZR * pc * (sini - s)
+
+        sm._water_stress[cell] = min(
+            ((max(((sc - (s + sini) / 2.) / (sc - wp)), 0.)) ** 4.), 1.0
+        )
+        sm._S[cell] = s
+        sm._SO[cell] = s
+        sm._Sini[cell] = sini
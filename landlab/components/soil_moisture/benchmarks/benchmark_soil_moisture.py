@@ -0,0 +1,72 @@
+"""Timing of SoilMoisture.update on a large raster grid.
+
+Run as a script to print the time of one daily update of a grid with 1e6
+nodes using the whole-grid update and the cell-by-cell one::
+
+    $ python benchmark_soil_moisture.py
+"""
+from __future__ import print_function
+
+import timeit
+
+import numpy as np
+
+from landlab import RasterModelGrid
+from landlab.components import SoilMoisture
+from landlab.components.soil_moisture._reference import _update_soil_moisture_by_cell
+
+GRID_SHAPE = (1000, 1000)
+
+
+def _setup_soil_moisture(shape, by_cell=False):
+    grid = RasterModelGrid(shape)
+    n_cells = grid.number_of_cells
+    np.random.seed(0)
+    grid.add_field(
+        "vegetation__plant_functional_type",
+        np.random.randint(0, 6, n_cells),
+        at="cell",
+    )
+    grid.add_field("rainfall__daily_depth", 20. * np.random.rand(n_cells), at="cell")
+    grid.add_field(
+        "soil_moisture__initial_saturation_fraction",
+        np.random.rand(n_cells),
+        at="cell",
+    )
+    grid.add_field(
+        "surface__potential_evapotranspiration_rate",
+        10. * np.random.rand(n_cells),
+        at="cell",
+    )
+    grid.add_field("vegetation__cover_fraction", np.random.rand(n_cells), at="cell")
+    grid.add_field(
+        "vegetation__live_leaf_area_index", 3. * np.random.rand(n_cells), at="cell"
+    )
+    sm = SoilMoisture(grid)
+    if by_cell:
+        sm._update_soil_moisture = lambda P, Tb: _update_soil_moisture_by_cell(
+            sm, P, Tb
+        )
+    return sm
+
+
+def bench_soil_moisture_1e6():
+    sm = _setup_soil_moisture(GRID_SHAPE)
+    sm.update(0.)
+
+
+def time_per_update(shape, n_steps=1, by_cell=False):
+    """Return the mean time (s) of SoilMoisture.update."""
+    sm = _setup_soil_moisture(shape, by_cell=by_cell)
+    return timeit.timeit(lambda: sm.update(0.), number=n_steps) / n_steps
+
+
+if __name__ == "__main__":  # pragma: no cover
+    for by_cell in (False, True):
+        print(
+            "{n_nodes:>10d} nodes, {method}: {time:.3f} s per update".format(
+                n_nodes=GRID_SHAPE[0] * GRID_SHAPE[1],
+                method="cell by cell" if by_cell else "whole grid",
+                time=time_per_update(GRID_SHAPE, by_cell=by_cell),
+            )
+        )
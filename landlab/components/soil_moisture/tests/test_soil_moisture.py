@@ -4,7 +4,11 @@ Unit tests for \
 """
 import numpy as np
 import pytest
-from numpy.testing import assert_array_almost_equal
+from numpy.testing import assert_allclose, assert_array_almost_equal
+
+from landlab import RasterModelGrid
+from landlab.components.soil_moisture._reference import _update_soil_moisture_by_cell
+from landlab.components.soil_moisture.soil_moisture_dynamics import SoilMoisture
 
 (_SHAPE, _SPACING, _ORIGIN) = ((20, 20), (10e0, 10e0), (0., 0.))
 _ARGS = (_SHAPE, _SPACING, _ORIGIN)
@@ -92,3 +96,53 @@ def test_field_initialized_to_zero(sm):
     for name in sm.grid["cell"]:
         field = sm.grid["cell"][name]
         assert_array_almost_equal(field, np.zeros(sm.grid.number_of_cells))
+
+
+def _make_soil_moisture(seed):
+    grid = RasterModelGrid((22, 22))
+    n_cells = grid.number_of_cells
+    np.random.seed(seed)
+    grid.add_field(
+        "vegetation__plant_functional_type",
+        np.random.randint(0, 6, n_cells),
+        at="cell",
+    )
+    grid.add_field("rainfall__daily_depth", 20. * np.random.rand(n_cells), at="cell")
+    grid.at_cell["rainfall__daily_depth"][::5] = 0.
+    grid.add_field(
+        "soil_moisture__initial_saturation_fraction",
+        np.random.rand(n_cells),
+        at="cell",
+    )
+    grid.add_field(
+        "surface__potential_evapotranspiration_rate",
+        10. * np.random.rand(n_cells),
+        at="cell",
+    )
+    grid.add_field("vegetation__cover_fraction", np.random.rand(n_cells), at="cell")
+    grid.add_field(
+        "vegetation__live_leaf_area_index", 3. * np.random.rand(n_cells), at="cell"
+    )
+    return SoilMoisture(grid)
+
+
+@pytest.mark.parametrize("Tb", [0.5, 6., 24., 240., 2400.])
+def test_update_matches_update_by_cell(Tb):
+    """Test the whole-grid update against the cell-by-cell one."""
+    sm = _make_soil_moisture(1945)
+    sm_by_cell = _make_soil_moisture(1945)
+    sm_by_cell._update_soil_moisture = lambda P, Tb: _update_soil_moisture_by_cell(
+        sm_by_cell, P, Tb
+    )
+
+    for _ in range(3):
+        assert sm.update(0., Tb=Tb) == sm_by_cell.update(0., Tb=Tb)
+        for name in sm.output_var_names:
+            assert_allclose(
+                sm.grid.at_cell[name],
+                sm_by_cell.grid.at_cell[name],
+                rtol=1e-12,
+                atol=1e-12,
+            )
+        assert_allclose(sm._Sini, sm_by_cell._Sini, rtol=1e-12)
+        assert_allclose(sm._ETmax, sm_by_cell._ETmax, rtol=1e-12)
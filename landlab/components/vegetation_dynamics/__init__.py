@@ -1,5 +1,6 @@
 
 from .vegetation_dynamics import Vegetation
+from .ecohydrology import run_storms
 
 
-__all__ = ["Vegetation"]
+__all__ = ["Vegetation", "run_storms"]
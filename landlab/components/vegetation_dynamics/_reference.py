@@ -0,0 +1,96 @@
+"""Cell-by-cell biomass update.
+
+The tests and the benchmark of Vegetation use this as the reference for
+the whole-grid update.
+"""
+import numpy as np
+
+
+def _update_biomass_by_cell(
+    veg, PET, PET30_, ActualET, Water_stress, PETthreshold, Tb=24., Tr=0.01
+):
+    """Update biomass one cell at a time.
+
+    This is the scalar scheme that Vegetation used before it updated the
+    whole grid at once.
+    """
+    for cell in range(0, veg.grid.number_of_cells):
+
+        WUE = veg._WUE[cell]
+        LAImax = veg._LAI_max[cell]
+        cb = veg._cb[cell]
+        cd = veg._cd[cell]
+        ksg = veg._ksg[cell]
+        kdd = veg._kdd[cell]
+        kws = veg._kws[cell]
+        # ETdmax = veg._ETdmax[cell]
+        LAIlive = min(cb * veg._Blive_ini[cell], LAImax)
+        LAIdead = min(cd * veg._Bdead_ini[cell], (LAImax - LAIlive))
+        NPP = max((ActualET[cell] / (Tb + Tr)) * WUE * 24. * veg._w * 1000, 0.001)
+
+        if veg._vegtype[cell] == 0:
+            if PET30_[cell] > PETthreshold:
+                # Growing Season
+                Bmax = (LAImax - LAIdead) / cb
+                Yconst = 1 / (
+                    (1 / Bmax) + (((kws * Water_stress[cell]) + ksg) / NPP)
+                )
+                Blive = (veg._Blive_ini[cell] - Yconst) * np.exp(
+                    -(NPP / Yconst) * ((Tb + Tr) / 24.)
+                ) + Yconst
+                Bdead = (
+                    veg._Bdead_ini[cell]
+                    + (Blive - max(Blive * np.exp(-1 * ksg * Tb / 24.), 0.00001))
+                ) * np.exp(-1 * kdd * min(PET[cell] / veg._Tdmax, 1.) * Tb / 24.)
+            else:  # Senescense
+                Blive = max(
+                    veg._Blive_ini[cell] * np.exp((-2) * ksg * Tb / 24.), 1
+                )
+                Bdead = max(
+                    (
+                        veg._Bdead_ini[cell]
+                        + (
+                            veg._Blive_ini[cell]
+                            - (
+                                max(
+                                    veg._Blive_ini[cell]
+                                    * np.exp((-2) * ksg * Tb / 24.),
+                                    0.000001,
+                                )
+                            )
+                        )
+                        * np.exp(
+                            (-1) * kdd * min(PET[cell] / veg._Tdmax, 1.) * Tb / 24.
+                        ),
+                        0.,
+                    )
+                )
+
+        elif veg._vegtype[cell] == 3:
+            Blive = 0.
+            Bdead = 0.
+
+        else:
+            Bmax = LAImax / cb
+            Yconst = 1. / ((1. / Bmax) + (((kws * Water_stress[cell]) + ksg) / NPP))
+            Blive = (veg._Blive_ini[cell] - Yconst) * np.exp(
+                -(NPP / Yconst) * ((Tb + Tr) / 24.)
+            ) + Yconst
+            Bdead = (
+                veg._Bdead_ini[cell]
+                + (Blive - max(Blive * np.exp(-ksg * Tb / 24.), 0.00001))
+            ) * np.exp(-kdd * min(PET[cell] / veg._Tdmax, 1.) * Tb / 24.)
+
+        LAIlive = min(cb * (Blive + veg._Blive_ini[cell]) / 2., LAImax)
+        LAIdead = min(cd * (Bdead + veg._Bdead_ini[cell]) / 2., (LAImax - LAIlive))
+        if veg._vegtype[cell] == 0:
+            Vt = 1. - np.exp(-0.75 * (LAIlive + LAIdead))
+        else:
+            # Vt = 1 - np.exp(-0.75 * LAIlive)
+            Vt = 1.
+
+        veg._LAIlive[cell] = LAIlive
+        veg._LAIdead[cell] = LAIdead
+        veg._VegCov[cell] = Vt
+        veg._Blive[cell] = Blive
+        veg._Bdead[cell] = Bdead
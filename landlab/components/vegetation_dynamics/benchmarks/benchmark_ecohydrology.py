@@ -0,0 +1,90 @@
+"""Timing of a season of storms through the ecohydrology components.
+
+Run as a script to print the time to run a season of storms on a grid with
+1e6 nodes with run_storms, using the whole-grid updates of SoilMoisture
+and Vegetation and then their cell-by-cell ones::
+
+    $ python benchmark_ecohydrology.py
+"""
+from __future__ import print_function
+
+import timeit
+
+import numpy as np
+
+from landlab import RasterModelGrid
+from landlab.components import (
+    PotentialEvapotranspiration,
+    Radiation,
+    SoilMoisture,
+    Vegetation,
+)
+from landlab.components.soil_moisture._reference import _update_soil_moisture_by_cell
+from landlab.components.vegetation_dynamics import run_storms
+from landlab.components.vegetation_dynamics._reference import _update_biomass_by_cell
+
+GRID_SHAPE = (1000, 1000)
+N_STORMS = 90
+
+
+def _setup_ecohydrology(shape, by_cell=False):
+    grid = RasterModelGrid(shape, xy_spacing=10.)
+    np.random.seed(0)
+    grid.add_field(
+        "topographic__elevation",
+        0.1 * grid.node_y + np.random.rand(grid.number_of_nodes),
+        at="node",
+    )
+    grid.add_field(
+        "vegetation__plant_functional_type",
+        np.random.randint(0, 6, grid.number_of_cells),
+        at="cell",
+    )
+    grid.add_field(
+        "soil_moisture__initial_saturation_fraction",
+        np.full(grid.number_of_cells, 0.5),
+        at="cell",
+    )
+    sm = SoilMoisture(grid)
+    veg = Vegetation(grid)
+    if by_cell:
+        sm._update_soil_moisture = lambda P, Tb: _update_soil_moisture_by_cell(
+            sm, P, Tb
+        )
+        veg._update_biomass = lambda *args, **kwds: _update_biomass_by_cell(
+            veg, *args, **kwds
+        )
+    return Radiation(grid), PotentialEvapotranspiration(grid), sm, veg
+
+
+def _storms(n_storms):
+    np.random.seed(1)
+    return (
+        10. * np.random.exponential(size=n_storms),
+        np.random.uniform(0.5, 4., size=n_storms),
+        np.random.uniform(4., 44., size=n_storms),
+    )
+
+
+def bench_run_storms_1e6():
+    rad, pet, sm, veg = _setup_ecohydrology(GRID_SHAPE)
+    run_storms(rad, pet, sm, veg, 0., *_storms(N_STORMS))
+
+
+def time_per_season(shape, n_storms=N_STORMS, by_cell=False):
+    """Return the time (s) to run a season of storms."""
+    components = _setup_ecohydrology(shape, by_cell=by_cell)
+    storms = _storms(n_storms)
+    return timeit.timeit(lambda: run_storms(*(components + (0.,) + storms)), number=1)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    for by_cell in (False, True):
+        print(
+            "{n_nodes:>10d} nodes, {n_storms} storms, {method}: {time:.2f} s".format(
+                n_nodes=GRID_SHAPE[0] * GRID_SHAPE[1],
+                n_storms=N_STORMS,
+                method="cell by cell" if by_cell else "whole grid",
+                time=time_per_season(GRID_SHAPE, by_cell=by_cell),
+            )
+        )
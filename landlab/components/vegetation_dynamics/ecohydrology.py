@@ -0,0 +1,142 @@
+"""Run the ecohydrology components over a sequence of storms."""
+import numpy as np
+
+
+def _pet_30day_mean(pet, **pet_kwds):
+    """Mean potential evapotranspiration over the 30 days up to each day.
+
+    Parameters
+    ----------
+    pet: PotentialEvapotranspiration
+        Component that calculates potential evapotranspiration.
+    **pet_kwds
+        Keywords passed to the *update* method of *pet*.
+
+    Returns
+    -------
+    ndarray of float
+        30-day mean of the potential evapotranspiration on a flat surface
+        for each of the 365 days of the year (mm/d).
+    """
+    daily = np.array(
+        [pet._calc_pet_value((day + 0.5) / 365., **pet_kwds) for day in range(365)]
+    )
+    return np.convolve(
+        np.concatenate((daily[-29:], daily)), np.full(30, 1. / 30.), mode="valid"
+    )
+
+
+def run_storms(
+    radiation,
+    pet,
+    soil_moisture,
+    vegetation,
+    current_time,
+    rainfall,
+    storm_duration,
+    interstorm_duration,
+    **pet_kwds
+):
+    """Advance radiation, PET, soil moisture and vegetation over many storms.
+
+    All four components must be set up on the same grid. For each storm,
+    the rainfall of the grid is set to the depth of the storm, and the
+    components are updated, each over the whole grid, with the durations
+    of the storm and the interstorm that follows it.
+
+    The 30-day mean of potential evapotranspiration at each cell is the
+    mean on a flat surface over the 30 days up to the day of the storm,
+    scaled by the radiation ratio of the cell. The growing season of grass
+    starts when that mean is rising.
+
+    Parameters
+    ----------
+    radiation: Radiation
+        Radiation component.
+    pet: PotentialEvapotranspiration
+        Potential evapotranspiration component.
+    soil_moisture: SoilMoisture
+        Soil moisture component.
+    vegetation: Vegetation
+        Vegetation component.
+    current_time: float
+        Current time (years).
+    rainfall: array_like of float
+        Rainfall depth of each storm (mm).
+    storm_duration: array_like of float
+        Duration of each storm (hours).
+    interstorm_duration: array_like of float
+        Duration of the interstorm that follows each storm (hours).
+    **pet_kwds
+        Keywords passed to the *update* method of *pet*.
+
+    Returns
+    -------
+    float
+        Time after the last storm (years).
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from landlab import RasterModelGrid
+    >>> from landlab.components import (
+    ...     PotentialEvapotranspiration, Radiation, SoilMoisture, Vegetation
+    ... )
+    >>> from landlab.components.vegetation_dynamics import run_storms
+
+    >>> grid = RasterModelGrid((5, 4), xy_spacing=10.)
+    >>> _ = grid.add_field(
+    ...     "topographic__elevation", 0.2 * grid.node_y, at="node"
+    ... )
+    >>> _ = grid.add_zeros("vegetation__plant_functional_type", at="cell", dtype=int)
+    >>> grid.at_cell["soil_moisture__initial_saturation_fraction"] = np.full(6, 0.5)
+
+    >>> radiation = Radiation(grid)
+    >>> pet = PotentialEvapotranspiration(grid)
+    >>> soil_moisture = SoilMoisture(grid)
+    >>> vegetation = Vegetation(grid)
+
+    Run a month of daily storms.
+
+    >>> current_time = run_storms(
+    ...     radiation, pet, soil_moisture, vegetation, 0.5,
+    ...     rainfall=np.full(30, 2.),
+    ...     storm_duration=np.full(30, 2.),
+    ...     interstorm_duration=np.full(30, 22.),
+    ... )
+    >>> round(current_time, 4)
+    0.5821
+    >>> np.all(grid.at_cell["vegetation__live_biomass"] > 0.)
+    True
+    """
+    grid = soil_moisture.grid
+    rainfall, storm_duration, interstorm_duration = np.broadcast_arrays(
+        np.atleast_1d(np.asarray(rainfall, dtype=float)),
+        np.asarray(storm_duration, dtype=float),
+        np.asarray(interstorm_duration, dtype=float),
+    )
+    if len(rainfall) == 0:
+        return current_time
+
+    pet_30day_mean = _pet_30day_mean(pet, **pet_kwds)
+    for i in range(len(rainfall)):
+        grid.at_cell["rainfall__daily_depth"][:] = rainfall[i]
+        radiation.update(current_time)
+        pet.update(current_time, **pet_kwds)
+
+        julian = int(np.floor((current_time - np.floor(current_time)) * 365.))
+        grid.at_cell["surface__potential_evapotranspiration_30day_mean"][:] = (
+            pet_30day_mean[julian] * grid.at_cell["radiation__ratio_to_flat_surface"]
+        )
+        is_rising = pet_30day_mean[(julian + 1) % 365] > pet_30day_mean[julian]
+
+        current_time = soil_moisture.update(
+            current_time, Tr=storm_duration[i], Tb=interstorm_duration[i]
+        )
+        vegetation.update(
+            PETthreshold_switch=int(is_rising),
+            Tb=interstorm_duration[i],
+            Tr=storm_duration[i],
+        )
+
+    return float(current_time)
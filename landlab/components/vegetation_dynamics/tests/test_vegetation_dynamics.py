@@ -4,7 +4,18 @@ Unit tests for \
 """
 import numpy as np
 import pytest
-from numpy.testing import assert_array_almost_equal
+from numpy.testing import assert_allclose, assert_array_almost_equal
+
+from landlab import RasterModelGrid
+from landlab.components import (
+    PotentialEvapotranspiration,
+    Radiation,
+    SoilMoisture,
+    Vegetation,
+)
+from landlab.components.vegetation_dynamics import run_storms
+from landlab.components.vegetation_dynamics._reference import _update_biomass_by_cell
+from landlab.components.vegetation_dynamics.ecohydrology import _pet_30day_mean
 
 (_SHAPE, _SPACING, _ORIGIN) = ((20, 20), (10e0, 10e0), (0., 0.))
 _ARGS = (_SHAPE, _SPACING, _ORIGIN)
@@ -90,3 +101,119 @@ def test_field_initialized_to_zero(veg):
     for name in veg.grid["cell"]:
         field = veg.grid["cell"][name]
         assert_array_almost_equal(field, np.zeros(veg.grid.number_of_cells))
+
+
+def _make_vegetation(seed):
+    grid = RasterModelGrid((22, 22))
+    n_cells = grid.number_of_cells
+    np.random.seed(seed)
+    grid.add_field(
+        "vegetation__plant_functional_type",
+        np.random.randint(0, 6, n_cells),
+        at="cell",
+    )
+    grid.add_field(
+        "surface__evapotranspiration", 5. * np.random.rand(n_cells), at="cell"
+    )
+    grid.add_field(
+        "surface__potential_evapotranspiration_rate",
+        10. * np.random.rand(n_cells),
+        at="cell",
+    )
+    grid.add_field(
+        "surface__potential_evapotranspiration_30day_mean",
+        10. * np.random.rand(n_cells),
+        at="cell",
+    )
+    grid.add_field("vegetation__water_stress", np.random.rand(n_cells), at="cell")
+    return Vegetation(grid)
+
+
+@pytest.mark.parametrize("switch", [0, 1])
+def test_update_matches_update_by_cell(switch):
+    """Test the whole-grid update against the cell-by-cell one."""
+    veg = _make_vegetation(1945)
+    veg_by_cell = _make_vegetation(1945)
+    veg_by_cell._update_biomass = lambda *args, **kwds: _update_biomass_by_cell(
+        veg_by_cell, *args, **kwds
+    )
+
+    for _ in range(3):
+        veg.update(PETthreshold_switch=switch)
+        veg_by_cell.update(PETthreshold_switch=switch)
+        for name in veg.output_var_names:
+            assert_allclose(
+                veg.grid.at_cell[name], veg_by_cell.grid.at_cell[name], rtol=1e-12
+            )
+
+
+def _make_ecohydrology(seed):
+    grid = RasterModelGrid((12, 12), xy_spacing=10.)
+    np.random.seed(seed)
+    grid.add_field(
+        "topographic__elevation",
+        0.3 * grid.node_x + 0.1 * grid.node_y + np.random.rand(grid.number_of_nodes),
+        at="node",
+    )
+    grid.add_field(
+        "vegetation__plant_functional_type",
+        np.random.randint(0, 6, grid.number_of_cells),
+        at="cell",
+    )
+    grid.add_field(
+        "soil_moisture__initial_saturation_fraction",
+        np.random.rand(grid.number_of_cells),
+        at="cell",
+    )
+    return (
+        grid,
+        Radiation(grid),
+        PotentialEvapotranspiration(grid),
+        SoilMoisture(grid),
+        Vegetation(grid),
+    )
+
+
+def test_run_storms_matches_updates():
+    """Test run_storms against updating the components storm by storm."""
+    np.random.seed(7)
+    n_storms = 80
+    rainfall = 10. * np.random.exponential(size=n_storms)
+    storm_duration = np.random.uniform(0.5, 4., size=n_storms)
+    interstorm_duration = np.random.uniform(4., 120., size=n_storms)
+
+    grid, rad, pet, sm, veg = _make_ecohydrology(1945)
+    current_time = run_storms(
+        rad, pet, sm, veg, 0.2, rainfall, storm_duration, interstorm_duration
+    )
+
+    expected, rad, pet, sm, veg = _make_ecohydrology(1945)
+    pet_30day_mean = _pet_30day_mean(pet)
+    expected_time = 0.2
+    for i in range(n_storms):
+        expected.at_cell["rainfall__daily_depth"] = np.full(
+            expected.number_of_cells, rainfall[i]
+        )
+        rad.update(expected_time)
+        pet.update(expected_time)
+        julian = int(np.floor((expected_time - np.floor(expected_time)) * 365.))
+        expected.at_cell["surface__potential_evapotranspiration_30day_mean"] = (
+            pet_30day_mean[julian]
+            * expected.at_cell["radiation__ratio_to_flat_surface"]
+        )
+        expected_time = sm.update(
+            expected_time, Tr=storm_duration[i], Tb=interstorm_duration[i]
+        )
+        veg.update(
+            PETthreshold_switch=int(
+                pet_30day_mean[(julian + 1) % 365] > pet_30day_mean[julian]
+            ),
+            Tb=interstorm_duration[i],
+            Tr=storm_duration[i],
+        )
+
+    assert current_time == pytest.approx(expected_time)
+    for name in expected.at_cell:
+        assert_allclose(
+            grid.at_cell[name], expected.at_cell[name], rtol=1e-9, err_msg=name
+        )
@@ -445,86 +445,88 @@ class Vegetation(Component):
         else:
             PETthreshold = self._ETthresholddown
 
-        for cell in range(0, self.grid.number_of_cells):
-
-            WUE = self._WUE[cell]
-            LAImax = self._LAI_max[cell]
-            cb = self._cb[cell]
-            cd = self._cd[cell]
-            ksg = self._ksg[cell]
-            kdd = self._kdd[cell]
-            kws = self._kws[cell]
-            # ETdmax = self._ETdmax[cell]
-            LAIlive = min(cb * self._Blive_ini[cell], LAImax)
-            LAIdead = min(cd * self._Bdead_ini[cell], (LAImax - LAIlive))
-            NPP = max((ActualET[cell] / (Tb + Tr)) * WUE * 24. * self._w * 1000, 0.001)
-
-            if self._vegtype[cell] == 0:
-                if PET30_[cell] > PETthreshold:
-                    # Growing Season
-                    Bmax = (LAImax - LAIdead) / cb
-                    Yconst = 1 / (
-                        (1 / Bmax) + (((kws * Water_stress[cell]) + ksg) / NPP)
-                    )
-                    Blive = (self._Blive_ini[cell] - Yconst) * np.exp(
-                        -(NPP / Yconst) * ((Tb + Tr) / 24.)
-                    ) + Yconst
-                    Bdead = (
-                        self._Bdead_ini[cell]
-                        + (Blive - max(Blive * np.exp(-1 * ksg * Tb / 24.), 0.00001))
-                    ) * np.exp(-1 * kdd * min(PET[cell] / self._Tdmax, 1.) * Tb / 24.)
-                else:  # Senescense
-                    Blive = max(
-                        self._Blive_ini[cell] * np.exp((-2) * ksg * Tb / 24.), 1
-                    )
-                    Bdead = max(
-                        (
-                            self._Bdead_ini[cell]
-                            + (
-                                self._Blive_ini[cell]
-                                - (
-                                    max(
-                                        self._Blive_ini[cell]
-                                        * np.exp((-2) * ksg * Tb / 24.),
-                                        0.000001,
-                                    )
-                                )
-                            )
-                            * np.exp(
-                                (-1) * kdd * min(PET[cell] / self._Tdmax, 1.) * Tb / 24.
-                            ),
-                            0.,
-                        )
-                    )
-
-            elif self._vegtype[cell] == 3:
-                Blive = 0.
-                Bdead = 0.
-
-            else:
-                Bmax = LAImax / cb
-                Yconst = 1. / ((1. / Bmax) + (((kws * Water_stress[cell]) + ksg) / NPP))
-                Blive = (self._Blive_ini[cell] - Yconst) * np.exp(
-                    -(NPP / Yconst) * ((Tb + Tr) / 24.)
-                ) + Yconst
-                Bdead = (
-                    self._Bdead_ini[cell]
-                    + (Blive - max(Blive * np.exp(-ksg * Tb / 24.), 0.00001))
-                ) * np.exp(-kdd * min(PET[cell] / self._Tdmax, 1.) * Tb / 24.)
-
-            LAIlive = min(cb * (Blive + self._Blive_ini[cell]) / 2., LAImax)
-            LAIdead = min(cd * (Bdead + self._Bdead_ini[cell]) / 2., (LAImax - LAIlive))
-            if self._vegtype[cell] == 0:
-                Vt = 1. - np.exp(-0.75 * (LAIlive + LAIdead))
-            else:
-                # Vt = 1 - np.exp(-0.75 * LAIlive)
-                Vt = 1.
-
-            self._LAIlive[cell] = LAIlive
-            self._LAIdead[cell] = LAIdead
-            self._VegCov[cell] = Vt
-            self._Blive[cell] = Blive
-            self._Bdead[cell] = Bdead
+        self._update_biomass(
+            PET, PET30_, ActualET, Water_stress, PETthreshold, Tb=Tb, Tr=Tr
+        )
 
         self._Blive_ini = self._Blive
         self._Bdead_ini = self._Bdead
+
+    def _update_biomass(
+        self, PET, PET30_, ActualET, Water_stress, PETthreshold, Tb=24., Tr=0.01
+    ):
+        """Update biomass, leaf area index and cover of all cells at once.
+
+        Grass grows while the 30-day mean PET is above *PETthreshold* and
+        senesces otherwise, bare cells have no biomass, and all other plant
+        types grow. Each of these is applied to its cells through a mask.
+
+        Parameters
+        ----------
+        PET: ndarray of float
+            Potential evapotranspiration at each cell (mm/d).
+        PET30_: ndarray of float
+            30-day mean of potential evapotranspiration at each cell (mm/d).
+        ActualET: ndarray of float
+            Evapotranspiration at each cell (mm).
+        Water_stress: ndarray of float
+            Water stress at each cell.
+        PETthreshold: float
+            PET threshold for the growing season of grass (mm/d).
+        Tb: float, optional
+            Inter-storm duration (hours).
+        Tr: float, optional
+            Storm duration (hours).
+        """
+        Blive_ini = self._Blive_ini
+        Bdead_ini = self._Bdead_ini
+        LAImax = self._LAI_max
+        cb = self._cb
+        cd = self._cd
+        ksg = self._ksg
+        kdd = self._kdd
+
+        grass = self._vegtype == 0
+        bare = self._vegtype == 3
+        senescent = grass & ~(PET30_ > PETthreshold)
+
+        NPP = np.maximum(
+            (ActualET / (Tb + Tr)) * self._WUE * 24. * self._w * 1000, 0.001
+        )
+        dead_loss = np.exp(-kdd * np.minimum(PET / self._Tdmax, 1.) * Tb / 24.)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            # Growing season
+            LAIlive = np.minimum(cb * Blive_ini, LAImax)
+            LAIdead = np.minimum(cd * Bdead_ini, (LAImax - LAIlive))
+            Bmax = np.where(grass, (LAImax - LAIdead) / cb, LAImax / cb)
+            Yconst = 1. / ((1. / Bmax) + (((self._kws * Water_stress) + ksg) / NPP))
+            Blive = (Blive_ini - Yconst) * np.exp(
+                -(NPP / Yconst) * ((Tb + Tr) / 24.)
+            ) + Yconst
+            Bdead = (
+                Bdead_ini
+                + (Blive - np.maximum(Blive * np.exp(-ksg * Tb / 24.), 0.00001))
+            ) * dead_loss
+
+        # Senescence
+        Blive_sen = Blive_ini * np.exp((-2) * ksg * Tb / 24.)
+        Bdead_sen = np.maximum(
+            Bdead_ini + (Blive_ini - np.maximum(Blive_sen, 0.000001)) * dead_loss, 0.
+        )
+        Blive = np.where(senescent, np.maximum(Blive_sen, 1), Blive)
+        Bdead = np.where(senescent, Bdead_sen, Bdead)
+
+        Blive[bare] = 0.
+        Bdead[bare] = 0.
+
+        LAIlive = np.minimum(cb * (Blive + Blive_ini) / 2., LAImax)
+        LAIdead = np.minimum(cd * (Bdead + Bdead_ini) / 2., (LAImax - LAIlive))
+        # Vt = 1 - np.exp(-0.75 * LAIlive) for plant types other than grass
+        Vt = np.where(grass, 1. - np.exp(-0.75 * (LAIlive + LAIdead)), 1.)
+
+        self._LAIlive[:] = LAIlive
+        self._LAIdead[:] = LAIdead
+        self._VegCov[:] = Vt
+        self._Blive[:] = Blive
+        self._Bdead[:] = Bdead
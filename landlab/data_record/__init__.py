@@ -1,4 +1,5 @@
+from .columnar_data_record import ColumnarDataRecord
 from .data_record import DataRecord
 
 
-__all__ = ["DataRecord"]
+__all__ = ["DataRecord", "ColumnarDataRecord"]
@@ -0,0 +1,902 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Append-optimized storage of records of items that live on a grid."""
+
+import numpy as np
+from six import string_types
+from xarray import Dataset
+
+
+class _Table(object):
+
+    """Named columns, of equal length, that can be appended to.
+
+    Each column is stored in an array that doubles in size whenever it runs
+    out of room, so appending rows takes, on average, a constant amount of
+    time. A column need not have a value in every row; a mask records the
+    rows in which a column has been given a value.
+
+    Examples
+    --------
+    >>> from landlab.data_record.columnar_data_record import _Table
+    >>> table = _Table()
+    >>> table.append(2, size=[1., 2.])
+    >>> table.append(1, age=[7])
+    >>> len(table)
+    3
+    >>> table.column("size")[:2]
+    array([ 1.,  2.])
+    >>> table.present("size")
+    array([ True,  True, False], dtype=bool)
+    >>> table.set("size", [2], [3.])
+    >>> table.column("size")
+    array([ 1.,  2.,  3.])
+    """
+
+    def __init__(self):
+        self._size = 0
+        self._capacity = 0
+        self._columns = dict()
+        self._present = dict()
+
+    def __len__(self):
+        return self._size
+
+    def __contains__(self, name):
+        return name in self._columns
+
+    @property
+    def names(self):
+        """Names of the columns."""
+        return list(self._columns)
+
+    def column(self, name):
+        """Values of a column (undefined where they are not present)."""
+        return self._columns[name][: self._size]
+
+    def present(self, name):
+        """Rows in which a column has a value."""
+        return self._present[name][: self._size]
+
+    def grow(self, n_rows):
+        """Add rows in which no column has a value."""
+        self._reserve(self._size + n_rows)
+        for name in self._columns:
+            self._present[name][self._size : self._size + n_rows] = False
+        self._size += n_rows
+
+    def append(self, n_rows, **values):
+        """Add rows with values for some columns."""
+        start = self._size
+        self.grow(n_rows)
+        for name, value in values.items():
+            self.set(name, slice(start, start + n_rows), value)
+
+    def set(self, name, rows, values):
+        """Set the values of a column in existing rows."""
+        values = np.asarray(values)
+        if name not in self._columns:
+            self._columns[name] = np.empty(self._capacity, dtype=values.dtype)
+            self._present[name] = np.zeros(self._capacity, dtype=bool)
+        else:
+            dtype = np.result_type(self._columns[name], values)
+            if dtype != self._columns[name].dtype:
+                self._columns[name] = self._columns[name].astype(dtype)
+
+        self._columns[name][: self._size][rows] = values
+        self._present[name][: self._size][rows] = True
+
+    def _reserve(self, n_rows):
+        """Make room for at least *n_rows* rows."""
+        if n_rows <= self._capacity:
+            return
+        self._capacity = max(2 * self._capacity, n_rows, 16)
+        for name in self._columns:
+            for arrays in (self._columns, self._present):
+                larger = np.empty(self._capacity, dtype=arrays[name].dtype)
+                larger[: self._size] = arrays[name][: self._size]
+                arrays[name] = larger
+
+
+def _last_value_at(keys, values, query_keys):
+    """Find the value last given to each of a set of keys.
+
+    Returns
+    -------
+    tuple of ndarray
+        The index into *values* of the last value with each of the query
+        keys (or -1, if there is no such value), and whether it was found.
+
+    Examples
+    --------
+    >>> from landlab.data_record.columnar_data_record import _last_value_at
+    >>> _last_value_at([4, 2, 4], [10., 20., 30.], [4, 2, 3])
+    (array([ 2,  1, -1]), array([ True,  True, False], dtype=bool))
+    """
+    keys = np.asarray(keys)
+    query_keys = np.asarray(query_keys)
+
+    order = np.argsort(keys, kind="mergesort")
+    sorted_keys = keys[order]
+    index = np.searchsorted(sorted_keys, query_keys, side="right") - 1
+    found = index >= 0
+    found[found] = sorted_keys[index[found]] == query_keys[found]
+
+    rows = np.full(query_keys.shape, -1, dtype=int)
+    rows[found] = order[index[found]]
+
+    return rows, found
+
+
+def _fill_with_nan(values, found):
+    """Fill values that were not found with NaN."""
+    if np.all(found):
+        return values
+    if values.dtype.kind in ("i", "u", "b", "f"):
+        filled = values.astype(float)
+    else:
+        filled = values.astype(object)
+    filled[~found] = np.nan
+    return filled
+
+
+class ColumnarDataRecord(object):
+
+    """Append-optimized record of variables in time and of items on a grid.
+
+    ColumnarDataRecord stores the same sort of data as DataRecord, and has
+    the same methods to add, get and set it. Where a DataRecord grows its
+    xarray Dataset each time records or items are added, a
+    ColumnarDataRecord appends them to columns of preallocated arrays that
+    double in size when they run out of room. Values of variables that vary
+    by item and time are stored only for the items and times at which they
+    are recorded. An xarray Dataset of the record is built only when asked
+    for, through the *dataset* attribute.
+
+    Use ColumnarDataRecord when there are many items and many times, and
+    records and items are added often, for instance when tracking sediment
+    parcels.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from landlab import RasterModelGrid
+    >>> from landlab.data_record import ColumnarDataRecord
+    >>> grid = RasterModelGrid((3, 3))
+
+    >>> dr = ColumnarDataRecord(
+    ...     grid,
+    ...     time=[0.],
+    ...     items={'grid_element': 'node',
+    ...            'element_id': np.array([[1], [3]])},
+    ...     data_vars={'item_size': (['item_id', 'time'],
+    ...                              np.array([[0.3], [0.4]]))})
+    >>> dr.add_record(time=[1.],
+    ...               item_id=[1],
+    ...               new_item_loc={'grid_element': np.array([['node']]),
+    ...                             'element_id': np.array([[4]])},
+    ...               new_record={'item_size': (['item_id', 'time'],
+    ...                                         np.array([[0.2]]))})
+    >>> dr.add_item(time=[1.],
+    ...             new_item={'grid_element': 'node',
+    ...                       'element_id': np.array([[4]])},
+    ...             new_item_spec={'item_size': (['item_id', 'time'],
+    ...                                          np.array([[0.5]]))})
+    >>> dr.number_of_items, dr.number_of_timesteps
+    (3, 2)
+    >>> dr.get_data(time=[1.], data_variable='item_size')
+    array([ nan,  0.2,  0.5])
+    >>> dr.ffill_grid_element_and_id()
+    >>> dr.get_data(time=[1.], data_variable='element_id')
+    array([1, 4, 4])
+    >>> dr.calc_aggregate_value(np.sum, 'item_size')[:5]
+    array([ nan,  0.3,  nan,  0.4,  0.7])
+
+    >>> dr.dataset['item_size'].values
+    array([[ 0.3,  nan],
+           [ 0.4,  0.2],
+           [ nan,  0.5]])
+    """
+
+    _name = "ColumnarDataRecord"
+
+    def __init__(self, grid, time=None, items=None, data_vars=None, attrs=None):
+        """
+        Parameters
+        ----------
+        grid : ModelGrid
+        time : list or 1-D array of float or int (optional)
+            The initial time(s) to add to the record. A time dimension is not
+            created if the value is 'None' (default).
+        items : dict (optional)
+            Generic items that live on grid elements, as for DataRecord:
+                {'grid_element' : [grid_element],
+                 'element_id' : [element_id]}
+        data_vars : dict (optional)
+            Dictionary of the data variables to be recorded, as for
+            DataRecord:
+                {'variable_name_1' : (['dimensions'], variable_data_1)}
+        attrs : dict (optional)
+            Dictionary of global attributes on the record (metadata).
+        """
+        self._grid = grid
+        self.permitted_locations = self._grid.groups
+        self.attrs = dict(attrs or {})
+
+        self._has_time = time is not None
+        self._has_items = items is not None
+        self._time_index = dict()
+
+        self._times = _Table()
+        self._items = _Table()
+        self._records = _Table()
+        self._dataset = None
+
+        if time is not None:
+            if not isinstance(time, (list, np.ndarray)):
+                raise TypeError("time must be a list or numpy array")
+            self._add_times(time)
+
+        if items is not None:
+            try:
+                grid_element, element_id = items["grid_element"], items["element_id"]
+            except (KeyError, TypeError):
+                raise TypeError(
+                    "You must provide an `items` dictionary "
+                    "(see documentation for required format)"
+                )
+            self._add_items(grid_element, element_id, time)
+
+        if data_vars is not None:
+            try:
+                data_vars.keys()
+            except AttributeError:
+                raise TypeError(
+                    "Data variables (data_vars) passed to "
+                    "DataRecord must be a dictionary (see "
+                    "documentation for valid structure)"
+                )
+            self._write(data_vars, np.arange(len(self._items)), time)
+
+    @property
+    def dataset(self):
+        """The record as an xarray Dataset.
+
+        The Dataset is built the first time it is asked for after the record
+        has changed.
+        """
+        if self._dataset is None:
+            self._dataset = self._to_dataset()
+        return self._dataset
+
+    def __getitem__(self, name):
+        return self.dataset[name]
+
+    @property
+    def variable_names(self):
+        """Names of the data variables in the record."""
+        names = set(self._times.names + self._items.names + self._records.names)
+        return sorted(names - {"time", "item_id", "time_index"})
+
+    @property
+    def number_of_items(self):
+        """Number of items in the record."""
+        return len(self._items)
+
+    @property
+    def item_coordinates(self):
+        """List of the item_id coordinates in the record."""
+        return list(range(self.number_of_items))
+
+    @property
+    def number_of_timesteps(self):
+        """Number of time steps in the record."""
+        return len(self._times)
+
+    @property
+    def time_coordinates(self):
+        """List of the time coordinates in the record."""
+        return self._times.column("time").tolist()
+
+    @property
+    def earliest_time(self):
+        """Earliest time coordinate in the record."""
+        return min(self._times.column("time"))
+
+    @property
+    def latest_time(self):
+        """Latest time coordinate in the record."""
+        return max(self._times.column("time"))
+
+    @property
+    def prior_time(self):
+        """Penultimate time coordinate in the record."""
+        if self.number_of_timesteps < 2:
+            return np.nan
+        else:
+            return sorted(self.time_coordinates)[-2]
+
+    def add_record(self, time=None, item_id=None, new_item_loc=None, new_record=None):
+        """Add a time-related record.
+
+        Parameters are as for DataRecord.add_record.
+        """
+        if time is not None:
+            if not self._has_time:
+                raise KeyError("This DataRecord does not record time")
+            if not isinstance(time, (list, np.ndarray)):
+                raise TypeError(
+                    "You have passed a time that is"
+                    " not permitted, must be list or array"
+                )
+        if item_id is not None:
+            if not self._has_items:
+                raise KeyError("This DataRecord does not hold items")
+            item_id = self._check_item_id(item_id)
+        else:
+            item_id = np.arange(len(self._items))
+
+        if new_item_loc is not None:
+            if time is None:
+                raise ValueError(
+                    "Use the method set_data to change the "
+                    "location of an item in this DataRecord"
+                )
+            try:
+                grid_element = new_item_loc["grid_element"]
+                element_id = new_item_loc["element_id"]
+            except KeyError:
+                raise KeyError(
+                    "You must provide a "
+                    "new_item_loc dictionary with both "
+                    "grid_element and element_id"
+                )
+
+        if time is not None:
+            self._add_times(time)
+
+        if new_item_loc is not None:
+            grid_element, element_id = self._check_location(
+                grid_element, element_id, (len(item_id), len(time))
+            )
+            self._write(
+                {
+                    "grid_element": (["item_id", "time"], grid_element),
+                    "element_id": (["item_id", "time"], element_id),
+                },
+                item_id,
+                time,
+            )
+
+        if new_record is not None:
+            self._write(new_record, item_id, time)
+
+        self._dataset = None
+
+    def add_item(self, time=None, new_item=None, new_item_spec=None):
+        """Add new item(s).
+
+        Parameters are as for DataRecord.add_item.
+        """
+        if time is None and self._has_time and self._has_items:
+            raise ValueError(
+                "The items previously defined in this DataRecord"
+                ' have dimensions "time" and "item_id", '
+                'you must provide a "time" for the new item(s)'
+            )
+        if time is not None and not self._has_time:
+            raise KeyError("This DataRecord does not record time")
+        try:
+            grid_element, element_id = (
+                new_item["grid_element"],
+                new_item["element_id"],
+            )
+        except (KeyError, TypeError):
+            raise KeyError(
+                "You must provide a new_item dictionary "
+                "(see documentation for required format)"
+            )
+
+        if time is not None:
+            self._add_times(time)
+        first_new_item = len(self._items)
+        self._add_items(grid_element, element_id, time)
+
+        if new_item_spec is not None:
+            self._write(
+                new_item_spec, np.arange(first_new_item, len(self._items)), time
+            )
+
+        self._dataset = None
+
+    def get_data(self, time=None, item_id=None, data_variable=None):
+        """Get the value of a variable at a model time and/or for an item.
+
+        Parameters are as for DataRecord.get_data.
+
+        Examples
+        --------
+        >>> import numpy as np
+        >>> from landlab import RasterModelGrid
+        >>> from landlab.data_record import ColumnarDataRecord
+        >>> grid = RasterModelGrid((3,3))
+        >>> dr = ColumnarDataRecord(
+        ...     grid,
+        ...     time=[50.],
+        ...     items={'grid_element': 'node',
+        ...            'element_id': np.array([[1], [3], [3], [7]])},
+        ...     data_vars={'item_size': (['item_id', 'time'],
+        ...                              np.array([[0.3], [0.4], [0.8], [0.4]])),
+        ...                'mean_elev': (['time'], [110.])})
+        >>> dr.get_data([50.], [2], 'element_id')
+        array([3])
+        >>> dr.get_data(time=[50.], data_variable='item_size')
+        array([ 0.3,  0.4,  0.8,  0.4])
+        >>> dr.get_data(item_id=[1, 2], data_variable='grid_element')
+        array([['node'],
+               ['node']],
+              dtype='<U4')
+        >>> dr.get_data(time=[50.], data_variable='mean_elev')
+        array(110.0)
+        """
+        if data_variable not in self.variable_names:
+            raise KeyError(
+                "the variable '{}' is not in the " "DataRecord".format(data_variable)
+            )
+
+        item_id, time_index = self._item_and_time_index(item_id, time)
+
+        if data_variable in self._records:
+            values = self._cell_values(data_variable, item_id, time_index)
+            if time is not None:
+                values = values[:, 0]
+        elif data_variable in self._items:
+            values = self._column_values(self._items, data_variable, item_id)
+        else:
+            values = self._column_values(self._times, data_variable, time_index)
+            if time is not None:
+                values = values[0]
+
+        return np.asarray(values)
+
+    def set_data(self, time=None, item_id=None, data_variable=None, new_value=np.nan):
+        """Set the value of a variable at a model time and/or for an item.
+
+        Parameters are as for DataRecord.set_data. New values of variables
+        that vary by item and time are appended to the record, and take the
+        place of the values recorded before for the same items and times.
+        The location of an item is checked against the grid before it is
+        set.
+
+        Examples
+        --------
+        >>> import numpy as np
+        >>> from landlab import RasterModelGrid
+        >>> from landlab.data_record import ColumnarDataRecord
+        >>> grid = RasterModelGrid((3,3))
+        >>> dr = ColumnarDataRecord(
+        ...     grid,
+        ...     time=[50.],
+        ...     items={'grid_element': 'node',
+        ...            'element_id': np.array([[1], [3], [3], [7]])},
+        ...     data_vars={'item_size': (['item_id', 'time'],
+        ...                              np.array([[0.3], [0.4], [0.8], [0.4]]))})
+        >>> dr.set_data([50.], [2], 'item_size', [0.5])
+        >>> dr['item_size'].values
+        array([[ 0.3],
+               [ 0.4],
+               [ 0.5],
+               [ 0.4]])
+        >>> dr.set_data([50.], [0], 'element_id', 4)
+        >>> dr.get_data(time=[50.], data_variable='element_id')
+        array([4, 3, 3, 7])
+        """
+        if data_variable not in self.variable_names:
+            raise KeyError(
+                "the variable '{}' is not in the " "DataRecord".format(data_variable)
+            )
+        item_id, time_index = self._item_and_time_index(item_id, time)
+
+        if data_variable in self._records and time is None:
+            shape = (len(item_id), len(time_index))
+        elif data_variable in self._times:
+            shape = (len(time_index),)
+        else:
+            shape = (len(item_id),)
+        new_values = {data_variable: np.broadcast_to(new_value, shape)}
+
+        if data_variable in ("grid_element", "element_id"):
+            location = {
+                "grid_element": self.get_data(time, item_id, "grid_element"),
+                "element_id": self.get_data(time, item_id, "element_id"),
+            }
+            location.update(new_values)
+            grid_element, element_id = self._check_location(
+                location["grid_element"], location["element_id"], shape
+            )
+            new_values = {"grid_element": grid_element, "element_id": element_id}
+
+        if data_variable in self._records:
+            self._write(
+                {
+                    name: (["item_id", "time"], values.reshape((len(item_id), -1)))
+                    for name, values in new_values.items()
+                },
+                item_id,
+                time,
+            )
+        elif data_variable in self._items:
+            for name, values in new_values.items():
+                self._items.set(name, item_id, values)
+        else:
+            self._times.set(data_variable, time_index, new_values[data_variable])
+
+        self._dataset = None
+
+    def calc_aggregate_value(
+        self, func, data_variable, at="node", filter_array=None, args=(), **kwargs
+    ):
+        """Apply a function to a variable aggregated at grid elements.
+
+        Parameters are as for DataRecord.calc_aggregate_value. Values
+        that have not been recorded are ignored.
+
+        Examples
+        --------
+        >>> import numpy as np
+        >>> from landlab.data_record import ColumnarDataRecord
+        >>> from landlab import RasterModelGrid
+        >>> grid = RasterModelGrid((3,3))
+        >>> element_id = [0, 0, 0, 0, 1, 2, 3, 4, 5]
+        >>> volumes = [4, 5, 1, 2, 3, 4, 5, 6, 7]
+        >>> ages = [10, 11, 12, 13, 14, 15, 16, 8, 10]
+        >>> dr = ColumnarDataRecord(
+        ...     grid,
+        ...     items={'grid_element' : 'node',
+        ...            'element_id' : np.array(element_id)},
+        ...     data_vars={'ages' : (['item_id'], np.array(ages)),
+        ...                'volumes' : (['item_id'], np.array(volumes))})
+        >>> dr.calc_aggregate_value(func=np.sum, data_variable='ages')
+        array([ 46.,  14.,  15.,  16.,   8.,  10.,  nan,  nan,  nan])
+
+        >>> f = dr.get_data(data_variable='ages') > 10.
+        >>> dr.calc_aggregate_value(func=np.sum, data_variable='volumes',
+        ...                         filter_array=f)
+        array([  8.,   3.,   4.,   5.,  nan,  nan,  nan,  nan,  nan])
+        """
+        if self._has_time:
+            item, time_index, grid_element, element_id = self._locations()
+            if data_variable in self._records:
+                rows, found = self._last_cell_rows(data_variable, item, time_index)
+                values = self._records.column(data_variable)[rows]
+            elif data_variable in self._items:
+                values = self._items.column(data_variable)[item]
+                found = self._items.present(data_variable)[item]
+            else:
+                raise ValueError(
+                    "{} does not vary with item_id".format(data_variable)
+                )
+        else:
+            item = np.arange(self.number_of_items)
+            time_index = None
+            grid_element = self._items.column("grid_element")
+            element_id = self._items.column("element_id")
+            values = self._items.column(data_variable)
+            found = self._items.present(data_variable)
+
+        keep = found & (grid_element == at)
+        if values.dtype.kind == "f":
+            keep &= ~np.isnan(values)
+        if filter_array is not None:
+            filter_array = np.asarray(filter_array, dtype=bool)
+            if time_index is None or filter_array.ndim == 1:
+                keep &= filter_array[item]
+            else:
+                keep &= filter_array[item, time_index]
+
+        element_id, values = element_id[keep], values[keep]
+
+        out = np.nan * np.ones(self._grid[at].size)
+
+        order = np.argsort(element_id, kind="mergesort")
+        elements, first = np.unique(element_id[order], return_index=True)
+        for element, group in zip(elements, np.split(values[order], first[1:])):
+            out[element] = func(group, *args, **kwargs)
+
+        return out
+
+    def ffill_grid_element_and_id(self):
+        """Fill missing values of 'grid_element' and 'element_id'.
+
+        The location of each item is propagated forward in time, from the
+        time at which it is recorded to the time of the next record of its
+        location.
+
+        Examples
+        --------
+        >>> import numpy as np
+        >>> from landlab import RasterModelGrid
+        >>> from landlab.data_record import ColumnarDataRecord
+        >>> grid = RasterModelGrid((3,3))
+        >>> dr = ColumnarDataRecord(
+        ...     grid,
+        ...     time=[0.],
+        ...     items={'grid_element': np.array([['node'], ['link']]),
+        ...            'element_id': np.array([[1], [3]])})
+        >>> dr.add_record(time=[2.0, 3.0],
+        ...               new_record={'mean_elevation': (
+        ...                          ['time'], np.array([200., 250.]))})
+        >>> dr.get_data(data_variable='element_id')
+        array([[  1.,  nan,  nan],
+               [  3.,  nan,  nan]])
+        >>> dr.ffill_grid_element_and_id()
+        >>> dr.get_data(data_variable='grid_element')
+        array([['node', 'node', 'node'],
+               ['link', 'link', 'link']],
+              dtype='<U4')
+        >>> dr.get_data(data_variable='element_id')
+        array([[1, 1, 1],
+               [3, 3, 3]])
+        """
+        if not self._has_time or not self._has_items:
+            return
+
+        item, time_index, grid_element, element_id = self._locations()
+        n_times = self.number_of_timesteps
+
+        order = np.lexsort((time_index, item))
+        item, time_index = item[order], time_index[order]
+        grid_element, element_id = grid_element[order], element_id[order]
+
+        next_time = np.empty_like(time_index)
+        next_time[:-1] = time_index[1:]
+        next_time[-1:] = n_times
+        is_last = np.ones(len(item), dtype=bool)
+        is_last[:-1] = item[:-1] != item[1:]
+        next_time[is_last] = n_times
+
+        n_fill = next_time - time_index - 1
+        source = np.repeat(np.arange(len(item)), n_fill)
+        offset = np.arange(len(source)) - np.repeat(np.cumsum(n_fill) - n_fill, n_fill)
+
+        self._records.append(
+            len(source),
+            item_id=item[source],
+            time_index=time_index[source] + offset + 1,
+            grid_element=grid_element[source],
+            element_id=element_id[source],
+        )
+        self._dataset = None
+
+    def _add_times(self, time):
+        """Add time coordinates that are not yet in the record."""
+        new_times = [t for t in np.asarray(time).tolist() if t not in self._time_index]
+        for t in new_times:
+            self._time_index[t] = len(self._time_index)
+        self._times.append(len(new_times), time=np.asarray(new_times, dtype=float))
+
+    def _add_items(self, grid_element, element_id, time):
+        """Add new items at their locations."""
+        element_id = np.asarray(element_id)
+        n_items = len(element_id)
+        if self._has_time and time is not None:
+            shape = (n_items, len(time))
+        else:
+            shape = (n_items,)
+        grid_element, element_id = self._check_location(
+            grid_element, element_id, shape
+        )
+
+        first_item = len(self._items)
+        self._items.grow(n_items)
+        self._has_items = True
+
+        item_id = np.arange(first_item, first_item + n_items)
+        if len(shape) == 2:
+            self._write(
+                {
+                    "grid_element": (["item_id", "time"], grid_element),
+                    "element_id": (["item_id", "time"], element_id),
+                },
+                item_id,
+                time,
+            )
+        else:
+            self._items.set("grid_element", item_id, grid_element)
+            self._items.set("element_id", item_id, element_id)
+
+    def _item_and_time_index(self, item_id, time):
+        """Check items and a time, and return item IDs and time indices."""
+        if item_id is not None:
+            if not self._has_items:
+                raise KeyError("This DataRecord does not hold items")
+            try:
+                len(item_id)
+            except TypeError:
+                raise TypeError("item_id must be a list or a 1-D array")
+            item_id = np.asarray(item_id, dtype=int)
+            if np.any(item_id >= self.number_of_items):
+                raise IndexError(
+                    "The item_id you passed does not exist " "in this DataRecord"
+                )
+        else:
+            item_id = np.arange(self.number_of_items)
+
+        if time is not None:
+            if not self._has_time:
+                raise KeyError("This DataRecord does not record time")
+            try:
+                len(time)
+            except TypeError:
+                raise TypeError("time must be a list or a 1-D array")
+            try:
+                time_index = np.array([self._time_index[time[0]]])
+            except KeyError:
+                raise IndexError(
+                    "The time you passed is not currently"
+                    " in the DataRecord, you must change the value"
+                    " you pass or first create the new time "
+                    " coordinate using the add_record method"
+                )
+        else:
+            time_index = np.arange(self.number_of_timesteps)
+
+        return item_id, time_index
+
+    def _check_item_id(self, item_id):
+        """Check that items exist."""
+        try:
+            len(item_id)
+        except TypeError:
+            raise TypeError("item_id must be a list or a 1D array")
+        item_id = np.asarray(item_id, dtype=int)
+        if np.any((item_id < 0) | (item_id >= len(self._items))):
+            raise ValueError(
+                "One or more of the value(s) you "
+                "passed as item_id is/are not "
+                "currently in the DataRecord. Change"
+                " the input values create a new item"
+                "using the method add_item"
+            )
+        return item_id
+
+    def _check_location(self, grid_element, element_id, shape):
+        """Check that grid elements and element IDs exist on the grid."""
+        element_id = np.asarray(element_id)
+        if isinstance(grid_element, string_types):
+            grid_element = np.full(shape, grid_element)
+        else:
+            grid_element = np.asarray(grid_element).astype(str).reshape(shape)
+        element_id = element_id.reshape(shape)
+
+        if element_id.dtype.kind not in ("i", "u"):
+            raise ValueError(
+                "You have passed a non-integer element_id to "
+                "DataRecord, this is not permitted"
+            )
+
+        for at in np.unique(grid_element):
+            if at not in self.permitted_locations:
+                raise ValueError(
+                    "Location provided: " + at + " is "
+                    "not a permitted location for this grid type"
+                )
+            ids = element_id[grid_element == at]
+            if np.any(ids >= self._grid[at].size):
+                raise ValueError(
+                    "An item residing at " + at + " has an "
+                    "element_id larger than the number of " + at + " on the grid"
+                )
+            if np.any(ids < 0):
+                raise ValueError(
+                    "An item residing at " + at + " has "
+                    "an element id below zero. This is not "
+                    "permitted"
+                )
+
+        return grid_element, element_id
+
+    def _write(self, data_vars, item_id, time):
+        """Write variables for items and/or times."""
+        item_id = np.asarray(item_id, dtype=int)
+        if time is not None:
+            time_index = np.array(
+                [self._time_index[t] for t in np.asarray(time).tolist()]
+            )
+        else:
+            time_index = np.arange(self.number_of_timesteps)
+
+        records = {}
+        for name, (dims, values) in data_vars.items():
+            values = np.asarray(values)
+            dims = list(dims)
+            if dims == ["time"]:
+                self._times.set(name, time_index, values.reshape((-1,)))
+            elif dims == ["item_id"]:
+                self._items.set(name, item_id, values.reshape((-1,)))
+            elif sorted(dims) == ["item_id", "time"]:
+                if dims == ["time", "item_id"]:
+                    values = values.T
+                values = values.reshape((len(item_id), len(time_index)))
+                records[name] = values.reshape((-1,))
+            else:
+                raise ValueError(
+                    "Data variable dimensions must be " "time and/or item_id"
+                )
+
+        if records:
+            self._records.append(
+                len(item_id) * len(time_index),
+                item_id=np.repeat(item_id, len(time_index)),
+                time_index=np.tile(time_index, len(item_id)),
+                **records
+            )
+
+    def _locations(self):
+        """Items, time indices and locations at which items are recorded."""
+        present = self._records.present("element_id")
+        item = self._records.column("item_id")[present]
+        time_index = self._records.column("time_index")[present]
+
+        keys = item * self.number_of_timesteps + time_index
+        unique_keys = np.unique(keys)
+        rows, _ = _last_value_at(keys, np.arange(len(keys)), unique_keys)
+
+        row = np.where(present)[0][rows]
+        return (
+            item[rows],
+            time_index[rows],
+            self._records.column("grid_element")[row],
+            self._records.column("element_id")[row],
+        )
+
+    def _last_cell_rows(self, name, item, time_index):
+        """Rows of the records that last gave a variable a value."""
+        present = np.where(self._records.present(name))[0]
+        keys = (
+            self._records.column("item_id")[present] * self.number_of_timesteps
+            + self._records.column("time_index")[present]
+        )
+        rows, found = _last_value_at(
+            keys, present, item * self.number_of_timesteps + time_index
+        )
+        return present[rows], found
+
+    def _cell_values(self, name, item_id, time_index):
+        """Values of a variable for a set of items at a set of times."""
+        item = np.repeat(item_id, len(time_index))
+        times = np.tile(time_index, len(item_id))
+        rows, found = self._last_cell_rows(name, item, times)
+        values = _fill_with_nan(self._records.column(name)[rows], found)
+        return values.reshape((len(item_id), len(time_index)))
+
+    @staticmethod
+    def _column_values(table, name, rows):
+        """Values of a column, with NaN where they are not present."""
+        return _fill_with_nan(table.column(name)[rows], table.present(name)[rows])
+
+    def _to_dataset(self):
+        """Build an xarray Dataset of the record."""
+        coords = {}
+        if self._has_time:
+            coords["time"] = self._times.column("time").copy()
+        if self._has_items:
+            coords["item_id"] = np.arange(self.number_of_items)
+
+        item_id = np.arange(self.number_of_items)
+        time_index = np.arange(self.number_of_timesteps)
+
+        data_vars = {}
+        for name in self._times.names:
+            if name != "time":
+                values = self._column_values(self._times, name, time_index)
+                data_vars[name] = (["time"], values)
+        for name in self._items.names:
+            values = self._column_values(self._items, name, item_id)
+            data_vars[name] = (["item_id"], values)
+        for name in self._records.names:
+            if name not in ("item_id", "time_index"):
+                values = self._cell_values(name, item_id, time_index)
+                data_vars[name] = (["item_id", "time"], values)
+
+        return Dataset(data_vars=data_vars, coords=coords, attrs=self.attrs)
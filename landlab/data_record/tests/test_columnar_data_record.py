@@ -0,0 +1,247 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for landlab.data_record.columnar_data_record.ColumnarDataRecord
+"""
+
+import numpy as np
+import pytest
+from numpy.testing import assert_array_almost_equal, assert_array_equal
+
+from landlab import RasterModelGrid
+from landlab.data_record import ColumnarDataRecord
+
+grid = RasterModelGrid((3, 3))
+
+
+@pytest.fixture
+def cdr_2dim():
+    return ColumnarDataRecord(
+        grid,
+        time=[0.],
+        items={
+            "grid_element": np.array([["node"], ["link"]]),
+            "element_id": np.array([[1], [3]]),
+        },
+        data_vars={
+            "mean_elevation": (["time"], [110.]),
+            "item_size": (["item_id", "time"], np.array([[0.3], [0.4]])),
+        },
+    )
+
+
+def test_coordinates(cdr_2dim):
+    assert cdr_2dim.time_coordinates == [0.]
+    assert cdr_2dim.item_coordinates == [0, 1]
+    assert cdr_2dim.number_of_timesteps == 1
+    assert cdr_2dim.number_of_items == 2
+    assert np.isnan(cdr_2dim.prior_time)
+    cdr_2dim.add_record(
+        time=[10., 20.], new_record={"mean_elevation": (["time"], [120., 130.])}
+    )
+    assert cdr_2dim.earliest_time == 0.
+    assert cdr_2dim.latest_time == 20.
+    assert cdr_2dim.prior_time == 10.
+
+
+def test_variable_names(cdr_2dim):
+    assert cdr_2dim.variable_names == [
+        "element_id",
+        "grid_element",
+        "item_size",
+        "mean_elevation",
+    ]
+
+
+def test_add_record_at_existing_time(cdr_2dim):
+    cdr_2dim.add_record(
+        time=[0.],
+        item_id=[1],
+        new_record={"item_size": (["item_id", "time"], np.array([[0.7]]))},
+    )
+    assert cdr_2dim.number_of_timesteps == 1
+    assert_array_equal(
+        cdr_2dim.get_data(time=[0.], data_variable="item_size"), [0.3, 0.7]
+    )
+
+
+def test_dataset(cdr_2dim):
+    cdr_2dim.add_record(
+        time=[1.],
+        item_id=[0],
+        new_item_loc={
+            "grid_element": np.array([["node"]]),
+            "element_id": np.array([[2]]),
+        },
+    )
+    ds = cdr_2dim.dataset
+    assert ds is cdr_2dim.dataset
+    assert_array_equal(ds["time"], [0., 1.])
+    assert_array_equal(ds["item_id"], [0, 1])
+    assert_array_equal(ds["mean_elevation"], [110., np.nan])
+    assert_array_equal(ds["element_id"], [[1, 2], [3, np.nan]])
+    assert_array_equal(cdr_2dim["item_size"], [[0.3, np.nan], [0.4, np.nan]])
+
+    cdr_2dim.ffill_grid_element_and_id()
+    assert cdr_2dim.dataset is not ds
+    assert_array_equal(cdr_2dim["element_id"], [[1, 2], [3, 3]])
+
+
+def test_get_data_errors(cdr_2dim):
+    with pytest.raises(KeyError):
+        cdr_2dim.get_data(data_variable="not_a_variable")
+    with pytest.raises(IndexError):
+        cdr_2dim.get_data(item_id=[2], data_variable="item_size")
+    with pytest.raises(IndexError):
+        cdr_2dim.get_data(time=[5.], data_variable="item_size")
+
+
+def test_set_data(cdr_2dim):
+    cdr_2dim.add_record(time=[1.], new_record={"mean_elevation": (["time"], [120.])})
+    cdr_2dim.set_data(time=[1.], item_id=[1], data_variable="item_size", new_value=0.9)
+    cdr_2dim.set_data(item_id=[0], data_variable="item_size", new_value=[[0.1, 0.2]])
+    cdr_2dim.set_data(time=[0.], data_variable="mean_elevation", new_value=100.)
+    assert_array_equal(cdr_2dim["item_size"], [[0.1, 0.2], [0.4, 0.9]])
+    assert_array_equal(cdr_2dim["mean_elevation"], [100., 120.])
+
+    cdr_2dim.set_data(time=[0.], item_id=[1], data_variable="element_id", new_value=2)
+    cdr_2dim.set_data(
+        time=[0.], item_id=[0], data_variable="grid_element", new_value="link"
+    )
+    assert_array_equal(cdr_2dim["element_id"], [[1, np.nan], [2, np.nan]])
+    assert_array_equal(
+        cdr_2dim.get_data(time=[0.], data_variable="grid_element"), ["link", "link"]
+    )
+    assert_array_equal(cdr_2dim["item_size"], [[0.1, 0.2], [0.4, 0.9]])
+
+
+def test_set_data_errors(cdr_2dim):
+    with pytest.raises(KeyError):
+        cdr_2dim.set_data(time=[0.], item_id=[0], data_variable="not_a_variable")
+    with pytest.raises(IndexError):
+        cdr_2dim.set_data(time=[5.], item_id=[0], data_variable="item_size")
+    with pytest.raises(ValueError):
+        cdr_2dim.set_data(
+            time=[0.], item_id=[0], data_variable="element_id", new_value=9
+        )
+    with pytest.raises(ValueError):
+        cdr_2dim.set_data(
+            time=[0.], item_id=[0], data_variable="grid_element", new_value="cell"
+        )
+    assert_array_equal(cdr_2dim["element_id"], [[1], [3]])
+
+
+def test_bad_locations(cdr_2dim):
+    with pytest.raises(ValueError):
+        cdr_2dim.add_item(
+            time=[0.], new_item={"grid_element": "node", "element_id": [[9]]}
+        )
+    with pytest.raises(ValueError):
+        cdr_2dim.add_item(
+            time=[0.], new_item={"grid_element": "cell", "element_id": [[-1]]}
+        )
+    with pytest.raises(ValueError):
+        cdr_2dim.add_item(
+            time=[0.], new_item={"grid_element": "node", "element_id": [[1.5]]}
+        )
+    with pytest.raises(ValueError):
+        cdr_2dim.add_item(
+            time=[0.], new_item={"grid_element": "river", "element_id": [[1]]}
+        )
+    assert cdr_2dim.number_of_items == 2
+
+
+def test_ffill_grid_element_and_id():
+    cdr = ColumnarDataRecord(
+        grid,
+        time=[0.],
+        items={"grid_element": "node", "element_id": np.array([[1], [2]])},
+    )
+    cdr.add_item(time=[1.], new_item={"grid_element": "node", "element_id": [[5]]})
+    cdr.add_record(
+        time=[3.],
+        item_id=[0],
+        new_item_loc={"grid_element": [["link"]], "element_id": [[7]]},
+    )
+    cdr.add_record(time=[4., 6.])
+
+    cdr.ffill_grid_element_and_id()
+
+    assert_array_equal(
+        cdr.get_data(data_variable="element_id"),
+        [
+            [1, 1, 7, 7, 7],
+            [2, 2, 2, 2, 2],
+            [np.nan, 5, 5, 5, 5],
+        ],
+    )
+    assert_array_equal(
+        cdr.get_data(item_id=[0], data_variable="grid_element"),
+        [["node", "node", "link", "link", "link"]],
+    )
+
+
+def test_calc_aggregate_value_over_time():
+    cdr = ColumnarDataRecord(
+        grid,
+        time=[0.],
+        items={"grid_element": "node", "element_id": np.array([[1], [1], [4]])},
+        data_vars={"volume": (["item_id"], [1., 2., 4.])},
+    )
+    cdr.add_record(
+        time=[1.],
+        item_id=[0],
+        new_item_loc={"grid_element": [["node"]], "element_id": [[4]]},
+    )
+
+    assert_array_equal(cdr.calc_aggregate_value(np.sum, "volume")[[1, 4]], [3., 5.])
+
+    filter_array = np.array([[True, True], [False, False], [True, True]])
+    assert_array_equal(
+        cdr.calc_aggregate_value(np.sum, "volume", filter_array=filter_array)[
+            [1, 4]
+        ],
+        [1., 5.],
+    )
+
+
+@pytest.mark.parametrize("n_steps", [1, 17, 100])
+def test_many_records_match_dense_arrays(n_steps):
+    np.random.seed(2018)
+    n_items = 5
+    cdr = ColumnarDataRecord(
+        grid,
+        time=[0.],
+        items={
+            "grid_element": "node",
+            "element_id": np.random.randint(9, size=(n_items, 1)),
+        },
+    )
+    element_id = np.full((n_items, n_steps + 1), -1)
+    element_id[:, 0] = cdr.get_data(time=[0.], data_variable="element_id")
+    size = np.full((n_items, n_steps + 1), np.nan)
+
+    for step in range(1, n_steps + 1):
+        moved = np.where(np.random.random(n_items) > 0.5)[0]
+        new_ids = np.random.randint(9, size=(len(moved), 1))
+        new_size = np.random.random((len(moved), 1))
+        cdr.add_record(
+            time=[float(step)],
+            item_id=moved,
+            new_item_loc={"grid_element": "node", "element_id": new_ids},
+            new_record={"size": (["item_id", "time"], new_size)},
+        )
+        element_id[:, step] = element_id[:, step - 1]
+        element_id[moved, step] = new_ids[:, 0]
+        size[moved, step] = new_size[:, 0]
+
+    cdr.ffill_grid_element_and_id()
+
+    assert_array_equal(cdr.get_data(data_variable="element_id"), element_id)
+    assert_array_equal(cdr.get_data(data_variable="size"), size)
+
+    expected = np.full(grid.number_of_nodes, np.nan)
+    for node in range(grid.number_of_nodes):
+        at_node = (element_id == node) & ~np.isnan(size)
+        if np.any(at_node):
+            expected[node] = np.mean(size[at_node])
+    assert_array_almost_equal(cdr.calc_aggregate_value(np.mean, "size"), expected)
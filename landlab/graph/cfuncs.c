@@ -0,0 +1,12267 @@
+/* Generated by Cython 0.29.37 */
+
+#ifndef PY_SSIZE_T_CLEAN
+#define PY_SSIZE_T_CLEAN
+#endif /* PY_SSIZE_T_CLEAN */
+#include "Python.h"
+#ifndef Py_PYTHON_H
+    #error Python headers needed to compile C extensions, please install development version of Python.
+#elif PY_VERSION_HEX < 0x02060000 || (0x03000000 <= PY_VERSION_HEX && PY_VERSION_HEX < 0x03030000)
+    #error Cython requires Python 2.6+ or Python 3.3+.
+#else
+#define CYTHON_ABI "0_29_37"
+#define CYTHON_HEX_VERSION 0x001D25F0
+#define CYTHON_FUTURE_DIVISION 0
+#include <stddef.h>
+#ifndef offsetof
+  #define offsetof(type, member) ( (size_t) & ((type*)0) -> member )
+#endif
+#if !defined(WIN32) && !defined(MS_WINDOWS)
+  #ifndef __stdcall
+    #define __stdcall
+  #endif
+  #ifndef __cdecl
+    #define __cdecl
+  #endif
+  #ifndef __fastcall
+    #define __fastcall
+  #endif
+#endif
+#ifndef DL_IMPORT
+  #define DL_IMPORT(t) t
+#endif
+#ifndef DL_EXPORT
+  #define DL_EXPORT(t) t
+#endif
+#define __PYX_COMMA ,
+#ifndef HAVE_LONG_LONG
+  #if PY_VERSION_HEX >= 0x02070000
+    #define HAVE_LONG_LONG
+  #endif
+#endif
+#ifndef PY_LONG_LONG
+  #define PY_LONG_LONG LONG_LONG
+#endif
+#ifndef Py_HUGE_VAL
+  #define Py_HUGE_VAL HUGE_VAL
+#endif
+#ifdef PYPY_VERSION
+  #define CYTHON_COMPILING_IN_PYPY 1
+  #define CYTHON_COMPILING_IN_PYSTON 0
+  #define CYTHON_COMPILING_IN_CPYTHON 0
+  #define CYTHON_COMPILING_IN_NOGIL 0
+  #undef CYTHON_USE_TYPE_SLOTS
+  #define CYTHON_USE_TYPE_SLOTS 0
+  #undef CYTHON_USE_PYTYPE_LOOKUP
+  #define CYTHON_USE_PYTYPE_LOOKUP 0
+  #if PY_VERSION_HEX < 0x03050000
+    #undef CYTHON_USE_ASYNC_SLOTS
+    #define CYTHON_USE_ASYNC_SLOTS 0
+  #elif !defined(CYTHON_USE_ASYNC_SLOTS)
+    #define CYTHON_USE_ASYNC_SLOTS 1
+  #endif
+  #undef CYTHON_USE_PYLIST_INTERNALS
+  #define CYTHON_USE_PYLIST_INTERNALS 0
+  #undef CYTHON_USE_UNICODE_INTERNALS
+  #define CYTHON_USE_UNICODE_INTERNALS 0
+  #undef CYTHON_USE_UNICODE_WRITER
+  #define CYTHON_USE_UNICODE_WRITER 0
+  #undef CYTHON_USE_PYLONG_INTERNALS
+  #define CYTHON_USE_PYLONG_INTERNALS 0
+  #undef CYTHON_AVOID_BORROWED_REFS
+  #define CYTHON_AVOID_BORROWED_REFS 1
+  #undef CYTHON_ASSUME_SAFE_MACROS
+  #define CYTHON_ASSUME_SAFE_MACROS 0
+  #undef CYTHON_UNPACK_METHODS
+  #define CYTHON_UNPACK_METHODS 0
+  #undef CYTHON_FAST_THREAD_STATE
+  #define CYTHON_FAST_THREAD_STATE 0
+  #undef CYTHON_FAST_PYCALL
+  #define CYTHON_FAST_PYCALL 0
+  #if PY_VERSION_HEX < 0x03090000
+    #undef CYTHON_PEP489_MULTI_PHASE_INIT
+    #define CYTHON_PEP489_MULTI_PHASE_INIT 0
+  #elif !defined(CYTHON_PEP489_MULTI_PHASE_INIT)
+    #define CYTHON_PEP489_MULTI_PHASE_INIT 1
+  #endif
+  #undef CYTHON_USE_TP_FINALIZE
+  #define CYTHON_USE_TP_FINALIZE (PY_VERSION_HEX >= 0x030400a1 && PYPY_VERSION_NUM >= 0x07030C00)
+  #undef CYTHON_USE_DICT_VERSIONS
+  #define CYTHON_USE_DICT_VERSIONS 0
+  #undef CYTHON_USE_EXC_INFO_STACK
+  #define CYTHON_USE_EXC_INFO_STACK 0
+  #ifndef CYTHON_UPDATE_DESCRIPTOR_DOC
+    #define CYTHON_UPDATE_DESCRIPTOR_DOC 0
+  #endif
+#elif defined(PYSTON_VERSION)
+  #define CYTHON_COMPILING_IN_PYPY 0
+  #define CYTHON_COMPILING_IN_PYSTON 1
+  #define CYTHON_COMPILING_IN_CPYTHON 0
+  #define CYTHON_COMPILING_IN_NOGIL 0
+  #ifndef CYTHON_USE_TYPE_SLOTS
+    #define CYTHON_USE_TYPE_SLOTS 1
+  #endif
+  #undef CYTHON_USE_PYTYPE_LOOKUP
+  #define CYTHON_USE_PYTYPE_LOOKUP 0
+  #undef CYTHON_USE_ASYNC_SLOTS
+  #define CYTHON_USE_ASYNC_SLOTS 0
+  #undef CYTHON_USE_PYLIST_INTERNALS
+  #define CYTHON_USE_PYLIST_INTERNALS 0
+  #ifndef CYTHON_USE_UNICODE_INTERNALS
+    #define CYTHON_USE_UNICODE_INTERNALS 1
+  #endif
+  #undef CYTHON_USE_UNICODE_WRITER
+  #define CYTHON_USE_UNICODE_WRITER 0
+  #undef CYTHON_USE_PYLONG_INTERNALS
+  #define CYTHON_USE_PYLONG_INTERNALS 0
+  #ifndef CYTHON_AVOID_BORROWED_REFS
+    #define CYTHON_AVOID_BORROWED_REFS 0
+  #endif
+  #ifndef CYTHON_ASSUME_SAFE_MACROS
+    #define CYTHON_ASSUME_SAFE_MACROS 1
+  #endif
+  #ifndef CYTHON_UNPACK_METHODS
+    #define CYTHON_UNPACK_METHODS 1
+  #endif
+  #undef CYTHON_FAST_THREAD_STATE
+  #define CYTHON_FAST_THREAD_STATE 0
+  #undef CYTHON_FAST_PYCALL
+  #define CYTHON_FAST_PYCALL 0
+  #undef CYTHON_PEP489_MULTI_PHASE_INIT
+  #define CYTHON_PEP489_MULTI_PHASE_INIT 0
+  #undef CYTHON_USE_TP_FINALIZE
+  #define CYTHON_USE_TP_FINALIZE 0
+  #undef CYTHON_USE_DICT_VERSIONS
+  #define CYTHON_USE_DICT_VERSIONS 0
+  #undef CYTHON_USE_EXC_INFO_STACK
+  #define CYTHON_USE_EXC_INFO_STACK 0
+  #ifndef CYTHON_UPDATE_DESCRIPTOR_DOC
+    #define CYTHON_UPDATE_DESCRIPTOR_DOC 0
+  #endif
+#elif defined(PY_NOGIL)
+  #define CYTHON_COMPILING_IN_PYPY 0
+  #define CYTHON_COMPILING_IN_PYSTON 0
+  #define CYTHON_COMPILING_IN_CPYTHON 0
+  #define CYTHON_COMPILING_IN_NOGIL 1
+  #ifndef CYTHON_USE_TYPE_SLOTS
+    #define CYTHON_USE_TYPE_SLOTS 1
+  #endif
+  #undef CYTHON_USE_PYTYPE_LOOKUP
+  #define CYTHON_USE_PYTYPE_LOOKUP 0
+  #ifndef CYTHON_USE_ASYNC_SLOTS
+    #define CYTHON_USE_ASYNC_SLOTS 1
+  #endif
+  #undef CYTHON_USE_PYLIST_INTERNALS
+  #define CYTHON_USE_PYLIST_INTERNALS 0
+  #ifndef CYTHON_USE_UNICODE_INTERNALS
+    #define CYTHON_USE_UNICODE_INTERNALS 1
+  #endif
+  #undef CYTHON_USE_UNICODE_WRITER
+  #define CYTHON_USE_UNICODE_WRITER 0
+  #undef CYTHON_USE_PYLONG_INTERNALS
+  #define CYTHON_USE_PYLONG_INTERNALS 0
+  #ifndef CYTHON_AVOID_BORROWED_REFS
+    #define CYTHON_AVOID_BORROWED_REFS 0
+  #endif
+  #ifndef CYTHON_ASSUME_SAFE_MACROS
+    #define CYTHON_ASSUME_SAFE_MACROS 1
+  #endif
+  #ifndef CYTHON_UNPACK_METHODS
+    #define CYTHON_UNPACK_METHODS 1
+  #endif
+  #undef CYTHON_FAST_THREAD_STATE
+  #define CYTHON_FAST_THREAD_STATE 0
+  #undef CYTHON_FAST_PYCALL
+  #define CYTHON_FAST_PYCALL 0
+  #ifndef CYTHON_PEP489_MULTI_PHASE_INIT
+    #define CYTHON_PEP489_MULTI_PHASE_INIT 1
+  #endif
+  #ifndef CYTHON_USE_TP_FINALIZE
+    #define CYTHON_USE_TP_FINALIZE 1
+  #endif
+  #undef CYTHON_USE_DICT_VERSIONS
+  #define CYTHON_USE_DICT_VERSIONS 0
+  #undef CYTHON_USE_EXC_INFO_STACK
+  #define CYTHON_USE_EXC_INFO_STACK 0
+#else
+  #define CYTHON_COMPILING_IN_PYPY 0
+  #define CYTHON_COMPILING_IN_PYSTON 0
+  #define CYTHON_COMPILING_IN_CPYTHON 1
+  #define CYTHON_COMPILING_IN_NOGIL 0
+  #ifndef CYTHON_USE_TYPE_SLOTS
+    #define CYTHON_USE_TYPE_SLOTS 1
+  #endif
+  #if PY_VERSION_HEX < 0x02070000
+    #undef CYTHON_USE_PYTYPE_LOOKUP
+    #define CYTHON_USE_PYTYPE_LOOKUP 0
+  #elif !defined(CYTHON_USE_PYTYPE_LOOKUP)
+    #define CYTHON_USE_PYTYPE_LOOKUP 1
+  #endif
+  #if PY_MAJOR_VERSION < 3
+    #undef CYTHON_USE_ASYNC_SLOTS
+    #define CYTHON_USE_ASYNC_SLOTS 0
+  #elif !defined(CYTHON_USE_ASYNC_SLOTS)
+    #define CYTHON_USE_ASYNC_SLOTS 1
+  #endif
+  #if PY_VERSION_HEX < 0x02070000
+    #undef CYTHON_USE_PYLONG_INTERNALS
+    #define CYTHON_USE_PYLONG_INTERNALS 0
+  #elif !defined(CYTHON_USE_PYLONG_INTERNALS)
+    #define CYTHON_USE_PYLONG_INTERNALS (PY_VERSION_HEX < 0x030C00A5)
+  #endif
+  #ifndef CYTHON_USE_PYLIST_INTERNALS
+    #define CYTHON_USE_PYLIST_INTERNALS 1
+  #endif
+  #ifndef CYTHON_USE_UNICODE_INTERNALS
+    #define CYTHON_USE_UNICODE_INTERNALS 1
+  #endif
+  #if PY_VERSION_HEX < 0x030300F0 || PY_VERSION_HEX >= 0x030B00A2
+    #undef CYTHON_USE_UNICODE_WRITER
+    #define CYTHON_USE_UNICODE_WRITER 0
+  #elif !defined(CYTHON_USE_UNICODE_WRITER)
+    #define CYTHON_USE_UNICODE_WRITER 1
+  #endif
+  #ifndef CYTHON_AVOID_BORROWED_REFS
+    #define CYTHON_AVOID_BORROWED_REFS 0
+  #endif
+  #ifndef CYTHON_ASSUME_SAFE_MACROS
+    #define CYTHON_ASSUME_SAFE_MACROS 1
+  #endif
+  #ifndef CYTHON_UNPACK_METHODS
+    #define CYTHON_UNPACK_METHODS 1
+  #endif
+  #if PY_VERSION_HEX >= 0x030B00A4
+    #undef CYTHON_FAST_THREAD_STATE
+    #define CYTHON_FAST_THREAD_STATE 0
+  #elif !defined(CYTHON_FAST_THREAD_STATE)
+    #define CYTHON_FAST_THREAD_STATE 1
+  #endif
+  #ifndef CYTHON_FAST_PYCALL
+    #define CYTHON_FAST_PYCALL (PY_VERSION_HEX < 0x030A0000)
+  #endif
+  #ifndef CYTHON_PEP489_MULTI_PHASE_INIT
+    #define CYTHON_PEP489_MULTI_PHASE_INIT (PY_VERSION_HEX >= 0x03050000)
+  #endif
+  #ifndef CYTHON_USE_TP_FINALIZE
+    #define CYTHON_USE_TP_FINALIZE (PY_VERSION_HEX >= 0x030400a1)
+  #endif
+  #ifndef CYTHON_USE_DICT_VERSIONS
+    #define CYTHON_USE_DICT_VERSIONS ((PY_VERSION_HEX >= 0x030600B1) && (PY_VERSION_HEX < 0x030C00A5))
+  #endif
+  #if PY_VERSION_HEX >= 0x030B00A4
+    #undef CYTHON_USE_EXC_INFO_STACK
+    #define CYTHON_USE_EXC_INFO_STACK 0
+  #elif !defined(CYTHON_USE_EXC_INFO_STACK)
+    #define CYTHON_USE_EXC_INFO_STACK (PY_VERSION_HEX >= 0x030700A3)
+  #endif
+  #ifndef CYTHON_UPDATE_DESCRIPTOR_DOC
+    #define CYTHON_UPDATE_DESCRIPTOR_DOC 1
+  #endif
+#endif
+#if !defined(CYTHON_FAST_PYCCALL)
+#define CYTHON_FAST_PYCCALL  (CYTHON_FAST_PYCALL && PY_VERSION_HEX >= 0x030600B1)
+#endif
+#if CYTHON_USE_PYLONG_INTERNALS
+  #if PY_MAJOR_VERSION < 3
+    #include "longintrepr.h"
+  #endif
+  #undef SHIFT
+  #undef BASE
+  #undef MASK
+  #ifdef SIZEOF_VOID_P
+    enum { __pyx_check_sizeof_voidp = 1 / (int)(SIZEOF_VOID_P == sizeof(void*)) };
+  #endif
+#endif
+#ifndef __has_attribute
+  #define __has_attribute(x) 0
+#endif
+#ifndef __has_cpp_attribute
+  #define __has_cpp_attribute(x) 0
+#endif
+#ifndef CYTHON_RESTRICT
+  #if defined(__GNUC__)
+    #define CYTHON_RESTRICT __restrict__
+  #elif defined(_MSC_VER) && _MSC_VER >= 1400
+    #define CYTHON_RESTRICT __restrict
+  #elif defined (__STDC_VERSION__) && __STDC_VERSION__ >= 199901L
+    #define CYTHON_RESTRICT restrict
+  #else
+    #define CYTHON_RESTRICT
+  #endif
+#endif
+#ifndef CYTHON_UNUSED
+# if defined(__GNUC__)
+#   if !(defined(__cplusplus)) || (__GNUC__ > 3 || (__GNUC__ == 3 && __GNUC_MINOR__ >= 4))
+#     define CYTHON_UNUSED __attribute__ ((__unused__))
+#   else
+#     define CYTHON_UNUSED
+#   endif
+# elif defined(__ICC) || (defined(__INTEL_COMPILER) && !defined(_MSC_VER))
+#   define CYTHON_UNUSED __attribute__ ((__unused__))
+# else
+#   define CYTHON_UNUSED
+# endif
+#endif
+#ifndef CYTHON_MAYBE_UNUSED_VAR
+#  if defined(__cplusplus)
+     template<class T> void CYTHON_MAYBE_UNUSED_VAR( const T& ) { }
+#  else
+#    define CYTHON_MAYBE_UNUSED_VAR(x) (void)(x)
+#  endif
+#endif
+#ifndef CYTHON_NCP_UNUSED
+# if CYTHON_COMPILING_IN_CPYTHON
+#  define CYTHON_NCP_UNUSED
+# else
+#  define CYTHON_NCP_UNUSED CYTHON_UNUSED
+# endif
+#endif
+#define __Pyx_void_to_None(void_result) ((void)(void_result), Py_INCREF(Py_None), Py_None)
+#ifdef _MSC_VER
+    #ifndef _MSC_STDINT_H_
+        #if _MSC_VER < 1300
+           typedef unsigned char     uint8_t;
+           typedef unsigned int      uint32_t;
+        #else
+           typedef unsigned __int8   uint8_t;
+           typedef unsigned __int32  uint32_t;
+        #endif
+    #endif
+#else
+   #include <stdint.h>
+#endif
+#ifndef CYTHON_FALLTHROUGH
+  #if defined(__cplusplus) && __cplusplus >= 201103L
+    #if __has_cpp_attribute(fallthrough)
+      #define CYTHON_FALLTHROUGH [[fallthrough]]
+    #elif __has_cpp_attribute(clang::fallthrough)
+      #define CYTHON_FALLTHROUGH [[clang::fallthrough]]
+    #elif __has_cpp_attribute(gnu::fallthrough)
+      #define CYTHON_FALLTHROUGH [[gnu::fallthrough]]
+    #endif
+  #endif
+  #ifndef CYTHON_FALLTHROUGH
+    #if __has_attribute(fallthrough)
+      #define CYTHON_FALLTHROUGH __attribute__((fallthrough))
+    #else
+      #define CYTHON_FALLTHROUGH
+    #endif
+  #endif
+  #if defined(__clang__ ) && defined(__apple_build_version__)
+    #if __apple_build_version__ < 7000000
+      #undef  CYTHON_FALLTHROUGH
+      #define CYTHON_FALLTHROUGH
+    #endif
+  #endif
+#endif
+
+#ifndef CYTHON_INLINE
+  #if defined(__clang__)
+    #define CYTHON_INLINE __inline__ __attribute__ ((__unused__))
+  #elif defined(__GNUC__)
+    #define CYTHON_INLINE __inline__
+  #elif defined(_MSC_VER)
+    #define CYTHON_INLINE __inline
+  #elif defined (__STDC_VERSION__) && __STDC_VERSION__ >= 199901L
+    #define CYTHON_INLINE inline
+  #else
+    #define CYTHON_INLINE
+  #endif
+#endif
+
+#define __PYX_BUILD_PY_SSIZE_T "n"
+#define CYTHON_FORMAT_SSIZE_T "z"
+#if PY_MAJOR_VERSION < 3
+  #define __Pyx_BUILTIN_MODULE_NAME "__builtin__"
+  #define __Pyx_PyCode_New(a, k, l, s, f, code, c, n, v, fv, cell, fn, name, fline, lnos)\
+          PyCode_New(a+k, l, s, f, code, c, n, v, fv, cell, fn, name, fline, lnos)
+  #define __Pyx_DefaultClassType PyClass_Type
+#else
+  #define __Pyx_BUILTIN_MODULE_NAME "builtins"
+  #define __Pyx_DefaultClassType PyType_Type
+#if PY_VERSION_HEX >= 0x030B00A1
+    static CYTHON_INLINE PyCodeObject* __Pyx_PyCode_New(int a, int k, int l, int s, int f,
+                                                    PyObject *code, PyObject *c, PyObject* n, PyObject *v,
+                                                    PyObject *fv, PyObject *cell, PyObject* fn,
+                                                    PyObject *name, int fline, PyObject *lnos) {
+        PyObject *kwds=NULL, *argcount=NULL, *posonlyargcount=NULL, *kwonlyargcount=NULL;
+        PyObject *nlocals=NULL, *stacksize=NULL, *flags=NULL, *replace=NULL, *call_result=NULL, *empty=NULL;
+        const char *fn_cstr=NULL;
+        const char *name_cstr=NULL;
+        PyCodeObject* co=NULL;
+        PyObject *type, *value, *traceback;
+        PyErr_Fetch(&type, &value, &traceback);
+        if (!(kwds=PyDict_New())) goto end;
+        if (!(argcount=PyLong_FromLong(a))) goto end;
+        if (PyDict_SetItemString(kwds, "co_argcount", argcount) != 0) goto end;
+        if (!(posonlyargcount=PyLong_FromLong(0))) goto end;
+        if (PyDict_SetItemString(kwds, "co_posonlyargcount", posonlyargcount) != 0) goto end;
+        if (!(kwonlyargcount=PyLong_FromLong(k))) goto end;
+        if (PyDict_SetItemString(kwds, "co_kwonlyargcount", kwonlyargcount) != 0) goto end;
+        if (!(nlocals=PyLong_FromLong(l))) goto end;
+        if (PyDict_SetItemString(kwds, "co_nlocals", nlocals) != 0) goto end;
+        if (!(stacksize=PyLong_FromLong(s))) goto end;
+        if (PyDict_SetItemString(kwds, "co_stacksize", stacksize) != 0) goto end;
+        if (!(flags=PyLong_FromLong(f))) goto end;
+        if (PyDict_SetItemString(kwds, "co_flags", flags) != 0) goto end;
+        if (PyDict_SetItemString(kwds, "co_code", code) != 0) goto end;
+        if (PyDict_SetItemString(kwds, "co_consts", c) != 0) goto end;
+        if (PyDict_SetItemString(kwds, "co_names", n) != 0) goto end;
+        if (PyDict_SetItemString(kwds, "co_varnames", v) != 0) goto end;
+        if (PyDict_SetItemString(kwds, "co_freevars", fv) != 0) goto end;
+        if (PyDict_SetItemString(kwds, "co_cellvars", cell) != 0) goto end;
+        if (PyDict_SetItemString(kwds, "co_linetable", lnos) != 0) goto end;
+        if (!(fn_cstr=PyUnicode_AsUTF8AndSize(fn, NULL))) goto end;
+        if (!(name_cstr=PyUnicode_AsUTF8AndSize(name, NULL))) goto end;
+        if (!(co = PyCode_NewEmpty(fn_cstr, name_cstr, fline))) goto end;
+        if (!(replace = PyObject_GetAttrString((PyObject*)co, "replace"))) goto cleanup_code_too;
+        if (!(empty = PyTuple_New(0))) goto cleanup_code_too; // unfortunately __pyx_empty_tuple isn't available here
+        if (!(call_result = PyObject_Call(replace, empty, kwds))) goto cleanup_code_too;
+        Py_XDECREF((PyObject*)co);
+        co = (PyCodeObject*)call_result;
+        call_result = NULL;
+        if (0) {
+            cleanup_code_too:
+            Py_XDECREF((PyObject*)co);
+            co = NULL;
+        }
+        end:
+        Py_XDECREF(kwds);
+        Py_XDECREF(argcount);
+        Py_XDECREF(posonlyargcount);
+        Py_XDECREF(kwonlyargcount);
+        Py_XDECREF(nlocals);
+        Py_XDECREF(stacksize);
+        Py_XDECREF(replace);
+        Py_XDECREF(call_result);
+        Py_XDECREF(empty);
+        if (type) {
+            PyErr_Restore(type, value, traceback);
+        }
+        return co;
+    }
+#else
+  #define __Pyx_PyCode_New(a, k, l, s, f, code, c, n, v, fv, cell, fn, name, fline, lnos)\
+          PyCode_New(a, k, l, s, f, code, c, n, v, fv, cell, fn, name, fline, lnos)
+#endif
+  #define __Pyx_DefaultClassType PyType_Type
+#endif
+#if PY_VERSION_HEX >= 0x030900F0 && !CYTHON_COMPILING_IN_PYPY
+  #define __Pyx_PyObject_GC_IsFinalized(o) PyObject_GC_IsFinalized(o)
+#else
+  #define __Pyx_PyObject_GC_IsFinalized(o) _PyGC_FINALIZED(o)
+#endif
+#ifndef Py_TPFLAGS_CHECKTYPES
+  #define Py_TPFLAGS_CHECKTYPES 0
+#endif
+#ifndef Py_TPFLAGS_HAVE_INDEX
+  #define Py_TPFLAGS_HAVE_INDEX 0
+#endif
+#ifndef Py_TPFLAGS_HAVE_NEWBUFFER
+  #define Py_TPFLAGS_HAVE_NEWBUFFER 0
+#endif
+#ifndef Py_TPFLAGS_HAVE_FINALIZE
+  #define Py_TPFLAGS_HAVE_FINALIZE 0
+#endif
+#ifndef METH_STACKLESS
+  #define METH_STACKLESS 0
+#endif
+#if PY_VERSION_HEX <= 0x030700A3 || !defined(METH_FASTCALL)
+  #ifndef METH_FASTCALL
+     #define METH_FASTCALL 0x80
+  #endif
+  typedef PyObject *(*__Pyx_PyCFunctionFast) (PyObject *self, PyObject *const *args, Py_ssize_t nargs);
+  typedef PyObject *(*__Pyx_PyCFunctionFastWithKeywords) (PyObject *self, PyObject *const *args,
+                                                          Py_ssize_t nargs, PyObject *kwnames);
+#else
+  #define __Pyx_PyCFunctionFast _PyCFunctionFast
+  #define __Pyx_PyCFunctionFastWithKeywords _PyCFunctionFastWithKeywords
+#endif
+#if CYTHON_FAST_PYCCALL
+#define __Pyx_PyFastCFunction_Check(func)\
+    ((PyCFunction_Check(func) && (METH_FASTCALL == (PyCFunction_GET_FLAGS(func) & ~(METH_CLASS | METH_STATIC | METH_COEXIST | METH_KEYWORDS | METH_STACKLESS)))))
+#else
+#define __Pyx_PyFastCFunction_Check(func) 0
+#endif
+#if CYTHON_COMPILING_IN_PYPY && !defined(PyObject_Malloc)
+  #define PyObject_Malloc(s)   PyMem_Malloc(s)
+  #define PyObject_Free(p)     PyMem_Free(p)
+  #define PyObject_Realloc(p)  PyMem_Realloc(p)
+#endif
+#if CYTHON_COMPILING_IN_CPYTHON && PY_VERSION_HEX < 0x030400A1
+  #define PyMem_RawMalloc(n)           PyMem_Malloc(n)
+  #define PyMem_RawRealloc(p, n)       PyMem_Realloc(p, n)
+  #define PyMem_RawFree(p)             PyMem_Free(p)
+#endif
+#if CYTHON_COMPILING_IN_PYSTON
+  #define __Pyx_PyCode_HasFreeVars(co)  PyCode_HasFreeVars(co)
+  #define __Pyx_PyFrame_SetLineNumber(frame, lineno) PyFrame_SetLineNumber(frame, lineno)
+#else
+  #define __Pyx_PyCode_HasFreeVars(co)  (PyCode_GetNumFree(co) > 0)
+  #define __Pyx_PyFrame_SetLineNumber(frame, lineno)  (frame)->f_lineno = (lineno)
+#endif
+#if !CYTHON_FAST_THREAD_STATE || PY_VERSION_HEX < 0x02070000
+  #define __Pyx_PyThreadState_Current PyThreadState_GET()
+#elif PY_VERSION_HEX >= 0x03060000
+  #define __Pyx_PyThreadState_Current _PyThreadState_UncheckedGet()
+#elif PY_VERSION_HEX >= 0x03000000
+  #define __Pyx_PyThreadState_Current PyThreadState_GET()
+#else
+  #define __Pyx_PyThreadState_Current _PyThreadState_Current
+#endif
+#if PY_VERSION_HEX < 0x030700A2 && !defined(PyThread_tss_create) && !defined(Py_tss_NEEDS_INIT)
+#include "pythread.h"
+#define Py_tss_NEEDS_INIT 0
+typedef int Py_tss_t;
+static CYTHON_INLINE int PyThread_tss_create(Py_tss_t *key) {
+  *key = PyThread_create_key();
+  return 0;
+}
+static CYTHON_INLINE Py_tss_t * PyThread_tss_alloc(void) {
+  Py_tss_t *key = (Py_tss_t *)PyObject_Malloc(sizeof(Py_tss_t));
+  *key = Py_tss_NEEDS_INIT;
+  return key;
+}
+static CYTHON_INLINE void PyThread_tss_free(Py_tss_t *key) {
+  PyObject_Free(key);
+}
+static CYTHON_INLINE int PyThread_tss_is_created(Py_tss_t *key) {
+  return *key != Py_tss_NEEDS_INIT;
+}
+static CYTHON_INLINE void PyThread_tss_delete(Py_tss_t *key) {
+  PyThread_delete_key(*key);
+  *key = Py_tss_NEEDS_INIT;
+}
+static CYTHON_INLINE int PyThread_tss_set(Py_tss_t *key, void *value) {
+  return PyThread_set_key_value(*key, value);
+}
+static CYTHON_INLINE void * PyThread_tss_get(Py_tss_t *key) {
+  return PyThread_get_key_value(*key);
+}
+#endif
+#if CYTHON_COMPILING_IN_CPYTHON || defined(_PyDict_NewPresized)
+#define __Pyx_PyDict_NewPresized(n)  ((n <= 8) ? PyDict_New() : _PyDict_NewPresized(n))
+#else
+#define __Pyx_PyDict_NewPresized(n)  PyDict_New()
+#endif
+#if PY_MAJOR_VERSION >= 3 || CYTHON_FUTURE_DIVISION
+  #define __Pyx_PyNumber_Divide(x,y)         PyNumber_TrueDivide(x,y)
+  #define __Pyx_PyNumber_InPlaceDivide(x,y)  PyNumber_InPlaceTrueDivide(x,y)
+#else
+  #define __Pyx_PyNumber_Divide(x,y)         PyNumber_Divide(x,y)
+  #define __Pyx_PyNumber_InPlaceDivide(x,y)  PyNumber_InPlaceDivide(x,y)
+#endif
+#if CYTHON_COMPILING_IN_CPYTHON && PY_VERSION_HEX >= 0x030500A1 && CYTHON_USE_UNICODE_INTERNALS
+#define __Pyx_PyDict_GetItemStr(dict, name)  _PyDict_GetItem_KnownHash(dict, name, ((PyASCIIObject *) name)->hash)
+#else
+#define __Pyx_PyDict_GetItemStr(dict, name)  PyDict_GetItem(dict, name)
+#endif
+#if PY_VERSION_HEX > 0x03030000 && defined(PyUnicode_KIND)
+  #define CYTHON_PEP393_ENABLED 1
+  #if PY_VERSION_HEX >= 0x030C0000
+    #define __Pyx_PyUnicode_READY(op)       (0)
+  #else
+    #define __Pyx_PyUnicode_READY(op)       (likely(PyUnicode_IS_READY(op)) ?\
+                                                0 : _PyUnicode_Ready((PyObject *)(op)))
+  #endif
+  #define __Pyx_PyUnicode_GET_LENGTH(u)   PyUnicode_GET_LENGTH(u)
+  #define __Pyx_PyUnicode_READ_CHAR(u, i) PyUnicode_READ_CHAR(u, i)
+  #define __Pyx_PyUnicode_MAX_CHAR_VALUE(u)   PyUnicode_MAX_CHAR_VALUE(u)
+  #define __Pyx_PyUnicode_KIND(u)         PyUnicode_KIND(u)
+  #define __Pyx_PyUnicode_DATA(u)         PyUnicode_DATA(u)
+  #define __Pyx_PyUnicode_READ(k, d, i)   PyUnicode_READ(k, d, i)
+  #define __Pyx_PyUnicode_WRITE(k, d, i, ch)  PyUnicode_WRITE(k, d, i, ch)
+  #if PY_VERSION_HEX >= 0x030C0000
+    #define __Pyx_PyUnicode_IS_TRUE(u)      (0 != PyUnicode_GET_LENGTH(u))
+  #else
+    #if CYTHON_COMPILING_IN_CPYTHON && PY_VERSION_HEX >= 0x03090000
+    #define __Pyx_PyUnicode_IS_TRUE(u)      (0 != (likely(PyUnicode_IS_READY(u)) ? PyUnicode_GET_LENGTH(u) : ((PyCompactUnicodeObject *)(u))->wstr_length))
+    #else
+    #define __Pyx_PyUnicode_IS_TRUE(u)      (0 != (likely(PyUnicode_IS_READY(u)) ? PyUnicode_GET_LENGTH(u) : PyUnicode_GET_SIZE(u)))
+    #endif
+  #endif
+#else
+  #define CYTHON_PEP393_ENABLED 0
+  #define PyUnicode_1BYTE_KIND  1
+  #define PyUnicode_2BYTE_KIND  2
+  #define PyUnicode_4BYTE_KIND  4
+  #define __Pyx_PyUnicode_READY(op)       (0)
+  #define __Pyx_PyUnicode_GET_LENGTH(u)   PyUnicode_GET_SIZE(u)
+  #define __Pyx_PyUnicode_READ_CHAR(u, i) ((Py_UCS4)(PyUnicode_AS_UNICODE(u)[i]))
+  #define __Pyx_PyUnicode_MAX_CHAR_VALUE(u)   ((sizeof(Py_UNICODE) == 2) ? 65535 : 1114111)
+  #define __Pyx_PyUnicode_KIND(u)         (sizeof(Py_UNICODE))
+  #define __Pyx_PyUnicode_DATA(u)         ((void*)PyUnicode_AS_UNICODE(u))
+  #define __Pyx_PyUnicode_READ(k, d, i)   ((void)(k), (Py_UCS4)(((Py_UNICODE*)d)[i]))
+  #define __Pyx_PyUnicode_WRITE(k, d, i, ch)  (((void)(k)), ((Py_UNICODE*)d)[i] = ch)
+  #define __Pyx_PyUnicode_IS_TRUE(u)      (0 != PyUnicode_GET_SIZE(u))
+#endif
+#if CYTHON_COMPILING_IN_PYPY
+  #define __Pyx_PyUnicode_Concat(a, b)      PyNumber_Add(a, b)
+  #define __Pyx_PyUnicode_ConcatSafe(a, b)  PyNumber_Add(a, b)
+#else
+  #define __Pyx_PyUnicode_Concat(a, b)      PyUnicode_Concat(a, b)
+  #define __Pyx_PyUnicode_ConcatSafe(a, b)  ((unlikely((a) == Py_None) || unlikely((b) == Py_None)) ?\
+      PyNumber_Add(a, b) : __Pyx_PyUnicode_Concat(a, b))
+#endif
+#if CYTHON_COMPILING_IN_PYPY && !defined(PyUnicode_Contains)
+  #define PyUnicode_Contains(u, s)  PySequence_Contains(u, s)
+#endif
+#if CYTHON_COMPILING_IN_PYPY && !defined(PyByteArray_Check)
+  #define PyByteArray_Check(obj)  PyObject_TypeCheck(obj, &PyByteArray_Type)
+#endif
+#if CYTHON_COMPILING_IN_PYPY && !defined(PyObject_Format)
+  #define PyObject_Format(obj, fmt)  PyObject_CallMethod(obj, "__format__", "O", fmt)
+#endif
+#define __Pyx_PyString_FormatSafe(a, b)   ((unlikely((a) == Py_None || (PyString_Check(b) && !PyString_CheckExact(b)))) ? PyNumber_Remainder(a, b) : __Pyx_PyString_Format(a, b))
+#define __Pyx_PyUnicode_FormatSafe(a, b)  ((unlikely((a) == Py_None || (PyUnicode_Check(b) && !PyUnicode_CheckExact(b)))) ? PyNumber_Remainder(a, b) : PyUnicode_Format(a, b))
+#if PY_MAJOR_VERSION >= 3
+  #define __Pyx_PyString_Format(a, b)  PyUnicode_Format(a, b)
+#else
+  #define __Pyx_PyString_Format(a, b)  PyString_Format(a, b)
+#endif
+#if PY_MAJOR_VERSION < 3 && !defined(PyObject_ASCII)
+  #define PyObject_ASCII(o)            PyObject_Repr(o)
+#endif
+#if PY_MAJOR_VERSION >= 3
+  #define PyBaseString_Type            PyUnicode_Type
+  #define PyStringObject               PyUnicodeObject
+  #define PyString_Type                PyUnicode_Type
+  #define PyString_Check               PyUnicode_Check
+  #define PyString_CheckExact          PyUnicode_CheckExact
+#ifndef PyObject_Unicode
+  #define PyObject_Unicode             PyObject_Str
+#endif
+#endif
+#if PY_MAJOR_VERSION >= 3
+  #define __Pyx_PyBaseString_Check(obj) PyUnicode_Check(obj)
+  #define __Pyx_PyBaseString_CheckExact(obj) PyUnicode_CheckExact(obj)
+#else
+  #define __Pyx_PyBaseString_Check(obj) (PyString_Check(obj) || PyUnicode_Check(obj))
+  #define __Pyx_PyBaseString_CheckExact(obj) (PyString_CheckExact(obj) || PyUnicode_CheckExact(obj))
+#endif
+#ifndef PySet_CheckExact
+  #define PySet_CheckExact(obj)        (Py_TYPE(obj) == &PySet_Type)
+#endif
+#if PY_VERSION_HEX >= 0x030900A4
+  #define __Pyx_SET_REFCNT(obj, refcnt) Py_SET_REFCNT(obj, refcnt)
+  #define __Pyx_SET_SIZE(obj, size) Py_SET_SIZE(obj, size)
+#else
+  #define __Pyx_SET_REFCNT(obj, refcnt) Py_REFCNT(obj) = (refcnt)
+  #define __Pyx_SET_SIZE(obj, size) Py_SIZE(obj) = (size)
+#endif
+#if CYTHON_ASSUME_SAFE_MACROS
+  #define __Pyx_PySequence_SIZE(seq)  Py_SIZE(seq)
+#else
+  #define __Pyx_PySequence_SIZE(seq)  PySequence_Size(seq)
+#endif
+#if PY_MAJOR_VERSION >= 3
+  #define PyIntObject                  PyLongObject
+  #define PyInt_Type                   PyLong_Type
+  #define PyInt_Check(op)              PyLong_Check(op)
+  #define PyInt_CheckExact(op)         PyLong_CheckExact(op)
+  #define PyInt_FromString             PyLong_FromString
+  #define PyInt_FromUnicode            PyLong_FromUnicode
+  #define PyInt_FromLong               PyLong_FromLong
+  #define PyInt_FromSize_t             PyLong_FromSize_t
+  #define PyInt_FromSsize_t            PyLong_FromSsize_t
+  #define PyInt_AsLong                 PyLong_AsLong
+  #define PyInt_AS_LONG                PyLong_AS_LONG
+  #define PyInt_AsSsize_t              PyLong_AsSsize_t
+  #define PyInt_AsUnsignedLongMask     PyLong_AsUnsignedLongMask
+  #define PyInt_AsUnsignedLongLongMask PyLong_AsUnsignedLongLongMask
+  #define PyNumber_Int                 PyNumber_Long
+#endif
+#if PY_MAJOR_VERSION >= 3
+  #define PyBoolObject                 PyLongObject
+#endif
+#if PY_MAJOR_VERSION >= 3 && CYTHON_COMPILING_IN_PYPY
+  #ifndef PyUnicode_InternFromString
+    #define PyUnicode_InternFromString(s) PyUnicode_FromString(s)
+  #endif
+#endif
+#if PY_VERSION_HEX < 0x030200A4
+  typedef long Py_hash_t;
+  #define __Pyx_PyInt_FromHash_t PyInt_FromLong
+  #define __Pyx_PyInt_AsHash_t   __Pyx_PyIndex_AsHash_t
+#else
+  #define __Pyx_PyInt_FromHash_t PyInt_FromSsize_t
+  #define __Pyx_PyInt_AsHash_t   __Pyx_PyIndex_AsSsize_t
+#endif
+#if PY_MAJOR_VERSION >= 3
+  #define __Pyx_PyMethod_New(func, self, klass) ((self) ? ((void)(klass), PyMethod_New(func, self)) : __Pyx_NewRef(func))
+#else
+  #define __Pyx_PyMethod_New(func, self, klass) PyMethod_New(func, self, klass)
+#endif
+#if CYTHON_USE_ASYNC_SLOTS
+  #if PY_VERSION_HEX >= 0x030500B1
+    #define __Pyx_PyAsyncMethodsStruct PyAsyncMethods
+    #define __Pyx_PyType_AsAsync(obj) (Py_TYPE(obj)->tp_as_async)
+  #else
+    #define __Pyx_PyType_AsAsync(obj) ((__Pyx_PyAsyncMethodsStruct*) (Py_TYPE(obj)->tp_reserved))
+  #endif
+#else
+  #define __Pyx_PyType_AsAsync(obj) NULL
+#endif
+#ifndef __Pyx_PyAsyncMethodsStruct
+    typedef struct {
+        unaryfunc am_await;
+        unaryfunc am_aiter;
+        unaryfunc am_anext;
+    } __Pyx_PyAsyncMethodsStruct;
+#endif
+
+#if defined(_WIN32) || defined(WIN32) || defined(MS_WINDOWS)
+  #if !defined(_USE_MATH_DEFINES)
+    #define _USE_MATH_DEFINES
+  #endif
+#endif
+#include <math.h>
+#ifdef NAN
+#define __PYX_NAN() ((float) NAN)
+#else
+static CYTHON_INLINE float __PYX_NAN() {
+  float value;
+  memset(&value, 0xFF, sizeof(value));
+  return value;
+}
+#endif
+#if defined(__CYGWIN__) && defined(_LDBL_EQ_DBL)
+#define __Pyx_truncl trunc
+#else
+#define __Pyx_truncl truncl
+#endif
+
+#define __PYX_MARK_ERR_POS(f_index, lineno) \
+    { __pyx_filename = __pyx_f[f_index]; (void)__pyx_filename; __pyx_lineno = lineno; (void)__pyx_lineno; __pyx_clineno = __LINE__; (void)__pyx_clineno; }
+#define __PYX_ERR(f_index, lineno, Ln_error) \
+    { __PYX_MARK_ERR_POS(f_index, lineno) goto Ln_error; }
+
+#ifndef __PYX_EXTERN_C
+  #ifdef __cplusplus
+    #define __PYX_EXTERN_C extern "C"
+  #else
+    #define __PYX_EXTERN_C extern
+  #endif
+#endif
+
+#define __PYX_HAVE__landlab__graph__cfuncs
+#define __PYX_HAVE_API__landlab__graph__cfuncs
+/* Early includes */
+#include <string.h>
+#include <stdio.h>
+#include "numpy/arrayobject.h"
+#include "numpy/ufuncobject.h"
+
+    /* NumPy API declarations from "numpy/__init__.pxd" */
+    
+#include <stdlib.h>
+#include <math.h>
+#include "stdlib.h"
+#ifdef _OPENMP
+#include <omp.h>
+#endif /* _OPENMP */
+
+#if defined(PYREX_WITHOUT_ASSERTIONS) && !defined(CYTHON_WITHOUT_ASSERTIONS)
+#define CYTHON_WITHOUT_ASSERTIONS
+#endif
+
+typedef struct {PyObject **p; const char *s; const Py_ssize_t n; const char* encoding;
+                const char is_unicode; const char is_str; const char intern; } __Pyx_StringTabEntry;
+
+#define __PYX_DEFAULT_STRING_ENCODING_IS_ASCII 0
+#define __PYX_DEFAULT_STRING_ENCODING_IS_UTF8 0
+#define __PYX_DEFAULT_STRING_ENCODING_IS_DEFAULT (PY_MAJOR_VERSION >= 3 && __PYX_DEFAULT_STRING_ENCODING_IS_UTF8)
+#define __PYX_DEFAULT_STRING_ENCODING ""
+#define __Pyx_PyObject_FromString __Pyx_PyBytes_FromString
+#define __Pyx_PyObject_FromStringAndSize __Pyx_PyBytes_FromStringAndSize
+#define __Pyx_uchar_cast(c) ((unsigned char)c)
+#define __Pyx_long_cast(x) ((long)x)
+#define __Pyx_fits_Py_ssize_t(v, type, is_signed)  (\
+    (sizeof(type) < sizeof(Py_ssize_t))  ||\
+    (sizeof(type) > sizeof(Py_ssize_t) &&\
+          likely(v < (type)PY_SSIZE_T_MAX ||\
+                 v == (type)PY_SSIZE_T_MAX)  &&\
+          (!is_signed || likely(v > (type)PY_SSIZE_T_MIN ||\
+                                v == (type)PY_SSIZE_T_MIN)))  ||\
+    (sizeof(type) == sizeof(Py_ssize_t) &&\
+          (is_signed || likely(v < (type)PY_SSIZE_T_MAX ||\
+                               v == (type)PY_SSIZE_T_MAX)))  )
+static CYTHON_INLINE int __Pyx_is_valid_index(Py_ssize_t i, Py_ssize_t limit) {
+    return (size_t) i < (size_t) limit;
+}
+#if defined (__cplusplus) && __cplusplus >= 201103L
+    #include <cstdlib>
+    #define __Pyx_sst_abs(value) std::abs(value)
+#elif SIZEOF_INT >= SIZEOF_SIZE_T
+    #define __Pyx_sst_abs(value) abs(value)
+#elif SIZEOF_LONG >= SIZEOF_SIZE_T
+    #define __Pyx_sst_abs(value) labs(value)
+#elif defined (_MSC_VER)
+    #define __Pyx_sst_abs(value) ((Py_ssize_t)_abs64(value))
+#elif defined (__STDC_VERSION__) && __STDC_VERSION__ >= 199901L
+    #define __Pyx_sst_abs(value) llabs(value)
+#elif defined (__GNUC__)
+    #define __Pyx_sst_abs(value) __builtin_llabs(value)
+#else
+    #define __Pyx_sst_abs(value) ((value<0) ? -value : value)
+#endif
+static CYTHON_INLINE const char* __Pyx_PyObject_AsString(PyObject*);
+static CYTHON_INLINE const char* __Pyx_PyObject_AsStringAndSize(PyObject*, Py_ssize_t* length);
+#define __Pyx_PyByteArray_FromString(s) PyByteArray_FromStringAndSize((const char*)s, strlen((const char*)s))
+#define __Pyx_PyByteArray_FromStringAndSize(s, l) PyByteArray_FromStringAndSize((const char*)s, l)
+#define __Pyx_PyBytes_FromString        PyBytes_FromString
+#define __Pyx_PyBytes_FromStringAndSize PyBytes_FromStringAndSize
+static CYTHON_INLINE PyObject* __Pyx_PyUnicode_FromString(const char*);
+#if PY_MAJOR_VERSION < 3
+    #define __Pyx_PyStr_FromString        __Pyx_PyBytes_FromString
+    #define __Pyx_PyStr_FromStringAndSize __Pyx_PyBytes_FromStringAndSize
+#else
+    #define __Pyx_PyStr_FromString        __Pyx_PyUnicode_FromString
+    #define __Pyx_PyStr_FromStringAndSize __Pyx_PyUnicode_FromStringAndSize
+#endif
+#define __Pyx_PyBytes_AsWritableString(s)     ((char*) PyBytes_AS_STRING(s))
+#define __Pyx_PyBytes_AsWritableSString(s)    ((signed char*) PyBytes_AS_STRING(s))
+#define __Pyx_PyBytes_AsWritableUString(s)    ((unsigned char*) PyBytes_AS_STRING(s))
+#define __Pyx_PyBytes_AsString(s)     ((const char*) PyBytes_AS_STRING(s))
+#define __Pyx_PyBytes_AsSString(s)    ((const signed char*) PyBytes_AS_STRING(s))
+#define __Pyx_PyBytes_AsUString(s)    ((const unsigned char*) PyBytes_AS_STRING(s))
+#define __Pyx_PyObject_AsWritableString(s)    ((char*) __Pyx_PyObject_AsString(s))
+#define __Pyx_PyObject_AsWritableSString(s)    ((signed char*) __Pyx_PyObject_AsString(s))
+#define __Pyx_PyObject_AsWritableUString(s)    ((unsigned char*) __Pyx_PyObject_AsString(s))
+#define __Pyx_PyObject_AsSString(s)    ((const signed char*) __Pyx_PyObject_AsString(s))
+#define __Pyx_PyObject_AsUString(s)    ((const unsigned char*) __Pyx_PyObject_AsString(s))
+#define __Pyx_PyObject_FromCString(s)  __Pyx_PyObject_FromString((const char*)s)
+#define __Pyx_PyBytes_FromCString(s)   __Pyx_PyBytes_FromString((const char*)s)
+#define __Pyx_PyByteArray_FromCString(s)   __Pyx_PyByteArray_FromString((const char*)s)
+#define __Pyx_PyStr_FromCString(s)     __Pyx_PyStr_FromString((const char*)s)
+#define __Pyx_PyUnicode_FromCString(s) __Pyx_PyUnicode_FromString((const char*)s)
+static CYTHON_INLINE size_t __Pyx_Py_UNICODE_strlen(const Py_UNICODE *u) {
+    const Py_UNICODE *u_end = u;
+    while (*u_end++) ;
+    return (size_t)(u_end - u - 1);
+}
+#define __Pyx_PyUnicode_FromUnicode(u)       PyUnicode_FromUnicode(u, __Pyx_Py_UNICODE_strlen(u))
+#define __Pyx_PyUnicode_FromUnicodeAndLength PyUnicode_FromUnicode
+#define __Pyx_PyUnicode_AsUnicode            PyUnicode_AsUnicode
+#define __Pyx_NewRef(obj) (Py_INCREF(obj), obj)
+#define __Pyx_Owned_Py_None(b) __Pyx_NewRef(Py_None)
+static CYTHON_INLINE PyObject * __Pyx_PyBool_FromLong(long b);
+static CYTHON_INLINE int __Pyx_PyObject_IsTrue(PyObject*);
+static CYTHON_INLINE int __Pyx_PyObject_IsTrueAndDecref(PyObject*);
+static CYTHON_INLINE PyObject* __Pyx_PyNumber_IntOrLong(PyObject* x);
+#define __Pyx_PySequence_Tuple(obj)\
+    (likely(PyTuple_CheckExact(obj)) ? __Pyx_NewRef(obj) : PySequence_Tuple(obj))
+static CYTHON_INLINE Py_ssize_t __Pyx_PyIndex_AsSsize_t(PyObject*);
+static CYTHON_INLINE PyObject * __Pyx_PyInt_FromSize_t(size_t);
+static CYTHON_INLINE Py_hash_t __Pyx_PyIndex_AsHash_t(PyObject*);
+#if CYTHON_ASSUME_SAFE_MACROS
+#define __pyx_PyFloat_AsDouble(x) (PyFloat_CheckExact(x) ? PyFloat_AS_DOUBLE(x) : PyFloat_AsDouble(x))
+#else
+#define __pyx_PyFloat_AsDouble(x) PyFloat_AsDouble(x)
+#endif
+#define __pyx_PyFloat_AsFloat(x) ((float) __pyx_PyFloat_AsDouble(x))
+#if PY_MAJOR_VERSION >= 3
+#define __Pyx_PyNumber_Int(x) (PyLong_CheckExact(x) ? __Pyx_NewRef(x) : PyNumber_Long(x))
+#else
+#define __Pyx_PyNumber_Int(x) (PyInt_CheckExact(x) ? __Pyx_NewRef(x) : PyNumber_Int(x))
+#endif
+#define __Pyx_PyNumber_Float(x) (PyFloat_CheckExact(x) ? __Pyx_NewRef(x) : PyNumber_Float(x))
+#if PY_MAJOR_VERSION < 3 && __PYX_DEFAULT_STRING_ENCODING_IS_ASCII
+static int __Pyx_sys_getdefaultencoding_not_ascii;
+static int __Pyx_init_sys_getdefaultencoding_params(void) {
+    PyObject* sys;
+    PyObject* default_encoding = NULL;
+    PyObject* ascii_chars_u = NULL;
+    PyObject* ascii_chars_b = NULL;
+    const char* default_encoding_c;
+    sys = PyImport_ImportModule("sys");
+    if (!sys) goto bad;
+    default_encoding = PyObject_CallMethod(sys, (char*) "getdefaultencoding", NULL);
+    Py_DECREF(sys);
+    if (!default_encoding) goto bad;
+    default_encoding_c = PyBytes_AsString(default_encoding);
+    if (!default_encoding_c) goto bad;
+    if (strcmp(default_encoding_c, "ascii") == 0) {
+        __Pyx_sys_getdefaultencoding_not_ascii = 0;
+    } else {
+        char ascii_chars[128];
+        int c;
+        for (c = 0; c < 128; c++) {
+            ascii_chars[c] = c;
+        }
+        __Pyx_sys_getdefaultencoding_not_ascii = 1;
+        ascii_chars_u = PyUnicode_DecodeASCII(ascii_chars, 128, NULL);
+        if (!ascii_chars_u) goto bad;
+        ascii_chars_b = PyUnicode_AsEncodedString(ascii_chars_u, default_encoding_c, NULL);
+        if (!ascii_chars_b || !PyBytes_Check(ascii_chars_b) || memcmp(ascii_chars, PyBytes_AS_STRING(ascii_chars_b), 128) != 0) {
+            PyErr_Format(
+                PyExc_ValueError,
+                "This module compiled with c_string_encoding=ascii, but default encoding '%.200s' is not a superset of ascii.",
+                default_encoding_c);
+            goto bad;
+        }
+        Py_DECREF(ascii_chars_u);
+        Py_DECREF(ascii_chars_b);
+    }
+    Py_DECREF(default_encoding);
+    return 0;
+bad:
+    Py_XDECREF(default_encoding);
+    Py_XDECREF(ascii_chars_u);
+    Py_XDECREF(ascii_chars_b);
+    return -1;
+}
+#endif
+#if __PYX_DEFAULT_STRING_ENCODING_IS_DEFAULT && PY_MAJOR_VERSION >= 3
+#define __Pyx_PyUnicode_FromStringAndSize(c_str, size) PyUnicode_DecodeUTF8(c_str, size, NULL)
+#else
+#define __Pyx_PyUnicode_FromStringAndSize(c_str, size) PyUnicode_Decode(c_str, size, __PYX_DEFAULT_STRING_ENCODING, NULL)
+#if __PYX_DEFAULT_STRING_ENCODING_IS_DEFAULT
+static char* __PYX_DEFAULT_STRING_ENCODING;
+static int __Pyx_init_sys_getdefaultencoding_params(void) {
+    PyObject* sys;
+    PyObject* default_encoding = NULL;
+    char* default_encoding_c;
+    sys = PyImport_ImportModule("sys");
+    if (!sys) goto bad;
+    default_encoding = PyObject_CallMethod(sys, (char*) (const char*) "getdefaultencoding", NULL);
+    Py_DECREF(sys);
+    if (!default_encoding) goto bad;
+    default_encoding_c = PyBytes_AsString(default_encoding);
+    if (!default_encoding_c) goto bad;
+    __PYX_DEFAULT_STRING_ENCODING = (char*) malloc(strlen(default_encoding_c) + 1);
+    if (!__PYX_DEFAULT_STRING_ENCODING) goto bad;
+    strcpy(__PYX_DEFAULT_STRING_ENCODING, default_encoding_c);
+    Py_DECREF(default_encoding);
+    return 0;
+bad:
+    Py_XDECREF(default_encoding);
+    return -1;
+}
+#endif
+#endif
+
+
+/* Test for GCC > 2.95 */
+#if defined(__GNUC__)     && (__GNUC__ > 2 || (__GNUC__ == 2 && (__GNUC_MINOR__ > 95)))
+  #define likely(x)   __builtin_expect(!!(x), 1)
+  #define unlikely(x) __builtin_expect(!!(x), 0)
+#else /* !__GNUC__ or GCC < 2.95 */
+  #define likely(x)   (x)
+  #define unlikely(x) (x)
+#endif /* __GNUC__ */
+static CYTHON_INLINE void __Pyx_pretend_to_initialize(void* ptr) { (void)ptr; }
+
+static PyObject *__pyx_m = NULL;
+static PyObject *__pyx_d;
+static PyObject *__pyx_b;
+static PyObject *__pyx_cython_runtime = NULL;
+static PyObject *__pyx_empty_tuple;
+static PyObject *__pyx_empty_bytes;
+static PyObject *__pyx_empty_unicode;
+static int __pyx_lineno;
+static int __pyx_clineno = 0;
+static const char * __pyx_cfilenm= __FILE__;
+static const char *__pyx_filename;
+
+/* Header.proto */
+#if !defined(CYTHON_CCOMPLEX)
+  #if defined(__cplusplus)
+    #define CYTHON_CCOMPLEX 1
+  #elif (defined(_Complex_I) && !defined(_MSC_VER))
+    #define CYTHON_CCOMPLEX 1
+  #else
+    #define CYTHON_CCOMPLEX 0
+  #endif
+#endif
+#if CYTHON_CCOMPLEX
+  #ifdef __cplusplus
+    #include <complex>
+  #else
+    #include <complex.h>
+  #endif
+#endif
+#if CYTHON_CCOMPLEX && !defined(__cplusplus) && defined(__sun__) && defined(__GNUC__)
+  #undef _Complex_I
+  #define _Complex_I 1.0fj
+#endif
+
+
+static const char *__pyx_f[] = {
+  "landlab/graph/cfuncs.pyx",
+  "__init__.pxd",
+  "type.pxd",
+};
+/* BufferFormatStructs.proto */
+#define IS_UNSIGNED(type) (((type) -1) > 0)
+struct __Pyx_StructField_;
+#define __PYX_BUF_FLAGS_PACKED_STRUCT (1 << 0)
+typedef struct {
+  const char* name;
+  struct __Pyx_StructField_* fields;
+  size_t size;
+  size_t arraysize[8];
+  int ndim;
+  char typegroup;
+  char is_unsigned;
+  int flags;
+} __Pyx_TypeInfo;
+typedef struct __Pyx_StructField_ {
+  __Pyx_TypeInfo* type;
+  const char* name;
+  size_t offset;
+} __Pyx_StructField;
+typedef struct {
+  __Pyx_StructField* field;
+  size_t parent_offset;
+} __Pyx_BufFmt_StackElem;
+typedef struct {
+  __Pyx_StructField root;
+  __Pyx_BufFmt_StackElem* head;
+  size_t fmt_offset;
+  size_t new_count, enc_count;
+  size_t struct_alignment;
+  int is_complex;
+  char enc_type;
+  char new_packmode;
+  char enc_packmode;
+  char is_valid_array;
+} __Pyx_BufFmt_Context;
+
+
+/* "../.pyenv/versions/3.7.16/lib/python3.7/site-packages/numpy/__init__.pxd":689
+ * # in Cython to enable them only on the right systems.
+ * 
+ * ctypedef npy_int8       int8_t             # <<<<<<<<<<<<<<
+ * ctypedef npy_int16      int16_t
+ * ctypedef npy_int32      int32_t
+ */
+typedef npy_int8 __pyx_t_5numpy_int8_t;
+
+/* "../.pyenv/versions/3.7.16/lib/python3.7/site-packages/numpy/__init__.pxd":690
+ * 
+ * ctypedef npy_int8       int8_t
+ * ctypedef npy_int16      int16_t             # <<<<<<<<<<<<<<
+ * ctypedef npy_int32      int32_t
+ * ctypedef npy_int64      int64_t
+ */
+typedef npy_int16 __pyx_t_5numpy_int16_t;
+
+/* "../.pyenv/versions/3.7.16/lib/python3.7/site-packages/numpy/__init__.pxd":691
+ * ctypedef npy_int8       int8_t
+ * ctypedef npy_int16      int16_t
+ * ctypedef npy_int32      int32_t             # <<<<<<<<<<<<<<
+ * ctypedef npy_int64      int64_t
+ * #ctypedef npy_int96      int96_t
+ */
+typedef npy_int32 __pyx_t_5numpy_int32_t;
+
+/* "../.pyenv/versions/3.7.16/lib/python3.7/site-packages/numpy/__init__.pxd":692
+ * ctypedef npy_int16      int16_t
+ * ctypedef npy_int32      int32_t
+ * ctypedef npy_int64      int64_t             # <<<<<<<<<<<<<<
+ * #ctypedef npy_int96      int96_t
+ * #ctypedef npy_int128     int128_t
+ */
+typedef npy_int64 __pyx_t_5numpy_int64_t;
+
+/* "../.pyenv/versions/3.7.16/lib/python3.7/site-packages/numpy/__init__.pxd":696
+ * #ctypedef npy_int128     int128_t
+ * 
+ * ctypedef npy_uint8      uint8_t             # <<<<<<<<<<<<<<
+ * ctypedef npy_uint16     uint16_t
+ * ctypedef npy_uint32     uint32_t
+ */
+typedef npy_uint8 __pyx_t_5numpy_uint8_t;
+
+/* "../.pyenv/versions/3.7.16/lib/python3.7/site-packages/numpy/__init__.pxd":697
+ * 
+ * ctypedef npy_uint8      uint8_t
+ * ctypedef npy_uint16     uint16_t             # <<<<<<<<<<<<<<
+ * ctypedef npy_uint32     uint32_t
+ * ctypedef npy_uint64     uint64_t
+ */
+typedef npy_uint16 __pyx_t_5numpy_uint16_t;
+
+/* "../.pyenv/versions/3.7.16/lib/python3.7/site-packages/numpy/__init__.pxd":698
+ * ctypedef npy_uint8      uint8_t
+ * ctypedef npy_uint16     uint16_t
+ * ctypedef npy_uint32     uint32_t             # <<<<<<<<<<<<<<
+ * ctypedef npy_uint64     uint64_t
+ * #ctypedef npy_uint96     uint96_t
+ */
+typedef npy_uint32 __pyx_t_5numpy_uint32_t;
+
+/* "../.pyenv/versions/3.7.16/lib/python3.7/site-packages/numpy/__init__.pxd":699
+ * ctypedef npy_uint16     uint16_t
+ * ctypedef npy_uint32     uint32_t
+ * ctypedef npy_uint64     uint64_t             # <<<<<<<<<<<<<<
+ * #ctypedef npy_uint96     uint96_t
+ * #ctypedef npy_uint128    uint128_t
+ */
+typedef npy_uint64 __pyx_t_5numpy_uint64_t;
+
+/* "../.pyenv/versions/3.7.16/lib/python3.7/site-packages/numpy/__init__.pxd":703
+ * #ctypedef npy_uint128    uint128_t
+ * 
+ * ctypedef npy_float32    float32_t             # <<<<<<<<<<<<<<
+ * ctypedef npy_float64    float64_t
+ * #ctypedef npy_float80    float80_t
+ */
+typedef npy_float32 __pyx_t_5numpy_float32_t;
+
+/* "../.pyenv/versions/3.7.16/lib/python3.7/site-packages/numpy/__init__.pxd":704
+ * 
+ * ctypedef npy_float32    float32_t
+ * ctypedef npy_float64    float64_t             # <<<<<<<<<<<<<<
+ * #ctypedef npy_float80    float80_t
+ * #ctypedef npy_float128   float128_t
+ */
+typedef npy_float64 __pyx_t_5numpy_float64_t;
+
+/* "../.pyenv/versions/3.7.16/lib/python3.7/site-packages/numpy/__init__.pxd":713
+ * # The int types are mapped a bit surprising --
+ * # numpy.int corresponds to 'l' and numpy.long to 'q'
+ * ctypedef npy_long       int_t             # <<<<<<<<<<<<<<
+ * ctypedef npy_longlong   long_t
+ * ctypedef npy_longlong   longlong_t
+ */
+typedef npy_long __pyx_t_5numpy_int_t;
+
+/* "../.pyenv/versions/3.7.16/lib/python3.7/site-packages/numpy/__init__.pxd":714
+ * # numpy.int corresponds to 'l' and numpy.long to 'q'
+ * ctypedef npy_long       int_t
+ * ctypedef npy_longlong   long_t             # <<<<<<<<<<<<<<
+ * ctypedef npy_longlong   longlong_t
+ * 
+ */
+typedef npy_longlong __pyx_t_5numpy_long_t;
+
+/* "../.pyenv/versions/3.7.16/lib/python3.7/site-packages/numpy/__init__.pxd":715
+ * ctypedef npy_long       int_t
+ * ctypedef npy_longlong   long_t
+ * ctypedef npy_longlong   longlong_t             # <<<<<<<<<<<<<<
+ * 
+ * ctypedef npy_ulong      uint_t
+ */
+typedef npy_longlong __pyx_t_5numpy_longlong_t;
+
+/* "../.pyenv/versions/3.7.16/lib/python3.7/site-packages/numpy/__init__.pxd":717
+ * ctypedef npy_longlong   longlong_t
+ * 
+ * ctypedef npy_ulong      uint_t             # <<<<<<<<<<<<<<
+ * ctypedef npy_ulonglong  ulong_t
+ * ctypedef npy_ulonglong  ulonglong_t
+ */
+typedef npy_ulong __pyx_t_5numpy_uint_t;
+
+/* "../.pyenv/versions/3.7.16/lib/python3.7/site-packages/numpy/__init__.pxd":718
+ * 
+ * ctypedef npy_ulong      uint_t
+ * ctypedef npy_ulonglong  ulong_t             # <<<<<<<<<<<<<<
+ * ctypedef npy_ulonglong  ulonglong_t
+ * 
+ */
+typedef npy_ulonglong __pyx_t_5numpy_ulong_t;
+
+/* "../.pyenv/versions/3.7.16/lib/python3.7/site-packages/numpy/__init__.pxd":719
+ * ctypedef npy_ulong      uint_t
+ * ctypedef npy_ulonglong  ulong_t
+ * ctypedef npy_ulonglong  ulonglong_t             # <<<<<<<<<<<<<<
+ * 
+ * ctypedef npy_intp       intp_t
+ */
+typedef npy_ulonglong __pyx_t_5numpy_ulonglong_t;
+
+/* "../.pyenv/versions/3.7.16/lib/python3.7/site-packages/numpy/__init__.pxd":721
+ * ctypedef npy_ulonglong  ulonglong_t
+ * 
+ * ctypedef npy_intp       intp_t             # <<<<<<<<<<<<<<
+ * ctypedef npy_uintp      uintp_t
+ * 
+ */
+typedef npy_intp __pyx_t_5numpy_intp_t;
+
+/* "../.pyenv/versions/3.7.16/lib/python3.7/site-packages/numpy/__init__.pxd":722
+ * 
+ * ctypedef npy_intp       intp_t
+ * ctypedef npy_uintp      uintp_t             # <<<<<<<<<<<<<<
+ * 
+ * ctypedef npy_double     float_t
+ */
+typedef npy_uintp __pyx_t_5numpy_uintp_t;
+
+/* "../.pyenv/versions/3.7.16/lib/python3.7/site-packages/numpy/__init__.pxd":724
+ * ctypedef npy_uintp      uintp_t
+ * 
+ * ctypedef npy_double     float_t             # <<<<<<<<<<<<<<
+ * ctypedef npy_double     double_t
+ * ctypedef npy_longdouble longdouble_t
+ */
+typedef npy_double __pyx_t_5numpy_float_t;
+
+/* "../.pyenv/versions/3.7.16/lib/python3.7/site-packages/numpy/__init__.pxd":725
+ * 
+ * ctypedef npy_double     float_t
+ * ctypedef npy_double     double_t             # <<<<<<<<<<<<<<
+ * ctypedef npy_longdouble longdouble_t
+ * 
+ */
+typedef npy_double __pyx_t_5numpy_double_t;
+
+/* "../.pyenv/versions/3.7.16/lib/python3.7/site-packages/numpy/__init__.pxd":726
+ * ctypedef npy_double     float_t
+ * ctypedef npy_double     double_t
+ * ctypedef npy_longdouble longdouble_t             # <<<<<<<<<<<<<<
+ * 
+ * ctypedef npy_cfloat      cfloat_t
+ */
+typedef npy_longdouble __pyx_t_5numpy_longdouble_t;
+
+/* "landlab/graph/cfuncs.pyx":10
+ * 
+ * DTYPE = np.int
+ * ctypedef np.int_t DTYPE_t             # <<<<<<<<<<<<<<
+ * 
+ * from libc.stdlib cimport malloc, free, qsort
+ */
+typedef __pyx_t_5numpy_int_t __pyx_t_7landlab_5graph_6cfuncs_DTYPE_t;
+
+/* "landlab/graph/cfuncs.pyx":15
+ * 
+ * 
+ * ctypedef np.int_t INT_t             # <<<<<<<<<<<<<<
+ * ctypedef np.float_t FLOAT_t
+ * 
+ */
+typedef __pyx_t_5numpy_int_t __pyx_t_7landlab_5graph_6cfuncs_INT_t;
+
+/* "landlab/graph/cfuncs.pyx":16
+ * 
+ * ctypedef np.int_t INT_t
+ * ctypedef np.float_t FLOAT_t             # <<<<<<<<<<<<<<
+ * 
+ * cdef struct Sorter:
+ */
+typedef __pyx_t_5numpy_float_t __pyx_t_7landlab_5graph_6cfuncs_FLOAT_t;
+/* Declarations.proto */
+#if CYTHON_CCOMPLEX
+  #ifdef __cplusplus
+    typedef ::std::complex< float > __pyx_t_float_complex;
+  #else
+    typedef float _Complex __pyx_t_float_complex;
+  #endif
+#else
+    typedef struct { float real, imag; } __pyx_t_float_complex;
+#endif
+static CYTHON_INLINE __pyx_t_float_complex __pyx_t_float_complex_from_parts(float, float);
+
+/* Declarations.proto */
+#if CYTHON_CCOMPLEX
+  #ifdef __cplusplus
+    typedef ::std::complex< double > __pyx_t_double_complex;
+  #else
+    typedef double _Complex __pyx_t_double_complex;
+  #endif
+#else
+    typedef struct { double real, imag; } __pyx_t_double_complex;
+#endif
+static CYTHON_INLINE __pyx_t_double_complex __pyx_t_double_complex_from_parts(double, double);
+
+
+/*--- Type declarations ---*/
+
+/* "../.pyenv/versions/3.7.16/lib/python3.7/site-packages/numpy/__init__.pxd":728
+ * ctypedef npy_longdouble longdouble_t
+ * 
+ * ctypedef npy_cfloat      cfloat_t             # <<<<<<<<<<<<<<
+ * ctypedef npy_cdouble     cdouble_t
+ * ctypedef npy_clongdouble clongdouble_t
+ */
+typedef npy_cfloat __pyx_t_5numpy_cfloat_t;
+
+/* "../.pyenv/versions/3.7.16/lib/python3.7/site-packages/numpy/__init__.pxd":729
+ * 
+ * ctypedef npy_cfloat      cfloat_t
+ * ctypedef npy_cdouble     cdouble_t             # <<<<<<<<<<<<<<
+ * ctypedef npy_clongdouble clongdouble_t
+ * 
+ */
+typedef npy_cdouble __pyx_t_5numpy_cdouble_t;
+
+/* "../.pyenv/versions/3.7.16/lib/python3.7/site-packages/numpy/__init__.pxd":730
+ * ctypedef npy_cfloat      cfloat_t
+ * ctypedef npy_cdouble     cdouble_t
+ * ctypedef npy_clongdouble clongdouble_t             # <<<<<<<<<<<<<<
+ * 
+ * ctypedef npy_cdouble     complex_t
+ */
+typedef npy_clongdouble __pyx_t_5numpy_clongdouble_t;
+
+/* "../.pyenv/versions/3.7.16/lib/python3.7/site-packages/numpy/__init__.pxd":732
+ * ctypedef npy_clongdouble clongdouble_t
+ * 
+ * ctypedef npy_cdouble     complex_t             # <<<<<<<<<<<<<<
+ * 
+ * cdef inline object PyArray_MultiIterNew1(a):
+ */
+typedef npy_cdouble __pyx_t_5numpy_complex_t;
+struct __pyx_t_7landlab_5graph_6cfuncs_Sorter;
+
+/* "landlab/graph/cfuncs.pyx":18
+ * ctypedef np.float_t FLOAT_t
+ * 
+ * cdef struct Sorter:             # <<<<<<<<<<<<<<
+ *     INT_t index
+ *     FLOAT_t value
+ */
+struct __pyx_t_7landlab_5graph_6cfuncs_Sorter {
+  __pyx_t_7landlab_5graph_6cfuncs_INT_t index;
+  __pyx_t_7landlab_5graph_6cfuncs_FLOAT_t value;
+};
+
+/* --- Runtime support code (head) --- */
+/* Refnanny.proto */
+#ifndef CYTHON_REFNANNY
+  #define CYTHON_REFNANNY 0
+#endif
+#if CYTHON_REFNANNY
+  typedef struct {
+    void (*INCREF)(void*, PyObject*, int);
+    void (*DECREF)(void*, PyObject*, int);
+    void (*GOTREF)(void*, PyObject*, int);
+    void (*GIVEREF)(void*, PyObject*, int);
+    void* (*SetupContext)(const char*, int, const char*);
+    void (*FinishContext)(void**);
+  } __Pyx_RefNannyAPIStruct;
+  static __Pyx_RefNannyAPIStruct *__Pyx_RefNanny = NULL;
+  static __Pyx_RefNannyAPIStruct *__Pyx_RefNannyImportAPI(const char *modname);
+  #define __Pyx_RefNannyDeclarations void *__pyx_refnanny = NULL;
+#ifdef WITH_THREAD
+  #define __Pyx_RefNannySetupContext(name, acquire_gil)\
+          if (acquire_gil) {\
+              PyGILState_STATE __pyx_gilstate_save = PyGILState_Ensure();\
+              __pyx_refnanny = __Pyx_RefNanny->SetupContext((name), __LINE__, __FILE__);\
+              PyGILState_Release(__pyx_gilstate_save);\
+          } else {\
+              __pyx_refnanny = __Pyx_RefNanny->SetupContext((name), __LINE__, __FILE__);\
+          }
+#else
+  #define __Pyx_RefNannySetupContext(name, acquire_gil)\
+          __pyx_refnanny = __Pyx_RefNanny->SetupContext((name), __LINE__, __FILE__)
+#endif
+  #define __Pyx_RefNannyFinishContext()\
+          __Pyx_RefNanny->FinishContext(&__pyx_refnanny)
+  #define __Pyx_INCREF(r)  __Pyx_RefNanny->INCREF(__pyx_refnanny, (PyObject *)(r), __LINE__)
+  #define __Pyx_DECREF(r)  __Pyx_RefNanny->DECREF(__pyx_refnanny, (PyObject *)(r), __LINE__)
+  #define __Pyx_GOTREF(r)  __Pyx_RefNanny->GOTREF(__pyx_refnanny, (PyObject *)(r), __LINE__)
+  #define __Pyx_GIVEREF(r) __Pyx_RefNanny->GIVEREF(__pyx_refnanny, (PyObject *)(r), __LINE__)
+  #define __Pyx_XINCREF(r)  do { if((r) != NULL) {__Pyx_INCREF(r); }} while(0)
+  #define __Pyx_XDECREF(r)  do { if((r) != NULL) {__Pyx_DECREF(r); }} while(0)
+  #define __Pyx_XGOTREF(r)  do { if((r) != NULL) {__Pyx_GOTREF(r); }} while(0)
+  #define __Pyx_XGIVEREF(r) do { if((r) != NULL) {__Pyx_GIVEREF(r);}} while(0)
+#else
+  #define __Pyx_RefNannyDeclarations
+  #define __Pyx_RefNannySetupContext(name, acquire_gil)
+  #define __Pyx_RefNannyFinishContext()
+  #define __Pyx_INCREF(r) Py_INCREF(r)
+  #define __Pyx_DECREF(r) Py_DECREF(r)
+  #define __Pyx_GOTREF(r)
+  #define __Pyx_GIVEREF(r)
+  #define __Pyx_XINCREF(r) Py_XINCREF(r)
+  #define __Pyx_XDECREF(r) Py_XDECREF(r)
+  #define __Pyx_XGOTREF(r)
+  #define __Pyx_XGIVEREF(r)
+#endif
+#define __Pyx_XDECREF_SET(r, v) do {\
+        PyObject *tmp = (PyObject *) r;\
+        r = v; __Pyx_XDECREF(tmp);\
+    } while (0)
+#define __Pyx_DECREF_SET(r, v) do {\
+        PyObject *tmp = (PyObject *) r;\
+        r = v; __Pyx_DECREF(tmp);\
+    } while (0)
+#define __Pyx_CLEAR(r)    do { PyObject* tmp = ((PyObject*)(r)); r = NULL; __Pyx_DECREF(tmp);} while(0)
+#define __Pyx_XCLEAR(r)   do { if((r) != NULL) {PyObject* tmp = ((PyObject*)(r)); r = NULL; __Pyx_DECREF(tmp);}} while(0)
+
+/* PyObjectGetAttrStr.proto */
+#if CYTHON_USE_TYPE_SLOTS
+static CYTHON_INLINE PyObject* __Pyx_PyObject_GetAttrStr(PyObject* obj, PyObject* attr_name);
+#else
+#define __Pyx_PyObject_GetAttrStr(o,n) PyObject_GetAttr(o,n)
+#endif
+
+/* GetBuiltinName.proto */
+static PyObject *__Pyx_GetBuiltinName(PyObject *name);
+
+/* RaiseArgTupleInvalid.proto */
+static void __Pyx_RaiseArgtupleInvalid(const char* func_name, int exact,
+    Py_ssize_t num_min, Py_ssize_t num_max, Py_ssize_t num_found);
+
+/* RaiseDoubleKeywords.proto */
+static void __Pyx_RaiseDoubleKeywordsError(const char* func_name, PyObject* kw_name);
+
+/* ParseKeywords.proto */
+static int __Pyx_ParseOptionalKeywords(PyObject *kwds, PyObject **argnames[],\
+    PyObject *kwds2, PyObject *values[], Py_ssize_t num_pos_args,\
+    const char* function_name);
+
+/* ArgTypeTest.proto */
+#define __Pyx_ArgTypeTest(obj, type, none_allowed, name, exact)\
+    ((likely((Py_TYPE(obj) == type) | (none_allowed && (obj == Py_None)))) ? 1 :\
+        __Pyx__ArgTypeTest(obj, type, name, exact))
+static int __Pyx__ArgTypeTest(PyObject *obj, PyTypeObject *type, const char *name, int exact);
+
+/* IsLittleEndian.proto */
+static CYTHON_INLINE int __Pyx_Is_Little_Endian(void);
+
+/* BufferFormatCheck.proto */
+static const char* __Pyx_BufFmt_CheckString(__Pyx_BufFmt_Context* ctx, const char* ts);
+static void __Pyx_BufFmt_Init(__Pyx_BufFmt_Context* ctx,
+                              __Pyx_BufFmt_StackElem* stack,
+                              __Pyx_TypeInfo* type);
+
+/* BufferGetAndValidate.proto */
+#define __Pyx_GetBufferAndValidate(buf, obj, dtype, flags, nd, cast, stack)\
+    ((obj == Py_None || obj == NULL) ?\
+    (__Pyx_ZeroBuffer(buf), 0) :\
+    __Pyx__GetBufferAndValidate(buf, obj, dtype, flags, nd, cast, stack))
+static int  __Pyx__GetBufferAndValidate(Py_buffer* buf, PyObject* obj,
+    __Pyx_TypeInfo* dtype, int flags, int nd, int cast, __Pyx_BufFmt_StackElem* stack);
+static void __Pyx_ZeroBuffer(Py_buffer* buf);
+static CYTHON_INLINE void __Pyx_SafeReleaseBuffer(Py_buffer* info);
+static Py_ssize_t __Pyx_minusones[] = { -1, -1, -1, -1, -1, -1, -1, -1 };
+static Py_ssize_t __Pyx_zeros[] = { 0, 0, 0, 0, 0, 0, 0, 0 };
+
+#define __Pyx_BufPtrStrided2d(type, buf, i0, s0, i1, s1) (type)((char*)buf + i0 * s0 + i1 * s1)
+#define __Pyx_BufPtrStrided1d(type, buf, i0, s0) (type)((char*)buf + i0 * s0)
+/* PyThreadStateGet.proto */
+#if CYTHON_FAST_THREAD_STATE
+#define __Pyx_PyThreadState_declare  PyThreadState *__pyx_tstate;
+#define __Pyx_PyThreadState_assign  __pyx_tstate = __Pyx_PyThreadState_Current;
+#define __Pyx_PyErr_Occurred()  __pyx_tstate->curexc_type
+#else
+#define __Pyx_PyThreadState_declare
+#define __Pyx_PyThreadState_assign
+#define __Pyx_PyErr_Occurred()  PyErr_Occurred()
+#endif
+
+/* PyErrFetchRestore.proto */
+#if CYTHON_FAST_THREAD_STATE
+#define __Pyx_PyErr_Clear() __Pyx_ErrRestore(NULL, NULL, NULL)
+#define __Pyx_ErrRestoreWithState(type, value, tb)  __Pyx_ErrRestoreInState(PyThreadState_GET(), type, value, tb)
+#define __Pyx_ErrFetchWithState(type, value, tb)    __Pyx_ErrFetchInState(PyThreadState_GET(), type, value, tb)
+#define __Pyx_ErrRestore(type, value, tb)  __Pyx_ErrRestoreInState(__pyx_tstate, type, value, tb)
+#define __Pyx_ErrFetch(type, value, tb)    __Pyx_ErrFetchInState(__pyx_tstate, type, value, tb)
+static CYTHON_INLINE void __Pyx_ErrRestoreInState(PyThreadState *tstate, PyObject *type, PyObject *value, PyObject *tb);
+static CYTHON_INLINE void __Pyx_ErrFetchInState(PyThreadState *tstate, PyObject **type, PyObject **value, PyObject **tb);
+#if CYTHON_COMPILING_IN_CPYTHON
+#define __Pyx_PyErr_SetNone(exc) (Py_INCREF(exc), __Pyx_ErrRestore((exc), NULL, NULL))
+#else
+#define __Pyx_PyErr_SetNone(exc) PyErr_SetNone(exc)
+#endif
+#else
+#define __Pyx_PyErr_Clear() PyErr_Clear()
+#define __Pyx_PyErr_SetNone(exc) PyErr_SetNone(exc)
+#define __Pyx_ErrRestoreWithState(type, value, tb)  PyErr_Restore(type, value, tb)
+#define __Pyx_ErrFetchWithState(type, value, tb)  PyErr_Fetch(type, value, tb)
+#define __Pyx_ErrRestoreInState(tstate, type, value, tb)  PyErr_Restore(type, value, tb)
+#define __Pyx_ErrFetchInState(tstate, type, value, tb)  PyErr_Fetch(type, value, tb)
+#define __Pyx_ErrRestore(type, value, tb)  PyErr_Restore(type, value, tb)
+#define __Pyx_ErrFetch(type, value, tb)  PyErr_Fetch(type, value, tb)
+#endif
+
+/* PyDictVersioning.proto */
+#if CYTHON_USE_DICT_VERSIONS && CYTHON_USE_TYPE_SLOTS
+#define __PYX_DICT_VERSION_INIT  ((PY_UINT64_T) -1)
+#define __PYX_GET_DICT_VERSION(dict)  (((PyDictObject*)(dict))->ma_version_tag)
+#define __PYX_UPDATE_DICT_CACHE(dict, value, cache_var, version_var)\
+    (version_var) = __PYX_GET_DICT_VERSION(dict);\
+    (cache_var) = (value);
+#define __PYX_PY_DICT_LOOKUP_IF_MODIFIED(VAR, DICT, LOOKUP) {\
+    static PY_UINT64_T __pyx_dict_version = 0;\
+    static PyObject *__pyx_dict_cached_value = NULL;\
+    if (likely(__PYX_GET_DICT_VERSION(DICT) == __pyx_dict_version)) {\
+        (VAR) = __pyx_dict_cached_value;\
+    } else {\
+        (VAR) = __pyx_dict_cached_value = (LOOKUP);\
+        __pyx_dict_version = __PYX_GET_DICT_VERSION(DICT);\
+    }\
+}
+static CYTHON_INLINE PY_UINT64_T __Pyx_get_tp_dict_version(PyObject *obj);
+static CYTHON_INLINE PY_UINT64_T __Pyx_get_object_dict_version(PyObject *obj);
+static CYTHON_INLINE int __Pyx_object_dict_version_matches(PyObject* obj, PY_UINT64_T tp_dict_version, PY_UINT64_T obj_dict_version);
+#else
+#define __PYX_GET_DICT_VERSION(dict)  (0)
+#define __PYX_UPDATE_DICT_CACHE(dict, value, cache_var, version_var)
+#define __PYX_PY_DICT_LOOKUP_IF_MODIFIED(VAR, DICT, LOOKUP)  (VAR) = (LOOKUP);
+#endif
+
+/* GetModuleGlobalName.proto */
+#if CYTHON_USE_DICT_VERSIONS
+#define __Pyx_GetModuleGlobalName(var, name)  do {\
+    static PY_UINT64_T __pyx_dict_version = 0;\
+    static PyObject *__pyx_dict_cached_value = NULL;\
+    (var) = (likely(__pyx_dict_version == __PYX_GET_DICT_VERSION(__pyx_d))) ?\
+        (likely(__pyx_dict_cached_value) ? __Pyx_NewRef(__pyx_dict_cached_value) : __Pyx_GetBuiltinName(name)) :\
+        __Pyx__GetModuleGlobalName(name, &__pyx_dict_version, &__pyx_dict_cached_value);\
+} while(0)
+#define __Pyx_GetModuleGlobalNameUncached(var, name)  do {\
+    PY_UINT64_T __pyx_dict_version;\
+    PyObject *__pyx_dict_cached_value;\
+    (var) = __Pyx__GetModuleGlobalName(name, &__pyx_dict_version, &__pyx_dict_cached_value);\
+} while(0)
+static PyObject *__Pyx__GetModuleGlobalName(PyObject *name, PY_UINT64_T *dict_version, PyObject **dict_cached_value);
+#else
+#define __Pyx_GetModuleGlobalName(var, name)  (var) = __Pyx__GetModuleGlobalName(name)
+#define __Pyx_GetModuleGlobalNameUncached(var, name)  (var) = __Pyx__GetModuleGlobalName(name)
+static CYTHON_INLINE PyObject *__Pyx__GetModuleGlobalName(PyObject *name);
+#endif
+
+/* GetItemInt.proto */
+#define __Pyx_GetItemInt(o, i, type, is_signed, to_py_func, is_list, wraparound, boundscheck)\
+    (__Pyx_fits_Py_ssize_t(i, type, is_signed) ?\
+    __Pyx_GetItemInt_Fast(o, (Py_ssize_t)i, is_list, wraparound, boundscheck) :\
+    (is_list ? (PyErr_SetString(PyExc_IndexError, "list index out of range"), (PyObject*)NULL) :\
+               __Pyx_GetItemInt_Generic(o, to_py_func(i))))
+#define __Pyx_GetItemInt_List(o, i, type, is_signed, to_py_func, is_list, wraparound, boundscheck)\
+    (__Pyx_fits_Py_ssize_t(i, type, is_signed) ?\
+    __Pyx_GetItemInt_List_Fast(o, (Py_ssize_t)i, wraparound, boundscheck) :\
+    (PyErr_SetString(PyExc_IndexError, "list index out of range"), (PyObject*)NULL))
+static CYTHON_INLINE PyObject *__Pyx_GetItemInt_List_Fast(PyObject *o, Py_ssize_t i,
+                                                              int wraparound, int boundscheck);
+#define __Pyx_GetItemInt_Tuple(o, i, type, is_signed, to_py_func, is_list, wraparound, boundscheck)\
+    (__Pyx_fits_Py_ssize_t(i, type, is_signed) ?\
+    __Pyx_GetItemInt_Tuple_Fast(o, (Py_ssize_t)i, wraparound, boundscheck) :\
+    (PyErr_SetString(PyExc_IndexError, "tuple index out of range"), (PyObject*)NULL))
+static CYTHON_INLINE PyObject *__Pyx_GetItemInt_Tuple_Fast(PyObject *o, Py_ssize_t i,
+                                                              int wraparound, int boundscheck);
+static PyObject *__Pyx_GetItemInt_Generic(PyObject *o, PyObject* j);
+static CYTHON_INLINE PyObject *__Pyx_GetItemInt_Fast(PyObject *o, Py_ssize_t i,
+                                                     int is_list, int wraparound, int boundscheck);
+
+/* PyFunctionFastCall.proto */
+#if CYTHON_FAST_PYCALL
+#define __Pyx_PyFunction_FastCall(func, args, nargs)\
+    __Pyx_PyFunction_FastCallDict((func), (args), (nargs), NULL)
+#if 1 || PY_VERSION_HEX < 0x030600B1
+static PyObject *__Pyx_PyFunction_FastCallDict(PyObject *func, PyObject **args, Py_ssize_t nargs, PyObject *kwargs);
+#else
+#define __Pyx_PyFunction_FastCallDict(func, args, nargs, kwargs) _PyFunction_FastCallDict(func, args, nargs, kwargs)
+#endif
+#define __Pyx_BUILD_ASSERT_EXPR(cond)\
+    (sizeof(char [1 - 2*!(cond)]) - 1)
+#ifndef Py_MEMBER_SIZE
+#define Py_MEMBER_SIZE(type, member) sizeof(((type *)0)->member)
+#endif
+#if CYTHON_FAST_PYCALL
+  static size_t __pyx_pyframe_localsplus_offset = 0;
+  #include "frameobject.h"
+#if PY_VERSION_HEX >= 0x030b00a6
+  #ifndef Py_BUILD_CORE
+    #define Py_BUILD_CORE 1
+  #endif
+  #include "internal/pycore_frame.h"
+#endif
+  #define __Pxy_PyFrame_Initialize_Offsets()\
+    ((void)__Pyx_BUILD_ASSERT_EXPR(sizeof(PyFrameObject) == offsetof(PyFrameObject, f_localsplus) + Py_MEMBER_SIZE(PyFrameObject, f_localsplus)),\
+     (void)(__pyx_pyframe_localsplus_offset = ((size_t)PyFrame_Type.tp_basicsize) - Py_MEMBER_SIZE(PyFrameObject, f_localsplus)))
+  #define __Pyx_PyFrame_GetLocalsplus(frame)\
+    (assert(__pyx_pyframe_localsplus_offset), (PyObject **)(((char *)(frame)) + __pyx_pyframe_localsplus_offset))
+#endif // CYTHON_FAST_PYCALL
+#endif
+
+/* PyCFunctionFastCall.proto */
+#if CYTHON_FAST_PYCCALL
+static CYTHON_INLINE PyObject *__Pyx_PyCFunction_FastCall(PyObject *func, PyObject **args, Py_ssize_t nargs);
+#else
+#define __Pyx_PyCFunction_FastCall(func, args, nargs)  (assert(0), NULL)
+#endif
+
+/* PyObjectCall.proto */
+#if CYTHON_COMPILING_IN_CPYTHON
+static CYTHON_INLINE PyObject* __Pyx_PyObject_Call(PyObject *func, PyObject *arg, PyObject *kw);
+#else
+#define __Pyx_PyObject_Call(func, arg, kw) PyObject_Call(func, arg, kw)
+#endif
+
+/* PyIntBinop.proto */
+#if !CYTHON_COMPILING_IN_PYPY
+static PyObject* __Pyx_PyInt_SubtractObjC(PyObject *op1, PyObject *op2, long intval, int inplace, int zerodivision_check);
+#else
+#define __Pyx_PyInt_SubtractObjC(op1, op2, intval, inplace, zerodivision_check)\
+    (inplace ? PyNumber_InPlaceSubtract(op1, op2) : PyNumber_Subtract(op1, op2))
+#endif
+
+/* PyIntBinop.proto */
+#if !CYTHON_COMPILING_IN_PYPY
+static PyObject* __Pyx_PyInt_AddObjC(PyObject *op1, PyObject *op2, long intval, int inplace, int zerodivision_check);
+#else
+#define __Pyx_PyInt_AddObjC(op1, op2, intval, inplace, zerodivision_check)\
+    (inplace ? PyNumber_InPlaceAdd(op1, op2) : PyNumber_Add(op1, op2))
+#endif
+
+/* GetException.proto */
+#if CYTHON_FAST_THREAD_STATE
+#define __Pyx_GetException(type, value, tb)  __Pyx__GetException(__pyx_tstate, type, value, tb)
+static int __Pyx__GetException(PyThreadState *tstate, PyObject **type, PyObject **value, PyObject **tb);
+#else
+static int __Pyx_GetException(PyObject **type, PyObject **value, PyObject **tb);
+#endif
+
+/* SwapException.proto */
+#if CYTHON_FAST_THREAD_STATE
+#define __Pyx_ExceptionSwap(type, value, tb)  __Pyx__ExceptionSwap(__pyx_tstate, type, value, tb)
+static CYTHON_INLINE void __Pyx__ExceptionSwap(PyThreadState *tstate, PyObject **type, PyObject **value, PyObject **tb);
+#else
+static CYTHON_INLINE void __Pyx_ExceptionSwap(PyObject **type, PyObject **value, PyObject **tb);
+#endif
+
+/* GetTopmostException.proto */
+#if CYTHON_USE_EXC_INFO_STACK
+static _PyErr_StackItem * __Pyx_PyErr_GetTopmostException(PyThreadState *tstate);
+#endif
+
+/* SaveResetException.proto */
+#if CYTHON_FAST_THREAD_STATE
+#define __Pyx_ExceptionSave(type, value, tb)  __Pyx__ExceptionSave(__pyx_tstate, type, value, tb)
+static CYTHON_INLINE void __Pyx__ExceptionSave(PyThreadState *tstate, PyObject **type, PyObject **value, PyObject **tb);
+#define __Pyx_ExceptionReset(type, value, tb)  __Pyx__ExceptionReset(__pyx_tstate, type, value, tb)
+static CYTHON_INLINE void __Pyx__ExceptionReset(PyThreadState *tstate, PyObject *type, PyObject *value, PyObject *tb);
+#else
+#define __Pyx_ExceptionSave(type, value, tb)   PyErr_GetExcInfo(type, value, tb)
+#define __Pyx_ExceptionReset(type, value, tb)  PyErr_SetExcInfo(type, value, tb)
+#endif
+
+#define __Pyx_BufPtrCContig1d(type, buf, i0, s0) ((type)buf + i0)
+#define __Pyx_BufPtrCContig2d(type, buf, i0, s0, i1, s1) ((type)((char*)buf + i0 * s0) + i1)
+/* PyErrExceptionMatches.proto */
+#if CYTHON_FAST_THREAD_STATE
+#define __Pyx_PyErr_ExceptionMatches(err) __Pyx_PyErr_ExceptionMatchesInState(__pyx_tstate, err)
+static CYTHON_INLINE int __Pyx_PyErr_ExceptionMatchesInState(PyThreadState* tstate, PyObject* err);
+#else
+#define __Pyx_PyErr_ExceptionMatches(err)  PyErr_ExceptionMatches(err)
+#endif
+
+/* RaiseException.proto */
+static void __Pyx_Raise(PyObject *type, PyObject *value, PyObject *tb, PyObject *cause);
+
+/* TypeImport.proto */
+#ifndef __PYX_HAVE_RT_ImportType_proto_0_29_37
+#define __PYX_HAVE_RT_ImportType_proto_0_29_37
+#if __STDC_VERSION__ >= 201112L
+#include <stdalign.h>
+#endif
+#if __STDC_VERSION__ >= 201112L || __cplusplus >= 201103L
+#define __PYX_GET_STRUCT_ALIGNMENT_0_29_37(s) alignof(s)
+#else
+#define __PYX_GET_STRUCT_ALIGNMENT_0_29_37(s) sizeof(void*)
+#endif
+enum __Pyx_ImportType_CheckSize_0_29_37 {
+   __Pyx_ImportType_CheckSize_Error_0_29_37 = 0,
+   __Pyx_ImportType_CheckSize_Warn_0_29_37 = 1,
+   __Pyx_ImportType_CheckSize_Ignore_0_29_37 = 2
+};
+static PyTypeObject *__Pyx_ImportType_0_29_37(PyObject* module, const char *module_name, const char *class_name, size_t size, size_t alignment, enum __Pyx_ImportType_CheckSize_0_29_37 check_size);
+#endif
+
+/* Import.proto */
+static PyObject *__Pyx_Import(PyObject *name, PyObject *from_list, int level);
+
+/* CLineInTraceback.proto */
+#ifdef CYTHON_CLINE_IN_TRACEBACK
+#define __Pyx_CLineForTraceback(tstate, c_line)  (((CYTHON_CLINE_IN_TRACEBACK)) ? c_line : 0)
+#else
+static int __Pyx_CLineForTraceback(PyThreadState *tstate, int c_line);
+#endif
+
+/* CodeObjectCache.proto */
+typedef struct {
+    PyCodeObject* code_object;
+    int code_line;
+} __Pyx_CodeObjectCacheEntry;
+struct __Pyx_CodeObjectCache {
+    int count;
+    int max_count;
+    __Pyx_CodeObjectCacheEntry* entries;
+};
+static struct __Pyx_CodeObjectCache __pyx_code_cache = {0,0,NULL};
+static int __pyx_bisect_code_objects(__Pyx_CodeObjectCacheEntry* entries, int count, int code_line);
+static PyCodeObject *__pyx_find_code_object(int code_line);
+static void __pyx_insert_code_object(int code_line, PyCodeObject* code_object);
+
+/* AddTraceback.proto */
+static void __Pyx_AddTraceback(const char *funcname, int c_line,
+                               int py_line, const char *filename);
+
+/* BufferStructDeclare.proto */
+typedef struct {
+  Py_ssize_t shape, strides, suboffsets;
+} __Pyx_Buf_DimInfo;
+typedef struct {
+  size_t refcount;
+  Py_buffer pybuffer;
+} __Pyx_Buffer;
+typedef struct {
+  __Pyx_Buffer *rcbuffer;
+  char *data;
+  __Pyx_Buf_DimInfo diminfo[8];
+} __Pyx_LocalBuf_ND;
+
+#if PY_MAJOR_VERSION < 3
+    static int __Pyx_GetBuffer(PyObject *obj, Py_buffer *view, int flags);
+    static void __Pyx_ReleaseBuffer(Py_buffer *view);
+#else
+    #define __Pyx_GetBuffer PyObject_GetBuffer
+    #define __Pyx_ReleaseBuffer PyBuffer_Release
+#endif
+
+
+/* GCCDiagnostics.proto */
+#if defined(__GNUC__) && (__GNUC__ > 4 || (__GNUC__ == 4 && __GNUC_MINOR__ >= 6))
+#define __Pyx_HAS_GCC_DIAGNOSTIC
+#endif
+
+/* RealImag.proto */
+#if CYTHON_CCOMPLEX
+  #ifdef __cplusplus
+    #define __Pyx_CREAL(z) ((z).real())
+    #define __Pyx_CIMAG(z) ((z).imag())
+  #else
+    #define __Pyx_CREAL(z) (__real__(z))
+    #define __Pyx_CIMAG(z) (__imag__(z))
+  #endif
+#else
+    #define __Pyx_CREAL(z) ((z).real)
+    #define __Pyx_CIMAG(z) ((z).imag)
+#endif
+#if defined(__cplusplus) && CYTHON_CCOMPLEX\
+        && (defined(_WIN32) || defined(__clang__) || (defined(__GNUC__) && (__GNUC__ >= 5 || __GNUC__ == 4 && __GNUC_MINOR__ >= 4 )) || __cplusplus >= 201103)
+    #define __Pyx_SET_CREAL(z,x) ((z).real(x))
+    #define __Pyx_SET_CIMAG(z,y) ((z).imag(y))
+#else
+    #define __Pyx_SET_CREAL(z,x) __Pyx_CREAL(z) = (x)
+    #define __Pyx_SET_CIMAG(z,y) __Pyx_CIMAG(z) = (y)
+#endif
+
+/* Arithmetic.proto */
+#if CYTHON_CCOMPLEX
+    #define __Pyx_c_eq_float(a, b)   ((a)==(b))
+    #define __Pyx_c_sum_float(a, b)  ((a)+(b))
+    #define __Pyx_c_diff_float(a, b) ((a)-(b))
+    #define __Pyx_c_prod_float(a, b) ((a)*(b))
+    #define __Pyx_c_quot_float(a, b) ((a)/(b))
+    #define __Pyx_c_neg_float(a)     (-(a))
+  #ifdef __cplusplus
+    #define __Pyx_c_is_zero_float(z) ((z)==(float)0)
+    #define __Pyx_c_conj_float(z)    (::std::conj(z))
+    #if 1
+        #define __Pyx_c_abs_float(z)     (::std::abs(z))
+        #define __Pyx_c_pow_float(a, b)  (::std::pow(a, b))
+    #endif
+  #else
+    #define __Pyx_c_is_zero_float(z) ((z)==0)
+    #define __Pyx_c_conj_float(z)    (conjf(z))
+    #if 1
+        #define __Pyx_c_abs_float(z)     (cabsf(z))
+        #define __Pyx_c_pow_float(a, b)  (cpowf(a, b))
+    #endif
+ #endif
+#else
+    static CYTHON_INLINE int __Pyx_c_eq_float(__pyx_t_float_complex, __pyx_t_float_complex);
+    static CYTHON_INLINE __pyx_t_float_complex __Pyx_c_sum_float(__pyx_t_float_complex, __pyx_t_float_complex);
+    static CYTHON_INLINE __pyx_t_float_complex __Pyx_c_diff_float(__pyx_t_float_complex, __pyx_t_float_complex);
+    static CYTHON_INLINE __pyx_t_float_complex __Pyx_c_prod_float(__pyx_t_float_complex, __pyx_t_float_complex);
+    static CYTHON_INLINE __pyx_t_float_complex __Pyx_c_quot_float(__pyx_t_float_complex, __pyx_t_float_complex);
+    static CYTHON_INLINE __pyx_t_float_complex __Pyx_c_neg_float(__pyx_t_float_complex);
+    static CYTHON_INLINE int __Pyx_c_is_zero_float(__pyx_t_float_complex);
+    static CYTHON_INLINE __pyx_t_float_complex __Pyx_c_conj_float(__pyx_t_float_complex);
+    #if 1
+        static CYTHON_INLINE float __Pyx_c_abs_float(__pyx_t_float_complex);
+        static CYTHON_INLINE __pyx_t_float_complex __Pyx_c_pow_float(__pyx_t_float_complex, __pyx_t_float_complex);
+    #endif
+#endif
+
+/* Arithmetic.proto */
+#if CYTHON_CCOMPLEX
+    #define __Pyx_c_eq_double(a, b)   ((a)==(b))
+    #define __Pyx_c_sum_double(a, b)  ((a)+(b))
+    #define __Pyx_c_diff_double(a, b) ((a)-(b))
+    #define __Pyx_c_prod_double(a, b) ((a)*(b))
+    #define __Pyx_c_quot_double(a, b) ((a)/(b))
+    #define __Pyx_c_neg_double(a)     (-(a))
+  #ifdef __cplusplus
+    #define __Pyx_c_is_zero_double(z) ((z)==(double)0)
+    #define __Pyx_c_conj_double(z)    (::std::conj(z))
+    #if 1
+        #define __Pyx_c_abs_double(z)     (::std::abs(z))
+        #define __Pyx_c_pow_double(a, b)  (::std::pow(a, b))
+    #endif
+  #else
+    #define __Pyx_c_is_zero_double(z) ((z)==0)
+    #define __Pyx_c_conj_double(z)    (conj(z))
+    #if 1
+        #define __Pyx_c_abs_double(z)     (cabs(z))
+        #define __Pyx_c_pow_double(a, b)  (cpow(a, b))
+    #endif
+ #endif
+#else
+    static CYTHON_INLINE int __Pyx_c_eq_double(__pyx_t_double_complex, __pyx_t_double_complex);
+    static CYTHON_INLINE __pyx_t_double_complex __Pyx_c_sum_double(__pyx_t_double_complex, __pyx_t_double_complex);
+    static CYTHON_INLINE __pyx_t_double_complex __Pyx_c_diff_double(__pyx_t_double_complex, __pyx_t_double_complex);
+    static CYTHON_INLINE __pyx_t_double_complex __Pyx_c_prod_double(__pyx_t_double_complex, __pyx_t_double_complex);
+    static CYTHON_INLINE __pyx_t_double_complex __Pyx_c_quot_double(__pyx_t_double_complex, __pyx_t_double_complex);
+    static CYTHON_INLINE __pyx_t_double_complex __Pyx_c_neg_double(__pyx_t_double_complex);
+    static CYTHON_INLINE int __Pyx_c_is_zero_double(__pyx_t_double_complex);
+    static CYTHON_INLINE __pyx_t_double_complex __Pyx_c_conj_double(__pyx_t_double_complex);
+    #if 1
+        static CYTHON_INLINE double __Pyx_c_abs_double(__pyx_t_double_complex);
+        static CYTHON_INLINE __pyx_t_double_complex __Pyx_c_pow_double(__pyx_t_double_complex, __pyx_t_double_complex);
+    #endif
+#endif
+
+/* CIntFromPy.proto */
+static CYTHON_INLINE npy_long __Pyx_PyInt_As_npy_long(PyObject *);
+
+/* CIntToPy.proto */
+static CYTHON_INLINE PyObject* __Pyx_PyInt_From_int(int value);
+
+/* CIntFromPy.proto */
+static CYTHON_INLINE int __Pyx_PyInt_As_int(PyObject *);
+
+/* CIntToPy.proto */
+static CYTHON_INLINE PyObject* __Pyx_PyInt_From_long(long value);
+
+/* CIntToPy.proto */
+static CYTHON_INLINE PyObject* __Pyx_PyInt_From_npy_long(npy_long value);
+
+/* CIntFromPy.proto */
+static CYTHON_INLINE long __Pyx_PyInt_As_long(PyObject *);
+
+/* FastTypeChecks.proto */
+#if CYTHON_COMPILING_IN_CPYTHON
+#define __Pyx_TypeCheck(obj, type) __Pyx_IsSubtype(Py_TYPE(obj), (PyTypeObject *)type)
+static CYTHON_INLINE int __Pyx_IsSubtype(PyTypeObject *a, PyTypeObject *b);
+static CYTHON_INLINE int __Pyx_PyErr_GivenExceptionMatches(PyObject *err, PyObject *type);
+static CYTHON_INLINE int __Pyx_PyErr_GivenExceptionMatches2(PyObject *err, PyObject *type1, PyObject *type2);
+#else
+#define __Pyx_TypeCheck(obj, type) PyObject_TypeCheck(obj, (PyTypeObject *)type)
+#define __Pyx_PyErr_GivenExceptionMatches(err, type) PyErr_GivenExceptionMatches(err, type)
+#define __Pyx_PyErr_GivenExceptionMatches2(err, type1, type2) (PyErr_GivenExceptionMatches(err, type1) || PyErr_GivenExceptionMatches(err, type2))
+#endif
+#define __Pyx_PyException_Check(obj) __Pyx_TypeCheck(obj, PyExc_Exception)
+
+/* CheckBinaryVersion.proto */
+static int __Pyx_check_binary_version(void);
+
+/* InitStrings.proto */
+static int __Pyx_InitStrings(__Pyx_StringTabEntry *t);
+
+
+/* Module declarations from 'cpython.buffer' */
+
+/* Module declarations from 'libc.string' */
+
+/* Module declarations from 'libc.stdio' */
+
+/* Module declarations from '__builtin__' */
+
+/* Module declarations from 'cpython.type' */
+static PyTypeObject *__pyx_ptype_7cpython_4type_type = 0;
+
+/* Module declarations from 'cpython' */
+
+/* Module declarations from 'cpython.object' */
+
+/* Module declarations from 'cpython.ref' */
+
+/* Module declarations from 'cpython.mem' */
+
+/* Module declarations from 'numpy' */
+
+/* Module declarations from 'numpy' */
+static PyTypeObject *__pyx_ptype_5numpy_dtype = 0;
+static PyTypeObject *__pyx_ptype_5numpy_flatiter = 0;
+static PyTypeObject *__pyx_ptype_5numpy_broadcast = 0;
+static PyTypeObject *__pyx_ptype_5numpy_ndarray = 0;
+static PyTypeObject *__pyx_ptype_5numpy_ufunc = 0;
+
+/* Module declarations from 'cython' */
+
+/* Module declarations from 'libc.stdlib' */
+
+/* Module declarations from 'libc.math' */
+
+/* Module declarations from 'landlab.graph.cfuncs' */
+static int __pyx_f_7landlab_5graph_6cfuncs__compare(const void *, const void *); /*proto*/
+static void __pyx_f_7landlab_5graph_6cfuncs__argsort(double *, int, struct __pyx_t_7landlab_5graph_6cfuncs_Sorter *); /*proto*/
+static PyObject *__pyx_f_7landlab_5graph_6cfuncs_argsort(double *, int, int *); /*proto*/
+static PyObject *__pyx_f_7landlab_5graph_6cfuncs_calc_centroid(double *, __pyx_t_5numpy_int_t, double *); /*proto*/
+static PyObject *__pyx_f_7landlab_5graph_6cfuncs_calc_spoke_angles(double *, double *, __pyx_t_5numpy_int_t, double *); /*proto*/
+static PyObject *__pyx_f_7landlab_5graph_6cfuncs_argsort_by_angle_around_centroid(double *, __pyx_t_5numpy_int_t, int *); /*proto*/
+static PyObject *__pyx_f_7landlab_5graph_6cfuncs_sort_spokes_around_hub(int *, int, double *, double *); /*proto*/
+static __Pyx_TypeInfo __Pyx_TypeInfo_nn___pyx_t_7landlab_5graph_6cfuncs_DTYPE_t = { "DTYPE_t", NULL, sizeof(__pyx_t_7landlab_5graph_6cfuncs_DTYPE_t), { 0 }, 0, IS_UNSIGNED(__pyx_t_7landlab_5graph_6cfuncs_DTYPE_t) ? 'U' : 'I', IS_UNSIGNED(__pyx_t_7landlab_5graph_6cfuncs_DTYPE_t), 0 };
+static __Pyx_TypeInfo __Pyx_TypeInfo_nn___pyx_t_5numpy_float_t = { "float_t", NULL, sizeof(__pyx_t_5numpy_float_t), { 0 }, 0, 'R', 0, 0 };
+static __Pyx_TypeInfo __Pyx_TypeInfo_int = { "int", NULL, sizeof(int), { 0 }, 0, IS_UNSIGNED(int) ? 'U' : 'I', IS_UNSIGNED(int), 0 };
+static __Pyx_TypeInfo __Pyx_TypeInfo_double = { "double", NULL, sizeof(double), { 0 }, 0, 'R', 0, 0 };
+#define __Pyx_MODULE_NAME "landlab.graph.cfuncs"
+extern int __pyx_module_is_main_landlab__graph__cfuncs;
+int __pyx_module_is_main_landlab__graph__cfuncs = 0;
+
+/* Implementation of 'landlab.graph.cfuncs' */
+static PyObject *__pyx_builtin_range;
+static PyObject *__pyx_builtin_ImportError;
+static const char __pyx_k_i[] = "i";
+static const char __pyx_k_x[] = "x";
+static const char __pyx_k_y[] = "y";
+static const char __pyx_k_np[] = "np";
+static const char __pyx_k_pi[] = "pi";
+static const char __pyx_k_col[] = "col";
+static const char __pyx_k_hub[] = "hub";
+static const char __pyx_k_int[] = "int";
+static const char __pyx_k_out[] = "out";
+static const char __pyx_k_row[] = "row";
+static const char __pyx_k_cell[] = "cell";
+static const char __pyx_k_link[] = "link";
+static const char __pyx_k_main[] = "__main__";
+static const char __pyx_k_name[] = "__name__";
+static const char __pyx_k_node[] = "node";
+static const char __pyx_k_test[] = "__test__";
+static const char __pyx_k_DTYPE[] = "DTYPE";
+static const char __pyx_k_numpy[] = "numpy";
+static const char __pyx_k_patch[] = "patch";
+static const char __pyx_k_range[] = "range";
+static const char __pyx_k_shape[] = "shape";
+static const char __pyx_k_wheel[] = "wheel";
+static const char __pyx_k_angles[] = "angles";
+static const char __pyx_k_buffer[] = "buffer";
+static const char __pyx_k_import[] = "__import__";
+static const char __pyx_k_offset[] = "offset";
+static const char __pyx_k_points[] = "points";
+static const char __pyx_k_n_links[] = "n_links";
+static const char __pyx_k_n_nodes[] = "n_nodes";
+static const char __pyx_k_ordered[] = "ordered";
+static const char __pyx_k_n_points[] = "n_points";
+static const char __pyx_k_n_spokes[] = "n_spokes";
+static const char __pyx_k_n_wheels[] = "n_wheels";
+static const char __pyx_k_cell_cols[] = "cell_cols";
+static const char __pyx_k_cell_rows[] = "cell_rows";
+static const char __pyx_k_n_patches[] = "n_patches";
+static const char __pyx_k_new_links[] = "new_links";
+static const char __pyx_k_new_nodes[] = "new_nodes";
+static const char __pyx_k_node_cols[] = "node_cols";
+static const char __pyx_k_xy_of_hub[] = "xy_of_hub";
+static const char __pyx_k_new_offset[] = "new_offset";
+static const char __pyx_k_row_offset[] = "row_offset";
+static const char __pyx_k_xy_at_link[] = "xy_at_link";
+static const char __pyx_k_xy_of_link[] = "xy_of_link";
+static const char __pyx_k_ImportError[] = "ImportError";
+static const char __pyx_k_link_buffer[] = "link_buffer";
+static const char __pyx_k_new_patches[] = "new_patches";
+static const char __pyx_k_xy_at_patch[] = "xy_at_patch";
+static const char __pyx_k_xy_of_spoke[] = "xy_of_spoke";
+static const char __pyx_k_node_at_cell[] = "node_at_cell";
+static const char __pyx_k_sorted_links[] = "sorted_links";
+static const char __pyx_k_links_at_node[] = "links_at_node";
+static const char __pyx_k_n_links_found[] = "n_links_found";
+static const char __pyx_k_nodes_at_link[] = "nodes_at_link";
+static const char __pyx_k_links_at_patch[] = "links_at_patch";
+static const char __pyx_k_resort_patches[] = "_resort_patches";
+static const char __pyx_k_sorted_patches[] = "sorted_patches";
+static const char __pyx_k_offset_to_patch[] = "offset_to_patch";
+static const char __pyx_k_offset_to_wheel[] = "offset_to_wheel";
+static const char __pyx_k_spokes_at_wheel[] = "spokes_at_wheel";
+static const char __pyx_k_n_links_per_node[] = "n_links_per_node";
+static const char __pyx_k_link_dirs_at_node[] = "link_dirs_at_node";
+static const char __pyx_k_max_links_at_node[] = "max_links_at_node";
+static const char __pyx_k_cline_in_traceback[] = "cline_in_traceback";
+static const char __pyx_k_find_links_at_node[] = "_find_links_at_node";
+static const char __pyx_k_setup_node_at_cell[] = "_setup_node_at_cell";
+static const char __pyx_k_remap_nodes_at_link[] = "_remap_nodes_at_link";
+static const char __pyx_k_setup_links_at_node[] = "_setup_links_at_node";
+static const char __pyx_k_argsort_spoke_angles[] = "argsort_spoke_angles";
+static const char __pyx_k_calc_center_of_patch[] = "_calc_center_of_patch";
+static const char __pyx_k_landlab_graph_cfuncs[] = "landlab.graph.cfuncs";
+static const char __pyx_k_remap_links_at_patch[] = "_remap_links_at_patch";
+static const char __pyx_k_setup_links_at_patch[] = "_setup_links_at_patch";
+static const char __pyx_k_sort_spokes_at_wheel[] = "sort_spokes_at_wheel";
+static const char __pyx_k_reorder_links_at_node[] = "_reorder_links_at_node";
+static const char __pyx_k_reorder_links_at_patch[] = "reorder_links_at_patch";
+static const char __pyx_k_landlab_graph_cfuncs_pyx[] = "landlab/graph/cfuncs.pyx";
+static const char __pyx_k_numpy_core_multiarray_failed_to[] = "numpy.core.multiarray failed to import";
+static const char __pyx_k_numpy_core_umath_failed_to_impor[] = "numpy.core.umath failed to import";
+static PyObject *__pyx_n_s_DTYPE;
+static PyObject *__pyx_n_s_ImportError;
+static PyObject *__pyx_n_s_angles;
+static PyObject *__pyx_n_s_argsort_spoke_angles;
+static PyObject *__pyx_n_s_buffer;
+static PyObject *__pyx_n_s_calc_center_of_patch;
+static PyObject *__pyx_n_s_cell;
+static PyObject *__pyx_n_s_cell_cols;
+static PyObject *__pyx_n_s_cell_rows;
+static PyObject *__pyx_n_s_cline_in_traceback;
+static PyObject *__pyx_n_s_col;
+static PyObject *__pyx_n_s_find_links_at_node;
+static PyObject *__pyx_n_s_hub;
+static PyObject *__pyx_n_s_i;
+static PyObject *__pyx_n_s_import;
+static PyObject *__pyx_n_s_int;
+static PyObject *__pyx_n_s_landlab_graph_cfuncs;
+static PyObject *__pyx_kp_s_landlab_graph_cfuncs_pyx;
+static PyObject *__pyx_n_s_link;
+static PyObject *__pyx_n_s_link_buffer;
+static PyObject *__pyx_n_s_link_dirs_at_node;
+static PyObject *__pyx_n_s_links_at_node;
+static PyObject *__pyx_n_s_links_at_patch;
+static PyObject *__pyx_n_s_main;
+static PyObject *__pyx_n_s_max_links_at_node;
+static PyObject *__pyx_n_s_n_links;
+static PyObject *__pyx_n_s_n_links_found;
+static PyObject *__pyx_n_s_n_links_per_node;
+static PyObject *__pyx_n_s_n_nodes;
+static PyObject *__pyx_n_s_n_patches;
+static PyObject *__pyx_n_s_n_points;
+static PyObject *__pyx_n_s_n_spokes;
+static PyObject *__pyx_n_s_n_wheels;
+static PyObject *__pyx_n_s_name;
+static PyObject *__pyx_n_s_new_links;
+static PyObject *__pyx_n_s_new_nodes;
+static PyObject *__pyx_n_s_new_offset;
+static PyObject *__pyx_n_s_new_patches;
+static PyObject *__pyx_n_s_node;
+static PyObject *__pyx_n_s_node_at_cell;
+static PyObject *__pyx_n_s_node_cols;
+static PyObject *__pyx_n_s_nodes_at_link;
+static PyObject *__pyx_n_s_np;
+static PyObject *__pyx_n_s_numpy;
+static PyObject *__pyx_kp_s_numpy_core_multiarray_failed_to;
+static PyObject *__pyx_kp_s_numpy_core_umath_failed_to_impor;
+static PyObject *__pyx_n_s_offset;
+static PyObject *__pyx_n_s_offset_to_patch;
+static PyObject *__pyx_n_s_offset_to_wheel;
+static PyObject *__pyx_n_s_ordered;
+static PyObject *__pyx_n_s_out;
+static PyObject *__pyx_n_s_patch;
+static PyObject *__pyx_n_s_pi;
+static PyObject *__pyx_n_s_points;
+static PyObject *__pyx_n_s_range;
+static PyObject *__pyx_n_s_remap_links_at_patch;
+static PyObject *__pyx_n_s_remap_nodes_at_link;
+static PyObject *__pyx_n_s_reorder_links_at_node;
+static PyObject *__pyx_n_s_reorder_links_at_patch;
+static PyObject *__pyx_n_s_resort_patches;
+static PyObject *__pyx_n_s_row;
+static PyObject *__pyx_n_s_row_offset;
+static PyObject *__pyx_n_s_setup_links_at_node;
+static PyObject *__pyx_n_s_setup_links_at_patch;
+static PyObject *__pyx_n_s_setup_node_at_cell;
+static PyObject *__pyx_n_s_shape;
+static PyObject *__pyx_n_s_sort_spokes_at_wheel;
+static PyObject *__pyx_n_s_sorted_links;
+static PyObject *__pyx_n_s_sorted_patches;
+static PyObject *__pyx_n_s_spokes_at_wheel;
+static PyObject *__pyx_n_s_test;
+static PyObject *__pyx_n_s_wheel;
+static PyObject *__pyx_n_s_x;
+static PyObject *__pyx_n_s_xy_at_link;
+static PyObject *__pyx_n_s_xy_at_patch;
+static PyObject *__pyx_n_s_xy_of_hub;
+static PyObject *__pyx_n_s_xy_of_link;
+static PyObject *__pyx_n_s_xy_of_spoke;
+static PyObject *__pyx_n_s_y;
+static PyObject *__pyx_pf_7landlab_5graph_6cfuncs__find_links_at_node(CYTHON_UNUSED PyObject *__pyx_self, __pyx_t_7landlab_5graph_6cfuncs_DTYPE_t __pyx_v_node, PyArrayObject *__pyx_v_nodes_at_link, PyArrayObject *__pyx_v_links_at_node, PyArrayObject *__pyx_v_link_dirs_at_node); /* proto */
+static PyObject *__pyx_pf_7landlab_5graph_6cfuncs_2_setup_links_at_node(CYTHON_UNUSED PyObject *__pyx_self, PyArrayObject *__pyx_v_nodes_at_link, PyArrayObject *__pyx_v_links_at_node, PyArrayObject *__pyx_v_link_dirs_at_node); /* proto */
+static PyObject *__pyx_pf_7landlab_5graph_6cfuncs_4_setup_node_at_cell(CYTHON_UNUSED PyObject *__pyx_self, PyObject *__pyx_v_shape, PyArrayObject *__pyx_v_node_at_cell); /* proto */
+static PyObject *__pyx_pf_7landlab_5graph_6cfuncs_6_remap_nodes_at_link(CYTHON_UNUSED PyObject *__pyx_self, PyArrayObject *__pyx_v_nodes_at_link, PyArrayObject *__pyx_v_new_nodes); /* proto */
+static PyObject *__pyx_pf_7landlab_5graph_6cfuncs_8_remap_links_at_patch(CYTHON_UNUSED PyObject *__pyx_self, PyArrayObject *__pyx_v_links_at_patch, PyArrayObject *__pyx_v_new_links); /* proto */
+static PyObject *__pyx_pf_7landlab_5graph_6cfuncs_10_calc_center_of_patch(CYTHON_UNUSED PyObject *__pyx_self, PyArrayObject *__pyx_v_links_at_patch, PyArrayObject *__pyx_v_offset_to_patch, PyArrayObject *__pyx_v_xy_at_link, PyArrayObject *__pyx_v_xy_at_patch); /* proto */
+static PyObject *__pyx_pf_7landlab_5graph_6cfuncs_12_resort_patches(CYTHON_UNUSED PyObject *__pyx_self, PyArrayObject *__pyx_v_links_at_patch, PyArrayObject *__pyx_v_offset_to_patch, PyArrayObject *__pyx_v_sorted_patches); /* proto */
+static PyObject *__pyx_pf_7landlab_5graph_6cfuncs_14_setup_links_at_patch(CYTHON_UNUSED PyObject *__pyx_self, PyArrayObject *__pyx_v_links_at_patch, PyArrayObject *__pyx_v_offset_to_patch, PyArrayObject *__pyx_v_out); /* proto */
+static PyObject *__pyx_pf_7landlab_5graph_6cfuncs_16_reorder_links_at_node(CYTHON_UNUSED PyObject *__pyx_self, PyArrayObject *__pyx_v_links_at_node, PyArrayObject *__pyx_v_sorted_links); /* proto */
+static PyObject *__pyx_pf_7landlab_5graph_6cfuncs_18reorder_links_at_patch(CYTHON_UNUSED PyObject *__pyx_self, PyArrayObject *__pyx_v_links_at_patch, PyArrayObject *__pyx_v_offset_to_patch, PyArrayObject *__pyx_v_xy_of_link); /* proto */
+static PyObject *__pyx_pf_7landlab_5graph_6cfuncs_20sort_spokes_at_wheel(CYTHON_UNUSED PyObject *__pyx_self, PyArrayObject *__pyx_v_spokes_at_wheel, PyArrayObject *__pyx_v_offset_to_wheel, PyArrayObject *__pyx_v_xy_of_hub, PyArrayObject *__pyx_v_xy_of_spoke); /* proto */
+static PyObject *__pyx_pf_7landlab_5graph_6cfuncs_22argsort_spoke_angles(CYTHON_UNUSED PyObject *__pyx_self, PyArrayObject *__pyx_v_points, PyArrayObject *__pyx_v_hub, PyArrayObject *__pyx_v_out); /* proto */
+static PyObject *__pyx_float_2_;
+static PyObject *__pyx_int_1;
+static PyObject *__pyx_int_2;
+static PyObject *__pyx_tuple_;
+static PyObject *__pyx_tuple__2;
+static PyObject *__pyx_tuple__3;
+static PyObject *__pyx_tuple__5;
+static PyObject *__pyx_tuple__7;
+static PyObject *__pyx_tuple__9;
+static PyObject *__pyx_tuple__11;
+static PyObject *__pyx_tuple__13;
+static PyObject *__pyx_tuple__15;
+static PyObject *__pyx_tuple__17;
+static PyObject *__pyx_tuple__19;
+static PyObject *__pyx_tuple__21;
+static PyObject *__pyx_tuple__23;
+static PyObject *__pyx_tuple__25;
+static PyObject *__pyx_codeobj__4;
+static PyObject *__pyx_codeobj__6;
+static PyObject *__pyx_codeobj__8;
+static PyObject *__pyx_codeobj__10;
+static PyObject *__pyx_codeobj__12;
+static PyObject *__pyx_codeobj__14;
+static PyObject *__pyx_codeobj__16;
+static PyObject *__pyx_codeobj__18;
+static PyObject *__pyx_codeobj__20;
+static PyObject *__pyx_codeobj__22;
+static PyObject *__pyx_codeobj__24;
+static PyObject *__pyx_codeobj__26;
+/* Late includes */
+
+/* "landlab/graph/cfuncs.pyx":29
+ * 
+ * 
+ * cdef int _compare(const_void *a, const_void *b):             # <<<<<<<<<<<<<<
+ *     cdef double v = ((<Sorter*>a)).value - ((<Sorter*>b)).value
+ *     if v < 0:
+ */
+
+static int __pyx_f_7landlab_5graph_6cfuncs__compare(const void *__pyx_v_a, const void *__pyx_v_b) {
+  double __pyx_v_v;
+  int __pyx_r;
+  __Pyx_RefNannyDeclarations
+  int __pyx_t_1;
+  __Pyx_RefNannySetupContext("_compare", 0);
+
+  /* "landlab/graph/cfuncs.pyx":30
+ * 
+ * cdef int _compare(const_void *a, const_void *b):
+ *     cdef double v = ((<Sorter*>a)).value - ((<Sorter*>b)).value             # <<<<<<<<<<<<<<
+ *     if v < 0:
+ *         return -1
+ */
+  __pyx_v_v = (((struct __pyx_t_7landlab_5graph_6cfuncs_Sorter *)__pyx_v_a)->value - ((struct __pyx_t_7landlab_5graph_6cfuncs_Sorter *)__pyx_v_b)->value);
+
+  /* "landlab/graph/cfuncs.pyx":31
+ * cdef int _compare(const_void *a, const_void *b):
+ *     cdef double v = ((<Sorter*>a)).value - ((<Sorter*>b)).value
+ *     if v < 0:             # <<<<<<<<<<<<<<
+ *         return -1
+ *     else:
+ */
+  __pyx_t_1 = ((__pyx_v_v < 0.0) != 0);
+  if (__pyx_t_1) {
+
+    /* "landlab/graph/cfuncs.pyx":32
+ *     cdef double v = ((<Sorter*>a)).value - ((<Sorter*>b)).value
+ *     if v < 0:
+ *         return -1             # <<<<<<<<<<<<<<
+ *     else:
+ *         return 1
+ */
+    __pyx_r = -1;
+    goto __pyx_L0;
+
+    /* "landlab/graph/cfuncs.pyx":31
+ * cdef int _compare(const_void *a, const_void *b):
+ *     cdef double v = ((<Sorter*>a)).value - ((<Sorter*>b)).value
+ *     if v < 0:             # <<<<<<<<<<<<<<
+ *         return -1
+ *     else:
+ */
+  }
+
+  /* "landlab/graph/cfuncs.pyx":34
+ *         return -1
+ *     else:
+ *         return 1             # <<<<<<<<<<<<<<
+ * 
+ * 
+ */
+  /*else*/ {
+    __pyx_r = 1;
+    goto __pyx_L0;
+  }
+
+  /* "landlab/graph/cfuncs.pyx":29
+ * 
+ * 
+ * cdef int _compare(const_void *a, const_void *b):             # <<<<<<<<<<<<<<
+ *     cdef double v = ((<Sorter*>a)).value - ((<Sorter*>b)).value
+ *     if v < 0:
+ */
+
+  /* function exit code */
+  __pyx_L0:;
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+/* "landlab/graph/cfuncs.pyx":37
+ * 
+ * 
+ * cdef void _argsort(double * data, int n_elements, Sorter * order):             # <<<<<<<<<<<<<<
+ *     cdef int i
+ * 
+ */
+
+static void __pyx_f_7landlab_5graph_6cfuncs__argsort(double *__pyx_v_data, int __pyx_v_n_elements, struct __pyx_t_7landlab_5graph_6cfuncs_Sorter *__pyx_v_order) {
+  int __pyx_v_i;
+  __Pyx_RefNannyDeclarations
+  int __pyx_t_1;
+  int __pyx_t_2;
+  int __pyx_t_3;
+  __Pyx_RefNannySetupContext("_argsort", 0);
+
+  /* "landlab/graph/cfuncs.pyx":40
+ *     cdef int i
+ * 
+ *     for i in range(n_elements):             # <<<<<<<<<<<<<<
+ *         order[i].index = i
+ *         order[i].value = data[i]
+ */
+  __pyx_t_1 = __pyx_v_n_elements;
+  __pyx_t_2 = __pyx_t_1;
+  for (__pyx_t_3 = 0; __pyx_t_3 < __pyx_t_2; __pyx_t_3+=1) {
+    __pyx_v_i = __pyx_t_3;
+
+    /* "landlab/graph/cfuncs.pyx":41
+ * 
+ *     for i in range(n_elements):
+ *         order[i].index = i             # <<<<<<<<<<<<<<
+ *         order[i].value = data[i]
+ * 
+ */
+    (__pyx_v_order[__pyx_v_i]).index = __pyx_v_i;
+
+    /* "landlab/graph/cfuncs.pyx":42
+ *     for i in range(n_elements):
+ *         order[i].index = i
+ *         order[i].value = data[i]             # <<<<<<<<<<<<<<
+ * 
+ *     qsort(<void*> order, n_elements, sizeof(Sorter), _compare)
+ */
+    (__pyx_v_order[__pyx_v_i]).value = (__pyx_v_data[__pyx_v_i]);
+  }
+
+  /* "landlab/graph/cfuncs.pyx":44
+ *         order[i].value = data[i]
+ * 
+ *     qsort(<void*> order, n_elements, sizeof(Sorter), _compare)             # <<<<<<<<<<<<<<
+ * 
+ * 
+ */
+  qsort(((void *)__pyx_v_order), __pyx_v_n_elements, (sizeof(struct __pyx_t_7landlab_5graph_6cfuncs_Sorter)), __pyx_f_7landlab_5graph_6cfuncs__compare);
+
+  /* "landlab/graph/cfuncs.pyx":37
+ * 
+ * 
+ * cdef void _argsort(double * data, int n_elements, Sorter * order):             # <<<<<<<<<<<<<<
+ *     cdef int i
+ * 
+ */
+
+  /* function exit code */
+  __Pyx_RefNannyFinishContext();
+}
+
+/* "landlab/graph/cfuncs.pyx":47
+ * 
+ * 
+ * cdef argsort(double * data, int n_elements, int * out):             # <<<<<<<<<<<<<<
+ *     cdef Sorter *sorted_struct = <Sorter*>malloc(n_elements * sizeof(Sorter))
+ * 
+ */
+
+static PyObject *__pyx_f_7landlab_5graph_6cfuncs_argsort(double *__pyx_v_data, int __pyx_v_n_elements, int *__pyx_v_out) {
+  struct __pyx_t_7landlab_5graph_6cfuncs_Sorter *__pyx_v_sorted_struct;
+  int __pyx_v_i;
+  PyObject *__pyx_r = NULL;
+  __Pyx_RefNannyDeclarations
+  int __pyx_t_1;
+  int __pyx_t_2;
+  int __pyx_t_3;
+  __pyx_t_7landlab_5graph_6cfuncs_INT_t __pyx_t_4;
+  __Pyx_RefNannySetupContext("argsort", 0);
+
+  /* "landlab/graph/cfuncs.pyx":48
+ * 
+ * cdef argsort(double * data, int n_elements, int * out):
+ *     cdef Sorter *sorted_struct = <Sorter*>malloc(n_elements * sizeof(Sorter))             # <<<<<<<<<<<<<<
+ * 
+ *     try:
+ */
+  __pyx_v_sorted_struct = ((struct __pyx_t_7landlab_5graph_6cfuncs_Sorter *)malloc((__pyx_v_n_elements * (sizeof(struct __pyx_t_7landlab_5graph_6cfuncs_Sorter)))));
+
+  /* "landlab/graph/cfuncs.pyx":50
+ *     cdef Sorter *sorted_struct = <Sorter*>malloc(n_elements * sizeof(Sorter))
+ * 
+ *     try:             # <<<<<<<<<<<<<<
+ *         _argsort(data, n_elements, sorted_struct)
+ *         for i in range(n_elements):
+ */
+  /*try:*/ {
+
+    /* "landlab/graph/cfuncs.pyx":51
+ * 
+ *     try:
+ *         _argsort(data, n_elements, sorted_struct)             # <<<<<<<<<<<<<<
+ *         for i in range(n_elements):
+ *             out[i] = sorted_struct[i].index
+ */
+    __pyx_f_7landlab_5graph_6cfuncs__argsort(__pyx_v_data, __pyx_v_n_elements, __pyx_v_sorted_struct);
+
+    /* "landlab/graph/cfuncs.pyx":52
+ *     try:
+ *         _argsort(data, n_elements, sorted_struct)
+ *         for i in range(n_elements):             # <<<<<<<<<<<<<<
+ *             out[i] = sorted_struct[i].index
+ *     finally:
+ */
+    __pyx_t_1 = __pyx_v_n_elements;
+    __pyx_t_2 = __pyx_t_1;
+    for (__pyx_t_3 = 0; __pyx_t_3 < __pyx_t_2; __pyx_t_3+=1) {
+      __pyx_v_i = __pyx_t_3;
+
+      /* "landlab/graph/cfuncs.pyx":53
+ *         _argsort(data, n_elements, sorted_struct)
+ *         for i in range(n_elements):
+ *             out[i] = sorted_struct[i].index             # <<<<<<<<<<<<<<
+ *     finally:
+ *         free(sorted_struct)
+ */
+      __pyx_t_4 = (__pyx_v_sorted_struct[__pyx_v_i]).index;
+      (__pyx_v_out[__pyx_v_i]) = __pyx_t_4;
+    }
+  }
+
+  /* "landlab/graph/cfuncs.pyx":55
+ *             out[i] = sorted_struct[i].index
+ *     finally:
+ *         free(sorted_struct)             # <<<<<<<<<<<<<<
+ * 
+ * 
+ */
+  /*finally:*/ {
+    /*normal exit:*/{
+      free(__pyx_v_sorted_struct);
+      goto __pyx_L5;
+    }
+    __pyx_L5:;
+  }
+
+  /* "landlab/graph/cfuncs.pyx":47
+ * 
+ * 
+ * cdef argsort(double * data, int n_elements, int * out):             # <<<<<<<<<<<<<<
+ *     cdef Sorter *sorted_struct = <Sorter*>malloc(n_elements * sizeof(Sorter))
+ * 
+ */
+
+  /* function exit code */
+  __pyx_r = Py_None; __Pyx_INCREF(Py_None);
+  __Pyx_XGIVEREF(__pyx_r);
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+/* "landlab/graph/cfuncs.pyx":58
+ * 
+ * 
+ * cdef argsort_inplace(double * data, int n_elements, int * out):             # <<<<<<<<<<<<<<
+ *     cdef Sorter *sorted_struct = <Sorter*>malloc(n_elements * sizeof(Sorter))
+ * 
+ */
+
+static PyObject *__pyx_f_7landlab_5graph_6cfuncs_argsort_inplace(double *__pyx_v_data, int __pyx_v_n_elements, int *__pyx_v_out) {
+  struct __pyx_t_7landlab_5graph_6cfuncs_Sorter *__pyx_v_sorted_struct;
+  int __pyx_v_i;
+  PyObject *__pyx_r = NULL;
+  __Pyx_RefNannyDeclarations
+  int __pyx_t_1;
+  int __pyx_t_2;
+  int __pyx_t_3;
+  __pyx_t_7landlab_5graph_6cfuncs_INT_t __pyx_t_4;
+  __pyx_t_7landlab_5graph_6cfuncs_FLOAT_t __pyx_t_5;
+  __Pyx_RefNannySetupContext("argsort_inplace", 0);
+
+  /* "landlab/graph/cfuncs.pyx":59
+ * 
+ * cdef argsort_inplace(double * data, int n_elements, int * out):
+ *     cdef Sorter *sorted_struct = <Sorter*>malloc(n_elements * sizeof(Sorter))             # <<<<<<<<<<<<<<
+ * 
+ *     try:
+ */
+  __pyx_v_sorted_struct = ((struct __pyx_t_7landlab_5graph_6cfuncs_Sorter *)malloc((__pyx_v_n_elements * (sizeof(struct __pyx_t_7landlab_5graph_6cfuncs_Sorter)))));
+
+  /* "landlab/graph/cfuncs.pyx":61
+ *     cdef Sorter *sorted_struct = <Sorter*>malloc(n_elements * sizeof(Sorter))
+ * 
+ *     try:             # <<<<<<<<<<<<<<
+ *         _argsort(data, n_elements, sorted_struct)
+ *         for i in range(n_elements):
+ */
+  /*try:*/ {
+
+    /* "landlab/graph/cfuncs.pyx":62
+ * 
+ *     try:
+ *         _argsort(data, n_elements, sorted_struct)             # <<<<<<<<<<<<<<
+ *         for i in range(n_elements):
+ *             out[i] = sorted_struct[i].index
+ */
+    __pyx_f_7landlab_5graph_6cfuncs__argsort(__pyx_v_data, __pyx_v_n_elements, __pyx_v_sorted_struct);
+
+    /* "landlab/graph/cfuncs.pyx":63
+ *     try:
+ *         _argsort(data, n_elements, sorted_struct)
+ *         for i in range(n_elements):             # <<<<<<<<<<<<<<
+ *             out[i] = sorted_struct[i].index
+ *             data[i] = sorted_struct[i].value
+ */
+    __pyx_t_1 = __pyx_v_n_elements;
+    __pyx_t_2 = __pyx_t_1;
+    for (__pyx_t_3 = 0; __pyx_t_3 < __pyx_t_2; __pyx_t_3+=1) {
+      __pyx_v_i = __pyx_t_3;
+
+      /* "landlab/graph/cfuncs.pyx":64
+ *         _argsort(data, n_elements, sorted_struct)
+ *         for i in range(n_elements):
+ *             out[i] = sorted_struct[i].index             # <<<<<<<<<<<<<<
+ *             data[i] = sorted_struct[i].value
+ *     finally:
+ */
+      __pyx_t_4 = (__pyx_v_sorted_struct[__pyx_v_i]).index;
+      (__pyx_v_out[__pyx_v_i]) = __pyx_t_4;
+
+      /* "landlab/graph/cfuncs.pyx":65
+ *         for i in range(n_elements):
+ *             out[i] = sorted_struct[i].index
+ *             data[i] = sorted_struct[i].value             # <<<<<<<<<<<<<<
+ *     finally:
+ *         free(sorted_struct)
+ */
+      __pyx_t_5 = (__pyx_v_sorted_struct[__pyx_v_i]).value;
+      (__pyx_v_data[__pyx_v_i]) = __pyx_t_5;
+    }
+  }
+
+  /* "landlab/graph/cfuncs.pyx":67
+ *             data[i] = sorted_struct[i].value
+ *     finally:
+ *         free(sorted_struct)             # <<<<<<<<<<<<<<
+ * 
+ * 
+ */
+  /*finally:*/ {
+    /*normal exit:*/{
+      free(__pyx_v_sorted_struct);
+      goto __pyx_L5;
+    }
+    __pyx_L5:;
+  }
+
+  /* "landlab/graph/cfuncs.pyx":58
+ * 
+ * 
+ * cdef argsort_inplace(double * data, int n_elements, int * out):             # <<<<<<<<<<<<<<
+ *     cdef Sorter *sorted_struct = <Sorter*>malloc(n_elements * sizeof(Sorter))
+ * 
+ */
+
+  /* function exit code */
+  __pyx_r = Py_None; __Pyx_INCREF(Py_None);
+  __Pyx_XGIVEREF(__pyx_r);
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+/* "landlab/graph/cfuncs.pyx":71
+ * 
+ * @cython.boundscheck(False)
+ * def _find_links_at_node(DTYPE_t node,             # <<<<<<<<<<<<<<
+ *                         np.ndarray[DTYPE_t, ndim=2] nodes_at_link,
+ *                         np.ndarray[DTYPE_t, ndim=1] links_at_node,
+ */
+
+/* Python wrapper */
+static PyObject *__pyx_pw_7landlab_5graph_6cfuncs_1_find_links_at_node(PyObject *__pyx_self, PyObject *__pyx_args, PyObject *__pyx_kwds); /*proto*/
+static char __pyx_doc_7landlab_5graph_6cfuncs__find_links_at_node[] = "Find directions of links touching a node.\n\n  Parameters\n  ----------\n  node : int\n      A node ID.\n  nodes_at_link : ndarray of int, shape `(n_links, 2)`\n      Nodes at link tail and head.\n  links_at_node : ndarray of int, shape `(max_links_per_node, )`\n      Buffer to hold link IDs for links around node.\n  link_dirs_at_node : ndarray of int, shape `(max_links_per_node, )`\n      Buffer to hold link directions for links around node.\n\n  Returns\n  -------\n  int\n    The number of links found.\n  ";
+static PyMethodDef __pyx_mdef_7landlab_5graph_6cfuncs_1_find_links_at_node = {"_find_links_at_node", (PyCFunction)(void*)(PyCFunctionWithKeywords)__pyx_pw_7landlab_5graph_6cfuncs_1_find_links_at_node, METH_VARARGS|METH_KEYWORDS, __pyx_doc_7landlab_5graph_6cfuncs__find_links_at_node};
+static PyObject *__pyx_pw_7landlab_5graph_6cfuncs_1_find_links_at_node(PyObject *__pyx_self, PyObject *__pyx_args, PyObject *__pyx_kwds) {
+  __pyx_t_7landlab_5graph_6cfuncs_DTYPE_t __pyx_v_node;
+  PyArrayObject *__pyx_v_nodes_at_link = 0;
+  PyArrayObject *__pyx_v_links_at_node = 0;
+  PyArrayObject *__pyx_v_link_dirs_at_node = 0;
+  int __pyx_lineno = 0;
+  const char *__pyx_filename = NULL;
+  int __pyx_clineno = 0;
+  PyObject *__pyx_r = 0;
+  __Pyx_RefNannyDeclarations
+  __Pyx_RefNannySetupContext("_find_links_at_node (wrapper)", 0);
+  {
+    static PyObject **__pyx_pyargnames[] = {&__pyx_n_s_node,&__pyx_n_s_nodes_at_link,&__pyx_n_s_links_at_node,&__pyx_n_s_link_dirs_at_node,0};
+    PyObject* values[4] = {0,0,0,0};
+    if (unlikely(__pyx_kwds)) {
+      Py_ssize_t kw_args;
+      const Py_ssize_t pos_args = PyTuple_GET_SIZE(__pyx_args);
+      switch (pos_args) {
+        case  4: values[3] = PyTuple_GET_ITEM(__pyx_args, 3);
+        CYTHON_FALLTHROUGH;
+        case  3: values[2] = PyTuple_GET_ITEM(__pyx_args, 2);
+        CYTHON_FALLTHROUGH;
+        case  2: values[1] = PyTuple_GET_ITEM(__pyx_args, 1);
+        CYTHON_FALLTHROUGH;
+        case  1: values[0] = PyTuple_GET_ITEM(__pyx_args, 0);
+        CYTHON_FALLTHROUGH;
+        case  0: break;
+        default: goto __pyx_L5_argtuple_error;
+      }
+      kw_args = PyDict_Size(__pyx_kwds);
+      switch (pos_args) {
+        case  0:
+        if (likely((values[0] = __Pyx_PyDict_GetItemStr(__pyx_kwds, __pyx_n_s_node)) != 0)) kw_args--;
+        else goto __pyx_L5_argtuple_error;
+        CYTHON_FALLTHROUGH;
+        case  1:
+        if (likely((values[1] = __Pyx_PyDict_GetItemStr(__pyx_kwds, __pyx_n_s_nodes_at_link)) != 0)) kw_args--;
+        else {
+          __Pyx_RaiseArgtupleInvalid("_find_links_at_node", 1, 4, 4, 1); __PYX_ERR(0, 71, __pyx_L3_error)
+        }
+        CYTHON_FALLTHROUGH;
+        case  2:
+        if (likely((values[2] = __Pyx_PyDict_GetItemStr(__pyx_kwds, __pyx_n_s_links_at_node)) != 0)) kw_args--;
+        else {
+          __Pyx_RaiseArgtupleInvalid("_find_links_at_node", 1, 4, 4, 2); __PYX_ERR(0, 71, __pyx_L3_error)
+        }
+        CYTHON_FALLTHROUGH;
+        case  3:
+        if (likely((values[3] = __Pyx_PyDict_GetItemStr(__pyx_kwds, __pyx_n_s_link_dirs_at_node)) != 0)) kw_args--;
+        else {
+          __Pyx_RaiseArgtupleInvalid("_find_links_at_node", 1, 4, 4, 3); __PYX_ERR(0, 71, __pyx_L3_error)
+        }
+      }
+      if (unlikely(kw_args > 0)) {
+        if (unlikely(__Pyx_ParseOptionalKeywords(__pyx_kwds, __pyx_pyargnames, 0, values, pos_args, "_find_links_at_node") < 0)) __PYX_ERR(0, 71, __pyx_L3_error)
+      }
+    } else if (PyTuple_GET_SIZE(__pyx_args) != 4) {
+      goto __pyx_L5_argtuple_error;
+    } else {
+      values[0] = PyTuple_GET_ITEM(__pyx_args, 0);
+      values[1] = PyTuple_GET_ITEM(__pyx_args, 1);
+      values[2] = PyTuple_GET_ITEM(__pyx_args, 2);
+      values[3] = PyTuple_GET_ITEM(__pyx_args, 3);
+    }
+    __pyx_v_node = __Pyx_PyInt_As_npy_long(values[0]); if (unlikely((__pyx_v_node == ((npy_long)-1)) && PyErr_Occurred())) __PYX_ERR(0, 71, __pyx_L3_error)
+    __pyx_v_nodes_at_link = ((PyArrayObject *)values[1]);
+    __pyx_v_links_at_node = ((PyArrayObject *)values[2]);
+    __pyx_v_link_dirs_at_node = ((PyArrayObject *)values[3]);
+  }
+  goto __pyx_L4_argument_unpacking_done;
+  __pyx_L5_argtuple_error:;
+  __Pyx_RaiseArgtupleInvalid("_find_links_at_node", 1, 4, 4, PyTuple_GET_SIZE(__pyx_args)); __PYX_ERR(0, 71, __pyx_L3_error)
+  __pyx_L3_error:;
+  __Pyx_AddTraceback("landlab.graph.cfuncs._find_links_at_node", __pyx_clineno, __pyx_lineno, __pyx_filename);
+  __Pyx_RefNannyFinishContext();
+  return NULL;
+  __pyx_L4_argument_unpacking_done:;
+  if (unlikely(!__Pyx_ArgTypeTest(((PyObject *)__pyx_v_nodes_at_link), __pyx_ptype_5numpy_ndarray, 1, "nodes_at_link", 0))) __PYX_ERR(0, 72, __pyx_L1_error)
+  if (unlikely(!__Pyx_ArgTypeTest(((PyObject *)__pyx_v_links_at_node), __pyx_ptype_5numpy_ndarray, 1, "links_at_node", 0))) __PYX_ERR(0, 73, __pyx_L1_error)
+  if (unlikely(!__Pyx_ArgTypeTest(((PyObject *)__pyx_v_link_dirs_at_node), __pyx_ptype_5numpy_ndarray, 1, "link_dirs_at_node", 0))) __PYX_ERR(0, 74, __pyx_L1_error)
+  __pyx_r = __pyx_pf_7landlab_5graph_6cfuncs__find_links_at_node(__pyx_self, __pyx_v_node, __pyx_v_nodes_at_link, __pyx_v_links_at_node, __pyx_v_link_dirs_at_node);
+
+  /* function exit code */
+  goto __pyx_L0;
+  __pyx_L1_error:;
+  __pyx_r = NULL;
+  __pyx_L0:;
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+static PyObject *__pyx_pf_7landlab_5graph_6cfuncs__find_links_at_node(CYTHON_UNUSED PyObject *__pyx_self, __pyx_t_7landlab_5graph_6cfuncs_DTYPE_t __pyx_v_node, PyArrayObject *__pyx_v_nodes_at_link, PyArrayObject *__pyx_v_links_at_node, PyArrayObject *__pyx_v_link_dirs_at_node) {
+  int __pyx_v_link;
+  int __pyx_v_n_links_found;
+  int __pyx_v_max_links_at_node;
+  int __pyx_v_n_links;
+  __Pyx_LocalBuf_ND __pyx_pybuffernd_link_dirs_at_node;
+  __Pyx_Buffer __pyx_pybuffer_link_dirs_at_node;
+  __Pyx_LocalBuf_ND __pyx_pybuffernd_links_at_node;
+  __Pyx_Buffer __pyx_pybuffer_links_at_node;
+  __Pyx_LocalBuf_ND __pyx_pybuffernd_nodes_at_link;
+  __Pyx_Buffer __pyx_pybuffer_nodes_at_link;
+  PyObject *__pyx_r = NULL;
+  __Pyx_RefNannyDeclarations
+  int __pyx_t_1;
+  int __pyx_t_2;
+  Py_ssize_t __pyx_t_3;
+  Py_ssize_t __pyx_t_4;
+  PyObject *__pyx_t_5 = NULL;
+  int __pyx_lineno = 0;
+  const char *__pyx_filename = NULL;
+  int __pyx_clineno = 0;
+  __Pyx_RefNannySetupContext("_find_links_at_node", 0);
+  __pyx_pybuffer_nodes_at_link.pybuffer.buf = NULL;
+  __pyx_pybuffer_nodes_at_link.refcount = 0;
+  __pyx_pybuffernd_nodes_at_link.data = NULL;
+  __pyx_pybuffernd_nodes_at_link.rcbuffer = &__pyx_pybuffer_nodes_at_link;
+  __pyx_pybuffer_links_at_node.pybuffer.buf = NULL;
+  __pyx_pybuffer_links_at_node.refcount = 0;
+  __pyx_pybuffernd_links_at_node.data = NULL;
+  __pyx_pybuffernd_links_at_node.rcbuffer = &__pyx_pybuffer_links_at_node;
+  __pyx_pybuffer_link_dirs_at_node.pybuffer.buf = NULL;
+  __pyx_pybuffer_link_dirs_at_node.refcount = 0;
+  __pyx_pybuffernd_link_dirs_at_node.data = NULL;
+  __pyx_pybuffernd_link_dirs_at_node.rcbuffer = &__pyx_pybuffer_link_dirs_at_node;
+  {
+    __Pyx_BufFmt_StackElem __pyx_stack[1];
+    if (unlikely(__Pyx_GetBufferAndValidate(&__pyx_pybuffernd_nodes_at_link.rcbuffer->pybuffer, (PyObject*)__pyx_v_nodes_at_link, &__Pyx_TypeInfo_nn___pyx_t_7landlab_5graph_6cfuncs_DTYPE_t, PyBUF_FORMAT| PyBUF_STRIDES, 2, 0, __pyx_stack) == -1)) __PYX_ERR(0, 71, __pyx_L1_error)
+  }
+  __pyx_pybuffernd_nodes_at_link.diminfo[0].strides = __pyx_pybuffernd_nodes_at_link.rcbuffer->pybuffer.strides[0]; __pyx_pybuffernd_nodes_at_link.diminfo[0].shape = __pyx_pybuffernd_nodes_at_link.rcbuffer->pybuffer.shape[0]; __pyx_pybuffernd_nodes_at_link.diminfo[1].strides = __pyx_pybuffernd_nodes_at_link.rcbuffer->pybuffer.strides[1]; __pyx_pybuffernd_nodes_at_link.diminfo[1].shape = __pyx_pybuffernd_nodes_at_link.rcbuffer->pybuffer.shape[1];
+  {
+    __Pyx_BufFmt_StackElem __pyx_stack[1];
+    if (unlikely(__Pyx_GetBufferAndValidate(&__pyx_pybuffernd_links_at_node.rcbuffer->pybuffer, (PyObject*)__pyx_v_links_at_node, &__Pyx_TypeInfo_nn___pyx_t_7landlab_5graph_6cfuncs_DTYPE_t, PyBUF_FORMAT| PyBUF_STRIDES| PyBUF_WRITABLE, 1, 0, __pyx_stack) == -1)) __PYX_ERR(0, 71, __pyx_L1_error)
+  }
+  __pyx_pybuffernd_links_at_node.diminfo[0].strides = __pyx_pybuffernd_links_at_node.rcbuffer->pybuffer.strides[0]; __pyx_pybuffernd_links_at_node.diminfo[0].shape = __pyx_pybuffernd_links_at_node.rcbuffer->pybuffer.shape[0];
+  {
+    __Pyx_BufFmt_StackElem __pyx_stack[1];
+    if (unlikely(__Pyx_GetBufferAndValidate(&__pyx_pybuffernd_link_dirs_at_node.rcbuffer->pybuffer, (PyObject*)__pyx_v_link_dirs_at_node, &__Pyx_TypeInfo_nn___pyx_t_7landlab_5graph_6cfuncs_DTYPE_t, PyBUF_FORMAT| PyBUF_STRIDES| PyBUF_WRITABLE, 1, 0, __pyx_stack) == -1)) __PYX_ERR(0, 71, __pyx_L1_error)
+  }
+  __pyx_pybuffernd_link_dirs_at_node.diminfo[0].strides = __pyx_pybuffernd_link_dirs_at_node.rcbuffer->pybuffer.strides[0]; __pyx_pybuffernd_link_dirs_at_node.diminfo[0].shape = __pyx_pybuffernd_link_dirs_at_node.rcbuffer->pybuffer.shape[0];
+
+  /* "landlab/graph/cfuncs.pyx":93
+ *     The number of links found.
+ *   """
+ *   cdef int link = 0             # <<<<<<<<<<<<<<
+ *   cdef int n_links_found = 0
+ *   cdef int max_links_at_node = links_at_node.shape[0]
+ */
+  __pyx_v_link = 0;
+
+  /* "landlab/graph/cfuncs.pyx":94
+ *   """
+ *   cdef int link = 0
+ *   cdef int n_links_found = 0             # <<<<<<<<<<<<<<
+ *   cdef int max_links_at_node = links_at_node.shape[0]
+ *   cdef int n_links = nodes_at_link.shape[0]
+ */
+  __pyx_v_n_links_found = 0;
+
+  /* "landlab/graph/cfuncs.pyx":95
+ *   cdef int link = 0
+ *   cdef int n_links_found = 0
+ *   cdef int max_links_at_node = links_at_node.shape[0]             # <<<<<<<<<<<<<<
+ *   cdef int n_links = nodes_at_link.shape[0]
+ * 
+ */
+  __pyx_v_max_links_at_node = (__pyx_v_links_at_node->dimensions[0]);
+
+  /* "landlab/graph/cfuncs.pyx":96
+ *   cdef int n_links_found = 0
+ *   cdef int max_links_at_node = links_at_node.shape[0]
+ *   cdef int n_links = nodes_at_link.shape[0]             # <<<<<<<<<<<<<<
+ * 
+ *   while n_links_found < max_links_at_node and link < n_links:
+ */
+  __pyx_v_n_links = (__pyx_v_nodes_at_link->dimensions[0]);
+
+  /* "landlab/graph/cfuncs.pyx":98
+ *   cdef int n_links = nodes_at_link.shape[0]
+ * 
+ *   while n_links_found < max_links_at_node and link < n_links:             # <<<<<<<<<<<<<<
+ *     if nodes_at_link[link, 0] == node:
+ *       links_at_node[n_links_found] = link
+ */
+  while (1) {
+    __pyx_t_2 = ((__pyx_v_n_links_found < __pyx_v_max_links_at_node) != 0);
+    if (__pyx_t_2) {
+    } else {
+      __pyx_t_1 = __pyx_t_2;
+      goto __pyx_L5_bool_binop_done;
+    }
+    __pyx_t_2 = ((__pyx_v_link < __pyx_v_n_links) != 0);
+    __pyx_t_1 = __pyx_t_2;
+    __pyx_L5_bool_binop_done:;
+    if (!__pyx_t_1) break;
+
+    /* "landlab/graph/cfuncs.pyx":99
+ * 
+ *   while n_links_found < max_links_at_node and link < n_links:
+ *     if nodes_at_link[link, 0] == node:             # <<<<<<<<<<<<<<
+ *       links_at_node[n_links_found] = link
+ *       link_dirs_at_node[n_links_found] = -1
+ */
+    __pyx_t_3 = __pyx_v_link;
+    __pyx_t_4 = 0;
+    if (__pyx_t_3 < 0) __pyx_t_3 += __pyx_pybuffernd_nodes_at_link.diminfo[0].shape;
+    if (__pyx_t_4 < 0) __pyx_t_4 += __pyx_pybuffernd_nodes_at_link.diminfo[1].shape;
+    __pyx_t_1 = (((*__Pyx_BufPtrStrided2d(__pyx_t_7landlab_5graph_6cfuncs_DTYPE_t *, __pyx_pybuffernd_nodes_at_link.rcbuffer->pybuffer.buf, __pyx_t_3, __pyx_pybuffernd_nodes_at_link.diminfo[0].strides, __pyx_t_4, __pyx_pybuffernd_nodes_at_link.diminfo[1].strides)) == __pyx_v_node) != 0);
+    if (__pyx_t_1) {
+
+      /* "landlab/graph/cfuncs.pyx":100
+ *   while n_links_found < max_links_at_node and link < n_links:
+ *     if nodes_at_link[link, 0] == node:
+ *       links_at_node[n_links_found] = link             # <<<<<<<<<<<<<<
+ *       link_dirs_at_node[n_links_found] = -1
+ *       n_links_found += 1
+ */
+      __pyx_t_4 = __pyx_v_n_links_found;
+      if (__pyx_t_4 < 0) __pyx_t_4 += __pyx_pybuffernd_links_at_node.diminfo[0].shape;
+      *__Pyx_BufPtrStrided1d(__pyx_t_7landlab_5graph_6cfuncs_DTYPE_t *, __pyx_pybuffernd_links_at_node.rcbuffer->pybuffer.buf, __pyx_t_4, __pyx_pybuffernd_links_at_node.diminfo[0].strides) = __pyx_v_link;
+
+      /* "landlab/graph/cfuncs.pyx":101
+ *     if nodes_at_link[link, 0] == node:
+ *       links_at_node[n_links_found] = link
+ *       link_dirs_at_node[n_links_found] = -1             # <<<<<<<<<<<<<<
+ *       n_links_found += 1
+ *     elif nodes_at_link[link, 1] == node:
+ */
+      __pyx_t_4 = __pyx_v_n_links_found;
+      if (__pyx_t_4 < 0) __pyx_t_4 += __pyx_pybuffernd_link_dirs_at_node.diminfo[0].shape;
+      *__Pyx_BufPtrStrided1d(__pyx_t_7landlab_5graph_6cfuncs_DTYPE_t *, __pyx_pybuffernd_link_dirs_at_node.rcbuffer->pybuffer.buf, __pyx_t_4, __pyx_pybuffernd_link_dirs_at_node.diminfo[0].strides) = -1L;
+
+      /* "landlab/graph/cfuncs.pyx":102
+ *       links_at_node[n_links_found] = link
+ *       link_dirs_at_node[n_links_found] = -1
+ *       n_links_found += 1             # <<<<<<<<<<<<<<
+ *     elif nodes_at_link[link, 1] == node:
+ *       links_at_node[n_links_found] = link
+ */
+      __pyx_v_n_links_found = (__pyx_v_n_links_found + 1);
+
+      /* "landlab/graph/cfuncs.pyx":99
+ * 
+ *   while n_links_found < max_links_at_node and link < n_links:
+ *     if nodes_at_link[link, 0] == node:             # <<<<<<<<<<<<<<
+ *       links_at_node[n_links_found] = link
+ *       link_dirs_at_node[n_links_found] = -1
+ */
+      goto __pyx_L7;
+    }
+
+    /* "landlab/graph/cfuncs.pyx":103
+ *       link_dirs_at_node[n_links_found] = -1
+ *       n_links_found += 1
+ *     elif nodes_at_link[link, 1] == node:             # <<<<<<<<<<<<<<
+ *       links_at_node[n_links_found] = link
+ *       link_dirs_at_node[n_links_found] = 1
+ */
+    __pyx_t_4 = __pyx_v_link;
+    __pyx_t_3 = 1;
+    if (__pyx_t_4 < 0) __pyx_t_4 += __pyx_pybuffernd_nodes_at_link.diminfo[0].shape;
+    if (__pyx_t_3 < 0) __pyx_t_3 += __pyx_pybuffernd_nodes_at_link.diminfo[1].shape;
+    __pyx_t_1 = (((*__Pyx_BufPtrStrided2d(__pyx_t_7landlab_5graph_6cfuncs_DTYPE_t *, __pyx_pybuffernd_nodes_at_link.rcbuffer->pybuffer.buf, __pyx_t_4, __pyx_pybuffernd_nodes_at_link.diminfo[0].strides, __pyx_t_3, __pyx_pybuffernd_nodes_at_link.diminfo[1].strides)) == __pyx_v_node) != 0);
+    if (__pyx_t_1) {
+
+      /* "landlab/graph/cfuncs.pyx":104
+ *       n_links_found += 1
+ *     elif nodes_at_link[link, 1] == node:
+ *       links_at_node[n_links_found] = link             # <<<<<<<<<<<<<<
+ *       link_dirs_at_node[n_links_found] = 1
+ *       n_links_found += 1
+ */
+      __pyx_t_3 = __pyx_v_n_links_found;
+      if (__pyx_t_3 < 0) __pyx_t_3 += __pyx_pybuffernd_links_at_node.diminfo[0].shape;
+      *__Pyx_BufPtrStrided1d(__pyx_t_7landlab_5graph_6cfuncs_DTYPE_t *, __pyx_pybuffernd_links_at_node.rcbuffer->pybuffer.buf, __pyx_t_3, __pyx_pybuffernd_links_at_node.diminfo[0].strides) = __pyx_v_link;
+
+      /* "landlab/graph/cfuncs.pyx":105
+ *     elif nodes_at_link[link, 1] == node:
+ *       links_at_node[n_links_found] = link
+ *       link_dirs_at_node[n_links_found] = 1             # <<<<<<<<<<<<<<
+ *       n_links_found += 1
+ * 
+ */
+      __pyx_t_3 = __pyx_v_n_links_found;
+      if (__pyx_t_3 < 0) __pyx_t_3 += __pyx_pybuffernd_link_dirs_at_node.diminfo[0].shape;
+      *__Pyx_BufPtrStrided1d(__pyx_t_7landlab_5graph_6cfuncs_DTYPE_t *, __pyx_pybuffernd_link_dirs_at_node.rcbuffer->pybuffer.buf, __pyx_t_3, __pyx_pybuffernd_link_dirs_at_node.diminfo[0].strides) = 1;
+
+      /* "landlab/graph/cfuncs.pyx":106
+ *       links_at_node[n_links_found] = link
+ *       link_dirs_at_node[n_links_found] = 1
+ *       n_links_found += 1             # <<<<<<<<<<<<<<
+ * 
+ *     link += 1
+ */
+      __pyx_v_n_links_found = (__pyx_v_n_links_found + 1);
+
+      /* "landlab/graph/cfuncs.pyx":103
+ *       link_dirs_at_node[n_links_found] = -1
+ *       n_links_found += 1
+ *     elif nodes_at_link[link, 1] == node:             # <<<<<<<<<<<<<<
+ *       links_at_node[n_links_found] = link
+ *       link_dirs_at_node[n_links_found] = 1
+ */
+    }
+    __pyx_L7:;
+
+    /* "landlab/graph/cfuncs.pyx":108
+ *       n_links_found += 1
+ * 
+ *     link += 1             # <<<<<<<<<<<<<<
+ * 
+ *   return n_links_found
+ */
+    __pyx_v_link = (__pyx_v_link + 1);
+  }
+
+  /* "landlab/graph/cfuncs.pyx":110
+ *     link += 1
+ * 
+ *   return n_links_found             # <<<<<<<<<<<<<<
+ * 
+ * 
+ */
+  __Pyx_XDECREF(__pyx_r);
+  __pyx_t_5 = __Pyx_PyInt_From_int(__pyx_v_n_links_found); if (unlikely(!__pyx_t_5)) __PYX_ERR(0, 110, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_5);
+  __pyx_r = __pyx_t_5;
+  __pyx_t_5 = 0;
+  goto __pyx_L0;
+
+  /* "landlab/graph/cfuncs.pyx":71
+ * 
+ * @cython.boundscheck(False)
+ * def _find_links_at_node(DTYPE_t node,             # <<<<<<<<<<<<<<
+ *                         np.ndarray[DTYPE_t, ndim=2] nodes_at_link,
+ *                         np.ndarray[DTYPE_t, ndim=1] links_at_node,
+ */
+
+  /* function exit code */
+  __pyx_L1_error:;
+  __Pyx_XDECREF(__pyx_t_5);
+  { PyObject *__pyx_type, *__pyx_value, *__pyx_tb;
+    __Pyx_PyThreadState_declare
+    __Pyx_PyThreadState_assign
+    __Pyx_ErrFetch(&__pyx_type, &__pyx_value, &__pyx_tb);
+    __Pyx_SafeReleaseBuffer(&__pyx_pybuffernd_link_dirs_at_node.rcbuffer->pybuffer);
+    __Pyx_SafeReleaseBuffer(&__pyx_pybuffernd_links_at_node.rcbuffer->pybuffer);
+    __Pyx_SafeReleaseBuffer(&__pyx_pybuffernd_nodes_at_link.rcbuffer->pybuffer);
+  __Pyx_ErrRestore(__pyx_type, __pyx_value, __pyx_tb);}
+  __Pyx_AddTraceback("landlab.graph.cfuncs._find_links_at_node", __pyx_clineno, __pyx_lineno, __pyx_filename);
+  __pyx_r = NULL;
+  goto __pyx_L2;
+  __pyx_L0:;
+  __Pyx_SafeReleaseBuffer(&__pyx_pybuffernd_link_dirs_at_node.rcbuffer->pybuffer);
+  __Pyx_SafeReleaseBuffer(&__pyx_pybuffernd_links_at_node.rcbuffer->pybuffer);
+  __Pyx_SafeReleaseBuffer(&__pyx_pybuffernd_nodes_at_link.rcbuffer->pybuffer);
+  __pyx_L2:;
+  __Pyx_XGIVEREF(__pyx_r);
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+/* "landlab/graph/cfuncs.pyx":114
+ * 
+ * @cython.boundscheck(False)
+ * def _setup_links_at_node(np.ndarray[DTYPE_t, ndim=2] nodes_at_link,             # <<<<<<<<<<<<<<
+ *                          np.ndarray[DTYPE_t, ndim=2] links_at_node,
+ *                          np.ndarray[DTYPE_t, ndim=2] link_dirs_at_node):
+ */
+
+/* Python wrapper */
+static PyObject *__pyx_pw_7landlab_5graph_6cfuncs_3_setup_links_at_node(PyObject *__pyx_self, PyObject *__pyx_args, PyObject *__pyx_kwds); /*proto*/
+static PyMethodDef __pyx_mdef_7landlab_5graph_6cfuncs_3_setup_links_at_node = {"_setup_links_at_node", (PyCFunction)(void*)(PyCFunctionWithKeywords)__pyx_pw_7landlab_5graph_6cfuncs_3_setup_links_at_node, METH_VARARGS|METH_KEYWORDS, 0};
+static PyObject *__pyx_pw_7landlab_5graph_6cfuncs_3_setup_links_at_node(PyObject *__pyx_self, PyObject *__pyx_args, PyObject *__pyx_kwds) {
+  PyArrayObject *__pyx_v_nodes_at_link = 0;
+  PyArrayObject *__pyx_v_links_at_node = 0;
+  PyArrayObject *__pyx_v_link_dirs_at_node = 0;
+  int __pyx_lineno = 0;
+  const char *__pyx_filename = NULL;
+  int __pyx_clineno = 0;
+  PyObject *__pyx_r = 0;
+  __Pyx_RefNannyDeclarations
+  __Pyx_RefNannySetupContext("_setup_links_at_node (wrapper)", 0);
+  {
+    static PyObject **__pyx_pyargnames[] = {&__pyx_n_s_nodes_at_link,&__pyx_n_s_links_at_node,&__pyx_n_s_link_dirs_at_node,0};
+    PyObject* values[3] = {0,0,0};
+    if (unlikely(__pyx_kwds)) {
+      Py_ssize_t kw_args;
+      const Py_ssize_t pos_args = PyTuple_GET_SIZE(__pyx_args);
+      switch (pos_args) {
+        case  3: values[2] = PyTuple_GET_ITEM(__pyx_args, 2);
+        CYTHON_FALLTHROUGH;
+        case  2: values[1] = PyTuple_GET_ITEM(__pyx_args, 1);
+        CYTHON_FALLTHROUGH;
+        case  1: values[0] = PyTuple_GET_ITEM(__pyx_args, 0);
+        CYTHON_FALLTHROUGH;
+        case  0: break;
+        default: goto __pyx_L5_argtuple_error;
+      }
+      kw_args = PyDict_Size(__pyx_kwds);
+      switch (pos_args) {
+        case  0:
+        if (likely((values[0] = __Pyx_PyDict_GetItemStr(__pyx_kwds, __pyx_n_s_nodes_at_link)) != 0)) kw_args--;
+        else goto __pyx_L5_argtuple_error;
+        CYTHON_FALLTHROUGH;
+        case  1:
+        if (likely((values[1] = __Pyx_PyDict_GetItemStr(__pyx_kwds, __pyx_n_s_links_at_node)) != 0)) kw_args--;
+        else {
+          __Pyx_RaiseArgtupleInvalid("_setup_links_at_node", 1, 3, 3, 1); __PYX_ERR(0, 114, __pyx_L3_error)
+        }
+        CYTHON_FALLTHROUGH;
+        case  2:
+        if (likely((values[2] = __Pyx_PyDict_GetItemStr(__pyx_kwds, __pyx_n_s_link_dirs_at_node)) != 0)) kw_args--;
+        else {
+          __Pyx_RaiseArgtupleInvalid("_setup_links_at_node", 1, 3, 3, 2); __PYX_ERR(0, 114, __pyx_L3_error)
+        }
+      }
+      if (unlikely(kw_args > 0)) {
+        if (unlikely(__Pyx_ParseOptionalKeywords(__pyx_kwds, __pyx_pyargnames, 0, values, pos_args, "_setup_links_at_node") < 0)) __PYX_ERR(0, 114, __pyx_L3_error)
+      }
+    } else if (PyTuple_GET_SIZE(__pyx_args) != 3) {
+      goto __pyx_L5_argtuple_error;
+    } else {
+      values[0] = PyTuple_GET_ITEM(__pyx_args, 0);
+      values[1] = PyTuple_GET_ITEM(__pyx_args, 1);
+      values[2] = PyTuple_GET_ITEM(__pyx_args, 2);
+    }
+    __pyx_v_nodes_at_link = ((PyArrayObject *)values[0]);
+    __pyx_v_links_at_node = ((PyArrayObject *)values[1]);
+    __pyx_v_link_dirs_at_node = ((PyArrayObject *)values[2]);
+  }
+  goto __pyx_L4_argument_unpacking_done;
+  __pyx_L5_argtuple_error:;
+  __Pyx_RaiseArgtupleInvalid("_setup_links_at_node", 1, 3, 3, PyTuple_GET_SIZE(__pyx_args)); __PYX_ERR(0, 114, __pyx_L3_error)
+  __pyx_L3_error:;
+  __Pyx_AddTraceback("landlab.graph.cfuncs._setup_links_at_node", __pyx_clineno, __pyx_lineno, __pyx_filename);
+  __Pyx_RefNannyFinishContext();
+  return NULL;
+  __pyx_L4_argument_unpacking_done:;
+  if (unlikely(!__Pyx_ArgTypeTest(((PyObject *)__pyx_v_nodes_at_link), __pyx_ptype_5numpy_ndarray, 1, "nodes_at_link", 0))) __PYX_ERR(0, 114, __pyx_L1_error)
+  if (unlikely(!__Pyx_ArgTypeTest(((PyObject *)__pyx_v_links_at_node), __pyx_ptype_5numpy_ndarray, 1, "links_at_node", 0))) __PYX_ERR(0, 115, __pyx_L1_error)
+  if (unlikely(!__Pyx_ArgTypeTest(((PyObject *)__pyx_v_link_dirs_at_node), __pyx_ptype_5numpy_ndarray, 1, "link_dirs_at_node", 0))) __PYX_ERR(0, 116, __pyx_L1_error)
+  __pyx_r = __pyx_pf_7landlab_5graph_6cfuncs_2_setup_links_at_node(__pyx_self, __pyx_v_nodes_at_link, __pyx_v_links_at_node, __pyx_v_link_dirs_at_node);
+
+  /* function exit code */
+  goto __pyx_L0;
+  __pyx_L1_error:;
+  __pyx_r = NULL;
+  __pyx_L0:;
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+static PyObject *__pyx_pf_7landlab_5graph_6cfuncs_2_setup_links_at_node(CYTHON_UNUSED PyObject *__pyx_self, PyArrayObject *__pyx_v_nodes_at_link, PyArrayObject *__pyx_v_links_at_node, PyArrayObject *__pyx_v_link_dirs_at_node) {
+  int __pyx_v_node;
+  int __pyx_v_n_nodes;
+  __Pyx_LocalBuf_ND __pyx_pybuffernd_link_dirs_at_node;
+  __Pyx_Buffer __pyx_pybuffer_link_dirs_at_node;
+  __Pyx_LocalBuf_ND __pyx_pybuffernd_links_at_node;
+  __Pyx_Buffer __pyx_pybuffer_links_at_node;
+  __Pyx_LocalBuf_ND __pyx_pybuffernd_nodes_at_link;
+  __Pyx_Buffer __pyx_pybuffer_nodes_at_link;
+  PyObject *__pyx_r = NULL;
+  __Pyx_RefNannyDeclarations
+  int __pyx_t_1;
+  int __pyx_t_2;
+  int __pyx_t_3;
+  PyObject *__pyx_t_4 = NULL;
+  PyObject *__pyx_t_5 = NULL;
+  PyObject *__pyx_t_6 = NULL;
+  PyObject *__pyx_t_7 = NULL;
+  PyObject *__pyx_t_8 = NULL;
+  PyObject *__pyx_t_9 = NULL;
+  int __pyx_t_10;
+  PyObject *__pyx_t_11 = NULL;
+  int __pyx_lineno = 0;
+  const char *__pyx_filename = NULL;
+  int __pyx_clineno = 0;
+  __Pyx_RefNannySetupContext("_setup_links_at_node", 0);
+  __pyx_pybuffer_nodes_at_link.pybuffer.buf = NULL;
+  __pyx_pybuffer_nodes_at_link.refcount = 0;
+  __pyx_pybuffernd_nodes_at_link.data = NULL;
+  __pyx_pybuffernd_nodes_at_link.rcbuffer = &__pyx_pybuffer_nodes_at_link;
+  __pyx_pybuffer_links_at_node.pybuffer.buf = NULL;
+  __pyx_pybuffer_links_at_node.refcount = 0;
+  __pyx_pybuffernd_links_at_node.data = NULL;
+  __pyx_pybuffernd_links_at_node.rcbuffer = &__pyx_pybuffer_links_at_node;
+  __pyx_pybuffer_link_dirs_at_node.pybuffer.buf = NULL;
+  __pyx_pybuffer_link_dirs_at_node.refcount = 0;
+  __pyx_pybuffernd_link_dirs_at_node.data = NULL;
+  __pyx_pybuffernd_link_dirs_at_node.rcbuffer = &__pyx_pybuffer_link_dirs_at_node;
+  {
+    __Pyx_BufFmt_StackElem __pyx_stack[1];
+    if (unlikely(__Pyx_GetBufferAndValidate(&__pyx_pybuffernd_nodes_at_link.rcbuffer->pybuffer, (PyObject*)__pyx_v_nodes_at_link, &__Pyx_TypeInfo_nn___pyx_t_7landlab_5graph_6cfuncs_DTYPE_t, PyBUF_FORMAT| PyBUF_STRIDES, 2, 0, __pyx_stack) == -1)) __PYX_ERR(0, 114, __pyx_L1_error)
+  }
+  __pyx_pybuffernd_nodes_at_link.diminfo[0].strides = __pyx_pybuffernd_nodes_at_link.rcbuffer->pybuffer.strides[0]; __pyx_pybuffernd_nodes_at_link.diminfo[0].shape = __pyx_pybuffernd_nodes_at_link.rcbuffer->pybuffer.shape[0]; __pyx_pybuffernd_nodes_at_link.diminfo[1].strides = __pyx_pybuffernd_nodes_at_link.rcbuffer->pybuffer.strides[1]; __pyx_pybuffernd_nodes_at_link.diminfo[1].shape = __pyx_pybuffernd_nodes_at_link.rcbuffer->pybuffer.shape[1];
+  {
+    __Pyx_BufFmt_StackElem __pyx_stack[1];
+    if (unlikely(__Pyx_GetBufferAndValidate(&__pyx_pybuffernd_links_at_node.rcbuffer->pybuffer, (PyObject*)__pyx_v_links_at_node, &__Pyx_TypeInfo_nn___pyx_t_7landlab_5graph_6cfuncs_DTYPE_t, PyBUF_FORMAT| PyBUF_STRIDES, 2, 0, __pyx_stack) == -1)) __PYX_ERR(0, 114, __pyx_L1_error)
+  }
+  __pyx_pybuffernd_links_at_node.diminfo[0].strides = __pyx_pybuffernd_links_at_node.rcbuffer->pybuffer.strides[0]; __pyx_pybuffernd_links_at_node.diminfo[0].shape = __pyx_pybuffernd_links_at_node.rcbuffer->pybuffer.shape[0]; __pyx_pybuffernd_links_at_node.diminfo[1].strides = __pyx_pybuffernd_links_at_node.rcbuffer->pybuffer.strides[1]; __pyx_pybuffernd_links_at_node.diminfo[1].shape = __pyx_pybuffernd_links_at_node.rcbuffer->pybuffer.shape[1];
+  {
+    __Pyx_BufFmt_StackElem __pyx_stack[1];
+    if (unlikely(__Pyx_GetBufferAndValidate(&__pyx_pybuffernd_link_dirs_at_node.rcbuffer->pybuffer, (PyObject*)__pyx_v_link_dirs_at_node, &__Pyx_TypeInfo_nn___pyx_t_7landlab_5graph_6cfuncs_DTYPE_t, PyBUF_FORMAT| PyBUF_STRIDES, 2, 0, __pyx_stack) == -1)) __PYX_ERR(0, 114, __pyx_L1_error)
+  }
+  __pyx_pybuffernd_link_dirs_at_node.diminfo[0].strides = __pyx_pybuffernd_link_dirs_at_node.rcbuffer->pybuffer.strides[0]; __pyx_pybuffernd_link_dirs_at_node.diminfo[0].shape = __pyx_pybuffernd_link_dirs_at_node.rcbuffer->pybuffer.shape[0]; __pyx_pybuffernd_link_dirs_at_node.diminfo[1].strides = __pyx_pybuffernd_link_dirs_at_node.rcbuffer->pybuffer.strides[1]; __pyx_pybuffernd_link_dirs_at_node.diminfo[1].shape = __pyx_pybuffernd_link_dirs_at_node.rcbuffer->pybuffer.shape[1];
+
+  /* "landlab/graph/cfuncs.pyx":120
+ *   cdef int n_nodes
+ * 
+ *   n_nodes = links_at_node.shape[0]             # <<<<<<<<<<<<<<
+ * 
+ *   for node in range(n_nodes):
+ */
+  __pyx_v_n_nodes = (__pyx_v_links_at_node->dimensions[0]);
+
+  /* "landlab/graph/cfuncs.pyx":122
+ *   n_nodes = links_at_node.shape[0]
+ * 
+ *   for node in range(n_nodes):             # <<<<<<<<<<<<<<
+ *     _find_links_at_node(node, nodes_at_link, links_at_node[node],
+ *                         link_dirs_at_node[node])
+ */
+  __pyx_t_1 = __pyx_v_n_nodes;
+  __pyx_t_2 = __pyx_t_1;
+  for (__pyx_t_3 = 0; __pyx_t_3 < __pyx_t_2; __pyx_t_3+=1) {
+    __pyx_v_node = __pyx_t_3;
+
+    /* "landlab/graph/cfuncs.pyx":123
+ * 
+ *   for node in range(n_nodes):
+ *     _find_links_at_node(node, nodes_at_link, links_at_node[node],             # <<<<<<<<<<<<<<
+ *                         link_dirs_at_node[node])
+ * 
+ */
+    __Pyx_GetModuleGlobalName(__pyx_t_5, __pyx_n_s_find_links_at_node); if (unlikely(!__pyx_t_5)) __PYX_ERR(0, 123, __pyx_L1_error)
+    __Pyx_GOTREF(__pyx_t_5);
+    __pyx_t_6 = __Pyx_PyInt_From_int(__pyx_v_node); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 123, __pyx_L1_error)
+    __Pyx_GOTREF(__pyx_t_6);
+    __pyx_t_7 = __Pyx_GetItemInt(((PyObject *)__pyx_v_links_at_node), __pyx_v_node, int, 1, __Pyx_PyInt_From_int, 0, 1, 0); if (unlikely(!__pyx_t_7)) __PYX_ERR(0, 123, __pyx_L1_error)
+    __Pyx_GOTREF(__pyx_t_7);
+
+    /* "landlab/graph/cfuncs.pyx":124
+ *   for node in range(n_nodes):
+ *     _find_links_at_node(node, nodes_at_link, links_at_node[node],
+ *                         link_dirs_at_node[node])             # <<<<<<<<<<<<<<
+ * 
+ * 
+ */
+    __pyx_t_8 = __Pyx_GetItemInt(((PyObject *)__pyx_v_link_dirs_at_node), __pyx_v_node, int, 1, __Pyx_PyInt_From_int, 0, 1, 0); if (unlikely(!__pyx_t_8)) __PYX_ERR(0, 124, __pyx_L1_error)
+    __Pyx_GOTREF(__pyx_t_8);
+    __pyx_t_9 = NULL;
+    __pyx_t_10 = 0;
+    if (CYTHON_UNPACK_METHODS && unlikely(PyMethod_Check(__pyx_t_5))) {
+      __pyx_t_9 = PyMethod_GET_SELF(__pyx_t_5);
+      if (likely(__pyx_t_9)) {
+        PyObject* function = PyMethod_GET_FUNCTION(__pyx_t_5);
+        __Pyx_INCREF(__pyx_t_9);
+        __Pyx_INCREF(function);
+        __Pyx_DECREF_SET(__pyx_t_5, function);
+        __pyx_t_10 = 1;
+      }
+    }
+    #if CYTHON_FAST_PYCALL
+    if (PyFunction_Check(__pyx_t_5)) {
+      PyObject *__pyx_temp[5] = {__pyx_t_9, __pyx_t_6, ((PyObject *)__pyx_v_nodes_at_link), __pyx_t_7, __pyx_t_8};
+      __pyx_t_4 = __Pyx_PyFunction_FastCall(__pyx_t_5, __pyx_temp+1-__pyx_t_10, 4+__pyx_t_10); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 123, __pyx_L1_error)
+      __Pyx_XDECREF(__pyx_t_9); __pyx_t_9 = 0;
+      __Pyx_GOTREF(__pyx_t_4);
+      __Pyx_DECREF(__pyx_t_6); __pyx_t_6 = 0;
+      __Pyx_DECREF(__pyx_t_7); __pyx_t_7 = 0;
+      __Pyx_DECREF(__pyx_t_8); __pyx_t_8 = 0;
+    } else
+    #endif
+    #if CYTHON_FAST_PYCCALL
+    if (__Pyx_PyFastCFunction_Check(__pyx_t_5)) {
+      PyObject *__pyx_temp[5] = {__pyx_t_9, __pyx_t_6, ((PyObject *)__pyx_v_nodes_at_link), __pyx_t_7, __pyx_t_8};
+      __pyx_t_4 = __Pyx_PyCFunction_FastCall(__pyx_t_5, __pyx_temp+1-__pyx_t_10, 4+__pyx_t_10); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 123, __pyx_L1_error)
+      __Pyx_XDECREF(__pyx_t_9); __pyx_t_9 = 0;
+      __Pyx_GOTREF(__pyx_t_4);
+      __Pyx_DECREF(__pyx_t_6); __pyx_t_6 = 0;
+      __Pyx_DECREF(__pyx_t_7); __pyx_t_7 = 0;
+      __Pyx_DECREF(__pyx_t_8); __pyx_t_8 = 0;
+    } else
+    #endif
+    {
+      __pyx_t_11 = PyTuple_New(4+__pyx_t_10); if (unlikely(!__pyx_t_11)) __PYX_ERR(0, 123, __pyx_L1_error)
+      __Pyx_GOTREF(__pyx_t_11);
+      if (__pyx_t_9) {
+        __Pyx_GIVEREF(__pyx_t_9); PyTuple_SET_ITEM(__pyx_t_11, 0, __pyx_t_9); __pyx_t_9 = NULL;
+      }
+      __Pyx_GIVEREF(__pyx_t_6);
+      PyTuple_SET_ITEM(__pyx_t_11, 0+__pyx_t_10, __pyx_t_6);
+      __Pyx_INCREF(((PyObject *)__pyx_v_nodes_at_link));
+      __Pyx_GIVEREF(((PyObject *)__pyx_v_nodes_at_link));
+      PyTuple_SET_ITEM(__pyx_t_11, 1+__pyx_t_10, ((PyObject *)__pyx_v_nodes_at_link));
+      __Pyx_GIVEREF(__pyx_t_7);
+      PyTuple_SET_ITEM(__pyx_t_11, 2+__pyx_t_10, __pyx_t_7);
+      __Pyx_GIVEREF(__pyx_t_8);
+      PyTuple_SET_ITEM(__pyx_t_11, 3+__pyx_t_10, __pyx_t_8);
+      __pyx_t_6 = 0;
+      __pyx_t_7 = 0;
+      __pyx_t_8 = 0;
+      __pyx_t_4 = __Pyx_PyObject_Call(__pyx_t_5, __pyx_t_11, NULL); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 123, __pyx_L1_error)
+      __Pyx_GOTREF(__pyx_t_4);
+      __Pyx_DECREF(__pyx_t_11); __pyx_t_11 = 0;
+    }
+    __Pyx_DECREF(__pyx_t_5); __pyx_t_5 = 0;
+    __Pyx_DECREF(__pyx_t_4); __pyx_t_4 = 0;
+  }
+
+  /* "landlab/graph/cfuncs.pyx":114
+ * 
+ * @cython.boundscheck(False)
+ * def _setup_links_at_node(np.ndarray[DTYPE_t, ndim=2] nodes_at_link,             # <<<<<<<<<<<<<<
+ *                          np.ndarray[DTYPE_t, ndim=2] links_at_node,
+ *                          np.ndarray[DTYPE_t, ndim=2] link_dirs_at_node):
+ */
+
+  /* function exit code */
+  __pyx_r = Py_None; __Pyx_INCREF(Py_None);
+  goto __pyx_L0;
+  __pyx_L1_error:;
+  __Pyx_XDECREF(__pyx_t_4);
+  __Pyx_XDECREF(__pyx_t_5);
+  __Pyx_XDECREF(__pyx_t_6);
+  __Pyx_XDECREF(__pyx_t_7);
+  __Pyx_XDECREF(__pyx_t_8);
+  __Pyx_XDECREF(__pyx_t_9);
+  __Pyx_XDECREF(__pyx_t_11);
+  { PyObject *__pyx_type, *__pyx_value, *__pyx_tb;
+    __Pyx_PyThreadState_declare
+    __Pyx_PyThreadState_assign
+    __Pyx_ErrFetch(&__pyx_type, &__pyx_value, &__pyx_tb);
+    __Pyx_SafeReleaseBuffer(&__pyx_pybuffernd_link_dirs_at_node.rcbuffer->pybuffer);
+    __Pyx_SafeReleaseBuffer(&__pyx_pybuffernd_links_at_node.rcbuffer->pybuffer);
+    __Pyx_SafeReleaseBuffer(&__pyx_pybuffernd_nodes_at_link.rcbuffer->pybuffer);
+  __Pyx_ErrRestore(__pyx_type, __pyx_value, __pyx_tb);}
+  __Pyx_AddTraceback("landlab.graph.cfuncs._setup_links_at_node", __pyx_clineno, __pyx_lineno, __pyx_filename);
+  __pyx_r = NULL;
+  goto __pyx_L2;
+  __pyx_L0:;
+  __Pyx_SafeReleaseBuffer(&__pyx_pybuffernd_link_dirs_at_node.rcbuffer->pybuffer);
+  __Pyx_SafeReleaseBuffer(&__pyx_pybuffernd_links_at_node.rcbuffer->pybuffer);
+  __Pyx_SafeReleaseBuffer(&__pyx_pybuffernd_nodes_at_link.rcbuffer->pybuffer);
+  __pyx_L2:;
+  __Pyx_XGIVEREF(__pyx_r);
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+/* "landlab/graph/cfuncs.pyx":128
+ * 
+ * @cython.boundscheck(False)
+ * def _setup_node_at_cell(shape,             # <<<<<<<<<<<<<<
+ *                         np.ndarray[DTYPE_t, ndim=1] node_at_cell):
+ *   cdef int cell
+ */
+
+/* Python wrapper */
+static PyObject *__pyx_pw_7landlab_5graph_6cfuncs_5_setup_node_at_cell(PyObject *__pyx_self, PyObject *__pyx_args, PyObject *__pyx_kwds); /*proto*/
+static PyMethodDef __pyx_mdef_7landlab_5graph_6cfuncs_5_setup_node_at_cell = {"_setup_node_at_cell", (PyCFunction)(void*)(PyCFunctionWithKeywords)__pyx_pw_7landlab_5graph_6cfuncs_5_setup_node_at_cell, METH_VARARGS|METH_KEYWORDS, 0};
+static PyObject *__pyx_pw_7landlab_5graph_6cfuncs_5_setup_node_at_cell(PyObject *__pyx_self, PyObject *__pyx_args, PyObject *__pyx_kwds) {
+  PyObject *__pyx_v_shape = 0;
+  PyArrayObject *__pyx_v_node_at_cell = 0;
+  int __pyx_lineno = 0;
+  const char *__pyx_filename = NULL;
+  int __pyx_clineno = 0;
+  PyObject *__pyx_r = 0;
+  __Pyx_RefNannyDeclarations
+  __Pyx_RefNannySetupContext("_setup_node_at_cell (wrapper)", 0);
+  {
+    static PyObject **__pyx_pyargnames[] = {&__pyx_n_s_shape,&__pyx_n_s_node_at_cell,0};
+    PyObject* values[2] = {0,0};
+    if (unlikely(__pyx_kwds)) {
+      Py_ssize_t kw_args;
+      const Py_ssize_t pos_args = PyTuple_GET_SIZE(__pyx_args);
+      switch (pos_args) {
+        case  2: values[1] = PyTuple_GET_ITEM(__pyx_args, 1);
+        CYTHON_FALLTHROUGH;
+        case  1: values[0] = PyTuple_GET_ITEM(__pyx_args, 0);
+        CYTHON_FALLTHROUGH;
+        case  0: break;
+        default: goto __pyx_L5_argtuple_error;
+      }
+      kw_args = PyDict_Size(__pyx_kwds);
+      switch (pos_args) {
+        case  0:
+        if (likely((values[0] = __Pyx_PyDict_GetItemStr(__pyx_kwds, __pyx_n_s_shape)) != 0)) kw_args--;
+        else goto __pyx_L5_argtuple_error;
+        CYTHON_FALLTHROUGH;
+        case  1:
+        if (likely((values[1] = __Pyx_PyDict_GetItemStr(__pyx_kwds, __pyx_n_s_node_at_cell)) != 0)) kw_args--;
+        else {
+          __Pyx_RaiseArgtupleInvalid("_setup_node_at_cell", 1, 2, 2, 1); __PYX_ERR(0, 128, __pyx_L3_error)
+        }
+      }
+      if (unlikely(kw_args > 0)) {
+        if (unlikely(__Pyx_ParseOptionalKeywords(__pyx_kwds, __pyx_pyargnames, 0, values, pos_args, "_setup_node_at_cell") < 0)) __PYX_ERR(0, 128, __pyx_L3_error)
+      }
+    } else if (PyTuple_GET_SIZE(__pyx_args) != 2) {
+      goto __pyx_L5_argtuple_error;
+    } else {
+      values[0] = PyTuple_GET_ITEM(__pyx_args, 0);
+      values[1] = PyTuple_GET_ITEM(__pyx_args, 1);
+    }
+    __pyx_v_shape = values[0];
+    __pyx_v_node_at_cell = ((PyArrayObject *)values[1]);
+  }
+  goto __pyx_L4_argument_unpacking_done;
+  __pyx_L5_argtuple_error:;
+  __Pyx_RaiseArgtupleInvalid("_setup_node_at_cell", 1, 2, 2, PyTuple_GET_SIZE(__pyx_args)); __PYX_ERR(0, 128, __pyx_L3_error)
+  __pyx_L3_error:;
+  __Pyx_AddTraceback("landlab.graph.cfuncs._setup_node_at_cell", __pyx_clineno, __pyx_lineno, __pyx_filename);
+  __Pyx_RefNannyFinishContext();
+  return NULL;
+  __pyx_L4_argument_unpacking_done:;
+  if (unlikely(!__Pyx_ArgTypeTest(((PyObject *)__pyx_v_node_at_cell), __pyx_ptype_5numpy_ndarray, 1, "node_at_cell", 0))) __PYX_ERR(0, 129, __pyx_L1_error)
+  __pyx_r = __pyx_pf_7landlab_5graph_6cfuncs_4_setup_node_at_cell(__pyx_self, __pyx_v_shape, __pyx_v_node_at_cell);
+
+  /* function exit code */
+  goto __pyx_L0;
+  __pyx_L1_error:;
+  __pyx_r = NULL;
+  __pyx_L0:;
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+static PyObject *__pyx_pf_7landlab_5graph_6cfuncs_4_setup_node_at_cell(CYTHON_UNUSED PyObject *__pyx_self, PyObject *__pyx_v_shape, PyArrayObject *__pyx_v_node_at_cell) {
+  int __pyx_v_cell;
+  int __pyx_v_cell_rows;
+  int __pyx_v_cell_cols;
+  int __pyx_v_node_cols;
+  int __pyx_v_row_offset;
+  CYTHON_UNUSED int __pyx_v_row;
+  int __pyx_v_col;
+  __Pyx_LocalBuf_ND __pyx_pybuffernd_node_at_cell;
+  __Pyx_Buffer __pyx_pybuffer_node_at_cell;
+  PyObject *__pyx_r = NULL;
+  __Pyx_RefNannyDeclarations
+  PyObject *__pyx_t_1 = NULL;
+  PyObject *__pyx_t_2 = NULL;
+  int __pyx_t_3;
+  int __pyx_t_4;
+  int __pyx_t_5;
+  int __pyx_t_6;
+  int __pyx_t_7;
+  int __pyx_t_8;
+  Py_ssize_t __pyx_t_9;
+  int __pyx_lineno = 0;
+  const char *__pyx_filename = NULL;
+  int __pyx_clineno = 0;
+  __Pyx_RefNannySetupContext("_setup_node_at_cell", 0);
+  __pyx_pybuffer_node_at_cell.pybuffer.buf = NULL;
+  __pyx_pybuffer_node_at_cell.refcount = 0;
+  __pyx_pybuffernd_node_at_cell.data = NULL;
+  __pyx_pybuffernd_node_at_cell.rcbuffer = &__pyx_pybuffer_node_at_cell;
+  {
+    __Pyx_BufFmt_StackElem __pyx_stack[1];
+    if (unlikely(__Pyx_GetBufferAndValidate(&__pyx_pybuffernd_node_at_cell.rcbuffer->pybuffer, (PyObject*)__pyx_v_node_at_cell, &__Pyx_TypeInfo_nn___pyx_t_7landlab_5graph_6cfuncs_DTYPE_t, PyBUF_FORMAT| PyBUF_STRIDES| PyBUF_WRITABLE, 1, 0, __pyx_stack) == -1)) __PYX_ERR(0, 128, __pyx_L1_error)
+  }
+  __pyx_pybuffernd_node_at_cell.diminfo[0].strides = __pyx_pybuffernd_node_at_cell.rcbuffer->pybuffer.strides[0]; __pyx_pybuffernd_node_at_cell.diminfo[0].shape = __pyx_pybuffernd_node_at_cell.rcbuffer->pybuffer.shape[0];
+
+  /* "landlab/graph/cfuncs.pyx":131
+ *                         np.ndarray[DTYPE_t, ndim=1] node_at_cell):
+ *   cdef int cell
+ *   cdef int cell_rows = shape[0] - 2             # <<<<<<<<<<<<<<
+ *   cdef int cell_cols = shape[1] - 2
+ *   cdef int node_cols = shape[1]
+ */
+  __pyx_t_1 = __Pyx_GetItemInt(__pyx_v_shape, 0, long, 1, __Pyx_PyInt_From_long, 0, 0, 0); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 131, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_1);
+  __pyx_t_2 = __Pyx_PyInt_SubtractObjC(__pyx_t_1, __pyx_int_2, 2, 0, 0); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 131, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_2);
+  __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
+  __pyx_t_3 = __Pyx_PyInt_As_int(__pyx_t_2); if (unlikely((__pyx_t_3 == (int)-1) && PyErr_Occurred())) __PYX_ERR(0, 131, __pyx_L1_error)
+  __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
+  __pyx_v_cell_rows = __pyx_t_3;
+
+  /* "landlab/graph/cfuncs.pyx":132
+ *   cdef int cell
+ *   cdef int cell_rows = shape[0] - 2
+ *   cdef int cell_cols = shape[1] - 2             # <<<<<<<<<<<<<<
+ *   cdef int node_cols = shape[1]
+ *   cdef int row_offset
+ */
+  __pyx_t_2 = __Pyx_GetItemInt(__pyx_v_shape, 1, long, 1, __Pyx_PyInt_From_long, 0, 0, 0); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 132, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_2);
+  __pyx_t_1 = __Pyx_PyInt_SubtractObjC(__pyx_t_2, __pyx_int_2, 2, 0, 0); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 132, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_1);
+  __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
+  __pyx_t_3 = __Pyx_PyInt_As_int(__pyx_t_1); if (unlikely((__pyx_t_3 == (int)-1) && PyErr_Occurred())) __PYX_ERR(0, 132, __pyx_L1_error)
+  __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
+  __pyx_v_cell_cols = __pyx_t_3;
+
+  /* "landlab/graph/cfuncs.pyx":133
+ *   cdef int cell_rows = shape[0] - 2
+ *   cdef int cell_cols = shape[1] - 2
+ *   cdef int node_cols = shape[1]             # <<<<<<<<<<<<<<
+ *   cdef int row_offset
+ *   cdef int row
+ */
+  __pyx_t_1 = __Pyx_GetItemInt(__pyx_v_shape, 1, long, 1, __Pyx_PyInt_From_long, 0, 0, 0); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 133, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_1);
+  __pyx_t_3 = __Pyx_PyInt_As_int(__pyx_t_1); if (unlikely((__pyx_t_3 == (int)-1) && PyErr_Occurred())) __PYX_ERR(0, 133, __pyx_L1_error)
+  __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
+  __pyx_v_node_cols = __pyx_t_3;
+
+  /* "landlab/graph/cfuncs.pyx":139
+ * 
+ * 
+ *   cell = 0             # <<<<<<<<<<<<<<
+ *   row_offset = shape[1] + 1
+ *   for row in range(cell_rows):
+ */
+  __pyx_v_cell = 0;
+
+  /* "landlab/graph/cfuncs.pyx":140
+ * 
+ *   cell = 0
+ *   row_offset = shape[1] + 1             # <<<<<<<<<<<<<<
+ *   for row in range(cell_rows):
+ *     for col in range(cell_cols):
+ */
+  __pyx_t_1 = __Pyx_GetItemInt(__pyx_v_shape, 1, long, 1, __Pyx_PyInt_From_long, 0, 0, 0); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 140, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_1);
+  __pyx_t_2 = __Pyx_PyInt_AddObjC(__pyx_t_1, __pyx_int_1, 1, 0, 0); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 140, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_2);
+  __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
+  __pyx_t_3 = __Pyx_PyInt_As_int(__pyx_t_2); if (unlikely((__pyx_t_3 == (int)-1) && PyErr_Occurred())) __PYX_ERR(0, 140, __pyx_L1_error)
+  __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
+  __pyx_v_row_offset = __pyx_t_3;
+
+  /* "landlab/graph/cfuncs.pyx":141
+ *   cell = 0
+ *   row_offset = shape[1] + 1
+ *   for row in range(cell_rows):             # <<<<<<<<<<<<<<
+ *     for col in range(cell_cols):
+ *       node_at_cell[cell] = row_offset + col
+ */
+  __pyx_t_3 = __pyx_v_cell_rows;
+  __pyx_t_4 = __pyx_t_3;
+  for (__pyx_t_5 = 0; __pyx_t_5 < __pyx_t_4; __pyx_t_5+=1) {
+    __pyx_v_row = __pyx_t_5;
+
+    /* "landlab/graph/cfuncs.pyx":142
+ *   row_offset = shape[1] + 1
+ *   for row in range(cell_rows):
+ *     for col in range(cell_cols):             # <<<<<<<<<<<<<<
+ *       node_at_cell[cell] = row_offset + col
+ *       cell += 1
+ */
+    __pyx_t_6 = __pyx_v_cell_cols;
+    __pyx_t_7 = __pyx_t_6;
+    for (__pyx_t_8 = 0; __pyx_t_8 < __pyx_t_7; __pyx_t_8+=1) {
+      __pyx_v_col = __pyx_t_8;
+
+      /* "landlab/graph/cfuncs.pyx":143
+ *   for row in range(cell_rows):
+ *     for col in range(cell_cols):
+ *       node_at_cell[cell] = row_offset + col             # <<<<<<<<<<<<<<
+ *       cell += 1
+ *     row_offset += node_cols
+ */
+      __pyx_t_9 = __pyx_v_cell;
+      if (__pyx_t_9 < 0) __pyx_t_9 += __pyx_pybuffernd_node_at_cell.diminfo[0].shape;
+      *__Pyx_BufPtrStrided1d(__pyx_t_7landlab_5graph_6cfuncs_DTYPE_t *, __pyx_pybuffernd_node_at_cell.rcbuffer->pybuffer.buf, __pyx_t_9, __pyx_pybuffernd_node_at_cell.diminfo[0].strides) = (__pyx_v_row_offset + __pyx_v_col);
+
+      /* "landlab/graph/cfuncs.pyx":144
+ *     for col in range(cell_cols):
+ *       node_at_cell[cell] = row_offset + col
+ *       cell += 1             # <<<<<<<<<<<<<<
+ *     row_offset += node_cols
+ * 
+ */
+      __pyx_v_cell = (__pyx_v_cell + 1);
+    }
+
+    /* "landlab/graph/cfuncs.pyx":145
+ *       node_at_cell[cell] = row_offset + col
+ *       cell += 1
+ *     row_offset += node_cols             # <<<<<<<<<<<<<<
+ * 
+ * 
+ */
+    __pyx_v_row_offset = (__pyx_v_row_offset + __pyx_v_node_cols);
+  }
+
+  /* "landlab/graph/cfuncs.pyx":128
+ * 
+ * @cython.boundscheck(False)
+ * def _setup_node_at_cell(shape,             # <<<<<<<<<<<<<<
+ *                         np.ndarray[DTYPE_t, ndim=1] node_at_cell):
+ *   cdef int cell
+ */
+
+  /* function exit code */
+  __pyx_r = Py_None; __Pyx_INCREF(Py_None);
+  goto __pyx_L0;
+  __pyx_L1_error:;
+  __Pyx_XDECREF(__pyx_t_1);
+  __Pyx_XDECREF(__pyx_t_2);
+  { PyObject *__pyx_type, *__pyx_value, *__pyx_tb;
+    __Pyx_PyThreadState_declare
+    __Pyx_PyThreadState_assign
+    __Pyx_ErrFetch(&__pyx_type, &__pyx_value, &__pyx_tb);
+    __Pyx_SafeReleaseBuffer(&__pyx_pybuffernd_node_at_cell.rcbuffer->pybuffer);
+  __Pyx_ErrRestore(__pyx_type, __pyx_value, __pyx_tb);}
+  __Pyx_AddTraceback("landlab.graph.cfuncs._setup_node_at_cell", __pyx_clineno, __pyx_lineno, __pyx_filename);
+  __pyx_r = NULL;
+  goto __pyx_L2;
+  __pyx_L0:;
+  __Pyx_SafeReleaseBuffer(&__pyx_pybuffernd_node_at_cell.rcbuffer->pybuffer);
+  __pyx_L2:;
+  __Pyx_XGIVEREF(__pyx_r);
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+/* "landlab/graph/cfuncs.pyx":149
+ * 
+ * @cython.boundscheck(False)
+ * def _remap_nodes_at_link(np.ndarray[DTYPE_t, ndim=2] nodes_at_link,             # <<<<<<<<<<<<<<
+ *                          np.ndarray[DTYPE_t, ndim=1] new_nodes):
+ *   cdef int link
+ */
+
+/* Python wrapper */
+static PyObject *__pyx_pw_7landlab_5graph_6cfuncs_7_remap_nodes_at_link(PyObject *__pyx_self, PyObject *__pyx_args, PyObject *__pyx_kwds); /*proto*/
+static PyMethodDef __pyx_mdef_7landlab_5graph_6cfuncs_7_remap_nodes_at_link = {"_remap_nodes_at_link", (PyCFunction)(void*)(PyCFunctionWithKeywords)__pyx_pw_7landlab_5graph_6cfuncs_7_remap_nodes_at_link, METH_VARARGS|METH_KEYWORDS, 0};
+static PyObject *__pyx_pw_7landlab_5graph_6cfuncs_7_remap_nodes_at_link(PyObject *__pyx_self, PyObject *__pyx_args, PyObject *__pyx_kwds) {
+  PyArrayObject *__pyx_v_nodes_at_link = 0;
+  PyArrayObject *__pyx_v_new_nodes = 0;
+  int __pyx_lineno = 0;
+  const char *__pyx_filename = NULL;
+  int __pyx_clineno = 0;
+  PyObject *__pyx_r = 0;
+  __Pyx_RefNannyDeclarations
+  __Pyx_RefNannySetupContext("_remap_nodes_at_link (wrapper)", 0);
+  {
+    static PyObject **__pyx_pyargnames[] = {&__pyx_n_s_nodes_at_link,&__pyx_n_s_new_nodes,0};
+    PyObject* values[2] = {0,0};
+    if (unlikely(__pyx_kwds)) {
+      Py_ssize_t kw_args;
+      const Py_ssize_t pos_args = PyTuple_GET_SIZE(__pyx_args);
+      switch (pos_args) {
+        case  2: values[1] = PyTuple_GET_ITEM(__pyx_args, 1);
+        CYTHON_FALLTHROUGH;
+        case  1: values[0] = PyTuple_GET_ITEM(__pyx_args, 0);
+        CYTHON_FALLTHROUGH;
+        case  0: break;
+        default: goto __pyx_L5_argtuple_error;
+      }
+      kw_args = PyDict_Size(__pyx_kwds);
+      switch (pos_args) {
+        case  0:
+        if (likely((values[0] = __Pyx_PyDict_GetItemStr(__pyx_kwds, __pyx_n_s_nodes_at_link)) != 0)) kw_args--;
+        else goto __pyx_L5_argtuple_error;
+        CYTHON_FALLTHROUGH;
+        case  1:
+        if (likely((values[1] = __Pyx_PyDict_GetItemStr(__pyx_kwds, __pyx_n_s_new_nodes)) != 0)) kw_args--;
+        else {
+          __Pyx_RaiseArgtupleInvalid("_remap_nodes_at_link", 1, 2, 2, 1); __PYX_ERR(0, 149, __pyx_L3_error)
+        }
+      }
+      if (unlikely(kw_args > 0)) {
+        if (unlikely(__Pyx_ParseOptionalKeywords(__pyx_kwds, __pyx_pyargnames, 0, values, pos_args, "_remap_nodes_at_link") < 0)) __PYX_ERR(0, 149, __pyx_L3_error)
+      }
+    } else if (PyTuple_GET_SIZE(__pyx_args) != 2) {
+      goto __pyx_L5_argtuple_error;
+    } else {
+      values[0] = PyTuple_GET_ITEM(__pyx_args, 0);
+      values[1] = PyTuple_GET_ITEM(__pyx_args, 1);
+    }
+    __pyx_v_nodes_at_link = ((PyArrayObject *)values[0]);
+    __pyx_v_new_nodes = ((PyArrayObject *)values[1]);
+  }
+  goto __pyx_L4_argument_unpacking_done;
+  __pyx_L5_argtuple_error:;
+  __Pyx_RaiseArgtupleInvalid("_remap_nodes_at_link", 1, 2, 2, PyTuple_GET_SIZE(__pyx_args)); __PYX_ERR(0, 149, __pyx_L3_error)
+  __pyx_L3_error:;
+  __Pyx_AddTraceback("landlab.graph.cfuncs._remap_nodes_at_link", __pyx_clineno, __pyx_lineno, __pyx_filename);
+  __Pyx_RefNannyFinishContext();
+  return NULL;
+  __pyx_L4_argument_unpacking_done:;
+  if (unlikely(!__Pyx_ArgTypeTest(((PyObject *)__pyx_v_nodes_at_link), __pyx_ptype_5numpy_ndarray, 1, "nodes_at_link", 0))) __PYX_ERR(0, 149, __pyx_L1_error)
+  if (unlikely(!__Pyx_ArgTypeTest(((PyObject *)__pyx_v_new_nodes), __pyx_ptype_5numpy_ndarray, 1, "new_nodes", 0))) __PYX_ERR(0, 150, __pyx_L1_error)
+  __pyx_r = __pyx_pf_7landlab_5graph_6cfuncs_6_remap_nodes_at_link(__pyx_self, __pyx_v_nodes_at_link, __pyx_v_new_nodes);
+
+  /* function exit code */
+  goto __pyx_L0;
+  __pyx_L1_error:;
+  __pyx_r = NULL;
+  __pyx_L0:;
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+static PyObject *__pyx_pf_7landlab_5graph_6cfuncs_6_remap_nodes_at_link(CYTHON_UNUSED PyObject *__pyx_self, PyArrayObject *__pyx_v_nodes_at_link, PyArrayObject *__pyx_v_new_nodes) {
+  int __pyx_v_link;
+  int __pyx_v_n_links;
+  __Pyx_LocalBuf_ND __pyx_pybuffernd_new_nodes;
+  __Pyx_Buffer __pyx_pybuffer_new_nodes;
+  __Pyx_LocalBuf_ND __pyx_pybuffernd_nodes_at_link;
+  __Pyx_Buffer __pyx_pybuffer_nodes_at_link;
+  PyObject *__pyx_r = NULL;
+  __Pyx_RefNannyDeclarations
+  Py_ssize_t __pyx_t_1;
+  int __pyx_t_2;
+  int __pyx_t_3;
+  int __pyx_t_4;
+  Py_ssize_t __pyx_t_5;
+  Py_ssize_t __pyx_t_6;
+  Py_ssize_t __pyx_t_7;
+  Py_ssize_t __pyx_t_8;
+  Py_ssize_t __pyx_t_9;
+  int __pyx_lineno = 0;
+  const char *__pyx_filename = NULL;
+  int __pyx_clineno = 0;
+  __Pyx_RefNannySetupContext("_remap_nodes_at_link", 0);
+  __pyx_pybuffer_nodes_at_link.pybuffer.buf = NULL;
+  __pyx_pybuffer_nodes_at_link.refcount = 0;
+  __pyx_pybuffernd_nodes_at_link.data = NULL;
+  __pyx_pybuffernd_nodes_at_link.rcbuffer = &__pyx_pybuffer_nodes_at_link;
+  __pyx_pybuffer_new_nodes.pybuffer.buf = NULL;
+  __pyx_pybuffer_new_nodes.refcount = 0;
+  __pyx_pybuffernd_new_nodes.data = NULL;
+  __pyx_pybuffernd_new_nodes.rcbuffer = &__pyx_pybuffer_new_nodes;
+  {
+    __Pyx_BufFmt_StackElem __pyx_stack[1];
+    if (unlikely(__Pyx_GetBufferAndValidate(&__pyx_pybuffernd_nodes_at_link.rcbuffer->pybuffer, (PyObject*)__pyx_v_nodes_at_link, &__Pyx_TypeInfo_nn___pyx_t_7landlab_5graph_6cfuncs_DTYPE_t, PyBUF_FORMAT| PyBUF_STRIDES| PyBUF_WRITABLE, 2, 0, __pyx_stack) == -1)) __PYX_ERR(0, 149, __pyx_L1_error)
+  }
+  __pyx_pybuffernd_nodes_at_link.diminfo[0].strides = __pyx_pybuffernd_nodes_at_link.rcbuffer->pybuffer.strides[0]; __pyx_pybuffernd_nodes_at_link.diminfo[0].shape = __pyx_pybuffernd_nodes_at_link.rcbuffer->pybuffer.shape[0]; __pyx_pybuffernd_nodes_at_link.diminfo[1].strides = __pyx_pybuffernd_nodes_at_link.rcbuffer->pybuffer.strides[1]; __pyx_pybuffernd_nodes_at_link.diminfo[1].shape = __pyx_pybuffernd_nodes_at_link.rcbuffer->pybuffer.shape[1];
+  {
+    __Pyx_BufFmt_StackElem __pyx_stack[1];
+    if (unlikely(__Pyx_GetBufferAndValidate(&__pyx_pybuffernd_new_nodes.rcbuffer->pybuffer, (PyObject*)__pyx_v_new_nodes, &__Pyx_TypeInfo_nn___pyx_t_7landlab_5graph_6cfuncs_DTYPE_t, PyBUF_FORMAT| PyBUF_STRIDES, 1, 0, __pyx_stack) == -1)) __PYX_ERR(0, 149, __pyx_L1_error)
+  }
+  __pyx_pybuffernd_new_nodes.diminfo[0].strides = __pyx_pybuffernd_new_nodes.rcbuffer->pybuffer.strides[0]; __pyx_pybuffernd_new_nodes.diminfo[0].shape = __pyx_pybuffernd_new_nodes.rcbuffer->pybuffer.shape[0];
+
+  /* "landlab/graph/cfuncs.pyx":152
+ *                          np.ndarray[DTYPE_t, ndim=1] new_nodes):
+ *   cdef int link
+ *   cdef int n_links = len(nodes_at_link)             # <<<<<<<<<<<<<<
+ * 
+ *   for link in range(n_links):
+ */
+  __pyx_t_1 = PyObject_Length(((PyObject *)__pyx_v_nodes_at_link)); if (unlikely(__pyx_t_1 == ((Py_ssize_t)-1))) __PYX_ERR(0, 152, __pyx_L1_error)
+  __pyx_v_n_links = __pyx_t_1;
+
+  /* "landlab/graph/cfuncs.pyx":154
+ *   cdef int n_links = len(nodes_at_link)
+ * 
+ *   for link in range(n_links):             # <<<<<<<<<<<<<<
+ *     nodes_at_link[link, 0] = new_nodes[nodes_at_link[link, 0]]
+ *     nodes_at_link[link, 1] = new_nodes[nodes_at_link[link, 1]]
+ */
+  __pyx_t_2 = __pyx_v_n_links;
+  __pyx_t_3 = __pyx_t_2;
+  for (__pyx_t_4 = 0; __pyx_t_4 < __pyx_t_3; __pyx_t_4+=1) {
+    __pyx_v_link = __pyx_t_4;
+
+    /* "landlab/graph/cfuncs.pyx":155
+ * 
+ *   for link in range(n_links):
+ *     nodes_at_link[link, 0] = new_nodes[nodes_at_link[link, 0]]             # <<<<<<<<<<<<<<
+ *     nodes_at_link[link, 1] = new_nodes[nodes_at_link[link, 1]]
+ * 
+ */
+    __pyx_t_5 = __pyx_v_link;
+    __pyx_t_6 = 0;
+    if (__pyx_t_5 < 0) __pyx_t_5 += __pyx_pybuffernd_nodes_at_link.diminfo[0].shape;
+    if (__pyx_t_6 < 0) __pyx_t_6 += __pyx_pybuffernd_nodes_at_link.diminfo[1].shape;
+    __pyx_t_7 = (*__Pyx_BufPtrStrided2d(__pyx_t_7landlab_5graph_6cfuncs_DTYPE_t *, __pyx_pybuffernd_nodes_at_link.rcbuffer->pybuffer.buf, __pyx_t_5, __pyx_pybuffernd_nodes_at_link.diminfo[0].strides, __pyx_t_6, __pyx_pybuffernd_nodes_at_link.diminfo[1].strides));
+    if (__pyx_t_7 < 0) __pyx_t_7 += __pyx_pybuffernd_new_nodes.diminfo[0].shape;
+    __pyx_t_8 = __pyx_v_link;
+    __pyx_t_9 = 0;
+    if (__pyx_t_8 < 0) __pyx_t_8 += __pyx_pybuffernd_nodes_at_link.diminfo[0].shape;
+    if (__pyx_t_9 < 0) __pyx_t_9 += __pyx_pybuffernd_nodes_at_link.diminfo[1].shape;
+    *__Pyx_BufPtrStrided2d(__pyx_t_7landlab_5graph_6cfuncs_DTYPE_t *, __pyx_pybuffernd_nodes_at_link.rcbuffer->pybuffer.buf, __pyx_t_8, __pyx_pybuffernd_nodes_at_link.diminfo[0].strides, __pyx_t_9, __pyx_pybuffernd_nodes_at_link.diminfo[1].strides) = (*__Pyx_BufPtrStrided1d(__pyx_t_7landlab_5graph_6cfuncs_DTYPE_t *, __pyx_pybuffernd_new_nodes.rcbuffer->pybuffer.buf, __pyx_t_7, __pyx_pybuffernd_new_nodes.diminfo[0].strides));
+
+    /* "landlab/graph/cfuncs.pyx":156
+ *   for link in range(n_links):
+ *     nodes_at_link[link, 0] = new_nodes[nodes_at_link[link, 0]]
+ *     nodes_at_link[link, 1] = new_nodes[nodes_at_link[link, 1]]             # <<<<<<<<<<<<<<
+ * 
+ * 
+ */
+    __pyx_t_6 = __pyx_v_link;
+    __pyx_t_5 = 1;
+    if (__pyx_t_6 < 0) __pyx_t_6 += __pyx_pybuffernd_nodes_at_link.diminfo[0].shape;
+    if (__pyx_t_5 < 0) __pyx_t_5 += __pyx_pybuffernd_nodes_at_link.diminfo[1].shape;
+    __pyx_t_7 = (*__Pyx_BufPtrStrided2d(__pyx_t_7landlab_5graph_6cfuncs_DTYPE_t *, __pyx_pybuffernd_nodes_at_link.rcbuffer->pybuffer.buf, __pyx_t_6, __pyx_pybuffernd_nodes_at_link.diminfo[0].strides, __pyx_t_5, __pyx_pybuffernd_nodes_at_link.diminfo[1].strides));
+    if (__pyx_t_7 < 0) __pyx_t_7 += __pyx_pybuffernd_new_nodes.diminfo[0].shape;
+    __pyx_t_9 = __pyx_v_link;
+    __pyx_t_8 = 1;
+    if (__pyx_t_9 < 0) __pyx_t_9 += __pyx_pybuffernd_nodes_at_link.diminfo[0].shape;
+    if (__pyx_t_8 < 0) __pyx_t_8 += __pyx_pybuffernd_nodes_at_link.diminfo[1].shape;
+    *__Pyx_BufPtrStrided2d(__pyx_t_7landlab_5graph_6cfuncs_DTYPE_t *, __pyx_pybuffernd_nodes_at_link.rcbuffer->pybuffer.buf, __pyx_t_9, __pyx_pybuffernd_nodes_at_link.diminfo[0].strides, __pyx_t_8, __pyx_pybuffernd_nodes_at_link.diminfo[1].strides) = (*__Pyx_BufPtrStrided1d(__pyx_t_7landlab_5graph_6cfuncs_DTYPE_t *, __pyx_pybuffernd_new_nodes.rcbuffer->pybuffer.buf, __pyx_t_7, __pyx_pybuffernd_new_nodes.diminfo[0].strides));
+  }
+
+  /* "landlab/graph/cfuncs.pyx":149
+ * 
+ * @cython.boundscheck(False)
+ * def _remap_nodes_at_link(np.ndarray[DTYPE_t, ndim=2] nodes_at_link,             # <<<<<<<<<<<<<<
+ *                          np.ndarray[DTYPE_t, ndim=1] new_nodes):
+ *   cdef int link
+ */
+
+  /* function exit code */
+  __pyx_r = Py_None; __Pyx_INCREF(Py_None);
+  goto __pyx_L0;
+  __pyx_L1_error:;
+  { PyObject *__pyx_type, *__pyx_value, *__pyx_tb;
+    __Pyx_PyThreadState_declare
+    __Pyx_PyThreadState_assign
+    __Pyx_ErrFetch(&__pyx_type, &__pyx_value, &__pyx_tb);
+    __Pyx_SafeReleaseBuffer(&__pyx_pybuffernd_new_nodes.rcbuffer->pybuffer);
+    __Pyx_SafeReleaseBuffer(&__pyx_pybuffernd_nodes_at_link.rcbuffer->pybuffer);
+  __Pyx_ErrRestore(__pyx_type, __pyx_value, __pyx_tb);}
+  __Pyx_AddTraceback("landlab.graph.cfuncs._remap_nodes_at_link", __pyx_clineno, __pyx_lineno, __pyx_filename);
+  __pyx_r = NULL;
+  goto __pyx_L2;
+  __pyx_L0:;
+  __Pyx_SafeReleaseBuffer(&__pyx_pybuffernd_new_nodes.rcbuffer->pybuffer);
+  __Pyx_SafeReleaseBuffer(&__pyx_pybuffernd_nodes_at_link.rcbuffer->pybuffer);
+  __pyx_L2:;
+  __Pyx_XGIVEREF(__pyx_r);
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+/* "landlab/graph/cfuncs.pyx":160
+ * 
+ * @cython.boundscheck(False)
+ * def _remap_links_at_patch(np.ndarray[DTYPE_t, ndim=1] links_at_patch,             # <<<<<<<<<<<<<<
+ *                           np.ndarray[DTYPE_t, ndim=1] new_links):
+ *     cdef int link
+ */
+
+/* Python wrapper */
+static PyObject *__pyx_pw_7landlab_5graph_6cfuncs_9_remap_links_at_patch(PyObject *__pyx_self, PyObject *__pyx_args, PyObject *__pyx_kwds); /*proto*/
+static PyMethodDef __pyx_mdef_7landlab_5graph_6cfuncs_9_remap_links_at_patch = {"_remap_links_at_patch", (PyCFunction)(void*)(PyCFunctionWithKeywords)__pyx_pw_7landlab_5graph_6cfuncs_9_remap_links_at_patch, METH_VARARGS|METH_KEYWORDS, 0};
+static PyObject *__pyx_pw_7landlab_5graph_6cfuncs_9_remap_links_at_patch(PyObject *__pyx_self, PyObject *__pyx_args, PyObject *__pyx_kwds) {
+  PyArrayObject *__pyx_v_links_at_patch = 0;
+  PyArrayObject *__pyx_v_new_links = 0;
+  int __pyx_lineno = 0;
+  const char *__pyx_filename = NULL;
+  int __pyx_clineno = 0;
+  PyObject *__pyx_r = 0;
+  __Pyx_RefNannyDeclarations
+  __Pyx_RefNannySetupContext("_remap_links_at_patch (wrapper)", 0);
+  {
+    static PyObject **__pyx_pyargnames[] = {&__pyx_n_s_links_at_patch,&__pyx_n_s_new_links,0};
+    PyObject* values[2] = {0,0};
+    if (unlikely(__pyx_kwds)) {
+      Py_ssize_t kw_args;
+      const Py_ssize_t pos_args = PyTuple_GET_SIZE(__pyx_args);
+      switch (pos_args) {
+        case  2: values[1] = PyTuple_GET_ITEM(__pyx_args, 1);
+        CYTHON_FALLTHROUGH;
+        case  1: values[0] = PyTuple_GET_ITEM(__pyx_args, 0);
+        CYTHON_FALLTHROUGH;
+        case  0: break;
+        default: goto __pyx_L5_argtuple_error;
+      }
+      kw_args = PyDict_Size(__pyx_kwds);
+      switch (pos_args) {
+        case  0:
+        if (likely((values[0] = __Pyx_PyDict_GetItemStr(__pyx_kwds, __pyx_n_s_links_at_patch)) != 0)) kw_args--;
+        else goto __pyx_L5_argtuple_error;
+        CYTHON_FALLTHROUGH;
+        case  1:
+        if (likely((values[1] = __Pyx_PyDict_GetItemStr(__pyx_kwds, __pyx_n_s_new_links)) != 0)) kw_args--;
+        else {
+          __Pyx_RaiseArgtupleInvalid("_remap_links_at_patch", 1, 2, 2, 1); __PYX_ERR(0, 160, __pyx_L3_error)
+        }
+      }
+      if (unlikely(kw_args > 0)) {
+        if (unlikely(__Pyx_ParseOptionalKeywords(__pyx_kwds, __pyx_pyargnames, 0, values, pos_args, "_remap_links_at_patch") < 0)) __PYX_ERR(0, 160, __pyx_L3_error)
+      }
+    } else if (PyTuple_GET_SIZE(__pyx_args) != 2) {
+      goto __pyx_L5_argtuple_error;
+    } else {
+      values[0] = PyTuple_GET_ITEM(__pyx_args, 0);
+      values[1] = PyTuple_GET_ITEM(__pyx_args, 1);
+    }
+    __pyx_v_links_at_patch = ((PyArrayObject *)values[0]);
+    __pyx_v_new_links = ((PyArrayObject *)values[1]);
+  }
+  goto __pyx_L4_argument_unpacking_done;
+  __pyx_L5_argtuple_error:;
+  __Pyx_RaiseArgtupleInvalid("_remap_links_at_patch", 1, 2, 2, PyTuple_GET_SIZE(__pyx_args)); __PYX_ERR(0, 160, __pyx_L3_error)
+  __pyx_L3_error:;
+  __Pyx_AddTraceback("landlab.graph.cfuncs._remap_links_at_patch", __pyx_clineno, __pyx_lineno, __pyx_filename);
+  __Pyx_RefNannyFinishContext();
+  return NULL;
+  __pyx_L4_argument_unpacking_done:;
+  if (unlikely(!__Pyx_ArgTypeTest(((PyObject *)__pyx_v_links_at_patch), __pyx_ptype_5numpy_ndarray, 1, "links_at_patch", 0))) __PYX_ERR(0, 160, __pyx_L1_error)
+  if (unlikely(!__Pyx_ArgTypeTest(((PyObject *)__pyx_v_new_links), __pyx_ptype_5numpy_ndarray, 1, "new_links", 0))) __PYX_ERR(0, 161, __pyx_L1_error)
+  __pyx_r = __pyx_pf_7landlab_5graph_6cfuncs_8_remap_links_at_patch(__pyx_self, __pyx_v_links_at_patch, __pyx_v_new_links);
+
+  /* function exit code */
+  goto __pyx_L0;
+  __pyx_L1_error:;
+  __pyx_r = NULL;
+  __pyx_L0:;
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+static PyObject *__pyx_pf_7landlab_5graph_6cfuncs_8_remap_links_at_patch(CYTHON_UNUSED PyObject *__pyx_self, PyArrayObject *__pyx_v_links_at_patch, PyArrayObject *__pyx_v_new_links) {
+  int __pyx_v_link;
+  int __pyx_v_n_links;
+  __Pyx_LocalBuf_ND __pyx_pybuffernd_links_at_patch;
+  __Pyx_Buffer __pyx_pybuffer_links_at_patch;
+  __Pyx_LocalBuf_ND __pyx_pybuffernd_new_links;
+  __Pyx_Buffer __pyx_pybuffer_new_links;
+  PyObject *__pyx_r = NULL;
+  __Pyx_RefNannyDeclarations
+  int __pyx_t_1;
+  int __pyx_t_2;
+  int __pyx_t_3;
+  Py_ssize_t __pyx_t_4;
+  Py_ssize_t __pyx_t_5;
+  Py_ssize_t __pyx_t_6;
+  int __pyx_lineno = 0;
+  const char *__pyx_filename = NULL;
+  int __pyx_clineno = 0;
+  __Pyx_RefNannySetupContext("_remap_links_at_patch", 0);
+  __pyx_pybuffer_links_at_patch.pybuffer.buf = NULL;
+  __pyx_pybuffer_links_at_patch.refcount = 0;
+  __pyx_pybuffernd_links_at_patch.data = NULL;
+  __pyx_pybuffernd_links_at_patch.rcbuffer = &__pyx_pybuffer_links_at_patch;
+  __pyx_pybuffer_new_links.pybuffer.buf = NULL;
+  __pyx_pybuffer_new_links.refcount = 0;
+  __pyx_pybuffernd_new_links.data = NULL;
+  __pyx_pybuffernd_new_links.rcbuffer = &__pyx_pybuffer_new_links;
+  {
+    __Pyx_BufFmt_StackElem __pyx_stack[1];
+    if (unlikely(__Pyx_GetBufferAndValidate(&__pyx_pybuffernd_links_at_patch.rcbuffer->pybuffer, (PyObject*)__pyx_v_links_at_patch, &__Pyx_TypeInfo_nn___pyx_t_7landlab_5graph_6cfuncs_DTYPE_t, PyBUF_FORMAT| PyBUF_STRIDES| PyBUF_WRITABLE, 1, 0, __pyx_stack) == -1)) __PYX_ERR(0, 160, __pyx_L1_error)
+  }
+  __pyx_pybuffernd_links_at_patch.diminfo[0].strides = __pyx_pybuffernd_links_at_patch.rcbuffer->pybuffer.strides[0]; __pyx_pybuffernd_links_at_patch.diminfo[0].shape = __pyx_pybuffernd_links_at_patch.rcbuffer->pybuffer.shape[0];
+  {
+    __Pyx_BufFmt_StackElem __pyx_stack[1];
+    if (unlikely(__Pyx_GetBufferAndValidate(&__pyx_pybuffernd_new_links.rcbuffer->pybuffer, (PyObject*)__pyx_v_new_links, &__Pyx_TypeInfo_nn___pyx_t_7landlab_5graph_6cfuncs_DTYPE_t, PyBUF_FORMAT| PyBUF_STRIDES, 1, 0, __pyx_stack) == -1)) __PYX_ERR(0, 160, __pyx_L1_error)
+  }
+  __pyx_pybuffernd_new_links.diminfo[0].strides = __pyx_pybuffernd_new_links.rcbuffer->pybuffer.strides[0]; __pyx_pybuffernd_new_links.diminfo[0].shape = __pyx_pybuffernd_new_links.rcbuffer->pybuffer.shape[0];
+
+  /* "landlab/graph/cfuncs.pyx":163
+ *                           np.ndarray[DTYPE_t, ndim=1] new_links):
+ *     cdef int link
+ *     cdef int n_links = links_at_patch.shape[0]             # <<<<<<<<<<<<<<
+ * 
+ *     for link in range(n_links):
+ */
+  __pyx_v_n_links = (__pyx_v_links_at_patch->dimensions[0]);
+
+  /* "landlab/graph/cfuncs.pyx":165
+ *     cdef int n_links = links_at_patch.shape[0]
+ * 
+ *     for link in range(n_links):             # <<<<<<<<<<<<<<
+ *         links_at_patch[link] = new_links[links_at_patch[link]]
+ * 
+ */
+  __pyx_t_1 = __pyx_v_n_links;
+  __pyx_t_2 = __pyx_t_1;
+  for (__pyx_t_3 = 0; __pyx_t_3 < __pyx_t_2; __pyx_t_3+=1) {
+    __pyx_v_link = __pyx_t_3;
+
+    /* "landlab/graph/cfuncs.pyx":166
+ * 
+ *     for link in range(n_links):
+ *         links_at_patch[link] = new_links[links_at_patch[link]]             # <<<<<<<<<<<<<<
+ * 
+ * 
+ */
+    __pyx_t_4 = __pyx_v_link;
+    if (__pyx_t_4 < 0) __pyx_t_4 += __pyx_pybuffernd_links_at_patch.diminfo[0].shape;
+    __pyx_t_5 = (*__Pyx_BufPtrStrided1d(__pyx_t_7landlab_5graph_6cfuncs_DTYPE_t *, __pyx_pybuffernd_links_at_patch.rcbuffer->pybuffer.buf, __pyx_t_4, __pyx_pybuffernd_links_at_patch.diminfo[0].strides));
+    if (__pyx_t_5 < 0) __pyx_t_5 += __pyx_pybuffernd_new_links.diminfo[0].shape;
+    __pyx_t_6 = __pyx_v_link;
+    if (__pyx_t_6 < 0) __pyx_t_6 += __pyx_pybuffernd_links_at_patch.diminfo[0].shape;
+    *__Pyx_BufPtrStrided1d(__pyx_t_7landlab_5graph_6cfuncs_DTYPE_t *, __pyx_pybuffernd_links_at_patch.rcbuffer->pybuffer.buf, __pyx_t_6, __pyx_pybuffernd_links_at_patch.diminfo[0].strides) = (*__Pyx_BufPtrStrided1d(__pyx_t_7landlab_5graph_6cfuncs_DTYPE_t *, __pyx_pybuffernd_new_links.rcbuffer->pybuffer.buf, __pyx_t_5, __pyx_pybuffernd_new_links.diminfo[0].strides));
+  }
+
+  /* "landlab/graph/cfuncs.pyx":160
+ * 
+ * @cython.boundscheck(False)
+ * def _remap_links_at_patch(np.ndarray[DTYPE_t, ndim=1] links_at_patch,             # <<<<<<<<<<<<<<
+ *                           np.ndarray[DTYPE_t, ndim=1] new_links):
+ *     cdef int link
+ */
+
+  /* function exit code */
+  __pyx_r = Py_None; __Pyx_INCREF(Py_None);
+  goto __pyx_L0;
+  __pyx_L1_error:;
+  { PyObject *__pyx_type, *__pyx_value, *__pyx_tb;
+    __Pyx_PyThreadState_declare
+    __Pyx_PyThreadState_assign
+    __Pyx_ErrFetch(&__pyx_type, &__pyx_value, &__pyx_tb);
+    __Pyx_SafeReleaseBuffer(&__pyx_pybuffernd_links_at_patch.rcbuffer->pybuffer);
+    __Pyx_SafeReleaseBuffer(&__pyx_pybuffernd_new_links.rcbuffer->pybuffer);
+  __Pyx_ErrRestore(__pyx_type, __pyx_value, __pyx_tb);}
+  __Pyx_AddTraceback("landlab.graph.cfuncs._remap_links_at_patch", __pyx_clineno, __pyx_lineno, __pyx_filename);
+  __pyx_r = NULL;
+  goto __pyx_L2;
+  __pyx_L0:;
+  __Pyx_SafeReleaseBuffer(&__pyx_pybuffernd_links_at_patch.rcbuffer->pybuffer);
+  __Pyx_SafeReleaseBuffer(&__pyx_pybuffernd_new_links.rcbuffer->pybuffer);
+  __pyx_L2:;
+  __Pyx_XGIVEREF(__pyx_r);
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+/* "landlab/graph/cfuncs.pyx":170
+ * 
+ * @cython.boundscheck(False)
+ * def _calc_center_of_patch(np.ndarray[DTYPE_t, ndim=1] links_at_patch,             # <<<<<<<<<<<<<<
+ *                           np.ndarray[DTYPE_t, ndim=1] offset_to_patch,
+ *                           np.ndarray[np.float_t, ndim=2] xy_at_link,
+ */
+
+/* Python wrapper */
+static PyObject *__pyx_pw_7landlab_5graph_6cfuncs_11_calc_center_of_patch(PyObject *__pyx_self, PyObject *__pyx_args, PyObject *__pyx_kwds); /*proto*/
+static PyMethodDef __pyx_mdef_7landlab_5graph_6cfuncs_11_calc_center_of_patch = {"_calc_center_of_patch", (PyCFunction)(void*)(PyCFunctionWithKeywords)__pyx_pw_7landlab_5graph_6cfuncs_11_calc_center_of_patch, METH_VARARGS|METH_KEYWORDS, 0};
+static PyObject *__pyx_pw_7landlab_5graph_6cfuncs_11_calc_center_of_patch(PyObject *__pyx_self, PyObject *__pyx_args, PyObject *__pyx_kwds) {
+  PyArrayObject *__pyx_v_links_at_patch = 0;
+  PyArrayObject *__pyx_v_offset_to_patch = 0;
+  PyArrayObject *__pyx_v_xy_at_link = 0;
+  PyArrayObject *__pyx_v_xy_at_patch = 0;
+  int __pyx_lineno = 0;
+  const char *__pyx_filename = NULL;
+  int __pyx_clineno = 0;
+  PyObject *__pyx_r = 0;
+  __Pyx_RefNannyDeclarations
+  __Pyx_RefNannySetupContext("_calc_center_of_patch (wrapper)", 0);
+  {
+    static PyObject **__pyx_pyargnames[] = {&__pyx_n_s_links_at_patch,&__pyx_n_s_offset_to_patch,&__pyx_n_s_xy_at_link,&__pyx_n_s_xy_at_patch,0};
+    PyObject* values[4] = {0,0,0,0};
+    if (unlikely(__pyx_kwds)) {
+      Py_ssize_t kw_args;
+      const Py_ssize_t pos_args = PyTuple_GET_SIZE(__pyx_args);
+      switch (pos_args) {
+        case  4: values[3] = PyTuple_GET_ITEM(__pyx_args, 3);
+        CYTHON_FALLTHROUGH;
+        case  3: values[2] = PyTuple_GET_ITEM(__pyx_args, 2);
+        CYTHON_FALLTHROUGH;
+        case  2: values[1] = PyTuple_GET_ITEM(__pyx_args, 1);
+        CYTHON_FALLTHROUGH;
+        case  1: values[0] = PyTuple_GET_ITEM(__pyx_args, 0);
+        CYTHON_FALLTHROUGH;
+        case  0: break;
+        default: goto __pyx_L5_argtuple_error;
+      }
+      kw_args = PyDict_Size(__pyx_kwds);
+      switch (pos_args) {
+        case  0:
+        if (likely((values[0] = __Pyx_PyDict_GetItemStr(__pyx_kwds, __pyx_n_s_links_at_patch)) != 0)) kw_args--;
+        else goto __pyx_L5_argtuple_error;
+        CYTHON_FALLTHROUGH;
+        case  1:
+        if (likely((values[1] = __Pyx_PyDict_GetItemStr(__pyx_kwds, __pyx_n_s_offset_to_patch)) != 0)) kw_args--;
+        else {
+          __Pyx_RaiseArgtupleInvalid("_calc_center_of_patch", 1, 4, 4, 1); __PYX_ERR(0, 170, __pyx_L3_error)
+        }
+        CYTHON_FALLTHROUGH;
+        case  2:
+        if (likely((values[2] = __Pyx_PyDict_GetItemStr(__pyx_kwds, __pyx_n_s_xy_at_link)) != 0)) kw_args--;
+        else {
+          __Pyx_RaiseArgtupleInvalid("_calc_center_of_patch", 1, 4, 4, 2); __PYX_ERR(0, 170, __pyx_L3_error)
+        }
+        CYTHON_FALLTHROUGH;
+        case  3:
+        if (likely((values[3] = __Pyx_PyDict_GetItemStr(__pyx_kwds, __pyx_n_s_xy_at_patch)) != 0)) kw_args--;
+        else {
+          __Pyx_RaiseArgtupleInvalid("_calc_center_of_patch", 1, 4, 4, 3); __PYX_ERR(0, 170, __pyx_L3_error)
+        }
+      }
+      if (unlikely(kw_args > 0)) {
+        if (unlikely(__Pyx_ParseOptionalKeywords(__pyx_kwds, __pyx_pyargnames, 0, values, pos_args, "_calc_center_of_patch") < 0)) __PYX_ERR(0, 170, __pyx_L3_error)
+      }
+    } else if (PyTuple_GET_SIZE(__pyx_args) != 4) {
+      goto __pyx_L5_argtuple_error;
+    } else {
+      values[0] = PyTuple_GET_ITEM(__pyx_args, 0);
+      values[1] = PyTuple_GET_ITEM(__pyx_args, 1);
+      values[2] = PyTuple_GET_ITEM(__pyx_args, 2);
+      values[3] = PyTuple_GET_ITEM(__pyx_args, 3);
+    }
+    __pyx_v_links_at_patch = ((PyArrayObject *)values[0]);
+    __pyx_v_offset_to_patch = ((PyArrayObject *)values[1]);
+    __pyx_v_xy_at_link = ((PyArrayObject *)values[2]);
+    __pyx_v_xy_at_patch = ((PyArrayObject *)values[3]);
+  }
+  goto __pyx_L4_argument_unpacking_done;
+  __pyx_L5_argtuple_error:;
+  __Pyx_RaiseArgtupleInvalid("_calc_center_of_patch", 1, 4, 4, PyTuple_GET_SIZE(__pyx_args)); __PYX_ERR(0, 170, __pyx_L3_error)
+  __pyx_L3_error:;
+  __Pyx_AddTraceback("landlab.graph.cfuncs._calc_center_of_patch", __pyx_clineno, __pyx_lineno, __pyx_filename);
+  __Pyx_RefNannyFinishContext();
+  return NULL;
+  __pyx_L4_argument_unpacking_done:;
+  if (unlikely(!__Pyx_ArgTypeTest(((PyObject *)__pyx_v_links_at_patch), __pyx_ptype_5numpy_ndarray, 1, "links_at_patch", 0))) __PYX_ERR(0, 170, __pyx_L1_error)
+  if (unlikely(!__Pyx_ArgTypeTest(((PyObject *)__pyx_v_offset_to_patch), __pyx_ptype_5numpy_ndarray, 1, "offset_to_patch", 0))) __PYX_ERR(0, 171, __pyx_L1_error)
+  if (unlikely(!__Pyx_ArgTypeTest(((PyObject *)__pyx_v_xy_at_link), __pyx_ptype_5numpy_ndarray, 1, "xy_at_link", 0))) __PYX_ERR(0, 172, __pyx_L1_error)
+  if (unlikely(!__Pyx_ArgTypeTest(((PyObject *)__pyx_v_xy_at_patch), __pyx_ptype_5numpy_ndarray, 1, "xy_at_patch", 0))) __PYX_ERR(0, 173, __pyx_L1_error)
+  __pyx_r = __pyx_pf_7landlab_5graph_6cfuncs_10_calc_center_of_patch(__pyx_self, __pyx_v_links_at_patch, __pyx_v_offset_to_patch, __pyx_v_xy_at_link, __pyx_v_xy_at_patch);
+
+  /* function exit code */
+  goto __pyx_L0;
+  __pyx_L1_error:;
+  __pyx_r = NULL;
+  __pyx_L0:;
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+static PyObject *__pyx_pf_7landlab_5graph_6cfuncs_10_calc_center_of_patch(CYTHON_UNUSED PyObject *__pyx_self, PyArrayObject *__pyx_v_links_at_patch, PyArrayObject *__pyx_v_offset_to_patch, PyArrayObject *__pyx_v_xy_at_link, PyArrayObject *__pyx_v_xy_at_patch) {
+  int __pyx_v_patch;
+  int __pyx_v_link;
+  int __pyx_v_i;
+  int __pyx_v_offset;
+  int __pyx_v_n_links;
+  int __pyx_v_n_patches;
+  float __pyx_v_x;
+  float __pyx_v_y;
+  __Pyx_LocalBuf_ND __pyx_pybuffernd_links_at_patch;
+  __Pyx_Buffer __pyx_pybuffer_links_at_patch;
+  __Pyx_LocalBuf_ND __pyx_pybuffernd_offset_to_patch;
+  __Pyx_Buffer __pyx_pybuffer_offset_to_patch;
+  __Pyx_LocalBuf_ND __pyx_pybuffernd_xy_at_link;
+  __Pyx_Buffer __pyx_pybuffer_xy_at_link;
+  __Pyx_LocalBuf_ND __pyx_pybuffernd_xy_at_patch;
+  __Pyx_Buffer __pyx_pybuffer_xy_at_patch;
+  PyObject *__pyx_r = NULL;
+  __Pyx_RefNannyDeclarations
+  Py_ssize_t __pyx_t_1;
+  int __pyx_t_2;
+  int __pyx_t_3;
+  int __pyx_t_4;
+  Py_ssize_t __pyx_t_5;
+  int __pyx_t_6;
+  int __pyx_t_7;
+  int __pyx_t_8;
+  Py_ssize_t __pyx_t_9;
+  int __pyx_lineno = 0;
+  const char *__pyx_filename = NULL;
+  int __pyx_clineno = 0;
+  __Pyx_RefNannySetupContext("_calc_center_of_patch", 0);
+  __pyx_pybuffer_links_at_patch.pybuffer.buf = NULL;
+  __pyx_pybuffer_links_at_patch.refcount = 0;
+  __pyx_pybuffernd_links_at_patch.data = NULL;
+  __pyx_pybuffernd_links_at_patch.rcbuffer = &__pyx_pybuffer_links_at_patch;
+  __pyx_pybuffer_offset_to_patch.pybuffer.buf = NULL;
+  __pyx_pybuffer_offset_to_patch.refcount = 0;
+  __pyx_pybuffernd_offset_to_patch.data = NULL;
+  __pyx_pybuffernd_offset_to_patch.rcbuffer = &__pyx_pybuffer_offset_to_patch;
+  __pyx_pybuffer_xy_at_link.pybuffer.buf = NULL;
+  __pyx_pybuffer_xy_at_link.refcount = 0;
+  __pyx_pybuffernd_xy_at_link.data = NULL;
+  __pyx_pybuffernd_xy_at_link.rcbuffer = &__pyx_pybuffer_xy_at_link;
+  __pyx_pybuffer_xy_at_patch.pybuffer.buf = NULL;
+  __pyx_pybuffer_xy_at_patch.refcount = 0;
+  __pyx_pybuffernd_xy_at_patch.data = NULL;
+  __pyx_pybuffernd_xy_at_patch.rcbuffer = &__pyx_pybuffer_xy_at_patch;
+  {
+    __Pyx_BufFmt_StackElem __pyx_stack[1];
+    if (unlikely(__Pyx_GetBufferAndValidate(&__pyx_pybuffernd_links_at_patch.rcbuffer->pybuffer, (PyObject*)__pyx_v_links_at_patch, &__Pyx_TypeInfo_nn___pyx_t_7landlab_5graph_6cfuncs_DTYPE_t, PyBUF_FORMAT| PyBUF_STRIDES, 1, 0, __pyx_stack) == -1)) __PYX_ERR(0, 170, __pyx_L1_error)
+  }
+  __pyx_pybuffernd_links_at_patch.diminfo[0].strides = __pyx_pybuffernd_links_at_patch.rcbuffer->pybuffer.strides[0]; __pyx_pybuffernd_links_at_patch.diminfo[0].shape = __pyx_pybuffernd_links_at_patch.rcbuffer->pybuffer.shape[0];
+  {
+    __Pyx_BufFmt_StackElem __pyx_stack[1];
+    if (unlikely(__Pyx_GetBufferAndValidate(&__pyx_pybuffernd_offset_to_patch.rcbuffer->pybuffer, (PyObject*)__pyx_v_offset_to_patch, &__Pyx_TypeInfo_nn___pyx_t_7landlab_5graph_6cfuncs_DTYPE_t, PyBUF_FORMAT| PyBUF_STRIDES, 1, 0, __pyx_stack) == -1)) __PYX_ERR(0, 170, __pyx_L1_error)
+  }
+  __pyx_pybuffernd_offset_to_patch.diminfo[0].strides = __pyx_pybuffernd_offset_to_patch.rcbuffer->pybuffer.strides[0]; __pyx_pybuffernd_offset_to_patch.diminfo[0].shape = __pyx_pybuffernd_offset_to_patch.rcbuffer->pybuffer.shape[0];
+  {
+    __Pyx_BufFmt_StackElem __pyx_stack[1];
+    if (unlikely(__Pyx_GetBufferAndValidate(&__pyx_pybuffernd_xy_at_link.rcbuffer->pybuffer, (PyObject*)__pyx_v_xy_at_link, &__Pyx_TypeInfo_nn___pyx_t_5numpy_float_t, PyBUF_FORMAT| PyBUF_STRIDES, 2, 0, __pyx_stack) == -1)) __PYX_ERR(0, 170, __pyx_L1_error)
+  }
+  __pyx_pybuffernd_xy_at_link.diminfo[0].strides = __pyx_pybuffernd_xy_at_link.rcbuffer->pybuffer.strides[0]; __pyx_pybuffernd_xy_at_link.diminfo[0].shape = __pyx_pybuffernd_xy_at_link.rcbuffer->pybuffer.shape[0]; __pyx_pybuffernd_xy_at_link.diminfo[1].strides = __pyx_pybuffernd_xy_at_link.rcbuffer->pybuffer.strides[1]; __pyx_pybuffernd_xy_at_link.diminfo[1].shape = __pyx_pybuffernd_xy_at_link.rcbuffer->pybuffer.shape[1];
+  {
+    __Pyx_BufFmt_StackElem __pyx_stack[1];
+    if (unlikely(__Pyx_GetBufferAndValidate(&__pyx_pybuffernd_xy_at_patch.rcbuffer->pybuffer, (PyObject*)__pyx_v_xy_at_patch, &__Pyx_TypeInfo_nn___pyx_t_5numpy_float_t, PyBUF_FORMAT| PyBUF_STRIDES| PyBUF_WRITABLE, 2, 0, __pyx_stack) == -1)) __PYX_ERR(0, 170, __pyx_L1_error)
+  }
+  __pyx_pybuffernd_xy_at_patch.diminfo[0].strides = __pyx_pybuffernd_xy_at_patch.rcbuffer->pybuffer.strides[0]; __pyx_pybuffernd_xy_at_patch.diminfo[0].shape = __pyx_pybuffernd_xy_at_patch.rcbuffer->pybuffer.shape[0]; __pyx_pybuffernd_xy_at_patch.diminfo[1].strides = __pyx_pybuffernd_xy_at_patch.rcbuffer->pybuffer.strides[1]; __pyx_pybuffernd_xy_at_patch.diminfo[1].shape = __pyx_pybuffernd_xy_at_patch.rcbuffer->pybuffer.shape[1];
+
+  /* "landlab/graph/cfuncs.pyx":179
+ *     cdef int offset
+ *     cdef int n_links
+ *     cdef int n_patches = len(xy_at_patch)             # <<<<<<<<<<<<<<
+ *     cdef float x
+ *     cdef float y
+ */
+  __pyx_t_1 = PyObject_Length(((PyObject *)__pyx_v_xy_at_patch)); if (unlikely(__pyx_t_1 == ((Py_ssize_t)-1))) __PYX_ERR(0, 179, __pyx_L1_error)
+  __pyx_v_n_patches = __pyx_t_1;
+
+  /* "landlab/graph/cfuncs.pyx":183
+ *     cdef float y
+ * 
+ *     for patch in range(n_patches):             # <<<<<<<<<<<<<<
+ *         offset = offset_to_patch[patch]
+ *         n_links = offset_to_patch[patch + 1] - offset
+ */
+  __pyx_t_2 = __pyx_v_n_patches;
+  __pyx_t_3 = __pyx_t_2;
+  for (__pyx_t_4 = 0; __pyx_t_4 < __pyx_t_3; __pyx_t_4+=1) {
+    __pyx_v_patch = __pyx_t_4;
+
+    /* "landlab/graph/cfuncs.pyx":184
+ * 
+ *     for patch in range(n_patches):
+ *         offset = offset_to_patch[patch]             # <<<<<<<<<<<<<<
+ *         n_links = offset_to_patch[patch + 1] - offset
+ *         x = 0.
+ */
+    __pyx_t_5 = __pyx_v_patch;
+    if (__pyx_t_5 < 0) __pyx_t_5 += __pyx_pybuffernd_offset_to_patch.diminfo[0].shape;
+    __pyx_v_offset = (*__Pyx_BufPtrStrided1d(__pyx_t_7landlab_5graph_6cfuncs_DTYPE_t *, __pyx_pybuffernd_offset_to_patch.rcbuffer->pybuffer.buf, __pyx_t_5, __pyx_pybuffernd_offset_to_patch.diminfo[0].strides));
+
+    /* "landlab/graph/cfuncs.pyx":185
+ *     for patch in range(n_patches):
+ *         offset = offset_to_patch[patch]
+ *         n_links = offset_to_patch[patch + 1] - offset             # <<<<<<<<<<<<<<
+ *         x = 0.
+ *         y = 0.
+ */
+    __pyx_t_5 = (__pyx_v_patch + 1);
+    if (__pyx_t_5 < 0) __pyx_t_5 += __pyx_pybuffernd_offset_to_patch.diminfo[0].shape;
+    __pyx_v_n_links = ((*__Pyx_BufPtrStrided1d(__pyx_t_7landlab_5graph_6cfuncs_DTYPE_t *, __pyx_pybuffernd_offset_to_patch.rcbuffer->pybuffer.buf, __pyx_t_5, __pyx_pybuffernd_offset_to_patch.diminfo[0].strides)) - __pyx_v_offset);
+
+    /* "landlab/graph/cfuncs.pyx":186
+ *         offset = offset_to_patch[patch]
+ *         n_links = offset_to_patch[patch + 1] - offset
+ *         x = 0.             # <<<<<<<<<<<<<<
+ *         y = 0.
+ *         for i in range(offset, offset + n_links):
+ */
+    __pyx_v_x = 0.;
+
+    /* "landlab/graph/cfuncs.pyx":187
+ *         n_links = offset_to_patch[patch + 1] - offset
+ *         x = 0.
+ *         y = 0.             # <<<<<<<<<<<<<<
+ *         for i in range(offset, offset + n_links):
+ *             link = links_at_patch[i]
+ */
+    __pyx_v_y = 0.;
+
+    /* "landlab/graph/cfuncs.pyx":188
+ *         x = 0.
+ *         y = 0.
+ *         for i in range(offset, offset + n_links):             # <<<<<<<<<<<<<<
+ *             link = links_at_patch[i]
+ *             x += xy_at_link[link, 0]
+ */
+    __pyx_t_6 = (__pyx_v_offset + __pyx_v_n_links);
+    __pyx_t_7 = __pyx_t_6;
+    for (__pyx_t_8 = __pyx_v_offset; __pyx_t_8 < __pyx_t_7; __pyx_t_8+=1) {
+      __pyx_v_i = __pyx_t_8;
+
+      /* "landlab/graph/cfuncs.pyx":189
+ *         y = 0.
+ *         for i in range(offset, offset + n_links):
+ *             link = links_at_patch[i]             # <<<<<<<<<<<<<<
+ *             x += xy_at_link[link, 0]
+ *             y += xy_at_link[link, 1]
+ */
+      __pyx_t_5 = __pyx_v_i;
+      if (__pyx_t_5 < 0) __pyx_t_5 += __pyx_pybuffernd_links_at_patch.diminfo[0].shape;
+      __pyx_v_link = (*__Pyx_BufPtrStrided1d(__pyx_t_7landlab_5graph_6cfuncs_DTYPE_t *, __pyx_pybuffernd_links_at_patch.rcbuffer->pybuffer.buf, __pyx_t_5, __pyx_pybuffernd_links_at_patch.diminfo[0].strides));
+
+      /* "landlab/graph/cfuncs.pyx":190
+ *         for i in range(offset, offset + n_links):
+ *             link = links_at_patch[i]
+ *             x += xy_at_link[link, 0]             # <<<<<<<<<<<<<<
+ *             y += xy_at_link[link, 1]
+ *         xy_at_patch[patch, 0] = x / n_links
+ */
+      __pyx_t_5 = __pyx_v_link;
+      __pyx_t_9 = 0;
+      if (__pyx_t_5 < 0) __pyx_t_5 += __pyx_pybuffernd_xy_at_link.diminfo[0].shape;
+      if (__pyx_t_9 < 0) __pyx_t_9 += __pyx_pybuffernd_xy_at_link.diminfo[1].shape;
+      __pyx_v_x = (__pyx_v_x + (*__Pyx_BufPtrStrided2d(__pyx_t_5numpy_float_t *, __pyx_pybuffernd_xy_at_link.rcbuffer->pybuffer.buf, __pyx_t_5, __pyx_pybuffernd_xy_at_link.diminfo[0].strides, __pyx_t_9, __pyx_pybuffernd_xy_at_link.diminfo[1].strides)));
+
+      /* "landlab/graph/cfuncs.pyx":191
+ *             link = links_at_patch[i]
+ *             x += xy_at_link[link, 0]
+ *             y += xy_at_link[link, 1]             # <<<<<<<<<<<<<<
+ *         xy_at_patch[patch, 0] = x / n_links
+ *         xy_at_patch[patch, 1] = y / n_links
+ */
+      __pyx_t_9 = __pyx_v_link;
+      __pyx_t_5 = 1;
+      if (__pyx_t_9 < 0) __pyx_t_9 += __pyx_pybuffernd_xy_at_link.diminfo[0].shape;
+      if (__pyx_t_5 < 0) __pyx_t_5 += __pyx_pybuffernd_xy_at_link.diminfo[1].shape;
+      __pyx_v_y = (__pyx_v_y + (*__Pyx_BufPtrStrided2d(__pyx_t_5numpy_float_t *, __pyx_pybuffernd_xy_at_link.rcbuffer->pybuffer.buf, __pyx_t_9, __pyx_pybuffernd_xy_at_link.diminfo[0].strides, __pyx_t_5, __pyx_pybuffernd_xy_at_link.diminfo[1].strides)));
+    }
+
+    /* "landlab/graph/cfuncs.pyx":192
+ *             x += xy_at_link[link, 0]
+ *             y += xy_at_link[link, 1]
+ *         xy_at_patch[patch, 0] = x / n_links             # <<<<<<<<<<<<<<
+ *         xy_at_patch[patch, 1] = y / n_links
+ * 
+ */
+    if (unlikely(__pyx_v_n_links == 0)) {
+      PyErr_SetString(PyExc_ZeroDivisionError, "float division");
+      __PYX_ERR(0, 192, __pyx_L1_error)
+    }
+    __pyx_t_5 = __pyx_v_patch;
+    __pyx_t_9 = 0;
+    if (__pyx_t_5 < 0) __pyx_t_5 += __pyx_pybuffernd_xy_at_patch.diminfo[0].shape;
+    if (__pyx_t_9 < 0) __pyx_t_9 += __pyx_pybuffernd_xy_at_patch.diminfo[1].shape;
+    *__Pyx_BufPtrStrided2d(__pyx_t_5numpy_float_t *, __pyx_pybuffernd_xy_at_patch.rcbuffer->pybuffer.buf, __pyx_t_5, __pyx_pybuffernd_xy_at_patch.diminfo[0].strides, __pyx_t_9, __pyx_pybuffernd_xy_at_patch.diminfo[1].strides) = (__pyx_v_x / __pyx_v_n_links);
+
+    /* "landlab/graph/cfuncs.pyx":193
+ *             y += xy_at_link[link, 1]
+ *         xy_at_patch[patch, 0] = x / n_links
+ *         xy_at_patch[patch, 1] = y / n_links             # <<<<<<<<<<<<<<
+ * 
+ * 
+ */
+    if (unlikely(__pyx_v_n_links == 0)) {
+      PyErr_SetString(PyExc_ZeroDivisionError, "float division");
+      __PYX_ERR(0, 193, __pyx_L1_error)
+    }
+    __pyx_t_9 = __pyx_v_patch;
+    __pyx_t_5 = 1;
+    if (__pyx_t_9 < 0) __pyx_t_9 += __pyx_pybuffernd_xy_at_patch.diminfo[0].shape;
+    if (__pyx_t_5 < 0) __pyx_t_5 += __pyx_pybuffernd_xy_at_patch.diminfo[1].shape;
+    *__Pyx_BufPtrStrided2d(__pyx_t_5numpy_float_t *, __pyx_pybuffernd_xy_at_patch.rcbuffer->pybuffer.buf, __pyx_t_9, __pyx_pybuffernd_xy_at_patch.diminfo[0].strides, __pyx_t_5, __pyx_pybuffernd_xy_at_patch.diminfo[1].strides) = (__pyx_v_y / __pyx_v_n_links);
+  }
+
+  /* "landlab/graph/cfuncs.pyx":170
+ * 
+ * @cython.boundscheck(False)
+ * def _calc_center_of_patch(np.ndarray[DTYPE_t, ndim=1] links_at_patch,             # <<<<<<<<<<<<<<
+ *                           np.ndarray[DTYPE_t, ndim=1] offset_to_patch,
+ *                           np.ndarray[np.float_t, ndim=2] xy_at_link,
+ */
+
+  /* function exit code */
+  __pyx_r = Py_None; __Pyx_INCREF(Py_None);
+  goto __pyx_L0;
+  __pyx_L1_error:;
+  { PyObject *__pyx_type, *__pyx_value, *__pyx_tb;
+    __Pyx_PyThreadState_declare
+    __Pyx_PyThreadState_assign
+    __Pyx_ErrFetch(&__pyx_type, &__pyx_value, &__pyx_tb);
+    __Pyx_SafeReleaseBuffer(&__pyx_pybuffernd_links_at_patch.rcbuffer->pybuffer);
+    __Pyx_SafeReleaseBuffer(&__pyx_pybuffernd_offset_to_patch.rcbuffer->pybuffer);
+    __Pyx_SafeReleaseBuffer(&__pyx_pybuffernd_xy_at_link.rcbuffer->pybuffer);
+    __Pyx_SafeReleaseBuffer(&__pyx_pybuffernd_xy_at_patch.rcbuffer->pybuffer);
+  __Pyx_ErrRestore(__pyx_type, __pyx_value, __pyx_tb);}
+  __Pyx_AddTraceback("landlab.graph.cfuncs._calc_center_of_patch", __pyx_clineno, __pyx_lineno, __pyx_filename);
+  __pyx_r = NULL;
+  goto __pyx_L2;
+  __pyx_L0:;
+  __Pyx_SafeReleaseBuffer(&__pyx_pybuffernd_links_at_patch.rcbuffer->pybuffer);
+  __Pyx_SafeReleaseBuffer(&__pyx_pybuffernd_offset_to_patch.rcbuffer->pybuffer);
+  __Pyx_SafeReleaseBuffer(&__pyx_pybuffernd_xy_at_link.rcbuffer->pybuffer);
+  __Pyx_SafeReleaseBuffer(&__pyx_pybuffernd_xy_at_patch.rcbuffer->pybuffer);
+  __pyx_L2:;
+  __Pyx_XGIVEREF(__pyx_r);
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+/* "landlab/graph/cfuncs.pyx":197
+ * 
+ * @cython.boundscheck(False)
+ * def _resort_patches(np.ndarray[DTYPE_t, ndim=1] links_at_patch,             # <<<<<<<<<<<<<<
+ *                     np.ndarray[DTYPE_t, ndim=1] offset_to_patch,
+ *                     np.ndarray[DTYPE_t, ndim=1] sorted_patches):
+ */
+
+/* Python wrapper */
+static PyObject *__pyx_pw_7landlab_5graph_6cfuncs_13_resort_patches(PyObject *__pyx_self, PyObject *__pyx_args, PyObject *__pyx_kwds); /*proto*/
+static PyMethodDef __pyx_mdef_7landlab_5graph_6cfuncs_13_resort_patches = {"_resort_patches", (PyCFunction)(void*)(PyCFunctionWithKeywords)__pyx_pw_7landlab_5graph_6cfuncs_13_resort_patches, METH_VARARGS|METH_KEYWORDS, 0};
+static PyObject *__pyx_pw_7landlab_5graph_6cfuncs_13_resort_patches(PyObject *__pyx_self, PyObject *__pyx_args, PyObject *__pyx_kwds) {
+  PyArrayObject *__pyx_v_links_at_patch = 0;
+  PyArrayObject *__pyx_v_offset_to_patch = 0;
+  PyArrayObject *__pyx_v_sorted_patches = 0;
+  int __pyx_lineno = 0;
+  const char *__pyx_filename = NULL;
+  int __pyx_clineno = 0;
+  PyObject *__pyx_r = 0;
+  __Pyx_RefNannyDeclarations
+  __Pyx_RefNannySetupContext("_resort_patches (wrapper)", 0);
+  {
+    static PyObject **__pyx_pyargnames[] = {&__pyx_n_s_links_at_patch,&__pyx_n_s_offset_to_patch,&__pyx_n_s_sorted_patches,0};
+    PyObject* values[3] = {0,0,0};
+    if (unlikely(__pyx_kwds)) {
+      Py_ssize_t kw_args;
+      const Py_ssize_t pos_args = PyTuple_GET_SIZE(__pyx_args);
+      switch (pos_args) {
+        case  3: values[2] = PyTuple_GET_ITEM(__pyx_args, 2);
+        CYTHON_FALLTHROUGH;
+        case  2: values[1] = PyTuple_GET_ITEM(__pyx_args, 1);
+        CYTHON_FALLTHROUGH;
+        case  1: values[0] = PyTuple_GET_ITEM(__pyx_args, 0);
+        CYTHON_FALLTHROUGH;
+        case  0: break;
+        default: goto __pyx_L5_argtuple_error;
+      }
+      kw_args = PyDict_Size(__pyx_kwds);
+      switch (pos_args) {
+        case  0:
+        if (likely((values[0] = __Pyx_PyDict_GetItemStr(__pyx_kwds, __pyx_n_s_links_at_patch)) != 0)) kw_args--;
+        else goto __pyx_L5_argtuple_error;
+        CYTHON_FALLTHROUGH;
+        case  1:
+        if (likely((values[1] = __Pyx_PyDict_GetItemStr(__pyx_kwds, __pyx_n_s_offset_to_patch)) != 0)) kw_args--;
+        else {
+          __Pyx_RaiseArgtupleInvalid("_resort_patches", 1, 3, 3, 1); __PYX_ERR(0, 197, __pyx_L3_error)
+        }
+        CYTHON_FALLTHROUGH;
+        case  2:
+        if (likely((values[2] = __Pyx_PyDict_GetItemStr(__pyx_kwds, __pyx_n_s_sorted_patches)) != 0)) kw_args--;
+        else {
+          __Pyx_RaiseArgtupleInvalid("_resort_patches", 1, 3, 3, 2); __PYX_ERR(0, 197, __pyx_L3_error)
+        }
+      }
+      if (unlikely(kw_args > 0)) {
+        if (unlikely(__Pyx_ParseOptionalKeywords(__pyx_kwds, __pyx_pyargnames, 0, values, pos_args, "_resort_patches") < 0)) __PYX_ERR(0, 197, __pyx_L3_error)
+      }
+    } else if (PyTuple_GET_SIZE(__pyx_args) != 3) {
+      goto __pyx_L5_argtuple_error;
+    } else {
+      values[0] = PyTuple_GET_ITEM(__pyx_args, 0);
+      values[1] = PyTuple_GET_ITEM(__pyx_args, 1);
+      values[2] = PyTuple_GET_ITEM(__pyx_args, 2);
+    }
+    __pyx_v_links_at_patch = ((PyArrayObject *)values[0]);
+    __pyx_v_offset_to_patch = ((PyArrayObject *)values[1]);
+    __pyx_v_sorted_patches = ((PyArrayObject *)values[2]);
+  }
+  goto __pyx_L4_argument_unpacking_done;
+  __pyx_L5_argtuple_error:;
+  __Pyx_RaiseArgtupleInvalid("_resort_patches", 1, 3, 3, PyTuple_GET_SIZE(__pyx_args)); __PYX_ERR(0, 197, __pyx_L3_error)
+  __pyx_L3_error:;
+  __Pyx_AddTraceback("landlab.graph.cfuncs._resort_patches", __pyx_clineno, __pyx_lineno, __pyx_filename);
+  __Pyx_RefNannyFinishContext();
+  return NULL;
+  __pyx_L4_argument_unpacking_done:;
+  if (unlikely(!__Pyx_ArgTypeTest(((PyObject *)__pyx_v_links_at_patch), __pyx_ptype_5numpy_ndarray, 1, "links_at_patch", 0))) __PYX_ERR(0, 197, __pyx_L1_error)
+  if (unlikely(!__Pyx_ArgTypeTest(((PyObject *)__pyx_v_offset_to_patch), __pyx_ptype_5numpy_ndarray, 1, "offset_to_patch", 0))) __PYX_ERR(0, 198, __pyx_L1_error)
+  if (unlikely(!__Pyx_ArgTypeTest(((PyObject *)__pyx_v_sorted_patches), __pyx_ptype_5numpy_ndarray, 1, "sorted_patches", 0))) __PYX_ERR(0, 199, __pyx_L1_error)
+  __pyx_r = __pyx_pf_7landlab_5graph_6cfuncs_12_resort_patches(__pyx_self, __pyx_v_links_at_patch, __pyx_v_offset_to_patch, __pyx_v_sorted_patches);
+
+  /* function exit code */
+  goto __pyx_L0;
+  __pyx_L1_error:;
+  __pyx_r = NULL;
+  __pyx_L0:;
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+static PyObject *__pyx_pf_7landlab_5graph_6cfuncs_12_resort_patches(CYTHON_UNUSED PyObject *__pyx_self, PyArrayObject *__pyx_v_links_at_patch, PyArrayObject *__pyx_v_offset_to_patch, PyArrayObject *__pyx_v_sorted_patches) {
+  int __pyx_v_i;
+  int __pyx_v_patch;
+  int __pyx_v_offset;
+  int __pyx_v_n_links;
+  int __pyx_v_n_patches;
+  int *__pyx_v_new_offset;
+  int *__pyx_v_new_patches;
+  __Pyx_LocalBuf_ND __pyx_pybuffernd_links_at_patch;
+  __Pyx_Buffer __pyx_pybuffer_links_at_patch;
+  __Pyx_LocalBuf_ND __pyx_pybuffernd_offset_to_patch;
+  __Pyx_Buffer __pyx_pybuffer_offset_to_patch;
+  __Pyx_LocalBuf_ND __pyx_pybuffernd_sorted_patches;
+  __Pyx_Buffer __pyx_pybuffer_sorted_patches;
+  PyObject *__pyx_r = NULL;
+  __Pyx_RefNannyDeclarations
+  Py_ssize_t __pyx_t_1;
+  int __pyx_t_2;
+  int __pyx_t_3;
+  int __pyx_t_4;
+  Py_ssize_t __pyx_t_5;
+  Py_ssize_t __pyx_t_6;
+  int __pyx_t_7;
+  int __pyx_t_8;
+  int __pyx_t_9;
+  Py_ssize_t __pyx_t_10;
+  char const *__pyx_t_11;
+  PyObject *__pyx_t_12 = NULL;
+  PyObject *__pyx_t_13 = NULL;
+  PyObject *__pyx_t_14 = NULL;
+  PyObject *__pyx_t_15 = NULL;
+  PyObject *__pyx_t_16 = NULL;
+  PyObject *__pyx_t_17 = NULL;
+  int __pyx_lineno = 0;
+  const char *__pyx_filename = NULL;
+  int __pyx_clineno = 0;
+  __Pyx_RefNannySetupContext("_resort_patches", 0);
+  __pyx_pybuffer_links_at_patch.pybuffer.buf = NULL;
+  __pyx_pybuffer_links_at_patch.refcount = 0;
+  __pyx_pybuffernd_links_at_patch.data = NULL;
+  __pyx_pybuffernd_links_at_patch.rcbuffer = &__pyx_pybuffer_links_at_patch;
+  __pyx_pybuffer_offset_to_patch.pybuffer.buf = NULL;
+  __pyx_pybuffer_offset_to_patch.refcount = 0;
+  __pyx_pybuffernd_offset_to_patch.data = NULL;
+  __pyx_pybuffernd_offset_to_patch.rcbuffer = &__pyx_pybuffer_offset_to_patch;
+  __pyx_pybuffer_sorted_patches.pybuffer.buf = NULL;
+  __pyx_pybuffer_sorted_patches.refcount = 0;
+  __pyx_pybuffernd_sorted_patches.data = NULL;
+  __pyx_pybuffernd_sorted_patches.rcbuffer = &__pyx_pybuffer_sorted_patches;
+  {
+    __Pyx_BufFmt_StackElem __pyx_stack[1];
+    if (unlikely(__Pyx_GetBufferAndValidate(&__pyx_pybuffernd_links_at_patch.rcbuffer->pybuffer, (PyObject*)__pyx_v_links_at_patch, &__Pyx_TypeInfo_nn___pyx_t_7landlab_5graph_6cfuncs_DTYPE_t, PyBUF_FORMAT| PyBUF_STRIDES| PyBUF_WRITABLE, 1, 0, __pyx_stack) == -1)) __PYX_ERR(0, 197, __pyx_L1_error)
+  }
+  __pyx_pybuffernd_links_at_patch.diminfo[0].strides = __pyx_pybuffernd_links_at_patch.rcbuffer->pybuffer.strides[0]; __pyx_pybuffernd_links_at_patch.diminfo[0].shape = __pyx_pybuffernd_links_at_patch.rcbuffer->pybuffer.shape[0];
+  {
+    __Pyx_BufFmt_StackElem __pyx_stack[1];
+    if (unlikely(__Pyx_GetBufferAndValidate(&__pyx_pybuffernd_offset_to_patch.rcbuffer->pybuffer, (PyObject*)__pyx_v_offset_to_patch, &__Pyx_TypeInfo_nn___pyx_t_7landlab_5graph_6cfuncs_DTYPE_t, PyBUF_FORMAT| PyBUF_STRIDES| PyBUF_WRITABLE, 1, 0, __pyx_stack) == -1)) __PYX_ERR(0, 197, __pyx_L1_error)
+  }
+  __pyx_pybuffernd_offset_to_patch.diminfo[0].strides = __pyx_pybuffernd_offset_to_patch.rcbuffer->pybuffer.strides[0]; __pyx_pybuffernd_offset_to_patch.diminfo[0].shape = __pyx_pybuffernd_offset_to_patch.rcbuffer->pybuffer.shape[0];
+  {
+    __Pyx_BufFmt_StackElem __pyx_stack[1];
+    if (unlikely(__Pyx_GetBufferAndValidate(&__pyx_pybuffernd_sorted_patches.rcbuffer->pybuffer, (PyObject*)__pyx_v_sorted_patches, &__Pyx_TypeInfo_nn___pyx_t_7landlab_5graph_6cfuncs_DTYPE_t, PyBUF_FORMAT| PyBUF_STRIDES, 1, 0, __pyx_stack) == -1)) __PYX_ERR(0, 197, __pyx_L1_error)
+  }
+  __pyx_pybuffernd_sorted_patches.diminfo[0].strides = __pyx_pybuffernd_sorted_patches.rcbuffer->pybuffer.strides[0]; __pyx_pybuffernd_sorted_patches.diminfo[0].shape = __pyx_pybuffernd_sorted_patches.rcbuffer->pybuffer.shape[0];
+
+  /* "landlab/graph/cfuncs.pyx":204
+ *     cdef int offset
+ *     cdef int n_links
+ *     cdef int n_patches = len(sorted_patches)             # <<<<<<<<<<<<<<
+ *     cdef int *new_offset = <int *>malloc(len(offset_to_patch) * sizeof(int))
+ *     cdef int *new_patches = <int *>malloc(len(links_at_patch) * sizeof(int))
+ */
+  __pyx_t_1 = PyObject_Length(((PyObject *)__pyx_v_sorted_patches)); if (unlikely(__pyx_t_1 == ((Py_ssize_t)-1))) __PYX_ERR(0, 204, __pyx_L1_error)
+  __pyx_v_n_patches = __pyx_t_1;
+
+  /* "landlab/graph/cfuncs.pyx":205
+ *     cdef int n_links
+ *     cdef int n_patches = len(sorted_patches)
+ *     cdef int *new_offset = <int *>malloc(len(offset_to_patch) * sizeof(int))             # <<<<<<<<<<<<<<
+ *     cdef int *new_patches = <int *>malloc(len(links_at_patch) * sizeof(int))
+ * 
+ */
+  __pyx_t_1 = PyObject_Length(((PyObject *)__pyx_v_offset_to_patch)); if (unlikely(__pyx_t_1 == ((Py_ssize_t)-1))) __PYX_ERR(0, 205, __pyx_L1_error)
+  __pyx_v_new_offset = ((int *)malloc((__pyx_t_1 * (sizeof(int)))));
+
+  /* "landlab/graph/cfuncs.pyx":206
+ *     cdef int n_patches = len(sorted_patches)
+ *     cdef int *new_offset = <int *>malloc(len(offset_to_patch) * sizeof(int))
+ *     cdef int *new_patches = <int *>malloc(len(links_at_patch) * sizeof(int))             # <<<<<<<<<<<<<<
+ * 
+ *     try:
+ */
+  __pyx_t_1 = PyObject_Length(((PyObject *)__pyx_v_links_at_patch)); if (unlikely(__pyx_t_1 == ((Py_ssize_t)-1))) __PYX_ERR(0, 206, __pyx_L1_error)
+  __pyx_v_new_patches = ((int *)malloc((__pyx_t_1 * (sizeof(int)))));
+
+  /* "landlab/graph/cfuncs.pyx":208
+ *     cdef int *new_patches = <int *>malloc(len(links_at_patch) * sizeof(int))
+ * 
+ *     try:             # <<<<<<<<<<<<<<
+ *         new_offset[0] = 0
+ *         for patch in range(n_patches):
+ */
+  /*try:*/ {
+
+    /* "landlab/graph/cfuncs.pyx":209
+ * 
+ *     try:
+ *         new_offset[0] = 0             # <<<<<<<<<<<<<<
+ *         for patch in range(n_patches):
+ *             offset = offset_to_patch[sorted_patches[patch]]
+ */
+    (__pyx_v_new_offset[0]) = 0;
+
+    /* "landlab/graph/cfuncs.pyx":210
+ *     try:
+ *         new_offset[0] = 0
+ *         for patch in range(n_patches):             # <<<<<<<<<<<<<<
+ *             offset = offset_to_patch[sorted_patches[patch]]
+ *             n_links = offset_to_patch[sorted_patches[patch] + 1] - offset
+ */
+    __pyx_t_2 = __pyx_v_n_patches;
+    __pyx_t_3 = __pyx_t_2;
+    for (__pyx_t_4 = 0; __pyx_t_4 < __pyx_t_3; __pyx_t_4+=1) {
+      __pyx_v_patch = __pyx_t_4;
+
+      /* "landlab/graph/cfuncs.pyx":211
+ *         new_offset[0] = 0
+ *         for patch in range(n_patches):
+ *             offset = offset_to_patch[sorted_patches[patch]]             # <<<<<<<<<<<<<<
+ *             n_links = offset_to_patch[sorted_patches[patch] + 1] - offset
+ * 
+ */
+      __pyx_t_5 = __pyx_v_patch;
+      if (__pyx_t_5 < 0) __pyx_t_5 += __pyx_pybuffernd_sorted_patches.diminfo[0].shape;
+      __pyx_t_6 = (*__Pyx_BufPtrStrided1d(__pyx_t_7landlab_5graph_6cfuncs_DTYPE_t *, __pyx_pybuffernd_sorted_patches.rcbuffer->pybuffer.buf, __pyx_t_5, __pyx_pybuffernd_sorted_patches.diminfo[0].strides));
+      if (__pyx_t_6 < 0) __pyx_t_6 += __pyx_pybuffernd_offset_to_patch.diminfo[0].shape;
+      __pyx_v_offset = (*__Pyx_BufPtrStrided1d(__pyx_t_7landlab_5graph_6cfuncs_DTYPE_t *, __pyx_pybuffernd_offset_to_patch.rcbuffer->pybuffer.buf, __pyx_t_6, __pyx_pybuffernd_offset_to_patch.diminfo[0].strides));
+
+      /* "landlab/graph/cfuncs.pyx":212
+ *         for patch in range(n_patches):
+ *             offset = offset_to_patch[sorted_patches[patch]]
+ *             n_links = offset_to_patch[sorted_patches[patch] + 1] - offset             # <<<<<<<<<<<<<<
+ * 
+ *             new_offset[patch + 1] = new_offset[patch] + n_links
+ */
+      __pyx_t_5 = __pyx_v_patch;
+      if (__pyx_t_5 < 0) __pyx_t_5 += __pyx_pybuffernd_sorted_patches.diminfo[0].shape;
+      __pyx_t_6 = ((*__Pyx_BufPtrStrided1d(__pyx_t_7landlab_5graph_6cfuncs_DTYPE_t *, __pyx_pybuffernd_sorted_patches.rcbuffer->pybuffer.buf, __pyx_t_5, __pyx_pybuffernd_sorted_patches.diminfo[0].strides)) + 1);
+      if (__pyx_t_6 < 0) __pyx_t_6 += __pyx_pybuffernd_offset_to_patch.diminfo[0].shape;
+      __pyx_v_n_links = ((*__Pyx_BufPtrStrided1d(__pyx_t_7landlab_5graph_6cfuncs_DTYPE_t *, __pyx_pybuffernd_offset_to_patch.rcbuffer->pybuffer.buf, __pyx_t_6, __pyx_pybuffernd_offset_to_patch.diminfo[0].strides)) - __pyx_v_offset);
+
+      /* "landlab/graph/cfuncs.pyx":214
+ *             n_links = offset_to_patch[sorted_patches[patch] + 1] - offset
+ * 
+ *             new_offset[patch + 1] = new_offset[patch] + n_links             # <<<<<<<<<<<<<<
+ *             for i in range(n_links):
+ *                 new_patches[new_offset[patch] + i] = links_at_patch[offset + i]
+ */
+      (__pyx_v_new_offset[(__pyx_v_patch + 1)]) = ((__pyx_v_new_offset[__pyx_v_patch]) + __pyx_v_n_links);
+
+      /* "landlab/graph/cfuncs.pyx":215
+ * 
+ *             new_offset[patch + 1] = new_offset[patch] + n_links
+ *             for i in range(n_links):             # <<<<<<<<<<<<<<
+ *                 new_patches[new_offset[patch] + i] = links_at_patch[offset + i]
+ * 
+ */
+      __pyx_t_7 = __pyx_v_n_links;
+      __pyx_t_8 = __pyx_t_7;
+      for (__pyx_t_9 = 0; __pyx_t_9 < __pyx_t_8; __pyx_t_9+=1) {
+        __pyx_v_i = __pyx_t_9;
+
+        /* "landlab/graph/cfuncs.pyx":216
+ *             new_offset[patch + 1] = new_offset[patch] + n_links
+ *             for i in range(n_links):
+ *                 new_patches[new_offset[patch] + i] = links_at_patch[offset + i]             # <<<<<<<<<<<<<<
+ * 
+ *         for i in range(len(links_at_patch)):
+ */
+        __pyx_t_5 = (__pyx_v_offset + __pyx_v_i);
+        if (__pyx_t_5 < 0) __pyx_t_5 += __pyx_pybuffernd_links_at_patch.diminfo[0].shape;
+        (__pyx_v_new_patches[((__pyx_v_new_offset[__pyx_v_patch]) + __pyx_v_i)]) = (*__Pyx_BufPtrStrided1d(__pyx_t_7landlab_5graph_6cfuncs_DTYPE_t *, __pyx_pybuffernd_links_at_patch.rcbuffer->pybuffer.buf, __pyx_t_5, __pyx_pybuffernd_links_at_patch.diminfo[0].strides));
+      }
+    }
+
+    /* "landlab/graph/cfuncs.pyx":218
+ *                 new_patches[new_offset[patch] + i] = links_at_patch[offset + i]
+ * 
+ *         for i in range(len(links_at_patch)):             # <<<<<<<<<<<<<<
+ *             links_at_patch[i] = new_patches[i]
+ *         for i in range(len(offset_to_patch)):
+ */
+    __pyx_t_1 = PyObject_Length(((PyObject *)__pyx_v_links_at_patch)); if (unlikely(__pyx_t_1 == ((Py_ssize_t)-1))) __PYX_ERR(0, 218, __pyx_L4_error)
+    __pyx_t_10 = __pyx_t_1;
+    for (__pyx_t_2 = 0; __pyx_t_2 < __pyx_t_10; __pyx_t_2+=1) {
+      __pyx_v_i = __pyx_t_2;
+
+      /* "landlab/graph/cfuncs.pyx":219
+ * 
+ *         for i in range(len(links_at_patch)):
+ *             links_at_patch[i] = new_patches[i]             # <<<<<<<<<<<<<<
+ *         for i in range(len(offset_to_patch)):
+ *             offset_to_patch[i] = new_offset[i]
+ */
+      __pyx_t_5 = __pyx_v_i;
+      if (__pyx_t_5 < 0) __pyx_t_5 += __pyx_pybuffernd_links_at_patch.diminfo[0].shape;
+      *__Pyx_BufPtrStrided1d(__pyx_t_7landlab_5graph_6cfuncs_DTYPE_t *, __pyx_pybuffernd_links_at_patch.rcbuffer->pybuffer.buf, __pyx_t_5, __pyx_pybuffernd_links_at_patch.diminfo[0].strides) = (__pyx_v_new_patches[__pyx_v_i]);
+    }
+
+    /* "landlab/graph/cfuncs.pyx":220
+ *         for i in range(len(links_at_patch)):
+ *             links_at_patch[i] = new_patches[i]
+ *         for i in range(len(offset_to_patch)):             # <<<<<<<<<<<<<<
+ *             offset_to_patch[i] = new_offset[i]
+ *     finally:
+ */
+    __pyx_t_1 = PyObject_Length(((PyObject *)__pyx_v_offset_to_patch)); if (unlikely(__pyx_t_1 == ((Py_ssize_t)-1))) __PYX_ERR(0, 220, __pyx_L4_error)
+    __pyx_t_10 = __pyx_t_1;
+    for (__pyx_t_2 = 0; __pyx_t_2 < __pyx_t_10; __pyx_t_2+=1) {
+      __pyx_v_i = __pyx_t_2;
+
+      /* "landlab/graph/cfuncs.pyx":221
+ *             links_at_patch[i] = new_patches[i]
+ *         for i in range(len(offset_to_patch)):
+ *             offset_to_patch[i] = new_offset[i]             # <<<<<<<<<<<<<<
+ *     finally:
+ *         free(new_offset)
+ */
+      __pyx_t_5 = __pyx_v_i;
+      if (__pyx_t_5 < 0) __pyx_t_5 += __pyx_pybuffernd_offset_to_patch.diminfo[0].shape;
+      *__Pyx_BufPtrStrided1d(__pyx_t_7landlab_5graph_6cfuncs_DTYPE_t *, __pyx_pybuffernd_offset_to_patch.rcbuffer->pybuffer.buf, __pyx_t_5, __pyx_pybuffernd_offset_to_patch.diminfo[0].strides) = (__pyx_v_new_offset[__pyx_v_i]);
+    }
+  }
+
+  /* "landlab/graph/cfuncs.pyx":223
+ *             offset_to_patch[i] = new_offset[i]
+ *     finally:
+ *         free(new_offset)             # <<<<<<<<<<<<<<
+ *         free(new_patches)
+ * 
+ */
+  /*finally:*/ {
+    /*normal exit:*/{
+      free(__pyx_v_new_offset);
+
+      /* "landlab/graph/cfuncs.pyx":224
+ *     finally:
+ *         free(new_offset)
+ *         free(new_patches)             # <<<<<<<<<<<<<<
+ * 
+ * 
+ */
+      free(__pyx_v_new_patches);
+      goto __pyx_L5;
+    }
+    __pyx_L4_error:;
+    /*exception exit:*/{
+      __Pyx_PyThreadState_declare
+      __Pyx_PyThreadState_assign
+      __pyx_t_12 = 0; __pyx_t_13 = 0; __pyx_t_14 = 0; __pyx_t_15 = 0; __pyx_t_16 = 0; __pyx_t_17 = 0;
+      if (PY_MAJOR_VERSION >= 3) __Pyx_ExceptionSwap(&__pyx_t_15, &__pyx_t_16, &__pyx_t_17);
+      if ((PY_MAJOR_VERSION < 3) || unlikely(__Pyx_GetException(&__pyx_t_12, &__pyx_t_13, &__pyx_t_14) < 0)) __Pyx_ErrFetch(&__pyx_t_12, &__pyx_t_13, &__pyx_t_14);
+      __Pyx_XGOTREF(__pyx_t_12);
+      __Pyx_XGOTREF(__pyx_t_13);
+      __Pyx_XGOTREF(__pyx_t_14);
+      __Pyx_XGOTREF(__pyx_t_15);
+      __Pyx_XGOTREF(__pyx_t_16);
+      __Pyx_XGOTREF(__pyx_t_17);
+      __pyx_t_2 = __pyx_lineno; __pyx_t_3 = __pyx_clineno; __pyx_t_11 = __pyx_filename;
+      {
+
+        /* "landlab/graph/cfuncs.pyx":223
+ *             offset_to_patch[i] = new_offset[i]
+ *     finally:
+ *         free(new_offset)             # <<<<<<<<<<<<<<
+ *         free(new_patches)
+ * 
+ */
+        free(__pyx_v_new_offset);
+
+        /* "landlab/graph/cfuncs.pyx":224
+ *     finally:
+ *         free(new_offset)
+ *         free(new_patches)             # <<<<<<<<<<<<<<
+ * 
+ * 
+ */
+        free(__pyx_v_new_patches);
+      }
+      if (PY_MAJOR_VERSION >= 3) {
+        __Pyx_XGIVEREF(__pyx_t_15);
+        __Pyx_XGIVEREF(__pyx_t_16);
+        __Pyx_XGIVEREF(__pyx_t_17);
+        __Pyx_ExceptionReset(__pyx_t_15, __pyx_t_16, __pyx_t_17);
+      }
+      __Pyx_XGIVEREF(__pyx_t_12);
+      __Pyx_XGIVEREF(__pyx_t_13);
+      __Pyx_XGIVEREF(__pyx_t_14);
+      __Pyx_ErrRestore(__pyx_t_12, __pyx_t_13, __pyx_t_14);
+      __pyx_t_12 = 0; __pyx_t_13 = 0; __pyx_t_14 = 0; __pyx_t_15 = 0; __pyx_t_16 = 0; __pyx_t_17 = 0;
+      __pyx_lineno = __pyx_t_2; __pyx_clineno = __pyx_t_3; __pyx_filename = __pyx_t_11;
+      goto __pyx_L1_error;
+    }
+    __pyx_L5:;
+  }
+
+  /* "landlab/graph/cfuncs.pyx":197
+ * 
+ * @cython.boundscheck(False)
+ * def _resort_patches(np.ndarray[DTYPE_t, ndim=1] links_at_patch,             # <<<<<<<<<<<<<<
+ *                     np.ndarray[DTYPE_t, ndim=1] offset_to_patch,
+ *                     np.ndarray[DTYPE_t, ndim=1] sorted_patches):
+ */
+
+  /* function exit code */
+  __pyx_r = Py_None; __Pyx_INCREF(Py_None);
+  goto __pyx_L0;
+  __pyx_L1_error:;
+  { PyObject *__pyx_type, *__pyx_value, *__pyx_tb;
+    __Pyx_PyThreadState_declare
+    __Pyx_PyThreadState_assign
+    __Pyx_ErrFetch(&__pyx_type, &__pyx_value, &__pyx_tb);
+    __Pyx_SafeReleaseBuffer(&__pyx_pybuffernd_links_at_patch.rcbuffer->pybuffer);
+    __Pyx_SafeReleaseBuffer(&__pyx_pybuffernd_offset_to_patch.rcbuffer->pybuffer);
+    __Pyx_SafeReleaseBuffer(&__pyx_pybuffernd_sorted_patches.rcbuffer->pybuffer);
+  __Pyx_ErrRestore(__pyx_type, __pyx_value, __pyx_tb);}
+  __Pyx_AddTraceback("landlab.graph.cfuncs._resort_patches", __pyx_clineno, __pyx_lineno, __pyx_filename);
+  __pyx_r = NULL;
+  goto __pyx_L2;
+  __pyx_L0:;
+  __Pyx_SafeReleaseBuffer(&__pyx_pybuffernd_links_at_patch.rcbuffer->pybuffer);
+  __Pyx_SafeReleaseBuffer(&__pyx_pybuffernd_offset_to_patch.rcbuffer->pybuffer);
+  __Pyx_SafeReleaseBuffer(&__pyx_pybuffernd_sorted_patches.rcbuffer->pybuffer);
+  __pyx_L2:;
+  __Pyx_XGIVEREF(__pyx_r);
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+/* "landlab/graph/cfuncs.pyx":228
+ * 
+ * @cython.boundscheck(False)
+ * def _setup_links_at_patch(np.ndarray[DTYPE_t, ndim=1] links_at_patch,             # <<<<<<<<<<<<<<
+ *                           np.ndarray[DTYPE_t, ndim=1] offset_to_patch,
+ *                           np.ndarray[DTYPE_t, ndim=2] out):
+ */
+
+/* Python wrapper */
+static PyObject *__pyx_pw_7landlab_5graph_6cfuncs_15_setup_links_at_patch(PyObject *__pyx_self, PyObject *__pyx_args, PyObject *__pyx_kwds); /*proto*/
+static PyMethodDef __pyx_mdef_7landlab_5graph_6cfuncs_15_setup_links_at_patch = {"_setup_links_at_patch", (PyCFunction)(void*)(PyCFunctionWithKeywords)__pyx_pw_7landlab_5graph_6cfuncs_15_setup_links_at_patch, METH_VARARGS|METH_KEYWORDS, 0};
+static PyObject *__pyx_pw_7landlab_5graph_6cfuncs_15_setup_links_at_patch(PyObject *__pyx_self, PyObject *__pyx_args, PyObject *__pyx_kwds) {
+  PyArrayObject *__pyx_v_links_at_patch = 0;
+  PyArrayObject *__pyx_v_offset_to_patch = 0;
+  PyArrayObject *__pyx_v_out = 0;
+  int __pyx_lineno = 0;
+  const char *__pyx_filename = NULL;
+  int __pyx_clineno = 0;
+  PyObject *__pyx_r = 0;
+  __Pyx_RefNannyDeclarations
+  __Pyx_RefNannySetupContext("_setup_links_at_patch (wrapper)", 0);
+  {
+    static PyObject **__pyx_pyargnames[] = {&__pyx_n_s_links_at_patch,&__pyx_n_s_offset_to_patch,&__pyx_n_s_out,0};
+    PyObject* values[3] = {0,0,0};
+    if (unlikely(__pyx_kwds)) {
+      Py_ssize_t kw_args;
+      const Py_ssize_t pos_args = PyTuple_GET_SIZE(__pyx_args);
+      switch (pos_args) {
+        case  3: values[2] = PyTuple_GET_ITEM(__pyx_args, 2);
+        CYTHON_FALLTHROUGH;
+        case  2: values[1] = PyTuple_GET_ITEM(__pyx_args, 1);
+        CYTHON_FALLTHROUGH;
+        case  1: values[0] = PyTuple_GET_ITEM(__pyx_args, 0);
+        CYTHON_FALLTHROUGH;
+        case  0: break;
+        default: goto __pyx_L5_argtuple_error;
+      }
+      kw_args = PyDict_Size(__pyx_kwds);
+      switch (pos_args) {
+        case  0:
+        if (likely((values[0] = __Pyx_PyDict_GetItemStr(__pyx_kwds, __pyx_n_s_links_at_patch)) != 0)) kw_args--;
+        else goto __pyx_L5_argtuple_error;
+        CYTHON_FALLTHROUGH;
+        case  1:
+        if (likely((values[1] = __Pyx_PyDict_GetItemStr(__pyx_kwds, __pyx_n_s_offset_to_patch)) != 0)) kw_args--;
+        else {
+          __Pyx_RaiseArgtupleInvalid("_setup_links_at_patch", 1, 3, 3, 1); __PYX_ERR(0, 228, __pyx_L3_error)
+        }
+        CYTHON_FALLTHROUGH;
+        case  2:
+        if (likely((values[2] = __Pyx_PyDict_GetItemStr(__pyx_kwds, __pyx_n_s_out)) != 0)) kw_args--;
+        else {
+          __Pyx_RaiseArgtupleInvalid("_setup_links_at_patch", 1, 3, 3, 2); __PYX_ERR(0, 228, __pyx_L3_error)
+        }
+      }
+      if (unlikely(kw_args > 0)) {
+        if (unlikely(__Pyx_ParseOptionalKeywords(__pyx_kwds, __pyx_pyargnames, 0, values, pos_args, "_setup_links_at_patch") < 0)) __PYX_ERR(0, 228, __pyx_L3_error)
+      }
+    } else if (PyTuple_GET_SIZE(__pyx_args) != 3) {
+      goto __pyx_L5_argtuple_error;
+    } else {
+      values[0] = PyTuple_GET_ITEM(__pyx_args, 0);
+      values[1] = PyTuple_GET_ITEM(__pyx_args, 1);
+      values[2] = PyTuple_GET_ITEM(__pyx_args, 2);
+    }
+    __pyx_v_links_at_patch = ((PyArrayObject *)values[0]);
+    __pyx_v_offset_to_patch = ((PyArrayObject *)values[1]);
+    __pyx_v_out = ((PyArrayObject *)values[2]);
+  }
+  goto __pyx_L4_argument_unpacking_done;
+  __pyx_L5_argtuple_error:;
+  __Pyx_RaiseArgtupleInvalid("_setup_links_at_patch", 1, 3, 3, PyTuple_GET_SIZE(__pyx_args)); __PYX_ERR(0, 228, __pyx_L3_error)
+  __pyx_L3_error:;
+  __Pyx_AddTraceback("landlab.graph.cfuncs._setup_links_at_patch", __pyx_clineno, __pyx_lineno, __pyx_filename);
+  __Pyx_RefNannyFinishContext();
+  return NULL;
+  __pyx_L4_argument_unpacking_done:;
+  if (unlikely(!__Pyx_ArgTypeTest(((PyObject *)__pyx_v_links_at_patch), __pyx_ptype_5numpy_ndarray, 1, "links_at_patch", 0))) __PYX_ERR(0, 228, __pyx_L1_error)
+  if (unlikely(!__Pyx_ArgTypeTest(((PyObject *)__pyx_v_offset_to_patch), __pyx_ptype_5numpy_ndarray, 1, "offset_to_patch", 0))) __PYX_ERR(0, 229, __pyx_L1_error)
+  if (unlikely(!__Pyx_ArgTypeTest(((PyObject *)__pyx_v_out), __pyx_ptype_5numpy_ndarray, 1, "out", 0))) __PYX_ERR(0, 230, __pyx_L1_error)
+  __pyx_r = __pyx_pf_7landlab_5graph_6cfuncs_14_setup_links_at_patch(__pyx_self, __pyx_v_links_at_patch, __pyx_v_offset_to_patch, __pyx_v_out);
+
+  /* function exit code */
+  goto __pyx_L0;
+  __pyx_L1_error:;
+  __pyx_r = NULL;
+  __pyx_L0:;
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+static PyObject *__pyx_pf_7landlab_5graph_6cfuncs_14_setup_links_at_patch(CYTHON_UNUSED PyObject *__pyx_self, PyArrayObject *__pyx_v_links_at_patch, PyArrayObject *__pyx_v_offset_to_patch, PyArrayObject *__pyx_v_out) {
+  int __pyx_v_i;
+  int __pyx_v_link;
+  int __pyx_v_patch;
+  int __pyx_v_offset;
+  int __pyx_v_n_links;
+  int __pyx_v_n_patches;
+  __Pyx_LocalBuf_ND __pyx_pybuffernd_links_at_patch;
+  __Pyx_Buffer __pyx_pybuffer_links_at_patch;
+  __Pyx_LocalBuf_ND __pyx_pybuffernd_offset_to_patch;
+  __Pyx_Buffer __pyx_pybuffer_offset_to_patch;
+  __Pyx_LocalBuf_ND __pyx_pybuffernd_out;
+  __Pyx_Buffer __pyx_pybuffer_out;
+  PyObject *__pyx_r = NULL;
+  __Pyx_RefNannyDeclarations
+  Py_ssize_t __pyx_t_1;
+  int __pyx_t_2;
+  int __pyx_t_3;
+  int __pyx_t_4;
+  Py_ssize_t __pyx_t_5;
+  int __pyx_t_6;
+  int __pyx_t_7;
+  int __pyx_t_8;
+  Py_ssize_t __pyx_t_9;
+  Py_ssize_t __pyx_t_10;
+  int __pyx_lineno = 0;
+  const char *__pyx_filename = NULL;
+  int __pyx_clineno = 0;
+  __Pyx_RefNannySetupContext("_setup_links_at_patch", 0);
+  __pyx_pybuffer_links_at_patch.pybuffer.buf = NULL;
+  __pyx_pybuffer_links_at_patch.refcount = 0;
+  __pyx_pybuffernd_links_at_patch.data = NULL;
+  __pyx_pybuffernd_links_at_patch.rcbuffer = &__pyx_pybuffer_links_at_patch;
+  __pyx_pybuffer_offset_to_patch.pybuffer.buf = NULL;
+  __pyx_pybuffer_offset_to_patch.refcount = 0;
+  __pyx_pybuffernd_offset_to_patch.data = NULL;
+  __pyx_pybuffernd_offset_to_patch.rcbuffer = &__pyx_pybuffer_offset_to_patch;
+  __pyx_pybuffer_out.pybuffer.buf = NULL;
+  __pyx_pybuffer_out.refcount = 0;
+  __pyx_pybuffernd_out.data = NULL;
+  __pyx_pybuffernd_out.rcbuffer = &__pyx_pybuffer_out;
+  {
+    __Pyx_BufFmt_StackElem __pyx_stack[1];
+    if (unlikely(__Pyx_GetBufferAndValidate(&__pyx_pybuffernd_links_at_patch.rcbuffer->pybuffer, (PyObject*)__pyx_v_links_at_patch, &__Pyx_TypeInfo_nn___pyx_t_7landlab_5graph_6cfuncs_DTYPE_t, PyBUF_FORMAT| PyBUF_STRIDES, 1, 0, __pyx_stack) == -1)) __PYX_ERR(0, 228, __pyx_L1_error)
+  }
+  __pyx_pybuffernd_links_at_patch.diminfo[0].strides = __pyx_pybuffernd_links_at_patch.rcbuffer->pybuffer.strides[0]; __pyx_pybuffernd_links_at_patch.diminfo[0].shape = __pyx_pybuffernd_links_at_patch.rcbuffer->pybuffer.shape[0];
+  {
+    __Pyx_BufFmt_StackElem __pyx_stack[1];
+    if (unlikely(__Pyx_GetBufferAndValidate(&__pyx_pybuffernd_offset_to_patch.rcbuffer->pybuffer, (PyObject*)__pyx_v_offset_to_patch, &__Pyx_TypeInfo_nn___pyx_t_7landlab_5graph_6cfuncs_DTYPE_t, PyBUF_FORMAT| PyBUF_STRIDES, 1, 0, __pyx_stack) == -1)) __PYX_ERR(0, 228, __pyx_L1_error)
+  }
+  __pyx_pybuffernd_offset_to_patch.diminfo[0].strides = __pyx_pybuffernd_offset_to_patch.rcbuffer->pybuffer.strides[0]; __pyx_pybuffernd_offset_to_patch.diminfo[0].shape = __pyx_pybuffernd_offset_to_patch.rcbuffer->pybuffer.shape[0];
+  {
+    __Pyx_BufFmt_StackElem __pyx_stack[1];
+    if (unlikely(__Pyx_GetBufferAndValidate(&__pyx_pybuffernd_out.rcbuffer->pybuffer, (PyObject*)__pyx_v_out, &__Pyx_TypeInfo_nn___pyx_t_7landlab_5graph_6cfuncs_DTYPE_t, PyBUF_FORMAT| PyBUF_STRIDES| PyBUF_WRITABLE, 2, 0, __pyx_stack) == -1)) __PYX_ERR(0, 228, __pyx_L1_error)
+  }
+  __pyx_pybuffernd_out.diminfo[0].strides = __pyx_pybuffernd_out.rcbuffer->pybuffer.strides[0]; __pyx_pybuffernd_out.diminfo[0].shape = __pyx_pybuffernd_out.rcbuffer->pybuffer.shape[0]; __pyx_pybuffernd_out.diminfo[1].strides = __pyx_pybuffernd_out.rcbuffer->pybuffer.strides[1]; __pyx_pybuffernd_out.diminfo[1].shape = __pyx_pybuffernd_out.rcbuffer->pybuffer.shape[1];
+
+  /* "landlab/graph/cfuncs.pyx":236
+ *     cdef int offset
+ *     cdef int n_links
+ *     cdef int n_patches = len(offset_to_patch) - 1             # <<<<<<<<<<<<<<
+ * 
+ *     for patch in range(n_patches):
+ */
+  __pyx_t_1 = PyObject_Length(((PyObject *)__pyx_v_offset_to_patch)); if (unlikely(__pyx_t_1 == ((Py_ssize_t)-1))) __PYX_ERR(0, 236, __pyx_L1_error)
+  __pyx_v_n_patches = (__pyx_t_1 - 1);
+
+  /* "landlab/graph/cfuncs.pyx":238
+ *     cdef int n_patches = len(offset_to_patch) - 1
+ * 
+ *     for patch in range(n_patches):             # <<<<<<<<<<<<<<
+ *         offset = offset_to_patch[patch]
+ *         n_links = offset_to_patch[patch + 1] - offset
+ */
+  __pyx_t_2 = __pyx_v_n_patches;
+  __pyx_t_3 = __pyx_t_2;
+  for (__pyx_t_4 = 0; __pyx_t_4 < __pyx_t_3; __pyx_t_4+=1) {
+    __pyx_v_patch = __pyx_t_4;
+
+    /* "landlab/graph/cfuncs.pyx":239
+ * 
+ *     for patch in range(n_patches):
+ *         offset = offset_to_patch[patch]             # <<<<<<<<<<<<<<
+ *         n_links = offset_to_patch[patch + 1] - offset
+ * 
+ */
+    __pyx_t_5 = __pyx_v_patch;
+    if (__pyx_t_5 < 0) __pyx_t_5 += __pyx_pybuffernd_offset_to_patch.diminfo[0].shape;
+    __pyx_v_offset = (*__Pyx_BufPtrStrided1d(__pyx_t_7landlab_5graph_6cfuncs_DTYPE_t *, __pyx_pybuffernd_offset_to_patch.rcbuffer->pybuffer.buf, __pyx_t_5, __pyx_pybuffernd_offset_to_patch.diminfo[0].strides));
+
+    /* "landlab/graph/cfuncs.pyx":240
+ *     for patch in range(n_patches):
+ *         offset = offset_to_patch[patch]
+ *         n_links = offset_to_patch[patch + 1] - offset             # <<<<<<<<<<<<<<
+ * 
+ *         link = 0
+ */
+    __pyx_t_5 = (__pyx_v_patch + 1);
+    if (__pyx_t_5 < 0) __pyx_t_5 += __pyx_pybuffernd_offset_to_patch.diminfo[0].shape;
+    __pyx_v_n_links = ((*__Pyx_BufPtrStrided1d(__pyx_t_7landlab_5graph_6cfuncs_DTYPE_t *, __pyx_pybuffernd_offset_to_patch.rcbuffer->pybuffer.buf, __pyx_t_5, __pyx_pybuffernd_offset_to_patch.diminfo[0].strides)) - __pyx_v_offset);
+
+    /* "landlab/graph/cfuncs.pyx":242
+ *         n_links = offset_to_patch[patch + 1] - offset
+ * 
+ *         link = 0             # <<<<<<<<<<<<<<
+ *         for i in range(offset, offset + n_links):
+ *           out[patch, link] = links_at_patch[i]
+ */
+    __pyx_v_link = 0;
+
+    /* "landlab/graph/cfuncs.pyx":243
+ * 
+ *         link = 0
+ *         for i in range(offset, offset + n_links):             # <<<<<<<<<<<<<<
+ *           out[patch, link] = links_at_patch[i]
+ *           link += 1
+ */
+    __pyx_t_6 = (__pyx_v_offset + __pyx_v_n_links);
+    __pyx_t_7 = __pyx_t_6;
+    for (__pyx_t_8 = __pyx_v_offset; __pyx_t_8 < __pyx_t_7; __pyx_t_8+=1) {
+      __pyx_v_i = __pyx_t_8;
+
+      /* "landlab/graph/cfuncs.pyx":244
+ *         link = 0
+ *         for i in range(offset, offset + n_links):
+ *           out[patch, link] = links_at_patch[i]             # <<<<<<<<<<<<<<
+ *           link += 1
+ * 
+ */
+      __pyx_t_5 = __pyx_v_i;
+      if (__pyx_t_5 < 0) __pyx_t_5 += __pyx_pybuffernd_links_at_patch.diminfo[0].shape;
+      __pyx_t_9 = __pyx_v_patch;
+      __pyx_t_10 = __pyx_v_link;
+      if (__pyx_t_9 < 0) __pyx_t_9 += __pyx_pybuffernd_out.diminfo[0].shape;
+      if (__pyx_t_10 < 0) __pyx_t_10 += __pyx_pybuffernd_out.diminfo[1].shape;
+      *__Pyx_BufPtrStrided2d(__pyx_t_7landlab_5graph_6cfuncs_DTYPE_t *, __pyx_pybuffernd_out.rcbuffer->pybuffer.buf, __pyx_t_9, __pyx_pybuffernd_out.diminfo[0].strides, __pyx_t_10, __pyx_pybuffernd_out.diminfo[1].strides) = (*__Pyx_BufPtrStrided1d(__pyx_t_7landlab_5graph_6cfuncs_DTYPE_t *, __pyx_pybuffernd_links_at_patch.rcbuffer->pybuffer.buf, __pyx_t_5, __pyx_pybuffernd_links_at_patch.diminfo[0].strides));
+
+      /* "landlab/graph/cfuncs.pyx":245
+ *         for i in range(offset, offset + n_links):
+ *           out[patch, link] = links_at_patch[i]
+ *           link += 1             # <<<<<<<<<<<<<<
+ * 
+ * 
+ */
+      __pyx_v_link = (__pyx_v_link + 1);
+    }
+  }
+
+  /* "landlab/graph/cfuncs.pyx":228
+ * 
+ * @cython.boundscheck(False)
+ * def _setup_links_at_patch(np.ndarray[DTYPE_t, ndim=1] links_at_patch,             # <<<<<<<<<<<<<<
+ *                           np.ndarray[DTYPE_t, ndim=1] offset_to_patch,
+ *                           np.ndarray[DTYPE_t, ndim=2] out):
+ */
+
+  /* function exit code */
+  __pyx_r = Py_None; __Pyx_INCREF(Py_None);
+  goto __pyx_L0;
+  __pyx_L1_error:;
+  { PyObject *__pyx_type, *__pyx_value, *__pyx_tb;
+    __Pyx_PyThreadState_declare
+    __Pyx_PyThreadState_assign
+    __Pyx_ErrFetch(&__pyx_type, &__pyx_value, &__pyx_tb);
+    __Pyx_SafeReleaseBuffer(&__pyx_pybuffernd_links_at_patch.rcbuffer->pybuffer);
+    __Pyx_SafeReleaseBuffer(&__pyx_pybuffernd_offset_to_patch.rcbuffer->pybuffer);
+    __Pyx_SafeReleaseBuffer(&__pyx_pybuffernd_out.rcbuffer->pybuffer);
+  __Pyx_ErrRestore(__pyx_type, __pyx_value, __pyx_tb);}
+  __Pyx_AddTraceback("landlab.graph.cfuncs._setup_links_at_patch", __pyx_clineno, __pyx_lineno, __pyx_filename);
+  __pyx_r = NULL;
+  goto __pyx_L2;
+  __pyx_L0:;
+  __Pyx_SafeReleaseBuffer(&__pyx_pybuffernd_links_at_patch.rcbuffer->pybuffer);
+  __Pyx_SafeReleaseBuffer(&__pyx_pybuffernd_offset_to_patch.rcbuffer->pybuffer);
+  __Pyx_SafeReleaseBuffer(&__pyx_pybuffernd_out.rcbuffer->pybuffer);
+  __pyx_L2:;
+  __Pyx_XGIVEREF(__pyx_r);
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+/* "landlab/graph/cfuncs.pyx":249
+ * 
+ * @cython.boundscheck(False)
+ * def _reorder_links_at_node(np.ndarray[DTYPE_t, ndim=2] links_at_node,             # <<<<<<<<<<<<<<
+ *                            np.ndarray[DTYPE_t, ndim=2] sorted_links):
+ *     cdef int n_nodes = links_at_node.shape[0]
+ */
+
+/* Python wrapper */
+static PyObject *__pyx_pw_7landlab_5graph_6cfuncs_17_reorder_links_at_node(PyObject *__pyx_self, PyObject *__pyx_args, PyObject *__pyx_kwds); /*proto*/
+static PyMethodDef __pyx_mdef_7landlab_5graph_6cfuncs_17_reorder_links_at_node = {"_reorder_links_at_node", (PyCFunction)(void*)(PyCFunctionWithKeywords)__pyx_pw_7landlab_5graph_6cfuncs_17_reorder_links_at_node, METH_VARARGS|METH_KEYWORDS, 0};
+static PyObject *__pyx_pw_7landlab_5graph_6cfuncs_17_reorder_links_at_node(PyObject *__pyx_self, PyObject *__pyx_args, PyObject *__pyx_kwds) {
+  PyArrayObject *__pyx_v_links_at_node = 0;
+  PyArrayObject *__pyx_v_sorted_links = 0;
+  int __pyx_lineno = 0;
+  const char *__pyx_filename = NULL;
+  int __pyx_clineno = 0;
+  PyObject *__pyx_r = 0;
+  __Pyx_RefNannyDeclarations
+  __Pyx_RefNannySetupContext("_reorder_links_at_node (wrapper)", 0);
+  {
+    static PyObject **__pyx_pyargnames[] = {&__pyx_n_s_links_at_node,&__pyx_n_s_sorted_links,0};
+    PyObject* values[2] = {0,0};
+    if (unlikely(__pyx_kwds)) {
+      Py_ssize_t kw_args;
+      const Py_ssize_t pos_args = PyTuple_GET_SIZE(__pyx_args);
+      switch (pos_args) {
+        case  2: values[1] = PyTuple_GET_ITEM(__pyx_args, 1);
+        CYTHON_FALLTHROUGH;
+        case  1: values[0] = PyTuple_GET_ITEM(__pyx_args, 0);
+        CYTHON_FALLTHROUGH;
+        case  0: break;
+        default: goto __pyx_L5_argtuple_error;
+      }
+      kw_args = PyDict_Size(__pyx_kwds);
+      switch (pos_args) {
+        case  0:
+        if (likely((values[0] = __Pyx_PyDict_GetItemStr(__pyx_kwds, __pyx_n_s_links_at_node)) != 0)) kw_args--;
+        else goto __pyx_L5_argtuple_error;
+        CYTHON_FALLTHROUGH;
+        case  1:
+        if (likely((values[1] = __Pyx_PyDict_GetItemStr(__pyx_kwds, __pyx_n_s_sorted_links)) != 0)) kw_args--;
+        else {
+          __Pyx_RaiseArgtupleInvalid("_reorder_links_at_node", 1, 2, 2, 1); __PYX_ERR(0, 249, __pyx_L3_error)
+        }
+      }
+      if (unlikely(kw_args > 0)) {
+        if (unlikely(__Pyx_ParseOptionalKeywords(__pyx_kwds, __pyx_pyargnames, 0, values, pos_args, "_reorder_links_at_node") < 0)) __PYX_ERR(0, 249, __pyx_L3_error)
+      }
+    } else if (PyTuple_GET_SIZE(__pyx_args) != 2) {
+      goto __pyx_L5_argtuple_error;
+    } else {
+      values[0] = PyTuple_GET_ITEM(__pyx_args, 0);
+      values[1] = PyTuple_GET_ITEM(__pyx_args, 1);
+    }
+    __pyx_v_links_at_node = ((PyArrayObject *)values[0]);
+    __pyx_v_sorted_links = ((PyArrayObject *)values[1]);
+  }
+  goto __pyx_L4_argument_unpacking_done;
+  __pyx_L5_argtuple_error:;
+  __Pyx_RaiseArgtupleInvalid("_reorder_links_at_node", 1, 2, 2, PyTuple_GET_SIZE(__pyx_args)); __PYX_ERR(0, 249, __pyx_L3_error)
+  __pyx_L3_error:;
+  __Pyx_AddTraceback("landlab.graph.cfuncs._reorder_links_at_node", __pyx_clineno, __pyx_lineno, __pyx_filename);
+  __Pyx_RefNannyFinishContext();
+  return NULL;
+  __pyx_L4_argument_unpacking_done:;
+  if (unlikely(!__Pyx_ArgTypeTest(((PyObject *)__pyx_v_links_at_node), __pyx_ptype_5numpy_ndarray, 1, "links_at_node", 0))) __PYX_ERR(0, 249, __pyx_L1_error)
+  if (unlikely(!__Pyx_ArgTypeTest(((PyObject *)__pyx_v_sorted_links), __pyx_ptype_5numpy_ndarray, 1, "sorted_links", 0))) __PYX_ERR(0, 250, __pyx_L1_error)
+  __pyx_r = __pyx_pf_7landlab_5graph_6cfuncs_16_reorder_links_at_node(__pyx_self, __pyx_v_links_at_node, __pyx_v_sorted_links);
+
+  /* function exit code */
+  goto __pyx_L0;
+  __pyx_L1_error:;
+  __pyx_r = NULL;
+  __pyx_L0:;
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+static PyObject *__pyx_pf_7landlab_5graph_6cfuncs_16_reorder_links_at_node(CYTHON_UNUSED PyObject *__pyx_self, PyArrayObject *__pyx_v_links_at_node, PyArrayObject *__pyx_v_sorted_links) {
+  int __pyx_v_n_nodes;
+  int __pyx_v_n_links_per_node;
+  int __pyx_v_i;
+  int __pyx_v_node;
+  int *__pyx_v_buffer;
+  __Pyx_LocalBuf_ND __pyx_pybuffernd_links_at_node;
+  __Pyx_Buffer __pyx_pybuffer_links_at_node;
+  __Pyx_LocalBuf_ND __pyx_pybuffernd_sorted_links;
+  __Pyx_Buffer __pyx_pybuffer_sorted_links;
+  PyObject *__pyx_r = NULL;
+  __Pyx_RefNannyDeclarations
+  int __pyx_t_1;
+  int __pyx_t_2;
+  int __pyx_t_3;
+  int __pyx_t_4;
+  int __pyx_t_5;
+  int __pyx_t_6;
+  Py_ssize_t __pyx_t_7;
+  Py_ssize_t __pyx_t_8;
+  Py_ssize_t __pyx_t_9;
+  Py_ssize_t __pyx_t_10;
+  int __pyx_lineno = 0;
+  const char *__pyx_filename = NULL;
+  int __pyx_clineno = 0;
+  __Pyx_RefNannySetupContext("_reorder_links_at_node", 0);
+  __pyx_pybuffer_links_at_node.pybuffer.buf = NULL;
+  __pyx_pybuffer_links_at_node.refcount = 0;
+  __pyx_pybuffernd_links_at_node.data = NULL;
+  __pyx_pybuffernd_links_at_node.rcbuffer = &__pyx_pybuffer_links_at_node;
+  __pyx_pybuffer_sorted_links.pybuffer.buf = NULL;
+  __pyx_pybuffer_sorted_links.refcount = 0;
+  __pyx_pybuffernd_sorted_links.data = NULL;
+  __pyx_pybuffernd_sorted_links.rcbuffer = &__pyx_pybuffer_sorted_links;
+  {
+    __Pyx_BufFmt_StackElem __pyx_stack[1];
+    if (unlikely(__Pyx_GetBufferAndValidate(&__pyx_pybuffernd_links_at_node.rcbuffer->pybuffer, (PyObject*)__pyx_v_links_at_node, &__Pyx_TypeInfo_nn___pyx_t_7landlab_5graph_6cfuncs_DTYPE_t, PyBUF_FORMAT| PyBUF_STRIDES| PyBUF_WRITABLE, 2, 0, __pyx_stack) == -1)) __PYX_ERR(0, 249, __pyx_L1_error)
+  }
+  __pyx_pybuffernd_links_at_node.diminfo[0].strides = __pyx_pybuffernd_links_at_node.rcbuffer->pybuffer.strides[0]; __pyx_pybuffernd_links_at_node.diminfo[0].shape = __pyx_pybuffernd_links_at_node.rcbuffer->pybuffer.shape[0]; __pyx_pybuffernd_links_at_node.diminfo[1].strides = __pyx_pybuffernd_links_at_node.rcbuffer->pybuffer.strides[1]; __pyx_pybuffernd_links_at_node.diminfo[1].shape = __pyx_pybuffernd_links_at_node.rcbuffer->pybuffer.shape[1];
+  {
+    __Pyx_BufFmt_StackElem __pyx_stack[1];
+    if (unlikely(__Pyx_GetBufferAndValidate(&__pyx_pybuffernd_sorted_links.rcbuffer->pybuffer, (PyObject*)__pyx_v_sorted_links, &__Pyx_TypeInfo_nn___pyx_t_7landlab_5graph_6cfuncs_DTYPE_t, PyBUF_FORMAT| PyBUF_STRIDES, 2, 0, __pyx_stack) == -1)) __PYX_ERR(0, 249, __pyx_L1_error)
+  }
+  __pyx_pybuffernd_sorted_links.diminfo[0].strides = __pyx_pybuffernd_sorted_links.rcbuffer->pybuffer.strides[0]; __pyx_pybuffernd_sorted_links.diminfo[0].shape = __pyx_pybuffernd_sorted_links.rcbuffer->pybuffer.shape[0]; __pyx_pybuffernd_sorted_links.diminfo[1].strides = __pyx_pybuffernd_sorted_links.rcbuffer->pybuffer.strides[1]; __pyx_pybuffernd_sorted_links.diminfo[1].shape = __pyx_pybuffernd_sorted_links.rcbuffer->pybuffer.shape[1];
+
+  /* "landlab/graph/cfuncs.pyx":251
+ * def _reorder_links_at_node(np.ndarray[DTYPE_t, ndim=2] links_at_node,
+ *                            np.ndarray[DTYPE_t, ndim=2] sorted_links):
+ *     cdef int n_nodes = links_at_node.shape[0]             # <<<<<<<<<<<<<<
+ *     cdef int n_links_per_node = links_at_node.shape[1]
+ *     cdef int i
+ */
+  __pyx_v_n_nodes = (__pyx_v_links_at_node->dimensions[0]);
+
+  /* "landlab/graph/cfuncs.pyx":252
+ *                            np.ndarray[DTYPE_t, ndim=2] sorted_links):
+ *     cdef int n_nodes = links_at_node.shape[0]
+ *     cdef int n_links_per_node = links_at_node.shape[1]             # <<<<<<<<<<<<<<
+ *     cdef int i
+ *     cdef int node
+ */
+  __pyx_v_n_links_per_node = (__pyx_v_links_at_node->dimensions[1]);
+
+  /* "landlab/graph/cfuncs.pyx":255
+ *     cdef int i
+ *     cdef int node
+ *     cdef int *buffer = <int *>malloc(n_links_per_node * sizeof(int))             # <<<<<<<<<<<<<<
+ * 
+ *     try:
+ */
+  __pyx_v_buffer = ((int *)malloc((__pyx_v_n_links_per_node * (sizeof(int)))));
+
+  /* "landlab/graph/cfuncs.pyx":257
+ *     cdef int *buffer = <int *>malloc(n_links_per_node * sizeof(int))
+ * 
+ *     try:             # <<<<<<<<<<<<<<
+ *       for node in range(n_nodes):
+ *           for i in range(n_links_per_node):
+ */
+  /*try:*/ {
+
+    /* "landlab/graph/cfuncs.pyx":258
+ * 
+ *     try:
+ *       for node in range(n_nodes):             # <<<<<<<<<<<<<<
+ *           for i in range(n_links_per_node):
+ *               buffer[i] = links_at_node[node, sorted_links[node, i]]
+ */
+    __pyx_t_1 = __pyx_v_n_nodes;
+    __pyx_t_2 = __pyx_t_1;
+    for (__pyx_t_3 = 0; __pyx_t_3 < __pyx_t_2; __pyx_t_3+=1) {
+      __pyx_v_node = __pyx_t_3;
+
+      /* "landlab/graph/cfuncs.pyx":259
+ *     try:
+ *       for node in range(n_nodes):
+ *           for i in range(n_links_per_node):             # <<<<<<<<<<<<<<
+ *               buffer[i] = links_at_node[node, sorted_links[node, i]]
+ *           for i in range(n_links_per_node):
+ */
+      __pyx_t_4 = __pyx_v_n_links_per_node;
+      __pyx_t_5 = __pyx_t_4;
+      for (__pyx_t_6 = 0; __pyx_t_6 < __pyx_t_5; __pyx_t_6+=1) {
+        __pyx_v_i = __pyx_t_6;
+
+        /* "landlab/graph/cfuncs.pyx":260
+ *       for node in range(n_nodes):
+ *           for i in range(n_links_per_node):
+ *               buffer[i] = links_at_node[node, sorted_links[node, i]]             # <<<<<<<<<<<<<<
+ *           for i in range(n_links_per_node):
+ *             links_at_node[node, i] = buffer[i]
+ */
+        __pyx_t_7 = __pyx_v_node;
+        __pyx_t_8 = __pyx_v_i;
+        if (__pyx_t_7 < 0) __pyx_t_7 += __pyx_pybuffernd_sorted_links.diminfo[0].shape;
+        if (__pyx_t_8 < 0) __pyx_t_8 += __pyx_pybuffernd_sorted_links.diminfo[1].shape;
+        __pyx_t_9 = __pyx_v_node;
+        __pyx_t_10 = (*__Pyx_BufPtrStrided2d(__pyx_t_7landlab_5graph_6cfuncs_DTYPE_t *, __pyx_pybuffernd_sorted_links.rcbuffer->pybuffer.buf, __pyx_t_7, __pyx_pybuffernd_sorted_links.diminfo[0].strides, __pyx_t_8, __pyx_pybuffernd_sorted_links.diminfo[1].strides));
+        if (__pyx_t_9 < 0) __pyx_t_9 += __pyx_pybuffernd_links_at_node.diminfo[0].shape;
+        if (__pyx_t_10 < 0) __pyx_t_10 += __pyx_pybuffernd_links_at_node.diminfo[1].shape;
+        (__pyx_v_buffer[__pyx_v_i]) = (*__Pyx_BufPtrStrided2d(__pyx_t_7landlab_5graph_6cfuncs_DTYPE_t *, __pyx_pybuffernd_links_at_node.rcbuffer->pybuffer.buf, __pyx_t_9, __pyx_pybuffernd_links_at_node.diminfo[0].strides, __pyx_t_10, __pyx_pybuffernd_links_at_node.diminfo[1].strides));
+      }
+
+      /* "landlab/graph/cfuncs.pyx":261
+ *           for i in range(n_links_per_node):
+ *               buffer[i] = links_at_node[node, sorted_links[node, i]]
+ *           for i in range(n_links_per_node):             # <<<<<<<<<<<<<<
+ *             links_at_node[node, i] = buffer[i]
+ *     finally:
+ */
+      __pyx_t_4 = __pyx_v_n_links_per_node;
+      __pyx_t_5 = __pyx_t_4;
+      for (__pyx_t_6 = 0; __pyx_t_6 < __pyx_t_5; __pyx_t_6+=1) {
+        __pyx_v_i = __pyx_t_6;
+
+        /* "landlab/graph/cfuncs.pyx":262
+ *               buffer[i] = links_at_node[node, sorted_links[node, i]]
+ *           for i in range(n_links_per_node):
+ *             links_at_node[node, i] = buffer[i]             # <<<<<<<<<<<<<<
+ *     finally:
+ *         free(buffer)
+ */
+        __pyx_t_8 = __pyx_v_node;
+        __pyx_t_7 = __pyx_v_i;
+        if (__pyx_t_8 < 0) __pyx_t_8 += __pyx_pybuffernd_links_at_node.diminfo[0].shape;
+        if (__pyx_t_7 < 0) __pyx_t_7 += __pyx_pybuffernd_links_at_node.diminfo[1].shape;
+        *__Pyx_BufPtrStrided2d(__pyx_t_7landlab_5graph_6cfuncs_DTYPE_t *, __pyx_pybuffernd_links_at_node.rcbuffer->pybuffer.buf, __pyx_t_8, __pyx_pybuffernd_links_at_node.diminfo[0].strides, __pyx_t_7, __pyx_pybuffernd_links_at_node.diminfo[1].strides) = (__pyx_v_buffer[__pyx_v_i]);
+      }
+    }
+  }
+
+  /* "landlab/graph/cfuncs.pyx":264
+ *             links_at_node[node, i] = buffer[i]
+ *     finally:
+ *         free(buffer)             # <<<<<<<<<<<<<<
+ * 
+ * 
+ */
+  /*finally:*/ {
+    /*normal exit:*/{
+      free(__pyx_v_buffer);
+      goto __pyx_L5;
+    }
+    __pyx_L5:;
+  }
+
+  /* "landlab/graph/cfuncs.pyx":249
+ * 
+ * @cython.boundscheck(False)
+ * def _reorder_links_at_node(np.ndarray[DTYPE_t, ndim=2] links_at_node,             # <<<<<<<<<<<<<<
+ *                            np.ndarray[DTYPE_t, ndim=2] sorted_links):
+ *     cdef int n_nodes = links_at_node.shape[0]
+ */
+
+  /* function exit code */
+  __pyx_r = Py_None; __Pyx_INCREF(Py_None);
+  goto __pyx_L0;
+  __pyx_L1_error:;
+  { PyObject *__pyx_type, *__pyx_value, *__pyx_tb;
+    __Pyx_PyThreadState_declare
+    __Pyx_PyThreadState_assign
+    __Pyx_ErrFetch(&__pyx_type, &__pyx_value, &__pyx_tb);
+    __Pyx_SafeReleaseBuffer(&__pyx_pybuffernd_links_at_node.rcbuffer->pybuffer);
+    __Pyx_SafeReleaseBuffer(&__pyx_pybuffernd_sorted_links.rcbuffer->pybuffer);
+  __Pyx_ErrRestore(__pyx_type, __pyx_value, __pyx_tb);}
+  __Pyx_AddTraceback("landlab.graph.cfuncs._reorder_links_at_node", __pyx_clineno, __pyx_lineno, __pyx_filename);
+  __pyx_r = NULL;
+  goto __pyx_L2;
+  __pyx_L0:;
+  __Pyx_SafeReleaseBuffer(&__pyx_pybuffernd_links_at_node.rcbuffer->pybuffer);
+  __Pyx_SafeReleaseBuffer(&__pyx_pybuffernd_sorted_links.rcbuffer->pybuffer);
+  __pyx_L2:;
+  __Pyx_XGIVEREF(__pyx_r);
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+/* "landlab/graph/cfuncs.pyx":267
+ * 
+ * 
+ * cdef calc_centroid(double * points, np.int_t n_points, double * out):             # <<<<<<<<<<<<<<
+ *     cdef int i
+ *     cdef double xc = 0.
+ */
+
+static PyObject *__pyx_f_7landlab_5graph_6cfuncs_calc_centroid(double *__pyx_v_points, __pyx_t_5numpy_int_t __pyx_v_n_points, double *__pyx_v_out) {
+  int __pyx_v_i;
+  double __pyx_v_xc;
+  double __pyx_v_yc;
+  PyObject *__pyx_r = NULL;
+  __Pyx_RefNannyDeclarations
+  __pyx_t_5numpy_int_t __pyx_t_1;
+  __pyx_t_5numpy_int_t __pyx_t_2;
+  int __pyx_t_3;
+  int __pyx_lineno = 0;
+  const char *__pyx_filename = NULL;
+  int __pyx_clineno = 0;
+  __Pyx_RefNannySetupContext("calc_centroid", 0);
+
+  /* "landlab/graph/cfuncs.pyx":269
+ * cdef calc_centroid(double * points, np.int_t n_points, double * out):
+ *     cdef int i
+ *     cdef double xc = 0.             # <<<<<<<<<<<<<<
+ *     cdef double yc = 0.
+ * 
+ */
+  __pyx_v_xc = 0.;
+
+  /* "landlab/graph/cfuncs.pyx":270
+ *     cdef int i
+ *     cdef double xc = 0.
+ *     cdef double yc = 0.             # <<<<<<<<<<<<<<
+ * 
+ *     for i in range(0, 2 * n_points, 2):
+ */
+  __pyx_v_yc = 0.;
+
+  /* "landlab/graph/cfuncs.pyx":272
+ *     cdef double yc = 0.
+ * 
+ *     for i in range(0, 2 * n_points, 2):             # <<<<<<<<<<<<<<
+ *         xc += points[i]
+ *         yc += points[i + 1]
+ */
+  __pyx_t_1 = (2 * __pyx_v_n_points);
+  __pyx_t_2 = __pyx_t_1;
+  for (__pyx_t_3 = 0; __pyx_t_3 < __pyx_t_2; __pyx_t_3+=2) {
+    __pyx_v_i = __pyx_t_3;
+
+    /* "landlab/graph/cfuncs.pyx":273
+ * 
+ *     for i in range(0, 2 * n_points, 2):
+ *         xc += points[i]             # <<<<<<<<<<<<<<
+ *         yc += points[i + 1]
+ *     xc /= n_points
+ */
+    __pyx_v_xc = (__pyx_v_xc + (__pyx_v_points[__pyx_v_i]));
+
+    /* "landlab/graph/cfuncs.pyx":274
+ *     for i in range(0, 2 * n_points, 2):
+ *         xc += points[i]
+ *         yc += points[i + 1]             # <<<<<<<<<<<<<<
+ *     xc /= n_points
+ *     yc /= n_points
+ */
+    __pyx_v_yc = (__pyx_v_yc + (__pyx_v_points[(__pyx_v_i + 1)]));
+  }
+
+  /* "landlab/graph/cfuncs.pyx":275
+ *         xc += points[i]
+ *         yc += points[i + 1]
+ *     xc /= n_points             # <<<<<<<<<<<<<<
+ *     yc /= n_points
+ * 
+ */
+  if (unlikely(__pyx_v_n_points == 0)) {
+    PyErr_SetString(PyExc_ZeroDivisionError, "float division");
+    __PYX_ERR(0, 275, __pyx_L1_error)
+  }
+  __pyx_v_xc = (__pyx_v_xc / __pyx_v_n_points);
+
+  /* "landlab/graph/cfuncs.pyx":276
+ *         yc += points[i + 1]
+ *     xc /= n_points
+ *     yc /= n_points             # <<<<<<<<<<<<<<
+ * 
+ *     out[0] = xc
+ */
+  if (unlikely(__pyx_v_n_points == 0)) {
+    PyErr_SetString(PyExc_ZeroDivisionError, "float division");
+    __PYX_ERR(0, 276, __pyx_L1_error)
+  }
+  __pyx_v_yc = (__pyx_v_yc / __pyx_v_n_points);
+
+  /* "landlab/graph/cfuncs.pyx":278
+ *     yc /= n_points
+ * 
+ *     out[0] = xc             # <<<<<<<<<<<<<<
+ *     out[1] = yc
+ * 
+ */
+  (__pyx_v_out[0]) = __pyx_v_xc;
+
+  /* "landlab/graph/cfuncs.pyx":279
+ * 
+ *     out[0] = xc
+ *     out[1] = yc             # <<<<<<<<<<<<<<
+ * 
+ * 
+ */
+  (__pyx_v_out[1]) = __pyx_v_yc;
+
+  /* "landlab/graph/cfuncs.pyx":267
+ * 
+ * 
+ * cdef calc_centroid(double * points, np.int_t n_points, double * out):             # <<<<<<<<<<<<<<
+ *     cdef int i
+ *     cdef double xc = 0.
+ */
+
+  /* function exit code */
+  __pyx_r = Py_None; __Pyx_INCREF(Py_None);
+  goto __pyx_L0;
+  __pyx_L1_error:;
+  __Pyx_AddTraceback("landlab.graph.cfuncs.calc_centroid", __pyx_clineno, __pyx_lineno, __pyx_filename);
+  __pyx_r = 0;
+  __pyx_L0:;
+  __Pyx_XGIVEREF(__pyx_r);
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+/* "landlab/graph/cfuncs.pyx":282
+ * 
+ * 
+ * cdef calc_spoke_angles(double * hub, double * spokes, np.int_t n_spokes,             # <<<<<<<<<<<<<<
+ *                        double * angles):
+ *     cdef int i
+ */
+
+static PyObject *__pyx_f_7landlab_5graph_6cfuncs_calc_spoke_angles(double *__pyx_v_hub, double *__pyx_v_spokes, __pyx_t_5numpy_int_t __pyx_v_n_spokes, double *__pyx_v_angles) {
+  int __pyx_v_i;
+  double __pyx_v_x0;
+  double __pyx_v_y0;
+  double *__pyx_v_spoke;
+  double __pyx_v_two_pi;
+  double __pyx_v_x;
+  double __pyx_v_y;
+  PyObject *__pyx_r = NULL;
+  __Pyx_RefNannyDeclarations
+  PyObject *__pyx_t_1 = NULL;
+  PyObject *__pyx_t_2 = NULL;
+  double __pyx_t_3;
+  __pyx_t_5numpy_int_t __pyx_t_4;
+  __pyx_t_5numpy_int_t __pyx_t_5;
+  int __pyx_t_6;
+  int __pyx_t_7;
+  int __pyx_t_8;
+  int __pyx_lineno = 0;
+  const char *__pyx_filename = NULL;
+  int __pyx_clineno = 0;
+  __Pyx_RefNannySetupContext("calc_spoke_angles", 0);
+
+  /* "landlab/graph/cfuncs.pyx":285
+ *                        double * angles):
+ *     cdef int i
+ *     cdef double x0 = hub[0]             # <<<<<<<<<<<<<<
+ *     cdef double y0 = hub[1]
+ *     cdef double * spoke = spokes
+ */
+  __pyx_v_x0 = (__pyx_v_hub[0]);
+
+  /* "landlab/graph/cfuncs.pyx":286
+ *     cdef int i
+ *     cdef double x0 = hub[0]
+ *     cdef double y0 = hub[1]             # <<<<<<<<<<<<<<
+ *     cdef double * spoke = spokes
+ *     cdef double two_pi = 2. * np.pi
+ */
+  __pyx_v_y0 = (__pyx_v_hub[1]);
+
+  /* "landlab/graph/cfuncs.pyx":287
+ *     cdef double x0 = hub[0]
+ *     cdef double y0 = hub[1]
+ *     cdef double * spoke = spokes             # <<<<<<<<<<<<<<
+ *     cdef double two_pi = 2. * np.pi
+ * 
+ */
+  __pyx_v_spoke = __pyx_v_spokes;
+
+  /* "landlab/graph/cfuncs.pyx":288
+ *     cdef double y0 = hub[1]
+ *     cdef double * spoke = spokes
+ *     cdef double two_pi = 2. * np.pi             # <<<<<<<<<<<<<<
+ * 
+ *     for i in range(n_spokes):
+ */
+  __Pyx_GetModuleGlobalName(__pyx_t_1, __pyx_n_s_np); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 288, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_1);
+  __pyx_t_2 = __Pyx_PyObject_GetAttrStr(__pyx_t_1, __pyx_n_s_pi); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 288, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_2);
+  __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
+  __pyx_t_1 = PyNumber_Multiply(__pyx_float_2_, __pyx_t_2); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 288, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_1);
+  __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
+  __pyx_t_3 = __pyx_PyFloat_AsDouble(__pyx_t_1); if (unlikely((__pyx_t_3 == (double)-1) && PyErr_Occurred())) __PYX_ERR(0, 288, __pyx_L1_error)
+  __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
+  __pyx_v_two_pi = __pyx_t_3;
+
+  /* "landlab/graph/cfuncs.pyx":290
+ *     cdef double two_pi = 2. * np.pi
+ * 
+ *     for i in range(n_spokes):             # <<<<<<<<<<<<<<
+ *         x = spoke[0]
+ *         y = spoke[1]
+ */
+  __pyx_t_4 = __pyx_v_n_spokes;
+  __pyx_t_5 = __pyx_t_4;
+  for (__pyx_t_6 = 0; __pyx_t_6 < __pyx_t_5; __pyx_t_6+=1) {
+    __pyx_v_i = __pyx_t_6;
+
+    /* "landlab/graph/cfuncs.pyx":291
+ * 
+ *     for i in range(n_spokes):
+ *         x = spoke[0]             # <<<<<<<<<<<<<<
+ *         y = spoke[1]
+ * 
+ */
+    __pyx_v_x = (__pyx_v_spoke[0]);
+
+    /* "landlab/graph/cfuncs.pyx":292
+ *     for i in range(n_spokes):
+ *         x = spoke[0]
+ *         y = spoke[1]             # <<<<<<<<<<<<<<
+ * 
+ *         angles[i] = atan2(y - y0, x - x0)
+ */
+    __pyx_v_y = (__pyx_v_spoke[1]);
+
+    /* "landlab/graph/cfuncs.pyx":294
+ *         y = spoke[1]
+ * 
+ *         angles[i] = atan2(y - y0, x - x0)             # <<<<<<<<<<<<<<
+ *         if angles[i] < 0.:
+ *             angles[i] += two_pi
+ */
+    (__pyx_v_angles[__pyx_v_i]) = atan2((__pyx_v_y - __pyx_v_y0), (__pyx_v_x - __pyx_v_x0));
+
+    /* "landlab/graph/cfuncs.pyx":295
+ * 
+ *         angles[i] = atan2(y - y0, x - x0)
+ *         if angles[i] < 0.:             # <<<<<<<<<<<<<<
+ *             angles[i] += two_pi
+ *         spoke += 2
+ */
+    __pyx_t_7 = (((__pyx_v_angles[__pyx_v_i]) < 0.) != 0);
+    if (__pyx_t_7) {
+
+      /* "landlab/graph/cfuncs.pyx":296
+ *         angles[i] = atan2(y - y0, x - x0)
+ *         if angles[i] < 0.:
+ *             angles[i] += two_pi             # <<<<<<<<<<<<<<
+ *         spoke += 2
+ * 
+ */
+      __pyx_t_8 = __pyx_v_i;
+      (__pyx_v_angles[__pyx_t_8]) = ((__pyx_v_angles[__pyx_t_8]) + __pyx_v_two_pi);
+
+      /* "landlab/graph/cfuncs.pyx":295
+ * 
+ *         angles[i] = atan2(y - y0, x - x0)
+ *         if angles[i] < 0.:             # <<<<<<<<<<<<<<
+ *             angles[i] += two_pi
+ *         spoke += 2
+ */
+    }
+
+    /* "landlab/graph/cfuncs.pyx":297
+ *         if angles[i] < 0.:
+ *             angles[i] += two_pi
+ *         spoke += 2             # <<<<<<<<<<<<<<
+ * 
+ * 
+ */
+    __pyx_v_spoke = (__pyx_v_spoke + 2);
+  }
+
+  /* "landlab/graph/cfuncs.pyx":282
+ * 
+ * 
+ * cdef calc_spoke_angles(double * hub, double * spokes, np.int_t n_spokes,             # <<<<<<<<<<<<<<
+ *                        double * angles):
+ *     cdef int i
+ */
+
+  /* function exit code */
+  __pyx_r = Py_None; __Pyx_INCREF(Py_None);
+  goto __pyx_L0;
+  __pyx_L1_error:;
+  __Pyx_XDECREF(__pyx_t_1);
+  __Pyx_XDECREF(__pyx_t_2);
+  __Pyx_AddTraceback("landlab.graph.cfuncs.calc_spoke_angles", __pyx_clineno, __pyx_lineno, __pyx_filename);
+  __pyx_r = 0;
+  __pyx_L0:;
+  __Pyx_XGIVEREF(__pyx_r);
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+/* "landlab/graph/cfuncs.pyx":300
+ * 
+ * 
+ * cdef argsort_by_angle_around_centroid(double * points,             # <<<<<<<<<<<<<<
+ *                                       np.int_t n_points,
+ *                                       int * out):
+ */
+
+static PyObject *__pyx_f_7landlab_5graph_6cfuncs_argsort_by_angle_around_centroid(double *__pyx_v_points, __pyx_t_5numpy_int_t __pyx_v_n_points, int *__pyx_v_out) {
+  double *__pyx_v_hub;
+  double *__pyx_v_angles;
+  PyObject *__pyx_r = NULL;
+  __Pyx_RefNannyDeclarations
+  PyObject *__pyx_t_1 = NULL;
+  int __pyx_t_2;
+  int __pyx_t_3;
+  char const *__pyx_t_4;
+  PyObject *__pyx_t_5 = NULL;
+  PyObject *__pyx_t_6 = NULL;
+  PyObject *__pyx_t_7 = NULL;
+  PyObject *__pyx_t_8 = NULL;
+  PyObject *__pyx_t_9 = NULL;
+  PyObject *__pyx_t_10 = NULL;
+  int __pyx_lineno = 0;
+  const char *__pyx_filename = NULL;
+  int __pyx_clineno = 0;
+  __Pyx_RefNannySetupContext("argsort_by_angle_around_centroid", 0);
+
+  /* "landlab/graph/cfuncs.pyx":303
+ *                                       np.int_t n_points,
+ *                                       int * out):
+ *     cdef double *hub = <double *>malloc(2 * sizeof(double))             # <<<<<<<<<<<<<<
+ *     cdef double *angles = <double *>malloc(n_points * sizeof(double))
+ * 
+ */
+  __pyx_v_hub = ((double *)malloc((2 * (sizeof(double)))));
+
+  /* "landlab/graph/cfuncs.pyx":304
+ *                                       int * out):
+ *     cdef double *hub = <double *>malloc(2 * sizeof(double))
+ *     cdef double *angles = <double *>malloc(n_points * sizeof(double))             # <<<<<<<<<<<<<<
+ * 
+ *     try:
+ */
+  __pyx_v_angles = ((double *)malloc((__pyx_v_n_points * (sizeof(double)))));
+
+  /* "landlab/graph/cfuncs.pyx":306
+ *     cdef double *angles = <double *>malloc(n_points * sizeof(double))
+ * 
+ *     try:             # <<<<<<<<<<<<<<
+ *         calc_centroid(points, n_points, hub)
+ *         calc_spoke_angles(hub, points, n_points, angles)
+ */
+  /*try:*/ {
+
+    /* "landlab/graph/cfuncs.pyx":307
+ * 
+ *     try:
+ *         calc_centroid(points, n_points, hub)             # <<<<<<<<<<<<<<
+ *         calc_spoke_angles(hub, points, n_points, angles)
+ *         argsort(angles, n_points, out)
+ */
+    __pyx_t_1 = __pyx_f_7landlab_5graph_6cfuncs_calc_centroid(__pyx_v_points, __pyx_v_n_points, __pyx_v_hub); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 307, __pyx_L4_error)
+    __Pyx_GOTREF(__pyx_t_1);
+    __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
+
+    /* "landlab/graph/cfuncs.pyx":308
+ *     try:
+ *         calc_centroid(points, n_points, hub)
+ *         calc_spoke_angles(hub, points, n_points, angles)             # <<<<<<<<<<<<<<
+ *         argsort(angles, n_points, out)
+ *     finally:
+ */
+    __pyx_t_1 = __pyx_f_7landlab_5graph_6cfuncs_calc_spoke_angles(__pyx_v_hub, __pyx_v_points, __pyx_v_n_points, __pyx_v_angles); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 308, __pyx_L4_error)
+    __Pyx_GOTREF(__pyx_t_1);
+    __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
+
+    /* "landlab/graph/cfuncs.pyx":309
+ *         calc_centroid(points, n_points, hub)
+ *         calc_spoke_angles(hub, points, n_points, angles)
+ *         argsort(angles, n_points, out)             # <<<<<<<<<<<<<<
+ *     finally:
+ *         free(angles)
+ */
+    __pyx_t_1 = __pyx_f_7landlab_5graph_6cfuncs_argsort(__pyx_v_angles, __pyx_v_n_points, __pyx_v_out); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 309, __pyx_L4_error)
+    __Pyx_GOTREF(__pyx_t_1);
+    __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
+  }
+
+  /* "landlab/graph/cfuncs.pyx":311
+ *         argsort(angles, n_points, out)
+ *     finally:
+ *         free(angles)             # <<<<<<<<<<<<<<
+ *         free(hub)
+ * 
+ */
+  /*finally:*/ {
+    /*normal exit:*/{
+      free(__pyx_v_angles);
+
+      /* "landlab/graph/cfuncs.pyx":312
+ *     finally:
+ *         free(angles)
+ *         free(hub)             # <<<<<<<<<<<<<<
+ * 
+ * 
+ */
+      free(__pyx_v_hub);
+      goto __pyx_L5;
+    }
+    __pyx_L4_error:;
+    /*exception exit:*/{
+      __Pyx_PyThreadState_declare
+      __Pyx_PyThreadState_assign
+      __pyx_t_5 = 0; __pyx_t_6 = 0; __pyx_t_7 = 0; __pyx_t_8 = 0; __pyx_t_9 = 0; __pyx_t_10 = 0;
+      __Pyx_XDECREF(__pyx_t_1); __pyx_t_1 = 0;
+      if (PY_MAJOR_VERSION >= 3) __Pyx_ExceptionSwap(&__pyx_t_8, &__pyx_t_9, &__pyx_t_10);
+      if ((PY_MAJOR_VERSION < 3) || unlikely(__Pyx_GetException(&__pyx_t_5, &__pyx_t_6, &__pyx_t_7) < 0)) __Pyx_ErrFetch(&__pyx_t_5, &__pyx_t_6, &__pyx_t_7);
+      __Pyx_XGOTREF(__pyx_t_5);
+      __Pyx_XGOTREF(__pyx_t_6);
+      __Pyx_XGOTREF(__pyx_t_7);
+      __Pyx_XGOTREF(__pyx_t_8);
+      __Pyx_XGOTREF(__pyx_t_9);
+      __Pyx_XGOTREF(__pyx_t_10);
+      __pyx_t_2 = __pyx_lineno; __pyx_t_3 = __pyx_clineno; __pyx_t_4 = __pyx_filename;
+      {
+
+        /* "landlab/graph/cfuncs.pyx":311
+ *         argsort(angles, n_points, out)
+ *     finally:
+ *         free(angles)             # <<<<<<<<<<<<<<
+ *         free(hub)
+ * 
+ */
+        free(__pyx_v_angles);
+
+        /* "landlab/graph/cfuncs.pyx":312
+ *     finally:
+ *         free(angles)
+ *         free(hub)             # <<<<<<<<<<<<<<
+ * 
+ * 
+ */
+        free(__pyx_v_hub);
+      }
+      if (PY_MAJOR_VERSION >= 3) {
+        __Pyx_XGIVEREF(__pyx_t_8);
+        __Pyx_XGIVEREF(__pyx_t_9);
+        __Pyx_XGIVEREF(__pyx_t_10);
+        __Pyx_ExceptionReset(__pyx_t_8, __pyx_t_9, __pyx_t_10);
+      }
+      __Pyx_XGIVEREF(__pyx_t_5);
+      __Pyx_XGIVEREF(__pyx_t_6);
+      __Pyx_XGIVEREF(__pyx_t_7);
+      __Pyx_ErrRestore(__pyx_t_5, __pyx_t_6, __pyx_t_7);
+      __pyx_t_5 = 0; __pyx_t_6 = 0; __pyx_t_7 = 0; __pyx_t_8 = 0; __pyx_t_9 = 0; __pyx_t_10 = 0;
+      __pyx_lineno = __pyx_t_2; __pyx_clineno = __pyx_t_3; __pyx_filename = __pyx_t_4;
+      goto __pyx_L1_error;
+    }
+    __pyx_L5:;
+  }
+
+  /* "landlab/graph/cfuncs.pyx":300
+ * 
+ * 
+ * cdef argsort_by_angle_around_centroid(double * points,             # <<<<<<<<<<<<<<
+ *                                       np.int_t n_points,
+ *                                       int * out):
+ */
+
+  /* function exit code */
+  __pyx_r = Py_None; __Pyx_INCREF(Py_None);
+  goto __pyx_L0;
+  __pyx_L1_error:;
+  __Pyx_XDECREF(__pyx_t_1);
+  __Pyx_AddTraceback("landlab.graph.cfuncs.argsort_by_angle_around_centroid", __pyx_clineno, __pyx_lineno, __pyx_filename);
+  __pyx_r = 0;
+  __pyx_L0:;
+  __Pyx_XGIVEREF(__pyx_r);
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+/* "landlab/graph/cfuncs.pyx":315
+ * 
+ * 
+ * cdef sort_spokes_around_hub(int * spokes, int n_spokes, double * xy_of_spoke,             # <<<<<<<<<<<<<<
+ *                             double * xy_of_hub):
+ *     cdef int point
+ */
+
+static PyObject *__pyx_f_7landlab_5graph_6cfuncs_sort_spokes_around_hub(int *__pyx_v_spokes, int __pyx_v_n_spokes, double *__pyx_v_xy_of_spoke, double *__pyx_v_xy_of_hub) {
+  int __pyx_v_point;
+  int __pyx_v_spoke;
+  double *__pyx_v_points;
+  double *__pyx_v_angles;
+  int *__pyx_v_ordered;
+  int *__pyx_v_temp;
+  PyObject *__pyx_r = NULL;
+  __Pyx_RefNannyDeclarations
+  int __pyx_t_1;
+  int __pyx_t_2;
+  int __pyx_t_3;
+  PyObject *__pyx_t_4 = NULL;
+  char const *__pyx_t_5;
+  PyObject *__pyx_t_6 = NULL;
+  PyObject *__pyx_t_7 = NULL;
+  PyObject *__pyx_t_8 = NULL;
+  PyObject *__pyx_t_9 = NULL;
+  PyObject *__pyx_t_10 = NULL;
+  PyObject *__pyx_t_11 = NULL;
+  int __pyx_lineno = 0;
+  const char *__pyx_filename = NULL;
+  int __pyx_clineno = 0;
+  __Pyx_RefNannySetupContext("sort_spokes_around_hub", 0);
+
+  /* "landlab/graph/cfuncs.pyx":319
+ *     cdef int point
+ *     cdef int spoke
+ *     cdef double * points = <double *>malloc(2 * n_spokes * sizeof(double))             # <<<<<<<<<<<<<<
+ *     cdef double * angles = <double *>malloc(n_spokes * sizeof(double))
+ *     cdef int * ordered = <int *>malloc(n_spokes * sizeof(int))
+ */
+  __pyx_v_points = ((double *)malloc(((2 * __pyx_v_n_spokes) * (sizeof(double)))));
+
+  /* "landlab/graph/cfuncs.pyx":320
+ *     cdef int spoke
+ *     cdef double * points = <double *>malloc(2 * n_spokes * sizeof(double))
+ *     cdef double * angles = <double *>malloc(n_spokes * sizeof(double))             # <<<<<<<<<<<<<<
+ *     cdef int * ordered = <int *>malloc(n_spokes * sizeof(int))
+ *     cdef int * temp = <int *>malloc(n_spokes * sizeof(int))
+ */
+  __pyx_v_angles = ((double *)malloc((__pyx_v_n_spokes * (sizeof(double)))));
+
+  /* "landlab/graph/cfuncs.pyx":321
+ *     cdef double * points = <double *>malloc(2 * n_spokes * sizeof(double))
+ *     cdef double * angles = <double *>malloc(n_spokes * sizeof(double))
+ *     cdef int * ordered = <int *>malloc(n_spokes * sizeof(int))             # <<<<<<<<<<<<<<
+ *     cdef int * temp = <int *>malloc(n_spokes * sizeof(int))
+ * 
+ */
+  __pyx_v_ordered = ((int *)malloc((__pyx_v_n_spokes * (sizeof(int)))));
+
+  /* "landlab/graph/cfuncs.pyx":322
+ *     cdef double * angles = <double *>malloc(n_spokes * sizeof(double))
+ *     cdef int * ordered = <int *>malloc(n_spokes * sizeof(int))
+ *     cdef int * temp = <int *>malloc(n_spokes * sizeof(int))             # <<<<<<<<<<<<<<
+ * 
+ *     try:
+ */
+  __pyx_v_temp = ((int *)malloc((__pyx_v_n_spokes * (sizeof(int)))));
+
+  /* "landlab/graph/cfuncs.pyx":324
+ *     cdef int * temp = <int *>malloc(n_spokes * sizeof(int))
+ * 
+ *     try:             # <<<<<<<<<<<<<<
+ *         point = 0
+ *         for spoke in range(n_spokes):
+ */
+  /*try:*/ {
+
+    /* "landlab/graph/cfuncs.pyx":325
+ * 
+ *     try:
+ *         point = 0             # <<<<<<<<<<<<<<
+ *         for spoke in range(n_spokes):
+ *             points[point] = xy_of_spoke[2 * spokes[spoke]]
+ */
+    __pyx_v_point = 0;
+
+    /* "landlab/graph/cfuncs.pyx":326
+ *     try:
+ *         point = 0
+ *         for spoke in range(n_spokes):             # <<<<<<<<<<<<<<
+ *             points[point] = xy_of_spoke[2 * spokes[spoke]]
+ *             points[point + 1] = xy_of_spoke[2 * spokes[spoke] + 1]
+ */
+    __pyx_t_1 = __pyx_v_n_spokes;
+    __pyx_t_2 = __pyx_t_1;
+    for (__pyx_t_3 = 0; __pyx_t_3 < __pyx_t_2; __pyx_t_3+=1) {
+      __pyx_v_spoke = __pyx_t_3;
+
+      /* "landlab/graph/cfuncs.pyx":327
+ *         point = 0
+ *         for spoke in range(n_spokes):
+ *             points[point] = xy_of_spoke[2 * spokes[spoke]]             # <<<<<<<<<<<<<<
+ *             points[point + 1] = xy_of_spoke[2 * spokes[spoke] + 1]
+ *             point += 2
+ */
+      (__pyx_v_points[__pyx_v_point]) = (__pyx_v_xy_of_spoke[(2 * (__pyx_v_spokes[__pyx_v_spoke]))]);
+
+      /* "landlab/graph/cfuncs.pyx":328
+ *         for spoke in range(n_spokes):
+ *             points[point] = xy_of_spoke[2 * spokes[spoke]]
+ *             points[point + 1] = xy_of_spoke[2 * spokes[spoke] + 1]             # <<<<<<<<<<<<<<
+ *             point += 2
+ * 
+ */
+      (__pyx_v_points[(__pyx_v_point + 1)]) = (__pyx_v_xy_of_spoke[((2 * (__pyx_v_spokes[__pyx_v_spoke])) + 1)]);
+
+      /* "landlab/graph/cfuncs.pyx":329
+ *             points[point] = xy_of_spoke[2 * spokes[spoke]]
+ *             points[point + 1] = xy_of_spoke[2 * spokes[spoke] + 1]
+ *             point += 2             # <<<<<<<<<<<<<<
+ * 
+ *         calc_spoke_angles(xy_of_hub, points, n_spokes, angles)
+ */
+      __pyx_v_point = (__pyx_v_point + 2);
+    }
+
+    /* "landlab/graph/cfuncs.pyx":331
+ *             point += 2
+ * 
+ *         calc_spoke_angles(xy_of_hub, points, n_spokes, angles)             # <<<<<<<<<<<<<<
+ *         argsort(angles, n_spokes, ordered)
+ * 
+ */
+    __pyx_t_4 = __pyx_f_7landlab_5graph_6cfuncs_calc_spoke_angles(__pyx_v_xy_of_hub, __pyx_v_points, __pyx_v_n_spokes, __pyx_v_angles); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 331, __pyx_L4_error)
+    __Pyx_GOTREF(__pyx_t_4);
+    __Pyx_DECREF(__pyx_t_4); __pyx_t_4 = 0;
+
+    /* "landlab/graph/cfuncs.pyx":332
+ * 
+ *         calc_spoke_angles(xy_of_hub, points, n_spokes, angles)
+ *         argsort(angles, n_spokes, ordered)             # <<<<<<<<<<<<<<
+ * 
+ *         for spoke in range(n_spokes):
+ */
+    __pyx_t_4 = __pyx_f_7landlab_5graph_6cfuncs_argsort(__pyx_v_angles, __pyx_v_n_spokes, __pyx_v_ordered); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 332, __pyx_L4_error)
+    __Pyx_GOTREF(__pyx_t_4);
+    __Pyx_DECREF(__pyx_t_4); __pyx_t_4 = 0;
+
+    /* "landlab/graph/cfuncs.pyx":334
+ *         argsort(angles, n_spokes, ordered)
+ * 
+ *         for spoke in range(n_spokes):             # <<<<<<<<<<<<<<
+ *             temp[spoke] = spokes[ordered[spoke]]
+ * 
+ */
+    __pyx_t_1 = __pyx_v_n_spokes;
+    __pyx_t_2 = __pyx_t_1;
+    for (__pyx_t_3 = 0; __pyx_t_3 < __pyx_t_2; __pyx_t_3+=1) {
+      __pyx_v_spoke = __pyx_t_3;
+
+      /* "landlab/graph/cfuncs.pyx":335
+ * 
+ *         for spoke in range(n_spokes):
+ *             temp[spoke] = spokes[ordered[spoke]]             # <<<<<<<<<<<<<<
+ * 
+ *         for spoke in range(n_spokes):
+ */
+      (__pyx_v_temp[__pyx_v_spoke]) = (__pyx_v_spokes[(__pyx_v_ordered[__pyx_v_spoke])]);
+    }
+
+    /* "landlab/graph/cfuncs.pyx":337
+ *             temp[spoke] = spokes[ordered[spoke]]
+ * 
+ *         for spoke in range(n_spokes):             # <<<<<<<<<<<<<<
+ *             spokes[spoke] = temp[spoke]
+ *     finally:
+ */
+    __pyx_t_1 = __pyx_v_n_spokes;
+    __pyx_t_2 = __pyx_t_1;
+    for (__pyx_t_3 = 0; __pyx_t_3 < __pyx_t_2; __pyx_t_3+=1) {
+      __pyx_v_spoke = __pyx_t_3;
+
+      /* "landlab/graph/cfuncs.pyx":338
+ * 
+ *         for spoke in range(n_spokes):
+ *             spokes[spoke] = temp[spoke]             # <<<<<<<<<<<<<<
+ *     finally:
+ *         free(angles)
+ */
+      (__pyx_v_spokes[__pyx_v_spoke]) = (__pyx_v_temp[__pyx_v_spoke]);
+    }
+  }
+
+  /* "landlab/graph/cfuncs.pyx":340
+ *             spokes[spoke] = temp[spoke]
+ *     finally:
+ *         free(angles)             # <<<<<<<<<<<<<<
+ *         free(temp)
+ *         free(ordered)
+ */
+  /*finally:*/ {
+    /*normal exit:*/{
+      free(__pyx_v_angles);
+
+      /* "landlab/graph/cfuncs.pyx":341
+ *     finally:
+ *         free(angles)
+ *         free(temp)             # <<<<<<<<<<<<<<
+ *         free(ordered)
+ *         free(points)
+ */
+      free(__pyx_v_temp);
+
+      /* "landlab/graph/cfuncs.pyx":342
+ *         free(angles)
+ *         free(temp)
+ *         free(ordered)             # <<<<<<<<<<<<<<
+ *         free(points)
+ * 
+ */
+      free(__pyx_v_ordered);
+
+      /* "landlab/graph/cfuncs.pyx":343
+ *         free(temp)
+ *         free(ordered)
+ *         free(points)             # <<<<<<<<<<<<<<
+ * 
+ * 
+ */
+      free(__pyx_v_points);
+      goto __pyx_L5;
+    }
+    __pyx_L4_error:;
+    /*exception exit:*/{
+      __Pyx_PyThreadState_declare
+      __Pyx_PyThreadState_assign
+      __pyx_t_6 = 0; __pyx_t_7 = 0; __pyx_t_8 = 0; __pyx_t_9 = 0; __pyx_t_10 = 0; __pyx_t_11 = 0;
+      __Pyx_XDECREF(__pyx_t_4); __pyx_t_4 = 0;
+      if (PY_MAJOR_VERSION >= 3) __Pyx_ExceptionSwap(&__pyx_t_9, &__pyx_t_10, &__pyx_t_11);
+      if ((PY_MAJOR_VERSION < 3) || unlikely(__Pyx_GetException(&__pyx_t_6, &__pyx_t_7, &__pyx_t_8) < 0)) __Pyx_ErrFetch(&__pyx_t_6, &__pyx_t_7, &__pyx_t_8);
+      __Pyx_XGOTREF(__pyx_t_6);
+      __Pyx_XGOTREF(__pyx_t_7);
+      __Pyx_XGOTREF(__pyx_t_8);
+      __Pyx_XGOTREF(__pyx_t_9);
+      __Pyx_XGOTREF(__pyx_t_10);
+      __Pyx_XGOTREF(__pyx_t_11);
+      __pyx_t_1 = __pyx_lineno; __pyx_t_2 = __pyx_clineno; __pyx_t_5 = __pyx_filename;
+      {
+
+        /* "landlab/graph/cfuncs.pyx":340
+ *             spokes[spoke] = temp[spoke]
+ *     finally:
+ *         free(angles)             # <<<<<<<<<<<<<<
+ *         free(temp)
+ *         free(ordered)
+ */
+        free(__pyx_v_angles);
+
+        /* "landlab/graph/cfuncs.pyx":341
+ *     finally:
+ *         free(angles)
+ *         free(temp)             # <<<<<<<<<<<<<<
+ *         free(ordered)
+ *         free(points)
+ */
+        free(__pyx_v_temp);
+
+        /* "landlab/graph/cfuncs.pyx":342
+ *         free(angles)
+ *         free(temp)
+ *         free(ordered)             # <<<<<<<<<<<<<<
+ *         free(points)
+ * 
+ */
+        free(__pyx_v_ordered);
+
+        /* "landlab/graph/cfuncs.pyx":343
+ *         free(temp)
+ *         free(ordered)
+ *         free(points)             # <<<<<<<<<<<<<<
+ * 
+ * 
+ */
+        free(__pyx_v_points);
+      }
+      if (PY_MAJOR_VERSION >= 3) {
+        __Pyx_XGIVEREF(__pyx_t_9);
+        __Pyx_XGIVEREF(__pyx_t_10);
+        __Pyx_XGIVEREF(__pyx_t_11);
+        __Pyx_ExceptionReset(__pyx_t_9, __pyx_t_10, __pyx_t_11);
+      }
+      __Pyx_XGIVEREF(__pyx_t_6);
+      __Pyx_XGIVEREF(__pyx_t_7);
+      __Pyx_XGIVEREF(__pyx_t_8);
+      __Pyx_ErrRestore(__pyx_t_6, __pyx_t_7, __pyx_t_8);
+      __pyx_t_6 = 0; __pyx_t_7 = 0; __pyx_t_8 = 0; __pyx_t_9 = 0; __pyx_t_10 = 0; __pyx_t_11 = 0;
+      __pyx_lineno = __pyx_t_1; __pyx_clineno = __pyx_t_2; __pyx_filename = __pyx_t_5;
+      goto __pyx_L1_error;
+    }
+    __pyx_L5:;
+  }
+
+  /* "landlab/graph/cfuncs.pyx":315
+ * 
+ * 
+ * cdef sort_spokes_around_hub(int * spokes, int n_spokes, double * xy_of_spoke,             # <<<<<<<<<<<<<<
+ *                             double * xy_of_hub):
+ *     cdef int point
+ */
+
+  /* function exit code */
+  __pyx_r = Py_None; __Pyx_INCREF(Py_None);
+  goto __pyx_L0;
+  __pyx_L1_error:;
+  __Pyx_XDECREF(__pyx_t_4);
+  __Pyx_AddTraceback("landlab.graph.cfuncs.sort_spokes_around_hub", __pyx_clineno, __pyx_lineno, __pyx_filename);
+  __pyx_r = 0;
+  __pyx_L0:;
+  __Pyx_XGIVEREF(__pyx_r);
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+/* "landlab/graph/cfuncs.pyx":347
+ * 
+ * @cython.boundscheck(False)
+ * def reorder_links_at_patch(np.ndarray[DTYPE_t, ndim=1] links_at_patch,             # <<<<<<<<<<<<<<
+ *                            np.ndarray[DTYPE_t, ndim=1] offset_to_patch,
+ *                            np.ndarray[np.float_t, ndim=2] xy_of_link):
+ */
+
+/* Python wrapper */
+static PyObject *__pyx_pw_7landlab_5graph_6cfuncs_19reorder_links_at_patch(PyObject *__pyx_self, PyObject *__pyx_args, PyObject *__pyx_kwds); /*proto*/
+static PyMethodDef __pyx_mdef_7landlab_5graph_6cfuncs_19reorder_links_at_patch = {"reorder_links_at_patch", (PyCFunction)(void*)(PyCFunctionWithKeywords)__pyx_pw_7landlab_5graph_6cfuncs_19reorder_links_at_patch, METH_VARARGS|METH_KEYWORDS, 0};
+static PyObject *__pyx_pw_7landlab_5graph_6cfuncs_19reorder_links_at_patch(PyObject *__pyx_self, PyObject *__pyx_args, PyObject *__pyx_kwds) {
+  PyArrayObject *__pyx_v_links_at_patch = 0;
+  PyArrayObject *__pyx_v_offset_to_patch = 0;
+  PyArrayObject *__pyx_v_xy_of_link = 0;
+  int __pyx_lineno = 0;
+  const char *__pyx_filename = NULL;
+  int __pyx_clineno = 0;
+  PyObject *__pyx_r = 0;
+  __Pyx_RefNannyDeclarations
+  __Pyx_RefNannySetupContext("reorder_links_at_patch (wrapper)", 0);
+  {
+    static PyObject **__pyx_pyargnames[] = {&__pyx_n_s_links_at_patch,&__pyx_n_s_offset_to_patch,&__pyx_n_s_xy_of_link,0};
+    PyObject* values[3] = {0,0,0};
+    if (unlikely(__pyx_kwds)) {
+      Py_ssize_t kw_args;
+      const Py_ssize_t pos_args = PyTuple_GET_SIZE(__pyx_args);
+      switch (pos_args) {
+        case  3: values[2] = PyTuple_GET_ITEM(__pyx_args, 2);
+        CYTHON_FALLTHROUGH;
+        case  2: values[1] = PyTuple_GET_ITEM(__pyx_args, 1);
+        CYTHON_FALLTHROUGH;
+        case  1: values[0] = PyTuple_GET_ITEM(__pyx_args, 0);
+        CYTHON_FALLTHROUGH;
+        case  0: break;
+        default: goto __pyx_L5_argtuple_error;
+      }
+      kw_args = PyDict_Size(__pyx_kwds);
+      switch (pos_args) {
+        case  0:
+        if (likely((values[0] = __Pyx_PyDict_GetItemStr(__pyx_kwds, __pyx_n_s_links_at_patch)) != 0)) kw_args--;
+        else goto __pyx_L5_argtuple_error;
+        CYTHON_FALLTHROUGH;
+        case  1:
+        if (likely((values[1] = __Pyx_PyDict_GetItemStr(__pyx_kwds, __pyx_n_s_offset_to_patch)) != 0)) kw_args--;
+        else {
+          __Pyx_RaiseArgtupleInvalid("reorder_links_at_patch", 1, 3, 3, 1); __PYX_ERR(0, 347, __pyx_L3_error)
+        }
+        CYTHON_FALLTHROUGH;
+        case  2:
+        if (likely((values[2] = __Pyx_PyDict_GetItemStr(__pyx_kwds, __pyx_n_s_xy_of_link)) != 0)) kw_args--;
+        else {
+          __Pyx_RaiseArgtupleInvalid("reorder_links_at_patch", 1, 3, 3, 2); __PYX_ERR(0, 347, __pyx_L3_error)
+        }
+      }
+      if (unlikely(kw_args > 0)) {
+        if (unlikely(__Pyx_ParseOptionalKeywords(__pyx_kwds, __pyx_pyargnames, 0, values, pos_args, "reorder_links_at_patch") < 0)) __PYX_ERR(0, 347, __pyx_L3_error)
+      }
+    } else if (PyTuple_GET_SIZE(__pyx_args) != 3) {
+      goto __pyx_L5_argtuple_error;
+    } else {
+      values[0] = PyTuple_GET_ITEM(__pyx_args, 0);
+      values[1] = PyTuple_GET_ITEM(__pyx_args, 1);
+      values[2] = PyTuple_GET_ITEM(__pyx_args, 2);
+    }
+    __pyx_v_links_at_patch = ((PyArrayObject *)values[0]);
+    __pyx_v_offset_to_patch = ((PyArrayObject *)values[1]);
+    __pyx_v_xy_of_link = ((PyArrayObject *)values[2]);
+  }
+  goto __pyx_L4_argument_unpacking_done;
+  __pyx_L5_argtuple_error:;
+  __Pyx_RaiseArgtupleInvalid("reorder_links_at_patch", 1, 3, 3, PyTuple_GET_SIZE(__pyx_args)); __PYX_ERR(0, 347, __pyx_L3_error)
+  __pyx_L3_error:;
+  __Pyx_AddTraceback("landlab.graph.cfuncs.reorder_links_at_patch", __pyx_clineno, __pyx_lineno, __pyx_filename);
+  __Pyx_RefNannyFinishContext();
+  return NULL;
+  __pyx_L4_argument_unpacking_done:;
+  if (unlikely(!__Pyx_ArgTypeTest(((PyObject *)__pyx_v_links_at_patch), __pyx_ptype_5numpy_ndarray, 1, "links_at_patch", 0))) __PYX_ERR(0, 347, __pyx_L1_error)
+  if (unlikely(!__Pyx_ArgTypeTest(((PyObject *)__pyx_v_offset_to_patch), __pyx_ptype_5numpy_ndarray, 1, "offset_to_patch", 0))) __PYX_ERR(0, 348, __pyx_L1_error)
+  if (unlikely(!__Pyx_ArgTypeTest(((PyObject *)__pyx_v_xy_of_link), __pyx_ptype_5numpy_ndarray, 1, "xy_of_link", 0))) __PYX_ERR(0, 349, __pyx_L1_error)
+  __pyx_r = __pyx_pf_7landlab_5graph_6cfuncs_18reorder_links_at_patch(__pyx_self, __pyx_v_links_at_patch, __pyx_v_offset_to_patch, __pyx_v_xy_of_link);
+
+  /* function exit code */
+  goto __pyx_L0;
+  __pyx_L1_error:;
+  __pyx_r = NULL;
+  __pyx_L0:;
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+static PyObject *__pyx_pf_7landlab_5graph_6cfuncs_18reorder_links_at_patch(CYTHON_UNUSED PyObject *__pyx_self, PyArrayObject *__pyx_v_links_at_patch, PyArrayObject *__pyx_v_offset_to_patch, PyArrayObject *__pyx_v_xy_of_link) {
+  int __pyx_v_n_links;
+  int __pyx_v_n_patches;
+  int __pyx_v_link;
+  int __pyx_v_patch;
+  int __pyx_v_offset;
+  int __pyx_v_i;
+  double *__pyx_v_angles;
+  double *__pyx_v_points;
+  int *__pyx_v_ordered;
+  int *__pyx_v_link_buffer;
+  __Pyx_LocalBuf_ND __pyx_pybuffernd_links_at_patch;
+  __Pyx_Buffer __pyx_pybuffer_links_at_patch;
+  __Pyx_LocalBuf_ND __pyx_pybuffernd_offset_to_patch;
+  __Pyx_Buffer __pyx_pybuffer_offset_to_patch;
+  __Pyx_LocalBuf_ND __pyx_pybuffernd_xy_of_link;
+  __Pyx_Buffer __pyx_pybuffer_xy_of_link;
+  PyObject *__pyx_r = NULL;
+  __Pyx_RefNannyDeclarations
+  Py_ssize_t __pyx_t_1;
+  int __pyx_t_2;
+  int __pyx_t_3;
+  int __pyx_t_4;
+  Py_ssize_t __pyx_t_5;
+  int __pyx_t_6;
+  int __pyx_t_7;
+  int __pyx_t_8;
+  PyObject *__pyx_t_9 = NULL;
+  PyObject *__pyx_t_10 = NULL;
+  double __pyx_t_11;
+  char const *__pyx_t_12;
+  PyObject *__pyx_t_13 = NULL;
+  PyObject *__pyx_t_14 = NULL;
+  PyObject *__pyx_t_15 = NULL;
+  PyObject *__pyx_t_16 = NULL;
+  PyObject *__pyx_t_17 = NULL;
+  PyObject *__pyx_t_18 = NULL;
+  int __pyx_lineno = 0;
+  const char *__pyx_filename = NULL;
+  int __pyx_clineno = 0;
+  __Pyx_RefNannySetupContext("reorder_links_at_patch", 0);
+  __pyx_pybuffer_links_at_patch.pybuffer.buf = NULL;
+  __pyx_pybuffer_links_at_patch.refcount = 0;
+  __pyx_pybuffernd_links_at_patch.data = NULL;
+  __pyx_pybuffernd_links_at_patch.rcbuffer = &__pyx_pybuffer_links_at_patch;
+  __pyx_pybuffer_offset_to_patch.pybuffer.buf = NULL;
+  __pyx_pybuffer_offset_to_patch.refcount = 0;
+  __pyx_pybuffernd_offset_to_patch.data = NULL;
+  __pyx_pybuffernd_offset_to_patch.rcbuffer = &__pyx_pybuffer_offset_to_patch;
+  __pyx_pybuffer_xy_of_link.pybuffer.buf = NULL;
+  __pyx_pybuffer_xy_of_link.refcount = 0;
+  __pyx_pybuffernd_xy_of_link.data = NULL;
+  __pyx_pybuffernd_xy_of_link.rcbuffer = &__pyx_pybuffer_xy_of_link;
+  {
+    __Pyx_BufFmt_StackElem __pyx_stack[1];
+    if (unlikely(__Pyx_GetBufferAndValidate(&__pyx_pybuffernd_links_at_patch.rcbuffer->pybuffer, (PyObject*)__pyx_v_links_at_patch, &__Pyx_TypeInfo_nn___pyx_t_7landlab_5graph_6cfuncs_DTYPE_t, PyBUF_FORMAT| PyBUF_STRIDES| PyBUF_WRITABLE, 1, 0, __pyx_stack) == -1)) __PYX_ERR(0, 347, __pyx_L1_error)
+  }
+  __pyx_pybuffernd_links_at_patch.diminfo[0].strides = __pyx_pybuffernd_links_at_patch.rcbuffer->pybuffer.strides[0]; __pyx_pybuffernd_links_at_patch.diminfo[0].shape = __pyx_pybuffernd_links_at_patch.rcbuffer->pybuffer.shape[0];
+  {
+    __Pyx_BufFmt_StackElem __pyx_stack[1];
+    if (unlikely(__Pyx_GetBufferAndValidate(&__pyx_pybuffernd_offset_to_patch.rcbuffer->pybuffer, (PyObject*)__pyx_v_offset_to_patch, &__Pyx_TypeInfo_nn___pyx_t_7landlab_5graph_6cfuncs_DTYPE_t, PyBUF_FORMAT| PyBUF_STRIDES, 1, 0, __pyx_stack) == -1)) __PYX_ERR(0, 347, __pyx_L1_error)
+  }
+  __pyx_pybuffernd_offset_to_patch.diminfo[0].strides = __pyx_pybuffernd_offset_to_patch.rcbuffer->pybuffer.strides[0]; __pyx_pybuffernd_offset_to_patch.diminfo[0].shape = __pyx_pybuffernd_offset_to_patch.rcbuffer->pybuffer.shape[0];
+  {
+    __Pyx_BufFmt_StackElem __pyx_stack[1];
+    if (unlikely(__Pyx_GetBufferAndValidate(&__pyx_pybuffernd_xy_of_link.rcbuffer->pybuffer, (PyObject*)__pyx_v_xy_of_link, &__Pyx_TypeInfo_nn___pyx_t_5numpy_float_t, PyBUF_FORMAT| PyBUF_STRIDES, 2, 0, __pyx_stack) == -1)) __PYX_ERR(0, 347, __pyx_L1_error)
+  }
+  __pyx_pybuffernd_xy_of_link.diminfo[0].strides = __pyx_pybuffernd_xy_of_link.rcbuffer->pybuffer.strides[0]; __pyx_pybuffernd_xy_of_link.diminfo[0].shape = __pyx_pybuffernd_xy_of_link.rcbuffer->pybuffer.shape[0]; __pyx_pybuffernd_xy_of_link.diminfo[1].strides = __pyx_pybuffernd_xy_of_link.rcbuffer->pybuffer.strides[1]; __pyx_pybuffernd_xy_of_link.diminfo[1].shape = __pyx_pybuffernd_xy_of_link.rcbuffer->pybuffer.shape[1];
+
+  /* "landlab/graph/cfuncs.pyx":350
+ *                            np.ndarray[DTYPE_t, ndim=1] offset_to_patch,
+ *                            np.ndarray[np.float_t, ndim=2] xy_of_link):
+ *     cdef int n_links = xy_of_link.shape[0]             # <<<<<<<<<<<<<<
+ *     cdef int n_patches = len(offset_to_patch) - 1
+ *     cdef int link
+ */
+  __pyx_v_n_links = (__pyx_v_xy_of_link->dimensions[0]);
+
+  /* "landlab/graph/cfuncs.pyx":351
+ *                            np.ndarray[np.float_t, ndim=2] xy_of_link):
+ *     cdef int n_links = xy_of_link.shape[0]
+ *     cdef int n_patches = len(offset_to_patch) - 1             # <<<<<<<<<<<<<<
+ *     cdef int link
+ *     cdef int patch
+ */
+  __pyx_t_1 = PyObject_Length(((PyObject *)__pyx_v_offset_to_patch)); if (unlikely(__pyx_t_1 == ((Py_ssize_t)-1))) __PYX_ERR(0, 351, __pyx_L1_error)
+  __pyx_v_n_patches = (__pyx_t_1 - 1);
+
+  /* "landlab/graph/cfuncs.pyx":356
+ *     cdef int offset
+ *     cdef int i
+ *     cdef double *angles = <double *>malloc(n_links * sizeof(double))             # <<<<<<<<<<<<<<
+ *     cdef double *points = <double *>malloc(2 * n_links * sizeof(double))
+ *     cdef int *ordered = <int *>malloc(n_links * sizeof(int))
+ */
+  __pyx_v_angles = ((double *)malloc((__pyx_v_n_links * (sizeof(double)))));
+
+  /* "landlab/graph/cfuncs.pyx":357
+ *     cdef int i
+ *     cdef double *angles = <double *>malloc(n_links * sizeof(double))
+ *     cdef double *points = <double *>malloc(2 * n_links * sizeof(double))             # <<<<<<<<<<<<<<
+ *     cdef int *ordered = <int *>malloc(n_links * sizeof(int))
+ *     cdef int *link_buffer = <int *>malloc(n_links * sizeof(int))
+ */
+  __pyx_v_points = ((double *)malloc(((2 * __pyx_v_n_links) * (sizeof(double)))));
+
+  /* "landlab/graph/cfuncs.pyx":358
+ *     cdef double *angles = <double *>malloc(n_links * sizeof(double))
+ *     cdef double *points = <double *>malloc(2 * n_links * sizeof(double))
+ *     cdef int *ordered = <int *>malloc(n_links * sizeof(int))             # <<<<<<<<<<<<<<
+ *     cdef int *link_buffer = <int *>malloc(n_links * sizeof(int))
+ * 
+ */
+  __pyx_v_ordered = ((int *)malloc((__pyx_v_n_links * (sizeof(int)))));
+
+  /* "landlab/graph/cfuncs.pyx":359
+ *     cdef double *points = <double *>malloc(2 * n_links * sizeof(double))
+ *     cdef int *ordered = <int *>malloc(n_links * sizeof(int))
+ *     cdef int *link_buffer = <int *>malloc(n_links * sizeof(int))             # <<<<<<<<<<<<<<
+ * 
+ *     try:
+ */
+  __pyx_v_link_buffer = ((int *)malloc((__pyx_v_n_links * (sizeof(int)))));
+
+  /* "landlab/graph/cfuncs.pyx":361
+ *     cdef int *link_buffer = <int *>malloc(n_links * sizeof(int))
+ * 
+ *     try:             # <<<<<<<<<<<<<<
+ *       for patch in range(n_patches):
+ *           offset = offset_to_patch[patch]
+ */
+  /*try:*/ {
+
+    /* "landlab/graph/cfuncs.pyx":362
+ * 
+ *     try:
+ *       for patch in range(n_patches):             # <<<<<<<<<<<<<<
+ *           offset = offset_to_patch[patch]
+ *           n_links = offset_to_patch[patch + 1] - offset
+ */
+    __pyx_t_2 = __pyx_v_n_patches;
+    __pyx_t_3 = __pyx_t_2;
+    for (__pyx_t_4 = 0; __pyx_t_4 < __pyx_t_3; __pyx_t_4+=1) {
+      __pyx_v_patch = __pyx_t_4;
+
+      /* "landlab/graph/cfuncs.pyx":363
+ *     try:
+ *       for patch in range(n_patches):
+ *           offset = offset_to_patch[patch]             # <<<<<<<<<<<<<<
+ *           n_links = offset_to_patch[patch + 1] - offset
+ * 
+ */
+      __pyx_t_5 = __pyx_v_patch;
+      if (__pyx_t_5 < 0) __pyx_t_5 += __pyx_pybuffernd_offset_to_patch.diminfo[0].shape;
+      __pyx_v_offset = (*__Pyx_BufPtrStrided1d(__pyx_t_7landlab_5graph_6cfuncs_DTYPE_t *, __pyx_pybuffernd_offset_to_patch.rcbuffer->pybuffer.buf, __pyx_t_5, __pyx_pybuffernd_offset_to_patch.diminfo[0].strides));
+
+      /* "landlab/graph/cfuncs.pyx":364
+ *       for patch in range(n_patches):
+ *           offset = offset_to_patch[patch]
+ *           n_links = offset_to_patch[patch + 1] - offset             # <<<<<<<<<<<<<<
+ * 
+ *           for i in range(n_links):
+ */
+      __pyx_t_5 = (__pyx_v_patch + 1);
+      if (__pyx_t_5 < 0) __pyx_t_5 += __pyx_pybuffernd_offset_to_patch.diminfo[0].shape;
+      __pyx_v_n_links = ((*__Pyx_BufPtrStrided1d(__pyx_t_7landlab_5graph_6cfuncs_DTYPE_t *, __pyx_pybuffernd_offset_to_patch.rcbuffer->pybuffer.buf, __pyx_t_5, __pyx_pybuffernd_offset_to_patch.diminfo[0].strides)) - __pyx_v_offset);
+
+      /* "landlab/graph/cfuncs.pyx":366
+ *           n_links = offset_to_patch[patch + 1] - offset
+ * 
+ *           for i in range(n_links):             # <<<<<<<<<<<<<<
+ *               link = links_at_patch[offset + i]
+ *               points[2 * i] = xy_of_link[link][0]
+ */
+      __pyx_t_6 = __pyx_v_n_links;
+      __pyx_t_7 = __pyx_t_6;
+      for (__pyx_t_8 = 0; __pyx_t_8 < __pyx_t_7; __pyx_t_8+=1) {
+        __pyx_v_i = __pyx_t_8;
+
+        /* "landlab/graph/cfuncs.pyx":367
+ * 
+ *           for i in range(n_links):
+ *               link = links_at_patch[offset + i]             # <<<<<<<<<<<<<<
+ *               points[2 * i] = xy_of_link[link][0]
+ *               points[2 * i + 1] = xy_of_link[link][1]
+ */
+        __pyx_t_5 = (__pyx_v_offset + __pyx_v_i);
+        if (__pyx_t_5 < 0) __pyx_t_5 += __pyx_pybuffernd_links_at_patch.diminfo[0].shape;
+        __pyx_v_link = (*__Pyx_BufPtrStrided1d(__pyx_t_7landlab_5graph_6cfuncs_DTYPE_t *, __pyx_pybuffernd_links_at_patch.rcbuffer->pybuffer.buf, __pyx_t_5, __pyx_pybuffernd_links_at_patch.diminfo[0].strides));
+
+        /* "landlab/graph/cfuncs.pyx":368
+ *           for i in range(n_links):
+ *               link = links_at_patch[offset + i]
+ *               points[2 * i] = xy_of_link[link][0]             # <<<<<<<<<<<<<<
+ *               points[2 * i + 1] = xy_of_link[link][1]
+ * 
+ */
+        __pyx_t_9 = __Pyx_GetItemInt(((PyObject *)__pyx_v_xy_of_link), __pyx_v_link, int, 1, __Pyx_PyInt_From_int, 0, 1, 0); if (unlikely(!__pyx_t_9)) __PYX_ERR(0, 368, __pyx_L4_error)
+        __Pyx_GOTREF(__pyx_t_9);
+        __pyx_t_10 = __Pyx_GetItemInt(__pyx_t_9, 0, long, 1, __Pyx_PyInt_From_long, 0, 0, 0); if (unlikely(!__pyx_t_10)) __PYX_ERR(0, 368, __pyx_L4_error)
+        __Pyx_GOTREF(__pyx_t_10);
+        __Pyx_DECREF(__pyx_t_9); __pyx_t_9 = 0;
+        __pyx_t_11 = __pyx_PyFloat_AsDouble(__pyx_t_10); if (unlikely((__pyx_t_11 == (double)-1) && PyErr_Occurred())) __PYX_ERR(0, 368, __pyx_L4_error)
+        __Pyx_DECREF(__pyx_t_10); __pyx_t_10 = 0;
+        (__pyx_v_points[(2 * __pyx_v_i)]) = __pyx_t_11;
+
+        /* "landlab/graph/cfuncs.pyx":369
+ *               link = links_at_patch[offset + i]
+ *               points[2 * i] = xy_of_link[link][0]
+ *               points[2 * i + 1] = xy_of_link[link][1]             # <<<<<<<<<<<<<<
+ * 
+ *           argsort_by_angle_around_centroid(points, n_links, ordered)
+ */
+        __pyx_t_10 = __Pyx_GetItemInt(((PyObject *)__pyx_v_xy_of_link), __pyx_v_link, int, 1, __Pyx_PyInt_From_int, 0, 1, 0); if (unlikely(!__pyx_t_10)) __PYX_ERR(0, 369, __pyx_L4_error)
+        __Pyx_GOTREF(__pyx_t_10);
+        __pyx_t_9 = __Pyx_GetItemInt(__pyx_t_10, 1, long, 1, __Pyx_PyInt_From_long, 0, 0, 0); if (unlikely(!__pyx_t_9)) __PYX_ERR(0, 369, __pyx_L4_error)
+        __Pyx_GOTREF(__pyx_t_9);
+        __Pyx_DECREF(__pyx_t_10); __pyx_t_10 = 0;
+        __pyx_t_11 = __pyx_PyFloat_AsDouble(__pyx_t_9); if (unlikely((__pyx_t_11 == (double)-1) && PyErr_Occurred())) __PYX_ERR(0, 369, __pyx_L4_error)
+        __Pyx_DECREF(__pyx_t_9); __pyx_t_9 = 0;
+        (__pyx_v_points[((2 * __pyx_v_i) + 1)]) = __pyx_t_11;
+      }
+
+      /* "landlab/graph/cfuncs.pyx":371
+ *               points[2 * i + 1] = xy_of_link[link][1]
+ * 
+ *           argsort_by_angle_around_centroid(points, n_links, ordered)             # <<<<<<<<<<<<<<
+ * 
+ *           for i in range(n_links):
+ */
+      __pyx_t_9 = __pyx_f_7landlab_5graph_6cfuncs_argsort_by_angle_around_centroid(__pyx_v_points, __pyx_v_n_links, __pyx_v_ordered); if (unlikely(!__pyx_t_9)) __PYX_ERR(0, 371, __pyx_L4_error)
+      __Pyx_GOTREF(__pyx_t_9);
+      __Pyx_DECREF(__pyx_t_9); __pyx_t_9 = 0;
+
+      /* "landlab/graph/cfuncs.pyx":373
+ *           argsort_by_angle_around_centroid(points, n_links, ordered)
+ * 
+ *           for i in range(n_links):             # <<<<<<<<<<<<<<
+ *               link_buffer[i] = links_at_patch[offset + ordered[i]]
+ * 
+ */
+      __pyx_t_6 = __pyx_v_n_links;
+      __pyx_t_7 = __pyx_t_6;
+      for (__pyx_t_8 = 0; __pyx_t_8 < __pyx_t_7; __pyx_t_8+=1) {
+        __pyx_v_i = __pyx_t_8;
+
+        /* "landlab/graph/cfuncs.pyx":374
+ * 
+ *           for i in range(n_links):
+ *               link_buffer[i] = links_at_patch[offset + ordered[i]]             # <<<<<<<<<<<<<<
+ * 
+ *           for i in range(n_links):
+ */
+        __pyx_t_5 = (__pyx_v_offset + (__pyx_v_ordered[__pyx_v_i]));
+        if (__pyx_t_5 < 0) __pyx_t_5 += __pyx_pybuffernd_links_at_patch.diminfo[0].shape;
+        (__pyx_v_link_buffer[__pyx_v_i]) = (*__Pyx_BufPtrStrided1d(__pyx_t_7landlab_5graph_6cfuncs_DTYPE_t *, __pyx_pybuffernd_links_at_patch.rcbuffer->pybuffer.buf, __pyx_t_5, __pyx_pybuffernd_links_at_patch.diminfo[0].strides));
+      }
+
+      /* "landlab/graph/cfuncs.pyx":376
+ *               link_buffer[i] = links_at_patch[offset + ordered[i]]
+ * 
+ *           for i in range(n_links):             # <<<<<<<<<<<<<<
+ *               links_at_patch[offset + i] = link_buffer[i]
+ * 
+ */
+      __pyx_t_6 = __pyx_v_n_links;
+      __pyx_t_7 = __pyx_t_6;
+      for (__pyx_t_8 = 0; __pyx_t_8 < __pyx_t_7; __pyx_t_8+=1) {
+        __pyx_v_i = __pyx_t_8;
+
+        /* "landlab/graph/cfuncs.pyx":377
+ * 
+ *           for i in range(n_links):
+ *               links_at_patch[offset + i] = link_buffer[i]             # <<<<<<<<<<<<<<
+ * 
+ *     finally:
+ */
+        __pyx_t_5 = (__pyx_v_offset + __pyx_v_i);
+        if (__pyx_t_5 < 0) __pyx_t_5 += __pyx_pybuffernd_links_at_patch.diminfo[0].shape;
+        *__Pyx_BufPtrStrided1d(__pyx_t_7landlab_5graph_6cfuncs_DTYPE_t *, __pyx_pybuffernd_links_at_patch.rcbuffer->pybuffer.buf, __pyx_t_5, __pyx_pybuffernd_links_at_patch.diminfo[0].strides) = (__pyx_v_link_buffer[__pyx_v_i]);
+      }
+    }
+  }
+
+  /* "landlab/graph/cfuncs.pyx":380
+ * 
+ *     finally:
+ *         free(link_buffer)             # <<<<<<<<<<<<<<
+ *         free(ordered)
+ *         free(points)
+ */
+  /*finally:*/ {
+    /*normal exit:*/{
+      free(__pyx_v_link_buffer);
+
+      /* "landlab/graph/cfuncs.pyx":381
+ *     finally:
+ *         free(link_buffer)
+ *         free(ordered)             # <<<<<<<<<<<<<<
+ *         free(points)
+ *         free(angles)
+ */
+      free(__pyx_v_ordered);
+
+      /* "landlab/graph/cfuncs.pyx":382
+ *         free(link_buffer)
+ *         free(ordered)
+ *         free(points)             # <<<<<<<<<<<<<<
+ *         free(angles)
+ * 
+ */
+      free(__pyx_v_points);
+
+      /* "landlab/graph/cfuncs.pyx":383
+ *         free(ordered)
+ *         free(points)
+ *         free(angles)             # <<<<<<<<<<<<<<
+ * 
+ * 
+ */
+      free(__pyx_v_angles);
+      goto __pyx_L5;
+    }
+    __pyx_L4_error:;
+    /*exception exit:*/{
+      __Pyx_PyThreadState_declare
+      __Pyx_PyThreadState_assign
+      __pyx_t_13 = 0; __pyx_t_14 = 0; __pyx_t_15 = 0; __pyx_t_16 = 0; __pyx_t_17 = 0; __pyx_t_18 = 0;
+      __Pyx_XDECREF(__pyx_t_10); __pyx_t_10 = 0;
+      __Pyx_XDECREF(__pyx_t_9); __pyx_t_9 = 0;
+      if (PY_MAJOR_VERSION >= 3) __Pyx_ExceptionSwap(&__pyx_t_16, &__pyx_t_17, &__pyx_t_18);
+      if ((PY_MAJOR_VERSION < 3) || unlikely(__Pyx_GetException(&__pyx_t_13, &__pyx_t_14, &__pyx_t_15) < 0)) __Pyx_ErrFetch(&__pyx_t_13, &__pyx_t_14, &__pyx_t_15);
+      __Pyx_XGOTREF(__pyx_t_13);
+      __Pyx_XGOTREF(__pyx_t_14);
+      __Pyx_XGOTREF(__pyx_t_15);
+      __Pyx_XGOTREF(__pyx_t_16);
+      __Pyx_XGOTREF(__pyx_t_17);
+      __Pyx_XGOTREF(__pyx_t_18);
+      __pyx_t_2 = __pyx_lineno; __pyx_t_3 = __pyx_clineno; __pyx_t_12 = __pyx_filename;
+      {
+
+        /* "landlab/graph/cfuncs.pyx":380
+ * 
+ *     finally:
+ *         free(link_buffer)             # <<<<<<<<<<<<<<
+ *         free(ordered)
+ *         free(points)
+ */
+        free(__pyx_v_link_buffer);
+
+        /* "landlab/graph/cfuncs.pyx":381
+ *     finally:
+ *         free(link_buffer)
+ *         free(ordered)             # <<<<<<<<<<<<<<
+ *         free(points)
+ *         free(angles)
+ */
+        free(__pyx_v_ordered);
+
+        /* "landlab/graph/cfuncs.pyx":382
+ *         free(link_buffer)
+ *         free(ordered)
+ *         free(points)             # <<<<<<<<<<<<<<
+ *         free(angles)
+ * 
+ */
+        free(__pyx_v_points);
+
+        /* "landlab/graph/cfuncs.pyx":383
+ *         free(ordered)
+ *         free(points)
+ *         free(angles)             # <<<<<<<<<<<<<<
+ * 
+ * 
+ */
+        free(__pyx_v_angles);
+      }
+      if (PY_MAJOR_VERSION >= 3) {
+        __Pyx_XGIVEREF(__pyx_t_16);
+        __Pyx_XGIVEREF(__pyx_t_17);
+        __Pyx_XGIVEREF(__pyx_t_18);
+        __Pyx_ExceptionReset(__pyx_t_16, __pyx_t_17, __pyx_t_18);
+      }
+      __Pyx_XGIVEREF(__pyx_t_13);
+      __Pyx_XGIVEREF(__pyx_t_14);
+      __Pyx_XGIVEREF(__pyx_t_15);
+      __Pyx_ErrRestore(__pyx_t_13, __pyx_t_14, __pyx_t_15);
+      __pyx_t_13 = 0; __pyx_t_14 = 0; __pyx_t_15 = 0; __pyx_t_16 = 0; __pyx_t_17 = 0; __pyx_t_18 = 0;
+      __pyx_lineno = __pyx_t_2; __pyx_clineno = __pyx_t_3; __pyx_filename = __pyx_t_12;
+      goto __pyx_L1_error;
+    }
+    __pyx_L5:;
+  }
+
+  /* "landlab/graph/cfuncs.pyx":347
+ * 
+ * @cython.boundscheck(False)
+ * def reorder_links_at_patch(np.ndarray[DTYPE_t, ndim=1] links_at_patch,             # <<<<<<<<<<<<<<
+ *                            np.ndarray[DTYPE_t, ndim=1] offset_to_patch,
+ *                            np.ndarray[np.float_t, ndim=2] xy_of_link):
+ */
+
+  /* function exit code */
+  __pyx_r = Py_None; __Pyx_INCREF(Py_None);
+  goto __pyx_L0;
+  __pyx_L1_error:;
+  __Pyx_XDECREF(__pyx_t_9);
+  __Pyx_XDECREF(__pyx_t_10);
+  { PyObject *__pyx_type, *__pyx_value, *__pyx_tb;
+    __Pyx_PyThreadState_declare
+    __Pyx_PyThreadState_assign
+    __Pyx_ErrFetch(&__pyx_type, &__pyx_value, &__pyx_tb);
+    __Pyx_SafeReleaseBuffer(&__pyx_pybuffernd_links_at_patch.rcbuffer->pybuffer);
+    __Pyx_SafeReleaseBuffer(&__pyx_pybuffernd_offset_to_patch.rcbuffer->pybuffer);
+    __Pyx_SafeReleaseBuffer(&__pyx_pybuffernd_xy_of_link.rcbuffer->pybuffer);
+  __Pyx_ErrRestore(__pyx_type, __pyx_value, __pyx_tb);}
+  __Pyx_AddTraceback("landlab.graph.cfuncs.reorder_links_at_patch", __pyx_clineno, __pyx_lineno, __pyx_filename);
+  __pyx_r = NULL;
+  goto __pyx_L2;
+  __pyx_L0:;
+  __Pyx_SafeReleaseBuffer(&__pyx_pybuffernd_links_at_patch.rcbuffer->pybuffer);
+  __Pyx_SafeReleaseBuffer(&__pyx_pybuffernd_offset_to_patch.rcbuffer->pybuffer);
+  __Pyx_SafeReleaseBuffer(&__pyx_pybuffernd_xy_of_link.rcbuffer->pybuffer);
+  __pyx_L2:;
+  __Pyx_XGIVEREF(__pyx_r);
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+/* "landlab/graph/cfuncs.pyx":387
+ * 
+ * @cython.boundscheck(False)
+ * def sort_spokes_at_wheel(np.ndarray[int, ndim=1] spokes_at_wheel,             # <<<<<<<<<<<<<<
+ *                          np.ndarray[int, ndim=1] offset_to_wheel,
+ *                          np.ndarray[double, ndim=2] xy_of_hub,
+ */
+
+/* Python wrapper */
+static PyObject *__pyx_pw_7landlab_5graph_6cfuncs_21sort_spokes_at_wheel(PyObject *__pyx_self, PyObject *__pyx_args, PyObject *__pyx_kwds); /*proto*/
+static char __pyx_doc_7landlab_5graph_6cfuncs_20sort_spokes_at_wheel[] = "Sort spokes about multiple hubs.\n\n    Parameters\n    ----------\n    spokes_at_wheel : ndarray of int\n        Spokes for each wheel.\n    offset_to_wheel : ndarray of int\n        Offset into *spokes_at_wheel* for each wheel.\n    xy_of_hub : ndarray of float, shape `(n_hubs, 2)`\n        Coordinates of each hub as `(x, y)`.\n    xy_of_spoke : ndarray of float, shape `(n_spokes, 2)`\n        Coordinates of the end of each spoke as `(x, y)`.\n    ";
+static PyMethodDef __pyx_mdef_7landlab_5graph_6cfuncs_21sort_spokes_at_wheel = {"sort_spokes_at_wheel", (PyCFunction)(void*)(PyCFunctionWithKeywords)__pyx_pw_7landlab_5graph_6cfuncs_21sort_spokes_at_wheel, METH_VARARGS|METH_KEYWORDS, __pyx_doc_7landlab_5graph_6cfuncs_20sort_spokes_at_wheel};
+static PyObject *__pyx_pw_7landlab_5graph_6cfuncs_21sort_spokes_at_wheel(PyObject *__pyx_self, PyObject *__pyx_args, PyObject *__pyx_kwds) {
+  PyArrayObject *__pyx_v_spokes_at_wheel = 0;
+  PyArrayObject *__pyx_v_offset_to_wheel = 0;
+  PyArrayObject *__pyx_v_xy_of_hub = 0;
+  PyArrayObject *__pyx_v_xy_of_spoke = 0;
+  int __pyx_lineno = 0;
+  const char *__pyx_filename = NULL;
+  int __pyx_clineno = 0;
+  PyObject *__pyx_r = 0;
+  __Pyx_RefNannyDeclarations
+  __Pyx_RefNannySetupContext("sort_spokes_at_wheel (wrapper)", 0);
+  {
+    static PyObject **__pyx_pyargnames[] = {&__pyx_n_s_spokes_at_wheel,&__pyx_n_s_offset_to_wheel,&__pyx_n_s_xy_of_hub,&__pyx_n_s_xy_of_spoke,0};
+    PyObject* values[4] = {0,0,0,0};
+    if (unlikely(__pyx_kwds)) {
+      Py_ssize_t kw_args;
+      const Py_ssize_t pos_args = PyTuple_GET_SIZE(__pyx_args);
+      switch (pos_args) {
+        case  4: values[3] = PyTuple_GET_ITEM(__pyx_args, 3);
+        CYTHON_FALLTHROUGH;
+        case  3: values[2] = PyTuple_GET_ITEM(__pyx_args, 2);
+        CYTHON_FALLTHROUGH;
+        case  2: values[1] = PyTuple_GET_ITEM(__pyx_args, 1);
+        CYTHON_FALLTHROUGH;
+        case  1: values[0] = PyTuple_GET_ITEM(__pyx_args, 0);
+        CYTHON_FALLTHROUGH;
+        case  0: break;
+        default: goto __pyx_L5_argtuple_error;
+      }
+      kw_args = PyDict_Size(__pyx_kwds);
+      switch (pos_args) {
+        case  0:
+        if (likely((values[0] = __Pyx_PyDict_GetItemStr(__pyx_kwds, __pyx_n_s_spokes_at_wheel)) != 0)) kw_args--;
+        else goto __pyx_L5_argtuple_error;
+        CYTHON_FALLTHROUGH;
+        case  1:
+        if (likely((values[1] = __Pyx_PyDict_GetItemStr(__pyx_kwds, __pyx_n_s_offset_to_wheel)) != 0)) kw_args--;
+        else {
+          __Pyx_RaiseArgtupleInvalid("sort_spokes_at_wheel", 1, 4, 4, 1); __PYX_ERR(0, 387, __pyx_L3_error)
+        }
+        CYTHON_FALLTHROUGH;
+        case  2:
+        if (likely((values[2] = __Pyx_PyDict_GetItemStr(__pyx_kwds, __pyx_n_s_xy_of_hub)) != 0)) kw_args--;
+        else {
+          __Pyx_RaiseArgtupleInvalid("sort_spokes_at_wheel", 1, 4, 4, 2); __PYX_ERR(0, 387, __pyx_L3_error)
+        }
+        CYTHON_FALLTHROUGH;
+        case  3:
+        if (likely((values[3] = __Pyx_PyDict_GetItemStr(__pyx_kwds, __pyx_n_s_xy_of_spoke)) != 0)) kw_args--;
+        else {
+          __Pyx_RaiseArgtupleInvalid("sort_spokes_at_wheel", 1, 4, 4, 3); __PYX_ERR(0, 387, __pyx_L3_error)
+        }
+      }
+      if (unlikely(kw_args > 0)) {
+        if (unlikely(__Pyx_ParseOptionalKeywords(__pyx_kwds, __pyx_pyargnames, 0, values, pos_args, "sort_spokes_at_wheel") < 0)) __PYX_ERR(0, 387, __pyx_L3_error)
+      }
+    } else if (PyTuple_GET_SIZE(__pyx_args) != 4) {
+      goto __pyx_L5_argtuple_error;
+    } else {
+      values[0] = PyTuple_GET_ITEM(__pyx_args, 0);
+      values[1] = PyTuple_GET_ITEM(__pyx_args, 1);
+      values[2] = PyTuple_GET_ITEM(__pyx_args, 2);
+      values[3] = PyTuple_GET_ITEM(__pyx_args, 3);
+    }
+    __pyx_v_spokes_at_wheel = ((PyArrayObject *)values[0]);
+    __pyx_v_offset_to_wheel = ((PyArrayObject *)values[1]);
+    __pyx_v_xy_of_hub = ((PyArrayObject *)values[2]);
+    __pyx_v_xy_of_spoke = ((PyArrayObject *)values[3]);
+  }
+  goto __pyx_L4_argument_unpacking_done;
+  __pyx_L5_argtuple_error:;
+  __Pyx_RaiseArgtupleInvalid("sort_spokes_at_wheel", 1, 4, 4, PyTuple_GET_SIZE(__pyx_args)); __PYX_ERR(0, 387, __pyx_L3_error)
+  __pyx_L3_error:;
+  __Pyx_AddTraceback("landlab.graph.cfuncs.sort_spokes_at_wheel", __pyx_clineno, __pyx_lineno, __pyx_filename);
+  __Pyx_RefNannyFinishContext();
+  return NULL;
+  __pyx_L4_argument_unpacking_done:;
+  if (unlikely(!__Pyx_ArgTypeTest(((PyObject *)__pyx_v_spokes_at_wheel), __pyx_ptype_5numpy_ndarray, 1, "spokes_at_wheel", 0))) __PYX_ERR(0, 387, __pyx_L1_error)
+  if (unlikely(!__Pyx_ArgTypeTest(((PyObject *)__pyx_v_offset_to_wheel), __pyx_ptype_5numpy_ndarray, 1, "offset_to_wheel", 0))) __PYX_ERR(0, 388, __pyx_L1_error)
+  if (unlikely(!__Pyx_ArgTypeTest(((PyObject *)__pyx_v_xy_of_hub), __pyx_ptype_5numpy_ndarray, 1, "xy_of_hub", 0))) __PYX_ERR(0, 389, __pyx_L1_error)
+  if (unlikely(!__Pyx_ArgTypeTest(((PyObject *)__pyx_v_xy_of_spoke), __pyx_ptype_5numpy_ndarray, 1, "xy_of_spoke", 0))) __PYX_ERR(0, 390, __pyx_L1_error)
+  __pyx_r = __pyx_pf_7landlab_5graph_6cfuncs_20sort_spokes_at_wheel(__pyx_self, __pyx_v_spokes_at_wheel, __pyx_v_offset_to_wheel, __pyx_v_xy_of_hub, __pyx_v_xy_of_spoke);
+
+  /* function exit code */
+  goto __pyx_L0;
+  __pyx_L1_error:;
+  __pyx_r = NULL;
+  __pyx_L0:;
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+static PyObject *__pyx_pf_7landlab_5graph_6cfuncs_20sort_spokes_at_wheel(CYTHON_UNUSED PyObject *__pyx_self, PyArrayObject *__pyx_v_spokes_at_wheel, PyArrayObject *__pyx_v_offset_to_wheel, PyArrayObject *__pyx_v_xy_of_hub, PyArrayObject *__pyx_v_xy_of_spoke) {
+  int __pyx_v_n_wheels;
+  int __pyx_v_i;
+  int __pyx_v_n_spokes;
+  int *__pyx_v_wheel;
+  __Pyx_LocalBuf_ND __pyx_pybuffernd_offset_to_wheel;
+  __Pyx_Buffer __pyx_pybuffer_offset_to_wheel;
+  __Pyx_LocalBuf_ND __pyx_pybuffernd_spokes_at_wheel;
+  __Pyx_Buffer __pyx_pybuffer_spokes_at_wheel;
+  __Pyx_LocalBuf_ND __pyx_pybuffernd_xy_of_hub;
+  __Pyx_Buffer __pyx_pybuffer_xy_of_hub;
+  __Pyx_LocalBuf_ND __pyx_pybuffernd_xy_of_spoke;
+  __Pyx_Buffer __pyx_pybuffer_xy_of_spoke;
+  PyObject *__pyx_r = NULL;
+  __Pyx_RefNannyDeclarations
+  Py_ssize_t __pyx_t_1;
+  Py_ssize_t __pyx_t_2;
+  int __pyx_t_3;
+  int __pyx_t_4;
+  int __pyx_t_5;
+  Py_ssize_t __pyx_t_6;
+  Py_ssize_t __pyx_t_7;
+  Py_ssize_t __pyx_t_8;
+  PyObject *__pyx_t_9 = NULL;
+  int __pyx_lineno = 0;
+  const char *__pyx_filename = NULL;
+  int __pyx_clineno = 0;
+  __Pyx_RefNannySetupContext("sort_spokes_at_wheel", 0);
+  __pyx_pybuffer_spokes_at_wheel.pybuffer.buf = NULL;
+  __pyx_pybuffer_spokes_at_wheel.refcount = 0;
+  __pyx_pybuffernd_spokes_at_wheel.data = NULL;
+  __pyx_pybuffernd_spokes_at_wheel.rcbuffer = &__pyx_pybuffer_spokes_at_wheel;
+  __pyx_pybuffer_offset_to_wheel.pybuffer.buf = NULL;
+  __pyx_pybuffer_offset_to_wheel.refcount = 0;
+  __pyx_pybuffernd_offset_to_wheel.data = NULL;
+  __pyx_pybuffernd_offset_to_wheel.rcbuffer = &__pyx_pybuffer_offset_to_wheel;
+  __pyx_pybuffer_xy_of_hub.pybuffer.buf = NULL;
+  __pyx_pybuffer_xy_of_hub.refcount = 0;
+  __pyx_pybuffernd_xy_of_hub.data = NULL;
+  __pyx_pybuffernd_xy_of_hub.rcbuffer = &__pyx_pybuffer_xy_of_hub;
+  __pyx_pybuffer_xy_of_spoke.pybuffer.buf = NULL;
+  __pyx_pybuffer_xy_of_spoke.refcount = 0;
+  __pyx_pybuffernd_xy_of_spoke.data = NULL;
+  __pyx_pybuffernd_xy_of_spoke.rcbuffer = &__pyx_pybuffer_xy_of_spoke;
+  {
+    __Pyx_BufFmt_StackElem __pyx_stack[1];
+    if (unlikely(__Pyx_GetBufferAndValidate(&__pyx_pybuffernd_spokes_at_wheel.rcbuffer->pybuffer, (PyObject*)__pyx_v_spokes_at_wheel, &__Pyx_TypeInfo_int, PyBUF_FORMAT| PyBUF_STRIDES, 1, 0, __pyx_stack) == -1)) __PYX_ERR(0, 387, __pyx_L1_error)
+  }
+  __pyx_pybuffernd_spokes_at_wheel.diminfo[0].strides = __pyx_pybuffernd_spokes_at_wheel.rcbuffer->pybuffer.strides[0]; __pyx_pybuffernd_spokes_at_wheel.diminfo[0].shape = __pyx_pybuffernd_spokes_at_wheel.rcbuffer->pybuffer.shape[0];
+  {
+    __Pyx_BufFmt_StackElem __pyx_stack[1];
+    if (unlikely(__Pyx_GetBufferAndValidate(&__pyx_pybuffernd_offset_to_wheel.rcbuffer->pybuffer, (PyObject*)__pyx_v_offset_to_wheel, &__Pyx_TypeInfo_int, PyBUF_FORMAT| PyBUF_STRIDES, 1, 0, __pyx_stack) == -1)) __PYX_ERR(0, 387, __pyx_L1_error)
+  }
+  __pyx_pybuffernd_offset_to_wheel.diminfo[0].strides = __pyx_pybuffernd_offset_to_wheel.rcbuffer->pybuffer.strides[0]; __pyx_pybuffernd_offset_to_wheel.diminfo[0].shape = __pyx_pybuffernd_offset_to_wheel.rcbuffer->pybuffer.shape[0];
+  {
+    __Pyx_BufFmt_StackElem __pyx_stack[1];
+    if (unlikely(__Pyx_GetBufferAndValidate(&__pyx_pybuffernd_xy_of_hub.rcbuffer->pybuffer, (PyObject*)__pyx_v_xy_of_hub, &__Pyx_TypeInfo_double, PyBUF_FORMAT| PyBUF_STRIDES, 2, 0, __pyx_stack) == -1)) __PYX_ERR(0, 387, __pyx_L1_error)
+  }
+  __pyx_pybuffernd_xy_of_hub.diminfo[0].strides = __pyx_pybuffernd_xy_of_hub.rcbuffer->pybuffer.strides[0]; __pyx_pybuffernd_xy_of_hub.diminfo[0].shape = __pyx_pybuffernd_xy_of_hub.rcbuffer->pybuffer.shape[0]; __pyx_pybuffernd_xy_of_hub.diminfo[1].strides = __pyx_pybuffernd_xy_of_hub.rcbuffer->pybuffer.strides[1]; __pyx_pybuffernd_xy_of_hub.diminfo[1].shape = __pyx_pybuffernd_xy_of_hub.rcbuffer->pybuffer.shape[1];
+  {
+    __Pyx_BufFmt_StackElem __pyx_stack[1];
+    if (unlikely(__Pyx_GetBufferAndValidate(&__pyx_pybuffernd_xy_of_spoke.rcbuffer->pybuffer, (PyObject*)__pyx_v_xy_of_spoke, &__Pyx_TypeInfo_double, PyBUF_FORMAT| PyBUF_STRIDES, 2, 0, __pyx_stack) == -1)) __PYX_ERR(0, 387, __pyx_L1_error)
+  }
+  __pyx_pybuffernd_xy_of_spoke.diminfo[0].strides = __pyx_pybuffernd_xy_of_spoke.rcbuffer->pybuffer.strides[0]; __pyx_pybuffernd_xy_of_spoke.diminfo[0].shape = __pyx_pybuffernd_xy_of_spoke.rcbuffer->pybuffer.shape[0]; __pyx_pybuffernd_xy_of_spoke.diminfo[1].strides = __pyx_pybuffernd_xy_of_spoke.rcbuffer->pybuffer.strides[1]; __pyx_pybuffernd_xy_of_spoke.diminfo[1].shape = __pyx_pybuffernd_xy_of_spoke.rcbuffer->pybuffer.shape[1];
+
+  /* "landlab/graph/cfuncs.pyx":404
+ *         Coordinates of the end of each spoke as `(x, y)`.
+ *     """
+ *     cdef int n_wheels = len(offset_to_wheel) - 1             # <<<<<<<<<<<<<<
+ *     cdef int i
+ *     cdef int n_spokes
+ */
+  __pyx_t_1 = PyObject_Length(((PyObject *)__pyx_v_offset_to_wheel)); if (unlikely(__pyx_t_1 == ((Py_ssize_t)-1))) __PYX_ERR(0, 404, __pyx_L1_error)
+  __pyx_v_n_wheels = (__pyx_t_1 - 1);
+
+  /* "landlab/graph/cfuncs.pyx":409
+ *     cdef int * wheel
+ * 
+ *     wheel = &spokes_at_wheel[0]             # <<<<<<<<<<<<<<
+ *     for i in range(n_wheels):
+ *         n_spokes = offset_to_wheel[i + 1] - offset_to_wheel[i]
+ */
+  __pyx_t_2 = 0;
+  if (__pyx_t_2 < 0) __pyx_t_2 += __pyx_pybuffernd_spokes_at_wheel.diminfo[0].shape;
+  __pyx_v_wheel = (&(*__Pyx_BufPtrStrided1d(int *, __pyx_pybuffernd_spokes_at_wheel.rcbuffer->pybuffer.buf, __pyx_t_2, __pyx_pybuffernd_spokes_at_wheel.diminfo[0].strides)));
+
+  /* "landlab/graph/cfuncs.pyx":410
+ * 
+ *     wheel = &spokes_at_wheel[0]
+ *     for i in range(n_wheels):             # <<<<<<<<<<<<<<
+ *         n_spokes = offset_to_wheel[i + 1] - offset_to_wheel[i]
+ * 
+ */
+  __pyx_t_3 = __pyx_v_n_wheels;
+  __pyx_t_4 = __pyx_t_3;
+  for (__pyx_t_5 = 0; __pyx_t_5 < __pyx_t_4; __pyx_t_5+=1) {
+    __pyx_v_i = __pyx_t_5;
+
+    /* "landlab/graph/cfuncs.pyx":411
+ *     wheel = &spokes_at_wheel[0]
+ *     for i in range(n_wheels):
+ *         n_spokes = offset_to_wheel[i + 1] - offset_to_wheel[i]             # <<<<<<<<<<<<<<
+ * 
+ *         sort_spokes_around_hub(wheel, n_spokes, &xy_of_spoke[0, 0],
+ */
+    __pyx_t_2 = (__pyx_v_i + 1);
+    if (__pyx_t_2 < 0) __pyx_t_2 += __pyx_pybuffernd_offset_to_wheel.diminfo[0].shape;
+    __pyx_t_6 = __pyx_v_i;
+    if (__pyx_t_6 < 0) __pyx_t_6 += __pyx_pybuffernd_offset_to_wheel.diminfo[0].shape;
+    __pyx_v_n_spokes = ((*__Pyx_BufPtrStrided1d(int *, __pyx_pybuffernd_offset_to_wheel.rcbuffer->pybuffer.buf, __pyx_t_2, __pyx_pybuffernd_offset_to_wheel.diminfo[0].strides)) - (*__Pyx_BufPtrStrided1d(int *, __pyx_pybuffernd_offset_to_wheel.rcbuffer->pybuffer.buf, __pyx_t_6, __pyx_pybuffernd_offset_to_wheel.diminfo[0].strides)));
+
+    /* "landlab/graph/cfuncs.pyx":413
+ *         n_spokes = offset_to_wheel[i + 1] - offset_to_wheel[i]
+ * 
+ *         sort_spokes_around_hub(wheel, n_spokes, &xy_of_spoke[0, 0],             # <<<<<<<<<<<<<<
+ *                                &xy_of_hub[i, 0])
+ * 
+ */
+    __pyx_t_6 = 0;
+    __pyx_t_2 = 0;
+    if (__pyx_t_6 < 0) __pyx_t_6 += __pyx_pybuffernd_xy_of_spoke.diminfo[0].shape;
+    if (__pyx_t_2 < 0) __pyx_t_2 += __pyx_pybuffernd_xy_of_spoke.diminfo[1].shape;
+
+    /* "landlab/graph/cfuncs.pyx":414
+ * 
+ *         sort_spokes_around_hub(wheel, n_spokes, &xy_of_spoke[0, 0],
+ *                                &xy_of_hub[i, 0])             # <<<<<<<<<<<<<<
+ * 
+ *         wheel += n_spokes
+ */
+    __pyx_t_7 = __pyx_v_i;
+    __pyx_t_8 = 0;
+    if (__pyx_t_7 < 0) __pyx_t_7 += __pyx_pybuffernd_xy_of_hub.diminfo[0].shape;
+    if (__pyx_t_8 < 0) __pyx_t_8 += __pyx_pybuffernd_xy_of_hub.diminfo[1].shape;
+
+    /* "landlab/graph/cfuncs.pyx":413
+ *         n_spokes = offset_to_wheel[i + 1] - offset_to_wheel[i]
+ * 
+ *         sort_spokes_around_hub(wheel, n_spokes, &xy_of_spoke[0, 0],             # <<<<<<<<<<<<<<
+ *                                &xy_of_hub[i, 0])
+ * 
+ */
+    __pyx_t_9 = __pyx_f_7landlab_5graph_6cfuncs_sort_spokes_around_hub(__pyx_v_wheel, __pyx_v_n_spokes, (&(*__Pyx_BufPtrStrided2d(double *, __pyx_pybuffernd_xy_of_spoke.rcbuffer->pybuffer.buf, __pyx_t_6, __pyx_pybuffernd_xy_of_spoke.diminfo[0].strides, __pyx_t_2, __pyx_pybuffernd_xy_of_spoke.diminfo[1].strides))), (&(*__Pyx_BufPtrStrided2d(double *, __pyx_pybuffernd_xy_of_hub.rcbuffer->pybuffer.buf, __pyx_t_7, __pyx_pybuffernd_xy_of_hub.diminfo[0].strides, __pyx_t_8, __pyx_pybuffernd_xy_of_hub.diminfo[1].strides)))); if (unlikely(!__pyx_t_9)) __PYX_ERR(0, 413, __pyx_L1_error)
+    __Pyx_GOTREF(__pyx_t_9);
+    __Pyx_DECREF(__pyx_t_9); __pyx_t_9 = 0;
+
+    /* "landlab/graph/cfuncs.pyx":416
+ *                                &xy_of_hub[i, 0])
+ * 
+ *         wheel += n_spokes             # <<<<<<<<<<<<<<
+ * 
+ * 
+ */
+    __pyx_v_wheel = (__pyx_v_wheel + __pyx_v_n_spokes);
+  }
+
+  /* "landlab/graph/cfuncs.pyx":387
+ * 
+ * @cython.boundscheck(False)
+ * def sort_spokes_at_wheel(np.ndarray[int, ndim=1] spokes_at_wheel,             # <<<<<<<<<<<<<<
+ *                          np.ndarray[int, ndim=1] offset_to_wheel,
+ *                          np.ndarray[double, ndim=2] xy_of_hub,
+ */
+
+  /* function exit code */
+  __pyx_r = Py_None; __Pyx_INCREF(Py_None);
+  goto __pyx_L0;
+  __pyx_L1_error:;
+  __Pyx_XDECREF(__pyx_t_9);
+  { PyObject *__pyx_type, *__pyx_value, *__pyx_tb;
+    __Pyx_PyThreadState_declare
+    __Pyx_PyThreadState_assign
+    __Pyx_ErrFetch(&__pyx_type, &__pyx_value, &__pyx_tb);
+    __Pyx_SafeReleaseBuffer(&__pyx_pybuffernd_offset_to_wheel.rcbuffer->pybuffer);
+    __Pyx_SafeReleaseBuffer(&__pyx_pybuffernd_spokes_at_wheel.rcbuffer->pybuffer);
+    __Pyx_SafeReleaseBuffer(&__pyx_pybuffernd_xy_of_hub.rcbuffer->pybuffer);
+    __Pyx_SafeReleaseBuffer(&__pyx_pybuffernd_xy_of_spoke.rcbuffer->pybuffer);
+  __Pyx_ErrRestore(__pyx_type, __pyx_value, __pyx_tb);}
+  __Pyx_AddTraceback("landlab.graph.cfuncs.sort_spokes_at_wheel", __pyx_clineno, __pyx_lineno, __pyx_filename);
+  __pyx_r = NULL;
+  goto __pyx_L2;
+  __pyx_L0:;
+  __Pyx_SafeReleaseBuffer(&__pyx_pybuffernd_offset_to_wheel.rcbuffer->pybuffer);
+  __Pyx_SafeReleaseBuffer(&__pyx_pybuffernd_spokes_at_wheel.rcbuffer->pybuffer);
+  __Pyx_SafeReleaseBuffer(&__pyx_pybuffernd_xy_of_hub.rcbuffer->pybuffer);
+  __Pyx_SafeReleaseBuffer(&__pyx_pybuffernd_xy_of_spoke.rcbuffer->pybuffer);
+  __pyx_L2:;
+  __Pyx_XGIVEREF(__pyx_r);
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+/* "landlab/graph/cfuncs.pyx":420
+ * 
+ * @cython.boundscheck(False)
+ * def argsort_spoke_angles(np.ndarray[double, ndim=2, mode="c"] points,             # <<<<<<<<<<<<<<
+ *                          np.ndarray[double, ndim=1, mode="c"] hub,
+ *                          np.ndarray[int, ndim=1] out):
+ */
+
+/* Python wrapper */
+static PyObject *__pyx_pw_7landlab_5graph_6cfuncs_23argsort_spoke_angles(PyObject *__pyx_self, PyObject *__pyx_args, PyObject *__pyx_kwds); /*proto*/
+static char __pyx_doc_7landlab_5graph_6cfuncs_22argsort_spoke_angles[] = "Sort spokes by angle around a hub.\n\n    Parameters\n    ----------\n    points : ndarray of float, shape `(n_points, 2)`\n        Coordinates of points as (*x*, *y*).\n    out : ndarray of int, shape `(n_points, )`\n        Indices of sorted points.\n\n    Returns\n    -------\n    ndarray of int, shape `(n_points, )`\n        Indices of sorted points.\n    ";
+static PyMethodDef __pyx_mdef_7landlab_5graph_6cfuncs_23argsort_spoke_angles = {"argsort_spoke_angles", (PyCFunction)(void*)(PyCFunctionWithKeywords)__pyx_pw_7landlab_5graph_6cfuncs_23argsort_spoke_angles, METH_VARARGS|METH_KEYWORDS, __pyx_doc_7landlab_5graph_6cfuncs_22argsort_spoke_angles};
+static PyObject *__pyx_pw_7landlab_5graph_6cfuncs_23argsort_spoke_angles(PyObject *__pyx_self, PyObject *__pyx_args, PyObject *__pyx_kwds) {
+  PyArrayObject *__pyx_v_points = 0;
+  PyArrayObject *__pyx_v_hub = 0;
+  PyArrayObject *__pyx_v_out = 0;
+  int __pyx_lineno = 0;
+  const char *__pyx_filename = NULL;
+  int __pyx_clineno = 0;
+  PyObject *__pyx_r = 0;
+  __Pyx_RefNannyDeclarations
+  __Pyx_RefNannySetupContext("argsort_spoke_angles (wrapper)", 0);
+  {
+    static PyObject **__pyx_pyargnames[] = {&__pyx_n_s_points,&__pyx_n_s_hub,&__pyx_n_s_out,0};
+    PyObject* values[3] = {0,0,0};
+    if (unlikely(__pyx_kwds)) {
+      Py_ssize_t kw_args;
+      const Py_ssize_t pos_args = PyTuple_GET_SIZE(__pyx_args);
+      switch (pos_args) {
+        case  3: values[2] = PyTuple_GET_ITEM(__pyx_args, 2);
+        CYTHON_FALLTHROUGH;
+        case  2: values[1] = PyTuple_GET_ITEM(__pyx_args, 1);
+        CYTHON_FALLTHROUGH;
+        case  1: values[0] = PyTuple_GET_ITEM(__pyx_args, 0);
+        CYTHON_FALLTHROUGH;
+        case  0: break;
+        default: goto __pyx_L5_argtuple_error;
+      }
+      kw_args = PyDict_Size(__pyx_kwds);
+      switch (pos_args) {
+        case  0:
+        if (likely((values[0] = __Pyx_PyDict_GetItemStr(__pyx_kwds, __pyx_n_s_points)) != 0)) kw_args--;
+        else goto __pyx_L5_argtuple_error;
+        CYTHON_FALLTHROUGH;
+        case  1:
+        if (likely((values[1] = __Pyx_PyDict_GetItemStr(__pyx_kwds, __pyx_n_s_hub)) != 0)) kw_args--;
+        else {
+          __Pyx_RaiseArgtupleInvalid("argsort_spoke_angles", 1, 3, 3, 1); __PYX_ERR(0, 420, __pyx_L3_error)
+        }
+        CYTHON_FALLTHROUGH;
+        case  2:
+        if (likely((values[2] = __Pyx_PyDict_GetItemStr(__pyx_kwds, __pyx_n_s_out)) != 0)) kw_args--;
+        else {
+          __Pyx_RaiseArgtupleInvalid("argsort_spoke_angles", 1, 3, 3, 2); __PYX_ERR(0, 420, __pyx_L3_error)
+        }
+      }
+      if (unlikely(kw_args > 0)) {
+        if (unlikely(__Pyx_ParseOptionalKeywords(__pyx_kwds, __pyx_pyargnames, 0, values, pos_args, "argsort_spoke_angles") < 0)) __PYX_ERR(0, 420, __pyx_L3_error)
+      }
+    } else if (PyTuple_GET_SIZE(__pyx_args) != 3) {
+      goto __pyx_L5_argtuple_error;
+    } else {
+      values[0] = PyTuple_GET_ITEM(__pyx_args, 0);
+      values[1] = PyTuple_GET_ITEM(__pyx_args, 1);
+      values[2] = PyTuple_GET_ITEM(__pyx_args, 2);
+    }
+    __pyx_v_points = ((PyArrayObject *)values[0]);
+    __pyx_v_hub = ((PyArrayObject *)values[1]);
+    __pyx_v_out = ((PyArrayObject *)values[2]);
+  }
+  goto __pyx_L4_argument_unpacking_done;
+  __pyx_L5_argtuple_error:;
+  __Pyx_RaiseArgtupleInvalid("argsort_spoke_angles", 1, 3, 3, PyTuple_GET_SIZE(__pyx_args)); __PYX_ERR(0, 420, __pyx_L3_error)
+  __pyx_L3_error:;
+  __Pyx_AddTraceback("landlab.graph.cfuncs.argsort_spoke_angles", __pyx_clineno, __pyx_lineno, __pyx_filename);
+  __Pyx_RefNannyFinishContext();
+  return NULL;
+  __pyx_L4_argument_unpacking_done:;
+  if (unlikely(!__Pyx_ArgTypeTest(((PyObject *)__pyx_v_points), __pyx_ptype_5numpy_ndarray, 1, "points", 0))) __PYX_ERR(0, 420, __pyx_L1_error)
+  if (unlikely(!__Pyx_ArgTypeTest(((PyObject *)__pyx_v_hub), __pyx_ptype_5numpy_ndarray, 1, "hub", 0))) __PYX_ERR(0, 421, __pyx_L1_error)
+  if (unlikely(!__Pyx_ArgTypeTest(((PyObject *)__pyx_v_out), __pyx_ptype_5numpy_ndarray, 1, "out", 0))) __PYX_ERR(0, 422, __pyx_L1_error)
+  __pyx_r = __pyx_pf_7landlab_5graph_6cfuncs_22argsort_spoke_angles(__pyx_self, __pyx_v_points, __pyx_v_hub, __pyx_v_out);
+
+  /* function exit code */
+  goto __pyx_L0;
+  __pyx_L1_error:;
+  __pyx_r = NULL;
+  __pyx_L0:;
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+static PyObject *__pyx_pf_7landlab_5graph_6cfuncs_22argsort_spoke_angles(CYTHON_UNUSED PyObject *__pyx_self, PyArrayObject *__pyx_v_points, PyArrayObject *__pyx_v_hub, PyArrayObject *__pyx_v_out) {
+  int __pyx_v_n_points;
+  double *__pyx_v_angles;
+  __Pyx_LocalBuf_ND __pyx_pybuffernd_hub;
+  __Pyx_Buffer __pyx_pybuffer_hub;
+  __Pyx_LocalBuf_ND __pyx_pybuffernd_out;
+  __Pyx_Buffer __pyx_pybuffer_out;
+  __Pyx_LocalBuf_ND __pyx_pybuffernd_points;
+  __Pyx_Buffer __pyx_pybuffer_points;
+  PyObject *__pyx_r = NULL;
+  __Pyx_RefNannyDeclarations
+  Py_ssize_t __pyx_t_1;
+  Py_ssize_t __pyx_t_2;
+  Py_ssize_t __pyx_t_3;
+  PyObject *__pyx_t_4 = NULL;
+  int __pyx_t_5;
+  int __pyx_t_6;
+  char const *__pyx_t_7;
+  PyObject *__pyx_t_8 = NULL;
+  PyObject *__pyx_t_9 = NULL;
+  PyObject *__pyx_t_10 = NULL;
+  PyObject *__pyx_t_11 = NULL;
+  PyObject *__pyx_t_12 = NULL;
+  PyObject *__pyx_t_13 = NULL;
+  int __pyx_lineno = 0;
+  const char *__pyx_filename = NULL;
+  int __pyx_clineno = 0;
+  __Pyx_RefNannySetupContext("argsort_spoke_angles", 0);
+  __pyx_pybuffer_points.pybuffer.buf = NULL;
+  __pyx_pybuffer_points.refcount = 0;
+  __pyx_pybuffernd_points.data = NULL;
+  __pyx_pybuffernd_points.rcbuffer = &__pyx_pybuffer_points;
+  __pyx_pybuffer_hub.pybuffer.buf = NULL;
+  __pyx_pybuffer_hub.refcount = 0;
+  __pyx_pybuffernd_hub.data = NULL;
+  __pyx_pybuffernd_hub.rcbuffer = &__pyx_pybuffer_hub;
+  __pyx_pybuffer_out.pybuffer.buf = NULL;
+  __pyx_pybuffer_out.refcount = 0;
+  __pyx_pybuffernd_out.data = NULL;
+  __pyx_pybuffernd_out.rcbuffer = &__pyx_pybuffer_out;
+  {
+    __Pyx_BufFmt_StackElem __pyx_stack[1];
+    if (unlikely(__Pyx_GetBufferAndValidate(&__pyx_pybuffernd_points.rcbuffer->pybuffer, (PyObject*)__pyx_v_points, &__Pyx_TypeInfo_double, PyBUF_FORMAT| PyBUF_C_CONTIGUOUS, 2, 0, __pyx_stack) == -1)) __PYX_ERR(0, 420, __pyx_L1_error)
+  }
+  __pyx_pybuffernd_points.diminfo[0].strides = __pyx_pybuffernd_points.rcbuffer->pybuffer.strides[0]; __pyx_pybuffernd_points.diminfo[0].shape = __pyx_pybuffernd_points.rcbuffer->pybuffer.shape[0]; __pyx_pybuffernd_points.diminfo[1].strides = __pyx_pybuffernd_points.rcbuffer->pybuffer.strides[1]; __pyx_pybuffernd_points.diminfo[1].shape = __pyx_pybuffernd_points.rcbuffer->pybuffer.shape[1];
+  {
+    __Pyx_BufFmt_StackElem __pyx_stack[1];
+    if (unlikely(__Pyx_GetBufferAndValidate(&__pyx_pybuffernd_hub.rcbuffer->pybuffer, (PyObject*)__pyx_v_hub, &__Pyx_TypeInfo_double, PyBUF_FORMAT| PyBUF_C_CONTIGUOUS, 1, 0, __pyx_stack) == -1)) __PYX_ERR(0, 420, __pyx_L1_error)
+  }
+  __pyx_pybuffernd_hub.diminfo[0].strides = __pyx_pybuffernd_hub.rcbuffer->pybuffer.strides[0]; __pyx_pybuffernd_hub.diminfo[0].shape = __pyx_pybuffernd_hub.rcbuffer->pybuffer.shape[0];
+  {
+    __Pyx_BufFmt_StackElem __pyx_stack[1];
+    if (unlikely(__Pyx_GetBufferAndValidate(&__pyx_pybuffernd_out.rcbuffer->pybuffer, (PyObject*)__pyx_v_out, &__Pyx_TypeInfo_int, PyBUF_FORMAT| PyBUF_STRIDES, 1, 0, __pyx_stack) == -1)) __PYX_ERR(0, 420, __pyx_L1_error)
+  }
+  __pyx_pybuffernd_out.diminfo[0].strides = __pyx_pybuffernd_out.rcbuffer->pybuffer.strides[0]; __pyx_pybuffernd_out.diminfo[0].shape = __pyx_pybuffernd_out.rcbuffer->pybuffer.shape[0];
+
+  /* "landlab/graph/cfuncs.pyx":437
+ *         Indices of sorted points.
+ *     """
+ *     cdef int n_points = points.shape[0]             # <<<<<<<<<<<<<<
+ *     cdef double *angles = <double *>malloc(n_points * sizeof(double))
+ * 
+ */
+  __pyx_v_n_points = (__pyx_v_points->dimensions[0]);
+
+  /* "landlab/graph/cfuncs.pyx":438
+ *     """
+ *     cdef int n_points = points.shape[0]
+ *     cdef double *angles = <double *>malloc(n_points * sizeof(double))             # <<<<<<<<<<<<<<
+ * 
+ *     try:
+ */
+  __pyx_v_angles = ((double *)malloc((__pyx_v_n_points * (sizeof(double)))));
+
+  /* "landlab/graph/cfuncs.pyx":440
+ *     cdef double *angles = <double *>malloc(n_points * sizeof(double))
+ * 
+ *     try:             # <<<<<<<<<<<<<<
+ *         calc_spoke_angles(&hub[0], &points[0, 0], n_points, angles)
+ *         argsort(angles, n_points, &out[0])
+ */
+  /*try:*/ {
+
+    /* "landlab/graph/cfuncs.pyx":441
+ * 
+ *     try:
+ *         calc_spoke_angles(&hub[0], &points[0, 0], n_points, angles)             # <<<<<<<<<<<<<<
+ *         argsort(angles, n_points, &out[0])
+ *     finally:
+ */
+    __pyx_t_1 = 0;
+    if (__pyx_t_1 < 0) __pyx_t_1 += __pyx_pybuffernd_hub.diminfo[0].shape;
+    __pyx_t_2 = 0;
+    __pyx_t_3 = 0;
+    if (__pyx_t_2 < 0) __pyx_t_2 += __pyx_pybuffernd_points.diminfo[0].shape;
+    if (__pyx_t_3 < 0) __pyx_t_3 += __pyx_pybuffernd_points.diminfo[1].shape;
+    __pyx_t_4 = __pyx_f_7landlab_5graph_6cfuncs_calc_spoke_angles((&(*__Pyx_BufPtrCContig1d(double *, __pyx_pybuffernd_hub.rcbuffer->pybuffer.buf, __pyx_t_1, __pyx_pybuffernd_hub.diminfo[0].strides))), (&(*__Pyx_BufPtrCContig2d(double *, __pyx_pybuffernd_points.rcbuffer->pybuffer.buf, __pyx_t_2, __pyx_pybuffernd_points.diminfo[0].strides, __pyx_t_3, __pyx_pybuffernd_points.diminfo[1].strides))), __pyx_v_n_points, __pyx_v_angles); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 441, __pyx_L4_error)
+    __Pyx_GOTREF(__pyx_t_4);
+    __Pyx_DECREF(__pyx_t_4); __pyx_t_4 = 0;
+
+    /* "landlab/graph/cfuncs.pyx":442
+ *     try:
+ *         calc_spoke_angles(&hub[0], &points[0, 0], n_points, angles)
+ *         argsort(angles, n_points, &out[0])             # <<<<<<<<<<<<<<
+ *     finally:
+ *       free(angles)
+ */
+    __pyx_t_3 = 0;
+    if (__pyx_t_3 < 0) __pyx_t_3 += __pyx_pybuffernd_out.diminfo[0].shape;
+    __pyx_t_4 = __pyx_f_7landlab_5graph_6cfuncs_argsort(__pyx_v_angles, __pyx_v_n_points, (&(*__Pyx_BufPtrStrided1d(int *, __pyx_pybuffernd_out.rcbuffer->pybuffer.buf, __pyx_t_3, __pyx_pybuffernd_out.diminfo[0].strides)))); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 442, __pyx_L4_error)
+    __Pyx_GOTREF(__pyx_t_4);
+    __Pyx_DECREF(__pyx_t_4); __pyx_t_4 = 0;
+  }
+
+  /* "landlab/graph/cfuncs.pyx":444
+ *         argsort(angles, n_points, &out[0])
+ *     finally:
+ *       free(angles)             # <<<<<<<<<<<<<<
+ * 
+ *     return out
+ */
+  /*finally:*/ {
+    /*normal exit:*/{
+      free(__pyx_v_angles);
+      goto __pyx_L5;
+    }
+    __pyx_L4_error:;
+    /*exception exit:*/{
+      __Pyx_PyThreadState_declare
+      __Pyx_PyThreadState_assign
+      __pyx_t_8 = 0; __pyx_t_9 = 0; __pyx_t_10 = 0; __pyx_t_11 = 0; __pyx_t_12 = 0; __pyx_t_13 = 0;
+      __Pyx_XDECREF(__pyx_t_4); __pyx_t_4 = 0;
+      if (PY_MAJOR_VERSION >= 3) __Pyx_ExceptionSwap(&__pyx_t_11, &__pyx_t_12, &__pyx_t_13);
+      if ((PY_MAJOR_VERSION < 3) || unlikely(__Pyx_GetException(&__pyx_t_8, &__pyx_t_9, &__pyx_t_10) < 0)) __Pyx_ErrFetch(&__pyx_t_8, &__pyx_t_9, &__pyx_t_10);
+      __Pyx_XGOTREF(__pyx_t_8);
+      __Pyx_XGOTREF(__pyx_t_9);
+      __Pyx_XGOTREF(__pyx_t_10);
+      __Pyx_XGOTREF(__pyx_t_11);
+      __Pyx_XGOTREF(__pyx_t_12);
+      __Pyx_XGOTREF(__pyx_t_13);
+      __pyx_t_5 = __pyx_lineno; __pyx_t_6 = __pyx_clineno; __pyx_t_7 = __pyx_filename;
+      {
+        free(__pyx_v_angles);
+      }
+      if (PY_MAJOR_VERSION >= 3) {
+        __Pyx_XGIVEREF(__pyx_t_11);
+        __Pyx_XGIVEREF(__pyx_t_12);
+        __Pyx_XGIVEREF(__pyx_t_13);
+        __Pyx_ExceptionReset(__pyx_t_11, __pyx_t_12, __pyx_t_13);
+      }
+      __Pyx_XGIVEREF(__pyx_t_8);
+      __Pyx_XGIVEREF(__pyx_t_9);
+      __Pyx_XGIVEREF(__pyx_t_10);
+      __Pyx_ErrRestore(__pyx_t_8, __pyx_t_9, __pyx_t_10);
+      __pyx_t_8 = 0; __pyx_t_9 = 0; __pyx_t_10 = 0; __pyx_t_11 = 0; __pyx_t_12 = 0; __pyx_t_13 = 0;
+      __pyx_lineno = __pyx_t_5; __pyx_clineno = __pyx_t_6; __pyx_filename = __pyx_t_7;
+      goto __pyx_L1_error;
+    }
+    __pyx_L5:;
+  }
+
+  /* "landlab/graph/cfuncs.pyx":446
+ *       free(angles)
+ * 
+ *     return out             # <<<<<<<<<<<<<<
+ */
+  __Pyx_XDECREF(__pyx_r);
+  __Pyx_INCREF(((PyObject *)__pyx_v_out));
+  __pyx_r = ((PyObject *)__pyx_v_out);
+  goto __pyx_L0;
+
+  /* "landlab/graph/cfuncs.pyx":420
+ * 
+ * @cython.boundscheck(False)
+ * def argsort_spoke_angles(np.ndarray[double, ndim=2, mode="c"] points,             # <<<<<<<<<<<<<<
+ *                          np.ndarray[double, ndim=1, mode="c"] hub,
+ *                          np.ndarray[int, ndim=1] out):
+ */
+
+  /* function exit code */
+  __pyx_L1_error:;
+  __Pyx_XDECREF(__pyx_t_4);
+  { PyObject *__pyx_type, *__pyx_value, *__pyx_tb;
+    __Pyx_PyThreadState_declare
+    __Pyx_PyThreadState_assign
+    __Pyx_ErrFetch(&__pyx_type, &__pyx_value, &__pyx_tb);
+    __Pyx_SafeReleaseBuffer(&__pyx_pybuffernd_hub.rcbuffer->pybuffer);
+    __Pyx_SafeReleaseBuffer(&__pyx_pybuffernd_out.rcbuffer->pybuffer);
+    __Pyx_SafeReleaseBuffer(&__pyx_pybuffernd_points.rcbuffer->pybuffer);
+  __Pyx_ErrRestore(__pyx_type, __pyx_value, __pyx_tb);}
+  __Pyx_AddTraceback("landlab.graph.cfuncs.argsort_spoke_angles", __pyx_clineno, __pyx_lineno, __pyx_filename);
+  __pyx_r = NULL;
+  goto __pyx_L2;
+  __pyx_L0:;
+  __Pyx_SafeReleaseBuffer(&__pyx_pybuffernd_hub.rcbuffer->pybuffer);
+  __Pyx_SafeReleaseBuffer(&__pyx_pybuffernd_out.rcbuffer->pybuffer);
+  __Pyx_SafeReleaseBuffer(&__pyx_pybuffernd_points.rcbuffer->pybuffer);
+  __pyx_L2:;
+  __Pyx_XGIVEREF(__pyx_r);
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+/* "../.pyenv/versions/3.7.16/lib/python3.7/site-packages/numpy/__init__.pxd":734
+ * ctypedef npy_cdouble     complex_t
+ * 
+ * cdef inline object PyArray_MultiIterNew1(a):             # <<<<<<<<<<<<<<
+ *     return PyArray_MultiIterNew(1, <void*>a)
+ * 
+ */
+
+static CYTHON_INLINE PyObject *__pyx_f_5numpy_PyArray_MultiIterNew1(PyObject *__pyx_v_a) {
+  PyObject *__pyx_r = NULL;
+  __Pyx_RefNannyDeclarations
+  PyObject *__pyx_t_1 = NULL;
+  int __pyx_lineno = 0;
+  const char *__pyx_filename = NULL;
+  int __pyx_clineno = 0;
+  __Pyx_RefNannySetupContext("PyArray_MultiIterNew1", 0);
+
+  /* "../.pyenv/versions/3.7.16/lib/python3.7/site-packages/numpy/__init__.pxd":735
+ * 
+ * cdef inline object PyArray_MultiIterNew1(a):
+ *     return PyArray_MultiIterNew(1, <void*>a)             # <<<<<<<<<<<<<<
+ * 
+ * cdef inline object PyArray_MultiIterNew2(a, b):
+ */
+  __Pyx_XDECREF(__pyx_r);
+  __pyx_t_1 = PyArray_MultiIterNew(1, ((void *)__pyx_v_a)); if (unlikely(!__pyx_t_1)) __PYX_ERR(1, 735, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_1);
+  __pyx_r = __pyx_t_1;
+  __pyx_t_1 = 0;
+  goto __pyx_L0;
+
+  /* "../.pyenv/versions/3.7.16/lib/python3.7/site-packages/numpy/__init__.pxd":734
+ * ctypedef npy_cdouble     complex_t
+ * 
+ * cdef inline object PyArray_MultiIterNew1(a):             # <<<<<<<<<<<<<<
+ *     return PyArray_MultiIterNew(1, <void*>a)
+ * 
+ */
+
+  /* function exit code */
+  __pyx_L1_error:;
+  __Pyx_XDECREF(__pyx_t_1);
+  __Pyx_AddTraceback("numpy.PyArray_MultiIterNew1", __pyx_clineno, __pyx_lineno, __pyx_filename);
+  __pyx_r = 0;
+  __pyx_L0:;
+  __Pyx_XGIVEREF(__pyx_r);
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+/* "../.pyenv/versions/3.7.16/lib/python3.7/site-packages/numpy/__init__.pxd":737
+ *     return PyArray_MultiIterNew(1, <void*>a)
+ * 
+ * cdef inline object PyArray_MultiIterNew2(a, b):             # <<<<<<<<<<<<<<
+ *     return PyArray_MultiIterNew(2, <void*>a, <void*>b)
+ * 
+ */
+
+static CYTHON_INLINE PyObject *__pyx_f_5numpy_PyArray_MultiIterNew2(PyObject *__pyx_v_a, PyObject *__pyx_v_b) {
+  PyObject *__pyx_r = NULL;
+  __Pyx_RefNannyDeclarations
+  PyObject *__pyx_t_1 = NULL;
+  int __pyx_lineno = 0;
+  const char *__pyx_filename = NULL;
+  int __pyx_clineno = 0;
+  __Pyx_RefNannySetupContext("PyArray_MultiIterNew2", 0);
+
+  /* "../.pyenv/versions/3.7.16/lib/python3.7/site-packages/numpy/__init__.pxd":738
+ * 
+ * cdef inline object PyArray_MultiIterNew2(a, b):
+ *     return PyArray_MultiIterNew(2, <void*>a, <void*>b)             # <<<<<<<<<<<<<<
+ * 
+ * cdef inline object PyArray_MultiIterNew3(a, b, c):
+ */
+  __Pyx_XDECREF(__pyx_r);
+  __pyx_t_1 = PyArray_MultiIterNew(2, ((void *)__pyx_v_a), ((void *)__pyx_v_b)); if (unlikely(!__pyx_t_1)) __PYX_ERR(1, 738, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_1);
+  __pyx_r = __pyx_t_1;
+  __pyx_t_1 = 0;
+  goto __pyx_L0;
+
+  /* "../.pyenv/versions/3.7.16/lib/python3.7/site-packages/numpy/__init__.pxd":737
+ *     return PyArray_MultiIterNew(1, <void*>a)
+ * 
+ * cdef inline object PyArray_MultiIterNew2(a, b):             # <<<<<<<<<<<<<<
+ *     return PyArray_MultiIterNew(2, <void*>a, <void*>b)
+ * 
+ */
+
+  /* function exit code */
+  __pyx_L1_error:;
+  __Pyx_XDECREF(__pyx_t_1);
+  __Pyx_AddTraceback("numpy.PyArray_MultiIterNew2", __pyx_clineno, __pyx_lineno, __pyx_filename);
+  __pyx_r = 0;
+  __pyx_L0:;
+  __Pyx_XGIVEREF(__pyx_r);
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+/* "../.pyenv/versions/3.7.16/lib/python3.7/site-packages/numpy/__init__.pxd":740
+ *     return PyArray_MultiIterNew(2, <void*>a, <void*>b)
+ * 
+ * cdef inline object PyArray_MultiIterNew3(a, b, c):             # <<<<<<<<<<<<<<
+ *     return PyArray_MultiIterNew(3, <void*>a, <void*>b, <void*> c)
+ * 
+ */
+
+static CYTHON_INLINE PyObject *__pyx_f_5numpy_PyArray_MultiIterNew3(PyObject *__pyx_v_a, PyObject *__pyx_v_b, PyObject *__pyx_v_c) {
+  PyObject *__pyx_r = NULL;
+  __Pyx_RefNannyDeclarations
+  PyObject *__pyx_t_1 = NULL;
+  int __pyx_lineno = 0;
+  const char *__pyx_filename = NULL;
+  int __pyx_clineno = 0;
+  __Pyx_RefNannySetupContext("PyArray_MultiIterNew3", 0);
+
+  /* "../.pyenv/versions/3.7.16/lib/python3.7/site-packages/numpy/__init__.pxd":741
+ * 
+ * cdef inline object PyArray_MultiIterNew3(a, b, c):
+ *     return PyArray_MultiIterNew(3, <void*>a, <void*>b, <void*> c)             # <<<<<<<<<<<<<<
+ * 
+ * cdef inline object PyArray_MultiIterNew4(a, b, c, d):
+ */
+  __Pyx_XDECREF(__pyx_r);
+  __pyx_t_1 = PyArray_MultiIterNew(3, ((void *)__pyx_v_a), ((void *)__pyx_v_b), ((void *)__pyx_v_c)); if (unlikely(!__pyx_t_1)) __PYX_ERR(1, 741, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_1);
+  __pyx_r = __pyx_t_1;
+  __pyx_t_1 = 0;
+  goto __pyx_L0;
+
+  /* "../.pyenv/versions/3.7.16/lib/python3.7/site-packages/numpy/__init__.pxd":740
+ *     return PyArray_MultiIterNew(2, <void*>a, <void*>b)
+ * 
+ * cdef inline object PyArray_MultiIterNew3(a, b, c):             # <<<<<<<<<<<<<<
+ *     return PyArray_MultiIterNew(3, <void*>a, <void*>b, <void*> c)
+ * 
+ */
+
+  /* function exit code */
+  __pyx_L1_error:;
+  __Pyx_XDECREF(__pyx_t_1);
+  __Pyx_AddTraceback("numpy.PyArray_MultiIterNew3", __pyx_clineno, __pyx_lineno, __pyx_filename);
+  __pyx_r = 0;
+  __pyx_L0:;
+  __Pyx_XGIVEREF(__pyx_r);
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+/* "../.pyenv/versions/3.7.16/lib/python3.7/site-packages/numpy/__init__.pxd":743
+ *     return PyArray_MultiIterNew(3, <void*>a, <void*>b, <void*> c)
+ * 
+ * cdef inline object PyArray_MultiIterNew4(a, b, c, d):             # <<<<<<<<<<<<<<
+ *     return PyArray_MultiIterNew(4, <void*>a, <void*>b, <void*>c, <void*> d)
+ * 
+ */
+
+static CYTHON_INLINE PyObject *__pyx_f_5numpy_PyArray_MultiIterNew4(PyObject *__pyx_v_a, PyObject *__pyx_v_b, PyObject *__pyx_v_c, PyObject *__pyx_v_d) {
+  PyObject *__pyx_r = NULL;
+  __Pyx_RefNannyDeclarations
+  PyObject *__pyx_t_1 = NULL;
+  int __pyx_lineno = 0;
+  const char *__pyx_filename = NULL;
+  int __pyx_clineno = 0;
+  __Pyx_RefNannySetupContext("PyArray_MultiIterNew4", 0);
+
+  /* "../.pyenv/versions/3.7.16/lib/python3.7/site-packages/numpy/__init__.pxd":744
+ * 
+ * cdef inline object PyArray_MultiIterNew4(a, b, c, d):
+ *     return PyArray_MultiIterNew(4, <void*>a, <void*>b, <void*>c, <void*> d)             # <<<<<<<<<<<<<<
+ * 
+ * cdef inline object PyArray_MultiIterNew5(a, b, c, d, e):
+ */
+  __Pyx_XDECREF(__pyx_r);
+  __pyx_t_1 = PyArray_MultiIterNew(4, ((void *)__pyx_v_a), ((void *)__pyx_v_b), ((void *)__pyx_v_c), ((void *)__pyx_v_d)); if (unlikely(!__pyx_t_1)) __PYX_ERR(1, 744, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_1);
+  __pyx_r = __pyx_t_1;
+  __pyx_t_1 = 0;
+  goto __pyx_L0;
+
+  /* "../.pyenv/versions/3.7.16/lib/python3.7/site-packages/numpy/__init__.pxd":743
+ *     return PyArray_MultiIterNew(3, <void*>a, <void*>b, <void*> c)
+ * 
+ * cdef inline object PyArray_MultiIterNew4(a, b, c, d):             # <<<<<<<<<<<<<<
+ *     return PyArray_MultiIterNew(4, <void*>a, <void*>b, <void*>c, <void*> d)
+ * 
+ */
+
+  /* function exit code */
+  __pyx_L1_error:;
+  __Pyx_XDECREF(__pyx_t_1);
+  __Pyx_AddTraceback("numpy.PyArray_MultiIterNew4", __pyx_clineno, __pyx_lineno, __pyx_filename);
+  __pyx_r = 0;
+  __pyx_L0:;
+  __Pyx_XGIVEREF(__pyx_r);
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+/* "../.pyenv/versions/3.7.16/lib/python3.7/site-packages/numpy/__init__.pxd":746
+ *     return PyArray_MultiIterNew(4, <void*>a, <void*>b, <void*>c, <void*> d)
+ * 
+ * cdef inline object PyArray_MultiIterNew5(a, b, c, d, e):             # <<<<<<<<<<<<<<
+ *     return PyArray_MultiIterNew(5, <void*>a, <void*>b, <void*>c, <void*> d, <void*> e)
+ * 
+ */
+
+static CYTHON_INLINE PyObject *__pyx_f_5numpy_PyArray_MultiIterNew5(PyObject *__pyx_v_a, PyObject *__pyx_v_b, PyObject *__pyx_v_c, PyObject *__pyx_v_d, PyObject *__pyx_v_e) {
+  PyObject *__pyx_r = NULL;
+  __Pyx_RefNannyDeclarations
+  PyObject *__pyx_t_1 = NULL;
+  int __pyx_lineno = 0;
+  const char *__pyx_filename = NULL;
+  int __pyx_clineno = 0;
+  __Pyx_RefNannySetupContext("PyArray_MultiIterNew5", 0);
+
+  /* "../.pyenv/versions/3.7.16/lib/python3.7/site-packages/numpy/__init__.pxd":747
+ * 
+ * cdef inline object PyArray_MultiIterNew5(a, b, c, d, e):
+ *     return PyArray_MultiIterNew(5, <void*>a, <void*>b, <void*>c, <void*> d, <void*> e)             # <<<<<<<<<<<<<<
+ * 
+ * cdef inline tuple PyDataType_SHAPE(dtype d):
+ */
+  __Pyx_XDECREF(__pyx_r);
+  __pyx_t_1 = PyArray_MultiIterNew(5, ((void *)__pyx_v_a), ((void *)__pyx_v_b), ((void *)__pyx_v_c), ((void *)__pyx_v_d), ((void *)__pyx_v_e)); if (unlikely(!__pyx_t_1)) __PYX_ERR(1, 747, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_1);
+  __pyx_r = __pyx_t_1;
+  __pyx_t_1 = 0;
+  goto __pyx_L0;
+
+  /* "../.pyenv/versions/3.7.16/lib/python3.7/site-packages/numpy/__init__.pxd":746
+ *     return PyArray_MultiIterNew(4, <void*>a, <void*>b, <void*>c, <void*> d)
+ * 
+ * cdef inline object PyArray_MultiIterNew5(a, b, c, d, e):             # <<<<<<<<<<<<<<
+ *     return PyArray_MultiIterNew(5, <void*>a, <void*>b, <void*>c, <void*> d, <void*> e)
+ * 
+ */
+
+  /* function exit code */
+  __pyx_L1_error:;
+  __Pyx_XDECREF(__pyx_t_1);
+  __Pyx_AddTraceback("numpy.PyArray_MultiIterNew5", __pyx_clineno, __pyx_lineno, __pyx_filename);
+  __pyx_r = 0;
+  __pyx_L0:;
+  __Pyx_XGIVEREF(__pyx_r);
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+/* "../.pyenv/versions/3.7.16/lib/python3.7/site-packages/numpy/__init__.pxd":749
+ *     return PyArray_MultiIterNew(5, <void*>a, <void*>b, <void*>c, <void*> d, <void*> e)
+ * 
+ * cdef inline tuple PyDataType_SHAPE(dtype d):             # <<<<<<<<<<<<<<
+ *     if PyDataType_HASSUBARRAY(d):
+ *         return <tuple>d.subarray.shape
+ */
+
+static CYTHON_INLINE PyObject *__pyx_f_5numpy_PyDataType_SHAPE(PyArray_Descr *__pyx_v_d) {
+  PyObject *__pyx_r = NULL;
+  __Pyx_RefNannyDeclarations
+  int __pyx_t_1;
+  __Pyx_RefNannySetupContext("PyDataType_SHAPE", 0);
+
+  /* "../.pyenv/versions/3.7.16/lib/python3.7/site-packages/numpy/__init__.pxd":750
+ * 
+ * cdef inline tuple PyDataType_SHAPE(dtype d):
+ *     if PyDataType_HASSUBARRAY(d):             # <<<<<<<<<<<<<<
+ *         return <tuple>d.subarray.shape
+ *     else:
+ */
+  __pyx_t_1 = (PyDataType_HASSUBARRAY(__pyx_v_d) != 0);
+  if (__pyx_t_1) {
+
+    /* "../.pyenv/versions/3.7.16/lib/python3.7/site-packages/numpy/__init__.pxd":751
+ * cdef inline tuple PyDataType_SHAPE(dtype d):
+ *     if PyDataType_HASSUBARRAY(d):
+ *         return <tuple>d.subarray.shape             # <<<<<<<<<<<<<<
+ *     else:
+ *         return ()
+ */
+    __Pyx_XDECREF(__pyx_r);
+    __Pyx_INCREF(((PyObject*)__pyx_v_d->subarray->shape));
+    __pyx_r = ((PyObject*)__pyx_v_d->subarray->shape);
+    goto __pyx_L0;
+
+    /* "../.pyenv/versions/3.7.16/lib/python3.7/site-packages/numpy/__init__.pxd":750
+ * 
+ * cdef inline tuple PyDataType_SHAPE(dtype d):
+ *     if PyDataType_HASSUBARRAY(d):             # <<<<<<<<<<<<<<
+ *         return <tuple>d.subarray.shape
+ *     else:
+ */
+  }
+
+  /* "../.pyenv/versions/3.7.16/lib/python3.7/site-packages/numpy/__init__.pxd":753
+ *         return <tuple>d.subarray.shape
+ *     else:
+ *         return ()             # <<<<<<<<<<<<<<
+ * 
+ * 
+ */
+  /*else*/ {
+    __Pyx_XDECREF(__pyx_r);
+    __Pyx_INCREF(__pyx_empty_tuple);
+    __pyx_r = __pyx_empty_tuple;
+    goto __pyx_L0;
+  }
+
+  /* "../.pyenv/versions/3.7.16/lib/python3.7/site-packages/numpy/__init__.pxd":749
+ *     return PyArray_MultiIterNew(5, <void*>a, <void*>b, <void*>c, <void*> d, <void*> e)
+ * 
+ * cdef inline tuple PyDataType_SHAPE(dtype d):             # <<<<<<<<<<<<<<
+ *     if PyDataType_HASSUBARRAY(d):
+ *         return <tuple>d.subarray.shape
+ */
+
+  /* function exit code */
+  __pyx_L0:;
+  __Pyx_XGIVEREF(__pyx_r);
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+/* "../.pyenv/versions/3.7.16/lib/python3.7/site-packages/numpy/__init__.pxd":868
+ *     int _import_umath() except -1
+ * 
+ * cdef inline void set_array_base(ndarray arr, object base):             # <<<<<<<<<<<<<<
+ *     Py_INCREF(base) # important to do this before stealing the reference below!
+ *     PyArray_SetBaseObject(arr, base)
+ */
+
+static CYTHON_INLINE void __pyx_f_5numpy_set_array_base(PyArrayObject *__pyx_v_arr, PyObject *__pyx_v_base) {
+  __Pyx_RefNannyDeclarations
+  __Pyx_RefNannySetupContext("set_array_base", 0);
+
+  /* "../.pyenv/versions/3.7.16/lib/python3.7/site-packages/numpy/__init__.pxd":869
+ * 
+ * cdef inline void set_array_base(ndarray arr, object base):
+ *     Py_INCREF(base) # important to do this before stealing the reference below!             # <<<<<<<<<<<<<<
+ *     PyArray_SetBaseObject(arr, base)
+ * 
+ */
+  Py_INCREF(__pyx_v_base);
+
+  /* "../.pyenv/versions/3.7.16/lib/python3.7/site-packages/numpy/__init__.pxd":870
+ * cdef inline void set_array_base(ndarray arr, object base):
+ *     Py_INCREF(base) # important to do this before stealing the reference below!
+ *     PyArray_SetBaseObject(arr, base)             # <<<<<<<<<<<<<<
+ * 
+ * cdef inline object get_array_base(ndarray arr):
+ */
+  (void)(PyArray_SetBaseObject(__pyx_v_arr, __pyx_v_base));
+
+  /* "../.pyenv/versions/3.7.16/lib/python3.7/site-packages/numpy/__init__.pxd":868
+ *     int _import_umath() except -1
+ * 
+ * cdef inline void set_array_base(ndarray arr, object base):             # <<<<<<<<<<<<<<
+ *     Py_INCREF(base) # important to do this before stealing the reference below!
+ *     PyArray_SetBaseObject(arr, base)
+ */
+
+  /* function exit code */
+  __Pyx_RefNannyFinishContext();
+}
+
+/* "../.pyenv/versions/3.7.16/lib/python3.7/site-packages/numpy/__init__.pxd":872
+ *     PyArray_SetBaseObject(arr, base)
+ * 
+ * cdef inline object get_array_base(ndarray arr):             # <<<<<<<<<<<<<<
+ *     base = PyArray_BASE(arr)
+ *     if base is NULL:
+ */
+
+static CYTHON_INLINE PyObject *__pyx_f_5numpy_get_array_base(PyArrayObject *__pyx_v_arr) {
+  PyObject *__pyx_v_base;
+  PyObject *__pyx_r = NULL;
+  __Pyx_RefNannyDeclarations
+  int __pyx_t_1;
+  __Pyx_RefNannySetupContext("get_array_base", 0);
+
+  /* "../.pyenv/versions/3.7.16/lib/python3.7/site-packages/numpy/__init__.pxd":873
+ * 
+ * cdef inline object get_array_base(ndarray arr):
+ *     base = PyArray_BASE(arr)             # <<<<<<<<<<<<<<
+ *     if base is NULL:
+ *         return None
+ */
+  __pyx_v_base = PyArray_BASE(__pyx_v_arr);
+
+  /* "../.pyenv/versions/3.7.16/lib/python3.7/site-packages/numpy/__init__.pxd":874
+ * cdef inline object get_array_base(ndarray arr):
+ *     base = PyArray_BASE(arr)
+ *     if base is NULL:             # <<<<<<<<<<<<<<
+ *         return None
+ *     return <object>base
+ */
+  __pyx_t_1 = ((__pyx_v_base == NULL) != 0);
+  if (__pyx_t_1) {
+
+    /* "../.pyenv/versions/3.7.16/lib/python3.7/site-packages/numpy/__init__.pxd":875
+ *     base = PyArray_BASE(arr)
+ *     if base is NULL:
+ *         return None             # <<<<<<<<<<<<<<
+ *     return <object>base
+ * 
+ */
+    __Pyx_XDECREF(__pyx_r);
+    __pyx_r = Py_None; __Pyx_INCREF(Py_None);
+    goto __pyx_L0;
+
+    /* "../.pyenv/versions/3.7.16/lib/python3.7/site-packages/numpy/__init__.pxd":874
+ * cdef inline object get_array_base(ndarray arr):
+ *     base = PyArray_BASE(arr)
+ *     if base is NULL:             # <<<<<<<<<<<<<<
+ *         return None
+ *     return <object>base
+ */
+  }
+
+  /* "../.pyenv/versions/3.7.16/lib/python3.7/site-packages/numpy/__init__.pxd":876
+ *     if base is NULL:
+ *         return None
+ *     return <object>base             # <<<<<<<<<<<<<<
+ * 
+ * # Versions of the import_* functions which are more suitable for
+ */
+  __Pyx_XDECREF(__pyx_r);
+  __Pyx_INCREF(((PyObject *)__pyx_v_base));
+  __pyx_r = ((PyObject *)__pyx_v_base);
+  goto __pyx_L0;
+
+  /* "../.pyenv/versions/3.7.16/lib/python3.7/site-packages/numpy/__init__.pxd":872
+ *     PyArray_SetBaseObject(arr, base)
+ * 
+ * cdef inline object get_array_base(ndarray arr):             # <<<<<<<<<<<<<<
+ *     base = PyArray_BASE(arr)
+ *     if base is NULL:
+ */
+
+  /* function exit code */
+  __pyx_L0:;
+  __Pyx_XGIVEREF(__pyx_r);
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+/* "../.pyenv/versions/3.7.16/lib/python3.7/site-packages/numpy/__init__.pxd":880
+ * # Versions of the import_* functions which are more suitable for
+ * # Cython code.
+ * cdef inline int import_array() except -1:             # <<<<<<<<<<<<<<
+ *     try:
+ *         __pyx_import_array()
+ */
+
+static CYTHON_INLINE int __pyx_f_5numpy_import_array(void) {
+  int __pyx_r;
+  __Pyx_RefNannyDeclarations
+  PyObject *__pyx_t_1 = NULL;
+  PyObject *__pyx_t_2 = NULL;
+  PyObject *__pyx_t_3 = NULL;
+  int __pyx_t_4;
+  PyObject *__pyx_t_5 = NULL;
+  PyObject *__pyx_t_6 = NULL;
+  PyObject *__pyx_t_7 = NULL;
+  PyObject *__pyx_t_8 = NULL;
+  int __pyx_lineno = 0;
+  const char *__pyx_filename = NULL;
+  int __pyx_clineno = 0;
+  __Pyx_RefNannySetupContext("import_array", 0);
+
+  /* "../.pyenv/versions/3.7.16/lib/python3.7/site-packages/numpy/__init__.pxd":881
+ * # Cython code.
+ * cdef inline int import_array() except -1:
+ *     try:             # <<<<<<<<<<<<<<
+ *         __pyx_import_array()
+ *     except Exception:
+ */
+  {
+    __Pyx_PyThreadState_declare
+    __Pyx_PyThreadState_assign
+    __Pyx_ExceptionSave(&__pyx_t_1, &__pyx_t_2, &__pyx_t_3);
+    __Pyx_XGOTREF(__pyx_t_1);
+    __Pyx_XGOTREF(__pyx_t_2);
+    __Pyx_XGOTREF(__pyx_t_3);
+    /*try:*/ {
+
+      /* "../.pyenv/versions/3.7.16/lib/python3.7/site-packages/numpy/__init__.pxd":882
+ * cdef inline int import_array() except -1:
+ *     try:
+ *         __pyx_import_array()             # <<<<<<<<<<<<<<
+ *     except Exception:
+ *         raise ImportError("numpy.core.multiarray failed to import")
+ */
+      __pyx_t_4 = _import_array(); if (unlikely(__pyx_t_4 == ((int)-1))) __PYX_ERR(1, 882, __pyx_L3_error)
+
+      /* "../.pyenv/versions/3.7.16/lib/python3.7/site-packages/numpy/__init__.pxd":881
+ * # Cython code.
+ * cdef inline int import_array() except -1:
+ *     try:             # <<<<<<<<<<<<<<
+ *         __pyx_import_array()
+ *     except Exception:
+ */
+    }
+    __Pyx_XDECREF(__pyx_t_1); __pyx_t_1 = 0;
+    __Pyx_XDECREF(__pyx_t_2); __pyx_t_2 = 0;
+    __Pyx_XDECREF(__pyx_t_3); __pyx_t_3 = 0;
+    goto __pyx_L8_try_end;
+    __pyx_L3_error:;
+
+    /* "../.pyenv/versions/3.7.16/lib/python3.7/site-packages/numpy/__init__.pxd":883
+ *     try:
+ *         __pyx_import_array()
+ *     except Exception:             # <<<<<<<<<<<<<<
+ *         raise ImportError("numpy.core.multiarray failed to import")
+ * 
+ */
+    __pyx_t_4 = __Pyx_PyErr_ExceptionMatches(((PyObject *)(&((PyTypeObject*)PyExc_Exception)[0])));
+    if (__pyx_t_4) {
+      __Pyx_AddTraceback("numpy.import_array", __pyx_clineno, __pyx_lineno, __pyx_filename);
+      if (__Pyx_GetException(&__pyx_t_5, &__pyx_t_6, &__pyx_t_7) < 0) __PYX_ERR(1, 883, __pyx_L5_except_error)
+      __Pyx_GOTREF(__pyx_t_5);
+      __Pyx_GOTREF(__pyx_t_6);
+      __Pyx_GOTREF(__pyx_t_7);
+
+      /* "../.pyenv/versions/3.7.16/lib/python3.7/site-packages/numpy/__init__.pxd":884
+ *         __pyx_import_array()
+ *     except Exception:
+ *         raise ImportError("numpy.core.multiarray failed to import")             # <<<<<<<<<<<<<<
+ * 
+ * cdef inline int import_umath() except -1:
+ */
+      __pyx_t_8 = __Pyx_PyObject_Call(__pyx_builtin_ImportError, __pyx_tuple_, NULL); if (unlikely(!__pyx_t_8)) __PYX_ERR(1, 884, __pyx_L5_except_error)
+      __Pyx_GOTREF(__pyx_t_8);
+      __Pyx_Raise(__pyx_t_8, 0, 0, 0);
+      __Pyx_DECREF(__pyx_t_8); __pyx_t_8 = 0;
+      __PYX_ERR(1, 884, __pyx_L5_except_error)
+    }
+    goto __pyx_L5_except_error;
+    __pyx_L5_except_error:;
+
+    /* "../.pyenv/versions/3.7.16/lib/python3.7/site-packages/numpy/__init__.pxd":881
+ * # Cython code.
+ * cdef inline int import_array() except -1:
+ *     try:             # <<<<<<<<<<<<<<
+ *         __pyx_import_array()
+ *     except Exception:
+ */
+    __Pyx_XGIVEREF(__pyx_t_1);
+    __Pyx_XGIVEREF(__pyx_t_2);
+    __Pyx_XGIVEREF(__pyx_t_3);
+    __Pyx_ExceptionReset(__pyx_t_1, __pyx_t_2, __pyx_t_3);
+    goto __pyx_L1_error;
+    __pyx_L8_try_end:;
+  }
+
+  /* "../.pyenv/versions/3.7.16/lib/python3.7/site-packages/numpy/__init__.pxd":880
+ * # Versions of the import_* functions which are more suitable for
+ * # Cython code.
+ * cdef inline int import_array() except -1:             # <<<<<<<<<<<<<<
+ *     try:
+ *         __pyx_import_array()
+ */
+
+  /* function exit code */
+  __pyx_r = 0;
+  goto __pyx_L0;
+  __pyx_L1_error:;
+  __Pyx_XDECREF(__pyx_t_5);
+  __Pyx_XDECREF(__pyx_t_6);
+  __Pyx_XDECREF(__pyx_t_7);
+  __Pyx_XDECREF(__pyx_t_8);
+  __Pyx_AddTraceback("numpy.import_array", __pyx_clineno, __pyx_lineno, __pyx_filename);
+  __pyx_r = -1;
+  __pyx_L0:;
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+/* "../.pyenv/versions/3.7.16/lib/python3.7/site-packages/numpy/__init__.pxd":886
+ *         raise ImportError("numpy.core.multiarray failed to import")
+ * 
+ * cdef inline int import_umath() except -1:             # <<<<<<<<<<<<<<
+ *     try:
+ *         _import_umath()
+ */
+
+static CYTHON_INLINE int __pyx_f_5numpy_import_umath(void) {
+  int __pyx_r;
+  __Pyx_RefNannyDeclarations
+  PyObject *__pyx_t_1 = NULL;
+  PyObject *__pyx_t_2 = NULL;
+  PyObject *__pyx_t_3 = NULL;
+  int __pyx_t_4;
+  PyObject *__pyx_t_5 = NULL;
+  PyObject *__pyx_t_6 = NULL;
+  PyObject *__pyx_t_7 = NULL;
+  PyObject *__pyx_t_8 = NULL;
+  int __pyx_lineno = 0;
+  const char *__pyx_filename = NULL;
+  int __pyx_clineno = 0;
+  __Pyx_RefNannySetupContext("import_umath", 0);
+
+  /* "../.pyenv/versions/3.7.16/lib/python3.7/site-packages/numpy/__init__.pxd":887
+ * 
+ * cdef inline int import_umath() except -1:
+ *     try:             # <<<<<<<<<<<<<<
+ *         _import_umath()
+ *     except Exception:
+ */
+  {
+    __Pyx_PyThreadState_declare
+    __Pyx_PyThreadState_assign
+    __Pyx_ExceptionSave(&__pyx_t_1, &__pyx_t_2, &__pyx_t_3);
+    __Pyx_XGOTREF(__pyx_t_1);
+    __Pyx_XGOTREF(__pyx_t_2);
+    __Pyx_XGOTREF(__pyx_t_3);
+    /*try:*/ {
+
+      /* "../.pyenv/versions/3.7.16/lib/python3.7/site-packages/numpy/__init__.pxd":888
+ * cdef inline int import_umath() except -1:
+ *     try:
+ *         _import_umath()             # <<<<<<<<<<<<<<
+ *     except Exception:
+ *         raise ImportError("numpy.core.umath failed to import")
+ */
+      __pyx_t_4 = _import_umath(); if (unlikely(__pyx_t_4 == ((int)-1))) __PYX_ERR(1, 888, __pyx_L3_error)
+
+      /* "../.pyenv/versions/3.7.16/lib/python3.7/site-packages/numpy/__init__.pxd":887
+ * 
+ * cdef inline int import_umath() except -1:
+ *     try:             # <<<<<<<<<<<<<<
+ *         _import_umath()
+ *     except Exception:
+ */
+    }
+    __Pyx_XDECREF(__pyx_t_1); __pyx_t_1 = 0;
+    __Pyx_XDECREF(__pyx_t_2); __pyx_t_2 = 0;
+    __Pyx_XDECREF(__pyx_t_3); __pyx_t_3 = 0;
+    goto __pyx_L8_try_end;
+    __pyx_L3_error:;
+
+    /* "../.pyenv/versions/3.7.16/lib/python3.7/site-packages/numpy/__init__.pxd":889
+ *     try:
+ *         _import_umath()
+ *     except Exception:             # <<<<<<<<<<<<<<
+ *         raise ImportError("numpy.core.umath failed to import")
+ * 
+ */
+    __pyx_t_4 = __Pyx_PyErr_ExceptionMatches(((PyObject *)(&((PyTypeObject*)PyExc_Exception)[0])));
+    if (__pyx_t_4) {
+      __Pyx_AddTraceback("numpy.import_umath", __pyx_clineno, __pyx_lineno, __pyx_filename);
+      if (__Pyx_GetException(&__pyx_t_5, &__pyx_t_6, &__pyx_t_7) < 0) __PYX_ERR(1, 889, __pyx_L5_except_error)
+      __Pyx_GOTREF(__pyx_t_5);
+      __Pyx_GOTREF(__pyx_t_6);
+      __Pyx_GOTREF(__pyx_t_7);
+
+      /* "../.pyenv/versions/3.7.16/lib/python3.7/site-packages/numpy/__init__.pxd":890
+ *         _import_umath()
+ *     except Exception:
+ *         raise ImportError("numpy.core.umath failed to import")             # <<<<<<<<<<<<<<
+ * 
+ * cdef inline int import_ufunc() except -1:
+ */
+      __pyx_t_8 = __Pyx_PyObject_Call(__pyx_builtin_ImportError, __pyx_tuple__2, NULL); if (unlikely(!__pyx_t_8)) __PYX_ERR(1, 890, __pyx_L5_except_error)
+      __Pyx_GOTREF(__pyx_t_8);
+      __Pyx_Raise(__pyx_t_8, 0, 0, 0);
+      __Pyx_DECREF(__pyx_t_8); __pyx_t_8 = 0;
+      __PYX_ERR(1, 890, __pyx_L5_except_error)
+    }
+    goto __pyx_L5_except_error;
+    __pyx_L5_except_error:;
+
+    /* "../.pyenv/versions/3.7.16/lib/python3.7/site-packages/numpy/__init__.pxd":887
+ * 
+ * cdef inline int import_umath() except -1:
+ *     try:             # <<<<<<<<<<<<<<
+ *         _import_umath()
+ *     except Exception:
+ */
+    __Pyx_XGIVEREF(__pyx_t_1);
+    __Pyx_XGIVEREF(__pyx_t_2);
+    __Pyx_XGIVEREF(__pyx_t_3);
+    __Pyx_ExceptionReset(__pyx_t_1, __pyx_t_2, __pyx_t_3);
+    goto __pyx_L1_error;
+    __pyx_L8_try_end:;
+  }
+
+  /* "../.pyenv/versions/3.7.16/lib/python3.7/site-packages/numpy/__init__.pxd":886
+ *         raise ImportError("numpy.core.multiarray failed to import")
+ * 
+ * cdef inline int import_umath() except -1:             # <<<<<<<<<<<<<<
+ *     try:
+ *         _import_umath()
+ */
+
+  /* function exit code */
+  __pyx_r = 0;
+  goto __pyx_L0;
+  __pyx_L1_error:;
+  __Pyx_XDECREF(__pyx_t_5);
+  __Pyx_XDECREF(__pyx_t_6);
+  __Pyx_XDECREF(__pyx_t_7);
+  __Pyx_XDECREF(__pyx_t_8);
+  __Pyx_AddTraceback("numpy.import_umath", __pyx_clineno, __pyx_lineno, __pyx_filename);
+  __pyx_r = -1;
+  __pyx_L0:;
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+/* "../.pyenv/versions/3.7.16/lib/python3.7/site-packages/numpy/__init__.pxd":892
+ *         raise ImportError("numpy.core.umath failed to import")
+ * 
+ * cdef inline int import_ufunc() except -1:             # <<<<<<<<<<<<<<
+ *     try:
+ *         _import_umath()
+ */
+
+static CYTHON_INLINE int __pyx_f_5numpy_import_ufunc(void) {
+  int __pyx_r;
+  __Pyx_RefNannyDeclarations
+  PyObject *__pyx_t_1 = NULL;
+  PyObject *__pyx_t_2 = NULL;
+  PyObject *__pyx_t_3 = NULL;
+  int __pyx_t_4;
+  PyObject *__pyx_t_5 = NULL;
+  PyObject *__pyx_t_6 = NULL;
+  PyObject *__pyx_t_7 = NULL;
+  PyObject *__pyx_t_8 = NULL;
+  int __pyx_lineno = 0;
+  const char *__pyx_filename = NULL;
+  int __pyx_clineno = 0;
+  __Pyx_RefNannySetupContext("import_ufunc", 0);
+
+  /* "../.pyenv/versions/3.7.16/lib/python3.7/site-packages/numpy/__init__.pxd":893
+ * 
+ * cdef inline int import_ufunc() except -1:
+ *     try:             # <<<<<<<<<<<<<<
+ *         _import_umath()
+ *     except Exception:
+ */
+  {
+    __Pyx_PyThreadState_declare
+    __Pyx_PyThreadState_assign
+    __Pyx_ExceptionSave(&__pyx_t_1, &__pyx_t_2, &__pyx_t_3);
+    __Pyx_XGOTREF(__pyx_t_1);
+    __Pyx_XGOTREF(__pyx_t_2);
+    __Pyx_XGOTREF(__pyx_t_3);
+    /*try:*/ {
+
+      /* "../.pyenv/versions/3.7.16/lib/python3.7/site-packages/numpy/__init__.pxd":894
+ * cdef inline int import_ufunc() except -1:
+ *     try:
+ *         _import_umath()             # <<<<<<<<<<<<<<
+ *     except Exception:
+ *         raise ImportError("numpy.core.umath failed to import")
+ */
+      __pyx_t_4 = _import_umath(); if (unlikely(__pyx_t_4 == ((int)-1))) __PYX_ERR(1, 894, __pyx_L3_error)
+
+      /* "../.pyenv/versions/3.7.16/lib/python3.7/site-packages/numpy/__init__.pxd":893
+ * 
+ * cdef inline int import_ufunc() except -1:
+ *     try:             # <<<<<<<<<<<<<<
+ *         _import_umath()
+ *     except Exception:
+ */
+    }
+    __Pyx_XDECREF(__pyx_t_1); __pyx_t_1 = 0;
+    __Pyx_XDECREF(__pyx_t_2); __pyx_t_2 = 0;
+    __Pyx_XDECREF(__pyx_t_3); __pyx_t_3 = 0;
+    goto __pyx_L8_try_end;
+    __pyx_L3_error:;
+
+    /* "../.pyenv/versions/3.7.16/lib/python3.7/site-packages/numpy/__init__.pxd":895
+ *     try:
+ *         _import_umath()
+ *     except Exception:             # <<<<<<<<<<<<<<
+ *         raise ImportError("numpy.core.umath failed to import")
+ * 
+ */
+    __pyx_t_4 = __Pyx_PyErr_ExceptionMatches(((PyObject *)(&((PyTypeObject*)PyExc_Exception)[0])));
+    if (__pyx_t_4) {
+      __Pyx_AddTraceback("numpy.import_ufunc", __pyx_clineno, __pyx_lineno, __pyx_filename);
+      if (__Pyx_GetException(&__pyx_t_5, &__pyx_t_6, &__pyx_t_7) < 0) __PYX_ERR(1, 895, __pyx_L5_except_error)
+      __Pyx_GOTREF(__pyx_t_5);
+      __Pyx_GOTREF(__pyx_t_6);
+      __Pyx_GOTREF(__pyx_t_7);
+
+      /* "../.pyenv/versions/3.7.16/lib/python3.7/site-packages/numpy/__init__.pxd":896
+ *         _import_umath()
+ *     except Exception:
+ *         raise ImportError("numpy.core.umath failed to import")             # <<<<<<<<<<<<<<
+ * 
+ * cdef extern from *:
+ */
+      __pyx_t_8 = __Pyx_PyObject_Call(__pyx_builtin_ImportError, __pyx_tuple__2, NULL); if (unlikely(!__pyx_t_8)) __PYX_ERR(1, 896, __pyx_L5_except_error)
+      __Pyx_GOTREF(__pyx_t_8);
+      __Pyx_Raise(__pyx_t_8, 0, 0, 0);
+      __Pyx_DECREF(__pyx_t_8); __pyx_t_8 = 0;
+      __PYX_ERR(1, 896, __pyx_L5_except_error)
+    }
+    goto __pyx_L5_except_error;
+    __pyx_L5_except_error:;
+
+    /* "../.pyenv/versions/3.7.16/lib/python3.7/site-packages/numpy/__init__.pxd":893
+ * 
+ * cdef inline int import_ufunc() except -1:
+ *     try:             # <<<<<<<<<<<<<<
+ *         _import_umath()
+ *     except Exception:
+ */
+    __Pyx_XGIVEREF(__pyx_t_1);
+    __Pyx_XGIVEREF(__pyx_t_2);
+    __Pyx_XGIVEREF(__pyx_t_3);
+    __Pyx_ExceptionReset(__pyx_t_1, __pyx_t_2, __pyx_t_3);
+    goto __pyx_L1_error;
+    __pyx_L8_try_end:;
+  }
+
+  /* "../.pyenv/versions/3.7.16/lib/python3.7/site-packages/numpy/__init__.pxd":892
+ *         raise ImportError("numpy.core.umath failed to import")
+ * 
+ * cdef inline int import_ufunc() except -1:             # <<<<<<<<<<<<<<
+ *     try:
+ *         _import_umath()
+ */
+
+  /* function exit code */
+  __pyx_r = 0;
+  goto __pyx_L0;
+  __pyx_L1_error:;
+  __Pyx_XDECREF(__pyx_t_5);
+  __Pyx_XDECREF(__pyx_t_6);
+  __Pyx_XDECREF(__pyx_t_7);
+  __Pyx_XDECREF(__pyx_t_8);
+  __Pyx_AddTraceback("numpy.import_ufunc", __pyx_clineno, __pyx_lineno, __pyx_filename);
+  __pyx_r = -1;
+  __pyx_L0:;
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+static PyMethodDef __pyx_methods[] = {
+  {0, 0, 0, 0}
+};
+
+#if PY_MAJOR_VERSION >= 3
+#if CYTHON_PEP489_MULTI_PHASE_INIT
+static PyObject* __pyx_pymod_create(PyObject *spec, PyModuleDef *def); /*proto*/
+static int __pyx_pymod_exec_cfuncs(PyObject* module); /*proto*/
+static PyModuleDef_Slot __pyx_moduledef_slots[] = {
+  {Py_mod_create, (void*)__pyx_pymod_create},
+  {Py_mod_exec, (void*)__pyx_pymod_exec_cfuncs},
+  {0, NULL}
+};
+#endif
+
+static struct PyModuleDef __pyx_moduledef = {
+    PyModuleDef_HEAD_INIT,
+    "cfuncs",
+    0, /* m_doc */
+  #if CYTHON_PEP489_MULTI_PHASE_INIT
+    0, /* m_size */
+  #else
+    -1, /* m_size */
+  #endif
+    __pyx_methods /* m_methods */,
+  #if CYTHON_PEP489_MULTI_PHASE_INIT
+    __pyx_moduledef_slots, /* m_slots */
+  #else
+    NULL, /* m_reload */
+  #endif
+    NULL, /* m_traverse */
+    NULL, /* m_clear */
+    NULL /* m_free */
+};
+#endif
+#ifndef CYTHON_SMALL_CODE
+#if defined(__clang__)
+    #define CYTHON_SMALL_CODE
+#elif defined(__GNUC__) && (__GNUC__ > 4 || (__GNUC__ == 4 && __GNUC_MINOR__ >= 3))
+    #define CYTHON_SMALL_CODE __attribute__((cold))
+#else
+    #define CYTHON_SMALL_CODE
+#endif
+#endif
+
+static __Pyx_StringTabEntry __pyx_string_tab[] = {
+  {&__pyx_n_s_DTYPE, __pyx_k_DTYPE, sizeof(__pyx_k_DTYPE), 0, 0, 1, 1},
+  {&__pyx_n_s_ImportError, __pyx_k_ImportError, sizeof(__pyx_k_ImportError), 0, 0, 1, 1},
+  {&__pyx_n_s_angles, __pyx_k_angles, sizeof(__pyx_k_angles), 0, 0, 1, 1},
+  {&__pyx_n_s_argsort_spoke_angles, __pyx_k_argsort_spoke_angles, sizeof(__pyx_k_argsort_spoke_angles), 0, 0, 1, 1},
+  {&__pyx_n_s_buffer, __pyx_k_buffer, sizeof(__pyx_k_buffer), 0, 0, 1, 1},
+  {&__pyx_n_s_calc_center_of_patch, __pyx_k_calc_center_of_patch, sizeof(__pyx_k_calc_center_of_patch), 0, 0, 1, 1},
+  {&__pyx_n_s_cell, __pyx_k_cell, sizeof(__pyx_k_cell), 0, 0, 1, 1},
+  {&__pyx_n_s_cell_cols, __pyx_k_cell_cols, sizeof(__pyx_k_cell_cols), 0, 0, 1, 1},
+  {&__pyx_n_s_cell_rows, __pyx_k_cell_rows, sizeof(__pyx_k_cell_rows), 0, 0, 1, 1},
+  {&__pyx_n_s_cline_in_traceback, __pyx_k_cline_in_traceback, sizeof(__pyx_k_cline_in_traceback), 0, 0, 1, 1},
+  {&__pyx_n_s_col, __pyx_k_col, sizeof(__pyx_k_col), 0, 0, 1, 1},
+  {&__pyx_n_s_find_links_at_node, __pyx_k_find_links_at_node, sizeof(__pyx_k_find_links_at_node), 0, 0, 1, 1},
+  {&__pyx_n_s_hub, __pyx_k_hub, sizeof(__pyx_k_hub), 0, 0, 1, 1},
+  {&__pyx_n_s_i, __pyx_k_i, sizeof(__pyx_k_i), 0, 0, 1, 1},
+  {&__pyx_n_s_import, __pyx_k_import, sizeof(__pyx_k_import), 0, 0, 1, 1},
+  {&__pyx_n_s_int, __pyx_k_int, sizeof(__pyx_k_int), 0, 0, 1, 1},
+  {&__pyx_n_s_landlab_graph_cfuncs, __pyx_k_landlab_graph_cfuncs, sizeof(__pyx_k_landlab_graph_cfuncs), 0, 0, 1, 1},
+  {&__pyx_kp_s_landlab_graph_cfuncs_pyx, __pyx_k_landlab_graph_cfuncs_pyx, sizeof(__pyx_k_landlab_graph_cfuncs_pyx), 0, 0, 1, 0},
+  {&__pyx_n_s_link, __pyx_k_link, sizeof(__pyx_k_link), 0, 0, 1, 1},
+  {&__pyx_n_s_link_buffer, __pyx_k_link_buffer, sizeof(__pyx_k_link_buffer), 0, 0, 1, 1},
+  {&__pyx_n_s_link_dirs_at_node, __pyx_k_link_dirs_at_node, sizeof(__pyx_k_link_dirs_at_node), 0, 0, 1, 1},
+  {&__pyx_n_s_links_at_node, __pyx_k_links_at_node, sizeof(__pyx_k_links_at_node), 0, 0, 1, 1},
+  {&__pyx_n_s_links_at_patch, __pyx_k_links_at_patch, sizeof(__pyx_k_links_at_patch), 0, 0, 1, 1},
+  {&__pyx_n_s_main, __pyx_k_main, sizeof(__pyx_k_main), 0, 0, 1, 1},
+  {&__pyx_n_s_max_links_at_node, __pyx_k_max_links_at_node, sizeof(__pyx_k_max_links_at_node), 0, 0, 1, 1},
+  {&__pyx_n_s_n_links, __pyx_k_n_links, sizeof(__pyx_k_n_links), 0, 0, 1, 1},
+  {&__pyx_n_s_n_links_found, __pyx_k_n_links_found, sizeof(__pyx_k_n_links_found), 0, 0, 1, 1},
+  {&__pyx_n_s_n_links_per_node, __pyx_k_n_links_per_node, sizeof(__pyx_k_n_links_per_node), 0, 0, 1, 1},
+  {&__pyx_n_s_n_nodes, __pyx_k_n_nodes, sizeof(__pyx_k_n_nodes), 0, 0, 1, 1},
+  {&__pyx_n_s_n_patches, __pyx_k_n_patches, sizeof(__pyx_k_n_patches), 0, 0, 1, 1},
+  {&__pyx_n_s_n_points, __pyx_k_n_points, sizeof(__pyx_k_n_points), 0, 0, 1, 1},
+  {&__pyx_n_s_n_spokes, __pyx_k_n_spokes, sizeof(__pyx_k_n_spokes), 0, 0, 1, 1},
+  {&__pyx_n_s_n_wheels, __pyx_k_n_wheels, sizeof(__pyx_k_n_wheels), 0, 0, 1, 1},
+  {&__pyx_n_s_name, __pyx_k_name, sizeof(__pyx_k_name), 0, 0, 1, 1},
+  {&__pyx_n_s_new_links, __pyx_k_new_links, sizeof(__pyx_k_new_links), 0, 0, 1, 1},
+  {&__pyx_n_s_new_nodes, __pyx_k_new_nodes, sizeof(__pyx_k_new_nodes), 0, 0, 1, 1},
+  {&__pyx_n_s_new_offset, __pyx_k_new_offset, sizeof(__pyx_k_new_offset), 0, 0, 1, 1},
+  {&__pyx_n_s_new_patches, __pyx_k_new_patches, sizeof(__pyx_k_new_patches), 0, 0, 1, 1},
+  {&__pyx_n_s_node, __pyx_k_node, sizeof(__pyx_k_node), 0, 0, 1, 1},
+  {&__pyx_n_s_node_at_cell, __pyx_k_node_at_cell, sizeof(__pyx_k_node_at_cell), 0, 0, 1, 1},
+  {&__pyx_n_s_node_cols, __pyx_k_node_cols, sizeof(__pyx_k_node_cols), 0, 0, 1, 1},
+  {&__pyx_n_s_nodes_at_link, __pyx_k_nodes_at_link, sizeof(__pyx_k_nodes_at_link), 0, 0, 1, 1},
+  {&__pyx_n_s_np, __pyx_k_np, sizeof(__pyx_k_np), 0, 0, 1, 1},
+  {&__pyx_n_s_numpy, __pyx_k_numpy, sizeof(__pyx_k_numpy), 0, 0, 1, 1},
+  {&__pyx_kp_s_numpy_core_multiarray_failed_to, __pyx_k_numpy_core_multiarray_failed_to, sizeof(__pyx_k_numpy_core_multiarray_failed_to), 0, 0, 1, 0},
+  {&__pyx_kp_s_numpy_core_umath_failed_to_impor, __pyx_k_numpy_core_umath_failed_to_impor, sizeof(__pyx_k_numpy_core_umath_failed_to_impor), 0, 0, 1, 0},
+  {&__pyx_n_s_offset, __pyx_k_offset, sizeof(__pyx_k_offset), 0, 0, 1, 1},
+  {&__pyx_n_s_offset_to_patch, __pyx_k_offset_to_patch, sizeof(__pyx_k_offset_to_patch), 0, 0, 1, 1},
+  {&__pyx_n_s_offset_to_wheel, __pyx_k_offset_to_wheel, sizeof(__pyx_k_offset_to_wheel), 0, 0, 1, 1},
+  {&__pyx_n_s_ordered, __pyx_k_ordered, sizeof(__pyx_k_ordered), 0, 0, 1, 1},
+  {&__pyx_n_s_out, __pyx_k_out, sizeof(__pyx_k_out), 0, 0, 1, 1},
+  {&__pyx_n_s_patch, __pyx_k_patch, sizeof(__pyx_k_patch), 0, 0, 1, 1},
+  {&__pyx_n_s_pi, __pyx_k_pi, sizeof(__pyx_k_pi), 0, 0, 1, 1},
+  {&__pyx_n_s_points, __pyx_k_points, sizeof(__pyx_k_points), 0, 0, 1, 1},
+  {&__pyx_n_s_range, __pyx_k_range, sizeof(__pyx_k_range), 0, 0, 1, 1},
+  {&__pyx_n_s_remap_links_at_patch, __pyx_k_remap_links_at_patch, sizeof(__pyx_k_remap_links_at_patch), 0, 0, 1, 1},
+  {&__pyx_n_s_remap_nodes_at_link, __pyx_k_remap_nodes_at_link, sizeof(__pyx_k_remap_nodes_at_link), 0, 0, 1, 1},
+  {&__pyx_n_s_reorder_links_at_node, __pyx_k_reorder_links_at_node, sizeof(__pyx_k_reorder_links_at_node), 0, 0, 1, 1},
+  {&__pyx_n_s_reorder_links_at_patch, __pyx_k_reorder_links_at_patch, sizeof(__pyx_k_reorder_links_at_patch), 0, 0, 1, 1},
+  {&__pyx_n_s_resort_patches, __pyx_k_resort_patches, sizeof(__pyx_k_resort_patches), 0, 0, 1, 1},
+  {&__pyx_n_s_row, __pyx_k_row, sizeof(__pyx_k_row), 0, 0, 1, 1},
+  {&__pyx_n_s_row_offset, __pyx_k_row_offset, sizeof(__pyx_k_row_offset), 0, 0, 1, 1},
+  {&__pyx_n_s_setup_links_at_node, __pyx_k_setup_links_at_node, sizeof(__pyx_k_setup_links_at_node), 0, 0, 1, 1},
+  {&__pyx_n_s_setup_links_at_patch, __pyx_k_setup_links_at_patch, sizeof(__pyx_k_setup_links_at_patch), 0, 0, 1, 1},
+  {&__pyx_n_s_setup_node_at_cell, __pyx_k_setup_node_at_cell, sizeof(__pyx_k_setup_node_at_cell), 0, 0, 1, 1},
+  {&__pyx_n_s_shape, __pyx_k_shape, sizeof(__pyx_k_shape), 0, 0, 1, 1},
+  {&__pyx_n_s_sort_spokes_at_wheel, __pyx_k_sort_spokes_at_wheel, sizeof(__pyx_k_sort_spokes_at_wheel), 0, 0, 1, 1},
+  {&__pyx_n_s_sorted_links, __pyx_k_sorted_links, sizeof(__pyx_k_sorted_links), 0, 0, 1, 1},
+  {&__pyx_n_s_sorted_patches, __pyx_k_sorted_patches, sizeof(__pyx_k_sorted_patches), 0, 0, 1, 1},
+  {&__pyx_n_s_spokes_at_wheel, __pyx_k_spokes_at_wheel, sizeof(__pyx_k_spokes_at_wheel), 0, 0, 1, 1},
+  {&__pyx_n_s_test, __pyx_k_test, sizeof(__pyx_k_test), 0, 0, 1, 1},
+  {&__pyx_n_s_wheel, __pyx_k_wheel, sizeof(__pyx_k_wheel), 0, 0, 1, 1},
+  {&__pyx_n_s_x, __pyx_k_x, sizeof(__pyx_k_x), 0, 0, 1, 1},
+  {&__pyx_n_s_xy_at_link, __pyx_k_xy_at_link, sizeof(__pyx_k_xy_at_link), 0, 0, 1, 1},
+  {&__pyx_n_s_xy_at_patch, __pyx_k_xy_at_patch, sizeof(__pyx_k_xy_at_patch), 0, 0, 1, 1},
+  {&__pyx_n_s_xy_of_hub, __pyx_k_xy_of_hub, sizeof(__pyx_k_xy_of_hub), 0, 0, 1, 1},
+  {&__pyx_n_s_xy_of_link, __pyx_k_xy_of_link, sizeof(__pyx_k_xy_of_link), 0, 0, 1, 1},
+  {&__pyx_n_s_xy_of_spoke, __pyx_k_xy_of_spoke, sizeof(__pyx_k_xy_of_spoke), 0, 0, 1, 1},
+  {&__pyx_n_s_y, __pyx_k_y, sizeof(__pyx_k_y), 0, 0, 1, 1},
+  {0, 0, 0, 0, 0, 0, 0}
+};
+static CYTHON_SMALL_CODE int __Pyx_InitCachedBuiltins(void) {
+  __pyx_builtin_range = __Pyx_GetBuiltinName(__pyx_n_s_range); if (!__pyx_builtin_range) __PYX_ERR(0, 40, __pyx_L1_error)
+  __pyx_builtin_ImportError = __Pyx_GetBuiltinName(__pyx_n_s_ImportError); if (!__pyx_builtin_ImportError) __PYX_ERR(1, 884, __pyx_L1_error)
+  return 0;
+  __pyx_L1_error:;
+  return -1;
+}
+
+static CYTHON_SMALL_CODE int __Pyx_InitCachedConstants(void) {
+  __Pyx_RefNannyDeclarations
+  __Pyx_RefNannySetupContext("__Pyx_InitCachedConstants", 0);
+
+  /* "../.pyenv/versions/3.7.16/lib/python3.7/site-packages/numpy/__init__.pxd":884
+ *         __pyx_import_array()
+ *     except Exception:
+ *         raise ImportError("numpy.core.multiarray failed to import")             # <<<<<<<<<<<<<<
+ * 
+ * cdef inline int import_umath() except -1:
+ */
+  __pyx_tuple_ = PyTuple_Pack(1, __pyx_kp_s_numpy_core_multiarray_failed_to); if (unlikely(!__pyx_tuple_)) __PYX_ERR(1, 884, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_tuple_);
+  __Pyx_GIVEREF(__pyx_tuple_);
+
+  /* "../.pyenv/versions/3.7.16/lib/python3.7/site-packages/numpy/__init__.pxd":890
+ *         _import_umath()
+ *     except Exception:
+ *         raise ImportError("numpy.core.umath failed to import")             # <<<<<<<<<<<<<<
+ * 
+ * cdef inline int import_ufunc() except -1:
+ */
+  __pyx_tuple__2 = PyTuple_Pack(1, __pyx_kp_s_numpy_core_umath_failed_to_impor); if (unlikely(!__pyx_tuple__2)) __PYX_ERR(1, 890, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_tuple__2);
+  __Pyx_GIVEREF(__pyx_tuple__2);
+
+  /* "landlab/graph/cfuncs.pyx":71
+ * 
+ * @cython.boundscheck(False)
+ * def _find_links_at_node(DTYPE_t node,             # <<<<<<<<<<<<<<
+ *                         np.ndarray[DTYPE_t, ndim=2] nodes_at_link,
+ *                         np.ndarray[DTYPE_t, ndim=1] links_at_node,
+ */
+  __pyx_tuple__3 = PyTuple_Pack(8, __pyx_n_s_node, __pyx_n_s_nodes_at_link, __pyx_n_s_links_at_node, __pyx_n_s_link_dirs_at_node, __pyx_n_s_link, __pyx_n_s_n_links_found, __pyx_n_s_max_links_at_node, __pyx_n_s_n_links); if (unlikely(!__pyx_tuple__3)) __PYX_ERR(0, 71, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_tuple__3);
+  __Pyx_GIVEREF(__pyx_tuple__3);
+  __pyx_codeobj__4 = (PyObject*)__Pyx_PyCode_New(4, 0, 8, 0, CO_OPTIMIZED|CO_NEWLOCALS, __pyx_empty_bytes, __pyx_empty_tuple, __pyx_empty_tuple, __pyx_tuple__3, __pyx_empty_tuple, __pyx_empty_tuple, __pyx_kp_s_landlab_graph_cfuncs_pyx, __pyx_n_s_find_links_at_node, 71, __pyx_empty_bytes); if (unlikely(!__pyx_codeobj__4)) __PYX_ERR(0, 71, __pyx_L1_error)
+
+  /* "landlab/graph/cfuncs.pyx":114
+ * 
+ * @cython.boundscheck(False)
+ * def _setup_links_at_node(np.ndarray[DTYPE_t, ndim=2] nodes_at_link,             # <<<<<<<<<<<<<<
+ *                          np.ndarray[DTYPE_t, ndim=2] links_at_node,
+ *                          np.ndarray[DTYPE_t, ndim=2] link_dirs_at_node):
+ */
+  __pyx_tuple__5 = PyTuple_Pack(5, __pyx_n_s_nodes_at_link, __pyx_n_s_links_at_node, __pyx_n_s_link_dirs_at_node, __pyx_n_s_node, __pyx_n_s_n_nodes); if (unlikely(!__pyx_tuple__5)) __PYX_ERR(0, 114, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_tuple__5);
+  __Pyx_GIVEREF(__pyx_tuple__5);
+  __pyx_codeobj__6 = (PyObject*)__Pyx_PyCode_New(3, 0, 5, 0, CO_OPTIMIZED|CO_NEWLOCALS, __pyx_empty_bytes, __pyx_empty_tuple, __pyx_empty_tuple, __pyx_tuple__5, __pyx_empty_tuple, __pyx_empty_tuple, __pyx_kp_s_landlab_graph_cfuncs_pyx, __pyx_n_s_setup_links_at_node, 114, __pyx_empty_bytes); if (unlikely(!__pyx_codeobj__6)) __PYX_ERR(0, 114, __pyx_L1_error)
+
+  /* "landlab/graph/cfuncs.pyx":128
+ * 
+ * @cython.boundscheck(False)
+ * def _setup_node_at_cell(shape,             # <<<<<<<<<<<<<<
+ *                         np.ndarray[DTYPE_t, ndim=1] node_at_cell):
+ *   cdef int cell
+ */
+  __pyx_tuple__7 = PyTuple_Pack(9, __pyx_n_s_shape, __pyx_n_s_node_at_cell, __pyx_n_s_cell, __pyx_n_s_cell_rows, __pyx_n_s_cell_cols, __pyx_n_s_node_cols, __pyx_n_s_row_offset, __pyx_n_s_row, __pyx_n_s_col); if (unlikely(!__pyx_tuple__7)) __PYX_ERR(0, 128, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_tuple__7);
+  __Pyx_GIVEREF(__pyx_tuple__7);
+  __pyx_codeobj__8 = (PyObject*)__Pyx_PyCode_New(2, 0, 9, 0, CO_OPTIMIZED|CO_NEWLOCALS, __pyx_empty_bytes, __pyx_empty_tuple, __pyx_empty_tuple, __pyx_tuple__7, __pyx_empty_tuple, __pyx_empty_tuple, __pyx_kp_s_landlab_graph_cfuncs_pyx, __pyx_n_s_setup_node_at_cell, 128, __pyx_empty_bytes); if (unlikely(!__pyx_codeobj__8)) __PYX_ERR(0, 128, __pyx_L1_error)
+
+  /* "landlab/graph/cfuncs.pyx":149
+ * 
+ * @cython.boundscheck(False)
+ * def _remap_nodes_at_link(np.ndarray[DTYPE_t, ndim=2] nodes_at_link,             # <<<<<<<<<<<<<<
+ *                          np.ndarray[DTYPE_t, ndim=1] new_nodes):
+ *   cdef int link
+ */
+  __pyx_tuple__9 = PyTuple_Pack(4, __pyx_n_s_nodes_at_link, __pyx_n_s_new_nodes, __pyx_n_s_link, __pyx_n_s_n_links); if (unlikely(!__pyx_tuple__9)) __PYX_ERR(0, 149, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_tuple__9);
+  __Pyx_GIVEREF(__pyx_tuple__9);
+  __pyx_codeobj__10 = (PyObject*)__Pyx_PyCode_New(2, 0, 4, 0, CO_OPTIMIZED|CO_NEWLOCALS, __pyx_empty_bytes, __pyx_empty_tuple, __pyx_empty_tuple, __pyx_tuple__9, __pyx_empty_tuple, __pyx_empty_tuple, __pyx_kp_s_landlab_graph_cfuncs_pyx, __pyx_n_s_remap_nodes_at_link, 149, __pyx_empty_bytes); if (unlikely(!__pyx_codeobj__10)) __PYX_ERR(0, 149, __pyx_L1_error)
+
+  /* "landlab/graph/cfuncs.pyx":160
+ * 
+ * @cython.boundscheck(False)
+ * def _remap_links_at_patch(np.ndarray[DTYPE_t, ndim=1] links_at_patch,             # <<<<<<<<<<<<<<
+ *                           np.ndarray[DTYPE_t, ndim=1] new_links):
+ *     cdef int link
+ */
+  __pyx_tuple__11 = PyTuple_Pack(4, __pyx_n_s_links_at_patch, __pyx_n_s_new_links, __pyx_n_s_link, __pyx_n_s_n_links); if (unlikely(!__pyx_tuple__11)) __PYX_ERR(0, 160, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_tuple__11);
+  __Pyx_GIVEREF(__pyx_tuple__11);
+  __pyx_codeobj__12 = (PyObject*)__Pyx_PyCode_New(2, 0, 4, 0, CO_OPTIMIZED|CO_NEWLOCALS, __pyx_empty_bytes, __pyx_empty_tuple, __pyx_empty_tuple, __pyx_tuple__11, __pyx_empty_tuple, __pyx_empty_tuple, __pyx_kp_s_landlab_graph_cfuncs_pyx, __pyx_n_s_remap_links_at_patch, 160, __pyx_empty_bytes); if (unlikely(!__pyx_codeobj__12)) __PYX_ERR(0, 160, __pyx_L1_error)
+
+  /* "landlab/graph/cfuncs.pyx":170
+ * 
+ * @cython.boundscheck(False)
+ * def _calc_center_of_patch(np.ndarray[DTYPE_t, ndim=1] links_at_patch,             # <<<<<<<<<<<<<<
+ *                           np.ndarray[DTYPE_t, ndim=1] offset_to_patch,
+ *                           np.ndarray[np.float_t, ndim=2] xy_at_link,
+ */
+  __pyx_tuple__13 = PyTuple_Pack(12, __pyx_n_s_links_at_patch, __pyx_n_s_offset_to_patch, __pyx_n_s_xy_at_link, __pyx_n_s_xy_at_patch, __pyx_n_s_patch, __pyx_n_s_link, __pyx_n_s_i, __pyx_n_s_offset, __pyx_n_s_n_links, __pyx_n_s_n_patches, __pyx_n_s_x, __pyx_n_s_y); if (unlikely(!__pyx_tuple__13)) __PYX_ERR(0, 170, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_tuple__13);
+  __Pyx_GIVEREF(__pyx_tuple__13);
+  __pyx_codeobj__14 = (PyObject*)__Pyx_PyCode_New(4, 0, 12, 0, CO_OPTIMIZED|CO_NEWLOCALS, __pyx_empty_bytes, __pyx_empty_tuple, __pyx_empty_tuple, __pyx_tuple__13, __pyx_empty_tuple, __pyx_empty_tuple, __pyx_kp_s_landlab_graph_cfuncs_pyx, __pyx_n_s_calc_center_of_patch, 170, __pyx_empty_bytes); if (unlikely(!__pyx_codeobj__14)) __PYX_ERR(0, 170, __pyx_L1_error)
+
+  /* "landlab/graph/cfuncs.pyx":197
+ * 
+ * @cython.boundscheck(False)
+ * def _resort_patches(np.ndarray[DTYPE_t, ndim=1] links_at_patch,             # <<<<<<<<<<<<<<
+ *                     np.ndarray[DTYPE_t, ndim=1] offset_to_patch,
+ *                     np.ndarray[DTYPE_t, ndim=1] sorted_patches):
+ */
+  __pyx_tuple__15 = PyTuple_Pack(10, __pyx_n_s_links_at_patch, __pyx_n_s_offset_to_patch, __pyx_n_s_sorted_patches, __pyx_n_s_i, __pyx_n_s_patch, __pyx_n_s_offset, __pyx_n_s_n_links, __pyx_n_s_n_patches, __pyx_n_s_new_offset, __pyx_n_s_new_patches); if (unlikely(!__pyx_tuple__15)) __PYX_ERR(0, 197, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_tuple__15);
+  __Pyx_GIVEREF(__pyx_tuple__15);
+  __pyx_codeobj__16 = (PyObject*)__Pyx_PyCode_New(3, 0, 10, 0, CO_OPTIMIZED|CO_NEWLOCALS, __pyx_empty_bytes, __pyx_empty_tuple, __pyx_empty_tuple, __pyx_tuple__15, __pyx_empty_tuple, __pyx_empty_tuple, __pyx_kp_s_landlab_graph_cfuncs_pyx, __pyx_n_s_resort_patches, 197, __pyx_empty_bytes); if (unlikely(!__pyx_codeobj__16)) __PYX_ERR(0, 197, __pyx_L1_error)
+
+  /* "landlab/graph/cfuncs.pyx":228
+ * 
+ * @cython.boundscheck(False)
+ * def _setup_links_at_patch(np.ndarray[DTYPE_t, ndim=1] links_at_patch,             # <<<<<<<<<<<<<<
+ *                           np.ndarray[DTYPE_t, ndim=1] offset_to_patch,
+ *                           np.ndarray[DTYPE_t, ndim=2] out):
+ */
+  __pyx_tuple__17 = PyTuple_Pack(9, __pyx_n_s_links_at_patch, __pyx_n_s_offset_to_patch, __pyx_n_s_out, __pyx_n_s_i, __pyx_n_s_link, __pyx_n_s_patch, __pyx_n_s_offset, __pyx_n_s_n_links, __pyx_n_s_n_patches); if (unlikely(!__pyx_tuple__17)) __PYX_ERR(0, 228, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_tuple__17);
+  __Pyx_GIVEREF(__pyx_tuple__17);
+  __pyx_codeobj__18 = (PyObject*)__Pyx_PyCode_New(3, 0, 9, 0, CO_OPTIMIZED|CO_NEWLOCALS, __pyx_empty_bytes, __pyx_empty_tuple, __pyx_empty_tuple, __pyx_tuple__17, __pyx_empty_tuple, __pyx_empty_tuple, __pyx_kp_s_landlab_graph_cfuncs_pyx, __pyx_n_s_setup_links_at_patch, 228, __pyx_empty_bytes); if (unlikely(!__pyx_codeobj__18)) __PYX_ERR(0, 228, __pyx_L1_error)
+
+  /* "landlab/graph/cfuncs.pyx":249
+ * 
+ * @cython.boundscheck(False)
+ * def _reorder_links_at_node(np.ndarray[DTYPE_t, ndim=2] links_at_node,             # <<<<<<<<<<<<<<
+ *                            np.ndarray[DTYPE_t, ndim=2] sorted_links):
+ *     cdef int n_nodes = links_at_node.shape[0]
+ */
+  __pyx_tuple__19 = PyTuple_Pack(7, __pyx_n_s_links_at_node, __pyx_n_s_sorted_links, __pyx_n_s_n_nodes, __pyx_n_s_n_links_per_node, __pyx_n_s_i, __pyx_n_s_node, __pyx_n_s_buffer); if (unlikely(!__pyx_tuple__19)) __PYX_ERR(0, 249, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_tuple__19);
+  __Pyx_GIVEREF(__pyx_tuple__19);
+  __pyx_codeobj__20 = (PyObject*)__Pyx_PyCode_New(2, 0, 7, 0, CO_OPTIMIZED|CO_NEWLOCALS, __pyx_empty_bytes, __pyx_empty_tuple, __pyx_empty_tuple, __pyx_tuple__19, __pyx_empty_tuple, __pyx_empty_tuple, __pyx_kp_s_landlab_graph_cfuncs_pyx, __pyx_n_s_reorder_links_at_node, 249, __pyx_empty_bytes); if (unlikely(!__pyx_codeobj__20)) __PYX_ERR(0, 249, __pyx_L1_error)
+
+  /* "landlab/graph/cfuncs.pyx":347
+ * 
+ * @cython.boundscheck(False)
+ * def reorder_links_at_patch(np.ndarray[DTYPE_t, ndim=1] links_at_patch,             # <<<<<<<<<<<<<<
+ *                            np.ndarray[DTYPE_t, ndim=1] offset_to_patch,
+ *                            np.ndarray[np.float_t, ndim=2] xy_of_link):
+ */
+  __pyx_tuple__21 = PyTuple_Pack(13, __pyx_n_s_links_at_patch, __pyx_n_s_offset_to_patch, __pyx_n_s_xy_of_link, __pyx_n_s_n_links, __pyx_n_s_n_patches, __pyx_n_s_link, __pyx_n_s_patch, __pyx_n_s_offset, __pyx_n_s_i, __pyx_n_s_angles, __pyx_n_s_points, __pyx_n_s_ordered, __pyx_n_s_link_buffer); if (unlikely(!__pyx_tuple__21)) __PYX_ERR(0, 347, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_tuple__21);
+  __Pyx_GIVEREF(__pyx_tuple__21);
+  __pyx_codeobj__22 = (PyObject*)__Pyx_PyCode_New(3, 0, 13, 0, CO_OPTIMIZED|CO_NEWLOCALS, __pyx_empty_bytes, __pyx_empty_tuple, __pyx_empty_tuple, __pyx_tuple__21, __pyx_empty_tuple, __pyx_empty_tuple, __pyx_kp_s_landlab_graph_cfuncs_pyx, __pyx_n_s_reorder_links_at_patch, 347, __pyx_empty_bytes); if (unlikely(!__pyx_codeobj__22)) __PYX_ERR(0, 347, __pyx_L1_error)
+
+  /* "landlab/graph/cfuncs.pyx":387
+ * 
+ * @cython.boundscheck(False)
+ * def sort_spokes_at_wheel(np.ndarray[int, ndim=1] spokes_at_wheel,             # <<<<<<<<<<<<<<
+ *                          np.ndarray[int, ndim=1] offset_to_wheel,
+ *                          np.ndarray[double, ndim=2] xy_of_hub,
+ */
+  __pyx_tuple__23 = PyTuple_Pack(8, __pyx_n_s_spokes_at_wheel, __pyx_n_s_offset_to_wheel, __pyx_n_s_xy_of_hub, __pyx_n_s_xy_of_spoke, __pyx_n_s_n_wheels, __pyx_n_s_i, __pyx_n_s_n_spokes, __pyx_n_s_wheel); if (unlikely(!__pyx_tuple__23)) __PYX_ERR(0, 387, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_tuple__23);
+  __Pyx_GIVEREF(__pyx_tuple__23);
+  __pyx_codeobj__24 = (PyObject*)__Pyx_PyCode_New(4, 0, 8, 0, CO_OPTIMIZED|CO_NEWLOCALS, __pyx_empty_bytes, __pyx_empty_tuple, __pyx_empty_tuple, __pyx_tuple__23, __pyx_empty_tuple, __pyx_empty_tuple, __pyx_kp_s_landlab_graph_cfuncs_pyx, __pyx_n_s_sort_spokes_at_wheel, 387, __pyx_empty_bytes); if (unlikely(!__pyx_codeobj__24)) __PYX_ERR(0, 387, __pyx_L1_error)
+
+  /* "landlab/graph/cfuncs.pyx":420
+ * 
+ * @cython.boundscheck(False)
+ * def argsort_spoke_angles(np.ndarray[double, ndim=2, mode="c"] points,             # <<<<<<<<<<<<<<
+ *                          np.ndarray[double, ndim=1, mode="c"] hub,
+ *                          np.ndarray[int, ndim=1] out):
+ */
+  __pyx_tuple__25 = PyTuple_Pack(5, __pyx_n_s_points, __pyx_n_s_hub, __pyx_n_s_out, __pyx_n_s_n_points, __pyx_n_s_angles); if (unlikely(!__pyx_tuple__25)) __PYX_ERR(0, 420, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_tuple__25);
+  __Pyx_GIVEREF(__pyx_tuple__25);
+  __pyx_codeobj__26 = (PyObject*)__Pyx_PyCode_New(3, 0, 5, 0, CO_OPTIMIZED|CO_NEWLOCALS, __pyx_empty_bytes, __pyx_empty_tuple, __pyx_empty_tuple, __pyx_tuple__25, __pyx_empty_tuple, __pyx_empty_tuple, __pyx_kp_s_landlab_graph_cfuncs_pyx, __pyx_n_s_argsort_spoke_angles, 420, __pyx_empty_bytes); if (unlikely(!__pyx_codeobj__26)) __PYX_ERR(0, 420, __pyx_L1_error)
+  __Pyx_RefNannyFinishContext();
+  return 0;
+  __pyx_L1_error:;
+  __Pyx_RefNannyFinishContext();
+  return -1;
+}
+
+static CYTHON_SMALL_CODE int __Pyx_InitGlobals(void) {
+  if (__Pyx_InitStrings(__pyx_string_tab) < 0) __PYX_ERR(0, 1, __pyx_L1_error)
+  __pyx_float_2_ = PyFloat_FromDouble(2.); if (unlikely(!__pyx_float_2_)) __PYX_ERR(0, 1, __pyx_L1_error)
+  __pyx_int_1 = PyInt_FromLong(1); if (unlikely(!__pyx_int_1)) __PYX_ERR(0, 1, __pyx_L1_error)
+  __pyx_int_2 = PyInt_FromLong(2); if (unlikely(!__pyx_int_2)) __PYX_ERR(0, 1, __pyx_L1_error)
+  return 0;
+  __pyx_L1_error:;
+  return -1;
+}
+
+static CYTHON_SMALL_CODE int __Pyx_modinit_global_init_code(void); /*proto*/
+static CYTHON_SMALL_CODE int __Pyx_modinit_variable_export_code(void); /*proto*/
+static CYTHON_SMALL_CODE int __Pyx_modinit_function_export_code(void); /*proto*/
+static CYTHON_SMALL_CODE int __Pyx_modinit_type_init_code(void); /*proto*/
+static CYTHON_SMALL_CODE int __Pyx_modinit_type_import_code(void); /*proto*/
+static CYTHON_SMALL_CODE int __Pyx_modinit_variable_import_code(void); /*proto*/
+static CYTHON_SMALL_CODE int __Pyx_modinit_function_import_code(void); /*proto*/
+
+static int __Pyx_modinit_global_init_code(void) {
+  __Pyx_RefNannyDeclarations
+  __Pyx_RefNannySetupContext("__Pyx_modinit_global_init_code", 0);
+  /*--- Global init code ---*/
+  __Pyx_RefNannyFinishContext();
+  return 0;
+}
+
+static int __Pyx_modinit_variable_export_code(void) {
+  __Pyx_RefNannyDeclarations
+  __Pyx_RefNannySetupContext("__Pyx_modinit_variable_export_code", 0);
+  /*--- Variable export code ---*/
+  __Pyx_RefNannyFinishContext();
+  return 0;
+}
+
+static int __Pyx_modinit_function_export_code(void) {
+  __Pyx_RefNannyDeclarations
+  __Pyx_RefNannySetupContext("__Pyx_modinit_function_export_code", 0);
+  /*--- Function export code ---*/
+  __Pyx_RefNannyFinishContext();
+  return 0;
+}
+
+static int __Pyx_modinit_type_init_code(void) {
+  __Pyx_RefNannyDeclarations
+  __Pyx_RefNannySetupContext("__Pyx_modinit_type_init_code", 0);
+  /*--- Type init code ---*/
+  __Pyx_RefNannyFinishContext();
+  return 0;
+}
+
+static int __Pyx_modinit_type_import_code(void) {
+  __Pyx_RefNannyDeclarations
+  PyObject *__pyx_t_1 = NULL;
+  int __pyx_lineno = 0;
+  const char *__pyx_filename = NULL;
+  int __pyx_clineno = 0;
+  __Pyx_RefNannySetupContext("__Pyx_modinit_type_import_code", 0);
+  /*--- Type import code ---*/
+  __pyx_t_1 = PyImport_ImportModule(__Pyx_BUILTIN_MODULE_NAME); if (unlikely(!__pyx_t_1)) __PYX_ERR(2, 9, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_1);
+  __pyx_ptype_7cpython_4type_type = __Pyx_ImportType_0_29_37(__pyx_t_1, __Pyx_BUILTIN_MODULE_NAME, "type", 
+  #if defined(PYPY_VERSION_NUM) && PYPY_VERSION_NUM < 0x050B0000
+  sizeof(PyTypeObject), __PYX_GET_STRUCT_ALIGNMENT_0_29_37(PyTypeObject),
+  #else
+  sizeof(PyHeapTypeObject), __PYX_GET_STRUCT_ALIGNMENT_0_29_37(PyHeapTypeObject),
+  #endif
+  __Pyx_ImportType_CheckSize_Warn_0_29_37); if (!__pyx_ptype_7cpython_4type_type) __PYX_ERR(2, 9, __pyx_L1_error)
+  __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
+  __pyx_t_1 = PyImport_ImportModule("numpy"); if (unlikely(!__pyx_t_1)) __PYX_ERR(1, 199, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_1);
+  __pyx_ptype_5numpy_dtype = __Pyx_ImportType_0_29_37(__pyx_t_1, "numpy", "dtype", sizeof(PyArray_Descr), __PYX_GET_STRUCT_ALIGNMENT_0_29_37(PyArray_Descr),__Pyx_ImportType_CheckSize_Ignore_0_29_37); if (!__pyx_ptype_5numpy_dtype) __PYX_ERR(1, 199, __pyx_L1_error)
+  __pyx_ptype_5numpy_flatiter = __Pyx_ImportType_0_29_37(__pyx_t_1, "numpy", "flatiter", sizeof(PyArrayIterObject), __PYX_GET_STRUCT_ALIGNMENT_0_29_37(PyArrayIterObject),__Pyx_ImportType_CheckSize_Ignore_0_29_37); if (!__pyx_ptype_5numpy_flatiter) __PYX_ERR(1, 222, __pyx_L1_error)
+  __pyx_ptype_5numpy_broadcast = __Pyx_ImportType_0_29_37(__pyx_t_1, "numpy", "broadcast", sizeof(PyArrayMultiIterObject), __PYX_GET_STRUCT_ALIGNMENT_0_29_37(PyArrayMultiIterObject),__Pyx_ImportType_CheckSize_Ignore_0_29_37); if (!__pyx_ptype_5numpy_broadcast) __PYX_ERR(1, 226, __pyx_L1_error)
+  __pyx_ptype_5numpy_ndarray = __Pyx_ImportType_0_29_37(__pyx_t_1, "numpy", "ndarray", sizeof(PyArrayObject), __PYX_GET_STRUCT_ALIGNMENT_0_29_37(PyArrayObject),__Pyx_ImportType_CheckSize_Ignore_0_29_37); if (!__pyx_ptype_5numpy_ndarray) __PYX_ERR(1, 238, __pyx_L1_error)
+  __pyx_ptype_5numpy_ufunc = __Pyx_ImportType_0_29_37(__pyx_t_1, "numpy", "ufunc", sizeof(PyUFuncObject), __PYX_GET_STRUCT_ALIGNMENT_0_29_37(PyUFuncObject),__Pyx_ImportType_CheckSize_Ignore_0_29_37); if (!__pyx_ptype_5numpy_ufunc) __PYX_ERR(1, 764, __pyx_L1_error)
+  __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
+  __Pyx_RefNannyFinishContext();
+  return 0;
+  __pyx_L1_error:;
+  __Pyx_XDECREF(__pyx_t_1);
+  __Pyx_RefNannyFinishContext();
+  return -1;
+}
+
+static int __Pyx_modinit_variable_import_code(void) {
+  __Pyx_RefNannyDeclarations
+  __Pyx_RefNannySetupContext("__Pyx_modinit_variable_import_code", 0);
+  /*--- Variable import code ---*/
+  __Pyx_RefNannyFinishContext();
+  return 0;
+}
+
+static int __Pyx_modinit_function_import_code(void) {
+  __Pyx_RefNannyDeclarations
+  __Pyx_RefNannySetupContext("__Pyx_modinit_function_import_code", 0);
+  /*--- Function import code ---*/
+  __Pyx_RefNannyFinishContext();
+  return 0;
+}
+
+
+#ifndef CYTHON_NO_PYINIT_EXPORT
+#define __Pyx_PyMODINIT_FUNC PyMODINIT_FUNC
+#elif PY_MAJOR_VERSION < 3
+#ifdef __cplusplus
+#define __Pyx_PyMODINIT_FUNC extern "C" void
+#else
+#define __Pyx_PyMODINIT_FUNC void
+#endif
+#else
+#ifdef __cplusplus
+#define __Pyx_PyMODINIT_FUNC extern "C" PyObject *
+#else
+#define __Pyx_PyMODINIT_FUNC PyObject *
+#endif
+#endif
+
+
+#if PY_MAJOR_VERSION < 3
+__Pyx_PyMODINIT_FUNC initcfuncs(void) CYTHON_SMALL_CODE; /*proto*/
+__Pyx_PyMODINIT_FUNC initcfuncs(void)
+#else
+__Pyx_PyMODINIT_FUNC PyInit_cfuncs(void) CYTHON_SMALL_CODE; /*proto*/
+__Pyx_PyMODINIT_FUNC PyInit_cfuncs(void)
+#if CYTHON_PEP489_MULTI_PHASE_INIT
+{
+  return PyModuleDef_Init(&__pyx_moduledef);
+}
+static CYTHON_SMALL_CODE int __Pyx_check_single_interpreter(void) {
+    #if PY_VERSION_HEX >= 0x030700A1
+    static PY_INT64_T main_interpreter_id = -1;
+    PY_INT64_T current_id = PyInterpreterState_GetID(PyThreadState_Get()->interp);
+    if (main_interpreter_id == -1) {
+        main_interpreter_id = current_id;
+        return (unlikely(current_id == -1)) ? -1 : 0;
+    } else if (unlikely(main_interpreter_id != current_id))
+    #else
+    static PyInterpreterState *main_interpreter = NULL;
+    PyInterpreterState *current_interpreter = PyThreadState_Get()->interp;
+    if (!main_interpreter) {
+        main_interpreter = current_interpreter;
+    } else if (unlikely(main_interpreter != current_interpreter))
+    #endif
+    {
+        PyErr_SetString(
+            PyExc_ImportError,
+            "Interpreter change detected - this module can only be loaded into one interpreter per process.");
+        return -1;
+    }
+    return 0;
+}
+static CYTHON_SMALL_CODE int __Pyx_copy_spec_to_module(PyObject *spec, PyObject *moddict, const char* from_name, const char* to_name, int allow_none) {
+    PyObject *value = PyObject_GetAttrString(spec, from_name);
+    int result = 0;
+    if (likely(value)) {
+        if (allow_none || value != Py_None) {
+            result = PyDict_SetItemString(moddict, to_name, value);
+        }
+        Py_DECREF(value);
+    } else if (PyErr_ExceptionMatches(PyExc_AttributeError)) {
+        PyErr_Clear();
+    } else {
+        result = -1;
+    }
+    return result;
+}
+static CYTHON_SMALL_CODE PyObject* __pyx_pymod_create(PyObject *spec, CYTHON_UNUSED PyModuleDef *def) {
+    PyObject *module = NULL, *moddict, *modname;
+    if (__Pyx_check_single_interpreter())
+        return NULL;
+    if (__pyx_m)
+        return __Pyx_NewRef(__pyx_m);
+    modname = PyObject_GetAttrString(spec, "name");
+    if (unlikely(!modname)) goto bad;
+    module = PyModule_NewObject(modname);
+    Py_DECREF(modname);
+    if (unlikely(!module)) goto bad;
+    moddict = PyModule_GetDict(module);
+    if (unlikely(!moddict)) goto bad;
+    if (unlikely(__Pyx_copy_spec_to_module(spec, moddict, "loader", "__loader__", 1) < 0)) goto bad;
+    if (unlikely(__Pyx_copy_spec_to_module(spec, moddict, "origin", "__file__", 1) < 0)) goto bad;
+    if (unlikely(__Pyx_copy_spec_to_module(spec, moddict, "parent", "__package__", 1) < 0)) goto bad;
+    if (unlikely(__Pyx_copy_spec_to_module(spec, moddict, "submodule_search_locations", "__path__", 0) < 0)) goto bad;
+    return module;
+bad:
+    Py_XDECREF(module);
+    return NULL;
+}
+
+
+static CYTHON_SMALL_CODE int __pyx_pymod_exec_cfuncs(PyObject *__pyx_pyinit_module)
+#endif
+#endif
+{
+  PyObject *__pyx_t_1 = NULL;
+  PyObject *__pyx_t_2 = NULL;
+  int __pyx_lineno = 0;
+  const char *__pyx_filename = NULL;
+  int __pyx_clineno = 0;
+  __Pyx_RefNannyDeclarations
+  #if CYTHON_PEP489_MULTI_PHASE_INIT
+  if (__pyx_m) {
+    if (__pyx_m == __pyx_pyinit_module) return 0;
+    PyErr_SetString(PyExc_RuntimeError, "Module 'cfuncs' has already been imported. Re-initialisation is not supported.");
+    return -1;
+  }
+  #elif PY_MAJOR_VERSION >= 3
+  if (__pyx_m) return __Pyx_NewRef(__pyx_m);
+  #endif
+  #if CYTHON_REFNANNY
+__Pyx_RefNanny = __Pyx_RefNannyImportAPI("refnanny");
+if (!__Pyx_RefNanny) {
+  PyErr_Clear();
+  __Pyx_RefNanny = __Pyx_RefNannyImportAPI("Cython.Runtime.refnanny");
+  if (!__Pyx_RefNanny)
+      Py_FatalError("failed to import 'refnanny' module");
+}
+#endif
+  __Pyx_RefNannySetupContext("__Pyx_PyMODINIT_FUNC PyInit_cfuncs(void)", 0);
+  if (__Pyx_check_binary_version() < 0) __PYX_ERR(0, 1, __pyx_L1_error)
+  #ifdef __Pxy_PyFrame_Initialize_Offsets
+  __Pxy_PyFrame_Initialize_Offsets();
+  #endif
+  __pyx_empty_tuple = PyTuple_New(0); if (unlikely(!__pyx_empty_tuple)) __PYX_ERR(0, 1, __pyx_L1_error)
+  __pyx_empty_bytes = PyBytes_FromStringAndSize("", 0); if (unlikely(!__pyx_empty_bytes)) __PYX_ERR(0, 1, __pyx_L1_error)
+  __pyx_empty_unicode = PyUnicode_FromStringAndSize("", 0); if (unlikely(!__pyx_empty_unicode)) __PYX_ERR(0, 1, __pyx_L1_error)
+  #ifdef __Pyx_CyFunction_USED
+  if (__pyx_CyFunction_init() < 0) __PYX_ERR(0, 1, __pyx_L1_error)
+  #endif
+  #ifdef __Pyx_FusedFunction_USED
+  if (__pyx_FusedFunction_init() < 0) __PYX_ERR(0, 1, __pyx_L1_error)
+  #endif
+  #ifdef __Pyx_Coroutine_USED
+  if (__pyx_Coroutine_init() < 0) __PYX_ERR(0, 1, __pyx_L1_error)
+  #endif
+  #ifdef __Pyx_Generator_USED
+  if (__pyx_Generator_init() < 0) __PYX_ERR(0, 1, __pyx_L1_error)
+  #endif
+  #ifdef __Pyx_AsyncGen_USED
+  if (__pyx_AsyncGen_init() < 0) __PYX_ERR(0, 1, __pyx_L1_error)
+  #endif
+  #ifdef __Pyx_StopAsyncIteration_USED
+  if (__pyx_StopAsyncIteration_init() < 0) __PYX_ERR(0, 1, __pyx_L1_error)
+  #endif
+  /*--- Library function declarations ---*/
+  /*--- Threads initialization code ---*/
+  #if defined(WITH_THREAD) && PY_VERSION_HEX < 0x030700F0 && defined(__PYX_FORCE_INIT_THREADS) && __PYX_FORCE_INIT_THREADS
+  PyEval_InitThreads();
+  #endif
+  /*--- Module creation code ---*/
+  #if CYTHON_PEP489_MULTI_PHASE_INIT
+  __pyx_m = __pyx_pyinit_module;
+  Py_INCREF(__pyx_m);
+  #else
+  #if PY_MAJOR_VERSION < 3
+  __pyx_m = Py_InitModule4("cfuncs", __pyx_methods, 0, 0, PYTHON_API_VERSION); Py_XINCREF(__pyx_m);
+  #else
+  __pyx_m = PyModule_Create(&__pyx_moduledef);
+  #endif
+  if (unlikely(!__pyx_m)) __PYX_ERR(0, 1, __pyx_L1_error)
+  #endif
+  __pyx_d = PyModule_GetDict(__pyx_m); if (unlikely(!__pyx_d)) __PYX_ERR(0, 1, __pyx_L1_error)
+  Py_INCREF(__pyx_d);
+  __pyx_b = PyImport_AddModule(__Pyx_BUILTIN_MODULE_NAME); if (unlikely(!__pyx_b)) __PYX_ERR(0, 1, __pyx_L1_error)
+  Py_INCREF(__pyx_b);
+  __pyx_cython_runtime = PyImport_AddModule((char *) "cython_runtime"); if (unlikely(!__pyx_cython_runtime)) __PYX_ERR(0, 1, __pyx_L1_error)
+  Py_INCREF(__pyx_cython_runtime);
+  if (PyObject_SetAttrString(__pyx_m, "__builtins__", __pyx_b) < 0) __PYX_ERR(0, 1, __pyx_L1_error)
+  /*--- Initialize various global constants etc. ---*/
+  if (__Pyx_InitGlobals() < 0) __PYX_ERR(0, 1, __pyx_L1_error)
+  #if PY_MAJOR_VERSION < 3 && (__PYX_DEFAULT_STRING_ENCODING_IS_ASCII || __PYX_DEFAULT_STRING_ENCODING_IS_DEFAULT)
+  if (__Pyx_init_sys_getdefaultencoding_params() < 0) __PYX_ERR(0, 1, __pyx_L1_error)
+  #endif
+  if (__pyx_module_is_main_landlab__graph__cfuncs) {
+    if (PyObject_SetAttr(__pyx_m, __pyx_n_s_name, __pyx_n_s_main) < 0) __PYX_ERR(0, 1, __pyx_L1_error)
+  }
+  #if PY_MAJOR_VERSION >= 3
+  {
+    PyObject *modules = PyImport_GetModuleDict(); if (unlikely(!modules)) __PYX_ERR(0, 1, __pyx_L1_error)
+    if (!PyDict_GetItemString(modules, "landlab.graph.cfuncs")) {
+      if (unlikely(PyDict_SetItemString(modules, "landlab.graph.cfuncs", __pyx_m) < 0)) __PYX_ERR(0, 1, __pyx_L1_error)
+    }
+  }
+  #endif
+  /*--- Builtin init code ---*/
+  if (__Pyx_InitCachedBuiltins() < 0) __PYX_ERR(0, 1, __pyx_L1_error)
+  /*--- Constants init code ---*/
+  if (__Pyx_InitCachedConstants() < 0) __PYX_ERR(0, 1, __pyx_L1_error)
+  /*--- Global type/function init code ---*/
+  (void)__Pyx_modinit_global_init_code();
+  (void)__Pyx_modinit_variable_export_code();
+  (void)__Pyx_modinit_function_export_code();
+  (void)__Pyx_modinit_type_init_code();
+  if (unlikely(__Pyx_modinit_type_import_code() < 0)) __PYX_ERR(0, 1, __pyx_L1_error)
+  (void)__Pyx_modinit_variable_import_code();
+  (void)__Pyx_modinit_function_import_code();
+  /*--- Execution code ---*/
+  #if defined(__Pyx_Generator_USED) || defined(__Pyx_Coroutine_USED)
+  if (__Pyx_patch_abc() < 0) __PYX_ERR(0, 1, __pyx_L1_error)
+  #endif
+
+  /* "landlab/graph/cfuncs.pyx":1
+ * import numpy as np             # <<<<<<<<<<<<<<
+ * cimport numpy as np
+ * cimport cython
+ */
+  __pyx_t_1 = __Pyx_Import(__pyx_n_s_numpy, 0, -1); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 1, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_1);
+  if (PyDict_SetItem(__pyx_d, __pyx_n_s_np, __pyx_t_1) < 0) __PYX_ERR(0, 1, __pyx_L1_error)
+  __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
+
+  /* "landlab/graph/cfuncs.pyx":9
+ * 
+ * 
+ * DTYPE = np.int             # <<<<<<<<<<<<<<
+ * ctypedef np.int_t DTYPE_t
+ * 
+ */
+  __Pyx_GetModuleGlobalName(__pyx_t_1, __pyx_n_s_np); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 9, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_1);
+  __pyx_t_2 = __Pyx_PyObject_GetAttrStr(__pyx_t_1, __pyx_n_s_int); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 9, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_2);
+  __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
+  if (PyDict_SetItem(__pyx_d, __pyx_n_s_DTYPE, __pyx_t_2) < 0) __PYX_ERR(0, 9, __pyx_L1_error)
+  __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
+
+  /* "landlab/graph/cfuncs.pyx":71
+ * 
+ * @cython.boundscheck(False)
+ * def _find_links_at_node(DTYPE_t node,             # <<<<<<<<<<<<<<
+ *                         np.ndarray[DTYPE_t, ndim=2] nodes_at_link,
+ *                         np.ndarray[DTYPE_t, ndim=1] links_at_node,
+ */
+  __pyx_t_2 = PyCFunction_NewEx(&__pyx_mdef_7landlab_5graph_6cfuncs_1_find_links_at_node, NULL, __pyx_n_s_landlab_graph_cfuncs); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 71, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_2);
+  if (PyDict_SetItem(__pyx_d, __pyx_n_s_find_links_at_node, __pyx_t_2) < 0) __PYX_ERR(0, 71, __pyx_L1_error)
+  __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
+
+  /* "landlab/graph/cfuncs.pyx":114
+ * 
+ * @cython.boundscheck(False)
+ * def _setup_links_at_node(np.ndarray[DTYPE_t, ndim=2] nodes_at_link,             # <<<<<<<<<<<<<<
+ *                          np.ndarray[DTYPE_t, ndim=2] links_at_node,
+ *                          np.ndarray[DTYPE_t, ndim=2] link_dirs_at_node):
+ */
+  __pyx_t_2 = PyCFunction_NewEx(&__pyx_mdef_7landlab_5graph_6cfuncs_3_setup_links_at_node, NULL, __pyx_n_s_landlab_graph_cfuncs); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 114, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_2);
+  if (PyDict_SetItem(__pyx_d, __pyx_n_s_setup_links_at_node, __pyx_t_2) < 0) __PYX_ERR(0, 114, __pyx_L1_error)
+  __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
+
+  /* "landlab/graph/cfuncs.pyx":128
+ * 
+ * @cython.boundscheck(False)
+ * def _setup_node_at_cell(shape,             # <<<<<<<<<<<<<<
+ *                         np.ndarray[DTYPE_t, ndim=1] node_at_cell):
+ *   cdef int cell
+ */
+  __pyx_t_2 = PyCFunction_NewEx(&__pyx_mdef_7landlab_5graph_6cfuncs_5_setup_node_at_cell, NULL, __pyx_n_s_landlab_graph_cfuncs); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 128, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_2);
+  if (PyDict_SetItem(__pyx_d, __pyx_n_s_setup_node_at_cell, __pyx_t_2) < 0) __PYX_ERR(0, 128, __pyx_L1_error)
+  __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
+
+  /* "landlab/graph/cfuncs.pyx":149
+ * 
+ * @cython.boundscheck(False)
+ * def _remap_nodes_at_link(np.ndarray[DTYPE_t, ndim=2] nodes_at_link,             # <<<<<<<<<<<<<<
+ *                          np.ndarray[DTYPE_t, ndim=1] new_nodes):
+ *   cdef int link
+ */
+  __pyx_t_2 = PyCFunction_NewEx(&__pyx_mdef_7landlab_5graph_6cfuncs_7_remap_nodes_at_link, NULL, __pyx_n_s_landlab_graph_cfuncs); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 149, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_2);
+  if (PyDict_SetItem(__pyx_d, __pyx_n_s_remap_nodes_at_link, __pyx_t_2) < 0) __PYX_ERR(0, 149, __pyx_L1_error)
+  __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
+
+  /* "landlab/graph/cfuncs.pyx":160
+ * 
+ * @cython.boundscheck(False)
+ * def _remap_links_at_patch(np.ndarray[DTYPE_t, ndim=1] links_at_patch,             # <<<<<<<<<<<<<<
+ *                           np.ndarray[DTYPE_t, ndim=1] new_links):
+ *     cdef int link
+ */
+  __pyx_t_2 = PyCFunction_NewEx(&__pyx_mdef_7landlab_5graph_6cfuncs_9_remap_links_at_patch, NULL, __pyx_n_s_landlab_graph_cfuncs); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 160, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_2);
+  if (PyDict_SetItem(__pyx_d, __pyx_n_s_remap_links_at_patch, __pyx_t_2) < 0) __PYX_ERR(0, 160, __pyx_L1_error)
+  __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
+
+  /* "landlab/graph/cfuncs.pyx":170
+ * 
+ * @cython.boundscheck(False)
+ * def _calc_center_of_patch(np.ndarray[DTYPE_t, ndim=1] links_at_patch,             # <<<<<<<<<<<<<<
+ *                           np.ndarray[DTYPE_t, ndim=1] offset_to_patch,
+ *                           np.ndarray[np.float_t, ndim=2] xy_at_link,
+ */
+  __pyx_t_2 = PyCFunction_NewEx(&__pyx_mdef_7landlab_5graph_6cfuncs_11_calc_center_of_patch, NULL, __pyx_n_s_landlab_graph_cfuncs); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 170, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_2);
+  if (PyDict_SetItem(__pyx_d, __pyx_n_s_calc_center_of_patch, __pyx_t_2) < 0) __PYX_ERR(0, 170, __pyx_L1_error)
+  __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
+
+  /* "landlab/graph/cfuncs.pyx":197
+ * 
+ * @cython.boundscheck(False)
+ * def _resort_patches(np.ndarray[DTYPE_t, ndim=1] links_at_patch,             # <<<<<<<<<<<<<<
+ *                     np.ndarray[DTYPE_t, ndim=1] offset_to_patch,
+ *                     np.ndarray[DTYPE_t, ndim=1] sorted_patches):
+ */
+  __pyx_t_2 = PyCFunction_NewEx(&__pyx_mdef_7landlab_5graph_6cfuncs_13_resort_patches, NULL, __pyx_n_s_landlab_graph_cfuncs); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 197, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_2);
+  if (PyDict_SetItem(__pyx_d, __pyx_n_s_resort_patches, __pyx_t_2) < 0) __PYX_ERR(0, 197, __pyx_L1_error)
+  __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
+
+  /* "landlab/graph/cfuncs.pyx":228
+ * 
+ * @cython.boundscheck(False)
+ * def _setup_links_at_patch(np.ndarray[DTYPE_t, ndim=1] links_at_patch,             # <<<<<<<<<<<<<<
+ *                           np.ndarray[DTYPE_t, ndim=1] offset_to_patch,
+ *                           np.ndarray[DTYPE_t, ndim=2] out):
+ */
+  __pyx_t_2 = PyCFunction_NewEx(&__pyx_mdef_7landlab_5graph_6cfuncs_15_setup_links_at_patch, NULL, __pyx_n_s_landlab_graph_cfuncs); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 228, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_2);
+  if (PyDict_SetItem(__pyx_d, __pyx_n_s_setup_links_at_patch, __pyx_t_2) < 0) __PYX_ERR(0, 228, __pyx_L1_error)
+  __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
+
+  /* "landlab/graph/cfuncs.pyx":249
+ * 
+ * @cython.boundscheck(False)
+ * def _reorder_links_at_node(np.ndarray[DTYPE_t, ndim=2] links_at_node,             # <<<<<<<<<<<<<<
+ *                            np.ndarray[DTYPE_t, ndim=2] sorted_links):
+ *     cdef int n_nodes = links_at_node.shape[0]
+ */
+  __pyx_t_2 = PyCFunction_NewEx(&__pyx_mdef_7landlab_5graph_6cfuncs_17_reorder_links_at_node, NULL, __pyx_n_s_landlab_graph_cfuncs); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 249, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_2);
+  if (PyDict_SetItem(__pyx_d, __pyx_n_s_reorder_links_at_node, __pyx_t_2) < 0) __PYX_ERR(0, 249, __pyx_L1_error)
+  __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
+
+  /* "landlab/graph/cfuncs.pyx":347
+ * 
+ * @cython.boundscheck(False)
+ * def reorder_links_at_patch(np.ndarray[DTYPE_t, ndim=1] links_at_patch,             # <<<<<<<<<<<<<<
+ *                            np.ndarray[DTYPE_t, ndim=1] offset_to_patch,
+ *                            np.ndarray[np.float_t, ndim=2] xy_of_link):
+ */
+  __pyx_t_2 = PyCFunction_NewEx(&__pyx_mdef_7landlab_5graph_6cfuncs_19reorder_links_at_patch, NULL, __pyx_n_s_landlab_graph_cfuncs); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 347, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_2);
+  if (PyDict_SetItem(__pyx_d, __pyx_n_s_reorder_links_at_patch, __pyx_t_2) < 0) __PYX_ERR(0, 347, __pyx_L1_error)
+  __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
+
+  /* "landlab/graph/cfuncs.pyx":387
+ * 
+ * @cython.boundscheck(False)
+ * def sort_spokes_at_wheel(np.ndarray[int, ndim=1] spokes_at_wheel,             # <<<<<<<<<<<<<<
+ *                          np.ndarray[int, ndim=1] offset_to_wheel,
+ *                          np.ndarray[double, ndim=2] xy_of_hub,
+ */
+  __pyx_t_2 = PyCFunction_NewEx(&__pyx_mdef_7landlab_5graph_6cfuncs_21sort_spokes_at_wheel, NULL, __pyx_n_s_landlab_graph_cfuncs); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 387, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_2);
+  if (PyDict_SetItem(__pyx_d, __pyx_n_s_sort_spokes_at_wheel, __pyx_t_2) < 0) __PYX_ERR(0, 387, __pyx_L1_error)
+  __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
+
+  /* "landlab/graph/cfuncs.pyx":420
+ * 
+ * @cython.boundscheck(False)
+ * def argsort_spoke_angles(np.ndarray[double, ndim=2, mode="c"] points,             # <<<<<<<<<<<<<<
+ *                          np.ndarray[double, ndim=1, mode="c"] hub,
+ *                          np.ndarray[int, ndim=1] out):
+ */
+  __pyx_t_2 = PyCFunction_NewEx(&__pyx_mdef_7landlab_5graph_6cfuncs_23argsort_spoke_angles, NULL, __pyx_n_s_landlab_graph_cfuncs); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 420, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_2);
+  if (PyDict_SetItem(__pyx_d, __pyx_n_s_argsort_spoke_angles, __pyx_t_2) < 0) __PYX_ERR(0, 420, __pyx_L1_error)
+  __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
+
+  /* "landlab/graph/cfuncs.pyx":1
+ * import numpy as np             # <<<<<<<<<<<<<<
+ * cimport numpy as np
+ * cimport cython
+ */
+  __pyx_t_2 = __Pyx_PyDict_NewPresized(0); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 1, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_2);
+  if (PyDict_SetItem(__pyx_d, __pyx_n_s_test, __pyx_t_2) < 0) __PYX_ERR(0, 1, __pyx_L1_error)
+  __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
+
+  /* "../.pyenv/versions/3.7.16/lib/python3.7/site-packages/numpy/__init__.pxd":892
+ *         raise ImportError("numpy.core.umath failed to import")
+ * 
+ * cdef inline int import_ufunc() except -1:             # <<<<<<<<<<<<<<
+ *     try:
+ *         _import_umath()
+ */
+
+  /*--- Wrapped vars code ---*/
+
+  goto __pyx_L0;
+  __pyx_L1_error:;
+  __Pyx_XDECREF(__pyx_t_1);
+  __Pyx_XDECREF(__pyx_t_2);
+  if (__pyx_m) {
+    if (__pyx_d) {
+      __Pyx_AddTraceback("init landlab.graph.cfuncs", __pyx_clineno, __pyx_lineno, __pyx_filename);
+    }
+    Py_CLEAR(__pyx_m);
+  } else if (!PyErr_Occurred()) {
+    PyErr_SetString(PyExc_ImportError, "init landlab.graph.cfuncs");
+  }
+  __pyx_L0:;
+  __Pyx_RefNannyFinishContext();
+  #if CYTHON_PEP489_MULTI_PHASE_INIT
+  return (__pyx_m != NULL) ? 0 : -1;
+  #elif PY_MAJOR_VERSION >= 3
+  return __pyx_m;
+  #else
+  return;
+  #endif
+}
+
+/* --- Runtime support code --- */
+/* Refnanny */
+#if CYTHON_REFNANNY
+static __Pyx_RefNannyAPIStruct *__Pyx_RefNannyImportAPI(const char *modname) {
+    PyObject *m = NULL, *p = NULL;
+    void *r = NULL;
+    m = PyImport_ImportModule(modname);
+    if (!m) goto end;
+    p = PyObject_GetAttrString(m, "RefNannyAPI");
+    if (!p) goto end;
+    r = PyLong_AsVoidPtr(p);
+end:
+    Py_XDECREF(p);
+    Py_XDECREF(m);
+    return (__Pyx_RefNannyAPIStruct *)r;
+}
+#endif
+
+/* PyObjectGetAttrStr */
+#if CYTHON_USE_TYPE_SLOTS
+static CYTHON_INLINE PyObject* __Pyx_PyObject_GetAttrStr(PyObject* obj, PyObject* attr_name) {
+    PyTypeObject* tp = Py_TYPE(obj);
+    if (likely(tp->tp_getattro))
+        return tp->tp_getattro(obj, attr_name);
+#if PY_MAJOR_VERSION < 3
+    if (likely(tp->tp_getattr))
+        return tp->tp_getattr(obj, PyString_AS_STRING(attr_name));
+#endif
+    return PyObject_GetAttr(obj, attr_name);
+}
+#endif
+
+/* GetBuiltinName */
+static PyObject *__Pyx_GetBuiltinName(PyObject *name) {
+    PyObject* result = __Pyx_PyObject_GetAttrStr(__pyx_b, name);
+    if (unlikely(!result)) {
+        PyErr_Format(PyExc_NameError,
+#if PY_MAJOR_VERSION >= 3
+            "name '%U' is not defined", name);
+#else
+            "name '%.200s' is not defined", PyString_AS_STRING(name));
+#endif
+    }
+    return result;
+}
+
+/* RaiseArgTupleInvalid */
+static void __Pyx_RaiseArgtupleInvalid(
+    const char* func_name,
+    int exact,
+    Py_ssize_t num_min,
+    Py_ssize_t num_max,
+    Py_ssize_t num_found)
+{
+    Py_ssize_t num_expected;
+    const char *more_or_less;
+    if (num_found < num_min) {
+        num_expected = num_min;
+        more_or_less = "at least";
+    } else {
+        num_expected = num_max;
+        more_or_less = "at most";
+    }
+    if (exact) {
+        more_or_less = "exactly";
+    }
+    PyErr_Format(PyExc_TypeError,
+                 "%.200s() takes %.8s %" CYTHON_FORMAT_SSIZE_T "d positional argument%.1s (%" CYTHON_FORMAT_SSIZE_T "d given)",
+                 func_name, more_or_less, num_expected,
+                 (num_expected == 1) ? "" : "s", num_found);
+}
+
+/* RaiseDoubleKeywords */
+static void __Pyx_RaiseDoubleKeywordsError(
+    const char* func_name,
+    PyObject* kw_name)
+{
+    PyErr_Format(PyExc_TypeError,
+        #if PY_MAJOR_VERSION >= 3
+        "%s() got multiple values for keyword argument '%U'", func_name, kw_name);
+        #else
+        "%s() got multiple values for keyword argument '%s'", func_name,
+        PyString_AsString(kw_name));
+        #endif
+}
+
+/* ParseKeywords */
+static int __Pyx_ParseOptionalKeywords(
+    PyObject *kwds,
+    PyObject **argnames[],
+    PyObject *kwds2,
+    PyObject *values[],
+    Py_ssize_t num_pos_args,
+    const char* function_name)
+{
+    PyObject *key = 0, *value = 0;
+    Py_ssize_t pos = 0;
+    PyObject*** name;
+    PyObject*** first_kw_arg = argnames + num_pos_args;
+    while (PyDict_Next(kwds, &pos, &key, &value)) {
+        name = first_kw_arg;
+        while (*name && (**name != key)) name++;
+        if (*name) {
+            values[name-argnames] = value;
+            continue;
+        }
+        name = first_kw_arg;
+        #if PY_MAJOR_VERSION < 3
+        if (likely(PyString_Check(key))) {
+            while (*name) {
+                if ((CYTHON_COMPILING_IN_PYPY || PyString_GET_SIZE(**name) == PyString_GET_SIZE(key))
+                        && _PyString_Eq(**name, key)) {
+                    values[name-argnames] = value;
+                    break;
+                }
+                name++;
+            }
+            if (*name) continue;
+            else {
+                PyObject*** argname = argnames;
+                while (argname != first_kw_arg) {
+                    if ((**argname == key) || (
+                            (CYTHON_COMPILING_IN_PYPY || PyString_GET_SIZE(**argname) == PyString_GET_SIZE(key))
+                             && _PyString_Eq(**argname, key))) {
+                        goto arg_passed_twice;
+                    }
+                    argname++;
+                }
+            }
+        } else
+        #endif
+        if (likely(PyUnicode_Check(key))) {
+            while (*name) {
+                int cmp = (**name == key) ? 0 :
+                #if !CYTHON_COMPILING_IN_PYPY && PY_MAJOR_VERSION >= 3
+                    (__Pyx_PyUnicode_GET_LENGTH(**name) != __Pyx_PyUnicode_GET_LENGTH(key)) ? 1 :
+                #endif
+                    PyUnicode_Compare(**name, key);
+                if (cmp < 0 && unlikely(PyErr_Occurred())) goto bad;
+                if (cmp == 0) {
+                    values[name-argnames] = value;
+                    break;
+                }
+                name++;
+            }
+            if (*name) continue;
+            else {
+                PyObject*** argname = argnames;
+                while (argname != first_kw_arg) {
+                    int cmp = (**argname == key) ? 0 :
+                    #if !CYTHON_COMPILING_IN_PYPY && PY_MAJOR_VERSION >= 3
+                        (__Pyx_PyUnicode_GET_LENGTH(**argname) != __Pyx_PyUnicode_GET_LENGTH(key)) ? 1 :
+                    #endif
+                        PyUnicode_Compare(**argname, key);
+                    if (cmp < 0 && unlikely(PyErr_Occurred())) goto bad;
+                    if (cmp == 0) goto arg_passed_twice;
+                    argname++;
+                }
+            }
+        } else
+            goto invalid_keyword_type;
+        if (kwds2) {
+            if (unlikely(PyDict_SetItem(kwds2, key, value))) goto bad;
+        } else {
+            goto invalid_keyword;
+        }
+    }
+    return 0;
+arg_passed_twice:
+    __Pyx_RaiseDoubleKeywordsError(function_name, key);
+    goto bad;
+invalid_keyword_type:
+    PyErr_Format(PyExc_TypeError,
+        "%.200s() keywords must be strings", function_name);
+    goto bad;
+invalid_keyword:
+    PyErr_Format(PyExc_TypeError,
+    #if PY_MAJOR_VERSION < 3
+        "%.200s() got an unexpected keyword argument '%.200s'",
+        function_name, PyString_AsString(key));
+    #else
+        "%s() got an unexpected keyword argument '%U'",
+        function_name, key);
+    #endif
+bad:
+    return -1;
+}
+
+/* ArgTypeTest */
+static int __Pyx__ArgTypeTest(PyObject *obj, PyTypeObject *type, const char *name, int exact)
+{
+    if (unlikely(!type)) {
+        PyErr_SetString(PyExc_SystemError, "Missing type object");
+        return 0;
+    }
+    else if (exact) {
+        #if PY_MAJOR_VERSION == 2
+        if ((type == &PyBaseString_Type) && likely(__Pyx_PyBaseString_CheckExact(obj))) return 1;
+        #endif
+    }
+    else {
+        if (likely(__Pyx_TypeCheck(obj, type))) return 1;
+    }
+    PyErr_Format(PyExc_TypeError,
+        "Argument '%.200s' has incorrect type (expected %.200s, got %.200s)",
+        name, type->tp_name, Py_TYPE(obj)->tp_name);
+    return 0;
+}
+
+/* IsLittleEndian */
+static CYTHON_INLINE int __Pyx_Is_Little_Endian(void)
+{
+  union {
+    uint32_t u32;
+    uint8_t u8[4];
+  } S;
+  S.u32 = 0x01020304;
+  return S.u8[0] == 4;
+}
+
+/* BufferFormatCheck */
+static void __Pyx_BufFmt_Init(__Pyx_BufFmt_Context* ctx,
+                              __Pyx_BufFmt_StackElem* stack,
+                              __Pyx_TypeInfo* type) {
+  stack[0].field = &ctx->root;
+  stack[0].parent_offset = 0;
+  ctx->root.type = type;
+  ctx->root.name = "buffer dtype";
+  ctx->root.offset = 0;
+  ctx->head = stack;
+  ctx->head->field = &ctx->root;
+  ctx->fmt_offset = 0;
+  ctx->head->parent_offset = 0;
+  ctx->new_packmode = '@';
+  ctx->enc_packmode = '@';
+  ctx->new_count = 1;
+  ctx->enc_count = 0;
+  ctx->enc_type = 0;
+  ctx->is_complex = 0;
+  ctx->is_valid_array = 0;
+  ctx->struct_alignment = 0;
+  while (type->typegroup == 'S') {
+    ++ctx->head;
+    ctx->head->field = type->fields;
+    ctx->head->parent_offset = 0;
+    type = type->fields->type;
+  }
+}
+static int __Pyx_BufFmt_ParseNumber(const char** ts) {
+    int count;
+    const char* t = *ts;
+    if (*t < '0' || *t > '9') {
+      return -1;
+    } else {
+        count = *t++ - '0';
+        while (*t >= '0' && *t <= '9') {
+            count *= 10;
+            count += *t++ - '0';
+        }
+    }
+    *ts = t;
+    return count;
+}
+static int __Pyx_BufFmt_ExpectNumber(const char **ts) {
+    int number = __Pyx_BufFmt_ParseNumber(ts);
+    if (number == -1)
+        PyErr_Format(PyExc_ValueError,\
+                     "Does not understand character buffer dtype format string ('%c')", **ts);
+    return number;
+}
+static void __Pyx_BufFmt_RaiseUnexpectedChar(char ch) {
+  PyErr_Format(PyExc_ValueError,
+               "Unexpected format string character: '%c'", ch);
+}
+static const char* __Pyx_BufFmt_DescribeTypeChar(char ch, int is_complex) {
+  switch (ch) {
+    case '?': return "'bool'";
+    case 'c': return "'char'";
+    case 'b': return "'signed char'";
+    case 'B': return "'unsigned char'";
+    case 'h': return "'short'";
+    case 'H': return "'unsigned short'";
+    case 'i': return "'int'";
+    case 'I': return "'unsigned int'";
+    case 'l': return "'long'";
+    case 'L': return "'unsigned long'";
+    case 'q': return "'long long'";
+    case 'Q': return "'unsigned long long'";
+    case 'f': return (is_complex ? "'complex float'" : "'float'");
+    case 'd': return (is_complex ? "'complex double'" : "'double'");
+    case 'g': return (is_complex ? "'complex long double'" : "'long double'");
+    case 'T': return "a struct";
+    case 'O': return "Python object";
+    case 'P': return "a pointer";
+    case 's': case 'p': return "a string";
+    case 0: return "end";
+    default: return "unparseable format string";
+  }
+}
+static size_t __Pyx_BufFmt_TypeCharToStandardSize(char ch, int is_complex) {
+  switch (ch) {
+    case '?': case 'c': case 'b': case 'B': case 's': case 'p': return 1;
+    case 'h': case 'H': return 2;
+    case 'i': case 'I': case 'l': case 'L': return 4;
+    case 'q': case 'Q': return 8;
+    case 'f': return (is_complex ? 8 : 4);
+    case 'd': return (is_complex ? 16 : 8);
+    case 'g': {
+      PyErr_SetString(PyExc_ValueError, "Python does not define a standard format string size for long double ('g')..");
+      return 0;
+    }
+    case 'O': case 'P': return sizeof(void*);
+    default:
+      __Pyx_BufFmt_RaiseUnexpectedChar(ch);
+      return 0;
+    }
+}
+static size_t __Pyx_BufFmt_TypeCharToNativeSize(char ch, int is_complex) {
+  switch (ch) {
+    case '?': case 'c': case 'b': case 'B': case 's': case 'p': return 1;
+    case 'h': case 'H': return sizeof(short);
+    case 'i': case 'I': return sizeof(int);
+    case 'l': case 'L': return sizeof(long);
+    #ifdef HAVE_LONG_LONG
+    case 'q': case 'Q': return sizeof(PY_LONG_LONG);
+    #endif
+    case 'f': return sizeof(float) * (is_complex ? 2 : 1);
+    case 'd': return sizeof(double) * (is_complex ? 2 : 1);
+    case 'g': return sizeof(long double) * (is_complex ? 2 : 1);
+    case 'O': case 'P': return sizeof(void*);
+    default: {
+      __Pyx_BufFmt_RaiseUnexpectedChar(ch);
+      return 0;
+    }
+  }
+}
+typedef struct { char c; short x; } __Pyx_st_short;
+typedef struct { char c; int x; } __Pyx_st_int;
+typedef struct { char c; long x; } __Pyx_st_long;
+typedef struct { char c; float x; } __Pyx_st_float;
+typedef struct { char c; double x; } __Pyx_st_double;
+typedef struct { char c; long double x; } __Pyx_st_longdouble;
+typedef struct { char c; void *x; } __Pyx_st_void_p;
+#ifdef HAVE_LONG_LONG
+typedef struct { char c; PY_LONG_LONG x; } __Pyx_st_longlong;
+#endif
+static size_t __Pyx_BufFmt_TypeCharToAlignment(char ch, CYTHON_UNUSED int is_complex) {
+  switch (ch) {
+    case '?': case 'c': case 'b': case 'B': case 's': case 'p': return 1;
+    case 'h': case 'H': return sizeof(__Pyx_st_short) - sizeof(short);
+    case 'i': case 'I': return sizeof(__Pyx_st_int) - sizeof(int);
+    case 'l': case 'L': return sizeof(__Pyx_st_long) - sizeof(long);
+#ifdef HAVE_LONG_LONG
+    case 'q': case 'Q': return sizeof(__Pyx_st_longlong) - sizeof(PY_LONG_LONG);
+#endif
+    case 'f': return sizeof(__Pyx_st_float) - sizeof(float);
+    case 'd': return sizeof(__Pyx_st_double) - sizeof(double);
+    case 'g': return sizeof(__Pyx_st_longdouble) - sizeof(long double);
+    case 'P': case 'O': return sizeof(__Pyx_st_void_p) - sizeof(void*);
+    default:
+      __Pyx_BufFmt_RaiseUnexpectedChar(ch);
+      return 0;
+    }
+}
+/* These are for computing the padding at the end of the struct to align
+   on the first member of the struct. This will probably the same as above,
+   but we don't have any guarantees.
+ */
+typedef struct { short x; char c; } __Pyx_pad_short;
+typedef struct { int x; char c; } __Pyx_pad_int;
+typedef struct { long x; char c; } __Pyx_pad_long;
+typedef struct { float x; char c; } __Pyx_pad_float;
+typedef struct { double x; char c; } __Pyx_pad_double;
+typedef struct { long double x; char c; } __Pyx_pad_longdouble;
+typedef struct { void *x; char c; } __Pyx_pad_void_p;
+#ifdef HAVE_LONG_LONG
+typedef struct { PY_LONG_LONG x; char c; } __Pyx_pad_longlong;
+#endif
+static size_t __Pyx_BufFmt_TypeCharToPadding(char ch, CYTHON_UNUSED int is_complex) {
+  switch (ch) {
+    case '?': case 'c': case 'b': case 'B': case 's': case 'p': return 1;
+    case 'h': case 'H': return sizeof(__Pyx_pad_short) - sizeof(short);
+    case 'i': case 'I': return sizeof(__Pyx_pad_int) - sizeof(int);
+    case 'l': case 'L': return sizeof(__Pyx_pad_long) - sizeof(long);
+#ifdef HAVE_LONG_LONG
+    case 'q': case 'Q': return sizeof(__Pyx_pad_longlong) - sizeof(PY_LONG_LONG);
+#endif
+    case 'f': return sizeof(__Pyx_pad_float) - sizeof(float);
+    case 'd': return sizeof(__Pyx_pad_double) - sizeof(double);
+    case 'g': return sizeof(__Pyx_pad_longdouble) - sizeof(long double);
+    case 'P': case 'O': return sizeof(__Pyx_pad_void_p) - sizeof(void*);
+    default:
+      __Pyx_BufFmt_RaiseUnexpectedChar(ch);
+      return 0;
+    }
+}
+static char __Pyx_BufFmt_TypeCharToGroup(char ch, int is_complex) {
+  switch (ch) {
+    case 'c':
+        return 'H';
+    case 'b': case 'h': case 'i':
+    case 'l': case 'q': case 's': case 'p':
+        return 'I';
+    case '?': case 'B': case 'H': case 'I': case 'L': case 'Q':
+        return 'U';
+    case 'f': case 'd': case 'g':
+        return (is_complex ? 'C' : 'R');
+    case 'O':
+        return 'O';
+    case 'P':
+        return 'P';
+    default: {
+      __Pyx_BufFmt_RaiseUnexpectedChar(ch);
+      return 0;
+    }
+  }
+}
+static void __Pyx_BufFmt_RaiseExpected(__Pyx_BufFmt_Context* ctx) {
+  if (ctx->head == NULL || ctx->head->field == &ctx->root) {
+    const char* expected;
+    const char* quote;
+    if (ctx->head == NULL) {
+      expected = "end";
+      quote = "";
+    } else {
+      expected = ctx->head->field->type->name;
+      quote = "'";
+    }
+    PyErr_Format(PyExc_ValueError,
+                 "Buffer dtype mismatch, expected %s%s%s but got %s",
+                 quote, expected, quote,
+                 __Pyx_BufFmt_DescribeTypeChar(ctx->enc_type, ctx->is_complex));
+  } else {
+    __Pyx_StructField* field = ctx->head->field;
+    __Pyx_StructField* parent = (ctx->head - 1)->field;
+    PyErr_Format(PyExc_ValueError,
+                 "Buffer dtype mismatch, expected '%s' but got %s in '%s.%s'",
+                 field->type->name, __Pyx_BufFmt_DescribeTypeChar(ctx->enc_type, ctx->is_complex),
+                 parent->type->name, field->name);
+  }
+}
+static int __Pyx_BufFmt_ProcessTypeChunk(__Pyx_BufFmt_Context* ctx) {
+  char group;
+  size_t size, offset, arraysize = 1;
+  if (ctx->enc_type == 0) return 0;
+  if (ctx->head->field->type->arraysize[0]) {
+    int i, ndim = 0;
+    if (ctx->enc_type == 's' || ctx->enc_type == 'p') {
+        ctx->is_valid_array = ctx->head->field->type->ndim == 1;
+        ndim = 1;
+        if (ctx->enc_count != ctx->head->field->type->arraysize[0]) {
+            PyErr_Format(PyExc_ValueError,
+                         "Expected a dimension of size %zu, got %zu",
+                         ctx->head->field->type->arraysize[0], ctx->enc_count);
+            return -1;
+        }
+    }
+    if (!ctx->is_valid_array) {
+      PyErr_Format(PyExc_ValueError, "Expected %d dimensions, got %d",
+                   ctx->head->field->type->ndim, ndim);
+      return -1;
+    }
+    for (i = 0; i < ctx->head->field->type->ndim; i++) {
+      arraysize *= ctx->head->field->type->arraysize[i];
+    }
+    ctx->is_valid_array = 0;
+    ctx->enc_count = 1;
+  }
+  group = __Pyx_BufFmt_TypeCharToGroup(ctx->enc_type, ctx->is_complex);
+  do {
+    __Pyx_StructField* field = ctx->head->field;
+    __Pyx_TypeInfo* type = field->type;
+    if (ctx->enc_packmode == '@' || ctx->enc_packmode == '^') {
+      size = __Pyx_BufFmt_TypeCharToNativeSize(ctx->enc_type, ctx->is_complex);
+    } else {
+      size = __Pyx_BufFmt_TypeCharToStandardSize(ctx->enc_type, ctx->is_complex);
+    }
+    if (ctx->enc_packmode == '@') {
+      size_t align_at = __Pyx_BufFmt_TypeCharToAlignment(ctx->enc_type, ctx->is_complex);
+      size_t align_mod_offset;
+      if (align_at == 0) return -1;
+      align_mod_offset = ctx->fmt_offset % align_at;
+      if (align_mod_offset > 0) ctx->fmt_offset += align_at - align_mod_offset;
+      if (ctx->struct_alignment == 0)
+          ctx->struct_alignment = __Pyx_BufFmt_TypeCharToPadding(ctx->enc_type,
+                                                                 ctx->is_complex);
+    }
+    if (type->size != size || type->typegroup != group) {
+      if (type->typegroup == 'C' && type->fields != NULL) {
+        size_t parent_offset = ctx->head->parent_offset + field->offset;
+        ++ctx->head;
+        ctx->head->field = type->fields;
+        ctx->head->parent_offset = parent_offset;
+        continue;
+      }
+      if ((type->typegroup == 'H' || group == 'H') && type->size == size) {
+      } else {
+          __Pyx_BufFmt_RaiseExpected(ctx);
+          return -1;
+      }
+    }
+    offset = ctx->head->parent_offset + field->offset;
+    if (ctx->fmt_offset != offset) {
+      PyErr_Format(PyExc_ValueError,
+                   "Buffer dtype mismatch; next field is at offset %" CYTHON_FORMAT_SSIZE_T "d but %" CYTHON_FORMAT_SSIZE_T "d expected",
+                   (Py_ssize_t)ctx->fmt_offset, (Py_ssize_t)offset);
+      return -1;
+    }
+    ctx->fmt_offset += size;
+    if (arraysize)
+      ctx->fmt_offset += (arraysize - 1) * size;
+    --ctx->enc_count;
+    while (1) {
+      if (field == &ctx->root) {
+        ctx->head = NULL;
+        if (ctx->enc_count != 0) {
+          __Pyx_BufFmt_RaiseExpected(ctx);
+          return -1;
+        }
+        break;
+      }
+      ctx->head->field = ++field;
+      if (field->type == NULL) {
+        --ctx->head;
+        field = ctx->head->field;
+        continue;
+      } else if (field->type->typegroup == 'S') {
+        size_t parent_offset = ctx->head->parent_offset + field->offset;
+        if (field->type->fields->type == NULL) continue;
+        field = field->type->fields;
+        ++ctx->head;
+        ctx->head->field = field;
+        ctx->head->parent_offset = parent_offset;
+        break;
+      } else {
+        break;
+      }
+    }
+  } while (ctx->enc_count);
+  ctx->enc_type = 0;
+  ctx->is_complex = 0;
+  return 0;
+}
+static PyObject *
+__pyx_buffmt_parse_array(__Pyx_BufFmt_Context* ctx, const char** tsp)
+{
+    const char *ts = *tsp;
+    int i = 0, number, ndim;
+    ++ts;
+    if (ctx->new_count != 1) {
+        PyErr_SetString(PyExc_ValueError,
+                        "Cannot handle repeated arrays in format string");
+        return NULL;
+    }
+    if (__Pyx_BufFmt_ProcessTypeChunk(ctx) == -1) return NULL;
+    ndim = ctx->head->field->type->ndim;
+    while (*ts && *ts != ')') {
+        switch (*ts) {
+            case ' ': case '\f': case '\r': case '\n': case '\t': case '\v':  continue;
+            default:  break;
+        }
+        number = __Pyx_BufFmt_ExpectNumber(&ts);
+        if (number == -1) return NULL;
+        if (i < ndim && (size_t) number != ctx->head->field->type->arraysize[i])
+            return PyErr_Format(PyExc_ValueError,
+                        "Expected a dimension of size %zu, got %d",
+                        ctx->head->field->type->arraysize[i], number);
+        if (*ts != ',' && *ts != ')')
+            return PyErr_Format(PyExc_ValueError,
+                                "Expected a comma in format string, got '%c'", *ts);
+        if (*ts == ',') ts++;
+        i++;
+    }
+    if (i != ndim)
+        return PyErr_Format(PyExc_ValueError, "Expected %d dimension(s), got %d",
+                            ctx->head->field->type->ndim, i);
+    if (!*ts) {
+        PyErr_SetString(PyExc_ValueError,
+                        "Unexpected end of format string, expected ')'");
+        return NULL;
+    }
+    ctx->is_valid_array = 1;
+    ctx->new_count = 1;
+    *tsp = ++ts;
+    return Py_None;
+}
+static const char* __Pyx_BufFmt_CheckString(__Pyx_BufFmt_Context* ctx, const char* ts) {
+  int got_Z = 0;
+  while (1) {
+    switch(*ts) {
+      case 0:
+        if (ctx->enc_type != 0 && ctx->head == NULL) {
+          __Pyx_BufFmt_RaiseExpected(ctx);
+          return NULL;
+        }
+        if (__Pyx_BufFmt_ProcessTypeChunk(ctx) == -1) return NULL;
+        if (ctx->head != NULL) {
+          __Pyx_BufFmt_RaiseExpected(ctx);
+          return NULL;
+        }
+        return ts;
+      case ' ':
+      case '\r':
+      case '\n':
+        ++ts;
+        break;
+      case '<':
+        if (!__Pyx_Is_Little_Endian()) {
+          PyErr_SetString(PyExc_ValueError, "Little-endian buffer not supported on big-endian compiler");
+          return NULL;
+        }
+        ctx->new_packmode = '=';
+        ++ts;
+        break;
+      case '>':
+      case '!':
+        if (__Pyx_Is_Little_Endian()) {
+          PyErr_SetString(PyExc_ValueError, "Big-endian buffer not supported on little-endian compiler");
+          return NULL;
+        }
+        ctx->new_packmode = '=';
+        ++ts;
+        break;
+      case '=':
+      case '@':
+      case '^':
+        ctx->new_packmode = *ts++;
+        break;
+      case 'T':
+        {
+          const char* ts_after_sub;
+          size_t i, struct_count = ctx->new_count;
+          size_t struct_alignment = ctx->struct_alignment;
+          ctx->new_count = 1;
+          ++ts;
+          if (*ts != '{') {
+            PyErr_SetString(PyExc_ValueError, "Buffer acquisition: Expected '{' after 'T'");
+            return NULL;
+          }
+          if (__Pyx_BufFmt_ProcessTypeChunk(ctx) == -1) return NULL;
+          ctx->enc_type = 0;
+          ctx->enc_count = 0;
+          ctx->struct_alignment = 0;
+          ++ts;
+          ts_after_sub = ts;
+          for (i = 0; i != struct_count; ++i) {
+            ts_after_sub = __Pyx_BufFmt_CheckString(ctx, ts);
+            if (!ts_after_sub) return NULL;
+          }
+          ts = ts_after_sub;
+          if (struct_alignment) ctx->struct_alignment = struct_alignment;
+        }
+        break;
+      case '}':
+        {
+          size_t alignment = ctx->struct_alignment;
+          ++ts;
+          if (__Pyx_BufFmt_ProcessTypeChunk(ctx) == -1) return NULL;
+          ctx->enc_type = 0;
+          if (alignment && ctx->fmt_offset % alignment) {
+            ctx->fmt_offset += alignment - (ctx->fmt_offset % alignment);
+          }
+        }
+        return ts;
+      case 'x':
+        if (__Pyx_BufFmt_ProcessTypeChunk(ctx) == -1) return NULL;
+        ctx->fmt_offset += ctx->new_count;
+        ctx->new_count = 1;
+        ctx->enc_count = 0;
+        ctx->enc_type = 0;
+        ctx->enc_packmode = ctx->new_packmode;
+        ++ts;
+        break;
+      case 'Z':
+        got_Z = 1;
+        ++ts;
+        if (*ts != 'f' && *ts != 'd' && *ts != 'g') {
+          __Pyx_BufFmt_RaiseUnexpectedChar('Z');
+          return NULL;
+        }
+        CYTHON_FALLTHROUGH;
+      case '?': case 'c': case 'b': case 'B': case 'h': case 'H': case 'i': case 'I':
+      case 'l': case 'L': case 'q': case 'Q':
+      case 'f': case 'd': case 'g':
+      case 'O': case 'p':
+        if ((ctx->enc_type == *ts) && (got_Z == ctx->is_complex) &&
+            (ctx->enc_packmode == ctx->new_packmode) && (!ctx->is_valid_array)) {
+          ctx->enc_count += ctx->new_count;
+          ctx->new_count = 1;
+          got_Z = 0;
+          ++ts;
+          break;
+        }
+        CYTHON_FALLTHROUGH;
+      case 's':
+        if (__Pyx_BufFmt_ProcessTypeChunk(ctx) == -1) return NULL;
+        ctx->enc_count = ctx->new_count;
+        ctx->enc_packmode = ctx->new_packmode;
+        ctx->enc_type = *ts;
+        ctx->is_complex = got_Z;
+        ++ts;
+        ctx->new_count = 1;
+        got_Z = 0;
+        break;
+      case ':':
+        ++ts;
+        while(*ts != ':') ++ts;
+        ++ts;
+        break;
+      case '(':
+        if (!__pyx_buffmt_parse_array(ctx, &ts)) return NULL;
+        break;
+      default:
+        {
+          int number = __Pyx_BufFmt_ExpectNumber(&ts);
+          if (number == -1) return NULL;
+          ctx->new_count = (size_t)number;
+        }
+    }
+  }
+}
+
+/* BufferGetAndValidate */
+  static CYTHON_INLINE void __Pyx_SafeReleaseBuffer(Py_buffer* info) {
+  if (unlikely(info->buf == NULL)) return;
+  if (info->suboffsets == __Pyx_minusones) info->suboffsets = NULL;
+  __Pyx_ReleaseBuffer(info);
+}
+static void __Pyx_ZeroBuffer(Py_buffer* buf) {
+  buf->buf = NULL;
+  buf->obj = NULL;
+  buf->strides = __Pyx_zeros;
+  buf->shape = __Pyx_zeros;
+  buf->suboffsets = __Pyx_minusones;
+}
+static int __Pyx__GetBufferAndValidate(
+        Py_buffer* buf, PyObject* obj,  __Pyx_TypeInfo* dtype, int flags,
+        int nd, int cast, __Pyx_BufFmt_StackElem* stack)
+{
+  buf->buf = NULL;
+  if (unlikely(__Pyx_GetBuffer(obj, buf, flags) == -1)) {
+    __Pyx_ZeroBuffer(buf);
+    return -1;
+  }
+  if (unlikely(buf->ndim != nd)) {
+    PyErr_Format(PyExc_ValueError,
+                 "Buffer has wrong number of dimensions (expected %d, got %d)",
+                 nd, buf->ndim);
+    goto fail;
+  }
+  if (!cast) {
+    __Pyx_BufFmt_Context ctx;
+    __Pyx_BufFmt_Init(&ctx, stack, dtype);
+    if (!__Pyx_BufFmt_CheckString(&ctx, buf->format)) goto fail;
+  }
+  if (unlikely((size_t)buf->itemsize != dtype->size)) {
+    PyErr_Format(PyExc_ValueError,
+      "Item size of buffer (%" CYTHON_FORMAT_SSIZE_T "d byte%s) does not match size of '%s' (%" CYTHON_FORMAT_SSIZE_T "d byte%s)",
+      buf->itemsize, (buf->itemsize > 1) ? "s" : "",
+      dtype->name, (Py_ssize_t)dtype->size, (dtype->size > 1) ? "s" : "");
+    goto fail;
+  }
+  if (buf->suboffsets == NULL) buf->suboffsets = __Pyx_minusones;
+  return 0;
+fail:;
+  __Pyx_SafeReleaseBuffer(buf);
+  return -1;
+}
+
+/* PyErrFetchRestore */
+  #if CYTHON_FAST_THREAD_STATE
+static CYTHON_INLINE void __Pyx_ErrRestoreInState(PyThreadState *tstate, PyObject *type, PyObject *value, PyObject *tb) {
+    PyObject *tmp_type, *tmp_value, *tmp_tb;
+    tmp_type = tstate->curexc_type;
+    tmp_value = tstate->curexc_value;
+    tmp_tb = tstate->curexc_traceback;
+    tstate->curexc_type = type;
+    tstate->curexc_value = value;
+    tstate->curexc_traceback = tb;
+    Py_XDECREF(tmp_type);
+    Py_XDECREF(tmp_value);
+    Py_XDECREF(tmp_tb);
+}
+static CYTHON_INLINE void __Pyx_ErrFetchInState(PyThreadState *tstate, PyObject **type, PyObject **value, PyObject **tb) {
+    *type = tstate->curexc_type;
+    *value = tstate->curexc_value;
+    *tb = tstate->curexc_traceback;
+    tstate->curexc_type = 0;
+    tstate->curexc_value = 0;
+    tstate->curexc_traceback = 0;
+}
+#endif
+
+/* PyDictVersioning */
+  #if CYTHON_USE_DICT_VERSIONS && CYTHON_USE_TYPE_SLOTS
+static CYTHON_INLINE PY_UINT64_T __Pyx_get_tp_dict_version(PyObject *obj) {
+    PyObject *dict = Py_TYPE(obj)->tp_dict;
+    return likely(dict) ? __PYX_GET_DICT_VERSION(dict) : 0;
+}
+static CYTHON_INLINE PY_UINT64_T __Pyx_get_object_dict_version(PyObject *obj) {
+    PyObject **dictptr = NULL;
+    Py_ssize_t offset = Py_TYPE(obj)->tp_dictoffset;
+    if (offset) {
+#if CYTHON_COMPILING_IN_CPYTHON
+        dictptr = (likely(offset > 0)) ? (PyObject **) ((char *)obj + offset) : _PyObject_GetDictPtr(obj);
+#else
+        dictptr = _PyObject_GetDictPtr(obj);
+#endif
+    }
+    return (dictptr && *dictptr) ? __PYX_GET_DICT_VERSION(*dictptr) : 0;
+}
+static CYTHON_INLINE int __Pyx_object_dict_version_matches(PyObject* obj, PY_UINT64_T tp_dict_version, PY_UINT64_T obj_dict_version) {
+    PyObject *dict = Py_TYPE(obj)->tp_dict;
+    if (unlikely(!dict) || unlikely(tp_dict_version != __PYX_GET_DICT_VERSION(dict)))
+        return 0;
+    return obj_dict_version == __Pyx_get_object_dict_version(obj);
+}
+#endif
+
+/* GetModuleGlobalName */
+  #if CYTHON_USE_DICT_VERSIONS
+static PyObject *__Pyx__GetModuleGlobalName(PyObject *name, PY_UINT64_T *dict_version, PyObject **dict_cached_value)
+#else
+static CYTHON_INLINE PyObject *__Pyx__GetModuleGlobalName(PyObject *name)
+#endif
+{
+    PyObject *result;
+#if !CYTHON_AVOID_BORROWED_REFS
+#if CYTHON_COMPILING_IN_CPYTHON && PY_VERSION_HEX >= 0x030500A1
+    result = _PyDict_GetItem_KnownHash(__pyx_d, name, ((PyASCIIObject *) name)->hash);
+    __PYX_UPDATE_DICT_CACHE(__pyx_d, result, *dict_cached_value, *dict_version)
+    if (likely(result)) {
+        return __Pyx_NewRef(result);
+    } else if (unlikely(PyErr_Occurred())) {
+        return NULL;
+    }
+#else
+    result = PyDict_GetItem(__pyx_d, name);
+    __PYX_UPDATE_DICT_CACHE(__pyx_d, result, *dict_cached_value, *dict_version)
+    if (likely(result)) {
+        return __Pyx_NewRef(result);
+    }
+#endif
+#else
+    result = PyObject_GetItem(__pyx_d, name);
+    __PYX_UPDATE_DICT_CACHE(__pyx_d, result, *dict_cached_value, *dict_version)
+    if (likely(result)) {
+        return __Pyx_NewRef(result);
+    }
+    PyErr_Clear();
+#endif
+    return __Pyx_GetBuiltinName(name);
+}
+
+/* GetItemInt */
+  static PyObject *__Pyx_GetItemInt_Generic(PyObject *o, PyObject* j) {
+    PyObject *r;
+    if (!j) return NULL;
+    r = PyObject_GetItem(o, j);
+    Py_DECREF(j);
+    return r;
+}
+static CYTHON_INLINE PyObject *__Pyx_GetItemInt_List_Fast(PyObject *o, Py_ssize_t i,
+                                                              CYTHON_NCP_UNUSED int wraparound,
+                                                              CYTHON_NCP_UNUSED int boundscheck) {
+#if CYTHON_ASSUME_SAFE_MACROS && !CYTHON_AVOID_BORROWED_REFS
+    Py_ssize_t wrapped_i = i;
+    if (wraparound & unlikely(i < 0)) {
+        wrapped_i += PyList_GET_SIZE(o);
+    }
+    if ((!boundscheck) || likely(__Pyx_is_valid_index(wrapped_i, PyList_GET_SIZE(o)))) {
+        PyObject *r = PyList_GET_ITEM(o, wrapped_i);
+        Py_INCREF(r);
+        return r;
+    }
+    return __Pyx_GetItemInt_Generic(o, PyInt_FromSsize_t(i));
+#else
+    return PySequence_GetItem(o, i);
+#endif
+}
+static CYTHON_INLINE PyObject *__Pyx_GetItemInt_Tuple_Fast(PyObject *o, Py_ssize_t i,
+                                                              CYTHON_NCP_UNUSED int wraparound,
+                                                              CYTHON_NCP_UNUSED int boundscheck) {
+#if CYTHON_ASSUME_SAFE_MACROS && !CYTHON_AVOID_BORROWED_REFS
+    Py_ssize_t wrapped_i = i;
+    if (wraparound & unlikely(i < 0)) {
+        wrapped_i += PyTuple_GET_SIZE(o);
+    }
+    if ((!boundscheck) || likely(__Pyx_is_valid_index(wrapped_i, PyTuple_GET_SIZE(o)))) {
+        PyObject *r = PyTuple_GET_ITEM(o, wrapped_i);
+        Py_INCREF(r);
+        return r;
+    }
+    return __Pyx_GetItemInt_Generic(o, PyInt_FromSsize_t(i));
+#else
+    return PySequence_GetItem(o, i);
+#endif
+}
+static CYTHON_INLINE PyObject *__Pyx_GetItemInt_Fast(PyObject *o, Py_ssize_t i, int is_list,
+                                                     CYTHON_NCP_UNUSED int wraparound,
+                                                     CYTHON_NCP_UNUSED int boundscheck) {
+#if CYTHON_ASSUME_SAFE_MACROS && !CYTHON_AVOID_BORROWED_REFS && CYTHON_USE_TYPE_SLOTS
+    if (is_list || PyList_CheckExact(o)) {
+        Py_ssize_t n = ((!wraparound) | likely(i >= 0)) ? i : i + PyList_GET_SIZE(o);
+        if ((!boundscheck) || (likely(__Pyx_is_valid_index(n, PyList_GET_SIZE(o))))) {
+            PyObject *r = PyList_GET_ITEM(o, n);
+            Py_INCREF(r);
+            return r;
+        }
+    }
+    else if (PyTuple_CheckExact(o)) {
+        Py_ssize_t n = ((!wraparound) | likely(i >= 0)) ? i : i + PyTuple_GET_SIZE(o);
+        if ((!boundscheck) || likely(__Pyx_is_valid_index(n, PyTuple_GET_SIZE(o)))) {
+            PyObject *r = PyTuple_GET_ITEM(o, n);
+            Py_INCREF(r);
+            return r;
+        }
+    } else {
+        PySequenceMethods *m = Py_TYPE(o)->tp_as_sequence;
+        if (likely(m && m->sq_item)) {
+            if (wraparound && unlikely(i < 0) && likely(m->sq_length)) {
+                Py_ssize_t l = m->sq_length(o);
+                if (likely(l >= 0)) {
+                    i += l;
+                } else {
+                    if (!PyErr_ExceptionMatches(PyExc_OverflowError))
+                        return NULL;
+                    PyErr_Clear();
+                }
+            }
+            return m->sq_item(o, i);
+        }
+    }
+#else
+    if (is_list || PySequence_Check(o)) {
+        return PySequence_GetItem(o, i);
+    }
+#endif
+    return __Pyx_GetItemInt_Generic(o, PyInt_FromSsize_t(i));
+}
+
+/* PyFunctionFastCall */
+  #if CYTHON_FAST_PYCALL
+static PyObject* __Pyx_PyFunction_FastCallNoKw(PyCodeObject *co, PyObject **args, Py_ssize_t na,
+                                               PyObject *globals) {
+    PyFrameObject *f;
+    PyThreadState *tstate = __Pyx_PyThreadState_Current;
+    PyObject **fastlocals;
+    Py_ssize_t i;
+    PyObject *result;
+    assert(globals != NULL);
+    /* XXX Perhaps we should create a specialized
+       PyFrame_New() that doesn't take locals, but does
+       take builtins without sanity checking them.
+       */
+    assert(tstate != NULL);
+    f = PyFrame_New(tstate, co, globals, NULL);
+    if (f == NULL) {
+        return NULL;
+    }
+    fastlocals = __Pyx_PyFrame_GetLocalsplus(f);
+    for (i = 0; i < na; i++) {
+        Py_INCREF(*args);
+        fastlocals[i] = *args++;
+    }
+    result = PyEval_EvalFrameEx(f,0);
+    ++tstate->recursion_depth;
+    Py_DECREF(f);
+    --tstate->recursion_depth;
+    return result;
+}
+#if 1 || PY_VERSION_HEX < 0x030600B1
+static PyObject *__Pyx_PyFunction_FastCallDict(PyObject *func, PyObject **args, Py_ssize_t nargs, PyObject *kwargs) {
+    PyCodeObject *co = (PyCodeObject *)PyFunction_GET_CODE(func);
+    PyObject *globals = PyFunction_GET_GLOBALS(func);
+    PyObject *argdefs = PyFunction_GET_DEFAULTS(func);
+    PyObject *closure;
+#if PY_MAJOR_VERSION >= 3
+    PyObject *kwdefs;
+#endif
+    PyObject *kwtuple, **k;
+    PyObject **d;
+    Py_ssize_t nd;
+    Py_ssize_t nk;
+    PyObject *result;
+    assert(kwargs == NULL || PyDict_Check(kwargs));
+    nk = kwargs ? PyDict_Size(kwargs) : 0;
+    if (Py_EnterRecursiveCall((char*)" while calling a Python object")) {
+        return NULL;
+    }
+    if (
+#if PY_MAJOR_VERSION >= 3
+            co->co_kwonlyargcount == 0 &&
+#endif
+            likely(kwargs == NULL || nk == 0) &&
+            co->co_flags == (CO_OPTIMIZED | CO_NEWLOCALS | CO_NOFREE)) {
+        if (argdefs == NULL && co->co_argcount == nargs) {
+            result = __Pyx_PyFunction_FastCallNoKw(co, args, nargs, globals);
+            goto done;
+        }
+        else if (nargs == 0 && argdefs != NULL
+                 && co->co_argcount == Py_SIZE(argdefs)) {
+            /* function called with no arguments, but all parameters have
+               a default value: use default values as arguments .*/
+            args = &PyTuple_GET_ITEM(argdefs, 0);
+            result =__Pyx_PyFunction_FastCallNoKw(co, args, Py_SIZE(argdefs), globals);
+            goto done;
+        }
+    }
+    if (kwargs != NULL) {
+        Py_ssize_t pos, i;
+        kwtuple = PyTuple_New(2 * nk);
+        if (kwtuple == NULL) {
+            result = NULL;
+            goto done;
+        }
+        k = &PyTuple_GET_ITEM(kwtuple, 0);
+        pos = i = 0;
+        while (PyDict_Next(kwargs, &pos, &k[i], &k[i+1])) {
+            Py_INCREF(k[i]);
+            Py_INCREF(k[i+1]);
+            i += 2;
+        }
+        nk = i / 2;
+    }
+    else {
+        kwtuple = NULL;
+        k = NULL;
+    }
+    closure = PyFunction_GET_CLOSURE(func);
+#if PY_MAJOR_VERSION >= 3
+    kwdefs = PyFunction_GET_KW_DEFAULTS(func);
+#endif
+    if (argdefs != NULL) {
+        d = &PyTuple_GET_ITEM(argdefs, 0);
+        nd = Py_SIZE(argdefs);
+    }
+    else {
+        d = NULL;
+        nd = 0;
+    }
+#if PY_MAJOR_VERSION >= 3
+    result = PyEval_EvalCodeEx((PyObject*)co, globals, (PyObject *)NULL,
+                               args, (int)nargs,
+                               k, (int)nk,
+                               d, (int)nd, kwdefs, closure);
+#else
+    result = PyEval_EvalCodeEx(co, globals, (PyObject *)NULL,
+                               args, (int)nargs,
+                               k, (int)nk,
+                               d, (int)nd, closure);
+#endif
+    Py_XDECREF(kwtuple);
+done:
+    Py_LeaveRecursiveCall();
+    return result;
+}
+#endif
+#endif
+
+/* PyCFunctionFastCall */
+  #if CYTHON_FAST_PYCCALL
+static CYTHON_INLINE PyObject * __Pyx_PyCFunction_FastCall(PyObject *func_obj, PyObject **args, Py_ssize_t nargs) {
+    PyCFunctionObject *func = (PyCFunctionObject*)func_obj;
+    PyCFunction meth = PyCFunction_GET_FUNCTION(func);
+    PyObject *self = PyCFunction_GET_SELF(func);
+    int flags = PyCFunction_GET_FLAGS(func);
+    assert(PyCFunction_Check(func));
+    assert(METH_FASTCALL == (flags & ~(METH_CLASS | METH_STATIC | METH_COEXIST | METH_KEYWORDS | METH_STACKLESS)));
+    assert(nargs >= 0);
+    assert(nargs == 0 || args != NULL);
+    /* _PyCFunction_FastCallDict() must not be called with an exception set,
+       because it may clear it (directly or indirectly) and so the
+       caller loses its exception */
+    assert(!PyErr_Occurred());
+    if ((PY_VERSION_HEX < 0x030700A0) || unlikely(flags & METH_KEYWORDS)) {
+        return (*((__Pyx_PyCFunctionFastWithKeywords)(void*)meth)) (self, args, nargs, NULL);
+    } else {
+        return (*((__Pyx_PyCFunctionFast)(void*)meth)) (self, args, nargs);
+    }
+}
+#endif
+
+/* PyObjectCall */
+  #if CYTHON_COMPILING_IN_CPYTHON
+static CYTHON_INLINE PyObject* __Pyx_PyObject_Call(PyObject *func, PyObject *arg, PyObject *kw) {
+    PyObject *result;
+    ternaryfunc call = Py_TYPE(func)->tp_call;
+    if (unlikely(!call))
+        return PyObject_Call(func, arg, kw);
+    if (unlikely(Py_EnterRecursiveCall((char*)" while calling a Python object")))
+        return NULL;
+    result = (*call)(func, arg, kw);
+    Py_LeaveRecursiveCall();
+    if (unlikely(!result) && unlikely(!PyErr_Occurred())) {
+        PyErr_SetString(
+            PyExc_SystemError,
+            "NULL result without error in PyObject_Call");
+    }
+    return result;
+}
+#endif
+
+/* PyIntBinop */
+  #if !CYTHON_COMPILING_IN_PYPY
+static PyObject* __Pyx_PyInt_SubtractObjC(PyObject *op1, PyObject *op2, CYTHON_UNUSED long intval, int inplace, int zerodivision_check) {
+    (void)inplace;
+    (void)zerodivision_check;
+    #if PY_MAJOR_VERSION < 3
+    if (likely(PyInt_CheckExact(op1))) {
+        const long b = intval;
+        long x;
+        long a = PyInt_AS_LONG(op1);
+            x = (long)((unsigned long)a - b);
+            if (likely((x^a) >= 0 || (x^~b) >= 0))
+                return PyInt_FromLong(x);
+            return PyLong_Type.tp_as_number->nb_subtract(op1, op2);
+    }
+    #endif
+    #if CYTHON_USE_PYLONG_INTERNALS
+    if (likely(PyLong_CheckExact(op1))) {
+        const long b = intval;
+        long a, x;
+#ifdef HAVE_LONG_LONG
+        const PY_LONG_LONG llb = intval;
+        PY_LONG_LONG lla, llx;
+#endif
+        const digit* digits = ((PyLongObject*)op1)->ob_digit;
+        const Py_ssize_t size = Py_SIZE(op1);
+        if (likely(__Pyx_sst_abs(size) <= 1)) {
+            a = likely(size) ? digits[0] : 0;
+            if (size == -1) a = -a;
+        } else {
+            switch (size) {
+                case -2:
+                    if (8 * sizeof(long) - 1 > 2 * PyLong_SHIFT) {
+                        a = -(long) (((((unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0]));
+                        break;
+#ifdef HAVE_LONG_LONG
+                    } else if (8 * sizeof(PY_LONG_LONG) - 1 > 2 * PyLong_SHIFT) {
+                        lla = -(PY_LONG_LONG) (((((unsigned PY_LONG_LONG)digits[1]) << PyLong_SHIFT) | (unsigned PY_LONG_LONG)digits[0]));
+                        goto long_long;
+#endif
+                    }
+                    CYTHON_FALLTHROUGH;
+                case 2:
+                    if (8 * sizeof(long) - 1 > 2 * PyLong_SHIFT) {
+                        a = (long) (((((unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0]));
+                        break;
+#ifdef HAVE_LONG_LONG
+                    } else if (8 * sizeof(PY_LONG_LONG) - 1 > 2 * PyLong_SHIFT) {
+                        lla = (PY_LONG_LONG) (((((unsigned PY_LONG_LONG)digits[1]) << PyLong_SHIFT) | (unsigned PY_LONG_LONG)digits[0]));
+                        goto long_long;
+#endif
+                    }
+                    CYTHON_FALLTHROUGH;
+                case -3:
+                    if (8 * sizeof(long) - 1 > 3 * PyLong_SHIFT) {
+                        a = -(long) (((((((unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0]));
+                        break;
+#ifdef HAVE_LONG_LONG
+                    } else if (8 * sizeof(PY_LONG_LONG) - 1 > 3 * PyLong_SHIFT) {
+                        lla = -(PY_LONG_LONG) (((((((unsigned PY_LONG_LONG)digits[2]) << PyLong_SHIFT) | (unsigned PY_LONG_LONG)digits[1]) << PyLong_SHIFT) | (unsigned PY_LONG_LONG)digits[0]));
+                        goto long_long;
+#endif
+                    }
+                    CYTHON_FALLTHROUGH;
+                case 3:
+                    if (8 * sizeof(long) - 1 > 3 * PyLong_SHIFT) {
+                        a = (long) (((((((unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0]));
+                        break;
+#ifdef HAVE_LONG_LONG
+                    } else if (8 * sizeof(PY_LONG_LONG) - 1 > 3 * PyLong_SHIFT) {
+                        lla = (PY_LONG_LONG) (((((((unsigned PY_LONG_LONG)digits[2]) << PyLong_SHIFT) | (unsigned PY_LONG_LONG)digits[1]) << PyLong_SHIFT) | (unsigned PY_LONG_LONG)digits[0]));
+                        goto long_long;
+#endif
+                    }
+                    CYTHON_FALLTHROUGH;
+                case -4:
+                    if (8 * sizeof(long) - 1 > 4 * PyLong_SHIFT) {
+                        a = -(long) (((((((((unsigned long)digits[3]) << PyLong_SHIFT) | (unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0]));
+                        break;
+#ifdef HAVE_LONG_LONG
+                    } else if (8 * sizeof(PY_LONG_LONG) - 1 > 4 * PyLong_SHIFT) {
+                        lla = -(PY_LONG_LONG) (((((((((unsigned PY_LONG_LONG)digits[3]) << PyLong_SHIFT) | (unsigned PY_LONG_LONG)digits[2]) << PyLong_SHIFT) | (unsigned PY_LONG_LONG)digits[1]) << PyLong_SHIFT) | (unsigned PY_LONG_LONG)digits[0]));
+                        goto long_long;
+#endif
+                    }
+                    CYTHON_FALLTHROUGH;
+                case 4:
+                    if (8 * sizeof(long) - 1 > 4 * PyLong_SHIFT) {
+                        a = (long) (((((((((unsigned long)digits[3]) << PyLong_SHIFT) | (unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0]));
+                        break;
+#ifdef HAVE_LONG_LONG
+                    } else if (8 * sizeof(PY_LONG_LONG) - 1 > 4 * PyLong_SHIFT) {
+                        lla = (PY_LONG_LONG) (((((((((unsigned PY_LONG_LONG)digits[3]) << PyLong_SHIFT) | (unsigned PY_LONG_LONG)digits[2]) << PyLong_SHIFT) | (unsigned PY_LONG_LONG)digits[1]) << PyLong_SHIFT) | (unsigned PY_LONG_LONG)digits[0]));
+                        goto long_long;
+#endif
+                    }
+                    CYTHON_FALLTHROUGH;
+                default: return PyLong_Type.tp_as_number->nb_subtract(op1, op2);
+            }
+        }
+                x = a - b;
+            return PyLong_FromLong(x);
+#ifdef HAVE_LONG_LONG
+        long_long:
+                llx = lla - llb;
+            return PyLong_FromLongLong(llx);
+#endif
+        
+        
+    }
+    #endif
+    if (PyFloat_CheckExact(op1)) {
+        const long b = intval;
+        double a = PyFloat_AS_DOUBLE(op1);
+            double result;
+            PyFPE_START_PROTECT("subtract", return NULL)
+            result = ((double)a) - (double)b;
+            PyFPE_END_PROTECT(result)
+            return PyFloat_FromDouble(result);
+    }
+    return (inplace ? PyNumber_InPlaceSubtract : PyNumber_Subtract)(op1, op2);
+}
+#endif
+
+/* PyIntBinop */
+  #if !CYTHON_COMPILING_IN_PYPY
+static PyObject* __Pyx_PyInt_AddObjC(PyObject *op1, PyObject *op2, CYTHON_UNUSED long intval, int inplace, int zerodivision_check) {
+    (void)inplace;
+    (void)zerodivision_check;
+    #if PY_MAJOR_VERSION < 3
+    if (likely(PyInt_CheckExact(op1))) {
+        const long b = intval;
+        long x;
+        long a = PyInt_AS_LONG(op1);
+            x = (long)((unsigned long)a + b);
+            if (likely((x^a) >= 0 || (x^b) >= 0))
+                return PyInt_FromLong(x);
+            return PyLong_Type.tp_as_number->nb_add(op1, op2);
+    }
+    #endif
+    #if CYTHON_USE_PYLONG_INTERNALS
+    if (likely(PyLong_CheckExact(op1))) {
+        const long b = intval;
+        long a, x;
+#ifdef HAVE_LONG_LONG
+        const PY_LONG_LONG llb = intval;
+        PY_LONG_LONG lla, llx;
+#endif
+        const digit* digits = ((PyLongObject*)op1)->ob_digit;
+        const Py_ssize_t size = Py_SIZE(op1);
+        if (likely(__Pyx_sst_abs(size) <= 1)) {
+            a = likely(size) ? digits[0] : 0;
+            if (size == -1) a = -a;
+        } else {
+            switch (size) {
+                case -2:
+                    if (8 * sizeof(long) - 1 > 2 * PyLong_SHIFT) {
+                        a = -(long) (((((unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0]));
+                        break;
+#ifdef HAVE_LONG_LONG
+                    } else if (8 * sizeof(PY_LONG_LONG) - 1 > 2 * PyLong_SHIFT) {
+                        lla = -(PY_LONG_LONG) (((((unsigned PY_LONG_LONG)digits[1]) << PyLong_SHIFT) | (unsigned PY_LONG_LONG)digits[0]));
+                        goto long_long;
+#endif
+                    }
+                    CYTHON_FALLTHROUGH;
+                case 2:
+                    if (8 * sizeof(long) - 1 > 2 * PyLong_SHIFT) {
+                        a = (long) (((((unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0]));
+                        break;
+#ifdef HAVE_LONG_LONG
+                    } else if (8 * sizeof(PY_LONG_LONG) - 1 > 2 * PyLong_SHIFT) {
+                        lla = (PY_LONG_LONG) (((((unsigned PY_LONG_LONG)digits[1]) << PyLong_SHIFT) | (unsigned PY_LONG_LONG)digits[0]));
+                        goto long_long;
+#endif
+                    }
+                    CYTHON_FALLTHROUGH;
+                case -3:
+                    if (8 * sizeof(long) - 1 > 3 * PyLong_SHIFT) {
+                        a = -(long) (((((((unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0]));
+                        break;
+#ifdef HAVE_LONG_LONG
+                    } else if (8 * sizeof(PY_LONG_LONG) - 1 > 3 * PyLong_SHIFT) {
+                        lla = -(PY_LONG_LONG) (((((((unsigned PY_LONG_LONG)digits[2]) << PyLong_SHIFT) | (unsigned PY_LONG_LONG)digits[1]) << PyLong_SHIFT) | (unsigned PY_LONG_LONG)digits[0]));
+                        goto long_long;
+#endif
+                    }
+                    CYTHON_FALLTHROUGH;
+                case 3:
+                    if (8 * sizeof(long) - 1 > 3 * PyLong_SHIFT) {
+                        a = (long) (((((((unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0]));
+                        break;
+#ifdef HAVE_LONG_LONG
+                    } else if (8 * sizeof(PY_LONG_LONG) - 1 > 3 * PyLong_SHIFT) {
+                        lla = (PY_LONG_LONG) (((((((unsigned PY_LONG_LONG)digits[2]) << PyLong_SHIFT) | (unsigned PY_LONG_LONG)digits[1]) << PyLong_SHIFT) | (unsigned PY_LONG_LONG)digits[0]));
+                        goto long_long;
+#endif
+                    }
+                    CYTHON_FALLTHROUGH;
+                case -4:
+                    if (8 * sizeof(long) - 1 > 4 * PyLong_SHIFT) {
+                        a = -(long) (((((((((unsigned long)digits[3]) << PyLong_SHIFT) | (unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0]));
+                        break;
+#ifdef HAVE_LONG_LONG
+                    } else if (8 * sizeof(PY_LONG_LONG) - 1 > 4 * PyLong_SHIFT) {
+                        lla = -(PY_LONG_LONG) (((((((((unsigned PY_LONG_LONG)digits[3]) << PyLong_SHIFT) | (unsigned PY_LONG_LONG)digits[2]) << PyLong_SHIFT) | (unsigned PY_LONG_LONG)digits[1]) << PyLong_SHIFT) | (unsigned PY_LONG_LONG)digits[0]));
+                        goto long_long;
+#endif
+                    }
+                    CYTHON_FALLTHROUGH;
+                case 4:
+                    if (8 * sizeof(long) - 1 > 4 * PyLong_SHIFT) {
+                        a = (long) (((((((((unsigned long)digits[3]) << PyLong_SHIFT) | (unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0]));
+                        break;
+#ifdef HAVE_LONG_LONG
+                    } else if (8 * sizeof(PY_LONG_LONG) - 1 > 4 * PyLong_SHIFT) {
+                        lla = (PY_LONG_LONG) (((((((((unsigned PY_LONG_LONG)digits[3]) << PyLong_SHIFT) | (unsigned PY_LONG_LONG)digits[2]) << PyLong_SHIFT) | (unsigned PY_LONG_LONG)digits[1]) << PyLong_SHIFT) | (unsigned PY_LONG_LONG)digits[0]));
+                        goto long_long;
+#endif
+                    }
+                    CYTHON_FALLTHROUGH;
+                default: return PyLong_Type.tp_as_number->nb_add(op1, op2);
+            }
+        }
+                x = a + b;
+            return PyLong_FromLong(x);
+#ifdef HAVE_LONG_LONG
+        long_long:
+                llx = lla + llb;
+            return PyLong_FromLongLong(llx);
+#endif
+        
+        
+    }
+    #endif
+    if (PyFloat_CheckExact(op1)) {
+        const long b = intval;
+        double a = PyFloat_AS_DOUBLE(op1);
+            double result;
+            PyFPE_START_PROTECT("add", return NULL)
+            result = ((double)a) + (double)b;
+            PyFPE_END_PROTECT(result)
+            return PyFloat_FromDouble(result);
+    }
+    return (inplace ? PyNumber_InPlaceAdd : PyNumber_Add)(op1, op2);
+}
+#endif
+
+/* GetException */
+  #if CYTHON_FAST_THREAD_STATE
+static int __Pyx__GetException(PyThreadState *tstate, PyObject **type, PyObject **value, PyObject **tb)
+#else
+static int __Pyx_GetException(PyObject **type, PyObject **value, PyObject **tb)
+#endif
+{
+    PyObject *local_type, *local_value, *local_tb;
+#if CYTHON_FAST_THREAD_STATE
+    PyObject *tmp_type, *tmp_value, *tmp_tb;
+    local_type = tstate->curexc_type;
+    local_value = tstate->curexc_value;
+    local_tb = tstate->curexc_traceback;
+    tstate->curexc_type = 0;
+    tstate->curexc_value = 0;
+    tstate->curexc_traceback = 0;
+#else
+    PyErr_Fetch(&local_type, &local_value, &local_tb);
+#endif
+    PyErr_NormalizeException(&local_type, &local_value, &local_tb);
+#if CYTHON_FAST_THREAD_STATE
+    if (unlikely(tstate->curexc_type))
+#else
+    if (unlikely(PyErr_Occurred()))
+#endif
+        goto bad;
+    #if PY_MAJOR_VERSION >= 3
+    if (local_tb) {
+        if (unlikely(PyException_SetTraceback(local_value, local_tb) < 0))
+            goto bad;
+    }
+    #endif
+    Py_XINCREF(local_tb);
+    Py_XINCREF(local_type);
+    Py_XINCREF(local_value);
+    *type = local_type;
+    *value = local_value;
+    *tb = local_tb;
+#if CYTHON_FAST_THREAD_STATE
+    #if CYTHON_USE_EXC_INFO_STACK
+    {
+        _PyErr_StackItem *exc_info = tstate->exc_info;
+        tmp_type = exc_info->exc_type;
+        tmp_value = exc_info->exc_value;
+        tmp_tb = exc_info->exc_traceback;
+        exc_info->exc_type = local_type;
+        exc_info->exc_value = local_value;
+        exc_info->exc_traceback = local_tb;
+    }
+    #else
+    tmp_type = tstate->exc_type;
+    tmp_value = tstate->exc_value;
+    tmp_tb = tstate->exc_traceback;
+    tstate->exc_type = local_type;
+    tstate->exc_value = local_value;
+    tstate->exc_traceback = local_tb;
+    #endif
+    Py_XDECREF(tmp_type);
+    Py_XDECREF(tmp_value);
+    Py_XDECREF(tmp_tb);
+#else
+    PyErr_SetExcInfo(local_type, local_value, local_tb);
+#endif
+    return 0;
+bad:
+    *type = 0;
+    *value = 0;
+    *tb = 0;
+    Py_XDECREF(local_type);
+    Py_XDECREF(local_value);
+    Py_XDECREF(local_tb);
+    return -1;
+}
+
+/* SwapException */
+  #if CYTHON_FAST_THREAD_STATE
+static CYTHON_INLINE void __Pyx__ExceptionSwap(PyThreadState *tstate, PyObject **type, PyObject **value, PyObject **tb) {
+    PyObject *tmp_type, *tmp_value, *tmp_tb;
+    #if CYTHON_USE_EXC_INFO_STACK
+    _PyErr_StackItem *exc_info = tstate->exc_info;
+    tmp_type = exc_info->exc_type;
+    tmp_value = exc_info->exc_value;
+    tmp_tb = exc_info->exc_traceback;
+    exc_info->exc_type = *type;
+    exc_info->exc_value = *value;
+    exc_info->exc_traceback = *tb;
+    #else
+    tmp_type = tstate->exc_type;
+    tmp_value = tstate->exc_value;
+    tmp_tb = tstate->exc_traceback;
+    tstate->exc_type = *type;
+    tstate->exc_value = *value;
+    tstate->exc_traceback = *tb;
+    #endif
+    *type = tmp_type;
+    *value = tmp_value;
+    *tb = tmp_tb;
+}
+#else
+static CYTHON_INLINE void __Pyx_ExceptionSwap(PyObject **type, PyObject **value, PyObject **tb) {
+    PyObject *tmp_type, *tmp_value, *tmp_tb;
+    PyErr_GetExcInfo(&tmp_type, &tmp_value, &tmp_tb);
+    PyErr_SetExcInfo(*type, *value, *tb);
+    *type = tmp_type;
+    *value = tmp_value;
+    *tb = tmp_tb;
+}
+#endif
+
+/* GetTopmostException */
+  #if CYTHON_USE_EXC_INFO_STACK
+static _PyErr_StackItem *
+__Pyx_PyErr_GetTopmostException(PyThreadState *tstate)
+{
+    _PyErr_StackItem *exc_info = tstate->exc_info;
+    while ((exc_info->exc_type == NULL || exc_info->exc_type == Py_None) &&
+           exc_info->previous_item != NULL)
+    {
+        exc_info = exc_info->previous_item;
+    }
+    return exc_info;
+}
+#endif
+
+/* SaveResetException */
+  #if CYTHON_FAST_THREAD_STATE
+static CYTHON_INLINE void __Pyx__ExceptionSave(PyThreadState *tstate, PyObject **type, PyObject **value, PyObject **tb) {
+    #if CYTHON_USE_EXC_INFO_STACK
+    _PyErr_StackItem *exc_info = __Pyx_PyErr_GetTopmostException(tstate);
+    *type = exc_info->exc_type;
+    *value = exc_info->exc_value;
+    *tb = exc_info->exc_traceback;
+    #else
+    *type = tstate->exc_type;
+    *value = tstate->exc_value;
+    *tb = tstate->exc_traceback;
+    #endif
+    Py_XINCREF(*type);
+    Py_XINCREF(*value);
+    Py_XINCREF(*tb);
+}
+static CYTHON_INLINE void __Pyx__ExceptionReset(PyThreadState *tstate, PyObject *type, PyObject *value, PyObject *tb) {
+    PyObject *tmp_type, *tmp_value, *tmp_tb;
+    #if CYTHON_USE_EXC_INFO_STACK
+    _PyErr_StackItem *exc_info = tstate->exc_info;
+    tmp_type = exc_info->exc_type;
+    tmp_value = exc_info->exc_value;
+    tmp_tb = exc_info->exc_traceback;
+    exc_info->exc_type = type;
+    exc_info->exc_value = value;
+    exc_info->exc_traceback = tb;
+    #else
+    tmp_type = tstate->exc_type;
+    tmp_value = tstate->exc_value;
+    tmp_tb = tstate->exc_traceback;
+    tstate->exc_type = type;
+    tstate->exc_value = value;
+    tstate->exc_traceback = tb;
+    #endif
+    Py_XDECREF(tmp_type);
+    Py_XDECREF(tmp_value);
+    Py_XDECREF(tmp_tb);
+}
+#endif
+
+/* PyErrExceptionMatches */
+  #if CYTHON_FAST_THREAD_STATE
+static int __Pyx_PyErr_ExceptionMatchesTuple(PyObject *exc_type, PyObject *tuple) {
+    Py_ssize_t i, n;
+    n = PyTuple_GET_SIZE(tuple);
+#if PY_MAJOR_VERSION >= 3
+    for (i=0; i<n; i++) {
+        if (exc_type == PyTuple_GET_ITEM(tuple, i)) return 1;
+    }
+#endif
+    for (i=0; i<n; i++) {
+        if (__Pyx_PyErr_GivenExceptionMatches(exc_type, PyTuple_GET_ITEM(tuple, i))) return 1;
+    }
+    return 0;
+}
+static CYTHON_INLINE int __Pyx_PyErr_ExceptionMatchesInState(PyThreadState* tstate, PyObject* err) {
+    PyObject *exc_type = tstate->curexc_type;
+    if (exc_type == err) return 1;
+    if (unlikely(!exc_type)) return 0;
+    if (unlikely(PyTuple_Check(err)))
+        return __Pyx_PyErr_ExceptionMatchesTuple(exc_type, err);
+    return __Pyx_PyErr_GivenExceptionMatches(exc_type, err);
+}
+#endif
+
+/* RaiseException */
+  #if PY_MAJOR_VERSION < 3
+static void __Pyx_Raise(PyObject *type, PyObject *value, PyObject *tb,
+                        CYTHON_UNUSED PyObject *cause) {
+    __Pyx_PyThreadState_declare
+    Py_XINCREF(type);
+    if (!value || value == Py_None)
+        value = NULL;
+    else
+        Py_INCREF(value);
+    if (!tb || tb == Py_None)
+        tb = NULL;
+    else {
+        Py_INCREF(tb);
+        if (!PyTraceBack_Check(tb)) {
+            PyErr_SetString(PyExc_TypeError,
+                "raise: arg 3 must be a traceback or None");
+            goto raise_error;
+        }
+    }
+    if (PyType_Check(type)) {
+#if CYTHON_COMPILING_IN_PYPY
+        if (!value) {
+            Py_INCREF(Py_None);
+            value = Py_None;
+        }
+#endif
+        PyErr_NormalizeException(&type, &value, &tb);
+    } else {
+        if (value) {
+            PyErr_SetString(PyExc_TypeError,
+                "instance exception may not have a separate value");
+            goto raise_error;
+        }
+        value = type;
+        type = (PyObject*) Py_TYPE(type);
+        Py_INCREF(type);
+        if (!PyType_IsSubtype((PyTypeObject *)type, (PyTypeObject *)PyExc_BaseException)) {
+            PyErr_SetString(PyExc_TypeError,
+                "raise: exception class must be a subclass of BaseException");
+            goto raise_error;
+        }
+    }
+    __Pyx_PyThreadState_assign
+    __Pyx_ErrRestore(type, value, tb);
+    return;
+raise_error:
+    Py_XDECREF(value);
+    Py_XDECREF(type);
+    Py_XDECREF(tb);
+    return;
+}
+#else
+static void __Pyx_Raise(PyObject *type, PyObject *value, PyObject *tb, PyObject *cause) {
+    PyObject* owned_instance = NULL;
+    if (tb == Py_None) {
+        tb = 0;
+    } else if (tb && !PyTraceBack_Check(tb)) {
+        PyErr_SetString(PyExc_TypeError,
+            "raise: arg 3 must be a traceback or None");
+        goto bad;
+    }
+    if (value == Py_None)
+        value = 0;
+    if (PyExceptionInstance_Check(type)) {
+        if (value) {
+            PyErr_SetString(PyExc_TypeError,
+                "instance exception may not have a separate value");
+            goto bad;
+        }
+        value = type;
+        type = (PyObject*) Py_TYPE(value);
+    } else if (PyExceptionClass_Check(type)) {
+        PyObject *instance_class = NULL;
+        if (value && PyExceptionInstance_Check(value)) {
+            instance_class = (PyObject*) Py_TYPE(value);
+            if (instance_class != type) {
+                int is_subclass = PyObject_IsSubclass(instance_class, type);
+                if (!is_subclass) {
+                    instance_class = NULL;
+                } else if (unlikely(is_subclass == -1)) {
+                    goto bad;
+                } else {
+                    type = instance_class;
+                }
+            }
+        }
+        if (!instance_class) {
+            PyObject *args;
+            if (!value)
+                args = PyTuple_New(0);
+            else if (PyTuple_Check(value)) {
+                Py_INCREF(value);
+                args = value;
+            } else
+                args = PyTuple_Pack(1, value);
+            if (!args)
+                goto bad;
+            owned_instance = PyObject_Call(type, args, NULL);
+            Py_DECREF(args);
+            if (!owned_instance)
+                goto bad;
+            value = owned_instance;
+            if (!PyExceptionInstance_Check(value)) {
+                PyErr_Format(PyExc_TypeError,
+                             "calling %R should have returned an instance of "
+                             "BaseException, not %R",
+                             type, Py_TYPE(value));
+                goto bad;
+            }
+        }
+    } else {
+        PyErr_SetString(PyExc_TypeError,
+            "raise: exception class must be a subclass of BaseException");
+        goto bad;
+    }
+    if (cause) {
+        PyObject *fixed_cause;
+        if (cause == Py_None) {
+            fixed_cause = NULL;
+        } else if (PyExceptionClass_Check(cause)) {
+            fixed_cause = PyObject_CallObject(cause, NULL);
+            if (fixed_cause == NULL)
+                goto bad;
+        } else if (PyExceptionInstance_Check(cause)) {
+            fixed_cause = cause;
+            Py_INCREF(fixed_cause);
+        } else {
+            PyErr_SetString(PyExc_TypeError,
+                            "exception causes must derive from "
+                            "BaseException");
+            goto bad;
+        }
+        PyException_SetCause(value, fixed_cause);
+    }
+    PyErr_SetObject(type, value);
+    if (tb) {
+#if CYTHON_FAST_THREAD_STATE
+        PyThreadState *tstate = __Pyx_PyThreadState_Current;
+        PyObject* tmp_tb = tstate->curexc_traceback;
+        if (tb != tmp_tb) {
+            Py_INCREF(tb);
+            tstate->curexc_traceback = tb;
+            Py_XDECREF(tmp_tb);
+        }
+#else
+        PyObject *tmp_type, *tmp_value, *tmp_tb;
+        PyErr_Fetch(&tmp_type, &tmp_value, &tmp_tb);
+        Py_INCREF(tb);
+        PyErr_Restore(tmp_type, tmp_value, tb);
+        Py_XDECREF(tmp_tb);
+#endif
+    }
+bad:
+    Py_XDECREF(owned_instance);
+    return;
+}
+#endif
+
+/* TypeImport */
+  #ifndef __PYX_HAVE_RT_ImportType_0_29_37
+#define __PYX_HAVE_RT_ImportType_0_29_37
+static PyTypeObject *__Pyx_ImportType_0_29_37(PyObject *module, const char *module_name, const char *class_name,
+    size_t size, size_t alignment, enum __Pyx_ImportType_CheckSize_0_29_37 check_size)
+{
+    PyObject *result = 0;
+    char warning[200];
+    Py_ssize_t basicsize;
+    Py_ssize_t itemsize;
+#ifdef Py_LIMITED_API
+    PyObject *py_basicsize;
+    PyObject *py_itemsize;
+#endif
+    result = PyObject_GetAttrString(module, class_name);
+    if (!result)
+        goto bad;
+    if (!PyType_Check(result)) {
+        PyErr_Format(PyExc_TypeError,
+            "%.200s.%.200s is not a type object",
+            module_name, class_name);
+        goto bad;
+    }
+#ifndef Py_LIMITED_API
+    basicsize = ((PyTypeObject *)result)->tp_basicsize;
+    itemsize = ((PyTypeObject *)result)->tp_itemsize;
+#else
+    py_basicsize = PyObject_GetAttrString(result, "__basicsize__");
+    if (!py_basicsize)
+        goto bad;
+    basicsize = PyLong_AsSsize_t(py_basicsize);
+    Py_DECREF(py_basicsize);
+    py_basicsize = 0;
+    if (basicsize == (Py_ssize_t)-1 && PyErr_Occurred())
+        goto bad;
+    py_itemsize = PyObject_GetAttrString(result, "__itemsize__");
+    if (!py_itemsize)
+        goto bad;
+    itemsize = PyLong_AsSsize_t(py_itemsize);
+    Py_DECREF(py_itemsize);
+    py_itemsize = 0;
+    if (itemsize == (Py_ssize_t)-1 && PyErr_Occurred())
+        goto bad;
+#endif
+    if (itemsize) {
+        if (size % alignment) {
+            alignment = size % alignment;
+        }
+        if (itemsize < (Py_ssize_t)alignment)
+            itemsize = (Py_ssize_t)alignment;
+    }
+    if ((size_t)(basicsize + itemsize) < size) {
+        PyErr_Format(PyExc_ValueError,
+            "%.200s.%.200s size changed, may indicate binary incompatibility. "
+            "Expected %zd from C header, got %zd from PyObject",
+            module_name, class_name, size, basicsize);
+        goto bad;
+    }
+    if (check_size == __Pyx_ImportType_CheckSize_Error_0_29_37 && (size_t)basicsize != size) {
+        PyErr_Format(PyExc_ValueError,
+            "%.200s.%.200s size changed, may indicate binary incompatibility. "
+            "Expected %zd from C header, got %zd from PyObject",
+            module_name, class_name, size, basicsize);
+        goto bad;
+    }
+    else if (check_size == __Pyx_ImportType_CheckSize_Warn_0_29_37 && (size_t)basicsize > size) {
+        PyOS_snprintf(warning, sizeof(warning),
+            "%s.%s size changed, may indicate binary incompatibility. "
+            "Expected %zd from C header, got %zd from PyObject",
+            module_name, class_name, size, basicsize);
+        if (PyErr_WarnEx(NULL, warning, 0) < 0) goto bad;
+    }
+    return (PyTypeObject *)result;
+bad:
+    Py_XDECREF(result);
+    return NULL;
+}
+#endif
+
+/* Import */
+  static PyObject *__Pyx_Import(PyObject *name, PyObject *from_list, int level) {
+    PyObject *empty_list = 0;
+    PyObject *module = 0;
+    PyObject *global_dict = 0;
+    PyObject *empty_dict = 0;
+    PyObject *list;
+    #if PY_MAJOR_VERSION < 3
+    PyObject *py_import;
+    py_import = __Pyx_PyObject_GetAttrStr(__pyx_b, __pyx_n_s_import);
+    if (!py_import)
+        goto bad;
+    #endif
+    if (from_list)
+        list = from_list;
+    else {
+        empty_list = PyList_New(0);
+        if (!empty_list)
+            goto bad;
+        list = empty_list;
+    }
+    global_dict = PyModule_GetDict(__pyx_m);
+    if (!global_dict)
+        goto bad;
+    empty_dict = PyDict_New();
+    if (!empty_dict)
+        goto bad;
+    {
+        #if PY_MAJOR_VERSION >= 3
+        if (level == -1) {
+            if ((1) && (strchr(__Pyx_MODULE_NAME, '.'))) {
+                module = PyImport_ImportModuleLevelObject(
+                    name, global_dict, empty_dict, list, 1);
+                if (!module) {
+                    if (!PyErr_ExceptionMatches(PyExc_ImportError))
+                        goto bad;
+                    PyErr_Clear();
+                }
+            }
+            level = 0;
+        }
+        #endif
+        if (!module) {
+            #if PY_MAJOR_VERSION < 3
+            PyObject *py_level = PyInt_FromLong(level);
+            if (!py_level)
+                goto bad;
+            module = PyObject_CallFunctionObjArgs(py_import,
+                name, global_dict, empty_dict, list, py_level, (PyObject *)NULL);
+            Py_DECREF(py_level);
+            #else
+            module = PyImport_ImportModuleLevelObject(
+                name, global_dict, empty_dict, list, level);
+            #endif
+        }
+    }
+bad:
+    #if PY_MAJOR_VERSION < 3
+    Py_XDECREF(py_import);
+    #endif
+    Py_XDECREF(empty_list);
+    Py_XDECREF(empty_dict);
+    return module;
+}
+
+/* CLineInTraceback */
+  #ifndef CYTHON_CLINE_IN_TRACEBACK
+static int __Pyx_CLineForTraceback(CYTHON_UNUSED PyThreadState *tstate, int c_line) {
+    PyObject *use_cline;
+    PyObject *ptype, *pvalue, *ptraceback;
+#if CYTHON_COMPILING_IN_CPYTHON
+    PyObject **cython_runtime_dict;
+#endif
+    if (unlikely(!__pyx_cython_runtime)) {
+        return c_line;
+    }
+    __Pyx_ErrFetchInState(tstate, &ptype, &pvalue, &ptraceback);
+#if CYTHON_COMPILING_IN_CPYTHON
+    cython_runtime_dict = _PyObject_GetDictPtr(__pyx_cython_runtime);
+    if (likely(cython_runtime_dict)) {
+        __PYX_PY_DICT_LOOKUP_IF_MODIFIED(
+            use_cline, *cython_runtime_dict,
+            __Pyx_PyDict_GetItemStr(*cython_runtime_dict, __pyx_n_s_cline_in_traceback))
+    } else
+#endif
+    {
+      PyObject *use_cline_obj = __Pyx_PyObject_GetAttrStr(__pyx_cython_runtime, __pyx_n_s_cline_in_traceback);
+      if (use_cline_obj) {
+        use_cline = PyObject_Not(use_cline_obj) ? Py_False : Py_True;
+        Py_DECREF(use_cline_obj);
+      } else {
+        PyErr_Clear();
+        use_cline = NULL;
+      }
+    }
+    if (!use_cline) {
+        c_line = 0;
+        (void) PyObject_SetAttr(__pyx_cython_runtime, __pyx_n_s_cline_in_traceback, Py_False);
+    }
+    else if (use_cline == Py_False || (use_cline != Py_True && PyObject_Not(use_cline) != 0)) {
+        c_line = 0;
+    }
+    __Pyx_ErrRestoreInState(tstate, ptype, pvalue, ptraceback);
+    return c_line;
+}
+#endif
+
+/* CodeObjectCache */
+  static int __pyx_bisect_code_objects(__Pyx_CodeObjectCacheEntry* entries, int count, int code_line) {
+    int start = 0, mid = 0, end = count - 1;
+    if (end >= 0 && code_line > entries[end].code_line) {
+        return count;
+    }
+    while (start < end) {
+        mid = start + (end - start) / 2;
+        if (code_line < entries[mid].code_line) {
+            end = mid;
+        } else if (code_line > entries[mid].code_line) {
+             start = mid + 1;
+        } else {
+            return mid;
+        }
+    }
+    if (code_line <= entries[mid].code_line) {
+        return mid;
+    } else {
+        return mid + 1;
+    }
+}
+static PyCodeObject *__pyx_find_code_object(int code_line) {
+    PyCodeObject* code_object;
+    int pos;
+    if (unlikely(!code_line) || unlikely(!__pyx_code_cache.entries)) {
+        return NULL;
+    }
+    pos = __pyx_bisect_code_objects(__pyx_code_cache.entries, __pyx_code_cache.count, code_line);
+    if (unlikely(pos >= __pyx_code_cache.count) || unlikely(__pyx_code_cache.entries[pos].code_line != code_line)) {
+        return NULL;
+    }
+    code_object = __pyx_code_cache.entries[pos].code_object;
+    Py_INCREF(code_object);
+    return code_object;
+}
+static void __pyx_insert_code_object(int code_line, PyCodeObject* code_object) {
+    int pos, i;
+    __Pyx_CodeObjectCacheEntry* entries = __pyx_code_cache.entries;
+    if (unlikely(!code_line)) {
+        return;
+    }
+    if (unlikely(!entries)) {
+        entries = (__Pyx_CodeObjectCacheEntry*)PyMem_Malloc(64*sizeof(__Pyx_CodeObjectCacheEntry));
+        if (likely(entries)) {
+            __pyx_code_cache.entries = entries;
+            __pyx_code_cache.max_count = 64;
+            __pyx_code_cache.count = 1;
+            entries[0].code_line = code_line;
+            entries[0].code_object = code_object;
+            Py_INCREF(code_object);
+        }
+        return;
+    }
+    pos = __pyx_bisect_code_objects(__pyx_code_cache.entries, __pyx_code_cache.count, code_line);
+    if ((pos < __pyx_code_cache.count) && unlikely(__pyx_code_cache.entries[pos].code_line == code_line)) {
+        PyCodeObject* tmp = entries[pos].code_object;
+        entries[pos].code_object = code_object;
+        Py_DECREF(tmp);
+        return;
+    }
+    if (__pyx_code_cache.count == __pyx_code_cache.max_count) {
+        int new_max = __pyx_code_cache.max_count + 64;
+        entries = (__Pyx_CodeObjectCacheEntry*)PyMem_Realloc(
+            __pyx_code_cache.entries, ((size_t)new_max) * sizeof(__Pyx_CodeObjectCacheEntry));
+        if (unlikely(!entries)) {
+            return;
+        }
+        __pyx_code_cache.entries = entries;
+        __pyx_code_cache.max_count = new_max;
+    }
+    for (i=__pyx_code_cache.count; i>pos; i--) {
+        entries[i] = entries[i-1];
+    }
+    entries[pos].code_line = code_line;
+    entries[pos].code_object = code_object;
+    __pyx_code_cache.count++;
+    Py_INCREF(code_object);
+}
+
+/* AddTraceback */
+  #include "compile.h"
+#include "frameobject.h"
+#include "traceback.h"
+#if PY_VERSION_HEX >= 0x030b00a6
+  #ifndef Py_BUILD_CORE
+    #define Py_BUILD_CORE 1
+  #endif
+  #include "internal/pycore_frame.h"
+#endif
+static PyCodeObject* __Pyx_CreateCodeObjectForTraceback(
+            const char *funcname, int c_line,
+            int py_line, const char *filename) {
+    PyCodeObject *py_code = NULL;
+    PyObject *py_funcname = NULL;
+    #if PY_MAJOR_VERSION < 3
+    PyObject *py_srcfile = NULL;
+    py_srcfile = PyString_FromString(filename);
+    if (!py_srcfile) goto bad;
+    #endif
+    if (c_line) {
+        #if PY_MAJOR_VERSION < 3
+        py_funcname = PyString_FromFormat( "%s (%s:%d)", funcname, __pyx_cfilenm, c_line);
+        if (!py_funcname) goto bad;
+        #else
+        py_funcname = PyUnicode_FromFormat( "%s (%s:%d)", funcname, __pyx_cfilenm, c_line);
+        if (!py_funcname) goto bad;
+        funcname = PyUnicode_AsUTF8(py_funcname);
+        if (!funcname) goto bad;
+        #endif
+    }
+    else {
+        #if PY_MAJOR_VERSION < 3
+        py_funcname = PyString_FromString(funcname);
+        if (!py_funcname) goto bad;
+        #endif
+    }
+    #if PY_MAJOR_VERSION < 3
+    py_code = __Pyx_PyCode_New(
+        0,
+        0,
+        0,
+        0,
+        0,
+        __pyx_empty_bytes, /*PyObject *code,*/
+        __pyx_empty_tuple, /*PyObject *consts,*/
+        __pyx_empty_tuple, /*PyObject *names,*/
+        __pyx_empty_tuple, /*PyObject *varnames,*/
+        __pyx_empty_tuple, /*PyObject *freevars,*/
+        __pyx_empty_tuple, /*PyObject *cellvars,*/
+        py_srcfile,   /*PyObject *filename,*/
+        py_funcname,  /*PyObject *name,*/
+        py_line,
+        __pyx_empty_bytes  /*PyObject *lnotab*/
+    );
+    Py_DECREF(py_srcfile);
+    #else
+    py_code = PyCode_NewEmpty(filename, funcname, py_line);
+    #endif
+    Py_XDECREF(py_funcname);  // XDECREF since it's only set on Py3 if cline
+    return py_code;
+bad:
+    Py_XDECREF(py_funcname);
+    #if PY_MAJOR_VERSION < 3
+    Py_XDECREF(py_srcfile);
+    #endif
+    return NULL;
+}
+static void __Pyx_AddTraceback(const char *funcname, int c_line,
+                               int py_line, const char *filename) {
+    PyCodeObject *py_code = 0;
+    PyFrameObject *py_frame = 0;
+    PyThreadState *tstate = __Pyx_PyThreadState_Current;
+    PyObject *ptype, *pvalue, *ptraceback;
+    if (c_line) {
+        c_line = __Pyx_CLineForTraceback(tstate, c_line);
+    }
+    py_code = __pyx_find_code_object(c_line ? -c_line : py_line);
+    if (!py_code) {
+        __Pyx_ErrFetchInState(tstate, &ptype, &pvalue, &ptraceback);
+        py_code = __Pyx_CreateCodeObjectForTraceback(
+            funcname, c_line, py_line, filename);
+        if (!py_code) {
+            /* If the code object creation fails, then we should clear the
+               fetched exception references and propagate the new exception */
+            Py_XDECREF(ptype);
+            Py_XDECREF(pvalue);
+            Py_XDECREF(ptraceback);
+            goto bad;
+        }
+        __Pyx_ErrRestoreInState(tstate, ptype, pvalue, ptraceback);
+        __pyx_insert_code_object(c_line ? -c_line : py_line, py_code);
+    }
+    py_frame = PyFrame_New(
+        tstate,            /*PyThreadState *tstate,*/
+        py_code,           /*PyCodeObject *code,*/
+        __pyx_d,    /*PyObject *globals,*/
+        0                  /*PyObject *locals*/
+    );
+    if (!py_frame) goto bad;
+    __Pyx_PyFrame_SetLineNumber(py_frame, py_line);
+    PyTraceBack_Here(py_frame);
+bad:
+    Py_XDECREF(py_code);
+    Py_XDECREF(py_frame);
+}
+
+#if PY_MAJOR_VERSION < 3
+static int __Pyx_GetBuffer(PyObject *obj, Py_buffer *view, int flags) {
+    if (PyObject_CheckBuffer(obj)) return PyObject_GetBuffer(obj, view, flags);
+    PyErr_Format(PyExc_TypeError, "'%.200s' does not have the buffer interface", Py_TYPE(obj)->tp_name);
+    return -1;
+}
+static void __Pyx_ReleaseBuffer(Py_buffer *view) {
+    PyObject *obj = view->obj;
+    if (!obj) return;
+    if (PyObject_CheckBuffer(obj)) {
+        PyBuffer_Release(view);
+        return;
+    }
+    if ((0)) {}
+    view->obj = NULL;
+    Py_DECREF(obj);
+}
+#endif
+
+
+  /* CIntFromPyVerify */
+  #define __PYX_VERIFY_RETURN_INT(target_type, func_type, func_value)\
+    __PYX__VERIFY_RETURN_INT(target_type, func_type, func_value, 0)
+#define __PYX_VERIFY_RETURN_INT_EXC(target_type, func_type, func_value)\
+    __PYX__VERIFY_RETURN_INT(target_type, func_type, func_value, 1)
+#define __PYX__VERIFY_RETURN_INT(target_type, func_type, func_value, exc)\
+    {\
+        func_type value = func_value;\
+        if (sizeof(target_type) < sizeof(func_type)) {\
+            if (unlikely(value != (func_type) (target_type) value)) {\
+                func_type zero = 0;\
+                if (exc && unlikely(value == (func_type)-1 && PyErr_Occurred()))\
+                    return (target_type) -1;\
+                if (is_unsigned && unlikely(value < zero))\
+                    goto raise_neg_overflow;\
+                else\
+                    goto raise_overflow;\
+            }\
+        }\
+        return (target_type) value;\
+    }
+
+/* Declarations */
+  #if CYTHON_CCOMPLEX
+  #ifdef __cplusplus
+    static CYTHON_INLINE __pyx_t_float_complex __pyx_t_float_complex_from_parts(float x, float y) {
+      return ::std::complex< float >(x, y);
+    }
+  #else
+    static CYTHON_INLINE __pyx_t_float_complex __pyx_t_float_complex_from_parts(float x, float y) {
+      return x + y*(__pyx_t_float_complex)_Complex_I;
+    }
+  #endif
+#else
+    static CYTHON_INLINE __pyx_t_float_complex __pyx_t_float_complex_from_parts(float x, float y) {
+      __pyx_t_float_complex z;
+      z.real = x;
+      z.imag = y;
+      return z;
+    }
+#endif
+
+/* Arithmetic */
+  #if CYTHON_CCOMPLEX
+#else
+    static CYTHON_INLINE int __Pyx_c_eq_float(__pyx_t_float_complex a, __pyx_t_float_complex b) {
+       return (a.real == b.real) && (a.imag == b.imag);
+    }
+    static CYTHON_INLINE __pyx_t_float_complex __Pyx_c_sum_float(__pyx_t_float_complex a, __pyx_t_float_complex b) {
+        __pyx_t_float_complex z;
+        z.real = a.real + b.real;
+        z.imag = a.imag + b.imag;
+        return z;
+    }
+    static CYTHON_INLINE __pyx_t_float_complex __Pyx_c_diff_float(__pyx_t_float_complex a, __pyx_t_float_complex b) {
+        __pyx_t_float_complex z;
+        z.real = a.real - b.real;
+        z.imag = a.imag - b.imag;
+        return z;
+    }
+    static CYTHON_INLINE __pyx_t_float_complex __Pyx_c_prod_float(__pyx_t_float_complex a, __pyx_t_float_complex b) {
+        __pyx_t_float_complex z;
+        z.real = a.real * b.real - a.imag * b.imag;
+        z.imag = a.real * b.imag + a.imag * b.real;
+        return z;
+    }
+    #if 1
+    static CYTHON_INLINE __pyx_t_float_complex __Pyx_c_quot_float(__pyx_t_float_complex a, __pyx_t_float_complex b) {
+        if (b.imag == 0) {
+            return __pyx_t_float_complex_from_parts(a.real / b.real, a.imag / b.real);
+        } else if (fabsf(b.real) >= fabsf(b.imag)) {
+            if (b.real == 0 && b.imag == 0) {
+                return __pyx_t_float_complex_from_parts(a.real / b.real, a.imag / b.imag);
+            } else {
+                float r = b.imag / b.real;
+                float s = (float)(1.0) / (b.real + b.imag * r);
+                return __pyx_t_float_complex_from_parts(
+                    (a.real + a.imag * r) * s, (a.imag - a.real * r) * s);
+            }
+        } else {
+            float r = b.real / b.imag;
+            float s = (float)(1.0) / (b.imag + b.real * r);
+            return __pyx_t_float_complex_from_parts(
+                (a.real * r + a.imag) * s, (a.imag * r - a.real) * s);
+        }
+    }
+    #else
+    static CYTHON_INLINE __pyx_t_float_complex __Pyx_c_quot_float(__pyx_t_float_complex a, __pyx_t_float_complex b) {
+        if (b.imag == 0) {
+            return __pyx_t_float_complex_from_parts(a.real / b.real, a.imag / b.real);
+        } else {
+            float denom = b.real * b.real + b.imag * b.imag;
+            return __pyx_t_float_complex_from_parts(
+                (a.real * b.real + a.imag * b.imag) / denom,
+                (a.imag * b.real - a.real * b.imag) / denom);
+        }
+    }
+    #endif
+    static CYTHON_INLINE __pyx_t_float_complex __Pyx_c_neg_float(__pyx_t_float_complex a) {
+        __pyx_t_float_complex z;
+        z.real = -a.real;
+        z.imag = -a.imag;
+        return z;
+    }
+    static CYTHON_INLINE int __Pyx_c_is_zero_float(__pyx_t_float_complex a) {
+       return (a.real == 0) && (a.imag == 0);
+    }
+    static CYTHON_INLINE __pyx_t_float_complex __Pyx_c_conj_float(__pyx_t_float_complex a) {
+        __pyx_t_float_complex z;
+        z.real =  a.real;
+        z.imag = -a.imag;
+        return z;
+    }
+    #if 1
+        static CYTHON_INLINE float __Pyx_c_abs_float(__pyx_t_float_complex z) {
+          #if !defined(HAVE_HYPOT) || defined(_MSC_VER)
+            return sqrtf(z.real*z.real + z.imag*z.imag);
+          #else
+            return hypotf(z.real, z.imag);
+          #endif
+        }
+        static CYTHON_INLINE __pyx_t_float_complex __Pyx_c_pow_float(__pyx_t_float_complex a, __pyx_t_float_complex b) {
+            __pyx_t_float_complex z;
+            float r, lnr, theta, z_r, z_theta;
+            if (b.imag == 0 && b.real == (int)b.real) {
+                if (b.real < 0) {
+                    float denom = a.real * a.real + a.imag * a.imag;
+                    a.real = a.real / denom;
+                    a.imag = -a.imag / denom;
+                    b.real = -b.real;
+                }
+                switch ((int)b.real) {
+                    case 0:
+                        z.real = 1;
+                        z.imag = 0;
+                        return z;
+                    case 1:
+                        return a;
+                    case 2:
+                        return __Pyx_c_prod_float(a, a);
+                    case 3:
+                        z = __Pyx_c_prod_float(a, a);
+                        return __Pyx_c_prod_float(z, a);
+                    case 4:
+                        z = __Pyx_c_prod_float(a, a);
+                        return __Pyx_c_prod_float(z, z);
+                }
+            }
+            if (a.imag == 0) {
+                if (a.real == 0) {
+                    return a;
+                } else if ((b.imag == 0) && (a.real >= 0)) {
+                    z.real = powf(a.real, b.real);
+                    z.imag = 0;
+                    return z;
+                } else if (a.real > 0) {
+                    r = a.real;
+                    theta = 0;
+                } else {
+                    r = -a.real;
+                    theta = atan2f(0.0, -1.0);
+                }
+            } else {
+                r = __Pyx_c_abs_float(a);
+                theta = atan2f(a.imag, a.real);
+            }
+            lnr = logf(r);
+            z_r = expf(lnr * b.real - theta * b.imag);
+            z_theta = theta * b.real + lnr * b.imag;
+            z.real = z_r * cosf(z_theta);
+            z.imag = z_r * sinf(z_theta);
+            return z;
+        }
+    #endif
+#endif
+
+/* Declarations */
+  #if CYTHON_CCOMPLEX
+  #ifdef __cplusplus
+    static CYTHON_INLINE __pyx_t_double_complex __pyx_t_double_complex_from_parts(double x, double y) {
+      return ::std::complex< double >(x, y);
+    }
+  #else
+    static CYTHON_INLINE __pyx_t_double_complex __pyx_t_double_complex_from_parts(double x, double y) {
+      return x + y*(__pyx_t_double_complex)_Complex_I;
+    }
+  #endif
+#else
+    static CYTHON_INLINE __pyx_t_double_complex __pyx_t_double_complex_from_parts(double x, double y) {
+      __pyx_t_double_complex z;
+      z.real = x;
+      z.imag = y;
+      return z;
+    }
+#endif
+
+/* Arithmetic */
+  #if CYTHON_CCOMPLEX
+#else
+    static CYTHON_INLINE int __Pyx_c_eq_double(__pyx_t_double_complex a, __pyx_t_double_complex b) {
+       return (a.real == b.real) && (a.imag == b.imag);
+    }
+    static CYTHON_INLINE __pyx_t_double_complex __Pyx_c_sum_double(__pyx_t_double_complex a, __pyx_t_double_complex b) {
+        __pyx_t_double_complex z;
+        z.real = a.real + b.real;
+        z.imag = a.imag + b.imag;
+        return z;
+    }
+    static CYTHON_INLINE __pyx_t_double_complex __Pyx_c_diff_double(__pyx_t_double_complex a, __pyx_t_double_complex b) {
+        __pyx_t_double_complex z;
+        z.real = a.real - b.real;
+        z.imag = a.imag - b.imag;
+        return z;
+    }
+    static CYTHON_INLINE __pyx_t_double_complex __Pyx_c_prod_double(__pyx_t_double_complex a, __pyx_t_double_complex b) {
+        __pyx_t_double_complex z;
+        z.real = a.real * b.real - a.imag * b.imag;
+        z.imag = a.real * b.imag + a.imag * b.real;
+        return z;
+    }
+    #if 1
+    static CYTHON_INLINE __pyx_t_double_complex __Pyx_c_quot_double(__pyx_t_double_complex a, __pyx_t_double_complex b) {
+        if (b.imag == 0) {
+            return __pyx_t_double_complex_from_parts(a.real / b.real, a.imag / b.real);
+        } else if (fabs(b.real) >= fabs(b.imag)) {
+            if (b.real == 0 && b.imag == 0) {
+                return __pyx_t_double_complex_from_parts(a.real / b.real, a.imag / b.imag);
+            } else {
+                double r = b.imag / b.real;
+                double s = (double)(1.0) / (b.real + b.imag * r);
+                return __pyx_t_double_complex_from_parts(
+                    (a.real + a.imag * r) * s, (a.imag - a.real * r) * s);
+            }
+        } else {
+            double r = b.real / b.imag;
+            double s = (double)(1.0) / (b.imag + b.real * r);
+            return __pyx_t_double_complex_from_parts(
+                (a.real * r + a.imag) * s, (a.imag * r - a.real) * s);
+        }
+    }
+    #else
+    static CYTHON_INLINE __pyx_t_double_complex __Pyx_c_quot_double(__pyx_t_double_complex a, __pyx_t_double_complex b) {
+        if (b.imag == 0) {
+            return __pyx_t_double_complex_from_parts(a.real / b.real, a.imag / b.real);
+        } else {
+            double denom = b.real * b.real + b.imag * b.imag;
+            return __pyx_t_double_complex_from_parts(
+                (a.real * b.real + a.imag * b.imag) / denom,
+                (a.imag * b.real - a.real * b.imag) / denom);
+        }
+    }
+    #endif
+    static CYTHON_INLINE __pyx_t_double_complex __Pyx_c_neg_double(__pyx_t_double_complex a) {
+        __pyx_t_double_complex z;
+        z.real = -a.real;
+        z.imag = -a.imag;
+        return z;
+    }
+    static CYTHON_INLINE int __Pyx_c_is_zero_double(__pyx_t_double_complex a) {
+       return (a.real == 0) && (a.imag == 0);
+    }
+    static CYTHON_INLINE __pyx_t_double_complex __Pyx_c_conj_double(__pyx_t_double_complex a) {
+        __pyx_t_double_complex z;
+        z.real =  a.real;
+        z.imag = -a.imag;
+        return z;
+    }
+    #if 1
+        static CYTHON_INLINE double __Pyx_c_abs_double(__pyx_t_double_complex z) {
+          #if !defined(HAVE_HYPOT) || defined(_MSC_VER)
+            return sqrt(z.real*z.real + z.imag*z.imag);
+          #else
+            return hypot(z.real, z.imag);
+          #endif
+        }
+        static CYTHON_INLINE __pyx_t_double_complex __Pyx_c_pow_double(__pyx_t_double_complex a, __pyx_t_double_complex b) {
+            __pyx_t_double_complex z;
+            double r, lnr, theta, z_r, z_theta;
+            if (b.imag == 0 && b.real == (int)b.real) {
+                if (b.real < 0) {
+                    double denom = a.real * a.real + a.imag * a.imag;
+                    a.real = a.real / denom;
+                    a.imag = -a.imag / denom;
+                    b.real = -b.real;
+                }
+                switch ((int)b.real) {
+                    case 0:
+                        z.real = 1;
+                        z.imag = 0;
+                        return z;
+                    case 1:
+                        return a;
+                    case 2:
+                        return __Pyx_c_prod_double(a, a);
+                    case 3:
+                        z = __Pyx_c_prod_double(a, a);
+                        return __Pyx_c_prod_double(z, a);
+                    case 4:
+                        z = __Pyx_c_prod_double(a, a);
+                        return __Pyx_c_prod_double(z, z);
+                }
+            }
+            if (a.imag == 0) {
+                if (a.real == 0) {
+                    return a;
+                } else if ((b.imag == 0) && (a.real >= 0)) {
+                    z.real = pow(a.real, b.real);
+                    z.imag = 0;
+                    return z;
+                } else if (a.real > 0) {
+                    r = a.real;
+                    theta = 0;
+                } else {
+                    r = -a.real;
+                    theta = atan2(0.0, -1.0);
+                }
+            } else {
+                r = __Pyx_c_abs_double(a);
+                theta = atan2(a.imag, a.real);
+            }
+            lnr = log(r);
+            z_r = exp(lnr * b.real - theta * b.imag);
+            z_theta = theta * b.real + lnr * b.imag;
+            z.real = z_r * cos(z_theta);
+            z.imag = z_r * sin(z_theta);
+            return z;
+        }
+    #endif
+#endif
+
+/* CIntFromPy */
+  static CYTHON_INLINE npy_long __Pyx_PyInt_As_npy_long(PyObject *x) {
+#ifdef __Pyx_HAS_GCC_DIAGNOSTIC
+#pragma GCC diagnostic push
+#pragma GCC diagnostic ignored "-Wconversion"
+#endif
+    const npy_long neg_one = (npy_long) -1, const_zero = (npy_long) 0;
+#ifdef __Pyx_HAS_GCC_DIAGNOSTIC
+#pragma GCC diagnostic pop
+#endif
+    const int is_unsigned = neg_one > const_zero;
+#if PY_MAJOR_VERSION < 3
+    if (likely(PyInt_Check(x))) {
+        if (sizeof(npy_long) < sizeof(long)) {
+            __PYX_VERIFY_RETURN_INT(npy_long, long, PyInt_AS_LONG(x))
+        } else {
+            long val = PyInt_AS_LONG(x);
+            if (is_unsigned && unlikely(val < 0)) {
+                goto raise_neg_overflow;
+            }
+            return (npy_long) val;
+        }
+    } else
+#endif
+    if (likely(PyLong_Check(x))) {
+        if (is_unsigned) {
+#if CYTHON_USE_PYLONG_INTERNALS
+            const digit* digits = ((PyLongObject*)x)->ob_digit;
+            switch (Py_SIZE(x)) {
+                case  0: return (npy_long) 0;
+                case  1: __PYX_VERIFY_RETURN_INT(npy_long, digit, digits[0])
+                case 2:
+                    if (8 * sizeof(npy_long) > 1 * PyLong_SHIFT) {
+                        if (8 * sizeof(unsigned long) > 2 * PyLong_SHIFT) {
+                            __PYX_VERIFY_RETURN_INT(npy_long, unsigned long, (((((unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(npy_long) >= 2 * PyLong_SHIFT) {
+                            return (npy_long) (((((npy_long)digits[1]) << PyLong_SHIFT) | (npy_long)digits[0]));
+                        }
+                    }
+                    break;
+                case 3:
+                    if (8 * sizeof(npy_long) > 2 * PyLong_SHIFT) {
+                        if (8 * sizeof(unsigned long) > 3 * PyLong_SHIFT) {
+                            __PYX_VERIFY_RETURN_INT(npy_long, unsigned long, (((((((unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(npy_long) >= 3 * PyLong_SHIFT) {
+                            return (npy_long) (((((((npy_long)digits[2]) << PyLong_SHIFT) | (npy_long)digits[1]) << PyLong_SHIFT) | (npy_long)digits[0]));
+                        }
+                    }
+                    break;
+                case 4:
+                    if (8 * sizeof(npy_long) > 3 * PyLong_SHIFT) {
+                        if (8 * sizeof(unsigned long) > 4 * PyLong_SHIFT) {
+                            __PYX_VERIFY_RETURN_INT(npy_long, unsigned long, (((((((((unsigned long)digits[3]) << PyLong_SHIFT) | (unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(npy_long) >= 4 * PyLong_SHIFT) {
+                            return (npy_long) (((((((((npy_long)digits[3]) << PyLong_SHIFT) | (npy_long)digits[2]) << PyLong_SHIFT) | (npy_long)digits[1]) << PyLong_SHIFT) | (npy_long)digits[0]));
+                        }
+                    }
+                    break;
+            }
+#endif
+#if CYTHON_COMPILING_IN_CPYTHON && PY_VERSION_HEX < 0x030C00A7
+            if (unlikely(Py_SIZE(x) < 0)) {
+                goto raise_neg_overflow;
+            }
+#else
+            {
+                int result = PyObject_RichCompareBool(x, Py_False, Py_LT);
+                if (unlikely(result < 0))
+                    return (npy_long) -1;
+                if (unlikely(result == 1))
+                    goto raise_neg_overflow;
+            }
+#endif
+            if (sizeof(npy_long) <= sizeof(unsigned long)) {
+                __PYX_VERIFY_RETURN_INT_EXC(npy_long, unsigned long, PyLong_AsUnsignedLong(x))
+#ifdef HAVE_LONG_LONG
+            } else if (sizeof(npy_long) <= sizeof(unsigned PY_LONG_LONG)) {
+                __PYX_VERIFY_RETURN_INT_EXC(npy_long, unsigned PY_LONG_LONG, PyLong_AsUnsignedLongLong(x))
+#endif
+            }
+        } else {
+#if CYTHON_USE_PYLONG_INTERNALS
+            const digit* digits = ((PyLongObject*)x)->ob_digit;
+            switch (Py_SIZE(x)) {
+                case  0: return (npy_long) 0;
+                case -1: __PYX_VERIFY_RETURN_INT(npy_long, sdigit, (sdigit) (-(sdigit)digits[0]))
+                case  1: __PYX_VERIFY_RETURN_INT(npy_long,  digit, +digits[0])
+                case -2:
+                    if (8 * sizeof(npy_long) - 1 > 1 * PyLong_SHIFT) {
+                        if (8 * sizeof(unsigned long) > 2 * PyLong_SHIFT) {
+                            __PYX_VERIFY_RETURN_INT(npy_long, long, -(long) (((((unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(npy_long) - 1 > 2 * PyLong_SHIFT) {
+                            return (npy_long) (((npy_long)-1)*(((((npy_long)digits[1]) << PyLong_SHIFT) | (npy_long)digits[0])));
+                        }
+                    }
+                    break;
+                case 2:
+                    if (8 * sizeof(npy_long) > 1 * PyLong_SHIFT) {
+                        if (8 * sizeof(unsigned long) > 2 * PyLong_SHIFT) {
+                            __PYX_VERIFY_RETURN_INT(npy_long, unsigned long, (((((unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(npy_long) - 1 > 2 * PyLong_SHIFT) {
+                            return (npy_long) ((((((npy_long)digits[1]) << PyLong_SHIFT) | (npy_long)digits[0])));
+                        }
+                    }
+                    break;
+                case -3:
+                    if (8 * sizeof(npy_long) - 1 > 2 * PyLong_SHIFT) {
+                        if (8 * sizeof(unsigned long) > 3 * PyLong_SHIFT) {
+                            __PYX_VERIFY_RETURN_INT(npy_long, long, -(long) (((((((unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(npy_long) - 1 > 3 * PyLong_SHIFT) {
+                            return (npy_long) (((npy_long)-1)*(((((((npy_long)digits[2]) << PyLong_SHIFT) | (npy_long)digits[1]) << PyLong_SHIFT) | (npy_long)digits[0])));
+                        }
+                    }
+                    break;
+                case 3:
+                    if (8 * sizeof(npy_long) > 2 * PyLong_SHIFT) {
+                        if (8 * sizeof(unsigned long) > 3 * PyLong_SHIFT) {
+                            __PYX_VERIFY_RETURN_INT(npy_long, unsigned long, (((((((unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(npy_long) - 1 > 3 * PyLong_SHIFT) {
+                            return (npy_long) ((((((((npy_long)digits[2]) << PyLong_SHIFT) | (npy_long)digits[1]) << PyLong_SHIFT) | (npy_long)digits[0])));
+                        }
+                    }
+                    break;
+                case -4:
+                    if (8 * sizeof(npy_long) - 1 > 3 * PyLong_SHIFT) {
+                        if (8 * sizeof(unsigned long) > 4 * PyLong_SHIFT) {
+                            __PYX_VERIFY_RETURN_INT(npy_long, long, -(long) (((((((((unsigned long)digits[3]) << PyLong_SHIFT) | (unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(npy_long) - 1 > 4 * PyLong_SHIFT) {
+                            return (npy_long) (((npy_long)-1)*(((((((((npy_long)digits[3]) << PyLong_SHIFT) | (npy_long)digits[2]) << PyLong_SHIFT) | (npy_long)digits[1]) << PyLong_SHIFT) | (npy_long)digits[0])));
+                        }
+                    }
+                    break;
+                case 4:
+                    if (8 * sizeof(npy_long) > 3 * PyLong_SHIFT) {
+                        if (8 * sizeof(unsigned long) > 4 * PyLong_SHIFT) {
+                            __PYX_VERIFY_RETURN_INT(npy_long, unsigned long, (((((((((unsigned long)digits[3]) << PyLong_SHIFT) | (unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(npy_long) - 1 > 4 * PyLong_SHIFT) {
+                            return (npy_long) ((((((((((npy_long)digits[3]) << PyLong_SHIFT) | (npy_long)digits[2]) << PyLong_SHIFT) | (npy_long)digits[1]) << PyLong_SHIFT) | (npy_long)digits[0])));
+                        }
+                    }
+                    break;
+            }
+#endif
+            if (sizeof(npy_long) <= sizeof(long)) {
+                __PYX_VERIFY_RETURN_INT_EXC(npy_long, long, PyLong_AsLong(x))
+#ifdef HAVE_LONG_LONG
+            } else if (sizeof(npy_long) <= sizeof(PY_LONG_LONG)) {
+                __PYX_VERIFY_RETURN_INT_EXC(npy_long, PY_LONG_LONG, PyLong_AsLongLong(x))
+#endif
+            }
+        }
+        {
+#if CYTHON_COMPILING_IN_PYPY && !defined(_PyLong_AsByteArray)
+            PyErr_SetString(PyExc_RuntimeError,
+                            "_PyLong_AsByteArray() not available in PyPy, cannot convert large numbers");
+#else
+            npy_long val;
+            PyObject *v = __Pyx_PyNumber_IntOrLong(x);
+ #if PY_MAJOR_VERSION < 3
+            if (likely(v) && !PyLong_Check(v)) {
+                PyObject *tmp = v;
+                v = PyNumber_Long(tmp);
+                Py_DECREF(tmp);
+            }
+ #endif
+            if (likely(v)) {
+                int one = 1; int is_little = (int)*(unsigned char *)&one;
+                unsigned char *bytes = (unsigned char *)&val;
+                int ret = _PyLong_AsByteArray((PyLongObject *)v,
+                                              bytes, sizeof(val),
+                                              is_little, !is_unsigned);
+                Py_DECREF(v);
+                if (likely(!ret))
+                    return val;
+            }
+#endif
+            return (npy_long) -1;
+        }
+    } else {
+        npy_long val;
+        PyObject *tmp = __Pyx_PyNumber_IntOrLong(x);
+        if (!tmp) return (npy_long) -1;
+        val = __Pyx_PyInt_As_npy_long(tmp);
+        Py_DECREF(tmp);
+        return val;
+    }
+raise_overflow:
+    PyErr_SetString(PyExc_OverflowError,
+        "value too large to convert to npy_long");
+    return (npy_long) -1;
+raise_neg_overflow:
+    PyErr_SetString(PyExc_OverflowError,
+        "can't convert negative value to npy_long");
+    return (npy_long) -1;
+}
+
+/* CIntToPy */
+  static CYTHON_INLINE PyObject* __Pyx_PyInt_From_int(int value) {
+#ifdef __Pyx_HAS_GCC_DIAGNOSTIC
+#pragma GCC diagnostic push
+#pragma GCC diagnostic ignored "-Wconversion"
+#endif
+    const int neg_one = (int) -1, const_zero = (int) 0;
+#ifdef __Pyx_HAS_GCC_DIAGNOSTIC
+#pragma GCC diagnostic pop
+#endif
+    const int is_unsigned = neg_one > const_zero;
+    if (is_unsigned) {
+        if (sizeof(int) < sizeof(long)) {
+            return PyInt_FromLong((long) value);
+        } else if (sizeof(int) <= sizeof(unsigned long)) {
+            return PyLong_FromUnsignedLong((unsigned long) value);
+#ifdef HAVE_LONG_LONG
+        } else if (sizeof(int) <= sizeof(unsigned PY_LONG_LONG)) {
+            return PyLong_FromUnsignedLongLong((unsigned PY_LONG_LONG) value);
+#endif
+        }
+    } else {
+        if (sizeof(int) <= sizeof(long)) {
+            return PyInt_FromLong((long) value);
+#ifdef HAVE_LONG_LONG
+        } else if (sizeof(int) <= sizeof(PY_LONG_LONG)) {
+            return PyLong_FromLongLong((PY_LONG_LONG) value);
+#endif
+        }
+    }
+    {
+        int one = 1; int little = (int)*(unsigned char *)&one;
+        unsigned char *bytes = (unsigned char *)&value;
+        return _PyLong_FromByteArray(bytes, sizeof(int),
+                                     little, !is_unsigned);
+    }
+}
+
+/* CIntFromPy */
+  static CYTHON_INLINE int __Pyx_PyInt_As_int(PyObject *x) {
+#ifdef __Pyx_HAS_GCC_DIAGNOSTIC
+#pragma GCC diagnostic push
+#pragma GCC diagnostic ignored "-Wconversion"
+#endif
+    const int neg_one = (int) -1, const_zero = (int) 0;
+#ifdef __Pyx_HAS_GCC_DIAGNOSTIC
+#pragma GCC diagnostic pop
+#endif
+    const int is_unsigned = neg_one > const_zero;
+#if PY_MAJOR_VERSION < 3
+    if (likely(PyInt_Check(x))) {
+        if (sizeof(int) < sizeof(long)) {
+            __PYX_VERIFY_RETURN_INT(int, long, PyInt_AS_LONG(x))
+        } else {
+            long val = PyInt_AS_LONG(x);
+            if (is_unsigned && unlikely(val < 0)) {
+                goto raise_neg_overflow;
+            }
+            return (int) val;
+        }
+    } else
+#endif
+    if (likely(PyLong_Check(x))) {
+        if (is_unsigned) {
+#if CYTHON_USE_PYLONG_INTERNALS
+            const digit* digits = ((PyLongObject*)x)->ob_digit;
+            switch (Py_SIZE(x)) {
+                case  0: return (int) 0;
+                case  1: __PYX_VERIFY_RETURN_INT(int, digit, digits[0])
+                case 2:
+                    if (8 * sizeof(int) > 1 * PyLong_SHIFT) {
+                        if (8 * sizeof(unsigned long) > 2 * PyLong_SHIFT) {
+                            __PYX_VERIFY_RETURN_INT(int, unsigned long, (((((unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(int) >= 2 * PyLong_SHIFT) {
+                            return (int) (((((int)digits[1]) << PyLong_SHIFT) | (int)digits[0]));
+                        }
+                    }
+                    break;
+                case 3:
+                    if (8 * sizeof(int) > 2 * PyLong_SHIFT) {
+                        if (8 * sizeof(unsigned long) > 3 * PyLong_SHIFT) {
+                            __PYX_VERIFY_RETURN_INT(int, unsigned long, (((((((unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(int) >= 3 * PyLong_SHIFT) {
+                            return (int) (((((((int)digits[2]) << PyLong_SHIFT) | (int)digits[1]) << PyLong_SHIFT) | (int)digits[0]));
+                        }
+                    }
+                    break;
+                case 4:
+                    if (8 * sizeof(int) > 3 * PyLong_SHIFT) {
+                        if (8 * sizeof(unsigned long) > 4 * PyLong_SHIFT) {
+                            __PYX_VERIFY_RETURN_INT(int, unsigned long, (((((((((unsigned long)digits[3]) << PyLong_SHIFT) | (unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(int) >= 4 * PyLong_SHIFT) {
+                            return (int) (((((((((int)digits[3]) << PyLong_SHIFT) | (int)digits[2]) << PyLong_SHIFT) | (int)digits[1]) << PyLong_SHIFT) | (int)digits[0]));
+                        }
+                    }
+                    break;
+            }
+#endif
+#if CYTHON_COMPILING_IN_CPYTHON && PY_VERSION_HEX < 0x030C00A7
+            if (unlikely(Py_SIZE(x) < 0)) {
+                goto raise_neg_overflow;
+            }
+#else
+            {
+                int result = PyObject_RichCompareBool(x, Py_False, Py_LT);
+                if (unlikely(result < 0))
+                    return (int) -1;
+                if (unlikely(result == 1))
+                    goto raise_neg_overflow;
+            }
+#endif
+            if (sizeof(int) <= sizeof(unsigned long)) {
+                __PYX_VERIFY_RETURN_INT_EXC(int, unsigned long, PyLong_AsUnsignedLong(x))
+#ifdef HAVE_LONG_LONG
+            } else if (sizeof(int) <= sizeof(unsigned PY_LONG_LONG)) {
+                __PYX_VERIFY_RETURN_INT_EXC(int, unsigned PY_LONG_LONG, PyLong_AsUnsignedLongLong(x))
+#endif
+            }
+        } else {
+#if CYTHON_USE_PYLONG_INTERNALS
+            const digit* digits = ((PyLongObject*)x)->ob_digit;
+            switch (Py_SIZE(x)) {
+                case  0: return (int) 0;
+                case -1: __PYX_VERIFY_RETURN_INT(int, sdigit, (sdigit) (-(sdigit)digits[0]))
+                case  1: __PYX_VERIFY_RETURN_INT(int,  digit, +digits[0])
+                case -2:
+                    if (8 * sizeof(int) - 1 > 1 * PyLong_SHIFT) {
+                        if (8 * sizeof(unsigned long) > 2 * PyLong_SHIFT) {
+                            __PYX_VERIFY_RETURN_INT(int, long, -(long) (((((unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(int) - 1 > 2 * PyLong_SHIFT) {
+                            return (int) (((int)-1)*(((((int)digits[1]) << PyLong_SHIFT) | (int)digits[0])));
+                        }
+                    }
+                    break;
+                case 2:
+                    if (8 * sizeof(int) > 1 * PyLong_SHIFT) {
+                        if (8 * sizeof(unsigned long) > 2 * PyLong_SHIFT) {
+                            __PYX_VERIFY_RETURN_INT(int, unsigned long, (((((unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(int) - 1 > 2 * PyLong_SHIFT) {
+                            return (int) ((((((int)digits[1]) << PyLong_SHIFT) | (int)digits[0])));
+                        }
+                    }
+                    break;
+                case -3:
+                    if (8 * sizeof(int) - 1 > 2 * PyLong_SHIFT) {
+                        if (8 * sizeof(unsigned long) > 3 * PyLong_SHIFT) {
+                            __PYX_VERIFY_RETURN_INT(int, long, -(long) (((((((unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(int) - 1 > 3 * PyLong_SHIFT) {
+                            return (int) (((int)-1)*(((((((int)digits[2]) << PyLong_SHIFT) | (int)digits[1]) << PyLong_SHIFT) | (int)digits[0])));
+                        }
+                    }
+                    break;
+                case 3:
+                    if (8 * sizeof(int) > 2 * PyLong_SHIFT) {
+                        if (8 * sizeof(unsigned long) > 3 * PyLong_SHIFT) {
+                            __PYX_VERIFY_RETURN_INT(int, unsigned long, (((((((unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(int) - 1 > 3 * PyLong_SHIFT) {
+                            return (int) ((((((((int)digits[2]) << PyLong_SHIFT) | (int)digits[1]) << PyLong_SHIFT) | (int)digits[0])));
+                        }
+                    }
+                    break;
+                case -4:
+                    if (8 * sizeof(int) - 1 > 3 * PyLong_SHIFT) {
+                        if (8 * sizeof(unsigned long) > 4 * PyLong_SHIFT) {
+                            __PYX_VERIFY_RETURN_INT(int, long, -(long) (((((((((unsigned long)digits[3]) << PyLong_SHIFT) | (unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(int) - 1 > 4 * PyLong_SHIFT) {
+                            return (int) (((int)-1)*(((((((((int)digits[3]) << PyLong_SHIFT) | (int)digits[2]) << PyLong_SHIFT) | (int)digits[1]) << PyLong_SHIFT) | (int)digits[0])));
+                        }
+                    }
+                    break;
+                case 4:
+                    if (8 * sizeof(int) > 3 * PyLong_SHIFT) {
+                        if (8 * sizeof(unsigned long) > 4 * PyLong_SHIFT) {
+                            __PYX_VERIFY_RETURN_INT(int, unsigned long, (((((((((unsigned long)digits[3]) << PyLong_SHIFT) | (unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(int) - 1 > 4 * PyLong_SHIFT) {
+                            return (int) ((((((((((int)digits[3]) << PyLong_SHIFT) | (int)digits[2]) << PyLong_SHIFT) | (int)digits[1]) << PyLong_SHIFT) | (int)digits[0])));
+                        }
+                    }
+                    break;
+            }
+#endif
+            if (sizeof(int) <= sizeof(long)) {
+                __PYX_VERIFY_RETURN_INT_EXC(int, long, PyLong_AsLong(x))
+#ifdef HAVE_LONG_LONG
+            } else if (sizeof(int) <= sizeof(PY_LONG_LONG)) {
+                __PYX_VERIFY_RETURN_INT_EXC(int, PY_LONG_LONG, PyLong_AsLongLong(x))
+#endif
+            }
+        }
+        {
+#if CYTHON_COMPILING_IN_PYPY && !defined(_PyLong_AsByteArray)
+            PyErr_SetString(PyExc_RuntimeError,
+                            "_PyLong_AsByteArray() not available in PyPy, cannot convert large numbers");
+#else
+            int val;
+            PyObject *v = __Pyx_PyNumber_IntOrLong(x);
+ #if PY_MAJOR_VERSION < 3
+            if (likely(v) && !PyLong_Check(v)) {
+                PyObject *tmp = v;
+                v = PyNumber_Long(tmp);
+                Py_DECREF(tmp);
+            }
+ #endif
+            if (likely(v)) {
+                int one = 1; int is_little = (int)*(unsigned char *)&one;
+                unsigned char *bytes = (unsigned char *)&val;
+                int ret = _PyLong_AsByteArray((PyLongObject *)v,
+                                              bytes, sizeof(val),
+                                              is_little, !is_unsigned);
+                Py_DECREF(v);
+                if (likely(!ret))
+                    return val;
+            }
+#endif
+            return (int) -1;
+        }
+    } else {
+        int val;
+        PyObject *tmp = __Pyx_PyNumber_IntOrLong(x);
+        if (!tmp) return (int) -1;
+        val = __Pyx_PyInt_As_int(tmp);
+        Py_DECREF(tmp);
+        return val;
+    }
+raise_overflow:
+    PyErr_SetString(PyExc_OverflowError,
+        "value too large to convert to int");
+    return (int) -1;
+raise_neg_overflow:
+    PyErr_SetString(PyExc_OverflowError,
+        "can't convert negative value to int");
+    return (int) -1;
+}
+
+/* CIntToPy */
+  static CYTHON_INLINE PyObject* __Pyx_PyInt_From_long(long value) {
+#ifdef __Pyx_HAS_GCC_DIAGNOSTIC
+#pragma GCC diagnostic push
+#pragma GCC diagnostic ignored "-Wconversion"
+#endif
+    const long neg_one = (long) -1, const_zero = (long) 0;
+#ifdef __Pyx_HAS_GCC_DIAGNOSTIC
+#pragma GCC diagnostic pop
+#endif
+    const int is_unsigned = neg_one > const_zero;
+    if (is_unsigned) {
+        if (sizeof(long) < sizeof(long)) {
+            return PyInt_FromLong((long) value);
+        } else if (sizeof(long) <= sizeof(unsigned long)) {
+            return PyLong_FromUnsignedLong((unsigned long) value);
+#ifdef HAVE_LONG_LONG
+        } else if (sizeof(long) <= sizeof(unsigned PY_LONG_LONG)) {
+            return PyLong_FromUnsignedLongLong((unsigned PY_LONG_LONG) value);
+#endif
+        }
+    } else {
+        if (sizeof(long) <= sizeof(long)) {
+            return PyInt_FromLong((long) value);
+#ifdef HAVE_LONG_LONG
+        } else if (sizeof(long) <= sizeof(PY_LONG_LONG)) {
+            return PyLong_FromLongLong((PY_LONG_LONG) value);
+#endif
+        }
+    }
+    {
+        int one = 1; int little = (int)*(unsigned char *)&one;
+        unsigned char *bytes = (unsigned char *)&value;
+        return _PyLong_FromByteArray(bytes, sizeof(long),
+                                     little, !is_unsigned);
+    }
+}
+
+/* CIntToPy */
+  static CYTHON_INLINE PyObject* __Pyx_PyInt_From_npy_long(npy_long value) {
+#ifdef __Pyx_HAS_GCC_DIAGNOSTIC
+#pragma GCC diagnostic push
+#pragma GCC diagnostic ignored "-Wconversion"
+#endif
+    const npy_long neg_one = (npy_long) -1, const_zero = (npy_long) 0;
+#ifdef __Pyx_HAS_GCC_DIAGNOSTIC
+#pragma GCC diagnostic pop
+#endif
+    const int is_unsigned = neg_one > const_zero;
+    if (is_unsigned) {
+        if (sizeof(npy_long) < sizeof(long)) {
+            return PyInt_FromLong((long) value);
+        } else if (sizeof(npy_long) <= sizeof(unsigned long)) {
+            return PyLong_FromUnsignedLong((unsigned long) value);
+#ifdef HAVE_LONG_LONG
+        } else if (sizeof(npy_long) <= sizeof(unsigned PY_LONG_LONG)) {
+            return PyLong_FromUnsignedLongLong((unsigned PY_LONG_LONG) value);
+#endif
+        }
+    } else {
+        if (sizeof(npy_long) <= sizeof(long)) {
+            return PyInt_FromLong((long) value);
+#ifdef HAVE_LONG_LONG
+        } else if (sizeof(npy_long) <= sizeof(PY_LONG_LONG)) {
+            return PyLong_FromLongLong((PY_LONG_LONG) value);
+#endif
+        }
+    }
+    {
+        int one = 1; int little = (int)*(unsigned char *)&one;
+        unsigned char *bytes = (unsigned char *)&value;
+        return _PyLong_FromByteArray(bytes, sizeof(npy_long),
+                                     little, !is_unsigned);
+    }
+}
+
+/* CIntFromPy */
+  static CYTHON_INLINE long __Pyx_PyInt_As_long(PyObject *x) {
+#ifdef __Pyx_HAS_GCC_DIAGNOSTIC
+#pragma GCC diagnostic push
+#pragma GCC diagnostic ignored "-Wconversion"
+#endif
+    const long neg_one = (long) -1, const_zero = (long) 0;
+#ifdef __Pyx_HAS_GCC_DIAGNOSTIC
+#pragma GCC diagnostic pop
+#endif
+    const int is_unsigned = neg_one > const_zero;
+#if PY_MAJOR_VERSION < 3
+    if (likely(PyInt_Check(x))) {
+        if (sizeof(long) < sizeof(long)) {
+            __PYX_VERIFY_RETURN_INT(long, long, PyInt_AS_LONG(x))
+        } else {
+            long val = PyInt_AS_LONG(x);
+            if (is_unsigned && unlikely(val < 0)) {
+                goto raise_neg_overflow;
+            }
+            return (long) val;
+        }
+    } else
+#endif
+    if (likely(PyLong_Check(x))) {
+        if (is_unsigned) {
+#if CYTHON_USE_PYLONG_INTERNALS
+            const digit* digits = ((PyLongObject*)x)->ob_digit;
+            switch (Py_SIZE(x)) {
+                case  0: return (long) 0;
+                case  1: __PYX_VERIFY_RETURN_INT(long, digit, digits[0])
+                case 2:
+                    if (8 * sizeof(long) > 1 * PyLong_SHIFT) {
+                        if (8 * sizeof(unsigned long) > 2 * PyLong_SHIFT) {
+                            __PYX_VERIFY_RETURN_INT(long, unsigned long, (((((unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(long) >= 2 * PyLong_SHIFT) {
+                            return (long) (((((long)digits[1]) << PyLong_SHIFT) | (long)digits[0]));
+                        }
+                    }
+                    break;
+                case 3:
+                    if (8 * sizeof(long) > 2 * PyLong_SHIFT) {
+                        if (8 * sizeof(unsigned long) > 3 * PyLong_SHIFT) {
+                            __PYX_VERIFY_RETURN_INT(long, unsigned long, (((((((unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(long) >= 3 * PyLong_SHIFT) {
+                            return (long) (((((((long)digits[2]) << PyLong_SHIFT) | (long)digits[1]) << PyLong_SHIFT) | (long)digits[0]));
+                        }
+                    }
+                    break;
+                case 4:
+                    if (8 * sizeof(long) > 3 * PyLong_SHIFT) {
+                        if (8 * sizeof(unsigned long) > 4 * PyLong_SHIFT) {
+                            __PYX_VERIFY_RETURN_INT(long, unsigned long, (((((((((unsigned long)digits[3]) << PyLong_SHIFT) | (unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(long) >= 4 * PyLong_SHIFT) {
+                            return (long) (((((((((long)digits[3]) << PyLong_SHIFT) | (long)digits[2]) << PyLong_SHIFT) | (long)digits[1]) << PyLong_SHIFT) | (long)digits[0]));
+                        }
+                    }
+                    break;
+            }
+#endif
+#if CYTHON_COMPILING_IN_CPYTHON && PY_VERSION_HEX < 0x030C00A7
+            if (unlikely(Py_SIZE(x) < 0)) {
+                goto raise_neg_overflow;
+            }
+#else
+            {
+                int result = PyObject_RichCompareBool(x, Py_False, Py_LT);
+                if (unlikely(result < 0))
+                    return (long) -1;
+                if (unlikely(result == 1))
+                    goto raise_neg_overflow;
+            }
+#endif
+            if (sizeof(long) <= sizeof(unsigned long)) {
+                __PYX_VERIFY_RETURN_INT_EXC(long, unsigned long, PyLong_AsUnsignedLong(x))
+#ifdef HAVE_LONG_LONG
+            } else if (sizeof(long) <= sizeof(unsigned PY_LONG_LONG)) {
+                __PYX_VERIFY_RETURN_INT_EXC(long, unsigned PY_LONG_LONG, PyLong_AsUnsignedLongLong(x))
+#endif
+            }
+        } else {
+#if CYTHON_USE_PYLONG_INTERNALS
+            const digit* digits = ((PyLongObject*)x)->ob_digit;
+            switch (Py_SIZE(x)) {
+                case  0: return (long) 0;
+                case -1: __PYX_VERIFY_RETURN_INT(long, sdigit, (sdigit) (-(sdigit)digits[0]))
+                case  1: __PYX_VERIFY_RETURN_INT(long,  digit, +digits[0])
+                case -2:
+                    if (8 * sizeof(long) - 1 > 1 * PyLong_SHIFT) {
+                        if (8 * sizeof(unsigned long) > 2 * PyLong_SHIFT) {
+                            __PYX_VERIFY_RETURN_INT(long, long, -(long) (((((unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(long) - 1 > 2 * PyLong_SHIFT) {
+                            return (long) (((long)-1)*(((((long)digits[1]) << PyLong_SHIFT) | (long)digits[0])));
+                        }
+                    }
+                    break;
+                case 2:
+                    if (8 * sizeof(long) > 1 * PyLong_SHIFT) {
+                        if (8 * sizeof(unsigned long) > 2 * PyLong_SHIFT) {
+                            __PYX_VERIFY_RETURN_INT(long, unsigned long, (((((unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(long) - 1 > 2 * PyLong_SHIFT) {
+                            return (long) ((((((long)digits[1]) << PyLong_SHIFT) | (long)digits[0])));
+                        }
+                    }
+                    break;
+                case -3:
+                    if (8 * sizeof(long) - 1 > 2 * PyLong_SHIFT) {
+                        if (8 * sizeof(unsigned long) > 3 * PyLong_SHIFT) {
+                            __PYX_VERIFY_RETURN_INT(long, long, -(long) (((((((unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(long) - 1 > 3 * PyLong_SHIFT) {
+                            return (long) (((long)-1)*(((((((long)digits[2]) << PyLong_SHIFT) | (long)digits[1]) << PyLong_SHIFT) | (long)digits[0])));
+                        }
+                    }
+                    break;
+                case 3:
+                    if (8 * sizeof(long) > 2 * PyLong_SHIFT) {
+                        if (8 * sizeof(unsigned long) > 3 * PyLong_SHIFT) {
+                            __PYX_VERIFY_RETURN_INT(long, unsigned long, (((((((unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(long) - 1 > 3 * PyLong_SHIFT) {
+                            return (long) ((((((((long)digits[2]) << PyLong_SHIFT) | (long)digits[1]) << PyLong_SHIFT) | (long)digits[0])));
+                        }
+                    }
+                    break;
+                case -4:
+                    if (8 * sizeof(long) - 1 > 3 * PyLong_SHIFT) {
+                        if (8 * sizeof(unsigned long) > 4 * PyLong_SHIFT) {
+                            __PYX_VERIFY_RETURN_INT(long, long, -(long) (((((((((unsigned long)digits[3]) << PyLong_SHIFT) | (unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(long) - 1 > 4 * PyLong_SHIFT) {
+                            return (long) (((long)-1)*(((((((((long)digits[3]) << PyLong_SHIFT) | (long)digits[2]) << PyLong_SHIFT) | (long)digits[1]) << PyLong_SHIFT) | (long)digits[0])));
+                        }
+                    }
+                    break;
+                case 4:
+                    if (8 * sizeof(long) > 3 * PyLong_SHIFT) {
+                        if (8 * sizeof(unsigned long) > 4 * PyLong_SHIFT) {
+                            __PYX_VERIFY_RETURN_INT(long, unsigned long, (((((((((unsigned long)digits[3]) << PyLong_SHIFT) | (unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(long) - 1 > 4 * PyLong_SHIFT) {
+                            return (long) ((((((((((long)digits[3]) << PyLong_SHIFT) | (long)digits[2]) << PyLong_SHIFT) | (long)digits[1]) << PyLong_SHIFT) | (long)digits[0])));
+                        }
+                    }
+                    break;
+            }
+#endif
+            if (sizeof(long) <= sizeof(long)) {
+                __PYX_VERIFY_RETURN_INT_EXC(long, long, PyLong_AsLong(x))
+#ifdef HAVE_LONG_LONG
+            } else if (sizeof(long) <= sizeof(PY_LONG_LONG)) {
+                __PYX_VERIFY_RETURN_INT_EXC(long, PY_LONG_LONG, PyLong_AsLongLong(x))
+#endif
+            }
+        }
+        {
+#if CYTHON_COMPILING_IN_PYPY && !defined(_PyLong_AsByteArray)
+            PyErr_SetString(PyExc_RuntimeError,
+                            "_PyLong_AsByteArray() not available in PyPy, cannot convert large numbers");
+#else
+            long val;
+            PyObject *v = __Pyx_PyNumber_IntOrLong(x);
+ #if PY_MAJOR_VERSION < 3
+            if (likely(v) && !PyLong_Check(v)) {
+                PyObject *tmp = v;
+                v = PyNumber_Long(tmp);
+                Py_DECREF(tmp);
+            }
+ #endif
+            if (likely(v)) {
+                int one = 1; int is_little = (int)*(unsigned char *)&one;
+                unsigned char *bytes = (unsigned char *)&val;
+                int ret = _PyLong_AsByteArray((PyLongObject *)v,
+                                              bytes, sizeof(val),
+                                              is_little, !is_unsigned);
+                Py_DECREF(v);
+                if (likely(!ret))
+                    return val;
+            }
+#endif
+            return (long) -1;
+        }
+    } else {
+        long val;
+        PyObject *tmp = __Pyx_PyNumber_IntOrLong(x);
+        if (!tmp) return (long) -1;
+        val = __Pyx_PyInt_As_long(tmp);
+        Py_DECREF(tmp);
+        return val;
+    }
+raise_overflow:
+    PyErr_SetString(PyExc_OverflowError,
+        "value too large to convert to long");
+    return (long) -1;
+raise_neg_overflow:
+    PyErr_SetString(PyExc_OverflowError,
+        "can't convert negative value to long");
+    return (long) -1;
+}
+
+/* FastTypeChecks */
+  #if CYTHON_COMPILING_IN_CPYTHON
+static int __Pyx_InBases(PyTypeObject *a, PyTypeObject *b) {
+    while (a) {
+        a = a->tp_base;
+        if (a == b)
+            return 1;
+    }
+    return b == &PyBaseObject_Type;
+}
+static CYTHON_INLINE int __Pyx_IsSubtype(PyTypeObject *a, PyTypeObject *b) {
+    PyObject *mro;
+    if (a == b) return 1;
+    mro = a->tp_mro;
+    if (likely(mro)) {
+        Py_ssize_t i, n;
+        n = PyTuple_GET_SIZE(mro);
+        for (i = 0; i < n; i++) {
+            if (PyTuple_GET_ITEM(mro, i) == (PyObject *)b)
+                return 1;
+        }
+        return 0;
+    }
+    return __Pyx_InBases(a, b);
+}
+#if PY_MAJOR_VERSION == 2
+static int __Pyx_inner_PyErr_GivenExceptionMatches2(PyObject *err, PyObject* exc_type1, PyObject* exc_type2) {
+    PyObject *exception, *value, *tb;
+    int res;
+    __Pyx_PyThreadState_declare
+    __Pyx_PyThreadState_assign
+    __Pyx_ErrFetch(&exception, &value, &tb);
+    res = exc_type1 ? PyObject_IsSubclass(err, exc_type1) : 0;
+    if (unlikely(res == -1)) {
+        PyErr_WriteUnraisable(err);
+        res = 0;
+    }
+    if (!res) {
+        res = PyObject_IsSubclass(err, exc_type2);
+        if (unlikely(res == -1)) {
+            PyErr_WriteUnraisable(err);
+            res = 0;
+        }
+    }
+    __Pyx_ErrRestore(exception, value, tb);
+    return res;
+}
+#else
+static CYTHON_INLINE int __Pyx_inner_PyErr_GivenExceptionMatches2(PyObject *err, PyObject* exc_type1, PyObject *exc_type2) {
+    int res = exc_type1 ? __Pyx_IsSubtype((PyTypeObject*)err, (PyTypeObject*)exc_type1) : 0;
+    if (!res) {
+        res = __Pyx_IsSubtype((PyTypeObject*)err, (PyTypeObject*)exc_type2);
+    }
+    return res;
+}
+#endif
+static int __Pyx_PyErr_GivenExceptionMatchesTuple(PyObject *exc_type, PyObject *tuple) {
+    Py_ssize_t i, n;
+    assert(PyExceptionClass_Check(exc_type));
+    n = PyTuple_GET_SIZE(tuple);
+#if PY_MAJOR_VERSION >= 3
+    for (i=0; i<n; i++) {
+        if (exc_type == PyTuple_GET_ITEM(tuple, i)) return 1;
+    }
+#endif
+    for (i=0; i<n; i++) {
+        PyObject *t = PyTuple_GET_ITEM(tuple, i);
+        #if PY_MAJOR_VERSION < 3
+        if (likely(exc_type == t)) return 1;
+        #endif
+        if (likely(PyExceptionClass_Check(t))) {
+            if (__Pyx_inner_PyErr_GivenExceptionMatches2(exc_type, NULL, t)) return 1;
+        } else {
+        }
+    }
+    return 0;
+}
+static CYTHON_INLINE int __Pyx_PyErr_GivenExceptionMatches(PyObject *err, PyObject* exc_type) {
+    if (likely(err == exc_type)) return 1;
+    if (likely(PyExceptionClass_Check(err))) {
+        if (likely(PyExceptionClass_Check(exc_type))) {
+            return __Pyx_inner_PyErr_GivenExceptionMatches2(err, NULL, exc_type);
+        } else if (likely(PyTuple_Check(exc_type))) {
+            return __Pyx_PyErr_GivenExceptionMatchesTuple(err, exc_type);
+        } else {
+        }
+    }
+    return PyErr_GivenExceptionMatches(err, exc_type);
+}
+static CYTHON_INLINE int __Pyx_PyErr_GivenExceptionMatches2(PyObject *err, PyObject *exc_type1, PyObject *exc_type2) {
+    assert(PyExceptionClass_Check(exc_type1));
+    assert(PyExceptionClass_Check(exc_type2));
+    if (likely(err == exc_type1 || err == exc_type2)) return 1;
+    if (likely(PyExceptionClass_Check(err))) {
+        return __Pyx_inner_PyErr_GivenExceptionMatches2(err, exc_type1, exc_type2);
+    }
+    return (PyErr_GivenExceptionMatches(err, exc_type1) || PyErr_GivenExceptionMatches(err, exc_type2));
+}
+#endif
+
+/* CheckBinaryVersion */
+  static int __Pyx_check_binary_version(void) {
+    char ctversion[5];
+    int same=1, i, found_dot;
+    const char* rt_from_call = Py_GetVersion();
+    PyOS_snprintf(ctversion, 5, "%d.%d", PY_MAJOR_VERSION, PY_MINOR_VERSION);
+    found_dot = 0;
+    for (i = 0; i < 4; i++) {
+        if (!ctversion[i]) {
+            same = (rt_from_call[i] < '0' || rt_from_call[i] > '9');
+            break;
+        }
+        if (rt_from_call[i] != ctversion[i]) {
+            same = 0;
+            break;
+        }
+    }
+    if (!same) {
+        char rtversion[5] = {'\0'};
+        char message[200];
+        for (i=0; i<4; ++i) {
+            if (rt_from_call[i] == '.') {
+                if (found_dot) break;
+                found_dot = 1;
+            } else if (rt_from_call[i] < '0' || rt_from_call[i] > '9') {
+                break;
+            }
+            rtversion[i] = rt_from_call[i];
+        }
+        PyOS_snprintf(message, sizeof(message),
+                      "compiletime version %s of module '%.100s' "
+                      "does not match runtime version %s",
+                      ctversion, __Pyx_MODULE_NAME, rtversion);
+        return PyErr_WarnEx(NULL, message, 1);
+    }
+    return 0;
+}
+
+/* InitStrings */
+  static int __Pyx_InitStrings(__Pyx_StringTabEntry *t) {
+    while (t->p) {
+        #if PY_MAJOR_VERSION < 3
+        if (t->is_unicode) {
+            *t->p = PyUnicode_DecodeUTF8(t->s, t->n - 1, NULL);
+        } else if (t->intern) {
+            *t->p = PyString_InternFromString(t->s);
+        } else {
+            *t->p = PyString_FromStringAndSize(t->s, t->n - 1);
+        }
+        #else
+        if (t->is_unicode | t->is_str) {
+            if (t->intern) {
+                *t->p = PyUnicode_InternFromString(t->s);
+            } else if (t->encoding) {
+                *t->p = PyUnicode_Decode(t->s, t->n - 1, t->encoding, NULL);
+            } else {
+                *t->p = PyUnicode_FromStringAndSize(t->s, t->n - 1);
+            }
+        } else {
+            *t->p = PyBytes_FromStringAndSize(t->s, t->n - 1);
+        }
+        #endif
+        if (!*t->p)
+            return -1;
+        if (PyObject_Hash(*t->p) == -1)
+            return -1;
+        ++t;
+    }
+    return 0;
+}
+
+static CYTHON_INLINE PyObject* __Pyx_PyUnicode_FromString(const char* c_str) {
+    return __Pyx_PyUnicode_FromStringAndSize(c_str, (Py_ssize_t)strlen(c_str));
+}
+static CYTHON_INLINE const char* __Pyx_PyObject_AsString(PyObject* o) {
+    Py_ssize_t ignore;
+    return __Pyx_PyObject_AsStringAndSize(o, &ignore);
+}
+#if __PYX_DEFAULT_STRING_ENCODING_IS_ASCII || __PYX_DEFAULT_STRING_ENCODING_IS_DEFAULT
+#if !CYTHON_PEP393_ENABLED
+static const char* __Pyx_PyUnicode_AsStringAndSize(PyObject* o, Py_ssize_t *length) {
+    char* defenc_c;
+    PyObject* defenc = _PyUnicode_AsDefaultEncodedString(o, NULL);
+    if (!defenc) return NULL;
+    defenc_c = PyBytes_AS_STRING(defenc);
+#if __PYX_DEFAULT_STRING_ENCODING_IS_ASCII
+    {
+        char* end = defenc_c + PyBytes_GET_SIZE(defenc);
+        char* c;
+        for (c = defenc_c; c < end; c++) {
+            if ((unsigned char) (*c) >= 128) {
+                PyUnicode_AsASCIIString(o);
+                return NULL;
+            }
+        }
+    }
+#endif
+    *length = PyBytes_GET_SIZE(defenc);
+    return defenc_c;
+}
+#else
+static CYTHON_INLINE const char* __Pyx_PyUnicode_AsStringAndSize(PyObject* o, Py_ssize_t *length) {
+    if (unlikely(__Pyx_PyUnicode_READY(o) == -1)) return NULL;
+#if __PYX_DEFAULT_STRING_ENCODING_IS_ASCII
+    if (likely(PyUnicode_IS_ASCII(o))) {
+        *length = PyUnicode_GET_LENGTH(o);
+        return PyUnicode_AsUTF8(o);
+    } else {
+        PyUnicode_AsASCIIString(o);
+        return NULL;
+    }
+#else
+    return PyUnicode_AsUTF8AndSize(o, length);
+#endif
+}
+#endif
+#endif
+static CYTHON_INLINE const char* __Pyx_PyObject_AsStringAndSize(PyObject* o, Py_ssize_t *length) {
+#if __PYX_DEFAULT_STRING_ENCODING_IS_ASCII || __PYX_DEFAULT_STRING_ENCODING_IS_DEFAULT
+    if (
+#if PY_MAJOR_VERSION < 3 && __PYX_DEFAULT_STRING_ENCODING_IS_ASCII
+            __Pyx_sys_getdefaultencoding_not_ascii &&
+#endif
+            PyUnicode_Check(o)) {
+        return __Pyx_PyUnicode_AsStringAndSize(o, length);
+    } else
+#endif
+#if (!CYTHON_COMPILING_IN_PYPY) || (defined(PyByteArray_AS_STRING) && defined(PyByteArray_GET_SIZE))
+    if (PyByteArray_Check(o)) {
+        *length = PyByteArray_GET_SIZE(o);
+        return PyByteArray_AS_STRING(o);
+    } else
+#endif
+    {
+        char* result;
+        int r = PyBytes_AsStringAndSize(o, &result, length);
+        if (unlikely(r < 0)) {
+            return NULL;
+        } else {
+            return result;
+        }
+    }
+}
+static CYTHON_INLINE int __Pyx_PyObject_IsTrue(PyObject* x) {
+   int is_true = x == Py_True;
+   if (is_true | (x == Py_False) | (x == Py_None)) return is_true;
+   else return PyObject_IsTrue(x);
+}
+static CYTHON_INLINE int __Pyx_PyObject_IsTrueAndDecref(PyObject* x) {
+    int retval;
+    if (unlikely(!x)) return -1;
+    retval = __Pyx_PyObject_IsTrue(x);
+    Py_DECREF(x);
+    return retval;
+}
+static PyObject* __Pyx_PyNumber_IntOrLongWrongResultType(PyObject* result, const char* type_name) {
+#if PY_MAJOR_VERSION >= 3
+    if (PyLong_Check(result)) {
+        if (PyErr_WarnFormat(PyExc_DeprecationWarning, 1,
+                "__int__ returned non-int (type %.200s).  "
+                "The ability to return an instance of a strict subclass of int "
+                "is deprecated, and may be removed in a future version of Python.",
+                Py_TYPE(result)->tp_name)) {
+            Py_DECREF(result);
+            return NULL;
+        }
+        return result;
+    }
+#endif
+    PyErr_Format(PyExc_TypeError,
+                 "__%.4s__ returned non-%.4s (type %.200s)",
+                 type_name, type_name, Py_TYPE(result)->tp_name);
+    Py_DECREF(result);
+    return NULL;
+}
+static CYTHON_INLINE PyObject* __Pyx_PyNumber_IntOrLong(PyObject* x) {
+#if CYTHON_USE_TYPE_SLOTS
+  PyNumberMethods *m;
+#endif
+  const char *name = NULL;
+  PyObject *res = NULL;
+#if PY_MAJOR_VERSION < 3
+  if (likely(PyInt_Check(x) || PyLong_Check(x)))
+#else
+  if (likely(PyLong_Check(x)))
+#endif
+    return __Pyx_NewRef(x);
+#if CYTHON_USE_TYPE_SLOTS
+  m = Py_TYPE(x)->tp_as_number;
+  #if PY_MAJOR_VERSION < 3
+  if (m && m->nb_int) {
+    name = "int";
+    res = m->nb_int(x);
+  }
+  else if (m && m->nb_long) {
+    name = "long";
+    res = m->nb_long(x);
+  }
+  #else
+  if (likely(m && m->nb_int)) {
+    name = "int";
+    res = m->nb_int(x);
+  }
+  #endif
+#else
+  if (!PyBytes_CheckExact(x) && !PyUnicode_CheckExact(x)) {
+    res = PyNumber_Int(x);
+  }
+#endif
+  if (likely(res)) {
+#if PY_MAJOR_VERSION < 3
+    if (unlikely(!PyInt_Check(res) && !PyLong_Check(res))) {
+#else
+    if (unlikely(!PyLong_CheckExact(res))) {
+#endif
+        return __Pyx_PyNumber_IntOrLongWrongResultType(res, name);
+    }
+  }
+  else if (!PyErr_Occurred()) {
+    PyErr_SetString(PyExc_TypeError,
+                    "an integer is required");
+  }
+  return res;
+}
+static CYTHON_INLINE Py_ssize_t __Pyx_PyIndex_AsSsize_t(PyObject* b) {
+  Py_ssize_t ival;
+  PyObject *x;
+#if PY_MAJOR_VERSION < 3
+  if (likely(PyInt_CheckExact(b))) {
+    if (sizeof(Py_ssize_t) >= sizeof(long))
+        return PyInt_AS_LONG(b);
+    else
+        return PyInt_AsSsize_t(b);
+  }
+#endif
+  if (likely(PyLong_CheckExact(b))) {
+    #if CYTHON_USE_PYLONG_INTERNALS
+    const digit* digits = ((PyLongObject*)b)->ob_digit;
+    const Py_ssize_t size = Py_SIZE(b);
+    if (likely(__Pyx_sst_abs(size) <= 1)) {
+        ival = likely(size) ? digits[0] : 0;
+        if (size == -1) ival = -ival;
+        return ival;
+    } else {
+      switch (size) {
+         case 2:
+           if (8 * sizeof(Py_ssize_t) > 2 * PyLong_SHIFT) {
+             return (Py_ssize_t) (((((size_t)digits[1]) << PyLong_SHIFT) | (size_t)digits[0]));
+           }
+           break;
+         case -2:
+           if (8 * sizeof(Py_ssize_t) > 2 * PyLong_SHIFT) {
+             return -(Py_ssize_t) (((((size_t)digits[1]) << PyLong_SHIFT) | (size_t)digits[0]));
+           }
+           break;
+         case 3:
+           if (8 * sizeof(Py_ssize_t) > 3 * PyLong_SHIFT) {
+             return (Py_ssize_t) (((((((size_t)digits[2]) << PyLong_SHIFT) | (size_t)digits[1]) << PyLong_SHIFT) | (size_t)digits[0]));
+           }
+           break;
+         case -3:
+           if (8 * sizeof(Py_ssize_t) > 3 * PyLong_SHIFT) {
+             return -(Py_ssize_t) (((((((size_t)digits[2]) << PyLong_SHIFT) | (size_t)digits[1]) << PyLong_SHIFT) | (size_t)digits[0]));
+           }
+           break;
+         case 4:
+           if (8 * sizeof(Py_ssize_t) > 4 * PyLong_SHIFT) {
+             return (Py_ssize_t) (((((((((size_t)digits[3]) << PyLong_SHIFT) | (size_t)digits[2]) << PyLong_SHIFT) | (size_t)digits[1]) << PyLong_SHIFT) | (size_t)digits[0]));
+           }
+           break;
+         case -4:
+           if (8 * sizeof(Py_ssize_t) > 4 * PyLong_SHIFT) {
+             return -(Py_ssize_t) (((((((((size_t)digits[3]) << PyLong_SHIFT) | (size_t)digits[2]) << PyLong_SHIFT) | (size_t)digits[1]) << PyLong_SHIFT) | (size_t)digits[0]));
+           }
+           break;
+      }
+    }
+    #endif
+    return PyLong_AsSsize_t(b);
+  }
+  x = PyNumber_Index(b);
+  if (!x) return -1;
+  ival = PyInt_AsSsize_t(x);
+  Py_DECREF(x);
+  return ival;
+}
+static CYTHON_INLINE Py_hash_t __Pyx_PyIndex_AsHash_t(PyObject* o) {
+  if (sizeof(Py_hash_t) == sizeof(Py_ssize_t)) {
+    return (Py_hash_t) __Pyx_PyIndex_AsSsize_t(o);
+#if PY_MAJOR_VERSION < 3
+  } else if (likely(PyInt_CheckExact(o))) {
+    return PyInt_AS_LONG(o);
+#endif
+  } else {
+    Py_ssize_t ival;
+    PyObject *x;
+    x = PyNumber_Index(o);
+    if (!x) return -1;
+    ival = PyInt_AsLong(x);
+    Py_DECREF(x);
+    return ival;
+  }
+}
+static CYTHON_INLINE PyObject * __Pyx_PyBool_FromLong(long b) {
+  return b ? __Pyx_NewRef(Py_True) : __Pyx_NewRef(Py_False);
+}
+static CYTHON_INLINE PyObject * __Pyx_PyInt_FromSize_t(size_t ival) {
+    return PyInt_FromSize_t(ival);
+}
+
+
+#endif /* Py_PYTHON_H */
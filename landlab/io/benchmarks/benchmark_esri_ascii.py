@@ -0,0 +1,111 @@
+"""Timing of reading and writing ESRI ASCII files of large rasters.
+
+Run as a script to compare the time to read and write files of between 1e6
+and 1.6e7 nodes with that of the *numpy.loadtxt*/*numpy.savetxt* versions
+that these functions replaced. Files are read into an existing grid so that
+the time to create a grid is not counted::
+
+    $ python benchmark_esri_ascii.py
+"""
+from __future__ import print_function
+
+import os
+import shutil
+import tempfile
+import timeit
+
+import numpy as np
+
+from landlab import RasterModelGrid
+from landlab.io.esri_ascii import read_asc_header, read_esri_ascii, write_esri_ascii
+
+GRID_SHAPES = ((1000, 1000), (2000, 2000), (4000, 4000))
+
+
+def _setup_grid(shape):
+    grid = RasterModelGrid(shape)
+    np.random.seed(0)
+    grid.add_field(
+        "topographic__elevation",
+        grid.node_x + grid.node_y + np.random.rand(grid.number_of_nodes),
+        at="node",
+    )
+    return grid
+
+
+def _read_with_loadtxt(path):
+    """Read a file as read_esri_ascii did before it was chunked."""
+    with open(path, "r") as fp:
+        read_asc_header(fp)
+        return np.flipud(np.loadtxt(fp)).flatten()
+
+
+def _write_with_savetxt(path, grid):
+    """Write a file as write_esri_ascii did before it was buffered."""
+    header = {
+        "ncols": grid.number_of_node_columns,
+        "nrows": grid.number_of_node_rows,
+        "xllcorner": grid.node_x[0],
+        "yllcorner": grid.node_y[0],
+        "cellsize": grid.dx,
+    }
+    header_lines = ["%s %s" % (key, str(val)) for key, val in list(header.items())]
+    data = grid.at_node["topographic__elevation"].reshape(grid.shape)
+    np.savetxt(path, np.flipud(data), header=os.linesep.join(header_lines), comments="")
+
+
+def bench_write_esri_ascii_1e6():
+    grid = _setup_grid(GRID_SHAPES[0])
+    path = tempfile.mktemp(suffix=".asc")
+    try:
+        write_esri_ascii(path, grid)
+    finally:
+        os.remove(path)
+
+
+def bench_read_esri_ascii_1e6():
+    grid = _setup_grid(GRID_SHAPES[0])
+    path = tempfile.mktemp(suffix=".asc")
+    write_esri_ascii(path, grid)
+    try:
+        read_esri_ascii(path, grid=grid)
+    finally:
+        os.remove(path)
+
+
+def time_read_and_write(shape, n_repeats=3):
+    """Return the time (s) to write and then read a file, new and old ways."""
+    grid = _setup_grid(shape)
+    tmp_dir = tempfile.mkdtemp()
+    path = os.path.join(tmp_dir, "test.asc")
+    try:
+        times = {
+            "write": timeit.timeit(
+                lambda: write_esri_ascii(path, grid, clobber=True), number=n_repeats
+            ),
+            "read": timeit.timeit(
+                lambda: read_esri_ascii(path, grid=grid), number=n_repeats
+            ),
+            "savetxt": timeit.timeit(
+                lambda: _write_with_savetxt(path, grid), number=n_repeats
+            ),
+            "loadtxt": timeit.timeit(
+                lambda: _read_with_loadtxt(path), number=n_repeats
+            ),
+        }
+    finally:
+        shutil.rmtree(tmp_dir)
+
+    return dict((name, time / n_repeats) for name, time in times.items())
+
+
+if __name__ == "__main__":  # pragma: no cover
+    for shape in GRID_SHAPES:
+        times = time_read_and_write(shape, n_repeats=1)
+        print(
+            "{n_nodes:>10d} nodes: "
+            "write {write:.2f} s (savetxt {savetxt:.2f} s), "
+            "read {read:.2f} s (loadtxt {loadtxt:.2f} s)".format(
+                n_nodes=shape[0] * shape[1], **times
+            )
+        )
@@ -0,0 +1,73 @@
+"""Timing of writing large rasters to VTK image (vti) files.
+
+Run as a script to compare the time to write a grid of 1e6 nodes with
+appended, raw data (with and without compression) to that of writing
+the data inline as ASCII or base64-encoded text::
+
+    $ python benchmark_vtk.py
+"""
+from __future__ import print_function
+
+import os
+import shutil
+import tempfile
+import timeit
+
+import numpy as np
+
+from landlab import RasterModelGrid
+from landlab.io.vtk.vti import VtkUniformRectilinearWriter
+
+GRID_SHAPE = (1000, 1000)
+WRITERS = (
+    ("appended, raw", dict(format="appended", encoding="raw")),
+    ("appended, raw, zlib", dict(format="appended", encoding="raw", compressor="zlib")),
+    ("appended, base64", dict(format="appended", encoding="base64")),
+    ("inline, base64", dict(format="base64", encoding="base64")),
+    ("inline, ascii", dict(format="ascii")),
+)
+
+
+def _setup_grid(shape):
+    grid = RasterModelGrid(shape)
+    np.random.seed(0)
+    grid.add_field(
+        "topographic__elevation",
+        grid.node_x + grid.node_y + np.random.rand(grid.number_of_nodes),
+        at="node",
+    )
+    return grid
+
+
+def bench_write_appended_raw_1e6():
+    grid = _setup_grid(GRID_SHAPE)
+    path = tempfile.mktemp(suffix=".vti")
+    try:
+        VtkUniformRectilinearWriter(format="appended", encoding="raw").write(
+            path, grid
+        )
+    finally:
+        os.remove(path)
+
+
+def time_write(shape, n_repeats=1):
+    """Return the time (s) and size (bytes) of a file for each writer."""
+    grid = _setup_grid(shape)
+    tmp_dir = tempfile.mkdtemp()
+    path = os.path.join(tmp_dir, "test.vti")
+    try:
+        times = {}
+        for name, kwds in WRITERS:
+            writer = VtkUniformRectilinearWriter(**kwds)
+            time = timeit.timeit(lambda: writer.write(path, grid), number=n_repeats)
+            times[name] = (time / n_repeats, os.path.getsize(path))
+    finally:
+        shutil.rmtree(tmp_dir)
+
+    return times
+
+
+if __name__ == "__main__":  # pragma: no cover
+    times = time_write(GRID_SHAPE)
+    for name, _ in WRITERS:
+        print("{name:>20s}: {0:.2f} s, {1:d} bytes".format(*times[name], name=name))
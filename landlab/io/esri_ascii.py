@@ -20,6 +20,8 @@ import six
 
 from landlab.utils import add_halo
 
+from .ext.esri_ascii import format_asc_values, parse_asc_values
+
 _VALID_HEADER_KEYS = [
     "ncols",
     "nrows",
@@ -32,6 +34,8 @@ _VALID_HEADER_KEYS = [
 ]
 _HEADER_KEY_REGEX_PATTERN = re.compile(r"\s*(?P<key>[a-zA-z]\w+)")
 _HEADER_REGEX_PATTERN = re.compile(r"\s*(?P<key>[a-zA-Z]\w+)\s+(?P<value>[\w.+-]+)")
+_CHUNK_SIZE = 1 << 22
+_VALUES_PER_BLOCK = 1 << 17
 _HEADER_VALUE_TESTS = {
     "nrows": (int, lambda x: x > 0),
     "ncols": (int, lambda x: x > 0),
@@ -343,22 +347,129 @@ def read_asc_header(asc_file):
     return header
 
 
-def _read_asc_data(asc_file):
+def _window_bounds(window, shape):
+    """Get the rows and columns of a window of a grid of nodes.
+
+    Parameters
+    ----------
+    window : tuple of (start, stop), or None
+        Rows and columns of the window. Bounds are as for slices.
+    shape : tuple of int
+        Shape of the grid of nodes.
+
+    Returns
+    -------
+    ((row_start, row_stop), (col_start, col_stop)) : tuple of tuple of int
+        First and one-past-the-last rows and columns of the window.
+
+    Examples
+    --------
+    >>> from landlab.io.esri_ascii import _window_bounds
+    >>> _window_bounds(None, (4, 3))
+    ((0, 4), (0, 3))
+    >>> _window_bounds(((1, 3), (None, -1)), (4, 3))
+    ((1, 3), (0, 2))
+    """
+    if window is None:
+        return ((0, shape[0]), (0, shape[1]))
+
+    bounds = []
+    for (start, stop), size in zip(window, shape):
+        start, stop, _ = slice(start, stop).indices(size)
+        if stop <= start:
+            raise ValueError("window is empty")
+        bounds.append((start, stop))
+    return tuple(bounds)
+
+
+def _read_asc_data(asc_file, shape, window=None):
     """Read gridded data from an ESRI ASCII data file.
 
+    The data block is read in chunks and values are parsed straight into
+    the array that is returned, so that reading takes little more memory
+    than the data themselves.
+
     Parameters
     ----------
     asc_file : file-like
         File-like object of the data file pointing to the start of the data.
+    shape : tuple of int
+        Number of rows and columns of data in the file.
+    window : tuple of (start, stop), optional
+        Rows and columns of nodes to read. Rows are counted from the bottom
+        of the grid.
+
+    Returns
+    -------
+    ndarray of float
+        Data with the bottom row of the grid first.
+
+    Raises
+    ------
+    DataSizeError
+        Data are not the same size as indicated by the header file.
 
     .. note::
         First row of the data is at the top of the raster grid, the second
         row is the second from the top, and so on.
+
+    Examples
+    --------
+    >>> from six import StringIO
+    >>> from landlab.io.esri_ascii import _read_asc_data
+    >>> contents = StringIO('''
+    ...     0. 1. 2.
+    ...     3. 4. 5.
+    ...     6. 7. 8.
+    ...     9. 10. 11.
+    ... ''')
+    >>> _read_asc_data(contents, (4, 3))
+    array([[  9.,  10.,  11.],
+           [  6.,   7.,   8.],
+           [  3.,   4.,   5.],
+           [  0.,   1.,   2.]])
+    >>> _ = contents.seek(0)
+    >>> _read_asc_data(contents, (4, 3), window=((1, 3), (1, 3)))
+    array([[ 7.,  8.],
+           [ 4.,  5.]])
     """
-    return np.loadtxt(asc_file)
+    (n_rows, n_cols) = shape
+    (rows, cols) = _window_bounds(window, shape)
+
+    data = np.empty((rows[1] - rows[0], cols[1] - cols[0]), dtype=float)
+    n_values_to_read = (n_rows - rows[0]) * n_cols
+
+    n_values, text = 0, b""
+    while n_values < n_values_to_read:
+        chunk = asc_file.read(_CHUNK_SIZE)
+        if not isinstance(chunk, bytes):
+            chunk = chunk.encode()
+        at_end = len(chunk) == 0
+
+        text += chunk
+        n_values, n_bytes = parse_asc_values(
+            text, data[::-1], n_values, n_cols, n_rows - rows[1], cols[0], at_end
+        )
+        text = text[n_bytes:]
+
+        if at_end:
+            break
+
+    if n_values < n_values_to_read:
+        raise DataSizeError(n_rows * n_cols, n_values)
+
+    if window is None:
+        rest = asc_file.read(_CHUNK_SIZE)
+        if not isinstance(rest, bytes):
+            rest = rest.encode()
+        rest = text + rest
+        if len(rest.strip()) > 0:
+            raise DataSizeError(n_rows * n_cols, n_values + len(rest.split()))
+
+    return data
 
 
-def read_esri_ascii(asc_file, grid=None, reshape=False, name=None, halo=0):
+def read_esri_ascii(asc_file, grid=None, reshape=False, name=None, halo=0, window=None):
     """Read :py:class:`~landlab.RasterModelGrid` from an ESRI ASCII file.
 
     Read data from *asc_file*, an ESRI_ ASCII file, into a
@@ -385,6 +496,11 @@ def read_esri_ascii(asc_file, grid=None, reshape=False, name=None, halo=0):
         Adds data to an existing *grid* instead of creating a new one.
     halo : integer, optional
         Adds outer border of depth halo to the *grid*.
+    window : tuple of (start, stop), optional
+        Read only the nodes of these rows and columns, given as
+        *((row_start, row_stop), (col_start, col_stop))*, where rows are
+        counted from the bottom of the grid. Bounds are as for slices.
+        The grid is the size of the window.
 
     Returns
     -------
@@ -433,6 +549,10 @@ def read_esri_ascii(asc_file, grid=None, reshape=False, name=None, halo=0):
     >>> #  -9999, 3., 4., 5., -9999,
     >>> #  -9999, 0., 1., 2. -9999,
     >>> #  -9999, -9999, -9999, -9999, -9999, -9999]
+    >>> (grid, data) = read_esri_ascii(
+    ...     'fop', window=((0, 2), (1, 3))) # doctest: +SKIP
+    >>> #grid has 2 rows and 2 cols, with its lower-left node at (11., 2.)
+    >>> #data is [10., 11., 7., 8.]
     """
     from ..grid import RasterModelGrid
 
@@ -441,46 +561,40 @@ def read_esri_ascii(asc_file, grid=None, reshape=False, name=None, halo=0):
     if isinstance(asc_file, six.string_types):
         with open(asc_file, "r") as f:
             header = read_asc_header(f)
-            data = _read_asc_data(f)
+            data = _read_asc_data(f, (header["nrows"], header["ncols"]), window=window)
 
     # otherwise, pass asc_file directly.
     else:
         header = read_asc_header(asc_file)
-        data = _read_asc_data(asc_file)
+        data = _read_asc_data(
+            asc_file, (header["nrows"], header["ncols"]), window=window
+        )
+
+    (rows, cols) = _window_bounds(window, (header["nrows"], header["ncols"]))
 
     # There is no reason for halo to be negative.
     # Assume that if a negative value is given it should be 0.
     if halo <= 0:
-        shape = (header["nrows"], header["ncols"])
-        if data.size != shape[0] * shape[1]:
-            raise DataSizeError(shape[0] * shape[1], data.size)
+        shape = data.shape
     else:
-        shape = (header["nrows"] + 2 * halo, header["ncols"] + 2 * halo)
+        shape = (data.shape[0] + 2 * halo, data.shape[1] + 2 * halo)
         # check to see if a nodata_value was given.  If not, assign -9999.
         if "nodata_value" in header.keys():
             nodata_value = header["nodata_value"]
         else:
             header["nodata_value"] = -9999.0
             nodata_value = header["nodata_value"]
-        if data.size != (shape[0] - 2 * halo) * (shape[1] - 2 * halo):
-            raise DataSizeError(shape[0] * shape[1], data.size)
     xy_spacing = (header["cellsize"], header["cellsize"])
     xy_of_lower_left = (
-        header["xllcorner"] - halo * header["cellsize"],
-        header["yllcorner"] - halo * header["cellsize"],
+        header["xllcorner"] + (cols[0] - halo) * header["cellsize"],
+        header["yllcorner"] + (rows[0] - halo) * header["cellsize"],
     )
 
-    data = np.flipud(data)
-
     if halo > 0:
-        data = add_halo(
-            data.reshape(header["nrows"], header["ncols"]),
-            halo=halo,
-            halo_value=nodata_value,
-        ).reshape((-1,))
+        data = add_halo(data, halo=halo, halo_value=nodata_value)
 
     if not reshape:
-        data = data.flatten()
+        data = data.reshape((-1,))
 
     if grid is not None:
         if (grid.number_of_node_rows != shape[0]) or (
@@ -574,11 +688,15 @@ def write_esri_ascii(path, fields, names=None, clobber=False):
         "cellsize": fields.dx,
     }
 
+    rows_per_block = max(_VALUES_PER_BLOCK // header["ncols"], 1)
+
     for path, name in zip(paths, names):
         header_lines = ["%s %s" % (key, str(val)) for key, val in list(header.items())]
         data = fields.at_node[name].reshape(header["nrows"], header["ncols"])
-        np.savetxt(
-            path, np.flipud(data), header=os.linesep.join(header_lines), comments=""
-        )
+        with open(path, "wb") as fp:
+            fp.write((os.linesep.join(header_lines) + "\n").encode())
+            for top in range(header["nrows"], 0, -rows_per_block):
+                rows = data[max(top - rows_per_block, 0) : top][::-1]
+                fp.write(format_asc_values(np.asarray(rows, dtype=float)))
 
     return paths
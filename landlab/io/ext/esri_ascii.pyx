@@ -0,0 +1,170 @@
+cimport cython
+
+from libc.stdio cimport snprintf
+from libc.stdlib cimport strtod
+
+
+# Most characters needed to print a double with "%.18e".
+DEF VALUE_WIDTH = 32
+
+
+cdef inline bint _is_space(char c) nogil:
+    return c == b' ' or c == b'\n' or c == b'\r' or c == b'\t'
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def parse_asc_values(
+    bytes buffer,
+    double [:, :] out,
+    Py_ssize_t n_values,
+    Py_ssize_t n_cols,
+    Py_ssize_t row_start,
+    Py_ssize_t col_start,
+    bint at_end,
+):
+    """Parse values from a chunk of the data block of an ESRI ASCII file.
+
+    Values are whitespace-separated and fill the rows of the file, from the
+    top row down, whatever the line breaks. Values outside of the window
+    are skipped without being converted.
+
+    Parameters
+    ----------
+    buffer : bytes
+        Chunk of the data block.
+    out : ndarray of float, shape (n_window_rows, n_window_cols)
+        Values of the window, ordered as in the file.
+    n_values : int
+        Number of values in the file before this chunk.
+    n_cols : int
+        Number of columns in the file.
+    row_start, col_start : int
+        File row and column of the first value of the window.
+    at_end : bool
+        True if this is the last chunk of the file.
+
+    Returns
+    -------
+    (n_values, n_bytes) : tuple of int
+        Number of values in the file before the rest of the chunk, and the
+        number of bytes of the chunk that were parsed. If this is not the
+        last chunk, a value that runs to its end is left for the next
+        chunk. Parsing stops once the window is full.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from landlab.io.ext.esri_ascii import parse_asc_values
+    >>> out = np.zeros((2, 2))
+    >>> parse_asc_values(b"1 2 3\\n4 5", out, 0, 3, 0, 1, False)
+    (4, 8)
+    >>> parse_asc_values(b"5 6\\n", out, 4, 3, 0, 1, True)
+    (6, 3)
+    >>> out
+    array([[ 2.,  3.],
+           [ 5.,  6.]])
+    """
+    cdef const char * start = buffer
+    cdef const char * end = start + len(buffer)
+    cdef const char * p = start
+    cdef const char * token = start
+    cdef char * token_end
+    cdef Py_ssize_t n_rows_out = out.shape[0]
+    cdef Py_ssize_t n_cols_out = out.shape[1]
+    cdef Py_ssize_t row = n_values // n_cols - row_start
+    cdef Py_ssize_t col = n_values % n_cols - col_start
+    cdef bint bad_value = False
+    cdef double value
+
+    with nogil:
+        while row < n_rows_out:
+            while p < end and _is_space(p[0]):
+                p += 1
+            if p == end:
+                break
+
+            token = p
+            while p < end and not _is_space(p[0]):
+                p += 1
+            if p == end and not at_end:
+                p = token
+                break
+
+            if row >= 0 and col >= 0 and col < n_cols_out:
+                value = strtod(token, &token_end)
+                if token_end != p:
+                    bad_value = True
+                    break
+                out[row, col] = value
+
+            n_values += 1
+            col += 1
+            if col + col_start == n_cols:
+                col = - col_start
+                row += 1
+
+    if bad_value:
+        raise ValueError(
+            "unable to read value: {0}".format(
+                buffer[token - start:p - start].decode())
+        )
+
+    return n_values, p - start
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def format_asc_values(const double [:, :] values):
+    """Format rows of values for the data block of an ESRI ASCII file.
+
+    Values are printed as by *numpy.savetxt*, separated by spaces and
+    with one row per line. Values that are not a number are printed as
+    ``nan``.
+
+    Parameters
+    ----------
+    values : ndarray of float, shape (n_rows, n_cols)
+        Values to format.
+
+    Returns
+    -------
+    bytes
+        The formatted rows.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from landlab.io.ext.esri_ascii import format_asc_values
+    >>> format_asc_values(np.array([[1., 2.], [3., -4.5]]))
+    ... # doctest: +NORMALIZE_WHITESPACE
+    b'1.000000000000000000e+00 2.000000000000000000e+00\\n3.000000000000000000e+00
+      -4.500000000000000000e+00\\n'
+    >>> format_asc_values(np.array([[np.nan, -np.nan]]))
+    b'nan nan\\n'
+    """
+    cdef Py_ssize_t n_rows = values.shape[0]
+    cdef Py_ssize_t n_cols = values.shape[1]
+    cdef bytearray text = bytearray(n_rows * n_cols * (VALUE_WIDTH + 1) + n_rows)
+    cdef char * start = text
+    cdef char * p = start
+    cdef Py_ssize_t row
+    cdef Py_ssize_t col
+    cdef double value
+
+    with nogil:
+        for row in range(n_rows):
+            for col in range(n_cols):
+                if col > 0:
+                    p[0] = b' '
+                    p += 1
+                value = values[row, col]
+                if value != value:
+                    # snprintf may print the sign of a NaN ("-nan").
+                    p += snprintf(p, VALUE_WIDTH, "nan")
+                else:
+                    p += snprintf(p, VALUE_WIDTH, "%.18e", value)
+            p[0] = b'\n'
+            p += 1
+
+    return bytes(text[:p - start])
@@ -1,5 +1,5 @@
 #! /usr/bin/env python
-"""Read data from a pickled Landlab grid file into a RasterModelGrid.
+"""Save and load Landlab grids, and their fields, in Landlab's native format.
 
 Read Landlab native
 +++++++++++++++++++
@@ -9,24 +9,57 @@ Read Landlab native
 
     ~landlab.io.native_landlab.load_grid
     ~landlab.io.native_landlab.save_grid
+
+RasterModelGrids are saved in a binary container. The file begins with
+a fixed-size preamble:
+
+    ========  =======  ============================================
+    Offset    Type     Contents
+    ========  =======  ============================================
+    0         8 bytes  Magic string, ``b"\\x89LLGRID\\n"``
+    8         uint32   Format version
+    12        uint32   Reserved (zero)
+    16        uint64   Length of the header, in bytes
+    ========  =======  ============================================
+
+This is followed by a UTF-8, JSON-encoded header that describes the grid
+and, for each group of fields (*node*, *link*, ...), the data type,
+shape, units and offset of each field. The values of each field follow
+as a raw buffer, aligned to 64 bytes. Other grids, and grids with fields
+of Python objects, are pickled.
 """
 
+import json
 import os
 
+import numpy as np
 from six.moves import cPickle
 
-from landlab import ModelGrid
+from landlab import ModelGrid, RasterModelGrid
+
+_MAGIC = b"\x89LLGRID\n"
+_FORMAT_VERSION = 1
+_PREAMBLE = np.dtype(
+    [("magic", "S8"), ("version", "<u4"), ("reserved", "<u4"), ("header_size", "<u8")]
+)
+_ALIGNMENT = 64
 
 
 def save_grid(grid, path, clobber=False):
     """Save a grid and fields to a Landlab "native" format.
 
-    This method uses cPickle to save a grid as a cPickle file.
-    All fields will be saved, along with the grid.
+    All fields will be saved, along with the grid. A RasterModelGrid is
+    written as a binary file that holds the raw values of its fields,
+    which can be memory-mapped when the grid is loaded. Other grids, and
+    grids with fields of Python objects, are saved as a cPickle file.
 
     The recommended suffix for the save file is '.grid'. This will
     be added to your save if you don't include it.
 
+    The grid is written to a temporary file that then replaces *path*,
+    so a grid loaded from *path*, whose fields are mapped from it, can
+    be saved back to the same file.
+
     Caution: Pickling can be slow, and can produce very large files.
     Caution 2: Future updates to Landlab could potentially render old
     saves unloadable.
@@ -60,16 +93,32 @@ def save_grid(grid, path, clobber=False):
         ext = ext + ".grid"
     path = base + ext
 
-    with open(path, "wb") as file_like:
-        cPickle.dump(grid, file_like)
+    # The fields of a loaded grid may be mapped from *path*, so write to a
+    # new file and then move it over the old one.
+    tmp_path = path + ".tmp"
+    try:
+        if isinstance(grid, RasterModelGrid) and not _has_object_fields(grid):
+            _write_raster_grid(grid, tmp_path)
+        else:
+            with open(tmp_path, "wb") as file_like:
+                cPickle.dump(grid, file_like)
+        _replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
 
 
-def load_grid(path):
+def load_grid(path, mmap_mode="c"):
     """Load a grid and its fields from a Landlab "native" format.
 
-    This method uses cPickle to load a saved grid.
     It assumes you saved using vmg.save() or save_grid, i.e., that the
-    pickle file is a .grid file.
+    file is a .grid file. Both binary and pickled grids can be loaded.
+
+    The fields of a binary grid are memory-mapped from the file so that
+    values are only read when they are used. By default the mapping is
+    copy-on-write, so changes to the loaded fields are not written back
+    to the file.
 
     Caution: Pickling can be slow, and can produce very large files.
     Caution 2: Future updates to Landlab could potentially render old
@@ -79,6 +128,9 @@ def load_grid(path):
     ----------
     path : str
         Path to output file, either without suffix, or '.grid'
+    mmap_mode : {'c', 'r', 'r+', None}, optional
+        Mode used to memory-map the fields of a binary grid (see
+        *numpy.memmap*). If None, read the fields into memory.
 
     Examples
     --------
@@ -92,12 +144,159 @@ def load_grid(path):
     >>> save_grid(grid_out, 'testsavedgrid.grid', clobber=True)
     >>> grid_in = load_grid('testsavedgrid.grid')
     >>> os.remove('testsavedgrid.grid') #to remove traces of this test
+
+    >>> from landlab import RasterModelGrid
+    >>> grid_out = RasterModelGrid((3, 4))
+    >>> _ = grid_out.add_field('node', 'z', np.arange(12.), units='m')
+    >>> save_grid(grid_out, 'testsavedgrid.grid', clobber=True)
+    >>> grid_in = load_grid('testsavedgrid.grid', mmap_mode=None)
+    >>> grid_in.at_node['z']
+    array([  0.,   1.,   2.,   3.,   4.,   5.,   6.,   7.,   8.,   9.,  10.,  11.])
+    >>> os.remove('testsavedgrid.grid')
     """
     (base, ext) = os.path.splitext(path)
     if ext != ".grid":
         ext = ext + ".grid"
     path = base + ext
     with open(path, "rb") as file_like:
-        loaded_grid = cPickle.load(file_like)
+        if file_like.read(len(_MAGIC)) == _MAGIC:
+            loaded_grid = None
+        else:
+            file_like.seek(0)
+            loaded_grid = cPickle.load(file_like)
+    if loaded_grid is None:
+        loaded_grid = _read_raster_grid(path, mmap_mode=mmap_mode)
     assert issubclass(type(loaded_grid), ModelGrid)
     return loaded_grid
+
+
+def _replace(src, dst):
+    """Move *src* to *dst*, replacing *dst* if it exists."""
+    try:
+        os.replace(src, dst)
+    except AttributeError:  # Python 2
+        if os.path.exists(dst):
+            os.remove(dst)
+        os.rename(src, dst)
+
+
+def _align(offset):
+    """Round an offset up to the next aligned offset.
+
+    Examples
+    --------
+    >>> from landlab.io.native_landlab import _align
+    >>> _align(0), _align(1), _align(64), _align(65)
+    (0, 64, 64, 128)
+    """
+    return (offset + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
+
+
+def _has_object_fields(grid):
+    """Check if any of a grid's fields hold Python objects."""
+    for group in grid.groups:
+        for name in grid[group]:
+            if grid[group][name].dtype.hasobject:
+                return True
+    return False
+
+
+def _write_raster_grid(grid, path):
+    """Write a raster grid and its fields to a binary file."""
+    status = np.asarray(grid.status_at_node)
+    header = {
+        "type": "RasterModelGrid",
+        "shape": list(grid.shape),
+        "xy_spacing": [grid.dx, grid.dy],
+        "xy_of_lower_left": [float(grid.node_x[0]), float(grid.node_y[0])],
+        "axis_name": list(grid.axis_name),
+        "axis_units": list(grid.axis_units),
+        "bc_set_code": grid.bc_set_code,
+        "status_at_node": {},
+        "fields": {},
+    }
+    arrays = [(header["status_at_node"], status)]
+    for group in sorted(grid.groups):
+        header["fields"][group] = {}
+        for name in sorted(grid[group]):
+            values = grid[group][name]
+            header["fields"][group][name] = {"units": grid[group].units[name]}
+            arrays.append((header["fields"][group][name], values))
+
+    for description, values in arrays:
+        description.update(dtype=values.dtype.str, shape=list(values.shape))
+
+    # Offsets depend on the length of the header, and the length of the
+    # header depends on the offsets, so leave room for them to grow.
+    header_size = len(json.dumps(header).encode("utf-8")) + 32 * len(arrays)
+    offset = _align(_PREAMBLE.itemsize + header_size)
+    for description, values in arrays:
+        description["offset"] = offset
+        offset = _align(offset + values.nbytes)
+    text = json.dumps(header).encode("utf-8").ljust(header_size)
+
+    preamble = np.zeros(1, dtype=_PREAMBLE)
+    preamble["magic"] = _MAGIC
+    preamble["version"] = _FORMAT_VERSION
+    preamble["header_size"] = header_size
+
+    with open(path, "wb") as fp:
+        fp.write(preamble.tobytes())
+        fp.write(text)
+        for description, values in arrays:
+            fp.write(b"\0" * (description["offset"] - fp.tell()))
+            fp.write(np.ascontiguousarray(values).data)
+
+
+def _read_raster_grid(path, mmap_mode="c"):
+    """Read a raster grid from a binary file, mapping its fields to memory."""
+    with open(path, "rb") as fp:
+        preamble = np.frombuffer(fp.read(_PREAMBLE.itemsize), dtype=_PREAMBLE)[0]
+        if preamble["version"] > _FORMAT_VERSION:
+            raise ValueError(
+                "{path}: unsupported format version ({version})".format(
+                    path=path, version=preamble["version"]
+                )
+            )
+        header = json.loads(fp.read(int(preamble["header_size"])).decode("utf-8"))
+
+    def read_array(description):
+        shape = tuple(description["shape"])
+        if mmap_mode is None or np.prod(shape) == 0:
+            with open(path, "rb") as fp:
+                fp.seek(description["offset"])
+                values = np.fromfile(
+                    fp, dtype=description["dtype"], count=int(np.prod(shape))
+                )
+            return values.reshape(shape)
+        else:
+            return np.memmap(
+                path,
+                dtype=description["dtype"],
+                mode=mmap_mode,
+                offset=description["offset"],
+                shape=shape,
+            )
+
+    grid = RasterModelGrid(
+        tuple(header["shape"]),
+        xy_spacing=tuple(header["xy_spacing"]),
+        xy_of_lower_left=tuple(header["xy_of_lower_left"]),
+    )
+    grid.axis_name = tuple(header["axis_name"])
+    grid.axis_units = tuple(header["axis_units"])
+    grid.status_at_node = read_array(header["status_at_node"])
+
+    for group, fields in header["fields"].items():
+        for name, description in fields.items():
+            grid.add_field(
+                group,
+                name,
+                read_array(description),
+                units=description["units"],
+                noclobber=False,
+            )
+
+    grid.bc_set_code = header["bc_set_code"]
+
+    return grid
@@ -3,6 +3,7 @@ import os
 from .read import read_netcdf
 from .write import write_netcdf
 from .write import write_raster_netcdf
+from .write import NetcdfWriter
 
 from .errors import NotRasterGridError
 
@@ -27,6 +28,7 @@ __all__ = [
     "read_netcdf",
     "write_netcdf",
     "write_raster_netcdf",
+    "NetcdfWriter",
     "NotRasterGridError",
     "WITH_NETCDF4",
     "NETCDF4_EXAMPLE_FILE",
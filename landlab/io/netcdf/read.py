@@ -17,7 +17,10 @@ except ImportError:
 
     warnings.warn("Unable to import netCDF4.", ImportWarning)
 
+import warnings
+
 import numpy as np
+import six
 from scipy.io import netcdf as nc
 
 from landlab.io import (
@@ -25,6 +28,7 @@ from landlab.io import (
     MismatchGridXYLowerLeft,
     MismatchGridXYSpacing,
 )
+from landlab.io.esri_ascii import _window_bounds
 from landlab.io.netcdf._constants import (
     _AXIS_COORDINATE_NAMES,
     _AXIS_DIMENSION_NAMES,
@@ -77,8 +81,8 @@ def _read_netcdf_grid_shape(root):
     return tuple(shape)
 
 
-def _read_netcdf_coordinate_values(root):
-    """Get arrays of coordinates for grid points.
+def _read_netcdf_coordinate_units(root):
+    """Get units for coodinate values.
 
     Parameters
     ----------
@@ -87,20 +91,23 @@ def _read_netcdf_coordinate_values(root):
 
     Returns
     -------
-    tuple of ndarray
-        Node coordinates for each dimension.
+    tuple of str
+        Units for each coordinate.
     """
-    values = []
+    units = []
     for coordinate_name in _AXIS_COORDINATE_NAMES:
         try:
-            values.append(root.variables[coordinate_name][:].copy())
+            units.append(root.variables[coordinate_name].units)
         except KeyError:
             pass
-    return tuple(values)
+    return tuple(units)
 
 
-def _read_netcdf_coordinate_units(root):
-    """Get units for coodinate values.
+def _read_netcdf_raster_axes(root):
+    """Get the coordinates of the rows and columns of a raster grid.
+
+    Only the coordinates along the edges of the grid are read so that the
+    cost does not depend on the number of nodes.
 
     Parameters
     ----------
@@ -109,71 +116,105 @@ def _read_netcdf_coordinate_units(root):
 
     Returns
     -------
-    tuple of str
-        Units for each coordinate.
+    (y_of_row, x_of_column) : tuple of ndarray
+        Coordinates of each row and column of nodes.
     """
-    units = []
-    for coordinate_name in _AXIS_COORDINATE_NAMES:
-        try:
-            units.append(root.variables[coordinate_name].units)
-        except KeyError:
-            pass
-    return tuple(units)
+    x, y = root.variables["x"], root.variables["y"]
+
+    if len(x.dimensions) == 1 and len(y.dimensions) == 1:
+        return np.asarray(y[:], dtype=float), np.asarray(x[:], dtype=float)
+    elif len(x.dimensions) == 2 and len(y.dimensions) == 2:
+        y_of_row = np.asarray(y[:, 0], dtype=float)
+        x_of_column = np.asarray(x[0, :], dtype=float)
+        if np.any(np.asarray(y[0, :]) != y_of_row[0]) or np.any(
+            np.asarray(x[:, 0]) != x_of_column[0]
+        ):
+            raise NotRasterGridError()
+        return y_of_row, x_of_column
+    else:
+        raise ValueError(
+            "x and y dimensions must both either be 2D "
+            "(nj, ni) or 1D (ni,) and (nj)."
+        )
 
 
-def _read_netcdf_structured_grid(root):
-    """Get node coordinates for a structured grid.
+def _read_netcdf_field_names(root, name=None):
+    """Get the names of the variables to read as fields.
 
     Parameters
     ----------
     root : netcdf_file
         A NetCDF file.
+    name : str or iterable of str, optional
+        Names of the variables to read. The default is all variables
+        that are not coordinates or a grid mapping.
 
     Returns
     -------
-    tuple of ndarray
-        Node coordinates for each dimension reshaped to match the shape
-        of the grid.
+    list of str
+        Variable names.
     """
-    shape = _read_netcdf_grid_shape(root)
-    coordinates = _read_netcdf_coordinate_values(root)
+    dont_use = set(_COORDINATE_NAMES)
+    dont_use.add(_read_netcdf_grid_mapping_name(root))
+
+    if name is None:
+        return [name for name in root.variables if name not in dont_use]
 
-    for coordinate in coordinates:
-        coordinate.shape = shape
+    if isinstance(name, six.string_types):
+        names = [name]
+    else:
+        names = list(name)
+    for name in names:
+        if name not in root.variables or name in dont_use:
+            raise ValueError(
+                "Specified field {name} was not in provided NetCDF.".format(name=name)
+            )
+    return names
 
-    return coordinates
 
+def _read_netcdf_variable(var, rows, cols, time=-1, copy=True):
+    """Read the values of a variable within a window of a grid.
 
-def _read_netcdf_raster_structured_grid(root):
-    """Get node coordinates for a structured grid written as a raster.
+    Only the values that are within the window are read, which, for
+    chunked files, means only the chunks that overlap the window.
 
     Parameters
     ----------
-    root : netcdf_file
-        A NetCDF file.
+    var : netcdf_variable
+        A NetCDF variable.
+    rows, cols : slice
+        Rows and columns of the window.
+    time : int, optional
+        Index of the record to read from variables that vary with time.
+    copy : bool, optional
+        If ``False``, return a view of the values of a memory-mapped
+        variable, rather than a copy, if possible.
 
     Returns
     -------
-    tuple of ndarray
-        Node coordinates for each dimension reshaped to match the shape
-        of the grid.
+    ndarray
+        Values at the nodes of the window, as a flat array.
     """
-    shape = _read_netcdf_grid_shape(root)
-    coordinates = _read_netcdf_coordinate_values(root)
-
-    if len(coordinates) != 2:
-        assert ValueError("Rasters must have only two spatial coordinate dimensions")
-    else:
-        coordinates = np.meshgrid(coordinates[0], coordinates[1], indexing="ij")
+    index = []
+    for dimension in var.dimensions:
+        if dimension == "nt":
+            index.append(time)
+        elif dimension == "nj":
+            index.append(rows)
+        elif dimension == "ni":
+            index.append(cols)
+        else:
+            index.append(slice(None))
 
-    for coordinate in coordinates:
-        coordinate.shape = shape
+    values = var[tuple(index)]
+    if copy:
+        values = values.copy()
 
-    return coordinates
+    return values.reshape((-1,))
 
 
-def _read_netcdf_structured_data(root):
-    """Get data values for a structured grid.
+def _read_netcdf_grid_mapping_name(root):
+    """Get the name of the grid mapping variable, if there is one.
 
     Parameters
     ----------
@@ -182,40 +223,44 @@ def _read_netcdf_structured_data(root):
 
     Returns
     -------
-    dict
-        Data values, reshaped to match that of the grid. Keys are the
-        variable names as read from the NetCDF file.
+    str or None
+        Name of the grid mapping variable.
     """
-    fields = dict()
-    grid_mapping_exists = False
-    grid_mapping_dict = None
-    for (name, var) in root.variables.items():
-        # identify if a grid mapping variable exist and do not pass it as a field
-        if name not in _COORDINATE_NAMES:
-            if hasattr(var, "grid_mapping"):
-                grid_mapping = getattr(var, "grid_mapping")
-                if type(grid_mapping) is bytes:
-                    grid_mapping = grid_mapping.decode("utf-8")
-                grid_mapping_exists = True
-
-    dont_use = list(_COORDINATE_NAMES)
-    if grid_mapping_exists:
-        dont_use.append(grid_mapping)
     for (name, var) in root.variables.items():
-        if name not in dont_use:
-            fields[name] = var[:].copy()
-            fields[name].shape = (fields[name].size,)
+        if name not in _COORDINATE_NAMES and hasattr(var, "grid_mapping"):
+            grid_mapping = getattr(var, "grid_mapping")
+            if type(grid_mapping) is bytes:
+                grid_mapping = grid_mapping.decode("utf-8")
+            return grid_mapping
+    return None
 
-    if grid_mapping_exists:
-        grid_mapping_variable = root.variables[grid_mapping]
-        grid_mapping_dict = {"name": grid_mapping}
-        try:
-            for att in grid_mapping_variable.ncattrs():
-                grid_mapping_dict[att] = getattr(grid_mapping_variable, att)
-        except AttributeError:  # if scipy is doing the reading
-            for att in var._attributes:
-                grid_mapping_dict[att] = getattr(grid_mapping_variable, att)
-    return fields, grid_mapping_dict
+
+def _read_netcdf_grid_mapping(root):
+    """Get the attributes of the grid mapping variable, if there is one.
+
+    Parameters
+    ----------
+    root : netcdf_file
+        A NetCDF file.
+
+    Returns
+    -------
+    dict or None
+        Attributes of the grid mapping, along with its name.
+    """
+    grid_mapping = _read_netcdf_grid_mapping_name(root)
+    if grid_mapping is None:
+        return None
+
+    grid_mapping_variable = root.variables[grid_mapping]
+    grid_mapping_dict = {"name": grid_mapping}
+    try:
+        for att in grid_mapping_variable.ncattrs():
+            grid_mapping_dict[att] = getattr(grid_mapping_variable, att)
+    except AttributeError:  # if scipy is doing the reading
+        for att in grid_mapping_variable._attributes:
+            grid_mapping_dict[att] = getattr(grid_mapping_variable, att)
+    return grid_mapping_dict
 
 
 def _get_raster_spacing(coords):
@@ -246,7 +291,16 @@ def _get_raster_spacing(coords):
 
 
 def read_netcdf(
-    nc_file, grid=None, name=None, just_grid=False, halo=0, nodata_value=-9999.0
+    nc_file,
+    grid=None,
+    name=None,
+    just_grid=False,
+    halo=0,
+    nodata_value=-9999.0,
+    window=None,
+    stride=1,
+    time=-1,
+    lazy=False,
 ):
     """Create a :class:`~.RasterModelGrid` from a netcdf file.
 
@@ -260,21 +314,43 @@ def read_netcdf(
     If you want the fields to be added to an existing grid, it can be passed
     to the keyword argument *grid*.
 
+    Only the coordinates along the edges of the grid and the values of the
+    requested variables, within the requested window, are read from the
+    file. For a *netcdf4*-formatted file with chunked variables, this means
+    only the chunks that overlap the window are read.
+
     Parameters
     ----------
     nc_file : str
         Name of a netcdf file.
     grid : *grid* , optional
         Adds data to an existing *grid* instead of creating a new one.
-    name : str, optional
-        Add only fields with NetCDF variable name to the grid. Default is to
-        add all NetCDF varibles to the grid.
+    name : str or iterable of str, optional
+        Add only fields with these NetCDF variable names to the grid.
+        Default is to add all NetCDF varibles to the grid.
     just_grid : boolean, optional
         Create a new grid but don't add value data.
     halo : integer, optional
         Adds outer border of depth halo to the *grid*.
     nodata_value : float, optional
         Value that indicates an invalid value. Default is -9999.
+    window : tuple of (start, stop), optional
+        Read only the nodes of these rows and columns, given as
+        *((row_start, row_stop), (col_start, col_stop))*, where rows are
+        counted from the bottom of the grid. Bounds are as for slices.
+        The grid is the size of the window.
+    stride : int or tuple of int, optional
+        Read every *stride*-th node of the window, or the rows and columns
+        of the window with strides of *(row_stride, col_stride)*. The
+        spacing of the grid is scaled by the stride.
+    time : int, optional
+        Index of the record to read from variables that vary with time.
+        Default is the last record.
+    lazy : boolean, optional
+        Don't read field values from *netcdf3*-formatted files until they
+        are used. Such fields are read-only views of the file, if
+        possible. *netcdf4*-formatted files can't be memory-mapped so
+        their values are read, as usual.
 
     Returns
     -------
@@ -315,6 +391,16 @@ def read_netcdf(
     >>> grid.dy, grid.dx
     (1.0, 1.0)
 
+    Read only part of the grid.
+
+    >>> grid = read_netcdf(NETCDF4_EXAMPLE_FILE, window=((1, 4), (0, 3)))
+    >>> grid.shape == (3, 3)
+    True
+    >>> grid.xy_of_lower_left
+    (0.0, 1.0)
+    >>> grid.at_node['surface__elevation']
+    array([  3.,   4.,   5.,   6.,   7.,   8.,   9.,  10.,  11.])
+
     A more complicated example might add data with a halo to an existing grid.
     Note that the lower left corner must be specified correctly for the data
     and the grid to align correctly.
@@ -342,27 +428,23 @@ def read_netcdf(
         root = nc4.Dataset(nc_file, "r", format="NETCDF4")
 
     try:
-        node_coords = _read_netcdf_structured_grid(root)
-    except ValueError:
-        if (len(root.variables["x"].dimensions) == 1) and (
-            len(root.variables["y"].dimensions) == 1
-        ):
-
-            node_coords = _read_netcdf_raster_structured_grid(root)
-        else:
-            assert ValueError(
-                "x and y dimensions must both either be 2D "
-                "(nj, ni) or 1D (ni,) and (nj)."
-            )
+        (row_stride, col_stride) = stride
+    except TypeError:
+        (row_stride, col_stride) = (stride, stride)
 
-    assert len(node_coords) == 2
+    y_of_row, x_of_column = _read_netcdf_raster_axes(root)
+    (rows, cols) = _window_bounds(window, (len(y_of_row), len(x_of_column)))
+    rows = slice(rows[0], rows[1], row_stride)
+    cols = slice(cols[0], cols[1], col_stride)
 
-    dx = _get_raster_spacing(node_coords)
-    xy_spacing = (dx, dx)
-    shape = node_coords[0].shape
+    dx = _get_raster_spacing((x_of_column,))
+    if _get_raster_spacing((y_of_row,)) != dx:
+        raise NotRasterGridError()
+    xy_spacing = (dx * col_stride, dx * row_stride)
+    shape = (len(y_of_row[rows]), len(x_of_column[cols]))
     xy_of_lower_left = (
-        node_coords[0].min() - halo * dx,
-        node_coords[1].min() - halo * dx,
+        x_of_column[cols].min() - halo * xy_spacing[0],
+        y_of_row[rows].min() - halo * xy_spacing[1],
     )
 
     if grid is not None:
@@ -385,8 +467,10 @@ def read_netcdf(
         )
 
     if not just_grid:
-        fields, grid_mapping_dict = _read_netcdf_structured_data(root)
-        for (field_name, values) in fields.items():
+        for field_name in _read_netcdf_field_names(root, name=name):
+            values = _read_netcdf_variable(
+                root.variables[field_name], rows, cols, time=time, copy=not lazy
+            )
 
             # add halo if necessary
             if halo > 0:
@@ -394,24 +478,19 @@ def read_netcdf(
                     values.reshape(shape), halo=halo, halo_value=nodata_value
                 ).reshape((-1,))
 
-            # add only the requested fields.
-            if (name is None) or (field_name == name):
-                add_field = True
-            else:
-                add_field = False
-
-            if add_field:
-                grid.add_field(field_name, values, at="node", noclobber=False)
-
-        if (name is not None) and (name not in grid.at_node):
-            raise ValueError(
-                "Specified field {name} was not in provided NetCDF.".format(name=name)
-            )
+            grid.add_field(field_name, values, at="node", noclobber=False)
 
     # save grid mapping
+    grid_mapping_dict = _read_netcdf_grid_mapping(root)
     if grid_mapping_dict is not None:
         grid.grid_mapping = grid_mapping_dict
 
-    root.close()
+    if lazy:
+        # Fields that are views of a memory-mapped file keep it open.
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)
+            root.close()
+    else:
+        root.close()
 
     return grid
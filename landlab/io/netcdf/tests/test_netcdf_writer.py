@@ -0,0 +1,147 @@
+#! /usr/bin/env python
+"""Unit tests for landlab.io.netcdf.write.NetcdfWriter."""
+import numpy as np
+import pytest
+from numpy.testing import assert_array_equal
+
+from landlab import RasterModelGrid
+from landlab.io.netcdf import WITH_NETCDF4, NetcdfWriter, read_netcdf
+
+try:
+    import netCDF4 as nc
+except ImportError:
+    pass
+
+
+def _write_records(path, n_records, **kwds):
+    grid = RasterModelGrid((4, 3))
+    z = grid.add_zeros("node", "topographic__elevation")
+    grid.add_ones("node", "uplift_rate")
+
+    with NetcdfWriter(path, grid, **kwds) as writer:
+        for n in range(n_records):
+            z[:] = np.arange(12.) + n
+            writer.write(time=10. * n)
+    return writer
+
+
+def _read_records(path):
+    root = nc.Dataset(path, "r")
+    records = dict(
+        (name, root.variables[name][:].data)
+        for name in ("t", "topographic__elevation", "uplift_rate")
+        if name in root.variables
+    )
+    root.close()
+    return records
+
+
+@pytest.mark.skipif(not WITH_NETCDF4, reason="netCDF4 package not installed")
+@pytest.mark.parametrize(
+    "format", ["NETCDF3_CLASSIC", "NETCDF3_64BIT", "NETCDF4_CLASSIC", "NETCDF4"]
+)
+def test_write_records(tmpdir, format):
+    with tmpdir.as_cwd():
+        writer = _write_records("test.nc", 5, format=format)
+        records = _read_records("test.nc")
+
+    assert writer.closed
+    assert writer.number_of_records == 5
+    assert_array_equal(records["t"], [0., 10., 20., 30., 40.])
+    assert records["topographic__elevation"].shape == (5, 4, 3)
+    for n in range(5):
+        assert_array_equal(
+            records["topographic__elevation"][n].flat, np.arange(12.) + n
+        )
+    assert_array_equal(records["uplift_rate"], 1.)
+
+
+@pytest.mark.skipif(not WITH_NETCDF4, reason="netCDF4 package not installed")
+@pytest.mark.parametrize("buffer_size", [1, 3, 100])
+@pytest.mark.parametrize("threaded", [False, True])
+def test_buffered_and_threaded(tmpdir, buffer_size, threaded):
+    with tmpdir.as_cwd():
+        _write_records("expected.nc", 10)
+        expected = _read_records("expected.nc")
+
+        _write_records("actual.nc", 10, buffer_size=buffer_size, threaded=threaded)
+        actual = _read_records("actual.nc")
+
+    for name in expected:
+        assert_array_equal(actual[name], expected[name])
+
+
+@pytest.mark.skipif(not WITH_NETCDF4, reason="netCDF4 package not installed")
+def test_flush(tmpdir):
+    grid = RasterModelGrid((4, 3))
+    grid.add_zeros("node", "topographic__elevation")
+
+    with tmpdir.as_cwd():
+        writer = NetcdfWriter("test.nc", grid, buffer_size=10)
+        writer.write()
+        writer.write()
+        assert writer.number_of_records == 2
+        assert len(_read_records("test.nc")["t"]) == 0
+
+        writer.flush()
+        assert_array_equal(_read_records("test.nc")["t"], [0., 1.])
+
+        writer.close()
+
+
+@pytest.mark.skipif(not WITH_NETCDF4, reason="netCDF4 package not installed")
+def test_compression(tmpdir):
+    with tmpdir.as_cwd():
+        _write_records("test.nc", 3, zlib=True, complevel=6)
+        root = nc.Dataset("test.nc", "r")
+        var = root.variables["topographic__elevation"]
+        assert var.filters()["zlib"]
+        assert var.filters()["complevel"] == 6
+        assert var.chunking() == [1, 4, 3]
+        root.close()
+
+
+def test_compression_needs_netcdf4(tmpdir):
+    with tmpdir.as_cwd():
+        with pytest.raises(ValueError):
+            _write_records("test.nc", 1, format="NETCDF3_64BIT", zlib=True)
+
+
+def test_names(tmpdir):
+    with tmpdir.as_cwd():
+        writer = _write_records("test.nc", 2, names="uplift_rate")
+        assert writer.names == ["uplift_rate"]
+        if WITH_NETCDF4:
+            assert "topographic__elevation" not in _read_records("test.nc")
+
+
+def test_write_after_close(tmpdir):
+    with tmpdir.as_cwd():
+        writer = _write_records("test.nc", 1, format="NETCDF3_64BIT")
+        with pytest.raises(ValueError):
+            writer.write()
+
+
+def test_read_netcdf(tmpdir):
+    with tmpdir.as_cwd():
+        _write_records("test.nc", 1, format="NETCDF3_64BIT")
+        grid = read_netcdf("test.nc")
+    assert grid.shape == (4, 3)
+    assert_array_equal(grid.at_node["topographic__elevation"], np.arange(12.))
+
+
+@pytest.mark.skipif(not WITH_NETCDF4, reason="netCDF4 package not installed")
+def test_write_at_cell(tmpdir):
+    grid = RasterModelGrid((4, 5))
+    grid.add_field("cell", "air__temperature", np.arange(6.))
+
+    with tmpdir.as_cwd():
+        with NetcdfWriter("test.nc", grid, at="cell") as writer:
+            writer.write()
+            writer.write()
+        root = nc.Dataset("test.nc", "r")
+        values = root.variables["air__temperature"][:]
+        root.close()
+
+    assert values.shape == (2, 2, 3)
+    assert_array_equal(values[1].flatten(), np.arange(6.))
@@ -3,7 +3,9 @@
 
 import os
 
+import numpy as np
 import pytest
+from numpy.testing import assert_array_equal
 
 from landlab import RasterModelGrid
 from landlab.io import (
@@ -11,7 +13,13 @@ from landlab.io import (
     MismatchGridXYLowerLeft,
     MismatchGridXYSpacing,
 )
-from landlab.io.netcdf import WITH_NETCDF4, read_netcdf
+from landlab.io.netcdf import (
+    WITH_NETCDF4,
+    NetcdfWriter,
+    read_netcdf,
+    write_netcdf,
+    write_raster_netcdf,
+)
 
 _TEST_DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
 
@@ -78,3 +86,90 @@ def test_bad_llc():
     grid = RasterModelGrid((4, 3), xy_of_lower_left=(-1, -2))
     with pytest.raises(MismatchGridXYLowerLeft):
         read_netcdf(os.path.join(_TEST_DATA_DIR, "test-netcdf4.nc"), grid=grid)
+
+
+def _write_grid(path, writer, format):
+    grid = RasterModelGrid((7, 9), xy_spacing=2., xy_of_lower_left=(10., 20.))
+    grid.add_field("node", "topographic__elevation", np.arange(63.))
+    grid.add_field("node", "uplift_rate", np.arange(63.) * 10.)
+    writer(path, grid, format=format)
+    return grid
+
+
+_WRITERS_AND_FORMATS = [(write_netcdf, "NETCDF3_64BIT")]
+if WITH_NETCDF4:
+    _WRITERS_AND_FORMATS += [
+        (write_netcdf, "NETCDF4"),
+        (write_raster_netcdf, "NETCDF4"),
+    ]
+
+
+@pytest.mark.parametrize("writer,format", _WRITERS_AND_FORMATS)
+@pytest.mark.parametrize(
+    "window,stride",
+    [
+        (None, 1),
+        (((2, 6), (1, 8)), 1),
+        (((None, None), (3, None)), 1),
+        (None, 2),
+        (((1, 7), (0, 9)), (2, 3)),
+    ],
+)
+def test_read_window_and_stride(tmpdir, writer, format, window, stride):
+    with tmpdir.as_cwd():
+        _write_grid("test.nc", writer, format)
+        grid = read_netcdf("test.nc", window=window, stride=stride)
+
+    (rows, cols) = window or ((None, None), (None, None))
+    (row_stride, col_stride) = (stride, stride) if np.isscalar(stride) else stride
+    expected = np.arange(63.).reshape((7, 9))[
+        slice(rows[0], rows[1], row_stride), slice(cols[0], cols[1], col_stride)
+    ]
+
+    assert grid.shape == expected.shape
+    assert (grid.dx, grid.dy) == (2. * col_stride, 2. * row_stride)
+    assert grid.xy_of_lower_left == (
+        10. + 2. * (cols[0] or 0),
+        20. + 2. * (rows[0] or 0),
+    )
+    assert_array_equal(grid.at_node["topographic__elevation"], expected.flat)
+    assert_array_equal(grid.at_node["uplift_rate"], expected.flatten() * 10.)
+
+
+def test_read_names(tmpdir):
+    with tmpdir.as_cwd():
+        _write_grid("test.nc", write_netcdf, "NETCDF3_64BIT")
+        grid = read_netcdf("test.nc", name=["uplift_rate"])
+        with pytest.raises(ValueError):
+            read_netcdf("test.nc", name=["uplift_rate", "not_a_field"])
+
+    assert list(grid.at_node) == ["uplift_rate"]
+
+
+@pytest.mark.skipif(not WITH_NETCDF4, reason="netCDF4 package not installed")
+@pytest.mark.parametrize("format", ["NETCDF3_64BIT", "NETCDF4"])
+def test_read_time(tmpdir, format):
+    grid = RasterModelGrid((4, 3))
+    z = grid.add_zeros("node", "topographic__elevation")
+
+    with tmpdir.as_cwd():
+        with NetcdfWriter("test.nc", grid, format=format) as writer:
+            for n in range(3):
+                z[:] = n
+                writer.write(time=float(n))
+
+        assert_array_equal(read_netcdf("test.nc").at_node["topographic__elevation"], 2.)
+        for n in range(3):
+            grid = read_netcdf("test.nc", time=n)
+            assert_array_equal(grid.at_node["topographic__elevation"], n)
+
+
+def test_read_lazy(tmpdir):
+    with tmpdir.as_cwd():
+        _write_grid("test.nc", write_netcdf, "NETCDF3_64BIT")
+        grid = read_netcdf("test.nc", lazy=True, window=((2, 5), (None, None)))
+        z = grid.at_node["topographic__elevation"]
+
+        assert not z.flags.writeable
+        assert_array_equal(z, np.arange(18., 45.))
+        del grid, z
@@ -8,15 +8,19 @@ Write netcdf
     :toctree: generated/
 
     ~landlab.io.netcdf.write.write_netcdf
+    ~landlab.io.netcdf.write.write_raster_netcdf
+    ~landlab.io.netcdf.write.NetcdfWriter
 """
 
 
 import os
+import threading
 import warnings
 
 import numpy as np
 import six
 from scipy.io import netcdf as nc
+from six.moves import queue
 
 from landlab.io.netcdf._constants import (
     _AXIS_COORDINATE_NAMES,
@@ -28,6 +32,7 @@ try:
     import netCDF4 as nc4
 except ImportError:
     warnings.warn("Unable to import netCDF4.", ImportWarning)
+    nc4 = None
 
 # try:
 #     import pycrs
@@ -840,3 +845,315 @@ def write_raster_netcdf(
     # print(warning_message(message))
 
     root.close()
+
+
+def _open_netcdf(path, mode, format):
+    """Open a NetCDF file with netCDF4, if available, or scipy.
+
+    Unlike scipy, netCDF4 writes new records of NETCDF3 files in place,
+    without holding the whole file in memory.
+    """
+    if nc4 is not None:
+        return nc4.Dataset(path, mode, format=format)
+    elif format == "NETCDF3_CLASSIC":
+        return nc.netcdf_file(path, mode, version=1)
+    elif format == "NETCDF3_64BIT":
+        return nc.netcdf_file(path, mode, version=2)
+    else:
+        raise ImportError("netCDF4 is required to write {0} files".format(format))
+
+
+class NetcdfWriter(object):
+
+    """Write a time series of landlab fields to a NetCDF file.
+
+    Unlike *write_netcdf*, which opens the file and sets up its dimensions
+    and variables each time it is called, a NetcdfWriter opens the file and
+    sets it up once. Each call to *write* then appends one record, at a cost
+    that depends only on the size of the record.
+
+    Records are held in memory until *buffer_size* of them have been
+    written, and are then written to the file together. If *threaded* is
+    True, they are written by a background thread so that the model can go
+    on with its next time steps.
+
+    The file has the same layout as those from *write_netcdf*, with an
+    unlimited time dimension, *nt*, and a time variable, *t*.
+
+    Parameters
+    ----------
+    path : str
+        Path to output file.
+    fields : field-like
+        Landlab field object that holds a grid and associated values.
+    names : iterable of str, optional
+        Names of the fields to include in the netcdf file. If not provided,
+        write all fields.
+    at : {'node', 'cell'}, optional
+        The location where values are defined.
+    format : {'NETCDF3_CLASSIC', 'NETCDF3_64BIT', 'NETCDF4_CLASSIC', 'NETCDF4'}
+        Format of output netcdf file.
+    attrs : dict, optional
+        Attributes to add to netcdf file.
+    time_units : str, optional
+        Units of time.
+    time_reference : str, optional
+        Reference time.
+    zlib : bool, optional
+        Compress the field variables (NETCDF4 formats only).
+    complevel : int, optional
+        Level of compression, from 1 to 9.
+    chunksizes : tuple of int, optional
+        Chunk shape of the field variables (NETCDF4 formats only). The
+        default is one record per chunk.
+    buffer_size : int, optional
+        Number of records to hold in memory before writing them to the file.
+    threaded : bool, optional
+        Write records to the file from a background thread.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from landlab import RasterModelGrid
+    >>> from landlab.io.netcdf import NetcdfWriter
+
+    >>> rmg = RasterModelGrid((4, 3))
+    >>> z = rmg.add_zeros('node', 'topographic__elevation')
+
+    >>> import tempfile, os
+    >>> temp_dir = tempfile.mkdtemp()
+    >>> os.chdir(temp_dir)
+
+    >>> with NetcdfWriter('test.nc', rmg, buffer_size=4) as writer:
+    ...     for time in range(10):
+    ...         z += 1.
+    ...         writer.write(time=time * 10.)
+    >>> writer.number_of_records
+    10
+
+    >>> from netCDF4 import Dataset
+    >>> root = Dataset('test.nc')
+    >>> root.variables['t'][:]
+    masked_array(data = [  0.  10.  20.  30.  40.  50.  60.  70.  80.  90.],
+                 mask = False,
+           fill_value = 1e+20)
+    <BLANKLINE>
+    >>> root.variables['topographic__elevation'][:, 0, 0]
+    masked_array(data = [  1.   2.   3.   4.   5.   6.   7.   8.   9.  10.],
+                 mask = False,
+           fill_value = 1e+20)
+    <BLANKLINE>
+    >>> root.close()
+    """
+
+    def __init__(
+        self,
+        path,
+        fields,
+        names=None,
+        at=None,
+        format="NETCDF4",
+        attrs=None,
+        time_units="days",
+        time_reference="00:00:00 UTC",
+        zlib=False,
+        complevel=4,
+        chunksizes=None,
+        buffer_size=1,
+        threaded=False,
+    ):
+        if format not in _VALID_NETCDF_FORMATS:
+            raise ValueError("format not understood")
+        if at not in (None, "cell", "node"):
+            raise ValueError("value location not understood")
+        if zlib and not format.startswith("NETCDF4"):
+            raise ValueError("compression requires a NETCDF4 format")
+        if buffer_size < 1:
+            raise ValueError("buffer_size must be at least 1")
+
+        if isinstance(names, six.string_types):
+            names = (names,)
+
+        at = at or _guess_at_location(fields, names) or "node"
+        names = list(names or fields[at].keys())
+
+        if not set(fields[at].keys()).issuperset(names):
+            raise ValueError("values must be on either cells or nodes, not both")
+
+        self._fields = fields
+        self._at = at
+        self._names = names
+        self._buffer_size = buffer_size
+
+        self._root = _open_netcdf(path, "w", format)
+        self._create_variables(
+            attrs or {},
+            units=time_units,
+            reference=time_reference,
+            zlib=zlib,
+            complevel=complevel,
+            chunksizes=chunksizes,
+        )
+        self._sync()
+
+        self._times = []
+        self._records = dict((name, []) for name in names)
+        self._n_written = 0
+
+        self._error = None
+        self._queue = None
+        if threaded:
+            self._queue = queue.Queue(maxsize=2)
+            self._thread = threading.Thread(target=self._write_blocks)
+            self._thread.daemon = True
+            self._thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @property
+    def names(self):
+        """Names of the fields that are written."""
+        return list(self._names)
+
+    @property
+    def number_of_records(self):
+        """Number of records written, including those not yet flushed."""
+        return self._n_written + len(self._times)
+
+    @property
+    def closed(self):
+        """True if the file has been closed."""
+        return self._root is None
+
+    def write(self, time=None):
+        """Append the current values of the fields as a new record.
+
+        Parameters
+        ----------
+        time : float, optional
+            Time of the record. The default is the record number.
+        """
+        if self.closed:
+            raise ValueError("I/O operation on closed NetcdfWriter")
+        self._raise_if_failed()
+
+        if time is None:
+            time = self.number_of_records
+        self._times.append(time)
+        for name in self._names:
+            self._records[name].append(np.array(self._fields[self._at][name]))
+
+        if len(self._times) >= self._buffer_size:
+            self.flush()
+
+    def flush(self):
+        """Write buffered records to the file."""
+        if self._times:
+            block = (
+                self._n_written,
+                np.array(self._times),
+                dict(
+                    (name, np.stack(records)) for name, records in self._records.items()
+                ),
+            )
+            self._n_written += len(self._times)
+            self._times = []
+            self._records = dict((name, []) for name in self._names)
+
+            if self._queue is None:
+                self._write_block(*block)
+            else:
+                self._queue.put(block)
+        self._raise_if_failed()
+
+    def close(self):
+        """Write buffered records and close the file."""
+        if self.closed:
+            return
+        try:
+            self.flush()
+        finally:
+            if self._queue is not None:
+                self._queue.put(None)
+                self._thread.join()
+            self._root.close()
+            self._root = None
+        self._raise_if_failed()
+
+    def _raise_if_failed(self):
+        """Re-raise an error from the background thread."""
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def _write_blocks(self):
+        """Write blocks of records from the queue until told to stop."""
+        while True:
+            block = self._queue.get()
+            if block is None:
+                break
+            if self._error is None:
+                try:
+                    self._write_block(*block)
+                except Exception as error:
+                    self._error = error
+
+    def _write_block(self, start, times, records):
+        """Write a block of records, starting at record *start*."""
+        stop = start + len(times)
+        self._root.variables["t"][start:stop] = times
+        for name, values in records.items():
+            var = self._root.variables[name]
+            var[start:stop] = values.reshape((len(times),) + tuple(var.shape[1:]))
+        self._sync()
+
+    def _sync(self):
+        try:
+            self._root.sync()
+        except AttributeError:
+            self._root.flush()
+
+    def _create_variables(self, attrs, units, reference, **kwds):
+        """Set up the dimensions and the variables of a new file."""
+        root, fields = self._root, self._fields
+
+        _set_netcdf_attributes(root, attrs)
+        if self._at == "node":
+            _set_netcdf_structured_dimensions(root, fields.shape)
+            _add_spatial_variables(root, fields)
+            spatial_shape = list(fields.shape)
+        else:
+            _set_netcdf_cell_structured_dimensions(root, fields.shape)
+            _add_cell_spatial_variables(root, fields)
+            spatial_shape = [dim - 2 for dim in fields.shape]
+        dimensions = ["nt"] + _get_dimension_names(spatial_shape)
+
+        time_var = root.createVariable("t", "f8", ("nt",))
+        time_var.units = " ".join([units, "since", reference])
+        time_var.long_name = "time"
+
+        if isinstance(root, nc.netcdf_file) or not root.data_model.startswith(
+            "NETCDF4"
+        ):
+            kwds = {}
+        else:
+            kwds["chunksizes"] = kwds["chunksizes"] or [1] + spatial_shape
+
+        for name in self._names:
+            var = root.createVariable(
+                name,
+                _NP_TO_NC_TYPE[str(fields[self._at][name].dtype)],
+                dimensions,
+                **kwds
+            )
+            var.units = fields[self._at].units[name] or "?"
+            var.long_name = name
+            if hasattr(fields, "grid_mapping"):
+                setattr(var, "grid_mapping", fields.grid_mapping["name"])
+
+        if hasattr(fields, "grid_mapping"):
+            _set_netcdf_grid_mapping_variable(root, dict(fields.grid_mapping))
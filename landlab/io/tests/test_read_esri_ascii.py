@@ -21,6 +21,7 @@ from landlab.io import (
     MissingRequiredKeyError,
     read_asc_header,
     read_esri_ascii,
+    write_esri_ascii,
 )
 
 _TEST_DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
@@ -451,3 +452,101 @@ def test_halo_keyword_no_nodata_value():
             ]
         ),
     )
+
+
+def test_values_wider_than_a_chunk(monkeypatch):
+    monkeypatch.setattr("landlab.io.esri_ascii._CHUNK_SIZE", 5)
+    (grid, field) = read_esri_ascii(os.path.join(_TEST_DATA_DIR, "hugo_site.asc"))
+    monkeypatch.undo()
+
+    (_, expected) = read_esri_ascii(os.path.join(_TEST_DATA_DIR, "hugo_site.asc"))
+    assert_array_equal(field, expected)
+
+
+def test_read_window():
+    (grid, field) = read_esri_ascii(
+        os.path.join(_TEST_DATA_DIR, "4_x_3.asc"), window=((1, 4), (0, None))
+    )
+    assert grid.shape == (3, 3)
+    assert (grid.x_of_node[0], grid.y_of_node[0]) == (1., 12.)
+    assert_array_equal(field, [6., 7., 8., 3., 4., 5., 0., 1., 2.])
+
+
+@pytest.mark.parametrize("rows", [(0, 10), (0, 3), (7, 10), (2, -3)])
+@pytest.mark.parametrize("cols", [(0, 8), (0, 3), (5, 8), (1, -1)])
+def test_read_window_matches_full_read(tmpdir, rows, cols):
+    full_grid = RasterModelGrid((10, 8), xy_spacing=2., xy_of_lower_left=(5., 3.))
+    full_grid.add_field("node", "air__temperature", np.arange(80.))
+    full = full_grid.at_node["air__temperature"].reshape(full_grid.shape)
+
+    with tmpdir.as_cwd():
+        write_esri_ascii("test.asc", full_grid)
+        (grid, field) = read_esri_ascii("test.asc", reshape=True, window=(rows, cols))
+
+    assert_array_equal(field, full[slice(*rows), slice(*cols)])
+    assert_array_equal(
+        grid.x_of_node.reshape(grid.shape),
+        full_grid.x_of_node.reshape(full_grid.shape)[slice(*rows), slice(*cols)],
+    )
+    assert_array_equal(
+        grid.y_of_node.reshape(grid.shape),
+        full_grid.y_of_node.reshape(full_grid.shape)[slice(*rows), slice(*cols)],
+    )
+
+
+def test_read_window_with_halo():
+    (grid, field) = read_esri_ascii(
+        os.path.join(_TEST_DATA_DIR, "4_x_3.asc"),
+        window=((0, 1), (0, 2)),
+        halo=1,
+        reshape=True,
+    )
+    assert grid.shape == (3, 4)
+    assert (grid.x_of_node[0], grid.y_of_node[0]) == (-9., -8.)
+    assert_array_equal(
+        field,
+        [
+            [-9999., -9999., -9999., -9999.],
+            [-9999., 9., 10., -9999.],
+            [-9999., -9999., -9999., -9999.],
+        ],
+    )
+
+
+def test_empty_window():
+    with pytest.raises(ValueError):
+        read_esri_ascii(
+            os.path.join(_TEST_DATA_DIR, "4_x_3.asc"), window=((2, 2), (0, 3))
+        )
+
+
+def test_4x3_too_many_values():
+    asc_file = StringIO(
+        """
+nrows         4
+ncols         3
+xllcorner     1.
+yllcorner     2.
+cellsize      10.
+NODATA_value  -9999
+1. 2. 3. 4. 5. 6. 7. 8. 9. 10. 11. 12. 13.
+        """
+    )
+    with pytest.raises(DataSizeError):
+        read_esri_ascii(asc_file)
+
+
+def test_bad_value():
+    asc_file = StringIO(
+        """
+nrows         2
+ncols         2
+xllcorner     1.
+yllcorner     2.
+cellsize      10.
+1. 2.
+3. four
+        """
+    )
+    with pytest.raises(ValueError):
+        read_esri_ascii(asc_file)
@@ -0,0 +1,180 @@
+#! /usr/bin/env python
+"""Unit tests for landlab.io.tiled."""
+import numpy as np
+import pytest
+from numpy.testing import assert_array_almost_equal, assert_array_equal
+from scipy.io import netcdf as nc
+
+from landlab import RasterModelGrid
+from landlab.io import MismatchGridDataSizeError, write_esri_ascii
+from landlab.io.netcdf import write_netcdf
+from landlab.io.tiled import read_tiled
+
+_POOLS = {"mean": np.mean, "min": np.min, "max": np.max}
+
+
+def _expected(values, factor, method="mean"):
+    (n_rows, n_cols) = (values.shape[0] // factor, values.shape[1] // factor)
+    blocks = values[: n_rows * factor, : n_cols * factor].reshape(
+        (n_rows, factor, n_cols, factor)
+    )
+    return _POOLS[method](blocks, axis=(1, 3))
+
+
+def _source_values(shape=(13, 11)):
+    np.random.seed(1945)
+    return np.random.rand(*shape) * 100.
+
+
+def _write_asc(path, values):
+    grid = RasterModelGrid(values.shape, xy_spacing=2., xy_of_lower_left=(10., 20.))
+    grid.add_field("node", "topographic__elevation", values.flatten())
+    write_esri_ascii(path, grid)
+
+
+def _write_landlab_netcdf(path, values):
+    grid = RasterModelGrid(values.shape, xy_spacing=2., xy_of_lower_left=(10., 20.))
+    grid.add_field("node", "topographic__elevation", values.flatten())
+    write_netcdf(path, grid, format="NETCDF3_64BIT")
+
+
+def _write_cf_netcdf(path, values):
+    """Write values as a CF-style file with rows from north to south."""
+    (n_rows, n_cols) = values.shape
+    root = nc.netcdf_file(path, "w", version=2)
+    root.createDimension("lat", n_rows)
+    root.createDimension("lon", n_cols)
+    root.createVariable("lat", "f8", ("lat",))[:] = 20. + 2. * np.arange(n_rows)[::-1]
+    root.createVariable("lon", "f8", ("lon",))[:] = 10. + 2. * np.arange(n_cols)
+    var = root.createVariable("elevation", "i2", ("lat", "lon"))
+    var.scale_factor = .5
+    var.add_offset = 0.
+    var._FillValue = np.int16(-32767)
+    var[:] = np.round(values[::-1] * 2.).astype(np.int16)
+    root.close()
+
+
+def _write_gmt_netcdf(path, values):
+    """Write values as a GMT-style GEBCO file."""
+    (n_rows, n_cols) = values.shape
+    root = nc.netcdf_file(path, "w", version=2)
+    root.createDimension("side", 2)
+    root.createDimension("xysize", values.size)
+    root.createVariable("x_range", "f8", ("side",))[:] = [10., 10. + 2. * (n_cols - 1)]
+    root.createVariable("y_range", "f8", ("side",))[:] = [20., 20. + 2. * (n_rows - 1)]
+    root.createVariable("z_range", "f8", ("side",))[:] = [values.min(), values.max()]
+    root.createVariable("spacing", "f8", ("side",))[:] = [2., 2.]
+    root.createVariable("dimension", "i4", ("side",))[:] = [n_cols, n_rows]
+    var = root.createVariable("z", "f8", ("xysize",))
+    var.scale_factor = 1.
+    var.add_offset = 0.
+    var[:] = values[::-1].flatten()
+    root.close()
+
+
+_WRITERS = {
+    "test.asc": _write_asc,
+    "landlab.nc": _write_landlab_netcdf,
+    "cf.nc": _write_cf_netcdf,
+    "gmt.nc": _write_gmt_netcdf,
+}
+
+
+@pytest.mark.parametrize("path", sorted(_WRITERS))
+@pytest.mark.parametrize("factor", [1, 2, 3])
+@pytest.mark.parametrize("method", ["mean", "min", "max"])
+def test_read_tiled(tmpdir, path, factor, method):
+    values = _source_values()
+    if path == "cf.nc":
+        values = np.round(values * 2.) / 2.
+
+    with tmpdir.as_cwd():
+        _WRITERS[path](path, values)
+        grid = read_tiled(
+            path, xy_spacing=2. * factor, method=method, tile_rows=1, n_threads=2
+        )
+
+    expected = _expected(values, factor, method=method)
+    assert grid.shape == expected.shape
+    assert (grid.dx, grid.dy) == (2. * factor, 2. * factor)
+    assert grid.xy_of_lower_left == (10. + factor - 1., 20. + factor - 1.)
+    assert_array_almost_equal(
+        grid.at_node["topographic__elevation"].reshape(grid.shape), expected
+    )
+
+
+@pytest.mark.parametrize("tile_rows", [None, 1, 2, 100])
+@pytest.mark.parametrize("n_threads", [1, 3])
+def test_tiles_and_threads(tmpdir, tile_rows, n_threads):
+    values = _source_values((31, 17))
+    with tmpdir.as_cwd():
+        _write_landlab_netcdf("test.nc", values)
+        grid = read_tiled(
+            "test.nc", xy_spacing=6., tile_rows=tile_rows, n_threads=n_threads
+        )
+
+    assert_array_almost_equal(
+        grid.at_node["topographic__elevation"].reshape(grid.shape),
+        _expected(values, 3),
+    )
+
+
+def test_nodata(tmpdir):
+    values = _source_values((12, 9))
+    values[:3, :3] = -9999.
+    values[3:6, :2] = -9999.
+
+    with tmpdir.as_cwd():
+        _write_asc("test.asc", values)
+        with open("test.asc", "r") as fp:
+            lines = fp.readlines()
+        with open("test.asc", "w") as fp:
+            fp.writelines(lines[:5] + ["NODATA_value -9999\n"] + lines[5:])
+        grid = read_tiled("test.asc", xy_spacing=6., nodata_value=-1.)
+
+    z = grid.at_node["topographic__elevation"].reshape(grid.shape)
+    assert z[0, 0] == -1.
+    assert z[1, 0] == pytest.approx(values[3:6, 2].mean())
+    assert_array_almost_equal(z[2:, :], _expected(values, 3)[2:, :])
+
+
+def test_fill_existing_field(tmpdir):
+    values = _source_values((12, 9))
+    grid = RasterModelGrid((4, 3), xy_spacing=6., xy_of_lower_left=(12., 22.))
+    z = grid.add_zeros("node", "topographic__elevation")
+
+    with tmpdir.as_cwd():
+        _write_asc("test.asc", values)
+        read_tiled("test.asc", xy_spacing=6., grid=grid)
+
+    assert grid.at_node["topographic__elevation"] is z
+    assert_array_almost_equal(z.reshape((4, 3)), _expected(values, 3))
+
+
+def test_mismatched_grid(tmpdir):
+    grid = RasterModelGrid((5, 3), xy_spacing=6., xy_of_lower_left=(12., 22.))
+    with tmpdir.as_cwd():
+        _write_asc("test.asc", _source_values((12, 9)))
+        with pytest.raises(MismatchGridDataSizeError):
+            read_tiled("test.asc", xy_spacing=6., grid=grid)
+
+
+@pytest.mark.parametrize("xy_spacing", [1., 3., 5.])
+def test_spacing_not_a_multiple(tmpdir, xy_spacing):
+    with tmpdir.as_cwd():
+        _write_asc("test.asc", _source_values((12, 9)))
+        with pytest.raises(ValueError):
+            read_tiled("test.asc", xy_spacing=xy_spacing)
+
+
+def test_read_tiled_same_as_read_esri_ascii(tmpdir):
+    from landlab.io import read_esri_ascii
+
+    values = _source_values((12, 9))
+    with tmpdir.as_cwd():
+        _write_asc("test.asc", values)
+        grid = read_tiled("test.asc")
+        (expected, z) = read_esri_ascii("test.asc")
+
+    assert grid.xy_of_lower_left == expected.xy_of_lower_left
+    assert_array_equal(grid.at_node["topographic__elevation"], z)
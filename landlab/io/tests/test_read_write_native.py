@@ -2,6 +2,9 @@
 import os
 import pickle
 
+import numpy as np
+import pytest
+
 from numpy.testing import assert_array_equal
 
 from landlab import RasterModelGrid
@@ -144,3 +147,105 @@ def test_save():
     #     raise
     # finally:
     #     os.remove('testsavedgrid.grid')
+
+
+def test_save_raster_is_binary(tmpdir):
+    grid = RasterModelGrid((4, 5), xy_spacing=(2., 3.), xy_of_lower_left=(1., -2.))
+    grid.add_field("node", "topographic__elevation", np.arange(20.), units="m")
+    grid.add_ones("link", "water__discharge", dtype=int)
+    grid.set_closed_boundaries_at_grid_edges(True, False, True, False)
+
+    with tmpdir.as_cwd():
+        save_grid(grid, "test.grid")
+        with open("test.grid", "rb") as fp:
+            assert fp.read(8) == b"\x89LLGRID\n"
+        loaded = load_grid("test.grid", mmap_mode=None)
+
+    assert loaded.shape == grid.shape
+    assert (loaded.dx, loaded.dy) == (2., 3.)
+    assert (loaded.node_x[0], loaded.node_y[0]) == (1., -2.)
+    assert_array_equal(loaded.status_at_node, grid.status_at_node)
+    assert_array_equal(loaded.status_at_link, grid.status_at_link)
+    assert_array_equal(loaded.at_node["topographic__elevation"], np.arange(20.))
+    assert loaded.at_node.units["topographic__elevation"] == "m"
+    assert loaded.at_link["water__discharge"].dtype == np.int_
+    assert_array_equal(loaded.at_link["water__discharge"], 1)
+
+
+@pytest.mark.parametrize("mmap_mode", ["c", "r"])
+def test_load_is_memory_mapped(tmpdir, mmap_mode):
+    grid = RasterModelGrid((4, 5))
+    grid.add_field("node", "topographic__elevation", np.arange(20.))
+
+    with tmpdir.as_cwd():
+        save_grid(grid, "test.grid")
+        loaded = load_grid("test.grid", mmap_mode=mmap_mode)
+        z = loaded.at_node["topographic__elevation"]
+        assert isinstance(z.base, np.memmap)
+
+        if mmap_mode == "c":
+            z[0] = 100.
+            reloaded = load_grid("test.grid", mmap_mode=None)
+            assert reloaded.at_node["topographic__elevation"][0] == 0.
+        else:
+            with pytest.raises(ValueError):
+                z[0] = 100.
+        del loaded, z
+
+
+def test_load_pickled_grid(tmpdir):
+    grid = RasterModelGrid((4, 5))
+    grid.add_field("node", "topographic__elevation", np.arange(20.))
+
+    with tmpdir.as_cwd():
+        with open("test.grid", "wb") as fp:
+            pickle.dump(grid, fp)
+        loaded = load_grid("test.grid")
+
+    assert_array_equal(loaded.at_node["topographic__elevation"], np.arange(20.))
+
+
+def test_load_newer_version(tmpdir):
+    grid = RasterModelGrid((4, 5))
+
+    with tmpdir.as_cwd():
+        save_grid(grid, "test.grid")
+        with open("test.grid", "r+b") as fp:
+            fp.seek(8)
+            fp.write(np.array(999, dtype="<u4").tobytes())
+        with pytest.raises(ValueError):
+            load_grid("test.grid")
+
+
+def test_save_object_field_is_pickled(tmpdir):
+    grid = RasterModelGrid((4, 5))
+    grid.add_field("node", "name", np.array(["node"] * 20, dtype=object))
+
+    with tmpdir.as_cwd():
+        save_grid(grid, "test.grid")
+        with open("test.grid", "rb") as fp:
+            assert fp.read(8) != b"\x89LLGRID\n"
+        loaded = load_grid("test.grid")
+
+    assert list(loaded.at_node["name"]) == ["node"] * 20
+
+
+def test_save_loaded_grid_to_same_path(tmpdir):
+    grid = RasterModelGrid((200, 300))
+    grid.add_field("node", "topographic__elevation", np.arange(60000.))
+
+    with tmpdir.as_cwd():
+        save_grid(grid, "test.grid")
+        loaded = load_grid("test.grid")
+        loaded.at_node["topographic__elevation"] += 1.
+        save_grid(loaded, "test.grid", clobber=True)
+        reloaded = load_grid("test.grid", mmap_mode=None)
+
+        assert_array_equal(
+            loaded.at_node["topographic__elevation"], np.arange(60000.) + 1.
+        )
+        assert_array_equal(
+            reloaded.at_node["topographic__elevation"], np.arange(60000.) + 1.
+        )
+        assert sorted(os.listdir(".")) == ["test.grid"]
+        del loaded
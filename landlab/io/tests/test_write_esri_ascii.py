@@ -120,3 +120,55 @@ def test_write_then_read(tmpdir):
     assert_array_almost_equal(grid.node_x, new_grid.node_x)
     assert_array_almost_equal(grid.node_y, new_grid.node_y)
     assert_array_almost_equal(field, grid.at_node["air__temperature"])
+
+
+def test_write_matches_savetxt(tmpdir):
+    grid = RasterModelGrid((4, 5), xy_spacing=(2., 2.))
+    np.random.seed(1973)
+    grid.add_field("node", "air__temperature", np.random.normal(size=20) * 1e5)
+
+    with tmpdir.as_cwd():
+        write_esri_ascii("test.asc", grid)
+        with open("test.asc", "r") as fp:
+            lines = fp.readlines()
+
+        np.savetxt(
+            "expected.txt",
+            np.flipud(grid.at_node["air__temperature"].reshape((4, 5))),
+        )
+        with open("expected.txt", "r") as fp:
+            expected = fp.readlines()
+
+    assert lines[5:] == expected
+
+
+def test_write_nan(tmpdir):
+    grid = RasterModelGrid((4, 5))
+    values = np.arange(20.)
+    values[[3, 7]] = np.nan
+    values[12] = -np.nan
+    grid.add_field("node", "air__temperature", values)
+
+    with tmpdir.as_cwd():
+        write_esri_ascii("test.asc", grid)
+        with open("test.asc", "r") as fp:
+            lines = fp.readlines()
+        _, field = read_esri_ascii("test.asc")
+
+    assert "-nan" not in "".join(lines[5:])
+    assert lines[6].split()[2] == "nan"
+    assert lines[7].split()[2] == "nan"
+    assert_array_almost_equal(field, values)
+
+
+@pytest.mark.parametrize("values_per_block", [1, 5, 7])
+def test_write_in_blocks(tmpdir, monkeypatch, values_per_block):
+    monkeypatch.setattr("landlab.io.esri_ascii._VALUES_PER_BLOCK", values_per_block)
+    grid = RasterModelGrid((4, 5))
+    grid.add_field("node", "air__temperature", np.arange(20, dtype=int))
+
+    with tmpdir.as_cwd():
+        write_esri_ascii("test.asc", grid)
+        _, field = read_esri_ascii("test.asc")
+
+    assert_array_almost_equal(field, grid.at_node["air__temperature"])
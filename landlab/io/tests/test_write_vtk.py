@@ -0,0 +1,170 @@
+#! /usr/bin/env python
+"""Unit tests for landlab.io.vtk."""
+import base64
+import xml.dom.minidom
+import zlib
+
+import numpy as np
+import pytest
+from numpy.testing import assert_array_equal
+
+from landlab import RasterModelGrid
+from landlab.io.vtk.vti import (
+    VtkUniformRectilinearDatabase,
+    VtkUniformRectilinearWriter,
+)
+from landlab.io.vtk.writer import InvalidCompressorError, InvalidFormatError
+
+
+def _read_vti(path):
+    """Read the point data of a vti file with appended data."""
+    with open(path, "rb") as fp:
+        contents = fp.read()
+    head, appended = contents.split(b"<AppendedData", 1)
+    encoding = appended.split(b'encoding="', 1)[1].split(b'"', 1)[0]
+    data = appended.split(b"_", 1)[1]
+
+    doc = xml.dom.minidom.parseString(head + b"</VTKFile>")
+    root = doc.documentElement
+    compressed = root.getAttribute("compressor") == "vtkZLibDataCompressor"
+
+    values = {}
+    for array in doc.getElementsByTagName("DataArray"):
+        dtype = {"Float64": "f8", "Int64": "i8"}[array.getAttribute("type")]
+        offset = int(array.getAttribute("offset"))
+        if encoding == b"base64":
+            header = np.frombuffer(base64.b64decode(data[offset : offset + 12]), "u8")
+            n_bytes = int(header[0])
+            start = offset + 12
+            stop = start + 4 * ((n_bytes + 2) // 3)
+            values[array.getAttribute("Name")] = np.frombuffer(
+                base64.b64decode(data[start:stop]), dtype
+            )
+        elif compressed:
+            n_blocks = int(np.frombuffer(data[offset : offset + 8], "u8")[0])
+            header = np.frombuffer(data[offset : offset + 8 * (3 + n_blocks)], "u8")
+            start = offset + 8 * (3 + n_blocks)
+            blocks = []
+            for size in header[3:]:
+                blocks.append(zlib.decompress(data[start : start + int(size)]))
+                start += int(size)
+            values[array.getAttribute("Name")] = np.frombuffer(b"".join(blocks), dtype)
+        else:
+            n_bytes = int(np.frombuffer(data[offset : offset + 8], "u8")[0])
+            values[array.getAttribute("Name")] = np.frombuffer(
+                data[offset + 8 : offset + 8 + n_bytes], dtype
+            )
+    return root, values
+
+
+def _setup_grid():
+    grid = RasterModelGrid((5, 4), xy_spacing=(2., 3.), xy_of_lower_left=(1., 2.))
+    grid.add_field("node", "topographic__elevation", np.arange(20.) / 3.)
+    grid.add_field("node", "drainage_area", np.arange(20))
+    return grid
+
+
+@pytest.mark.parametrize(
+    "kwds",
+    [
+        dict(encoding="raw"),
+        dict(encoding="raw", compressor="zlib"),
+        dict(encoding="raw", compressor="zlib", block_size=24),
+        dict(encoding="base64"),
+    ],
+)
+def test_write_appended(tmpdir, kwds):
+    grid = _setup_grid()
+    with tmpdir.as_cwd():
+        VtkUniformRectilinearWriter(format="appended", **kwds).write("test.vti", grid)
+        root, values = _read_vti("test.vti")
+
+    assert root.getAttribute("header_type") == "UInt64"
+    assert_array_equal(
+        values["topographic__elevation"], grid.at_node["topographic__elevation"]
+    )
+    assert_array_equal(values["drainage_area"], grid.at_node["drainage_area"])
+
+
+def test_write_geometry(tmpdir):
+    grid = _setup_grid()
+    with tmpdir.as_cwd():
+        VtkUniformRectilinearWriter(format="appended", encoding="raw").write(
+            "test.vti", grid
+        )
+        root, _ = _read_vti("test.vti")
+
+    image = root.getElementsByTagName("ImageData")[0]
+    assert image.getAttribute("WholeExtent") == "0 3 0 4 0 0"
+    assert image.getAttribute("Origin") == "1.000000 2.000000 0.000000"
+    assert image.getAttribute("Spacing") == "2.000000 3.000000 0.000000"
+
+
+def test_write_ascii(tmpdir):
+    grid = _setup_grid()
+    with tmpdir.as_cwd():
+        VtkUniformRectilinearWriter(format="ascii").write("test.vti", grid)
+        doc = xml.dom.minidom.parse("test.vti")
+
+    for array in doc.getElementsByTagName("DataArray"):
+        assert array.getAttribute("format") == "ascii"
+        name = array.getAttribute("Name")
+        assert_array_equal(
+            np.array(array.firstChild.data.split(), dtype=float), grid.at_node[name]
+        )
+
+
+def test_write_twice(tmpdir):
+    grid = _setup_grid()
+    writer = VtkUniformRectilinearWriter(format="appended", encoding="raw")
+    with tmpdir.as_cwd():
+        writer.write("first.vti", grid)
+        grid.at_node["topographic__elevation"] += 1.
+        writer.write("second.vti", grid)
+        _, values = _read_vti("second.vti")
+
+    assert_array_equal(
+        values["topographic__elevation"], grid.at_node["topographic__elevation"]
+    )
+
+
+def test_time_series(tmpdir):
+    grid = _setup_grid()
+    database = VtkUniformRectilinearDatabase(format="appended", encoding="raw")
+    with tmpdir.as_cwd():
+        for time in (0., 5., 10.):
+            grid.at_node["topographic__elevation"][:] = time
+            database.write("run.vti", grid, time=time)
+        doc = xml.dom.minidom.parse("run.pvd")
+        datasets = doc.getElementsByTagName("DataSet")
+        _, values = _read_vti("run_0002.vti")
+
+    assert [dataset.getAttribute("file") for dataset in datasets] == [
+        "run_0000.vti",
+        "run_0001.vti",
+        "run_0002.vti",
+    ]
+    assert [float(dataset.getAttribute("timestep")) for dataset in datasets] == [
+        0.,
+        5.,
+        10.,
+    ]
+    assert_array_equal(values["topographic__elevation"], 10.)
+
+
+def test_bad_format():
+    with pytest.raises(InvalidFormatError):
+        VtkUniformRectilinearWriter(format="xml")
+
+
+@pytest.mark.parametrize(
+    "kwds",
+    [
+        dict(format="appended", encoding="raw", compressor="bz2"),
+        dict(format="appended", encoding="base64", compressor="zlib"),
+        dict(format="ascii", compressor="zlib"),
+    ],
+)
+def test_bad_compressor(kwds):
+    with pytest.raises(InvalidCompressorError):
+        VtkUniformRectilinearWriter(**kwds)
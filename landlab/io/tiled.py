@@ -0,0 +1,499 @@
+#! /usr/bin/env python
+"""Read large rasters into coarser grids, one tile at a time.
+
+Read tiled
+++++++++++
+
+.. autosummary::
+    :toctree: generated/
+
+    ~landlab.io.tiled.read_tiled
+
+A source raster is read in bands of rows. Each band is pooled to the
+spacing of the new grid, in blocks of *factor* by *factor* source nodes,
+and written straight into a node field of the grid, so the source is never
+held in memory at its full resolution. A node of the new grid is at the
+center of the block of source nodes that it pools.
+
+Source rasters can be ESRI ASCII files, NetCDF files with one-dimensional
+coordinate variables (either as written by Landlab, or CF-style files such
+as the GEBCO global grids), or GMT-style GEBCO files that store their
+values as a one-dimensional *z* variable.
+"""
+import os
+import threading
+import warnings
+from multiprocessing.pool import ThreadPool
+
+import numpy as np
+from scipy.io import netcdf as nc
+
+from landlab.io.esri_ascii import (
+    _CHUNK_SIZE,
+    DataSizeError,
+    MismatchGridDataSizeError,
+    MismatchGridXYLowerLeft,
+    MismatchGridXYSpacing,
+    read_asc_header,
+)
+from landlab.io.ext.esri_ascii import parse_asc_values
+from landlab.io.netcdf.errors import NotRasterGridError
+from landlab.io.netcdf.read import _read_netcdf_raster_axes
+
+try:
+    import netCDF4 as nc4
+except ImportError:
+    nc4 = None
+
+_VALUES_PER_TILE = 1 << 22
+_POOLING_METHODS = ("mean", "min", "max")
+
+
+def _raster_axis(coords):
+    """Get the first coordinate and the spacing of a raster axis.
+
+    Coordinates must be evenly spaced, to within round-off.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from landlab.io.tiled import _raster_axis
+    >>> _raster_axis(np.array([10., 12., 14.]))
+    (10.0, 2.0)
+    >>> _raster_axis(np.array([1., 2., 4.]))
+    Traceback (most recent call last):
+    ...
+    NotRasterGridError
+    """
+    coords = np.asarray(coords, dtype=float)
+    spacing = (coords[-1] - coords[0]) / (len(coords) - 1)
+    if not np.allclose(np.diff(coords), spacing, rtol=1e-6, atol=0.):
+        raise NotRasterGridError()
+    return float(coords[0]), float(spacing)
+
+
+class _EsriAsciiSource(object):
+
+    """Rows of an ESRI ASCII file.
+
+    Values are parsed as the file is read, so bands of rows must be read
+    from the top of the grid down.
+    """
+
+    serial = True
+
+    def __init__(self, path):
+        self._file = open(path, "r")
+        header = read_asc_header(self._file)
+
+        self.shape = (header["nrows"], header["ncols"])
+        self.spacing = header["cellsize"]
+        self.xy_of_lower_left = (header["xllcorner"], header["yllcorner"])
+        self._nodata_value = header.get("nodata_value", None)
+
+        self._text = b""
+        self._n_values = 0
+
+    def read_rows(self, start, stop):
+        (n_rows, n_cols) = self.shape
+        if self._n_values != (n_rows - stop) * n_cols:
+            raise ValueError("rows must be read from the top of the grid down")
+
+        data = np.empty((stop - start, n_cols), dtype=float)
+        n_values_to_read = (n_rows - start) * n_cols
+        while self._n_values < n_values_to_read:
+            chunk = self._file.read(_CHUNK_SIZE)
+            if not isinstance(chunk, bytes):
+                chunk = chunk.encode()
+            at_end = len(chunk) == 0
+
+            self._text += chunk
+            self._n_values, n_bytes = parse_asc_values(
+                self._text,
+                data[::-1],
+                self._n_values,
+                n_cols,
+                n_rows - stop,
+                0,
+                at_end,
+            )
+            self._text = self._text[n_bytes:]
+
+            if at_end:
+                break
+
+        if self._n_values < n_values_to_read:
+            raise DataSizeError(n_rows * n_cols, self._n_values)
+
+        if self._nodata_value is not None:
+            data[data == self._nodata_value] = np.nan
+        return data
+
+    def close(self):
+        self._file.close()
+
+
+class _NetcdfSource(object):
+
+    """Rows of a NetCDF variable with one-dimensional coordinates.
+
+    The coordinates of the rows and columns of a variable with dimensions
+    *(..., rows, columns)* are those of the coordinate variables with the
+    names of its dimensions or, for Landlab's *nj* and *ni* dimensions,
+    the *y* and *x* variables. Rows may be ordered from north to south.
+    Only the last index of any leading dimensions (such as time) is read.
+    """
+
+    serial = False
+
+    def __init__(self, root, name):
+        self._root = root
+        self._var = root.variables[name]
+        self._lock = threading.Lock()
+
+        (row_dim, col_dim) = self._var.dimensions[-2:]
+        if (row_dim, col_dim) == ("nj", "ni"):
+            (y, x) = _read_netcdf_raster_axes(root)
+        else:
+            (y, x) = (root.variables[row_dim][:], root.variables[col_dim][:])
+        y0, dy = _raster_axis(y)
+        x0, dx = _raster_axis(x)
+        if not np.isclose(abs(dy), dx, rtol=1e-6, atol=0.):
+            raise NotRasterGridError()
+
+        self.shape = (len(y), len(x))
+        self.spacing = dx
+        self.xy_of_lower_left = (x0, min(y0, float(y[-1])))
+        self._flipped = dy < 0.
+        self._read_packing()
+
+    def _read_packing(self):
+        """Read the fill value, scale factor and offset of the variable."""
+        if nc4 is not None and isinstance(self._root, nc4.Dataset):
+            self._var.set_auto_maskandscale(False)
+        self._fill_value = getattr(
+            self._var, "_FillValue", getattr(self._var, "missing_value", None)
+        )
+        self._scale_factor = getattr(self._var, "scale_factor", 1.)
+        self._add_offset = getattr(self._var, "add_offset", 0.)
+
+    def _read(self, start, stop):
+        index = (-1,) * (len(self._var.dimensions) - 2) + (slice(start, stop),)
+        with self._lock:
+            return np.asarray(self._var[index])
+
+    def read_rows(self, start, stop):
+        if self._flipped:
+            n_rows = self.shape[0]
+            raw = self._read(n_rows - stop, n_rows - start)[::-1]
+        else:
+            raw = self._read(start, stop)
+
+        data = raw * float(self._scale_factor) + float(self._add_offset)
+        if self._fill_value is not None:
+            data[raw == self._fill_value] = np.nan
+        return data
+
+    def close(self):
+        # scipy warns if arrays still map the file, but they are only views.
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)
+            self._root.close()
+
+
+class _GmtSource(_NetcdfSource):
+
+    """Rows of a GMT-style (GEBCO) NetCDF file.
+
+    The values of these files are a one-dimensional *z* variable that holds
+    the rows of the grid from north to south. The *dimension*, *spacing*,
+    *x_range* and *y_range* variables give the number of columns and rows,
+    the column and row spacing, and the extent of the grid.
+    """
+
+    def __init__(self, root, name="z"):
+        self._root = root
+        self._var = root.variables[name]
+        self._lock = threading.Lock()
+
+        (n_cols, n_rows) = [int(n) for n in root.variables["dimension"][:]]
+        (dx, dy) = [float(d) for d in root.variables["spacing"][:]]
+        if not np.isclose(dx, dy, rtol=1e-6, atol=0.):
+            raise NotRasterGridError()
+
+        self.shape = (n_rows, n_cols)
+        self.spacing = dx
+        self.xy_of_lower_left = (
+            float(root.variables["x_range"][0]),
+            float(root.variables["y_range"][0]),
+        )
+        self._flipped = True
+        self._read_packing()
+
+    def _read(self, start, stop):
+        n_cols = self.shape[1]
+        with self._lock:
+            values = np.asarray(self._var[start * n_cols : stop * n_cols])
+        return values.reshape((-1, n_cols))
+
+
+def _open_source(path, format=None, name=None):
+    """Open a raster file for reading in bands of rows.
+
+    Parameters
+    ----------
+    path : str
+        Path to the file.
+    format : {'esri-ascii', 'netcdf'}, optional
+        Format of the file. The default is to guess from the suffix of
+        the file name, where *.asc* and *.txt* files are ESRI ASCII.
+    name : str, optional
+        Name of the variable to read from a NetCDF file. The default is
+        *z* for a GMT-style file, or otherwise the only variable with at
+        least two dimensions that is not a coordinate.
+    """
+    if format is None:
+        if os.path.splitext(path)[1].lower() in (".asc", ".txt"):
+            format = "esri-ascii"
+        else:
+            format = "netcdf"
+
+    if format == "esri-ascii":
+        return _EsriAsciiSource(path)
+    elif format != "netcdf":
+        raise ValueError("{format}: format not understood".format(format=format))
+
+    try:
+        root = nc.netcdf_file(path, "r", version=2)
+    except TypeError:
+        root = nc4.Dataset(path, "r")
+
+    if "dimension" in root.variables and "z" in root.variables:
+        return _GmtSource(root, name=name or "z")
+
+    if name is None:
+        names = [
+            var_name
+            for (var_name, var) in root.variables.items()
+            if len(var.dimensions) >= 2
+            and var_name not in root.dimensions
+            and var_name not in ("x", "y")
+        ]
+        if len(names) != 1:
+            root.close()
+            raise ValueError(
+                "unable to choose a variable from {names}".format(names=names)
+            )
+        name = names[0]
+
+    return _NetcdfSource(root, name)
+
+
+def _pool_blocks(values, factor, method="mean", nodata_value=-9999.):
+    """Pool values over blocks of *factor* by *factor* nodes.
+
+    Missing values (NaN) are not included in the pool. Blocks that have no
+    values are given *nodata_value*.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from landlab.io.tiled import _pool_blocks
+    >>> values = np.arange(16.).reshape((4, 4))
+    >>> _pool_blocks(values, 2)
+    array([[  2.5,   4.5],
+           [ 10.5,  12.5]])
+    >>> values[:2, :2] = np.nan
+    >>> _pool_blocks(values, 2, method="max", nodata_value=-1.)
+    array([[ -1.,   7.],
+           [ 13.,  15.]])
+    """
+    (n_rows, n_cols) = (values.shape[0] // factor, values.shape[1] // factor)
+    blocks = values[: n_rows * factor, : n_cols * factor].reshape(
+        (n_rows, factor, n_cols, factor)
+    )
+    is_valid = ~np.isnan(blocks)
+    count = is_valid.sum(axis=(1, 3))
+
+    if method == "mean":
+        pooled = np.where(is_valid, blocks, 0.).sum(axis=(1, 3))
+        pooled /= np.maximum(count, 1)
+    elif method == "min":
+        pooled = np.where(is_valid, blocks, np.inf).min(axis=(1, 3))
+    elif method == "max":
+        pooled = np.where(is_valid, blocks, -np.inf).max(axis=(1, 3))
+    else:
+        raise ValueError(
+            "{method}: pooling method not understood".format(method=method)
+        )
+
+    pooled[count == 0] = nodata_value
+    return pooled
+
+
+def read_tiled(
+    path,
+    xy_spacing=None,
+    grid=None,
+    name="topographic__elevation",
+    method="mean",
+    format=None,
+    variable=None,
+    nodata_value=-9999.,
+    tile_rows=None,
+    n_threads=1,
+):
+    """Read a raster file into a grid of coarser resolution, tile by tile.
+
+    The file is read in tiles that are bands of rows. The values of each
+    tile are pooled to the spacing of the grid in blocks of source nodes,
+    and written into a node field of the grid. Only a few tiles are held
+    in memory at once. Nodes of the source that don't fill a block, along
+    the top and right edges, are dropped.
+
+    Parameters
+    ----------
+    path : str
+        Path to an ESRI ASCII or NetCDF raster file.
+    xy_spacing : float, optional
+        Node spacing of the grid. This must be a multiple of the spacing of
+        the raster. The default is the spacing of the raster.
+    grid : RasterModelGrid, optional
+        Fill a field of this grid rather than creating a new grid. The
+        grid must have the shape, spacing and lower-left corner of the
+        pooled raster.
+    name : str, optional
+        Name of the node field to fill. If the grid already has the field,
+        its values are replaced in place.
+    method : {'mean', 'min', 'max'}, optional
+        Pool values of a block by their mean, minimum or maximum.
+    format : {'esri-ascii', 'netcdf'}, optional
+        Format of the file. The default is to guess from the file name.
+    variable : str, optional
+        Variable to read from a NetCDF file.
+    nodata_value : float, optional
+        Value of nodes whose block has no valid values.
+    tile_rows : int, optional
+        Number of rows of the grid in a tile. The default gives tiles of
+        about 4 million source values.
+    n_threads : int, optional
+        Number of threads that read and pool tiles. ESRI ASCII files are
+        read one tile at a time, in order.
+
+    Returns
+    -------
+    RasterModelGrid
+        The grid, with the pooled values in its *name* field.
+
+    Examples
+    --------
+    >>> import os
+    >>> import numpy as np
+    >>> from landlab import RasterModelGrid
+    >>> from landlab.io import write_esri_ascii
+    >>> from landlab.io.tiled import read_tiled
+
+    >>> fine = RasterModelGrid((12, 9))
+    >>> _ = fine.add_field("node", "topographic__elevation", np.arange(108.))
+    >>> _ = write_esri_ascii("fine.asc", fine)
+
+    >>> grid = read_tiled("fine.asc", xy_spacing=3., tile_rows=2)
+    >>> grid.shape == (4, 3)
+    True
+    >>> grid.xy_of_lower_left
+    (1.0, 1.0)
+    >>> grid.at_node["topographic__elevation"].reshape(grid.shape)
+    array([[ 10.,  13.,  16.],
+           [ 37.,  40.,  43.],
+           [ 64.,  67.,  70.],
+           [ 91.,  94.,  97.]])
+    >>> os.remove("fine.asc")
+    """
+    from landlab import RasterModelGrid
+
+    if method not in _POOLING_METHODS:
+        raise ValueError(
+            "{method}: pooling method not understood".format(method=method)
+        )
+
+    source = _open_source(path, format=format, name=variable)
+    try:
+        if xy_spacing is None:
+            factor = 1
+        else:
+            factor = int(round(xy_spacing / source.spacing))
+            if factor < 1 or not np.isclose(
+                factor * source.spacing, xy_spacing, rtol=1e-6, atol=0.
+            ):
+                raise ValueError(
+                    "spacing must be a multiple of the raster spacing "
+                    "({spacing})".format(spacing=source.spacing)
+                )
+
+        shape = (source.shape[0] // factor, source.shape[1] // factor)
+        spacing = source.spacing * factor
+        offset = .5 * (factor - 1) * source.spacing
+        xy_of_lower_left = (
+            source.xy_of_lower_left[0] + offset,
+            source.xy_of_lower_left[1] + offset,
+        )
+
+        if grid is None:
+            grid = RasterModelGrid(
+                shape, xy_spacing=spacing, xy_of_lower_left=xy_of_lower_left
+            )
+        else:
+            if grid.shape != shape:
+                raise MismatchGridDataSizeError(
+                    shape[0] * shape[1], grid.number_of_nodes
+                )
+            if not np.allclose((grid.dx, grid.dy), spacing):
+                raise MismatchGridXYSpacing((grid.dx, grid.dy), (spacing, spacing))
+            if not np.allclose(grid.xy_of_lower_left, xy_of_lower_left):
+                raise MismatchGridXYLowerLeft(grid.xy_of_lower_left, xy_of_lower_left)
+
+        if name in grid.at_node:
+            values = grid.at_node[name]
+        else:
+            values = grid.add_empty(name, at="node")
+        values = values.reshape(shape)
+
+        if tile_rows is None:
+            tile_rows = max(1, _VALUES_PER_TILE // (factor * factor * shape[1]))
+        tiles = [
+            (start, min(start + tile_rows, shape[0]))
+            for start in range(0, shape[0], tile_rows)
+        ]
+
+        def pool_tile(tile):
+            (start, stop) = tile
+            values[start:stop] = _pool_blocks(
+                source.read_rows(start * factor, stop * factor)[
+                    :, : shape[1] * factor
+                ],
+                factor,
+                method=method,
+                nodata_value=nodata_value,
+            )
+
+        if source.serial:
+            # Skip the rows that are above the top of the grid.
+            if source.shape[0] > shape[0] * factor:
+                source.read_rows(shape[0] * factor, source.shape[0])
+            for tile in reversed(tiles):
+                pool_tile(tile)
+        elif n_threads > 1:
+            pool = ThreadPool(n_threads)
+            try:
+                for _ in pool.imap_unordered(pool_tile, tiles):
+                    pass
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            for tile in tiles:
+                pool_tile(tile)
+    finally:
+        source.close()
+
+    return grid
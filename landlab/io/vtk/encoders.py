@@ -1,6 +1,7 @@
 #!/bin/env python
 
 import base64
+import zlib
 
 import numpy as np
 
@@ -11,7 +12,7 @@ class EncoderError(Exception):
 
 class UnknownEncoderError(EncoderError):
     def __init__(self, name):
-        self._name
+        self._name = name
 
     def __str__(self):
         return "%s: Unknown encoder" % self._name
@@ -24,36 +25,114 @@ class EncoderInterface(object):
 
 class AsciiEncoder(object):
     def encode(self, array):
-        try:
-            return " ".join([str(val) for val in array.flatten()])
-        except AttributeError:
-            return " ".join([str(val) for val in array])
+        return " ".join(map(str, np.asarray(array).ravel().tolist()))
 
 
 class RawEncoder(object):
     def encode(self, array):
-        try:
-            as_str = array.tostring()
-        except AttributeError:
-            as_str = np.array(array).tostring()
-        block_size = np.array(len(as_str), dtype=np.int32).tostring()
+        as_str = np.asarray(array).tobytes()
+        block_size = np.array(len(as_str), dtype=np.int32).tobytes()
         return block_size + as_str
 
 
 class Base64Encoder(object):
     def encode(self, array):
-        try:
-            as_str = array.tostring()
-        except AttributeError:
-            as_str = np.array(array).tostring()
-        as_str = base64.b64encode(as_str)
-        block_size = base64.b64encode(np.array(len(as_str), dtype=np.int32).tostring())
-        return block_size + as_str
+        as_str = np.asarray(array).tobytes()
+        block_size = base64.b64encode(np.array(len(as_str), dtype=np.int32).tobytes())
+        return (block_size + base64.b64encode(as_str)).decode("ascii")
 
     def decode(self, array):
         pass
 
 
+def iter_appended_blocks(
+    array, encoding="raw", compressor=None, block_size=1 << 15, level=-1
+):
+    """Iterate over the blocks of an array's appended data.
+
+    Blocks are written as described by the VTK XML file format with a
+    *header_type* of ``UInt64``. Uncompressed data are a header that
+    gives the number of bytes of data, followed by the data. Compressed
+    data are split into blocks of *block_size* bytes that are compressed
+    separately. Their header gives the number of blocks, the block size,
+    the size of the last block (if partial) and the compressed size of
+    each block.
+
+    Uncompressed raw data are not copied; the blocks are views of the
+    array's buffer.
+
+    Parameters
+    ----------
+    array : ndarray
+        Values to encode.
+    encoding : {'raw', 'base64'}, optional
+        Encoding of the data.
+    compressor : {None, 'zlib'}, optional
+        Compress the data in blocks. Compressed data must be raw.
+    block_size : int, optional
+        Size of a block, in bytes.
+    level : int, optional
+        Compression level.
+
+    Yields
+    ------
+    bytes-like
+        Blocks of encoded data.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from landlab.io.vtk.encoders import iter_appended_blocks
+    >>> blocks = iter_appended_blocks(np.arange(4, dtype=np.uint8))
+    >>> [len(block) for block in blocks]
+    [8, 4]
+    >>> blocks = iter_appended_blocks(np.arange(4, dtype=np.uint8), encoding="base64")
+    >>> [bytes(block) for block in blocks][1]
+    b'AAECAw=='
+
+    >>> blocks = iter_appended_blocks(
+    ...     np.zeros(5, dtype=np.uint8), compressor="zlib", block_size=2
+    ... )
+    >>> header = np.frombuffer(next(blocks), dtype=np.uint64)
+    >>> header[:3]
+    array([3, 2, 1], dtype=uint64)
+    >>> len(list(blocks))
+    3
+    """
+    array = np.asarray(array)
+    array = np.ascontiguousarray(array, dtype=array.dtype.newbyteorder("="))
+    buffer = memoryview(array.reshape(-1).view(np.uint8))
+
+    if compressor is None:
+        header = np.array([len(buffer)], dtype=np.uint64)
+        blocks = [buffer]
+    elif compressor == "zlib":
+        if encoding != "raw":
+            raise ValueError("compressed data must be raw")
+        blocks = [
+            zlib.compress(buffer[start : start + block_size], level)
+            for start in range(0, len(buffer), block_size)
+        ]
+        header = np.array(
+            [len(blocks), block_size, len(buffer) % block_size]
+            + [len(block) for block in blocks],
+            dtype=np.uint64,
+        )
+    else:
+        raise UnknownEncoderError(compressor)
+
+    if encoding == "raw":
+        yield header.tobytes()
+        for block in blocks:
+            yield block
+    elif encoding == "base64":
+        yield base64.b64encode(header.tobytes())
+        for start in range(0, len(buffer), 3 * block_size):
+            yield base64.b64encode(buffer[start : start + 3 * block_size])
+    else:
+        raise UnknownEncoderError(encoding)
+
+
 _ENCODERS = {"ascii": AsciiEncoder(), "raw": RawEncoder(), "base64": Base64Encoder()}
 
 
@@ -11,13 +11,52 @@ from landlab.io.vtk.vtkxml import (
     VtkRootElement,
     VtkSpacing,
 )
-from landlab.io.vtk.writer import VtkWriter
+from landlab.io.vtk.writer import VTKDatabase, VtkWriter
+
+
+class _RasterGridField(object):
+
+    """View the node fields of a RasterModelGrid as a uniform rectilinear field.
+
+    The points of the VTK image are the grid's nodes. Landlab cells are not
+    the cells of the image so cell fields are not written.
+    """
+
+    def __init__(self, grid):
+        self.shape = grid.shape
+        self.spacing = (grid.dy, grid.dx)
+        # VtkOrigin moves the origin back half of a spacing.
+        self.origin = (grid.node_y[0] + .5 * grid.dy, grid.node_x[0] + .5 * grid.dx)
+        self.at_node = grid.at_node
+        self.at_cell = {}
 
 
 class VtkUniformRectilinearWriter(VtkWriter):
+
+    """Write a uniform rectilinear field, or a RasterModelGrid, to a vti file.
+
+    Examples
+    --------
+    >>> import os
+    >>> import numpy as np
+    >>> from landlab import RasterModelGrid
+    >>> from landlab.io.vtk.vti import VtkUniformRectilinearWriter
+
+    >>> grid = RasterModelGrid((3, 4), xy_spacing=2.)
+    >>> _ = grid.add_field("node", "topographic__elevation", np.arange(12.))
+    >>> writer = VtkUniformRectilinearWriter(
+    ...     format="appended", encoding="raw", compressor="zlib"
+    ... )
+    >>> writer.write("topo.vti", grid)
+    >>> os.remove("topo.vti")
+    """
+
     _vtk_grid_type = VtkUniformRectilinear
 
     def construct_field_elements(self, field):
+        if hasattr(field, "at_node") and not hasattr(field, "origin"):
+            field = _RasterGridField(field)
+
         extent = VtkExtent(field.shape[::-1])
         origin = VtkOrigin(field.origin[::-1], field.spacing[::-1])
         spacing = VtkSpacing(field.spacing[::-1])
@@ -40,3 +79,27 @@ class VtkUniformRectilinearWriter(VtkWriter):
         }
 
         return element
+
+
+class VtkUniformRectilinearDatabase(VTKDatabase, VtkUniformRectilinearWriter):
+
+    """Write a time series of uniform rectilinear fields to vti files.
+
+    Examples
+    --------
+    >>> import os
+    >>> import numpy as np
+    >>> from landlab import RasterModelGrid
+    >>> from landlab.io.vtk.vti import VtkUniformRectilinearDatabase
+
+    >>> grid = RasterModelGrid((3, 4))
+    >>> z = grid.add_zeros("node", "topographic__elevation")
+    >>> database = VtkUniformRectilinearDatabase(format="appended", encoding="raw")
+    >>> for time in (0., 10.):
+    ...     z += 1.
+    ...     database.write("topo.vti", grid, time=time)
+    >>> sorted(name for name in os.listdir(".") if name.startswith("topo"))
+    ['topo.pvd', 'topo_0000.vti', 'topo_0001.vti']
+    >>> for name in ("topo.pvd", "topo_0000.vti", "topo_0001.vti"):
+    ...     os.remove(name)
+    """
@@ -6,7 +6,7 @@ import xml.dom.minidom
 import numpy as np
 from six.moves import range
 
-from landlab.io.vtk.encoders import encode
+from landlab.io.vtk.encoders import encode, iter_appended_blocks
 from landlab.io.vtk.vtktypes import NUMPY_TO_VTK_TYPE, SYS_TO_VTK_ENDIAN
 
 
@@ -80,6 +80,7 @@ class VtkSpacing(object):
 class VtkElement(xml.dom.minidom.Element):
     def __init__(self, name, **kwargs):
         xml.dom.minidom.Element.__init__(self, str(name), namespaceURI="VTK")
+        self.ownerDocument = None
         self.setAttributes(**kwargs)
 
     def setAttributes(self, **kwargs):
@@ -104,7 +105,9 @@ class VtkElement(xml.dom.minidom.Element):
 
 class VtkTextElement(xml.dom.minidom.Text):
     def __init__(self, text):
-        self.replaceWholeText(text)
+        self.ownerDocument = self.parentNode = None
+        self.previousSibling = self.nextSibling = None
+        self.data = text
 
 
 class VtkDataArrayElement(VtkElement):
@@ -116,34 +119,33 @@ class VtkDataArrayElement(VtkElement):
 
 
 class VtkDataElement(VtkElement):
-    format = "ascii"
-
     def __init__(self, name, **kwargs):
         VtkElement.__init__(self, name)
 
     def addData(self, data, name, append=None, encoding="ascii", **kwargs):
-        data_string = encode(data, encoding=encoding)
         data_array = VtkDataArrayElement(
-            data_string, Name=name, type=NUMPY_TO_VTK_TYPE[str(data.dtype)], **kwargs
+            data, Name=name, type=NUMPY_TO_VTK_TYPE[str(data.dtype)], **kwargs
         )
         self.appendChild(data_array)
 
         if append is not None:
-            data_array.setAttributes(offset=append.offset(), format="appended")
-            append.addData(data_string)
+            data_array.setAttributes(offset=append.addData(data), format="appended")
         else:
-            data_array.setAttributes(format=self.format)
-            data_array.addData(data_string)
+            data_array.setAttributes(
+                format="ascii" if encoding == "ascii" else "binary"
+            )
+            data_array.addData(encode(data, encoding=encoding))
 
 
 class VtkRootElement(VtkElement):
-    def __init__(self, type):
+    def __init__(self, type, version="0.1", **kwargs):
         VtkElement.__init__(
             self,
             "VTKFile",
             type=type,
-            version="0.1",
+            version=version,
             byte_order=str(SYS_TO_VTK_ENDIAN[sys.byteorder]),
+            **kwargs
         )
 
 
@@ -158,15 +160,79 @@ class VtkPieceElement(VtkElement):
 
 
 class VtkAppendedDataElement(VtkElement):
-    def __init__(self, data, **kwargs):
-        VtkElement.__init__(self, "AppendedData", **kwargs)
-        self.appendChild(VtkTextElement("_" + data))
 
-    def addData(self, data):
-        self.firstChild.appendData(data)
+    """Data arrays that are appended to a VTK XML file.
+
+    Arrays are not encoded when they are added but are streamed to the
+    file, one block at a time, by :meth:`write`. Because the size of
+    compressed data is not known until it has been compressed, the
+    *offset* attribute of each DataArray is first written as a
+    fixed-width placeholder (see :meth:`placeholder`) that is then
+    overwritten once the data have been written.
+
+    Parameters
+    ----------
+    encoding : {'raw', 'base64'}, optional
+        Encoding of the appended data.
+    compressor : {None, 'zlib'}, optional
+        Compress the data in blocks.
+    block_size : int, optional
+        Size of a block of compressed data, in bytes.
+    level : int, optional
+        Compression level.
+    """
+
+    def __init__(
+        self, encoding="raw", compressor=None, block_size=1 << 15, level=-1
+    ):
+        VtkElement.__init__(self, "AppendedData", encoding=encoding)
+        self._encoding = encoding
+        self._compressor = compressor
+        self._block_size = block_size
+        self._level = level
+        self._arrays = []
+
+    @staticmethod
+    def placeholder(index):
+        return "%020d" % index
 
-    def offset(self):
-        return self.firstChild.length - 1
+    def addData(self, data):
+        self._arrays.append(data)
+        return self.placeholder(len(self._arrays) - 1)
+
+    def write(self, xml_file):
+        """Write the appended data to a file.
+
+        Parameters
+        ----------
+        xml_file : file_like
+            Binary file to write to.
+
+        Returns
+        -------
+        list of int
+            Offsets to the data of each array.
+        """
+        xml_file.write(
+            ('<AppendedData encoding="%s">\n_' % self._encoding).encode("utf-8")
+        )
+        start = xml_file.tell()
+
+        offsets = []
+        for array in self._arrays:
+            offsets.append(xml_file.tell() - start)
+            for block in iter_appended_blocks(
+                array,
+                encoding=self._encoding,
+                compressor=self._compressor,
+                block_size=self._block_size,
+                level=self._level,
+            ):
+                xml_file.write(block)
+
+        xml_file.write(b"\n</AppendedData>\n")
+
+        return offsets
 
 
 class VtkPointsElement(VtkDataElement):
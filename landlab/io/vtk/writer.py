@@ -2,10 +2,11 @@
 import os
 import xml.dom.minidom
 
-from .vtkxml import VtkAppendedDataElement
+from .vtkxml import VtkAppendedDataElement, VtkElement
 
 _VALID_ENCODINGS = set(["ascii", "base64", "raw"])
 _VALID_FORMATS = set(["ascii", "base64", "raw", "appended"])
+_VALID_COMPRESSORS = {None: None, "zlib": "vtkZLibDataCompressor"}
 _VTK_POSSIBLE_PIECE_SECTIONS = [
     "Points",
     "Coordinates",
@@ -35,6 +36,14 @@ class InvalidEncodingError(VtkError):
         return "%s: Invalid encoder" % self.name
 
 
+class InvalidCompressorError(VtkError):
+    def __init__(self, compressor):
+        self.name = compressor
+
+    def __str__(self):
+        return "%s: Invalid compressor" % self.name
+
+
 def assemble_vtk_document(element):
     root = element["VTKFile"]
     grid = element["Grid"]
@@ -57,8 +66,8 @@ def assemble_vtk_document(element):
 
 
 def assert_format_is_valid(format_string):
-    if format not in _VALID_FORMATS:
-        raise InvalidFormatError(format)
+    if format_string not in _VALID_FORMATS:
+        raise InvalidFormatError(format_string)
 
 
 def assert_encoding_is_valid(encoding):
@@ -66,21 +75,55 @@ def assert_encoding_is_valid(encoding):
         raise InvalidEncodingError(encoding)
 
 
+def assert_compressor_is_valid(compressor):
+    if compressor not in _VALID_COMPRESSORS:
+        raise InvalidCompressorError(compressor)
+
+
 class VtkWriter(xml.dom.minidom.Document):
+
+    """Write fields to VTK XML files.
+
+    With the *appended* format, the values of each field are written as
+    a block of binary data at the end of the file. Data are streamed
+    from the field buffers so that, with *raw* encoding and no
+    compression, values are not copied.
+
+    Parameters
+    ----------
+    format : {'ascii', 'base64', 'raw', 'appended'}, optional
+        Write data inline or appended to the file.
+    encoding : {'ascii', 'base64', 'raw'}, optional
+        Encoding of the data.
+    compressor : {None, 'zlib'}, optional
+        Compress appended, raw data in blocks.
+    block_size : int, optional
+        Size of a block of compressed data, in bytes.
+    level : int, optional
+        Compression level.
+    """
+
     def __init__(self, **kwds):
         self._format = kwds.pop("format", "ascii")
         self._encoding = kwds.pop("encoding", "ascii")
+        self._compressor = kwds.pop("compressor", None)
+        self._block_size = kwds.pop("block_size", 1 << 15)
+        self._level = kwds.pop("level", -1)
 
         assert_format_is_valid(self.format)
         assert_encoding_is_valid(self.encoding)
+        assert_compressor_is_valid(self.compressor)
 
-        if format == "ascii":
+        if self.format == "ascii":
             self._encoding = "ascii"
+        if self.format == "appended" and self.encoding == "ascii":
+            raise InvalidEncodingError(self.encoding)
+        if self.compressor is not None and (
+            self.format != "appended" or self.encoding != "raw"
+        ):
+            raise InvalidCompressorError(self.compressor)
 
-        if self.format == "appended":
-            self._data = VtkAppendedDataElement("", encoding=self.encoding)
-        else:
-            self._data = None
+        self._data = None
 
         xml.dom.minidom.Document.__init__(self)
 
@@ -92,6 +135,10 @@ class VtkWriter(xml.dom.minidom.Document):
     def encoding(self):
         return self._encoding
 
+    @property
+    def compressor(self):
+        return self._compressor
+
     @property
     def data(self):
         return self._data
@@ -101,33 +148,148 @@ class VtkWriter(xml.dom.minidom.Document):
 
     def write(self, path, field):
         self.unlink()
+        if self.format == "appended":
+            self._data = VtkAppendedDataElement(
+                encoding=self.encoding,
+                compressor=self.compressor,
+                block_size=self._block_size,
+                level=self._level,
+            )
         elements = self.construct_field_elements(field)
 
+        root = assemble_vtk_document(elements)
         if self.data is not None:
-            elements["AppendedData"] = self.data
+            root.setAttributes(version="1.0", header_type="UInt64")
+        if self.compressor is not None:
+            root.setAttributes(compressor=_VALID_COMPRESSORS[self.compressor])
 
-        self.appendChild(assemble_vtk_document(elements))
+        self.appendChild(root)
         self.to_xml(path)
 
     def to_xml(self, path):
-        with open(path, "w") as xml_file:
-            xml_file.write(self.toprettyxml())
+        if self.data is None:
+            with open(path, "w") as xml_file:
+                xml_file.write(self.toprettyxml())
+            return
+
+        head, tail = self.toprettyxml().rsplit("</VTKFile>", 1)
+        head = head.encode("utf-8")
+
+        with open(path, "wb") as xml_file:
+            xml_file.write(head)
+            offsets = self.data.write(xml_file)
+            xml_file.write(("</VTKFile>" + tail).encode("utf-8"))
+
+            for index, offset in enumerate(offsets):
+                placeholder = self.data.placeholder(index).encode("utf-8")
+                xml_file.seek(head.index(b'offset="' + placeholder) + 8)
+                xml_file.write(self.data.placeholder(offset).encode("utf-8"))
+
+
+class VtkCollection(object):
+
+    """A ParaView data (pvd) file that collects a time series of VTK files.
+
+    The collection is written when it is created and each time a file is
+    added, so that it can be opened while a model is still running.
+
+    Parameters
+    ----------
+    path : str
+        Path to the collection file.
+
+    Examples
+    --------
+    >>> import os
+    >>> from landlab.io.vtk.writer import VtkCollection
+    >>> collection = VtkCollection("run.pvd")
+    >>> collection.add("run_0000.vti", 0.)
+    >>> collection.add("run_0001.vti", 10.)
+    >>> len(collection)
+    2
+    >>> import xml.dom.minidom
+    >>> datasets = xml.dom.minidom.parse("run.pvd").getElementsByTagName("DataSet")
+    >>> [dataset.getAttribute("file") for dataset in datasets]
+    ['run_0000.vti', 'run_0001.vti']
+    >>> [dataset.getAttribute("timestep") for dataset in datasets]
+    ['0.0', '10.0']
+    >>> os.remove("run.pvd")
+    """
+
+    _HEAD = '<?xml version="1.0"?>\n<VTKFile type="Collection" version="0.1">\n'
+    _TAIL = "  </Collection>\n</VTKFile>\n"
+
+    def __init__(self, path):
+        self._path = path
+        self._files = []
+
+        with open(self._path, "w") as pvd_file:
+            pvd_file.write(self._HEAD + "  <Collection>\n" + self._TAIL)
+
+    @property
+    def path(self):
+        return self._path
+
+    def __len__(self):
+        return len(self._files)
+
+    def add(self, path, time, part=0):
+        """Add a file to the collection.
+
+        Parameters
+        ----------
+        path : str
+            Path to a VTK file. Relative paths are relative to the
+            collection file.
+        time : float
+            Time of the data in the file.
+        part : int, optional
+            Part of the data set that is in the file.
+        """
+        if os.path.isabs(path):
+            path = os.path.relpath(path, os.path.dirname(os.path.abspath(self.path)))
+        dataset = VtkElement(
+            "DataSet", timestep=float(time), part=part, file=path.replace(os.sep, "/")
+        )
+
+        with open(self._path, "r+b") as pvd_file:
+            pvd_file.seek(-len(self._TAIL), os.SEEK_END)
+            pvd_file.write(
+                ("    " + dataset.toxml() + "\n" + self._TAIL).encode("utf-8")
+            )
+
+        self._files.append(path)
 
 
 class VTKDatabase(VtkWriter):
-    def write(self, path, **kwargs):
+
+    """Write a time series of fields to numbered VTK files.
+
+    Each call to :meth:`write` writes a new file, numbered from zero, and
+    adds it to a ParaView data (pvd) collection of the same name.
+    """
+
+    def write(self, path, field, time=None):
         (base, file) = os.path.split(path)
         (root, ext) = os.path.splitext(file)
 
         try:
-            next_file = "%s_%04d%s" % (root, self._count, ext)
-        except NameError:
-            self._count = 0
-            next_file = "%s_%04d%s" % (root, self._count, ext)
+            collections = self._collections
+        except AttributeError:
+            collections = self._collections = {}
+
+        pvd_path = os.path.join(base, root + ".pvd")
+        try:
+            collection = collections[pvd_path]
+        except KeyError:
+            collection = collections[pvd_path] = VtkCollection(pvd_path)
+
+        count = len(collection)
+        next_file = "%s_%04d%s" % (root, count, ext)
 
-        VtkWriter.write(self, os.path.join(base, next_file), **kwargs)
+        VtkWriter.write(self, os.path.join(base, next_file), field)
 
-        self._count += 1
+        collection.add(next_file, count if time is None else time)
 
 
 if __name__ == "__main__":
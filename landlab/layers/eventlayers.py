@@ -5,7 +5,7 @@ import os
 import numpy as np
 
 
-def _deposit_or_erode(layers, n_layers, dz):
+def _deposit_or_erode(layers, n_layers, dz, surface_index=None):
     """Update the array that contains layers with deposition or erosion.
 
     This function operates on the entire array that contain the layers (active,
@@ -35,6 +35,10 @@ def _deposit_or_erode(layers, n_layers, dz):
     dz : ndarray of shape `(n_nodes, )`
         Thickness of the new layer. Negative thicknesses mean
         erode the top-most layers.
+    surface_index : ndarray of shape `(n_nodes, )`, optional
+        Index of the layer at the surface of each stack. If given, erosion
+        starts from this layer rather than the top of the array (all layers
+        above it must be empty), and it is updated in place.
 
     Examples
     --------
@@ -90,8 +94,24 @@ def _deposit_or_erode(layers, n_layers, dz):
            [ 1.,  0.,  0.],
            [ 2.,  0.,  0.],
            [ 0.,  0.,  0.]])
+
+    Keep track of the surface of each stack as layers are added so that
+    it doesn't have to be searched for.
+
+    >>> allocated_layers_array = np.full((4, 3), 0.)
+    >>> surface_index = np.zeros(3, dtype=int)
+    >>> _deposit_or_erode(allocated_layers_array, 1, 1., surface_index)
+    >>> _deposit_or_erode(allocated_layers_array, 2, 0., surface_index)
+    >>> _deposit_or_erode(allocated_layers_array, 3, [1., -.5, -2.], surface_index)
+    >>> allocated_layers_array
+    array([[ 1. ,  0.5,  0. ],
+           [ 0. ,  0. ,  0. ],
+           [ 1. ,  0. ,  0. ],
+           [ 0. ,  0. ,  0. ]])
+    >>> surface_index
+    array([2, 0, 0])
     """
-    from .ext.eventlayers import deposit_or_erode
+    from .ext.eventlayers import deposit_or_erode, deposit_or_erode_at_surface
 
     layers = layers.reshape((layers.shape[0], -1))
     try:
@@ -101,7 +121,10 @@ def _deposit_or_erode(layers, n_layers, dz):
     finally:
         dz = np.asfarray(dz)
 
-    deposit_or_erode(layers, n_layers, dz)
+    if surface_index is None:
+        deposit_or_erode(layers, n_layers, dz)
+    else:
+        deposit_or_erode_at_surface(layers, n_layers, dz, surface_index)
 
 
 def _get_surface_index(layers, n_layers, surface_index):
@@ -195,10 +218,7 @@ def resize_array(array, newsize, exact=False):
     if newsize <= allocated:
         return array
 
-    if exact:
-        new_allocated = newsize
-    else:
-        new_allocated = (newsize >> 3) + 6 + newsize
+    new_allocated = _allocation_size(newsize, exact=exact)
 
     larger_array = np.empty((new_allocated,) + array.shape[1:], dtype=array.dtype)
     larger_array[:allocated] = array
@@ -206,6 +226,96 @@ def resize_array(array, newsize, exact=False):
     return larger_array
 
 
+def resize_layers_file(array, filename, newsize, exact=False):
+    """Increase the size of an array stored in a file, leaving room to grow.
+
+    The array is stored in *filename* as a memory-mapped, raw binary file.
+    Because it grows along its zero-th dimension, growing it only extends
+    the end of the file; values already there are not copied.
+
+    Parameters
+    ----------
+    array : ndarray or memmap
+        The array to resize. If it is not already a memory map of
+        *filename*, its values are copied into a new file. If it is, its
+        map is closed before the file grows, and it, and any views of it,
+        must not be used afterwards.
+    filename : str
+        Path to the file that holds the array.
+    newsize : int
+        Size of the zero-th dimension of the resized array.
+    exact : bool, optional
+        Should the new array have the exact size provided or
+        at least that size.
+
+    Returns
+    -------
+    memmap
+        Memory map of the resized array.
+
+    Examples
+    --------
+    >>> import os
+    >>> import tempfile
+    >>> import numpy as np
+    >>> from landlab.layers.eventlayers import resize_layers_file
+
+    >>> filename = os.path.join(tempfile.mkdtemp(), "x.dat")
+    >>> x = resize_layers_file(np.arange(6).reshape((2, 3)), filename, 4)
+    >>> x.shape == (10, 3)
+    True
+    >>> np.all(x[:2] == [[0, 1, 2], [3, 4, 5]])
+    True
+    >>> os.path.getsize(filename) == x.nbytes
+    True
+
+    >>> x = resize_layers_file(x, filename, 12, exact=True)
+    >>> x.shape == (12, 3)
+    True
+    >>> np.all(x[:2] == [[0, 1, 2], [3, 4, 5]])
+    True
+    """
+    newsize = int(newsize)
+    allocated = array.shape[0]
+
+    if newsize <= allocated and isinstance(array, np.memmap):
+        return array
+    if array.dtype.hasobject:
+        raise ValueError("unable to store layers of python objects in a file")
+
+    shape = (max(_allocation_size(newsize, exact=exact), allocated),) + array.shape[1:]
+
+    if isinstance(array, np.memmap) and array.filename == os.path.abspath(filename):
+        dtype = array.dtype
+        _release_memmap(array)
+        with open(filename, "r+b") as fp:
+            fp.truncate(dtype.itemsize * int(np.prod(shape)))
+        return np.memmap(filename, dtype=dtype, mode="r+", shape=shape)
+    else:
+        larger_array = np.memmap(filename, dtype=array.dtype, mode="w+", shape=shape)
+        larger_array[:allocated] = array
+        return larger_array
+
+
+def _release_memmap(array):
+    """Write a memory map to its file and close the map.
+
+    A file cannot be resized while it is mapped on some platforms (Windows,
+    for one), so the map must be closed first.
+    """
+    array.flush()
+    array._mmap.close()
+    array._mmap = None
+
+
+def _allocation_size(newsize, exact=False):
+    """Number of layers to allocate to hold at least *newsize* layers."""
+    if exact:
+        return newsize
+    else:
+        return (newsize >> 3) + 6 + newsize
+
+
 def _allocate_layers_for(array, number_of_layers, number_of_stacks):
     """Allocate a layer matrix.
 
@@ -307,6 +417,16 @@ class EventLayers(object):
     ----------
     number_of_stacks : int
         Number of layer stacks to track.
+    allocated : int, optional
+        Number of layers to allocate memory for.
+    path : str, optional
+        Folder in which to store the layers. If given, layer thicknesses
+        and properties are kept in memory-mapped files in this folder
+        rather than in memory, so that there can be more layers than
+        will fit in memory. Only the layers near the surface, which are
+        the ones that are added to and eroded, are read in the course
+        of adding layers. Arrays of layer values taken from the layers
+        are no longer valid once the layers grow to make room for more.
 
     Examples
     --------
@@ -354,12 +474,26 @@ class EventLayers(object):
 
     >>> layers.surface_index
     array([0, 1, 0, 1, 0])
+
+    Store the layers in files rather than in memory.
+
+    >>> import tempfile
+    >>> layers = EventLayers(5, path=tempfile.mkdtemp())
+    >>> layers.add(1.5, age=1.)
+    >>> layers.add([1., 2., .5, 5., 0.], age=2.)
+    >>> layers.add(-1, age=3.)
+    >>> layers.thickness
+    array([ 1.5,  2.5,  1. ,  5.5,  0.5])
+    >>> layers.get_surface_values('age')
+    array([ 1.,  2.,  1.,  2.,  1.])
     """
 
-    def __init__(self, number_of_stacks, allocated=0):
+    def __init__(self, number_of_stacks, allocated=0, path=None):
         self._number_of_layers = 0
         self._number_of_stacks = number_of_stacks
         self._surface_index = np.zeros(number_of_stacks, dtype=int)
+        self._thickness = np.zeros(number_of_stacks, dtype=float)
+        self._path = path
         self._attrs = dict()
 
         dims = (self.number_of_layers, self.number_of_stacks)
@@ -370,12 +504,11 @@ class EventLayers(object):
         return self._attrs[name][: self.number_of_layers]
 
     def __setitem__(self, name, values):
-        dims = (self.allocated, self.number_of_stacks)
         values = np.asarray(values)
         if values.ndim == 1:
             values = np.expand_dims(values, 1)
         values = np.broadcast_to(values, (self.number_of_layers, self.number_of_stacks))
-        self._attrs[name] = _allocate_layers_for(values.flatten()[0], *dims)
+        self._allocate(name, values.flatten()[0])
         self._attrs[name][: self.number_of_layers] = values
 
     def __str__(self):
@@ -412,9 +545,22 @@ class EventLayers(object):
         return [name for name in self._attrs if not name.startswith("_")]
 
     def _setup_layers(self, **kwds):
-        dims = (self.allocated, self.number_of_stacks)
         for name, array in kwds.items():
-            self._attrs[name] = _allocate_layers_for(array, *dims)
+            self._allocate(name, array)
+
+    def _allocate(self, name, array):
+        """Allocate storage for a layer property."""
+        self._attrs[name] = _allocate_layers_for(
+            array, self.allocated, self.number_of_stacks
+        )
+        if self._path is not None and self.allocated > 0:
+            self._attrs[name] = resize_layers_file(
+                self._attrs[name], self._filename(name), self.allocated, exact=True
+            )
+
+    def _filename(self, name):
+        """Path to the file that stores a layer property."""
+        return os.path.join(self._path, name + ".dat")
 
     @property
     def number_of_stacks(self):
@@ -444,8 +590,14 @@ class EventLayers(object):
         >>> layers.add([1., -1., 2.])
         >>> layers.thickness
         array([ 16.,  14.,  17.])
+
+        Stacks can't have negative thickness.
+
+        >>> layers.add([-20., 1., -17.])
+        >>> layers.thickness
+        array([  0.,  15.,   0.])
         """
-        return np.sum(self.dz, axis=0)
+        return self._thickness.copy()
 
     @property
     def z(self):
@@ -547,7 +699,7 @@ class EventLayers(object):
         >>> for _ in range(layers.allocated): layers.add(0.)
         >>> layers.number_of_layers
         8
-        >>> layers.allocated == 15
+        >>> layers.allocated == 21
         True
 
         If you know how many layers you will ultimately have, you
@@ -568,8 +720,12 @@ class EventLayers(object):
         >>> for _ in range(layers.allocated): layers.add(0.)
         >>> layers.number_of_layers
         16
-        >>> layers.allocated == 24
+        >>> layers.allocated == 39
         True
+
+        Memory for new layers is allocated in chunks that double in
+        size, so that adding a layer takes, on average, a constant amount
+        of time however many layers there already are.
         """
         return self._attrs["_dz"].shape[0]
 
@@ -654,10 +810,7 @@ class EventLayers(object):
 
         self._add_empty_layer()
 
-        _deposit_or_erode(self._attrs["_dz"], self.number_of_layers, dz)
-        _get_surface_index(
-            self._attrs["_dz"], self.number_of_layers, self._surface_index
-        )
+        self._change_thickness(dz)
 
         for name in kwds:
             try:
@@ -675,17 +828,35 @@ class EventLayers(object):
     def get_surface_values(self, name):
         return self._attrs[name][self.surface_index, np.arange(self._number_of_stacks)]
 
+    def _change_thickness(self, dz):
+        """Deposit onto, or erode from, the top of the stacks."""
+        dz = np.asarray(dz, dtype=float)
+        if dz.size == self.number_of_stacks:
+            dz = dz.reshape((self.number_of_stacks,))
+
+        _deposit_or_erode(
+            self._attrs["_dz"], self.number_of_layers, dz, self._surface_index
+        )
+        self._thickness += dz
+        self._thickness.clip(0., out=self._thickness)
+
     def _add_empty_layer(self):
         """Add a new empty layer to the stacks."""
         if self.number_of_layers >= self.allocated:
-            self._resize(self.allocated + 1)
+            self._resize(max(2 * self.allocated, self.allocated + 1))
 
         self._number_of_layers += 1
-        self._attrs["_dz"][self.number_of_layers - 1, :] = 0.
         for name in self._attrs:
             self._attrs[name][self.number_of_layers - 1] = 0.
 
     def _resize(self, newsize, exact=False):
         """Allocate more memory for the layers."""
         for name in self._attrs:
-            self._attrs[name] = resize_array(self._attrs[name], newsize, exact=exact)
+            if self._path is None or newsize == 0:
+                self._attrs[name] = resize_array(
+                    self._attrs[name], newsize, exact=exact
+                )
+            else:
+                self._attrs[name] = resize_layers_file(
+                    self._attrs[name], self._filename(name), newsize, exact=exact
+                )
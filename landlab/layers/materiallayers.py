@@ -2,11 +2,9 @@ from __future__ import print_function
 
 import numpy as np
 
-from landlab.layers.eventlayers import (
-    EventLayers,
-    _deposit_or_erode,
-    _get_surface_index,
-)
+from landlab.layers.eventlayers import EventLayers
+
+_MIN_LAYERS_TO_COMPACT = 32
 
 
 class MaterialLayersMixIn(object):
@@ -40,6 +38,11 @@ class MaterialLayers(EventLayers):
     ----------
     number_of_stacks : int
         Number of layer stacks to track.
+    allocated : int, optional
+        Number of layers to allocate memory for.
+    path : str, optional
+        Folder in which to store the layers, in memory-mapped files,
+        rather than in memory.
 
     Attributes
     ----------
@@ -104,6 +107,12 @@ class MaterialLayers(EventLayers):
     behaves if material properties are also tracked.
     """
 
+    def __init__(self, number_of_stacks, allocated=0, path=None):
+        super(MaterialLayers, self).__init__(
+            number_of_stacks, allocated=allocated, path=path
+        )
+        self._compact_at = _MIN_LAYERS_TO_COMPACT
+
     def add(self, dz, **kwds):
         """Add a layer to the  MaterialLayers stacks.
 
@@ -277,10 +286,7 @@ class MaterialLayers(EventLayers):
         if not compatible:
             self._add_empty_layer()
 
-        _deposit_or_erode(self._attrs["_dz"], self.number_of_layers, dz)
-        _get_surface_index(
-            self._attrs["_dz"], self.number_of_layers, self._surface_index
-        )
+        self._change_thickness(dz)
 
         self._remove_empty_layers()
 
@@ -288,6 +294,98 @@ class MaterialLayers(EventLayers):
             for name in kwds:
                 self[name][-1] = kwds[name]
 
+        if self.number_of_layers >= self._compact_at:
+            self.compact()
+            self._compact_at = max(
+                2 * self.number_of_layers, _MIN_LAYERS_TO_COMPACT
+            )
+
+    def compact(self):
+        """Merge layers that no longer need to be separate.
+
+        A layer is merged into the layer below it if, in every stack,
+        either one of the two layers is empty or both have the same
+        attributes. Layers that are empty in every stack are dropped
+        this way. This is done automatically as layers are added, each
+        time the number of layers doubles.
+
+        Examples
+        --------
+        >>> from landlab.layers.materiallayers import MaterialLayers
+
+        >>> layers = MaterialLayers(3)
+        >>> layers.add(1., type=3.)
+        >>> layers.add([0., 2., 0.], type=6.)
+        >>> layers.add([1., 0., 0.], type=9.)
+        >>> layers.add([0., -2., 0.])
+        >>> layers.dz
+        array([[ 1.,  1.,  1.],
+               [ 0.,  0.,  0.],
+               [ 1.,  0.,  0.]])
+        >>> layers.compact()
+        >>> layers.dz
+        array([[ 1.,  1.,  1.],
+               [ 1.,  0.,  0.]])
+        >>> layers['type']
+        array([[ 3.,  3.,  3.],
+               [ 9.,  9.,  9.]])
+        >>> layers.surface_index
+        array([1, 0, 0])
+
+        Stacks may hold different material in the same layer.
+
+        >>> layers.add([0., 1., 0.], type=6.)
+        >>> layers.dz
+        array([[ 1.,  1.,  1.],
+               [ 1.,  0.,  0.],
+               [ 0.,  1.,  0.]])
+        >>> layers.compact()
+        >>> layers.dz
+        array([[ 1.,  1.,  1.],
+               [ 1.,  1.,  0.]])
+        >>> layers['type']
+        array([[ 3.,  3.,  3.],
+               [ 9.,  6.,  6.]])
+        >>> layers.surface_index
+        array([1, 1, 0])
+        """
+        n_layers = self.number_of_layers
+        if n_layers == 0:
+            return
+
+        dz = self._attrs["_dz"]
+        attrs = [self._attrs[name] for name in self.tracking]
+        new_index = np.empty(n_layers, dtype=int)
+
+        top = 0
+        new_index[0] = 0
+        for layer in range(1, n_layers):
+            is_same = np.ones(self.number_of_stacks, dtype=bool)
+            for values in attrs:
+                is_same_value = values[top] == values[layer]
+                is_same &= is_same_value.reshape((self.number_of_stacks, -1)).all(
+                    axis=1
+                )
+            can_merge = is_same | (dz[top] == 0.) | (dz[layer] == 0.)
+
+            if np.all(can_merge):
+                is_below = dz[top] > 0.
+                for values in attrs:
+                    is_below_values = is_below.reshape(
+                        is_below.shape + (1,) * (values.ndim - 2)
+                    )
+                    values[top] = np.where(is_below_values, values[top], values[layer])
+                dz[top] += dz[layer]
+            else:
+                top += 1
+                dz[top] = dz[layer]
+                for values in attrs:
+                    values[top] = values[layer]
+            new_index[layer] = top
+
+        self._number_of_layers = top + 1
+        self._surface_index[:] = new_index[self._surface_index]
+
     def _remove_empty_layers(self):
         number_of_filled_layers = self.surface_index.max() + 1
         if number_of_filled_layers < self.number_of_layers:
@@ -310,7 +408,7 @@ class MaterialLayers(EventLayers):
         if len(where_deposition) > 0:
             for name in kwds:
                 try:
-                    is_compatible = self[name][self.surface_index] == kwds[name]
+                    is_compatible = self.get_surface_values(name) == kwds[name]
                 except KeyError:
                     msg = "MaterialLayers: {0} is not being tracked. Error in adding.".format(
                         name
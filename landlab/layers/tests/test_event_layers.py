@@ -6,6 +6,7 @@ from numpy.testing import assert_array_equal
 
 from landlab import RasterModelGrid
 from landlab.layers import EventLayers
+from landlab.layers.eventlayers import _get_surface_index, resize_layers_file
 
 
 def test_EventLayersMixIn():
@@ -76,3 +77,60 @@ def test_adding_untracked_layer():
     layers.add([0., 0., 1.], type=3., size="sand")
     with pytest.raises(ValueError):
         layers.add([1.], type=3., size="sand", spam="eggs")
+
+
+def test_surface_index_matches_search():
+    np.random.seed(1945)
+    layers = EventLayers(20)
+    expected = np.zeros(20, dtype=int)
+    for _ in range(200):
+        layers.add(np.random.uniform(-1., 1., size=20))
+        _get_surface_index(layers.dz, layers.number_of_layers, expected)
+        assert_array_equal(layers.surface_index, expected)
+
+
+def test_allocation_grows_geometrically():
+    layers = EventLayers(3)
+    n_resizes = 0
+    allocated = layers.allocated
+    for _ in range(10000):
+        layers.add(1.)
+        if layers.allocated != allocated:
+            n_resizes += 1
+            allocated = layers.allocated
+    assert layers.number_of_layers == 10000
+    assert n_resizes < 15
+
+
+def test_layers_in_files(tmpdir):
+    np.random.seed(1945)
+    in_memory = EventLayers(20)
+    in_files = EventLayers(20, path=str(tmpdir))
+    for step in range(100):
+        dz = np.random.uniform(-1., 1., size=20)
+        in_memory.add(dz, age=step)
+        in_files.add(dz, age=step)
+
+    assert isinstance(in_files.dz, np.memmap)
+    assert tmpdir.join("_dz.dat").size() == in_files.allocated * 20 * 8
+    assert tmpdir.join("age.dat").check()
+    assert_array_equal(in_files.dz, in_memory.dz)
+    assert_array_equal(in_files["age"], in_memory["age"])
+    assert_array_equal(in_files.thickness, in_memory.thickness)
+    assert_array_equal(
+        in_files.get_surface_values("age"), in_memory.get_surface_values("age")
+    )
+
+
+def test_resize_layers_file_releases_old_map(tmpdir):
+    filename = str(tmpdir.join("x.dat"))
+    x = resize_layers_file(np.arange(6.).reshape((2, 3)), filename, 2, exact=True)
+    old_map = x._mmap
+
+    y = resize_layers_file(x, filename, 5, exact=True)
+
+    assert x._mmap is None
+    with pytest.raises(ValueError):
+        old_map[0]
+    assert tmpdir.join("x.dat").size() == y.nbytes
+    assert_array_equal(y[:2], [[0., 1., 2.], [3., 4., 5.]])
@@ -1,6 +1,8 @@
 from __future__ import print_function
 
+import numpy as np
 import pytest
+from numpy.testing import assert_array_almost_equal, assert_array_equal
 
 from landlab import RasterModelGrid
 from landlab.layers import MaterialLayers
@@ -19,3 +21,52 @@ def test_adding_untracked_layer():
     layers.add([0., 0., 1.], type=3., size="sand")
     with pytest.raises(ValueError):
         layers.add([1.], type=3., size="sand", spam="eggs")
+
+
+def _stack_contents(layers, stack):
+    contents = []
+    for dz, rock in zip(layers.dz[:, stack], layers["type"][:, stack]):
+        if dz > 0.:
+            if contents and contents[-1][0] == rock:
+                contents[-1][1] += dz
+            else:
+                contents.append([rock, dz])
+    return contents
+
+
+def test_layers_are_compacted():
+    np.random.seed(1945)
+    layers = MaterialLayers(10)
+    uncompacted = MaterialLayers(10)
+    uncompacted._compact_at = np.inf
+    layers.add(10., type=0)
+    uncompacted.add(10., type=0)
+    for step in range(1000):
+        dz = np.where(np.arange(10) == step % 10, np.random.uniform(-2., 2.), 0.)
+        layers.add(dz, type=step % 3)
+        uncompacted.add(dz, type=step % 3)
+
+    assert layers.number_of_layers < uncompacted.number_of_layers // 2
+    assert_array_almost_equal(layers.thickness, uncompacted.thickness)
+    for stack in range(10):
+        expected = _stack_contents(uncompacted, stack)
+        actual = _stack_contents(layers, stack)
+        assert [rock for rock, _ in actual] == [rock for rock, _ in expected]
+        assert_array_almost_equal(
+            [dz for _, dz in actual], [dz for _, dz in expected]
+        )
+    assert_array_equal(
+        layers.get_surface_values("type"), uncompacted.get_surface_values("type")
+    )
+
+
+def test_compact_with_two_tracked_attributes():
+    layers = MaterialLayers(3)
+    for layer in range(40):
+        layers.add(1., type=0., age=float(layer // 2))
+    layers.compact()
+
+    assert layers.number_of_layers == 20
+    assert_array_equal(layers.dz, 2.)
+    assert_array_equal(layers["type"], 0.)
+    assert_array_equal(layers["age"][:, 0], np.arange(20.))